@@ -0,0 +1,72 @@
+"""
+Backtest Total Engines
+
+Replays one or more total engines over historical games in a process pool
+and compares them. Per-game predictions are stored in backtest_results, so
+engines whose code has not changed since the last run are not recomputed.
+
+Usage:
+    python -m api.scripts.backtest_engines --engines v5 v5_ppp --start 2025-11-01 --end 2026-01-03
+    python -m api.scripts.backtest_engines --engines all --workers 8 --force
+"""
+
+import argparse
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from api.utils.backtest_runner import ENGINES, run_backtest
+
+
+def print_report(metrics: dict):
+    """Print one row per engine"""
+    print("\n" + "=" * 100)
+    print("ENGINE BACKTEST RESULTS")
+    print("=" * 100)
+    print(f"{'Engine':<10} {'Games':>6} {'Errors':>7} {'MAE':>7} {'Bias':>7} {'RMSE':>7} "
+          f"{'O/U Hit':>8} {'Lines':>6} {'ms/game':>8} {'Computed':>9} {'Code':>18}")
+    print("-" * 100)
+    for name, m in metrics.items():
+        def fmt(value, spec):
+            return format(value, spec) if value is not None else '-'
+        hit = f"{m['ou_hit_rate']:.1f}%" if m['ou_hit_rate'] is not None else '-'
+        leak = '' if m['point_in_time'] else ' *'
+        print(f"{name + leak:<10} {m['games']:>6} {m['errors']:>7} {fmt(m['mae'], '.2f'):>7} "
+              f"{fmt(m['bias'], '+.2f'):>7} {fmt(m['rmse'], '.2f'):>7} {hit:>8} {m['ou_games']:>6} "
+              f"{fmt(m['ms_per_game'], '.1f'):>8} {m['computed']:>9} {m['code_hash']:>18}")
+    print("-" * 100)
+    if any(not m['point_in_time'] for m in metrics.values()):
+        print("* uses current-season inputs, so games after the one predicted leak in")
+    wall_clock = next(iter(metrics.values()))['wall_clock_s'] if metrics else 0
+    print(f"Wall clock: {wall_clock:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backtest total engines in parallel')
+    parser.add_argument('--engines', nargs='+', default=['v5', 'v5_ppp'],
+                        help=f"Engines to run ({', '.join(ENGINES)} or all)")
+    parser.add_argument('--season', default='2025-26', help='NBA season')
+    parser.add_argument('--start', default='2025-10-21', help='Start date (YYYY-MM-DD)')
+    parser.add_argument('--end', default='2026-01-03', help='End date (YYYY-MM-DD)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Recompute stored predictions')
+    parser.add_argument('--verbose', action='store_true', help='Show engine output')
+
+    args = parser.parse_args()
+
+    engine_names = list(ENGINES) if args.engines == ['all'] else args.engines
+    unknown = [name for name in engine_names if name not in ENGINES]
+    if unknown:
+        parser.error(f"Unknown engines: {', '.join(unknown)}")
+
+    print(f"Backtesting {', '.join(engine_names)} on {args.season} games "
+          f"from {args.start} to {args.end}...")
+    metrics = run_backtest(engine_names, args.season, args.start, args.end,
+                           workers=args.workers, force=args.force, quiet=not args.verbose)
+    print_report(metrics)
+
+
+if __name__ == '__main__':
+    main()
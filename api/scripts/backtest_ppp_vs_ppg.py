@@ -22,16 +22,18 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from api.utils.prediction_engine_v5 import predict_total_for_game_v5
 from api.utils.prediction_engine_v5_ppp import predict_total_for_game_v5_ppp
+from api.utils.team_feature_store import (
+    get_team_features_as_of, preloaded_feature_history, refresh_team_feature_store
+)
 from api.utils.db_config import get_db_path
+from api.utils.connection_pool import get_shared_connection
 
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH)
 
 
 def backtest_predictions(
@@ -43,6 +45,9 @@ def backtest_predictions(
     """
     Backtest both PPG and PPP projections on historical games.
 
+    Team features come from the point-in-time feature store, so each
+    projection only sees games played before its game date.
+
     For each game:
     1. Run PPG projection as-of game date
     2. Run PPP projection as-of game date
@@ -66,6 +71,9 @@ def backtest_predictions(
     print(f"Min Games Before: {min_games_before}")
     print()
 
+    # Bring the feature store up to date (only changed teams are rewritten)
+    refresh_team_feature_store(season)
+
     conn = _get_db_connection()
     cursor = conn.cursor()
 
@@ -75,7 +83,8 @@ def backtest_predictions(
             game_id,
             game_date,
             MAX(CASE WHEN is_home = 1 THEN team_id END) as home_team_id,
-            MAX(CASE WHEN is_home = 0 THEN team_id END) as away_team_id
+            MAX(CASE WHEN is_home = 0 THEN team_id END) as away_team_id,
+            SUM(team_pts) as actual_total
         FROM team_game_logs
         WHERE season = ? AND game_date >= ? AND game_date <= ?
         GROUP BY game_id
@@ -85,6 +94,7 @@ def backtest_predictions(
 
     games = cursor.fetchall()
     total_games = len(games)
+    conn.close()
 
     print(f"Found {total_games} completed games\n")
 
@@ -92,106 +102,89 @@ def backtest_predictions(
     skipped = 0
     errors = 0
 
-    for idx, game in enumerate(games, 1):
-        if idx % 25 == 0:
-            print(f"  Progress: {idx}/{total_games} ({(idx/total_games)*100:.1f}%)...")
-
-        game_id = game['game_id']
-        game_date = game['game_date']
-        home_team_id = game['home_team_id']
-        away_team_id = game['away_team_id']
-
-        # Get actual total
-        cursor.execute('''
-            SELECT SUM(team_pts) as actual_total
-            FROM team_game_logs
-            WHERE game_id = ?
-        ''', (game_id,))
-        actual_row = cursor.fetchone()
-        actual_total = actual_row['actual_total'] if actual_row else None
-
-        if not actual_total:
-            skipped += 1
-            continue
-
-        # Check if teams have enough games before this game
-        cursor.execute('''
-            SELECT COUNT(*) as count
-            FROM team_game_logs
-            WHERE team_id = ? AND season = ? AND game_date < ?
-        ''', (home_team_id, season, game_date))
-        home_games = cursor.fetchone()['count']
-
-        cursor.execute('''
-            SELECT COUNT(*) as count
-            FROM team_game_logs
-            WHERE team_id = ? AND season = ? AND game_date < ?
-        ''', (away_team_id, season, game_date))
-        away_games = cursor.fetchone()['count']
-
-        if home_games < min_games_before or away_games < min_games_before:
-            skipped += 1
-            continue
-
-        # Run both projections as-of game date
-        try:
-            ppg_result = predict_total_for_game_v5(
-                home_team_id, away_team_id,
-                season=season, as_of_date=game_date
-            )
-            ppg_predicted = ppg_result['predicted_total']
-            ppg_home = ppg_result['home_projected']
-            ppg_away = ppg_result['away_projected']
-            ppg_pace = ppg_result['breakdown']['projected_pace']
-        except Exception as e:
-            errors += 1
-            ppg_predicted = None
-            ppg_home = None
-            ppg_away = None
-            ppg_pace = None
-
-        try:
-            ppp_result = predict_total_for_game_v5_ppp(
-                home_team_id, away_team_id,
-                season=season, as_of_date=game_date
-            )
-            ppp_predicted = ppp_result['predicted_total']
-            ppp_home = ppp_result['home_projected']
-            ppp_away = ppp_result['away_projected']
-            ppp_pace = ppp_result['projected_possessions']
-        except Exception as e:
-            errors += 1
-            ppp_predicted = None
-            ppp_home = None
-            ppp_away = None
-            ppp_pace = None
-
-        if ppg_predicted and ppp_predicted:
-            ppg_error = abs(ppg_predicted - actual_total)
-            ppp_error = abs(ppp_predicted - actual_total)
-
-            results.append({
-                'game_id': game_id,
-                'game_date': game_date,
-                'home_team_id': home_team_id,
-                'away_team_id': away_team_id,
-                'actual_total': actual_total,
-                'ppg_predicted': ppg_predicted,
-                'ppp_predicted': ppp_predicted,
-                'ppg_home': ppg_home,
-                'ppg_away': ppg_away,
-                'ppp_home': ppp_home,
-                'ppp_away': ppp_away,
-                'projected_pace': ppg_pace,
-                'ppg_error': ppg_error,
-                'ppp_error': ppp_error,
-                'ppg_over_under': 'over' if ppg_predicted > actual_total else 'under',
-                'ppp_over_under': 'over' if ppp_predicted > actual_total else 'under',
-                'winner': 'ppp' if ppp_error < ppg_error else 'ppg',
-                'delta': ppp_predicted - ppg_predicted
-            })
-
-    conn.close()
+    with preloaded_feature_history(season):
+        for idx, game in enumerate(games, 1):
+            if idx % 25 == 0:
+                print(f"  Progress: {idx}/{total_games} ({(idx/total_games)*100:.1f}%)...")
+
+            game_id = game['game_id']
+            game_date = game['game_date']
+            home_team_id = game['home_team_id']
+            away_team_id = game['away_team_id']
+
+            actual_total = game['actual_total']
+
+            if not actual_total:
+                skipped += 1
+                continue
+
+            # Check if teams have enough games before this game
+            home_features = get_team_features_as_of(home_team_id, game_date, season)
+            away_features = get_team_features_as_of(away_team_id, game_date, season)
+            home_games = home_features['games'] if home_features else 0
+            away_games = away_features['games'] if away_features else 0
+
+            if home_games < min_games_before or away_games < min_games_before:
+                skipped += 1
+                continue
+
+            # Run both projections as-of game date
+            try:
+                ppg_result = predict_total_for_game_v5(
+                    home_team_id, away_team_id,
+                    season=season, as_of_date=game_date
+                )
+                ppg_predicted = ppg_result['predicted_total']
+                ppg_home = ppg_result['home_projected']
+                ppg_away = ppg_result['away_projected']
+                ppg_pace = ppg_result['breakdown']['projected_pace']
+            except Exception as e:
+                errors += 1
+                ppg_predicted = None
+                ppg_home = None
+                ppg_away = None
+                ppg_pace = None
+
+            try:
+                ppp_result = predict_total_for_game_v5_ppp(
+                    home_team_id, away_team_id,
+                    season=season, as_of_date=game_date
+                )
+                ppp_predicted = ppp_result['predicted_total']
+                ppp_home = ppp_result['home_projected']
+                ppp_away = ppp_result['away_projected']
+                ppp_pace = ppp_result['projected_possessions']
+            except Exception as e:
+                errors += 1
+                ppp_predicted = None
+                ppp_home = None
+                ppp_away = None
+                ppp_pace = None
+
+            if ppg_predicted and ppp_predicted:
+                ppg_error = abs(ppg_predicted - actual_total)
+                ppp_error = abs(ppp_predicted - actual_total)
+
+                results.append({
+                    'game_id': game_id,
+                    'game_date': game_date,
+                    'home_team_id': home_team_id,
+                    'away_team_id': away_team_id,
+                    'actual_total': actual_total,
+                    'ppg_predicted': ppg_predicted,
+                    'ppp_predicted': ppp_predicted,
+                    'ppg_home': ppg_home,
+                    'ppg_away': ppg_away,
+                    'ppp_home': ppp_home,
+                    'ppp_away': ppp_away,
+                    'projected_pace': ppg_pace,
+                    'ppg_error': ppg_error,
+                    'ppp_error': ppp_error,
+                    'ppg_over_under': 'over' if ppg_predicted > actual_total else 'under',
+                    'ppp_over_under': 'over' if ppp_predicted > actual_total else 'under',
+                    'winner': 'ppp' if ppp_error < ppg_error else 'ppg',
+                    'delta': ppp_predicted - ppg_predicted
+                })
 
     print(f"\n✅ Backtest complete!")
     print(f"  Total games: {total_games}")
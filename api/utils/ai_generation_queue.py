@@ -0,0 +1,242 @@
+"""
+Queued Generation of the AI game_detail Sections
+
+The matchup summary and AI writeup on /api/game_detail come from OpenAI.
+Generating them inside the request on a cache miss blocked the page for
+several seconds, and every user opening the same new game at once fired
+their own OpenAI call.
+
+attach_ai_sections() now only reads the caches. When a section is missing
+it queues one background job (background_jobs, kind 'ai_sections') and
+returns with the section set to None and
+
+    response['ai_status'] = {'status': 'pending', 'job_id': ...}
+
+Jobs are coalesced by (game_id, writeup data hash) in jobs.db, so
+concurrent requests from any worker share one generation, and they run on
+the 'openai' job pool, which caps concurrent OpenAI calls per worker
+process (OPENAI_JOB_CONCURRENCY). After a sync, queue_slate_ai_sections()
+queues the whole slate so most games are ready before anyone opens them.
+
+ai_status values:
+    ready        both sections served from cache
+    pending      a generation job is queued or running
+    unavailable  no OpenAI key, or the last attempt for this data failed
+                 less than RETRY_AFTER_SECONDS ago
+"""
+
+import os
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from api.utils.background_jobs import ACTIVE_STATUSES, latest_job, submit_job
+    from api.utils.db_queries import get_matchup_data, get_all_teams
+    from api.utils.openai_client import has_openai_key
+except ImportError:
+    from background_jobs import ACTIVE_STATUSES, latest_job, submit_job
+    from db_queries import get_matchup_data, get_all_teams
+    from openai_client import has_openai_key
+
+JOB_KIND = 'ai_sections'
+
+# Don't retry a failed generation for the same data more often than this
+RETRY_AFTER_SECONDS = int(os.environ.get('AI_SECTIONS_RETRY_AFTER', '300'))
+
+
+def _cache_modules():
+    try:
+        from api.utils import ai_writeup_cache, matchup_summary_cache
+    except ImportError:
+        import ai_writeup_cache
+        import matchup_summary_cache
+    return ai_writeup_cache, matchup_summary_cache
+
+
+def writeup_game_data(response: Dict, game_id: str) -> Dict:
+    """game_data for ai_writeup_cache, built from a game_detail payload"""
+    prediction = response.get('prediction') or {}
+    return {
+        'game_id': game_id,
+        'home_team': response.get('home_team', {}),
+        'away_team': response.get('away_team', {}),
+        'empty_possessions': response.get('empty_possessions'),
+        'home_archetypes': response.get('home_archetypes'),
+        'away_archetypes': response.get('away_archetypes'),
+        'home_last5_trends': prediction.get('home_last5_trends', {}),
+        'away_last5_trends': prediction.get('away_last5_trends', {}),
+        'back_to_back_debug': prediction.get('back_to_back_debug', {})
+    }
+
+
+def _cached_sections(response: Dict, game_id: str) -> Tuple[Optional[Dict], Optional[str]]:
+    """(matchup_summary, ai_writeup) from their caches; None where missing or stale"""
+    ai_writeup_cache, matchup_summary_cache = _cache_modules()
+    matchup_summary = matchup_summary_cache.get_cached_summary(game_id)
+    try:
+        ai_writeup = ai_writeup_cache.get_current_writeup(writeup_game_data(response, game_id))
+    except Exception as e:
+        print(f'[ai_generation_queue] Warning: could not read cached writeup for game {game_id}: {e}')
+        ai_writeup = None
+    return matchup_summary, ai_writeup
+
+
+def _dedupe_key(response: Dict, game_id: str) -> str:
+    ai_writeup_cache, _ = _cache_modules()
+    return f'{game_id}:{ai_writeup_cache.get_writeup_data_hash(writeup_game_data(response, game_id))}'
+
+
+def _seconds_since(timestamp: Optional[str]) -> float:
+    if not timestamp:
+        return float('inf')
+    return (datetime.now(timezone.utc) - datetime.fromisoformat(timestamp)).total_seconds()
+
+
+def generate_ai_sections(game_id: str, season: str = '2025-26') -> Dict:
+    """
+    Background job: generate and cache whatever is missing for one game.
+
+    Returns:
+        {'game_id': str, 'matchup_summary': bool, 'ai_writeup': bool}
+        (True when the section is now cached)
+    """
+    try:
+        from api.utils.game_payloads import get_game_payload
+    except ImportError:
+        from game_payloads import get_game_payload
+
+    ai_writeup_cache, matchup_summary_cache = _cache_modules()
+    response = get_game_payload(game_id, 'game_detail', season)
+
+    matchup_summary = matchup_summary_cache.get_cached_summary(game_id)
+    if matchup_summary is None:
+        home_team_id = int(response['home_team']['id'])
+        away_team_id = int(response['away_team']['id'])
+        all_teams = get_all_teams()
+        matchup_summary = matchup_summary_cache.get_or_generate_summary(
+            game_id=game_id,
+            prediction=response['prediction'],  # Pass minimal data structure
+            matchup_data=get_matchup_data(home_team_id, away_team_id, season),
+            home_team=next((t for t in all_teams if t['id'] == home_team_id), {}),
+            away_team=next((t for t in all_teams if t['id'] == away_team_id), {})
+        )
+
+    ai_writeup = ai_writeup_cache.get_or_generate_writeup(writeup_game_data(response, game_id))
+
+    result = {'game_id': game_id, 'matchup_summary': matchup_summary is not None,
+              'ai_writeup': ai_writeup is not None}
+    if not all(result.values()):
+        # Recorded as a failure so attach_ai_sections() backs off
+        raise RuntimeError(f'AI generation incomplete for game {game_id}: {result}')
+    return result
+
+
+def queue_ai_sections(game_id: str, season: str = '2025-26', response: Optional[Dict] = None,
+                      retry_failed: bool = False) -> Optional[Dict]:
+    """
+    Queue generation for one game unless it is already queued or recently failed.
+
+    Args:
+        response: The game's game_detail payload (loaded if not given)
+        retry_failed: Queue even if the last attempt failed recently
+
+    Returns:
+        The job (new or coalesced), the recent failed job, or None without an OpenAI key
+    """
+    if not has_openai_key():
+        return None
+    if response is None:
+        try:
+            from api.utils.game_payloads import get_game_payload
+        except ImportError:
+            from game_payloads import get_game_payload
+        response = get_game_payload(game_id, 'game_detail', season)
+
+    dedupe_key = _dedupe_key(response, game_id)
+    last = latest_job(JOB_KIND, dedupe_key)
+    if last is not None and last['status'] in ACTIVE_STATUSES:
+        return last
+    if (last is not None and last['status'] == 'failed' and not retry_failed
+            and _seconds_since(last['finished_at']) < RETRY_AFTER_SECONDS):
+        return last
+
+    job_id = submit_job(JOB_KIND, generate_ai_sections, game_id, season,
+                        params={'game_id': game_id, 'season': season},
+                        dedupe_key=dedupe_key, pool='openai')
+    return {'job_id': job_id, 'status': 'queued'}
+
+
+def attach_ai_sections(response: Dict, game_id: str, season: str = '2025-26') -> Dict:
+    """
+    Attach the cached matchup summary and AI writeup to a game_detail payload.
+
+    Never calls OpenAI: a missing section is queued and left as None.
+
+    Returns:
+        response, with 'matchup_summary', 'ai_writeup' and 'ai_status' set
+    """
+    response['matchup_summary'], response['ai_writeup'] = _cached_sections(response, game_id)
+    if response['matchup_summary'] is not None and response['ai_writeup'] is not None:
+        response['ai_status'] = {'status': 'ready'}
+        return response
+
+    try:
+        job = queue_ai_sections(game_id, season, response)
+    except Exception as e:
+        # Queueing must never fail the page
+        import traceback
+        traceback.print_exc()
+        job = None
+        print(f'[ai_generation_queue] Warning: could not queue AI sections for game {game_id}: {e}')
+
+    if job is None or job['status'] not in ACTIVE_STATUSES:
+        response['ai_status'] = {'status': 'unavailable'}
+    else:
+        response['ai_status'] = {'status': 'pending', 'job_id': job['job_id']}
+    return response
+
+
+def queue_slate_ai_sections(season: str = '2025-26',
+                            game_ids: Optional[Iterable[str]] = None) -> Dict:
+    """
+    Queue AI generation for every game on today's slate (after a sync).
+
+    Returns:
+        {'games': int, 'queued': int, 'ready': int, 'skipped': str (reason) or None,
+         'errors': [str]}
+    """
+    if not has_openai_key():
+        return {'games': 0, 'queued': 0, 'ready': 0, 'skipped': 'OPENAI_API_KEY not set', 'errors': []}
+
+    if game_ids is None:
+        try:
+            from api.utils.db_queries import get_todays_games
+        except ImportError:
+            from db_queries import get_todays_games
+        game_ids = [g['game_id'] for g in get_todays_games(season)]
+    game_ids = [str(game_id) for game_id in game_ids]
+
+    try:
+        from api.utils.game_payloads import get_game_payload, PayloadUnavailable
+    except ImportError:
+        from game_payloads import get_game_payload, PayloadUnavailable
+
+    queued = ready = 0
+    errors: List[str] = []
+    for game_id in game_ids:
+        try:
+            response = get_game_payload(game_id, 'game_detail', season)
+            if all(section is not None for section in _cached_sections(response, game_id)):
+                ready += 1
+                continue
+            job = queue_ai_sections(game_id, season, response, retry_failed=True)
+            if job is not None and job['status'] in ACTIVE_STATUSES:
+                queued += 1
+        except PayloadUnavailable:
+            continue
+        except Exception as e:
+            errors.append(f'{game_id}: {e}')
+
+    print(f'[ai_generation_queue] Queued AI sections for {queued}/{len(game_ids)} games '
+          f'({ready} already cached, {len(errors)} errors)')
+    return {'games': len(game_ids), 'queued': queued, 'ready': ready, 'skipped': None, 'errors': errors}
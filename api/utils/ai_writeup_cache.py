@@ -25,6 +25,7 @@ try:
         ENGINE_VERSION
     )
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
 except ImportError:
     from ai_game_writeup_generator import (
         build_writeup_context,
@@ -33,6 +34,7 @@ except ImportError:
         ENGINE_VERSION
     )
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
 
 logger = logging.getLogger(__name__)
 
@@ -41,10 +43,8 @@ NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection to nba_data.db with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False, timeout=30.0)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH)
 
 
 def get_cached_writeup(game_id: str) -> Optional[Dict]:
@@ -173,6 +173,28 @@ def should_regenerate(game_id: str, current_hash: str) -> bool:
     return False
 
 
+def get_writeup_data_hash(game_data: Dict) -> str:
+    """Data hash a writeup for game_data is cached under"""
+    return calculate_data_hash(build_writeup_context(game_data))
+
+
+def get_current_writeup(game_data: Dict) -> Optional[str]:
+    """
+    Cached writeup for game_data if it is still valid; never generates.
+
+    Args:
+        game_data: Same dict as get_or_generate_writeup()
+
+    Returns:
+        Writeup text, or None on a miss or stale entry
+    """
+    cached = get_cached_writeup(game_data.get('game_id'))
+    if (cached and cached['engine_version'] == ENGINE_VERSION
+            and cached['data_hash'] == get_writeup_data_hash(game_data)):
+        return cached['writeup_text']
+    return None
+
+
 def get_or_generate_writeup(game_data: Dict) -> Optional[str]:
     """
     Main orchestration function for cached AI writeup retrieval/generation.
@@ -14,9 +14,11 @@ Design Principles:
 
 from typing import Dict, Tuple, List, Optional
 import logging
-import statistics
 import math
 
+import numpy as np
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 # ============================================================================
@@ -44,7 +46,8 @@ def _safe_zscore(x: float, mean: float, std: float) -> float:
 
 try:
     from api.utils.archetype_features import (
-        calculate_all_team_features,
+        calculate_team_feature_frames,
+        WINDOWS,
         OFFENSIVE_FEATURE_NAMES,
         DEFENSIVE_FEATURE_NAMES,
         ASSISTS_FEATURE_NAMES,
@@ -56,9 +59,11 @@ try:
         TURNOVERS_FEATURE_NAMES,
         TURNOVERS_DEFENSIVE_FEATURE_NAMES
     )
+    from api.utils.db_queries import get_stored_team_archetypes
 except ImportError:
     from archetype_features import (
-        calculate_all_team_features,
+        calculate_team_feature_frames,
+        WINDOWS,
         OFFENSIVE_FEATURE_NAMES,
         DEFENSIVE_FEATURE_NAMES,
         ASSISTS_FEATURE_NAMES,
@@ -70,6 +75,7 @@ except ImportError:
         TURNOVERS_FEATURE_NAMES,
         TURNOVERS_DEFENSIVE_FEATURE_NAMES
     )
+    from db_queries import get_stored_team_archetypes
 
 # ============================================================================
 # ARCHETYPE DEFINITIONS
@@ -591,6 +597,67 @@ TURNOVERS_DEFENSIVE_ORDER = ['turnover_forcing_havoc', 'pressure_defense', 'pass
 # FEATURE STANDARDIZATION
 # ============================================================================
 
+# Feature type -> feature names
+FEATURE_NAMES_BY_TYPE = {
+    'offensive': OFFENSIVE_FEATURE_NAMES,
+    'defensive': DEFENSIVE_FEATURE_NAMES,
+    'assists_offensive': ASSISTS_FEATURE_NAMES,
+    'assists_defensive': ASSISTS_DEFENSIVE_FEATURE_NAMES,
+    'rebounds_offensive': REBOUNDS_FEATURE_NAMES,
+    'rebounds_defensive': REBOUNDS_DEFENSIVE_FEATURE_NAMES,
+    'threes_offensive': THREES_FEATURE_NAMES,
+    'threes_defensive': THREES_DEFENSIVE_FEATURE_NAMES,
+    'turnovers_offensive': TURNOVERS_FEATURE_NAMES,
+    'turnovers_defensive': TURNOVERS_DEFENSIVE_FEATURE_NAMES
+}
+
+
+def standardize_feature_frame(features: pd.DataFrame, feature_type: str) -> pd.DataFrame:
+    """
+    Calculate z-scores for every feature column across all teams at once.
+
+    Z-score = (value - mean) / std_dev, with the same small-sample rules as
+    standardize_features(): one team -> mean 0 / std 1, two teams -> std 1.
+
+    Args:
+        features: One row per team (index team_id), one column per feature
+        feature_type: Key of FEATURE_NAMES_BY_TYPE
+
+    Returns:
+        DataFrame of z-scores with the family's feature columns, same index
+    """
+    feature_names = FEATURE_NAMES_BY_TYPE.get(feature_type, OFFENSIVE_FEATURE_NAMES)
+    values = features.reindex(columns=feature_names).to_numpy(dtype=float)
+
+    # Missing values are left out of the statistics and standardized as 0.0
+    present = ~np.isnan(values)
+    counts = present.sum(axis=0)
+    filled = np.where(present, values, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = filled.sum(axis=0) / counts
+        stdev = np.sqrt((np.where(present, values - mean, 0.0) ** 2).sum(axis=0) / (counts - 1))
+    mean = np.where(counts > 1, mean, 0.0)
+    stdev = np.where(counts > 2, stdev, 1.0)
+
+    logger.debug(f"{feature_type.capitalize()} feature statistics: mean={mean.tolist()}, stdev={stdev.tolist()}")
+
+    z_scores = np.where(stdev > 0, (filled - mean) / np.where(stdev > 0, stdev, 1.0), 0.0)
+    return pd.DataFrame(z_scores, index=features.index, columns=feature_names)
+
+
+def _standardized_records(z_scores: pd.DataFrame, features: pd.DataFrame) -> Dict:
+    """z-score frame -> {team_id: {feature: z, 'games_count', 'window'}}"""
+    games_count = features['games_count'] if 'games_count' in features else pd.Series(0, index=features.index)
+    window = features['window'] if 'window' in features else pd.Series('unknown', index=features.index)
+
+    standardized = {}
+    for team_id, z_row in zip(z_scores.index, z_scores.to_dict('records')):
+        z_row['games_count'] = int(games_count[team_id]) if pd.notna(games_count[team_id]) else 0
+        z_row['window'] = window[team_id]
+        standardized[int(team_id)] = z_row
+    return standardized
+
+
 def standardize_features(all_team_features: Dict, feature_type: str) -> Dict:
     """
     Calculate z-scores for all features across all teams.
@@ -606,61 +673,11 @@ def standardize_features(all_team_features: Dict, feature_type: str) -> Dict:
     Returns:
         Dict of team_id -> standardized_features
     """
-    # Map feature type to feature names
-    feature_name_map = {
-        'offensive': OFFENSIVE_FEATURE_NAMES,
-        'defensive': DEFENSIVE_FEATURE_NAMES,
-        'assists_offensive': ASSISTS_FEATURE_NAMES,
-        'assists_defensive': ASSISTS_DEFENSIVE_FEATURE_NAMES,
-        'rebounds_offensive': REBOUNDS_FEATURE_NAMES,
-        'rebounds_defensive': REBOUNDS_DEFENSIVE_FEATURE_NAMES,
-        'threes_offensive': THREES_FEATURE_NAMES,
-        'threes_defensive': THREES_DEFENSIVE_FEATURE_NAMES,
-        'turnovers_offensive': TURNOVERS_FEATURE_NAMES,
-        'turnovers_defensive': TURNOVERS_DEFENSIVE_FEATURE_NAMES
-    }
-
-    feature_names = feature_name_map.get(feature_type, OFFENSIVE_FEATURE_NAMES)
-
-    # Collect all values for each feature across all teams
-    feature_values = {name: [] for name in feature_names}
-
-    for team_id, features in all_team_features.items():
-        for feature_name in feature_names:
-            value = features.get(feature_name)
-            if value is not None:
-                feature_values[feature_name].append(value)
-
-    # Calculate mean and stdev for each feature
-    feature_stats = {}
-    for feature_name, values in feature_values.items():
-        if len(values) > 1:
-            mean = statistics.mean(values)
-            stdev = statistics.stdev(values) if len(values) > 2 else 1.0
-            feature_stats[feature_name] = {'mean': mean, 'stdev': stdev}
-        else:
-            feature_stats[feature_name] = {'mean': 0.0, 'stdev': 1.0}
+    if not all_team_features:
+        return {}
 
-    logger.debug(f"{feature_type.capitalize()} feature statistics: {feature_stats}")
-
-    # Standardize features for each team
-    standardized = {}
-    for team_id, features in all_team_features.items():
-        standardized[team_id] = {}
-        for feature_name in feature_names:
-            value = features.get(feature_name, 0.0)
-            stats = feature_stats[feature_name]
-            if stats['stdev'] > 0:
-                z_score = (value - stats['mean']) / stats['stdev']
-            else:
-                z_score = 0.0
-            standardized[team_id][feature_name] = z_score
-
-        # Preserve metadata
-        standardized[team_id]['games_count'] = features.get('games_count', 0)
-        standardized[team_id]['window'] = features.get('window', 'unknown')
-
-    return standardized
+    features = pd.DataFrame.from_dict(all_team_features, orient='index')
+    return _standardized_records(standardize_feature_frame(features, feature_type), features)
 
 
 # ============================================================================
@@ -863,6 +880,77 @@ def assign_turnovers_defensive_archetype(standardized_features: Dict) -> str:
     return 'average_pressure'  # Fallback
 
 
+# Feature type -> (archetype definitions, priority order, fallback archetype)
+ARCHETYPE_RULESETS = {
+    'offensive': (OFFENSIVE_ARCHETYPES, OFFENSIVE_ARCHETYPE_ORDER, 'balanced_high_assist'),
+    'defensive': (DEFENSIVE_ARCHETYPES, DEFENSIVE_ARCHETYPE_ORDER, 'balanced_disciplined'),
+    'assists_offensive': (ASSISTS_OFFENSIVE_ARCHETYPES, ASSISTS_OFFENSIVE_ORDER, 'balanced_sharing'),
+    'assists_defensive': (ASSISTS_DEFENSIVE_ARCHETYPES, ASSISTS_DEFENSIVE_ORDER, 'average_assist_defense'),
+    'rebounds_offensive': (REBOUNDS_OFFENSIVE_ARCHETYPES, REBOUNDS_OFFENSIVE_ORDER, 'balanced_rebounding'),
+    'rebounds_defensive': (REBOUNDS_DEFENSIVE_ARCHETYPES, REBOUNDS_DEFENSIVE_ORDER, 'average_rebounding'),
+    'threes_offensive': (THREES_OFFENSIVE_ARCHETYPES, THREES_OFFENSIVE_ORDER, 'balanced_shooting'),
+    'threes_defensive': (THREES_DEFENSIVE_ARCHETYPES, THREES_DEFENSIVE_ORDER, 'average_perimeter_defense'),
+    'turnovers_offensive': (TURNOVERS_OFFENSIVE_ARCHETYPES, TURNOVERS_OFFENSIVE_ORDER, 'average_ball_security'),
+    'turnovers_defensive': (TURNOVERS_DEFENSIVE_ARCHETYPES, TURNOVERS_DEFENSIVE_ORDER, 'average_pressure')
+}
+
+
+def _rule_mask(z_scores: pd.DataFrame, feature_name: str, rule_spec: Tuple) -> np.ndarray:
+    """_check_rule() for every team at once"""
+    if feature_name in z_scores:
+        values = z_scores[feature_name].to_numpy()
+    else:
+        values = np.zeros(len(z_scores))
+
+    if len(rule_spec) not in (2, 3):
+        logger.error(f"Invalid rule spec for {feature_name}: {rule_spec}")
+        return np.zeros(len(z_scores), dtype=bool)
+
+    operator, threshold = rule_spec[0], rule_spec[1]
+    threshold2 = rule_spec[2] if len(rule_spec) == 3 else None
+
+    if operator == '>':
+        return values > threshold
+    elif operator == '<':
+        return values < threshold
+    elif operator == 'between':
+        if threshold2 is None:
+            logger.error("'between' operator requires threshold2")
+            return np.zeros(len(z_scores), dtype=bool)
+        return (values >= threshold) & (values <= threshold2)
+    else:
+        logger.error(f"Unknown operator: {operator}")
+        return np.zeros(len(z_scores), dtype=bool)
+
+
+def assign_archetypes_frame(z_scores: pd.DataFrame, feature_type: str) -> Dict[int, str]:
+    """
+    Assign every team in a z-score frame to an archetype of one family.
+
+    Same priority-order rule matching as the assign_*_archetype() functions,
+    evaluated as boolean masks over all teams.
+
+    Args:
+        z_scores: Output of standardize_feature_frame()
+        feature_type: Key of ARCHETYPE_RULESETS
+
+    Returns:
+        {team_id: archetype_id}
+    """
+    archetypes, order, fallback = ARCHETYPE_RULESETS[feature_type]
+
+    matches = []
+    for archetype_id in order:
+        mask = np.ones(len(z_scores), dtype=bool)
+        for feature_name, rule_spec in archetypes[archetype_id]['rules'].items():
+            mask &= _rule_mask(z_scores, feature_name, rule_spec)
+        matches.append(mask)
+
+    # np.select picks the first matching archetype in priority order
+    assigned = np.select(matches, order, default=fallback) if matches else np.full(len(z_scores), fallback)
+    return {int(team_id): str(archetype_id) for team_id, archetype_id in zip(z_scores.index, assigned)}
+
+
 # ============================================================================
 # PERCENTILE CALCULATION
 # ============================================================================
@@ -959,121 +1047,62 @@ def assign_all_team_archetypes(season: str = '2025-26') -> Dict:
     """
     logger.info(f"Starting archetype assignment for season {season}")
 
-    # Step 1: Calculate features for all teams
-    all_features = calculate_all_team_features(season)
-
-    # DEBUG: Log what families were computed
-    logger.info(f"[DEBUG assign_all_team_archetypes] all_features keys: {list(all_features.keys())}")
-    logger.info(f"[DEBUG assign_all_team_archetypes] threes_offensive teams: {len(all_features.get('threes_offensive', {}))}")
-    logger.info(f"[DEBUG assign_all_team_archetypes] threes_defensive teams: {len(all_features.get('threes_defensive', {}))}")
-    logger.info(f"[DEBUG assign_all_team_archetypes] assists_offensive teams: {len(all_features.get('assists_offensive', {}))}")
-    logger.info(f"[DEBUG assign_all_team_archetypes] rebounds_offensive teams: {len(all_features.get('rebounds_offensive', {}))}")
-    logger.info(f"[DEBUG assign_all_team_archetypes] turnovers_offensive teams: {len(all_features.get('turnovers_offensive', {}))}")
-
-    # Step 2: Standardize features for SCORING archetypes (existing)
-    season_offensive_std = standardize_features(
-        {tid: data['season'] for tid, data in all_features['offensive'].items()},
-        'offensive'
-    )
-    last10_offensive_std = standardize_features(
-        {tid: data['last_10'] for tid, data in all_features['offensive'].items()},
-        'offensive'
-    )
-    season_defensive_std = standardize_features(
-        {tid: data['season'] for tid, data in all_features['defensive'].items()},
-        'defensive'
-    )
-    last10_defensive_std = standardize_features(
-        {tid: data['last_10'] for tid, data in all_features['defensive'].items()},
-        'defensive'
-    )
-
-    # Step 2b: Standardize features for NEW archetype families
-    # Assists
-    season_assists_off_std = standardize_features(
-        {tid: data['season'] for tid, data in all_features['assists_offensive'].items()},
-        'assists_offensive'
-    ) if 'assists_offensive' in all_features else {}
-    last10_assists_off_std = standardize_features(
-        {tid: data['last_10'] for tid, data in all_features['assists_offensive'].items()},
-        'assists_offensive'
-    ) if 'assists_offensive' in all_features else {}
-    season_assists_def_std = standardize_features(
-        {tid: data['season'] for tid, data in all_features['assists_defensive'].items()},
-        'assists_defensive'
-    ) if 'assists_defensive' in all_features else {}
-    last10_assists_def_std = standardize_features(
-        {tid: data['last_10'] for tid, data in all_features['assists_defensive'].items()},
-        'assists_defensive'
-    ) if 'assists_defensive' in all_features else {}
-
-    # Rebounds
-    season_rebounds_off_std = standardize_features(
-        {tid: data['season'] for tid, data in all_features['rebounds_offensive'].items()},
-        'rebounds_offensive'
-    ) if 'rebounds_offensive' in all_features else {}
-    last10_rebounds_off_std = standardize_features(
-        {tid: data['last_10'] for tid, data in all_features['rebounds_offensive'].items()},
-        'rebounds_offensive'
-    ) if 'rebounds_offensive' in all_features else {}
-    season_rebounds_def_std = standardize_features(
-        {tid: data['season'] for tid, data in all_features['rebounds_defensive'].items()},
-        'rebounds_defensive'
-    ) if 'rebounds_defensive' in all_features else {}
-    last10_rebounds_def_std = standardize_features(
-        {tid: data['last_10'] for tid, data in all_features['rebounds_defensive'].items()},
-        'rebounds_defensive'
-    ) if 'rebounds_defensive' in all_features else {}
-
-    # Threes
-    season_threes_off_std = standardize_features(
-        {tid: data['season'] for tid, data in all_features['threes_offensive'].items()},
-        'threes_offensive'
-    ) if 'threes_offensive' in all_features else {}
-    last10_threes_off_std = standardize_features(
-        {tid: data['last_10'] for tid, data in all_features['threes_offensive'].items()},
-        'threes_offensive'
-    ) if 'threes_offensive' in all_features else {}
-    season_threes_def_std = standardize_features(
-        {tid: data['season'] for tid, data in all_features['threes_defensive'].items()},
-        'threes_defensive'
-    ) if 'threes_defensive' in all_features else {}
-    last10_threes_def_std = standardize_features(
-        {tid: data['last_10'] for tid, data in all_features['threes_defensive'].items()},
-        'threes_defensive'
-    ) if 'threes_defensive' in all_features else {}
-
-    # Turnovers
-    season_turnovers_off_std = standardize_features(
-        {tid: data['season'] for tid, data in all_features['turnovers_offensive'].items()},
-        'turnovers_offensive'
-    ) if 'turnovers_offensive' in all_features else {}
-    last10_turnovers_off_std = standardize_features(
-        {tid: data['last_10'] for tid, data in all_features['turnovers_offensive'].items()},
-        'turnovers_offensive'
-    ) if 'turnovers_offensive' in all_features else {}
-    season_turnovers_def_std = standardize_features(
-        {tid: data['season'] for tid, data in all_features['turnovers_defensive'].items()},
-        'turnovers_defensive'
-    ) if 'turnovers_defensive' in all_features else {}
-    last10_turnovers_def_std = standardize_features(
-        {tid: data['last_10'] for tid, data in all_features['turnovers_defensive'].items()},
-        'turnovers_defensive'
-    ) if 'turnovers_defensive' in all_features else {}
+    # Step 1: Calculate features for all teams (one frame per family, both windows)
+    feature_frames = calculate_team_feature_frames(season)
+
+    # Step 2: Standardize each family per window and match its rules on the whole frame
+    standardized = {}   # (family, window) -> {team_id: z-scores + metadata}
+    archetype_ids = {}  # (family, window) -> {team_id: archetype_id}
+
+    for family, frame in feature_frames.items():
+        present = frame.index.get_level_values('window')
+        by_window = {window: frame.xs(window, level='window') if window in present else frame.iloc[0:0].droplevel('window')
+                     for window in WINDOWS}
+        # Only teams with both windows are classified
+        teams = by_window['season'].index.intersection(by_window['last_10'].index)
+
+        for window, window_frame in by_window.items():
+            window_frame = window_frame.loc[teams].assign(window=window)
+            z_scores = standardize_feature_frame(window_frame, family)
+            standardized[family, window] = _standardized_records(z_scores, window_frame)
+            archetype_ids[family, window] = assign_archetypes_frame(z_scores, family)
+
+        logger.debug(f"{family}: {len(teams)} teams")
+
+    season_offensive_std = standardized['offensive', 'season']
+    last10_offensive_std = standardized['offensive', 'last_10']
+    season_defensive_std = standardized['defensive', 'season']
+    last10_defensive_std = standardized['defensive', 'last_10']
+    season_assists_off_std = standardized['assists_offensive', 'season']
+    last10_assists_off_std = standardized['assists_offensive', 'last_10']
+    season_assists_def_std = standardized['assists_defensive', 'season']
+    last10_assists_def_std = standardized['assists_defensive', 'last_10']
+    season_rebounds_off_std = standardized['rebounds_offensive', 'season']
+    last10_rebounds_off_std = standardized['rebounds_offensive', 'last_10']
+    season_rebounds_def_std = standardized['rebounds_defensive', 'season']
+    last10_rebounds_def_std = standardized['rebounds_defensive', 'last_10']
+    season_threes_off_std = standardized['threes_offensive', 'season']
+    last10_threes_off_std = standardized['threes_offensive', 'last_10']
+    season_threes_def_std = standardized['threes_defensive', 'season']
+    last10_threes_def_std = standardized['threes_defensive', 'last_10']
+    season_turnovers_off_std = standardized['turnovers_offensive', 'season']
+    last10_turnovers_off_std = standardized['turnovers_offensive', 'last_10']
+    season_turnovers_def_std = standardized['turnovers_defensive', 'season']
+    last10_turnovers_def_std = standardized['turnovers_defensive', 'last_10']
 
     # Step 3 & 4: Assign archetypes and calculate percentiles
     assignments = {}
 
-    team_ids = set(all_features['offensive'].keys()) & set(all_features['defensive'].keys())
+    team_ids = set(season_offensive_std.keys()) & set(season_defensive_std.keys())
 
     for team_id in team_ids:
         # ===== SCORING ARCHETYPES (existing, backward compatible) =====
-        season_off = assign_offensive_archetype(season_offensive_std[team_id])
-        last10_off = assign_offensive_archetype(last10_offensive_std[team_id])
+        season_off = archetype_ids['offensive', 'season'][team_id]
+        last10_off = archetype_ids['offensive', 'last_10'][team_id]
         off_shift, off_shift_details = detect_style_shift(season_off, last10_off, 'offensive')
 
-        season_def = assign_defensive_archetype(season_defensive_std[team_id])
-        last10_def = assign_defensive_archetype(last10_defensive_std[team_id])
+        season_def = archetype_ids['defensive', 'season'][team_id]
+        last10_def = archetype_ids['defensive', 'last_10'][team_id]
         def_shift, def_shift_details = detect_style_shift(season_def, last10_def, 'defensive')
 
         # Calculate percentiles for scoring archetypes (use max z-score)
@@ -1100,10 +1129,10 @@ def assign_all_team_archetypes(season: str = '2025-26') -> Dict:
 
         # ===== ASSISTS ARCHETYPES =====
         if team_id in season_assists_off_std and team_id in last10_assists_off_std:
-            season_assists_off_id = assign_assists_offensive_archetype(season_assists_off_std[team_id])
-            last10_assists_off_id = assign_assists_offensive_archetype(last10_assists_off_std[team_id])
-            season_assists_def_id = assign_assists_defensive_archetype(season_assists_def_std[team_id])
-            last10_assists_def_id = assign_assists_defensive_archetype(last10_assists_def_std[team_id])
+            season_assists_off_id = archetype_ids['assists_offensive', 'season'][team_id]
+            last10_assists_off_id = archetype_ids['assists_offensive', 'last_10'][team_id]
+            season_assists_def_id = archetype_ids['assists_defensive', 'season'][team_id]
+            last10_assists_def_id = archetype_ids['assists_defensive', 'last_10'][team_id]
 
             assists_off_shift = season_assists_off_id != last10_assists_off_id
             assists_def_shift = season_assists_def_id != last10_assists_def_id
@@ -1153,10 +1182,10 @@ def assign_all_team_archetypes(season: str = '2025-26') -> Dict:
 
         # ===== REBOUNDS ARCHETYPES =====
         if team_id in season_rebounds_off_std and team_id in last10_rebounds_off_std:
-            season_rebounds_off_id = assign_rebounds_offensive_archetype(season_rebounds_off_std[team_id])
-            last10_rebounds_off_id = assign_rebounds_offensive_archetype(last10_rebounds_off_std[team_id])
-            season_rebounds_def_id = assign_rebounds_defensive_archetype(season_rebounds_def_std[team_id])
-            last10_rebounds_def_id = assign_rebounds_defensive_archetype(last10_rebounds_def_std[team_id])
+            season_rebounds_off_id = archetype_ids['rebounds_offensive', 'season'][team_id]
+            last10_rebounds_off_id = archetype_ids['rebounds_offensive', 'last_10'][team_id]
+            season_rebounds_def_id = archetype_ids['rebounds_defensive', 'season'][team_id]
+            last10_rebounds_def_id = archetype_ids['rebounds_defensive', 'last_10'][team_id]
 
             rebounds_off_shift = season_rebounds_off_id != last10_rebounds_off_id
             rebounds_def_shift = season_rebounds_def_id != last10_rebounds_def_id
@@ -1208,10 +1237,10 @@ def assign_all_team_archetypes(season: str = '2025-26') -> Dict:
         logger.debug(f"[DEBUG] Checking threes for team {team_id}: in season_std={team_id in season_threes_off_std}, in last10_std={team_id in last10_threes_off_std}")
         if team_id in season_threes_off_std and team_id in last10_threes_off_std:
             logger.info(f"[DEBUG] ✓ Adding threes archetypes for team {team_id}")
-            season_threes_off_id = assign_threes_offensive_archetype(season_threes_off_std[team_id])
-            last10_threes_off_id = assign_threes_offensive_archetype(last10_threes_off_std[team_id])
-            season_threes_def_id = assign_threes_defensive_archetype(season_threes_def_std[team_id])
-            last10_threes_def_id = assign_threes_defensive_archetype(last10_threes_def_std[team_id])
+            season_threes_off_id = archetype_ids['threes_offensive', 'season'][team_id]
+            last10_threes_off_id = archetype_ids['threes_offensive', 'last_10'][team_id]
+            season_threes_def_id = archetype_ids['threes_defensive', 'season'][team_id]
+            last10_threes_def_id = archetype_ids['threes_defensive', 'last_10'][team_id]
 
             threes_off_shift = season_threes_off_id != last10_threes_off_id
             threes_def_shift = season_threes_def_id != last10_threes_def_id
@@ -1263,10 +1292,10 @@ def assign_all_team_archetypes(season: str = '2025-26') -> Dict:
 
         # ===== TURNOVERS ARCHETYPES =====
         if team_id in season_turnovers_off_std and team_id in last10_turnovers_off_std:
-            season_turnovers_off_id = assign_turnovers_offensive_archetype(season_turnovers_off_std[team_id])
-            last10_turnovers_off_id = assign_turnovers_offensive_archetype(last10_turnovers_off_std[team_id])
-            season_turnovers_def_id = assign_turnovers_defensive_archetype(season_turnovers_def_std[team_id])
-            last10_turnovers_def_id = assign_turnovers_defensive_archetype(last10_turnovers_def_std[team_id])
+            season_turnovers_off_id = archetype_ids['turnovers_offensive', 'season'][team_id]
+            last10_turnovers_off_id = archetype_ids['turnovers_offensive', 'last_10'][team_id]
+            season_turnovers_def_id = archetype_ids['turnovers_defensive', 'season'][team_id]
+            last10_turnovers_def_id = archetype_ids['turnovers_defensive', 'last_10'][team_id]
 
             turnovers_off_shift = season_turnovers_off_id != last10_turnovers_off_id
             turnovers_def_shift = season_turnovers_def_id != last10_turnovers_def_id
@@ -1316,3 +1345,22 @@ def assign_all_team_archetypes(season: str = '2025-26') -> Dict:
 
     logger.info(f"Archetype assignment complete for {len(assignments)} teams")
     return assignments
+
+
+def load_team_archetypes(season: str = '2025-26') -> Dict:
+    """
+    Get archetype assignments for all teams.
+
+    Reads the snapshot the derived pipeline stores after each sync and only
+    falls back to assign_all_team_archetypes() when that snapshot is missing
+    or older than the current game logs.
+
+    Returns:
+        Same structure as assign_all_team_archetypes()
+    """
+    stored = get_stored_team_archetypes(season)
+    if stored is not None:
+        return stored
+
+    logger.info(f"No current archetype snapshot for {season}, computing live")
+    return assign_all_team_archetypes(season)
@@ -9,19 +9,27 @@ Feature Vectors:
                           efg_pct, assist_rate, turnover_rate, second_chance_ppg
 - Defensive (7 features): opp_ft_rate, opp_ft_ppg, opp_pitp_ppg, opp_three_pa_rate,
                           opp_efg_pct, opp_turnovers_forced, opp_pace
+
+Every family is computed for all teams and both windows (season, last 10)
+from one grouped query; see calculate_team_feature_frames().
 """
 
 import sqlite3
 from typing import Dict, Optional, List
 import logging
 
+import numpy as np
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 # Import centralized database configuration
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
 
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
@@ -30,17 +38,247 @@ GAME_FILTER = "AND game_type IN ('Regular Season', 'NBA Cup')"
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
+
+
+def _ratio(numerator: pd.Series, denominator: pd.Series, default: float = 0.0) -> pd.Series:
+    """Element-wise division with default where the denominator is 0/NULL or the numerator is NULL"""
+    num = numerator.to_numpy(dtype=float)
+    den = denominator.to_numpy(dtype=float)
+    valid = ~np.isnan(den) & (den != 0) & ~np.isnan(num)
+    return pd.Series(np.where(valid, num / np.where(valid, den, 1.0), default), index=numerator.index)
+
+
+# Windows every family is computed for
+WINDOWS = ('season', 'last_10')
+LAST_N_GAMES = 10
+
+# Per-game team_game_logs columns averaged for the archetype families
+_AVERAGED_COLUMNS = [
+    'fta', 'fga', 'ftm', 'fgm', 'fg3a', 'fg3m',
+    'points_in_paint', 'team_pts', 'assists', 'turnovers', 'possessions', 'steals',
+    'offensive_rebounds', 'defensive_rebounds', 'second_chance_points',
+    'opp_fta', 'opp_fga', 'opp_ftm', 'opp_fgm', 'opp_fg3a', 'opp_fg3m',
+    'opp_points_in_paint', 'opp_assists', 'opp_turnovers', 'opp_possessions', 'opp_steals',
+    'opp_offensive_rebounds', 'opp_defensive_rebounds', 'opp_second_chance_points',
+    'opp_pace'
+]
+
+
+def _query_window_averages(season: str, team_ids: Optional[List[int]] = None) -> pd.DataFrame:
+    """
+    Average every archetype column per team for the season and last-10 windows.
+
+    One grouped query: games are ranked newest-first per team with a window
+    function, then aggregated once over all games and once over rank <= 10.
+
+    Args:
+        season: Season string
+        team_ids: Restrict to these teams (default: all teams)
+
+    Returns:
+        DataFrame indexed by (window, team_id) with games_count and one
+        column per averaged stat. Teams without games have no rows.
+    """
+    team_filter = ''
+    params = [season]
+    if team_ids is not None:
+        team_filter = f"AND team_id IN ({','.join('?' * len(team_ids))})"
+        params.extend(team_ids)
+
+    averages = ',\n                '.join(f"AVG({col}) as {col}" for col in _AVERAGED_COLUMNS)
+    query = f'''
+        WITH games AS (
+            SELECT team_id, {', '.join(_AVERAGED_COLUMNS)},
+                   ROW_NUMBER() OVER (PARTITION BY team_id ORDER BY game_date DESC) as recency
+            FROM team_game_logs
+            WHERE season = ?
+            {GAME_FILTER}
+            {team_filter}
+        )
+        SELECT 'season' as stat_window, team_id,
+               COUNT(*) as games_count,
+               {averages}
+        FROM games
+        GROUP BY team_id
+        UNION ALL
+        SELECT 'last_10' as stat_window, team_id,
+               COUNT(*) as games_count,
+               {averages}
+        FROM games
+        WHERE recency <= {LAST_N_GAMES}
+        GROUP BY team_id
+    '''
+
+    conn = _get_db_connection()
+    frame = pd.read_sql_query(query, conn, params=params)
+    conn.close()
+
+    frame = frame.rename(columns={'stat_window': 'window'}).set_index(['window', 'team_id'])
+    # All-NULL columns come back as object dtype
+    return frame.astype(float).astype({'games_count': int})
+
+
+# ============================================================================
+# FEATURE FORMULAS - one function per family, over a frame of averages
+# ============================================================================
+
+def _offensive_features(avg: pd.DataFrame) -> pd.DataFrame:
+    """Scoring offense: 9 features"""
+    return pd.DataFrame({
+        'ft_rate': _ratio(avg['fta'], avg['fga']),
+        'ft_ppg': avg['ftm'].fillna(0.0),
+        'pitp_ppg': avg['points_in_paint'].fillna(0.0),
+        'pitp_share': _ratio(avg['points_in_paint'], avg['team_pts']),
+        'three_pa_rate': _ratio(avg['fg3a'], avg['fga']),
+        'efg_pct': _ratio(avg['fgm'] + 0.5 * avg['fg3m'], avg['fga']),
+        'assist_rate': _ratio(avg['assists'], avg['fgm']),
+        'turnover_rate': _ratio(avg['turnovers'], avg['possessions']),
+        'second_chance_ppg': avg['second_chance_points'].fillna(0.0)
+    })
+
+
+def _defensive_features(avg: pd.DataFrame) -> pd.DataFrame:
+    """Scoring defense: 7 features"""
+    return pd.DataFrame({
+        'opp_ft_rate': _ratio(avg['opp_fta'], avg['opp_fga']),
+        'opp_ft_ppg': avg['opp_ftm'].fillna(0.0),
+        'opp_pitp_ppg': avg['opp_points_in_paint'].fillna(0.0),
+        'opp_three_pa_rate': _ratio(avg['opp_fg3a'], avg['opp_fga']),
+        'opp_efg_pct': _ratio(avg['opp_fgm'] + 0.5 * avg['opp_fg3m'], avg['opp_fga']),
+        'opp_turnovers_forced': avg['opp_turnovers'].fillna(0.0),
+        'opp_pace': avg['opp_pace'].fillna(0.0)
+    })
+
+
+def _assists_features(avg: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({
+        'assists': avg['assists'].fillna(0.0),
+        'assist_rate': _ratio(avg['assists'], avg['fgm']),
+        'assists_per_100': _ratio(avg['assists'], avg['possessions']) * 100
+    })
+
+
+def _assists_defensive_features(avg: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({
+        'opp_assists': avg['opp_assists'].fillna(0.0),
+        'opp_assist_rate': _ratio(avg['opp_assists'], avg['opp_fgm']),
+        'opp_assists_per_100': _ratio(avg['opp_assists'], avg['opp_possessions']) * 100
+    })
+
+
+def _rebounds_features(avg: pd.DataFrame) -> pd.DataFrame:
+    oreb = avg['offensive_rebounds']
+    dreb = avg['defensive_rebounds']
+    return pd.DataFrame({
+        'offensive_rebounds': oreb.fillna(0.0),
+        'defensive_rebounds': dreb.fillna(0.0),
+        'oreb_rate': _ratio(oreb, oreb.fillna(0.0) + avg['opp_defensive_rebounds'].fillna(0.0)) * 100,
+        'dreb_rate': _ratio(dreb, dreb.fillna(0.0) + avg['opp_offensive_rebounds'].fillna(0.0)) * 100,
+        'second_chance_points': avg['second_chance_points'].fillna(0.0)
+    })
+
+
+def _rebounds_defensive_features(avg: pd.DataFrame) -> pd.DataFrame:
+    opp_oreb = avg['opp_offensive_rebounds']
+    opp_dreb = avg['opp_defensive_rebounds']
+    return pd.DataFrame({
+        'opp_offensive_rebounds': opp_oreb.fillna(0.0),
+        'opp_defensive_rebounds': opp_dreb.fillna(0.0),
+        'opp_oreb_rate': _ratio(opp_oreb, opp_oreb.fillna(0.0) + avg['defensive_rebounds'].fillna(0.0)) * 100,
+        'opp_dreb_rate': _ratio(opp_dreb, opp_dreb.fillna(0.0) + avg['offensive_rebounds'].fillna(0.0)) * 100,
+        'opp_second_chance_points': avg['opp_second_chance_points'].fillna(0.0)
+    })
+
+
+def _threes_features(avg: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({
+        'fg3a': avg['fg3a'].fillna(0.0),
+        'fg3_pct': _ratio(avg['fg3m'], avg['fg3a']),
+        'three_pa_rate': _ratio(avg['fg3a'], avg['fga'])
+    })
+
+
+def _threes_defensive_features(avg: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({
+        'opp_fg3a': avg['opp_fg3a'].fillna(0.0),
+        'opp_fg3_pct': _ratio(avg['opp_fg3m'], avg['opp_fg3a']),
+        'opp_three_pa_rate': _ratio(avg['opp_fg3a'], avg['opp_fga'])
+    })
+
+
+def _turnovers_features(avg: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({
+        'turnovers': avg['turnovers'].fillna(0.0),
+        'turnover_rate': _ratio(avg['turnovers'], avg['possessions']),
+        'steals': avg['steals'].fillna(0.0)
+    })
+
+
+def _turnovers_defensive_features(avg: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({
+        'opp_turnovers': avg['opp_turnovers'].fillna(0.0),
+        'opp_turnover_rate': _ratio(avg['opp_turnovers'], avg['opp_possessions']),
+        'opp_steals': avg['opp_steals'].fillna(0.0)
+    })
+
+
+# Family key (as used by calculate_all_team_features) -> feature formulas
+FEATURE_FAMILIES = {
+    'offensive': _offensive_features,
+    'defensive': _defensive_features,
+    'assists_offensive': _assists_features,
+    'assists_defensive': _assists_defensive_features,
+    'rebounds_offensive': _rebounds_features,
+    'rebounds_defensive': _rebounds_defensive_features,
+    'threes_offensive': _threes_features,
+    'threes_defensive': _threes_defensive_features,
+    'turnovers_offensive': _turnovers_features,
+    'turnovers_defensive': _turnovers_defensive_features
+}
+
+
+def calculate_team_feature_frames(season: str = '2025-26',
+                                  team_ids: Optional[List[int]] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Calculate every archetype family for all teams and both windows at once.
+
+    Args:
+        season: Season string
+        team_ids: Restrict to these teams (default: all teams)
+
+    Returns:
+        {family: DataFrame indexed by (window, team_id)} where window is
+        'season' or 'last_10'; columns are the family's features plus games_count
+    """
+    averages = _query_window_averages(season, team_ids)
 
+    frames = {}
+    for family, formulas in FEATURE_FAMILIES.items():
+        frame = formulas(averages)
+        frame['games_count'] = averages['games_count']
+        frames[family] = frame
 
-def _safe_divide(numerator: float, denominator: float, default: float = 0.0) -> float:
-    """Safe division with default fallback"""
-    if denominator == 0 or denominator is None or numerator is None:
-        return default
-    return numerator / denominator
+    return frames
+
+
+def _team_window_features(family: str, team_id: int, season: str, window: str) -> Optional[Dict]:
+    """Single team/window row of calculate_team_feature_frames() as a feature dict"""
+    key = ('season' if window == 'season' else 'last_10', team_id)
+    frame = calculate_team_feature_frames(season, [team_id])[family]
+
+    if key not in frame.index:
+        logger.warning(f"No game data found for team {team_id}, {window}")
+        return None
+
+    row = frame.loc[key]
+    features = {name: float(row[name]) for name in frame.columns if name != 'games_count'}
+    features['games_count'] = int(row['games_count'])
+    features['window'] = window
+
+    logger.debug(f"{family} features for team {team_id} ({window}): {features}")
+    return features
 
 
 def calculate_offensive_features(team_id: int, season: str,
@@ -69,84 +307,7 @@ def calculate_offensive_features(team_id: int, season: str,
             'window': str
         }
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-
-    if window == 'season':
-        # Query season-level stats
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as games_count,
-                AVG(fta) as avg_fta,
-                AVG(fga) as avg_fga,
-                AVG(ftm) as avg_ftm,
-                AVG(points_in_paint) as avg_pitp,
-                AVG(team_pts) as avg_pts,
-                AVG(fg3a) as avg_fg3a,
-                AVG(fgm) as avg_fgm,
-                AVG(fg3m) as avg_fg3m,
-                AVG(assists) as avg_assists,
-                AVG(turnovers) as avg_turnovers,
-                AVG(possessions) as avg_possessions,
-                AVG(second_chance_points) as avg_second_chance
-            FROM team_game_logs
-            WHERE team_id = ?
-            AND season = ?
-            {GAME_FILTER}
-        ''', (team_id, season))
-
-    else:  # last_10
-        # Query last 10 games
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as games_count,
-                AVG(fta) as avg_fta,
-                AVG(fga) as avg_fga,
-                AVG(ftm) as avg_ftm,
-                AVG(points_in_paint) as avg_pitp,
-                AVG(team_pts) as avg_pts,
-                AVG(fg3a) as avg_fg3a,
-                AVG(fgm) as avg_fgm,
-                AVG(fg3m) as avg_fg3m,
-                AVG(assists) as avg_assists,
-                AVG(turnovers) as avg_turnovers,
-                AVG(possessions) as avg_possessions,
-                AVG(second_chance_points) as avg_second_chance
-            FROM (
-                SELECT *
-                FROM team_game_logs
-                WHERE team_id = ?
-                AND season = ?
-                {GAME_FILTER}
-                ORDER BY game_date DESC
-                LIMIT 10
-            )
-        ''', (team_id, season))
-
-    row = cursor.fetchone()
-    conn.close()
-
-    if not row or row['games_count'] == 0:
-        logger.warning(f"No game data found for team {team_id}, {window}")
-        return None
-
-    # Calculate features
-    features = {
-        'ft_rate': _safe_divide(row['avg_fta'], row['avg_fga']),
-        'ft_ppg': row['avg_ftm'] or 0.0,
-        'pitp_ppg': row['avg_pitp'] or 0.0,
-        'pitp_share': _safe_divide(row['avg_pitp'], row['avg_pts']),
-        'three_pa_rate': _safe_divide(row['avg_fg3a'], row['avg_fga']),
-        'efg_pct': _safe_divide(row['avg_fgm'] + 0.5 * row['avg_fg3m'], row['avg_fga']),
-        'assist_rate': _safe_divide(row['avg_assists'], row['avg_fgm']),
-        'turnover_rate': _safe_divide(row['avg_turnovers'], row['avg_possessions']),
-        'second_chance_ppg': row['avg_second_chance'] or 0.0,
-        'games_count': row['games_count'],
-        'window': window
-    }
-
-    logger.debug(f"Offensive features for team {team_id} ({window}): {features}")
-    return features
+    return _team_window_features('offensive', team_id, season, window)
 
 
 def calculate_defensive_features(team_id: int, season: str,
@@ -173,82 +334,16 @@ def calculate_defensive_features(team_id: int, season: str,
             'window': str
         }
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-
-    if window == 'season':
-        # Query season-level opponent stats
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as games_count,
-                AVG(opp_fta) as avg_opp_fta,
-                AVG(opp_fga) as avg_opp_fga,
-                AVG(opp_ftm) as avg_opp_ftm,
-                AVG(opp_points_in_paint) as avg_opp_pitp,
-                AVG(opp_fg3a) as avg_opp_fg3a,
-                AVG(opp_fgm) as avg_opp_fgm,
-                AVG(opp_fg3m) as avg_opp_fg3m,
-                AVG(opp_turnovers) as avg_opp_turnovers,
-                AVG(opp_pace) as avg_opp_pace
-            FROM team_game_logs
-            WHERE team_id = ?
-            AND season = ?
-            {GAME_FILTER}
-        ''', (team_id, season))
-
-    else:  # last_10
-        # Query last 10 games opponent stats
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as games_count,
-                AVG(opp_fta) as avg_opp_fta,
-                AVG(opp_fga) as avg_opp_fga,
-                AVG(opp_ftm) as avg_opp_ftm,
-                AVG(opp_points_in_paint) as avg_opp_pitp,
-                AVG(opp_fg3a) as avg_opp_fg3a,
-                AVG(opp_fgm) as avg_opp_fgm,
-                AVG(opp_fg3m) as avg_opp_fg3m,
-                AVG(opp_turnovers) as avg_opp_turnovers,
-                AVG(opp_pace) as avg_opp_pace
-            FROM (
-                SELECT *
-                FROM team_game_logs
-                WHERE team_id = ?
-                AND season = ?
-                {GAME_FILTER}
-                ORDER BY game_date DESC
-                LIMIT 10
-            )
-        ''', (team_id, season))
-
-    row = cursor.fetchone()
-    conn.close()
-
-    if not row or row['games_count'] == 0:
-        logger.warning(f"No game data found for team {team_id}, {window}")
-        return None
-
-    # Calculate features
-    features = {
-        'opp_ft_rate': _safe_divide(row['avg_opp_fta'], row['avg_opp_fga']),
-        'opp_ft_ppg': row['avg_opp_ftm'] or 0.0,
-        'opp_pitp_ppg': row['avg_opp_pitp'] or 0.0,
-        'opp_three_pa_rate': _safe_divide(row['avg_opp_fg3a'], row['avg_opp_fga']),
-        'opp_efg_pct': _safe_divide(row['avg_opp_fgm'] + 0.5 * row['avg_opp_fg3m'], row['avg_opp_fga']),
-        'opp_turnovers_forced': row['avg_opp_turnovers'] or 0.0,
-        'opp_pace': row['avg_opp_pace'] or 0.0,
-        'games_count': row['games_count'],
-        'window': window
-    }
-
-    logger.debug(f"Defensive features for team {team_id} ({window}): {features}")
-    return features
+    return _team_window_features('defensive', team_id, season, window)
 
 
 def calculate_all_team_features(season: str = '2025-26') -> Dict:
     """
     Calculate features for all 30 teams (season + last 10).
 
+    Built from calculate_team_feature_frames(); use that directly to work
+    with the features as DataFrames.
+
     Args:
         season: Season string
 
@@ -266,137 +361,26 @@ def calculate_all_team_features(season: str = '2025-26') -> Dict:
             'turnovers_defensive': {...}
         }
     """
-    # Get all team IDs
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute('''
-        SELECT DISTINCT team_id
-        FROM team_game_logs
-        WHERE season = ?
-    ''', (season,))
-
-    team_ids = [row['team_id'] for row in cursor.fetchall()]
-    conn.close()
-
-    logger.info(f"Calculating features for {len(team_ids)} teams in season {season}")
-
-    # Calculate features for each team
-    result = {
-        # Existing scoring archetypes
-        'offensive': {},
-        'defensive': {},
-        # New archetype families
-        'assists_offensive': {},
-        'assists_defensive': {},
-        'rebounds_offensive': {},
-        'rebounds_defensive': {},
-        'threes_offensive': {},
-        'threes_defensive': {},
-        'turnovers_offensive': {},
-        'turnovers_defensive': {}
-    }
-
-    for team_id in team_ids:
-        # EXISTING: Scoring Offensive features
-        season_off = calculate_offensive_features(team_id, season, 'season')
-        last10_off = calculate_offensive_features(team_id, season, 'last_10')
-
-        if season_off and last10_off:
-            result['offensive'][team_id] = {
-                'season': season_off,
-                'last_10': last10_off
-            }
-
-        # EXISTING: Scoring Defensive features
-        season_def = calculate_defensive_features(team_id, season, 'season')
-        last10_def = calculate_defensive_features(team_id, season, 'last_10')
-
-        if season_def and last10_def:
-            result['defensive'][team_id] = {
-                'season': season_def,
-                'last_10': last10_def
-            }
-
-        # NEW: Assists Offensive features
-        season_assists_off = calculate_assists_features(team_id, season, 'season')
-        last10_assists_off = calculate_assists_features(team_id, season, 'last_10')
-
-        if season_assists_off and last10_assists_off:
-            result['assists_offensive'][team_id] = {
-                'season': season_assists_off,
-                'last_10': last10_assists_off
-            }
-
-        # NEW: Assists Defensive features
-        season_assists_def = calculate_assists_defensive_features(team_id, season, 'season')
-        last10_assists_def = calculate_assists_defensive_features(team_id, season, 'last_10')
-
-        if season_assists_def and last10_assists_def:
-            result['assists_defensive'][team_id] = {
-                'season': season_assists_def,
-                'last_10': last10_assists_def
-            }
-
-        # NEW: Rebounds Offensive features
-        season_rebounds_off = calculate_rebounds_features(team_id, season, 'season')
-        last10_rebounds_off = calculate_rebounds_features(team_id, season, 'last_10')
-
-        if season_rebounds_off and last10_rebounds_off:
-            result['rebounds_offensive'][team_id] = {
-                'season': season_rebounds_off,
-                'last_10': last10_rebounds_off
-            }
-
-        # NEW: Rebounds Defensive features
-        season_rebounds_def = calculate_rebounds_defensive_features(team_id, season, 'season')
-        last10_rebounds_def = calculate_rebounds_defensive_features(team_id, season, 'last_10')
-
-        if season_rebounds_def and last10_rebounds_def:
-            result['rebounds_defensive'][team_id] = {
-                'season': season_rebounds_def,
-                'last_10': last10_rebounds_def
-            }
-
-        # NEW: Threes Offensive features
-        season_threes_off = calculate_threes_features(team_id, season, 'season')
-        last10_threes_off = calculate_threes_features(team_id, season, 'last_10')
-
-        if season_threes_off and last10_threes_off:
-            result['threes_offensive'][team_id] = {
-                'season': season_threes_off,
-                'last_10': last10_threes_off
-            }
-
-        # NEW: Threes Defensive features
-        season_threes_def = calculate_threes_defensive_features(team_id, season, 'season')
-        last10_threes_def = calculate_threes_defensive_features(team_id, season, 'last_10')
-
-        if season_threes_def and last10_threes_def:
-            result['threes_defensive'][team_id] = {
-                'season': season_threes_def,
-                'last_10': last10_threes_def
-            }
-
-        # NEW: Turnovers Offensive features
-        season_turnovers_off = calculate_turnovers_features(team_id, season, 'season')
-        last10_turnovers_off = calculate_turnovers_features(team_id, season, 'last_10')
-
-        if season_turnovers_off and last10_turnovers_off:
-            result['turnovers_offensive'][team_id] = {
-                'season': season_turnovers_off,
-                'last_10': last10_turnovers_off
-            }
-
-        # NEW: Turnovers Defensive features
-        season_turnovers_def = calculate_turnovers_defensive_features(team_id, season, 'season')
-        last10_turnovers_def = calculate_turnovers_defensive_features(team_id, season, 'last_10')
-
-        if season_turnovers_def and last10_turnovers_def:
-            result['turnovers_defensive'][team_id] = {
-                'season': season_turnovers_def,
-                'last_10': last10_turnovers_def
-            }
+    frames = calculate_team_feature_frames(season)
+
+    result = {}
+    for family, frame in frames.items():
+        result[family] = {}
+        by_window = {window: frame.xs(window, level='window').to_dict('index')
+                     for window in WINDOWS if window in frame.index.get_level_values('window')}
+
+        for team_id, season_features in by_window.get('season', {}).items():
+            last10_features = by_window.get('last_10', {}).get(team_id)
+            if last10_features is None:
+                continue
+
+            windows = {}
+            for window, features in (('season', season_features), ('last_10', last10_features)):
+                features = dict(features)
+                features['games_count'] = int(features['games_count'])
+                features['window'] = window
+                windows[window] = features
+            result[family][int(team_id)] = windows
 
     logger.info(f"Feature calculation complete: {len(result['offensive'])} teams with offensive features, "
                 f"{len(result['defensive'])} teams with defensive features, "
@@ -477,56 +461,7 @@ def calculate_assists_features(team_id: int, season: str,
             'window': str
         }
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-
-    if window == 'season':
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as games_count,
-                AVG(assists) as avg_assists,
-                AVG(fgm) as avg_fgm,
-                AVG(possessions) as avg_possessions
-            FROM team_game_logs
-            WHERE team_id = ?
-            AND season = ?
-            {GAME_FILTER}
-        ''', (team_id, season))
-    else:  # last_10
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as games_count,
-                AVG(assists) as avg_assists,
-                AVG(fgm) as avg_fgm,
-                AVG(possessions) as avg_possessions
-            FROM (
-                SELECT *
-                FROM team_game_logs
-                WHERE team_id = ?
-                AND season = ?
-                {GAME_FILTER}
-                ORDER BY game_date DESC
-                LIMIT 10
-            )
-        ''', (team_id, season))
-
-    row = cursor.fetchone()
-    conn.close()
-
-    if not row or row['games_count'] == 0:
-        logger.warning(f"No game data found for team {team_id}, {window}")
-        return None
-
-    features = {
-        'assists': row['avg_assists'] or 0.0,
-        'assist_rate': _safe_divide(row['avg_assists'], row['avg_fgm']),
-        'assists_per_100': _safe_divide(row['avg_assists'], row['avg_possessions']) * 100,
-        'games_count': row['games_count'],
-        'window': window
-    }
-
-    logger.debug(f"Assists features for team {team_id} ({window}): {features}")
-    return features
+    return _team_window_features('assists_offensive', team_id, season, window)
 
 
 def calculate_assists_defensive_features(team_id: int, season: str,
@@ -542,56 +477,7 @@ def calculate_assists_defensive_features(team_id: int, season: str,
     Returns:
         Dict with 3 defensive assists features + metadata
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-
-    if window == 'season':
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as games_count,
-                AVG(opp_assists) as avg_opp_assists,
-                AVG(opp_fgm) as avg_opp_fgm,
-                AVG(opp_possessions) as avg_opp_possessions
-            FROM team_game_logs
-            WHERE team_id = ?
-            AND season = ?
-            {GAME_FILTER}
-        ''', (team_id, season))
-    else:  # last_10
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as games_count,
-                AVG(opp_assists) as avg_opp_assists,
-                AVG(opp_fgm) as avg_opp_fgm,
-                AVG(opp_possessions) as avg_opp_possessions
-            FROM (
-                SELECT *
-                FROM team_game_logs
-                WHERE team_id = ?
-                AND season = ?
-                {GAME_FILTER}
-                ORDER BY game_date DESC
-                LIMIT 10
-            )
-        ''', (team_id, season))
-
-    row = cursor.fetchone()
-    conn.close()
-
-    if not row or row['games_count'] == 0:
-        logger.warning(f"No game data found for team {team_id}, {window}")
-        return None
-
-    features = {
-        'opp_assists': row['avg_opp_assists'] or 0.0,
-        'opp_assist_rate': _safe_divide(row['avg_opp_assists'], row['avg_opp_fgm']),
-        'opp_assists_per_100': _safe_divide(row['avg_opp_assists'], row['avg_opp_possessions']) * 100,
-        'games_count': row['games_count'],
-        'window': window
-    }
-
-    logger.debug(f"Assists defensive features for team {team_id} ({window}): {features}")
-    return features
+    return _team_window_features('assists_defensive', team_id, season, window)
 
 
 def calculate_rebounds_features(team_id: int, season: str,
@@ -616,62 +502,7 @@ def calculate_rebounds_features(team_id: int, season: str,
             'window': str
         }
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-
-    if window == 'season':
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as games_count,
-                AVG(offensive_rebounds) as avg_oreb,
-                AVG(defensive_rebounds) as avg_dreb,
-                AVG(opp_offensive_rebounds) as avg_opp_oreb,
-                AVG(opp_defensive_rebounds) as avg_opp_dreb,
-                AVG(second_chance_points) as avg_second_chance
-            FROM team_game_logs
-            WHERE team_id = ?
-            AND season = ?
-            {GAME_FILTER}
-        ''', (team_id, season))
-    else:  # last_10
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as games_count,
-                AVG(offensive_rebounds) as avg_oreb,
-                AVG(defensive_rebounds) as avg_dreb,
-                AVG(opp_offensive_rebounds) as avg_opp_oreb,
-                AVG(opp_defensive_rebounds) as avg_opp_dreb,
-                AVG(second_chance_points) as avg_second_chance
-            FROM (
-                SELECT *
-                FROM team_game_logs
-                WHERE team_id = ?
-                AND season = ?
-                {GAME_FILTER}
-                ORDER BY game_date DESC
-                LIMIT 10
-            )
-        ''', (team_id, season))
-
-    row = cursor.fetchone()
-    conn.close()
-
-    if not row or row['games_count'] == 0:
-        logger.warning(f"No game data found for team {team_id}, {window}")
-        return None
-
-    features = {
-        'offensive_rebounds': row['avg_oreb'] or 0.0,
-        'defensive_rebounds': row['avg_dreb'] or 0.0,
-        'oreb_rate': _safe_divide(row['avg_oreb'], (row['avg_oreb'] or 0.0) + (row['avg_opp_dreb'] or 0.0)) * 100,
-        'dreb_rate': _safe_divide(row['avg_dreb'], (row['avg_dreb'] or 0.0) + (row['avg_opp_oreb'] or 0.0)) * 100,
-        'second_chance_points': row['avg_second_chance'] or 0.0,
-        'games_count': row['games_count'],
-        'window': window
-    }
-
-    logger.debug(f"Rebounds features for team {team_id} ({window}): {features}")
-    return features
+    return _team_window_features('rebounds_offensive', team_id, season, window)
 
 
 def calculate_rebounds_defensive_features(team_id: int, season: str,
@@ -687,62 +518,7 @@ def calculate_rebounds_defensive_features(team_id: int, season: str,
     Returns:
         Dict with 5 defensive rebounds features + metadata
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-
-    if window == 'season':
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as games_count,
-                AVG(opp_offensive_rebounds) as avg_opp_oreb,
-                AVG(opp_defensive_rebounds) as avg_opp_dreb,
-                AVG(offensive_rebounds) as avg_oreb,
-                AVG(defensive_rebounds) as avg_dreb,
-                AVG(opp_second_chance_points) as avg_opp_second_chance
-            FROM team_game_logs
-            WHERE team_id = ?
-            AND season = ?
-            {GAME_FILTER}
-        ''', (team_id, season))
-    else:  # last_10
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as games_count,
-                AVG(opp_offensive_rebounds) as avg_opp_oreb,
-                AVG(opp_defensive_rebounds) as avg_opp_dreb,
-                AVG(offensive_rebounds) as avg_oreb,
-                AVG(defensive_rebounds) as avg_dreb,
-                AVG(opp_second_chance_points) as avg_opp_second_chance
-            FROM (
-                SELECT *
-                FROM team_game_logs
-                WHERE team_id = ?
-                AND season = ?
-                {GAME_FILTER}
-                ORDER BY game_date DESC
-                LIMIT 10
-            )
-        ''', (team_id, season))
-
-    row = cursor.fetchone()
-    conn.close()
-
-    if not row or row['games_count'] == 0:
-        logger.warning(f"No game data found for team {team_id}, {window}")
-        return None
-
-    features = {
-        'opp_offensive_rebounds': row['avg_opp_oreb'] or 0.0,
-        'opp_defensive_rebounds': row['avg_opp_dreb'] or 0.0,
-        'opp_oreb_rate': _safe_divide(row['avg_opp_oreb'], (row['avg_opp_oreb'] or 0.0) + (row['avg_dreb'] or 0.0)) * 100,
-        'opp_dreb_rate': _safe_divide(row['avg_opp_dreb'], (row['avg_opp_dreb'] or 0.0) + (row['avg_oreb'] or 0.0)) * 100,
-        'opp_second_chance_points': row['avg_opp_second_chance'] or 0.0,
-        'games_count': row['games_count'],
-        'window': window
-    }
-
-    logger.debug(f"Rebounds defensive features for team {team_id} ({window}): {features}")
-    return features
+    return _team_window_features('rebounds_defensive', team_id, season, window)
 
 
 def calculate_threes_features(team_id: int, season: str,
@@ -765,56 +541,7 @@ def calculate_threes_features(team_id: int, season: str,
             'window': str
         }
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-
-    if window == 'season':
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as games_count,
-                AVG(fg3a) as avg_fg3a,
-                AVG(fg3m) as avg_fg3m,
-                AVG(fga) as avg_fga
-            FROM team_game_logs
-            WHERE team_id = ?
-            AND season = ?
-            {GAME_FILTER}
-        ''', (team_id, season))
-    else:  # last_10
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as games_count,
-                AVG(fg3a) as avg_fg3a,
-                AVG(fg3m) as avg_fg3m,
-                AVG(fga) as avg_fga
-            FROM (
-                SELECT *
-                FROM team_game_logs
-                WHERE team_id = ?
-                AND season = ?
-                {GAME_FILTER}
-                ORDER BY game_date DESC
-                LIMIT 10
-            )
-        ''', (team_id, season))
-
-    row = cursor.fetchone()
-    conn.close()
-
-    if not row or row['games_count'] == 0:
-        logger.warning(f"No game data found for team {team_id}, {window}")
-        return None
-
-    features = {
-        'fg3a': row['avg_fg3a'] or 0.0,
-        'fg3_pct': _safe_divide(row['avg_fg3m'], row['avg_fg3a']),
-        'three_pa_rate': _safe_divide(row['avg_fg3a'], row['avg_fga']),
-        'games_count': row['games_count'],
-        'window': window
-    }
-
-    logger.debug(f"Threes features for team {team_id} ({window}): {features}")
-    return features
+    return _team_window_features('threes_offensive', team_id, season, window)
 
 
 def calculate_threes_defensive_features(team_id: int, season: str,
@@ -830,56 +557,7 @@ def calculate_threes_defensive_features(team_id: int, season: str,
     Returns:
         Dict with 3 defensive threes features + metadata
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-
-    if window == 'season':
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as games_count,
-                AVG(opp_fg3a) as avg_opp_fg3a,
-                AVG(opp_fg3m) as avg_opp_fg3m,
-                AVG(opp_fga) as avg_opp_fga
-            FROM team_game_logs
-            WHERE team_id = ?
-            AND season = ?
-            {GAME_FILTER}
-        ''', (team_id, season))
-    else:  # last_10
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as games_count,
-                AVG(opp_fg3a) as avg_opp_fg3a,
-                AVG(opp_fg3m) as avg_opp_fg3m,
-                AVG(opp_fga) as avg_opp_fga
-            FROM (
-                SELECT *
-                FROM team_game_logs
-                WHERE team_id = ?
-                AND season = ?
-                {GAME_FILTER}
-                ORDER BY game_date DESC
-                LIMIT 10
-            )
-        ''', (team_id, season))
-
-    row = cursor.fetchone()
-    conn.close()
-
-    if not row or row['games_count'] == 0:
-        logger.warning(f"No game data found for team {team_id}, {window}")
-        return None
-
-    features = {
-        'opp_fg3a': row['avg_opp_fg3a'] or 0.0,
-        'opp_fg3_pct': _safe_divide(row['avg_opp_fg3m'], row['avg_opp_fg3a']),
-        'opp_three_pa_rate': _safe_divide(row['avg_opp_fg3a'], row['avg_opp_fga']),
-        'games_count': row['games_count'],
-        'window': window
-    }
-
-    logger.debug(f"Threes defensive features for team {team_id} ({window}): {features}")
-    return features
+    return _team_window_features('threes_defensive', team_id, season, window)
 
 
 def calculate_turnovers_features(team_id: int, season: str,
@@ -902,56 +580,7 @@ def calculate_turnovers_features(team_id: int, season: str,
             'window': str
         }
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-
-    if window == 'season':
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as games_count,
-                AVG(turnovers) as avg_turnovers,
-                AVG(possessions) as avg_possessions,
-                AVG(steals) as avg_steals
-            FROM team_game_logs
-            WHERE team_id = ?
-            AND season = ?
-            {GAME_FILTER}
-        ''', (team_id, season))
-    else:  # last_10
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as games_count,
-                AVG(turnovers) as avg_turnovers,
-                AVG(possessions) as avg_possessions,
-                AVG(steals) as avg_steals
-            FROM (
-                SELECT *
-                FROM team_game_logs
-                WHERE team_id = ?
-                AND season = ?
-                {GAME_FILTER}
-                ORDER BY game_date DESC
-                LIMIT 10
-            )
-        ''', (team_id, season))
-
-    row = cursor.fetchone()
-    conn.close()
-
-    if not row or row['games_count'] == 0:
-        logger.warning(f"No game data found for team {team_id}, {window}")
-        return None
-
-    features = {
-        'turnovers': row['avg_turnovers'] or 0.0,
-        'turnover_rate': _safe_divide(row['avg_turnovers'], row['avg_possessions']),
-        'steals': row['avg_steals'] or 0.0,
-        'games_count': row['games_count'],
-        'window': window
-    }
-
-    logger.debug(f"Turnovers features for team {team_id} ({window}): {features}")
-    return features
+    return _team_window_features('turnovers_offensive', team_id, season, window)
 
 
 def calculate_turnovers_defensive_features(team_id: int, season: str,
@@ -967,53 +596,4 @@ def calculate_turnovers_defensive_features(team_id: int, season: str,
     Returns:
         Dict with 3 defensive turnovers features + metadata
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-
-    if window == 'season':
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as games_count,
-                AVG(opp_turnovers) as avg_opp_turnovers,
-                AVG(opp_possessions) as avg_opp_possessions,
-                AVG(opp_steals) as avg_opp_steals
-            FROM team_game_logs
-            WHERE team_id = ?
-            AND season = ?
-            {GAME_FILTER}
-        ''', (team_id, season))
-    else:  # last_10
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as games_count,
-                AVG(opp_turnovers) as avg_opp_turnovers,
-                AVG(opp_possessions) as avg_opp_possessions,
-                AVG(opp_steals) as avg_opp_steals
-            FROM (
-                SELECT *
-                FROM team_game_logs
-                WHERE team_id = ?
-                AND season = ?
-                {GAME_FILTER}
-                ORDER BY game_date DESC
-                LIMIT 10
-            )
-        ''', (team_id, season))
-
-    row = cursor.fetchone()
-    conn.close()
-
-    if not row or row['games_count'] == 0:
-        logger.warning(f"No game data found for team {team_id}, {window}")
-        return None
-
-    features = {
-        'opp_turnovers': row['avg_opp_turnovers'] or 0.0,
-        'opp_turnover_rate': _safe_divide(row['avg_opp_turnovers'], row['avg_opp_possessions']),
-        'opp_steals': row['avg_opp_steals'] or 0.0,
-        'games_count': row['games_count'],
-        'window': window
-    }
-
-    logger.debug(f"Turnovers defensive features for team {team_id} ({window}): {features}")
-    return features
+    return _team_window_features('turnovers_defensive', team_id, season, window)
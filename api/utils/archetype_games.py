@@ -7,6 +7,7 @@ Fetches games where a team played with a specific archetype (season or last10)
 import sqlite3
 from typing import Dict, List, Optional
 from .db_queries import _get_db_connection
+from .opponent_rank_snapshots import has_rank_snapshots
 
 
 def get_team_archetype_games(
@@ -37,62 +38,57 @@ def get_team_archetype_games(
 
     team_abbr = team_result[0]
 
-    # Query game logs for this team
-    if window == 'season':
-        # Get all games for the season
-        query = """
-            SELECT
-                game_id,
-                game_date,
-                matchup,
-                win_loss as wl,
-                team_pts,
-                opp_pts,
-                fgm, fga, fg3m, fg3a,
-                ftm, fta,
-                rebounds as reb,
-                assists as ast,
-                turnovers as tov,
-                pace,
-                opponent_abbr as opp_abbr,
-                points_in_paint as pitp
-            FROM team_game_logs
-            WHERE team_id IN (SELECT team_id FROM nba_teams WHERE team_abbreviation = ? LIMIT 1)
-            AND season = ?
-            ORDER BY game_date DESC
-            LIMIT 82
+    # Opponent ranks going into each game; season-to-date until snapshots are built
+    if has_rank_snapshots(cursor, season):
+        rank_join = """
+            LEFT JOIN opponent_rank_snapshots off_rank
+                ON off_rank.team_id = tgl.opponent_team_id AND off_rank.season = tgl.season
+                AND off_rank.game_date = tgl.game_date AND off_rank.metric = 'off_rtg'
+            LEFT JOIN opponent_rank_snapshots def_rank
+                ON def_rank.team_id = tgl.opponent_team_id AND def_rank.season = tgl.season
+                AND def_rank.game_date = tgl.game_date AND def_rank.metric = 'def_rtg'
         """
-        cursor.execute(query, (team_abbr, season))
-    else:  # last10
-        # Get most recent 10 games
-        query = """
-            SELECT
-                game_id,
-                game_date,
-                matchup,
-                win_loss as wl,
-                team_pts,
-                opp_pts,
-                fgm, fga, fg3m, fg3a,
-                ftm, fta,
-                rebounds as reb,
-                assists as ast,
-                turnovers as tov,
-                pace,
-                opponent_abbr as opp_abbr,
-                points_in_paint as pitp
-            FROM team_game_logs
-            WHERE team_id IN (SELECT team_id FROM nba_teams WHERE team_abbreviation = ? LIMIT 1)
-            AND season = ?
-            ORDER BY game_date DESC
-            LIMIT 10
+        rank_columns = "off_rank.rank, def_rank.rank"
+    else:
+        rank_join = """
+            LEFT JOIN team_season_stats tss_opp
+                ON tss_opp.team_id = tgl.opponent_team_id AND tss_opp.season = tgl.season
+                AND tss_opp.split_type = 'overall'
         """
-        cursor.execute(query, (team_abbr, season))
+        rank_columns = "tss_opp.off_rtg_rank, tss_opp.def_rtg_rank"
+
+    # Query game logs for this team: all games for 'season', the most recent 10 for 'last10'
+    query = f"""
+        SELECT
+            tgl.game_id,
+            tgl.game_date,
+            tgl.matchup,
+            tgl.win_loss as wl,
+            tgl.team_pts,
+            tgl.opp_pts,
+            tgl.fgm, tgl.fga, tgl.fg3m, tgl.fg3a,
+            tgl.ftm, tgl.fta,
+            tgl.rebounds as reb,
+            tgl.assists as ast,
+            tgl.turnovers as tov,
+            tgl.pace,
+            tgl.opponent_abbr as opp_abbr,
+            tgl.points_in_paint as pitp,
+            {rank_columns}
+        FROM team_game_logs tgl
+        {rank_join}
+        WHERE tgl.team_id IN (SELECT team_id FROM nba_teams WHERE team_abbreviation = ? LIMIT 1)
+        AND tgl.season = ?
+        ORDER BY tgl.game_date DESC
+        LIMIT ?
+    """
+    cursor.execute(query, (team_abbr, season, 82 if window == 'season' else 10))
 
     games = []
     for row in cursor.fetchall():
         game_id, game_date, matchup, wl, team_pts, opp_pts, \
-        fgm, fga, fg3m, fg3a, ftm, fta, reb, ast, tov, pace, opp_abbr, pitp = row
+        fgm, fga, fg3m, fg3a, ftm, fta, reb, ast, tov, pace, opp_abbr, pitp, \
+        opp_off_rank, opp_def_rank = row
 
         # Calculate eFG%
         efg_pct = ((fgm + 0.5 * fg3m) / fga * 100) if fga > 0 else 0
@@ -104,8 +100,8 @@ def get_team_archetype_games(
         ft_points = ftm or 0
         paint_points = pitp or 0
 
-        # Get opponent ranks (if available)
-        opponent_data = get_opponent_ranks(cursor, opp_abbr, season)
+        # Opponent ranks (if available)
+        opponent_data = get_opponent_ranks(opp_abbr, opp_off_rank, opp_def_rank)
 
         games.append({
             'game_id': game_id,
@@ -144,24 +140,11 @@ def get_team_archetype_games(
     return games
 
 
-def get_opponent_ranks(cursor, opp_abbr: str, season: str) -> Dict:
+def get_opponent_ranks(opp_abbr: str, off_rank: Optional[int], def_rank: Optional[int]) -> Dict:
     """
-    Get opponent's offensive and defensive ranks.
+    Describe an opponent by its offensive and defensive ranks going into a game.
     """
-    query = """
-        SELECT
-            tss.off_rtg_rank,
-            tss.def_rtg_rank
-        FROM team_season_stats tss
-        JOIN nba_teams nt ON tss.team_id = nt.team_id
-        WHERE nt.team_abbreviation = ?
-        AND tss.season = ?
-        AND tss.split_type = 'overall'
-    """
-    cursor.execute(query, (opp_abbr, season))
-    result = cursor.fetchone()
-
-    if not result:
+    if off_rank is None and def_rank is None:
         return {
             'tricode': opp_abbr,
             'off_rtg_rank': None,
@@ -169,8 +152,6 @@ def get_opponent_ranks(cursor, opp_abbr: str, season: str) -> Dict:
             'strength': 'unknown'
         }
 
-    off_rank, def_rank = result
-
     # Determine strength tier based on defensive rank
     if def_rank and def_rank <= 10:
         strength = 'top'
@@ -7,7 +7,7 @@ Fetches games where a team played AGAINST opponents with a specific archetype.
 import sqlite3
 from typing import Dict, List, Optional
 from .db_queries import _get_db_connection
-from .archetype_classifier import assign_all_team_archetypes
+from .archetype_classifier import load_team_archetypes
 
 
 def get_team_vs_archetype_games(
@@ -67,7 +67,7 @@ def get_team_vs_archetype_games(
     team_abbr = team_result[0]
 
     # Get all team archetypes for the season
-    all_archetypes = assign_all_team_archetypes(season)
+    all_archetypes = load_team_archetypes(season)
 
     # Build opponent archetype lookup map
     # opponent_archetypes[opponent_team_id] = archetype_id
@@ -22,18 +22,18 @@ logger = logging.getLogger(__name__)
 # Import centralized database configuration
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
 
 # Database path
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
 
 
 def get_ball_movement_defense_tier(opp_assists_rank: Optional[int]) -> Optional[str]:
@@ -22,18 +22,20 @@ logger = logging.getLogger(__name__)
 # Import centralized database configuration
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
+    from api.utils.game_log_store import average, get_game_log_store
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
+    from game_log_store import average, get_game_log_store
 
 # Database path
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
 
 
 def get_pace_tier(pace: float) -> Optional[str]:
@@ -139,99 +141,54 @@ def get_team_assists_vs_pace(team_id: int, season: str = '2025-26') -> Optional[
             'overall_avg_assists': team_row['season_avg_ast'] or 0
         }
 
-        # Step 2: Get all games with pace data (ordered by date DESC for last10)
+        # Step 2: Get all games with pace data (most recent first, for last10)
         # FILTER: Only Regular Season + NBA Cup (exclude Summer League, preseason, etc.)
-        cursor.execute('''
-            SELECT
-                game_date,
-                is_home,
-                assists as team_assists,
-                opp_assists,
-                pace
-            FROM team_game_logs
-            WHERE team_id = ?
-                AND season = ?
-                AND assists IS NOT NULL
-                AND opp_assists IS NOT NULL
-                AND pace IS NOT NULL
-                AND pace > 0
-                AND game_type IN ('Regular Season', 'NBA Cup')
-            ORDER BY game_date DESC
-        ''', (team_id, season))
-
-        games = cursor.fetchall()
-
-        # Step 2.5: Calculate season and last10 home/away splits for assists
-        all_asts = [g['team_assists'] for g in games if g['team_assists'] is not None]
-        last10_asts = [g['team_assists'] for g in games[:10] if g['team_assists'] is not None]
-
-        home_asts = [g['team_assists'] for g in games if g['team_assists'] is not None and g['is_home'] == 1]
-        away_asts = [g['team_assists'] for g in games if g['team_assists'] is not None and g['is_home'] == 0]
-        last10_home_asts = [g['team_assists'] for g in games[:10] if g['team_assists'] is not None and g['is_home'] == 1]
-        last10_away_asts = [g['team_assists'] for g in games[:10] if g['team_assists'] is not None and g['is_home'] == 0]
-
-        # Update season_avg_ast from actual game logs (more accurate than team_season_stats)
-        team_info['season_avg_ast'] = round(sum(all_asts) / len(all_asts), 1) if all_asts else 0
-        team_info['last10_avg_ast'] = round(sum(last10_asts) / len(last10_asts), 1) if last10_asts else 0
+        store = get_game_log_store(season)
+        games = store.team_rows(team_id, eligible_only=True,
+                                require=('assists', 'opp_assists'), positive=('pace',))
+        last10 = store.last_n(games, 10)
+        home, away = store.at_home(games), store.at_home(games, home=False)
+        last10_home, last10_away = store.at_home(last10), store.at_home(last10, home=False)
+
+        # Step 2.5: Season and last10 home/away splits for assists
+        # (season_avg_ast from game logs is more accurate than team_season_stats)
+        team_info['season_avg_ast'] = average(store.values('assists', games))
+        team_info['last10_avg_ast'] = average(store.values('assists', last10))
 
         # Home/Away splits
-        team_info['season_avg_ast_home'] = round(sum(home_asts) / len(home_asts), 1) if home_asts else 0
-        team_info['season_avg_ast_away'] = round(sum(away_asts) / len(away_asts), 1) if away_asts else 0
-        team_info['last10_avg_ast_home'] = round(sum(last10_home_asts) / len(last10_home_asts), 1) if last10_home_asts else 0
-        team_info['last10_avg_ast_away'] = round(sum(last10_away_asts) / len(last10_away_asts), 1) if last10_away_asts else 0
+        team_info['season_avg_ast_home'] = average(store.values('assists', home))
+        team_info['season_avg_ast_away'] = average(store.values('assists', away))
+        team_info['last10_avg_ast_home'] = average(store.values('assists', last10_home))
+        team_info['last10_avg_ast_away'] = average(store.values('assists', last10_away))
 
         # Update field aliases
         team_info['overall_avg_assists'] = team_info['season_avg_ast']
 
         # DEFENSIVE: Opponent assists (assists allowed)
-        all_opp_asts = [g['opp_assists'] for g in games if g['opp_assists'] is not None]
-        last10_opp_asts = [g['opp_assists'] for g in games[:10] if g['opp_assists'] is not None]
-
-        home_opp_asts = [g['opp_assists'] for g in games if g['opp_assists'] is not None and g['is_home'] == 1]
-        away_opp_asts = [g['opp_assists'] for g in games if g['opp_assists'] is not None and g['is_home'] == 0]
-        last10_home_opp_asts = [g['opp_assists'] for g in games[:10] if g['opp_assists'] is not None and g['is_home'] == 1]
-        last10_away_opp_asts = [g['opp_assists'] for g in games[:10] if g['opp_assists'] is not None and g['is_home'] == 0]
-
-        team_info['season_avg_opp_ast'] = round(sum(all_opp_asts) / len(all_opp_asts), 1) if all_opp_asts else 0
-        team_info['last10_avg_opp_ast'] = round(sum(last10_opp_asts) / len(last10_opp_asts), 1) if last10_opp_asts else 0
+        team_info['season_avg_opp_ast'] = average(store.values('opp_assists', games))
+        team_info['last10_avg_opp_ast'] = average(store.values('opp_assists', last10))
 
         # Home/Away splits for defensive
-        team_info['season_avg_opp_ast_home'] = round(sum(home_opp_asts) / len(home_opp_asts), 1) if home_opp_asts else 0
-        team_info['season_avg_opp_ast_away'] = round(sum(away_opp_asts) / len(away_opp_asts), 1) if away_opp_asts else 0
-        team_info['last10_avg_opp_ast_home'] = round(sum(last10_home_opp_asts) / len(last10_home_opp_asts), 1) if last10_home_opp_asts else 0
-        team_info['last10_avg_opp_ast_away'] = round(sum(last10_away_opp_asts) / len(last10_away_opp_asts), 1) if last10_away_opp_asts else 0
+        team_info['season_avg_opp_ast_home'] = average(store.values('opp_assists', home))
+        team_info['season_avg_opp_ast_away'] = average(store.values('opp_assists', away))
+        team_info['last10_avg_opp_ast_home'] = average(store.values('opp_assists', last10_home))
+        team_info['last10_avg_opp_ast_away'] = average(store.values('opp_assists', last10_away))
 
         # Defensive field aliases
         team_info['overall_avg_opp_assists'] = team_info['season_avg_opp_ast']
 
-        # Step 3: Group games by pace tier and location
-        splits = {
-            'slow': {'home_ast': [], 'away_ast': []},
-            'normal': {'home_ast': [], 'away_ast': []},
-            'fast': {'home_ast': [], 'away_ast': []}
-        }
-
-        for game in games:
-            pace = game['pace']
-            pace_tier = get_pace_tier(pace)
-
-            if not pace_tier:
-                continue
-
-            location_key = 'home_ast' if game['is_home'] else 'away_ast'
-            splits[pace_tier][location_key].append(game['team_assists'])
-
-        # Step 4: Calculate averages and game counts
+        # Step 3: Averages and game counts per pace tier and location
         result_splits = {}
         for tier in get_all_pace_tiers():
-            home_asts = splits[tier]['home_ast']
-            away_asts = splits[tier]['away_ast']
+            tier_games = store.in_pace_bucket(games, tier)
+            home_games = store.at_home(tier_games)
+            away_games = store.at_home(tier_games, home=False)
 
             result_splits[tier] = {
-                'home_ast': round(sum(home_asts) / len(home_asts), 1) if home_asts else None,
-                'home_games': len(home_asts),
-                'away_ast': round(sum(away_asts) / len(away_asts), 1) if away_asts else None,
-                'away_games': len(away_asts)
+                'home_ast': average(store.values('assists', home_games), default=None),
+                'home_games': len(home_games),
+                'away_ast': average(store.values('assists', away_games), default=None),
+                'away_games': len(away_games)
             }
 
         team_info['splits'] = result_splits
@@ -14,6 +14,9 @@ Profiles include:
 import sqlite3
 from typing import Dict, Optional, Any
 
+from api.utils.prediction_context import scoped_cache
+from api.utils.connection_pool import get_shared_connection
+
 DB_PATH = 'api/data/nba_data.db'
 
 
@@ -69,6 +72,7 @@ class BackToBackProfile:
                 f"small_sample={self.small_sample})")
 
 
+@scoped_cache
 def get_back_to_back_profile(team_id: int, season: str = '2025-26') -> BackToBackProfile:
     """
     Compute back-to-back performance profile for a specific team.
@@ -80,7 +84,7 @@ def get_back_to_back_profile(team_id: int, season: str = '2025-26') -> BackToBac
     Returns:
         BackToBackProfile with B2B stats and deltas
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_shared_connection(DB_PATH, readonly=True, row_factory=None)
     cursor = conn.cursor()
 
     profile = BackToBackProfile(team_id)
@@ -156,7 +160,7 @@ def is_team_on_back_to_back(team_id: int, game_id: str) -> bool:
     Returns:
         True if team is on second night of B2B, False otherwise
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_shared_connection(DB_PATH, readonly=True, row_factory=None)
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -185,7 +189,7 @@ def get_team_rest_days(team_id: int, game_id: str) -> Optional[int]:
     Returns:
         Number of rest days, or None if first game of season
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_shared_connection(DB_PATH, readonly=True, row_factory=None)
     cursor = conn.cursor()
 
     cursor.execute("""
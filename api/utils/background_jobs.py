@@ -0,0 +1,355 @@
+"""
+Background Jobs for Long-Running I/O
+
+Screenshot reviews (OpenAI Vision + Model Coach) and data syncs (nba_api)
+take from several seconds to several minutes. Running them inside a request
+held a gunicorn worker for the whole time; they now run on a small thread
+pool in the process that accepted the request, and the request returns a
+job ID straight away.
+
+Job records live in jobs.db (under DB_PATH), so a status poll answered by
+any worker process sees jobs started by another. A job whose process exits
+before it finishes (worker restart, deploy) is reported as failed. jobs.db
+outlives the container, and a restarted container hands its workers the
+same small PIDs, so each job records its process's identity (PID plus the
+process start time) rather than the PID alone. An active job older than
+JOB_MAX_RUNTIME_SECONDS is failed as expired.
+
+    status: queued -> running -> succeeded | failed
+
+Usage:
+    from api.utils.background_jobs import submit_job, get_job
+
+    job_id = submit_job('screenshot_review', run_review, game_id, path,
+                        params={'game_id': game_id})
+    return jsonify({'success': True, 'job_id': job_id}), 202
+
+    job = get_job(job_id)   # {'status': 'succeeded', 'result': {...}, ...}
+
+Identical work is coalesced with a dedupe_key: while a job of the same kind
+and key is queued or running (in any process), submit_job() returns its ID
+instead of starting another. Jobs run on named thread pools, so slow
+OpenAI work (pool='openai') is capped separately from syncs and reviews.
+
+Job functions run outside the Flask request context: pass them everything
+they need, and return something JSON-serializable (stored as the result).
+An exception is stored as the job's error; one with a `code` attribute
+(e.g. OpenAIKeyMissingError) also sets error_code.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection, reset_shared_connections
+except ImportError:
+    from db_config import get_db_path
+    from connection_pool import get_shared_connection, reset_shared_connections
+
+JOBS_DB_PATH = get_db_path('jobs.db')
+
+# Jobs run concurrently per worker process; the rest wait in the queue
+JOB_WORKERS = int(os.environ.get('BACKGROUND_JOB_WORKERS', '2'))
+
+# Thread pools by name -> threads per worker process
+JOB_POOLS = {
+    'default': JOB_WORKERS,
+    # Concurrent OpenAI generations (matchup summaries, writeups)
+    'openai': int(os.environ.get('OPENAI_JOB_CONCURRENCY', '2')),
+}
+
+# Finished jobs are kept this long for status polls
+JOB_RETENTION_SECONDS = int(os.environ.get('BACKGROUND_JOB_RETENTION', str(24 * 3600)))
+
+# Queued/running jobs older than this are failed as expired
+JOB_MAX_RUNTIME_SECONDS = int(os.environ.get('BACKGROUND_JOB_MAX_RUNTIME', '3600'))
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_executor_pid: Optional[int] = None
+_executor_lock = threading.Lock()
+_schema_ready = set()
+_identity: Optional[tuple] = None  # (pid, identity) of this process
+
+
+def _get_executor(pool: str = 'default') -> ThreadPoolExecutor:
+    """This process's thread pool for a JOB_POOLS name (a forked child gets its own)"""
+    global _executor_pid
+    with _executor_lock:
+        if _executor_pid != os.getpid():
+            _executors.clear()
+            _executor_pid = os.getpid()
+        if pool not in _executors:
+            _executors[pool] = ThreadPoolExecutor(max_workers=JOB_POOLS[pool],
+                                                  thread_name_prefix=f'background-job-{pool}')
+        return _executors[pool]
+
+
+def _get_db_connection() -> sqlite3.Connection:
+    """Get this thread's shared connection to jobs.db (close() releases it)"""
+    conn = get_shared_connection(JOBS_DB_PATH)
+    if JOBS_DB_PATH not in _schema_ready:
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS background_jobs (
+                job_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                dedupe_key TEXT,
+                params TEXT,
+                result TEXT,
+                error TEXT,
+                error_code TEXT,
+                worker_pid INTEGER,
+                worker_identity TEXT,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                finished_at TEXT,
+                duration_ms REAL
+            )
+        ''')
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(background_jobs)')}
+        if 'dedupe_key' not in columns:
+            conn.execute('ALTER TABLE background_jobs ADD COLUMN dedupe_key TEXT')
+        if 'worker_identity' not in columns:
+            conn.execute('ALTER TABLE background_jobs ADD COLUMN worker_identity TEXT')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_background_jobs_created ON background_jobs(created_at)')
+        # At most one active job per (kind, dedupe_key), across processes
+        conn.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_background_jobs_active_key
+            ON background_jobs(kind, dedupe_key)
+            WHERE dedupe_key IS NOT NULL AND status IN ('queued', 'running')
+        ''')
+        conn.commit()
+        _schema_ready.add(JOBS_DB_PATH)
+    return conn
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _update_job(job_id: str, **fields):
+    conn = _get_db_connection()
+    try:
+        assignments = ', '.join(f'{name} = ?' for name in fields)
+        conn.execute(f'UPDATE background_jobs SET {assignments} WHERE job_id = ?',
+                     (*fields.values(), job_id))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _run_job(job_id: str, kind: str, fn: Callable, args: tuple, kwargs: dict):
+    """Executor entry point: run fn and record the outcome"""
+    start = time.perf_counter()
+    _update_job(job_id, status='running', started_at=_now())
+    print(f'[background_jobs] Started {kind} job {job_id}')
+    try:
+        result = fn(*args, **kwargs)
+        _update_job(job_id, status='succeeded', result=json.dumps(result, default=str),
+                    finished_at=_now(), duration_ms=round((time.perf_counter() - start) * 1000, 1))
+        print(f'[background_jobs] {kind} job {job_id} succeeded in {time.perf_counter() - start:.1f}s')
+    except Exception as e:
+        traceback.print_exc()
+        _update_job(job_id, status='failed', error=str(e), error_code=getattr(e, 'code', None),
+                    finished_at=_now(), duration_ms=round((time.perf_counter() - start) * 1000, 1))
+        print(f'[background_jobs] {kind} job {job_id} failed: {e}')
+    finally:
+        # Job threads are long-lived; don't hold connections between jobs
+        reset_shared_connections()
+
+
+def submit_job(kind: str, fn: Callable, *args, params: Optional[Dict] = None,
+               dedupe_key: Optional[str] = None, pool: str = 'default', **kwargs) -> str:
+    """
+    Queue fn(*args, **kwargs) on one of this process's job pools.
+
+    Args:
+        kind: Job type, for listing and logs (e.g. 'screenshot_review', 'sync')
+        fn: Function to run; its return value is stored as the job result
+        params: JSON-serializable description shown in status responses
+        dedupe_key: Coalesce with an active job of the same kind and key
+        pool: JOB_POOLS name to run on
+
+    Returns:
+        job_id (of the existing job when coalesced)
+    """
+    for _ in range(3):
+        if dedupe_key is not None:
+            active = latest_job(kind, dedupe_key)
+            if active is not None and active['status'] in ACTIVE_STATUSES:
+                print(f'[background_jobs] Coalesced {kind} job for {dedupe_key} into {active["job_id"]}')
+                return active['job_id']
+
+        job_id = str(uuid.uuid4())
+        conn = _get_db_connection()
+        try:
+            conn.execute('''
+                INSERT INTO background_jobs
+                    (job_id, kind, status, dedupe_key, params, worker_pid, worker_identity, created_at)
+                VALUES (?, ?, 'queued', ?, ?, ?, ?, ?)
+            ''', (job_id, kind, dedupe_key, json.dumps(params or {}, default=str),
+                  os.getpid(), _current_identity(), _now()))
+            conn.commit()
+        except sqlite3.IntegrityError:
+            # Another request queued the same work between our check and insert
+            conn.rollback()
+            continue
+        finally:
+            conn.close()
+
+        _get_executor(pool).submit(_run_job, job_id, kind, fn, args, kwargs)
+        print(f'[background_jobs] Queued {kind} job {job_id}')
+        purge_finished_jobs()
+        return job_id
+
+    raise RuntimeError(f'Could not queue {kind} job for {dedupe_key}')
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _process_identity(pid: int) -> Optional[str]:
+    """
+    '<pid>:<start time>' for a running process, or None if it is not running
+    or /proc is unavailable (the start time tells a reused PID apart)
+    """
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # Fields after the parenthesized command name; starttime is field 22
+    return f'{pid}:{stat.rsplit(")", 1)[1].split()[19]}'
+
+
+def _current_identity() -> Optional[str]:
+    """This process's identity (a forked child computes its own)"""
+    global _identity
+    pid = os.getpid()
+    if _identity is None or _identity[0] != pid:
+        _identity = (pid, _process_identity(pid))
+    return _identity[1]
+
+
+def _orphaned(job: Dict[str, Any]) -> Optional[tuple]:
+    """(error, error_code) if an active job can no longer finish, else None"""
+    pid = job['worker_pid']
+    if pid:
+        if job['worker_identity'] and _process_identity(pid) != job['worker_identity']:
+            # Dead, or the PID now belongs to another process (e.g. after a restart)
+            return 'Worker process exited before the job finished', 'WORKER_EXITED'
+        if not job['worker_identity'] and not _process_alive(pid):
+            return 'Worker process exited before the job finished', 'WORKER_EXITED'
+
+    created = datetime.fromisoformat(job['created_at'])
+    if (datetime.now(timezone.utc) - created).total_seconds() > JOB_MAX_RUNTIME_SECONDS:
+        return f'Job did not finish within {JOB_MAX_RUNTIME_SECONDS}s', 'JOB_EXPIRED'
+    return None
+
+
+def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+    job = dict(row)
+    job['params'] = json.loads(job['params']) if job['params'] else {}
+    job['result'] = json.loads(job['result']) if job['result'] else None
+    return job
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Current state of a job (from any worker process).
+
+    Returns:
+        Job dict (status, params, result, error, error_code, timestamps), or None
+    """
+    conn = _get_db_connection()
+    try:
+        row = conn.execute('SELECT * FROM background_jobs WHERE job_id = ?', (job_id,)).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return None
+
+    job = _row_to_job(row)
+    orphaned = _orphaned(job) if job['status'] in ACTIVE_STATUSES else None
+    if orphaned is not None:
+        job.update(status='failed', error=orphaned[0], error_code=orphaned[1], finished_at=_now())
+        _update_job(job_id, status=job['status'], error=job['error'],
+                    error_code=job['error_code'], finished_at=job['finished_at'])
+    return job
+
+
+def latest_job(kind: str, dedupe_key: str) -> Optional[Dict[str, Any]]:
+    """Most recent job of a kind for a dedupe key (active or finished), or None"""
+    conn = _get_db_connection()
+    try:
+        row = conn.execute('''
+            SELECT job_id FROM background_jobs
+            WHERE kind = ? AND dedupe_key = ?
+            ORDER BY created_at DESC LIMIT 1
+        ''', (kind, dedupe_key)).fetchone()
+    finally:
+        conn.close()
+    # get_job() fails jobs orphaned by a dead process or expired, releasing the key
+    return get_job(row['job_id']) if row else None
+
+
+def list_jobs(kind: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+    """Most recent jobs, newest first (optionally of one kind)"""
+    conn = _get_db_connection()
+    try:
+        if kind:
+            rows = conn.execute('''
+                SELECT * FROM background_jobs WHERE kind = ?
+                ORDER BY created_at DESC LIMIT ?
+            ''', (kind, limit)).fetchall()
+        else:
+            rows = conn.execute('''
+                SELECT * FROM background_jobs ORDER BY created_at DESC LIMIT ?
+            ''', (limit,)).fetchall()
+    finally:
+        conn.close()
+    return [_row_to_job(row) for row in rows]
+
+
+def wait_for_job(job_id: str, timeout: float, poll_interval: float = 0.25) -> Optional[Dict[str, Any]]:
+    """Poll until a job finishes or timeout seconds pass; returns its last state"""
+    deadline = time.monotonic() + timeout
+    while True:
+        job = get_job(job_id)
+        if job is None or job['status'] not in ACTIVE_STATUSES or time.monotonic() >= deadline:
+            return job
+        time.sleep(poll_interval)
+
+
+def purge_finished_jobs(max_age_seconds: int = JOB_RETENTION_SECONDS) -> int:
+    """Delete finished jobs older than max_age_seconds; returns rows deleted"""
+    cutoff = datetime.fromtimestamp(time.time() - max_age_seconds, timezone.utc).isoformat()
+    conn = _get_db_connection()
+    try:
+        cursor = conn.execute('''
+            DELETE FROM background_jobs
+            WHERE status NOT IN ('queued', 'running') AND created_at < ?
+        ''', (cutoff,))
+        conn.commit()
+        return cursor.rowcount
+    finally:
+        conn.close()
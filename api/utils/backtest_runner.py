@@ -0,0 +1,461 @@
+"""
+Multi-Engine Backtest Runner
+
+Replays total engines over a date range in a process pool and stores each
+per-game prediction in backtest_results (nba_data.db). Rows are keyed by
+engine, engine version and a hash of the engine's source code (the engine
+module plus every api.utils module it imports), so re-running after a tweak
+only recomputes the engines whose code changed.
+
+    engine   function                                          inputs
+    v4       prediction_engine.predict_game_total              current season
+    v5       prediction_engine_v5.predict_total_for_game_v5    as of game date
+    v5_ppp   prediction_engine_v5_ppp.predict_total_for_game_v5_ppp  as of game date
+    ratings  team_ratings_model.predict                        current ratings
+
+Engines without as-of support see games after the one being predicted;
+their rows are also keyed by the data version, so a sync invalidates them.
+
+Metrics per engine: MAE, bias (predicted - actual), over/under hit rate
+against the sportsbook_total_line stored in predictions.db, and mean
+milliseconds per game.
+
+Usage:
+    from api.utils.backtest_runner import run_backtest
+
+    metrics = run_backtest(['v5', 'v5_ppp'], '2025-26', '2025-11-01', '2026-01-03')
+"""
+
+import ast
+import contextlib
+import hashlib
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+try:
+    from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
+except ImportError:
+    from db_config import get_db_path
+    from connection_pool import get_shared_connection
+
+NBA_DATA_DB_PATH = get_db_path('nba_data.db')
+PREDICTIONS_DB_PATH = get_db_path('predictions.db')
+
+UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(os.path.dirname(UTILS_DIR), 'data', 'model.json')
+
+# Games per worker task, so point-in-time engines preload the store once per task
+CHUNK_SIZE = 25
+
+
+def _get_db_connection() -> sqlite3.Connection:
+    """Get this thread's shared connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH)
+
+
+# ============================================================================
+# ENGINES
+# ============================================================================
+
+def _team_abbreviations(season: str) -> Dict[int, str]:
+    try:
+        from api.utils.db_queries import get_all_teams
+    except ImportError:
+        from db_queries import get_all_teams
+    return {team['id']: team['abbreviation'] for team in get_all_teams(season)}
+
+
+def _predict_v4(game: Dict, season: str) -> float:
+    try:
+        from api.utils.db_queries import get_matchup_data
+        from api.utils.prediction_engine import predict_game_total
+    except ImportError:
+        from db_queries import get_matchup_data
+        from prediction_engine import predict_game_total
+
+    matchup_data = get_matchup_data(game['home_team_id'], game['away_team_id'], season)
+    if matchup_data is None:
+        raise ValueError('no matchup data')
+
+    abbreviations = _team_abbreviations(season)
+    result = predict_game_total(
+        matchup_data['home'], matchup_data['away'], None,
+        home_team_id=game['home_team_id'], away_team_id=game['away_team_id'],
+        home_team_abbr=abbreviations.get(game['home_team_id']),
+        away_team_abbr=abbreviations.get(game['away_team_id']),
+        season=season, game_id=game['game_id']
+    )
+    debug = result.get('debug') or {}
+    if debug.get('using_fallback'):
+        raise ValueError('; '.join(debug.get('fallback_reasons', [])) or 'fallback prediction')
+    return result['predicted_total']
+
+
+def _predict_v5(game: Dict, season: str) -> float:
+    try:
+        from api.utils.prediction_engine_v5 import predict_total_for_game_v5
+    except ImportError:
+        from prediction_engine_v5 import predict_total_for_game_v5
+
+    return predict_total_for_game_v5(game['home_team_id'], game['away_team_id'], season=season,
+                                     as_of_date=game['game_date'])['predicted_total']
+
+
+def _predict_v5_ppp(game: Dict, season: str) -> float:
+    try:
+        from api.utils.prediction_engine_v5_ppp import predict_total_for_game_v5_ppp
+    except ImportError:
+        from prediction_engine_v5_ppp import predict_total_for_game_v5_ppp
+
+    return predict_total_for_game_v5_ppp(game['home_team_id'], game['away_team_id'], season=season,
+                                         as_of_date=game['game_date'])['predicted_total']
+
+
+def _predict_ratings(game: Dict, season: str) -> float:
+    try:
+        from api.utils.team_ratings_model import predict
+    except ImportError:
+        from team_ratings_model import predict
+
+    abbreviations = _team_abbreviations(season)
+    return predict(abbreviations[game['home_team_id']],
+                   abbreviations[game['away_team_id']])['predicted_total']
+
+
+@dataclass(frozen=True)
+class BacktestEngine:
+    """A total engine the runner can replay"""
+    name: str
+    version: str
+    module: str                    # api.utils module whose import closure is hashed
+    predict: Callable[[Dict, str], float]
+    point_in_time: bool            # Only sees games before the one predicted
+    extra_files: Tuple[str, ...] = ()
+
+
+ENGINES = {
+    engine.name: engine for engine in (
+        BacktestEngine('v4', '4.6', 'prediction_engine', _predict_v4, point_in_time=False),
+        BacktestEngine('v5', '5.0', 'prediction_engine_v5', _predict_v5, point_in_time=True),
+        BacktestEngine('v5_ppp', '5.0-PPP', 'prediction_engine_v5_ppp', _predict_v5_ppp, point_in_time=True),
+        BacktestEngine('ratings', '4.0-deterministic', 'team_ratings_model', _predict_ratings,
+                       point_in_time=False, extra_files=(MODEL_PATH,)),
+    )
+}
+
+
+def _module_closure(module: str) -> List[str]:
+    """Source files of an api.utils module and every api.utils module it imports"""
+    seen = set()
+    pending = [module]
+    while pending:
+        name = pending.pop()
+        path = os.path.join(UTILS_DIR, f'{name}.py')
+        if name in seen or not os.path.exists(path):
+            continue
+        seen.add(name)
+
+        with open(path, encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module:
+                if node.module == 'api.utils':
+                    pending.extend(alias.name for alias in node.names)
+                else:
+                    pending.append(node.module.split('.')[-1])
+            elif isinstance(node, ast.Import):
+                pending.extend(alias.name.split('.')[-1] for alias in node.names)
+
+    return sorted(os.path.join(UTILS_DIR, f'{name}.py') for name in seen)
+
+
+def engine_code_hash(engine: BacktestEngine) -> str:
+    """Hash of every source file (and data file) that can change an engine's output"""
+    digest = hashlib.sha256()
+    for path in _module_closure(engine.module) + list(engine.extra_files):
+        digest.update(os.path.basename(path).encode())
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def _engine_data_version(engine: BacktestEngine) -> str:
+    """'' for point-in-time engines, else the sync stamp their inputs depend on"""
+    if engine.point_in_time:
+        return ''
+    try:
+        from api.utils.prediction_cache import get_data_version
+    except ImportError:
+        from prediction_cache import get_data_version
+    return get_data_version()
+
+
+# ============================================================================
+# RESULTS TABLE
+# ============================================================================
+
+def create_results_table(cursor):
+    """Create backtest_results if migration v18 has not run"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS backtest_results (
+            engine TEXT NOT NULL,
+            engine_version TEXT NOT NULL,
+            code_hash TEXT NOT NULL,
+            data_version TEXT NOT NULL,
+            game_id TEXT NOT NULL,
+            game_date TEXT NOT NULL,
+            home_team_id INTEGER NOT NULL,
+            away_team_id INTEGER NOT NULL,
+            predicted_total REAL,
+            actual_total REAL,
+            elapsed_ms REAL,
+            error TEXT,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (engine, engine_version, code_hash, data_version, game_id)
+        )
+    ''')
+
+
+def _cached_game_ids(cursor, key: Tuple[str, str, str, str]) -> set:
+    """Games already predicted successfully under an engine key"""
+    cursor.execute('''
+        SELECT game_id FROM backtest_results
+        WHERE engine = ? AND engine_version = ? AND code_hash = ? AND data_version = ?
+            AND error IS NULL
+    ''', key)
+    return {row['game_id'] for row in cursor.fetchall()}
+
+
+def load_backtest_games(season: str, start_date: str, end_date: str) -> List[Dict]:
+    """Completed games in a date range with their actual totals, oldest first"""
+    conn = _get_db_connection()
+    try:
+        rows = conn.execute('''
+            SELECT
+                game_id,
+                game_date,
+                MAX(CASE WHEN is_home = 1 THEN team_id END) as home_team_id,
+                MAX(CASE WHEN is_home = 0 THEN team_id END) as away_team_id,
+                SUM(team_pts) as actual_total
+            FROM team_game_logs
+            WHERE season = ? AND substr(game_date, 1, 10) BETWEEN ? AND ?
+            GROUP BY game_id
+            HAVING COUNT(*) = 2 AND COUNT(team_pts) = 2
+            ORDER BY game_date, game_id
+        ''', (season, start_date, end_date)).fetchall()
+        return [dict(row) for row in rows]
+    finally:
+        conn.close()
+
+
+def _load_lines(game_ids: Iterable[str]) -> Dict[str, float]:
+    """sportsbook_total_line by game_id from predictions.db"""
+    try:
+        conn = get_shared_connection(PREDICTIONS_DB_PATH, row_factory=None, timeout=30.0)
+        try:
+            rows = conn.execute('''
+                SELECT game_id, sportsbook_total_line FROM game_predictions
+                WHERE sportsbook_total_line IS NOT NULL
+            ''').fetchall()
+        finally:
+            conn.close()
+    except sqlite3.OperationalError as e:
+        logger.warning(f"No sportsbook lines available: {e}")
+        return {}
+    wanted = set(game_ids)
+    return {game_id: line for game_id, line in rows if game_id in wanted}
+
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+
+def _run_chunk(engine_name: str, season: str, games: List[Dict], quiet: bool = True) -> List[Tuple]:
+    """
+    Predict a chunk of games with one engine (runs in a worker process)
+
+    Returns:
+        [(game_id, predicted_total, elapsed_ms, error)]
+    """
+    try:
+        from api.utils.team_feature_store import preloaded_feature_history
+        from api.utils.prediction_context import prediction_scope
+    except ImportError:
+        from team_feature_store import preloaded_feature_history
+        from prediction_context import prediction_scope
+
+    engine = ENGINES[engine_name]
+    # Point-in-time engines read the feature store from memory; the others
+    # see the same current-season inputs for every game, so share them
+    scope = preloaded_feature_history(season) if engine.point_in_time else prediction_scope()
+
+    results = []
+    with open(os.devnull, 'w') as devnull, scope:
+        for game in games:
+            start = time.perf_counter()
+            try:
+                with contextlib.redirect_stdout(devnull) if quiet else contextlib.nullcontext():
+                    predicted, error = float(engine.predict(game, season)), None
+            except Exception as e:
+                predicted, error = None, f'{type(e).__name__}: {e}'
+            results.append((game['game_id'], predicted, (time.perf_counter() - start) * 1000, error))
+    return results
+
+
+def _chunks(games: List[Dict], size: int) -> List[List[Dict]]:
+    return [games[i:i + size] for i in range(0, len(games), size)]
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def run_backtest(engine_names: Iterable[str], season: str = '2025-26',
+                 start_date: str = '2025-10-21', end_date: str = '2026-01-03',
+                 workers: Optional[int] = None, force: bool = False,
+                 quiet: bool = True) -> Dict[str, Dict]:
+    """
+    Predict every completed game in a range with each engine and score them
+
+    Args:
+        engine_names: Keys of ENGINES
+        season: NBA season
+        start_date: First game date (YYYY-MM-DD)
+        end_date: Last game date (YYYY-MM-DD)
+        workers: Process pool size (None = CPU count)
+        force: Recompute games already stored for the current engine key
+        quiet: Silence engine print() output in workers
+
+    Returns:
+        {engine: metrics} as from calculate_engine_metrics(), plus
+        'computed', 'cached', 'code_hash' and 'wall_clock_s'
+    """
+    engines = [ENGINES[name] for name in engine_names]
+    games = load_backtest_games(season, start_date, end_date)
+    games_by_id = {game['game_id']: game for game in games}
+
+    if any(engine.point_in_time for engine in engines):
+        try:
+            from api.utils.team_feature_store import refresh_team_feature_store
+        except ImportError:
+            from team_feature_store import refresh_team_feature_store
+        refresh_team_feature_store(season)
+
+    conn = _get_db_connection()
+    try:
+        cursor = conn.cursor()
+        create_results_table(cursor)
+        conn.commit()
+
+        keys, pending = {}, {}
+        for engine in engines:
+            keys[engine.name] = (engine.name, engine.version, engine_code_hash(engine),
+                                 _engine_data_version(engine))
+            cached = set() if force else _cached_game_ids(cursor, keys[engine.name])
+            pending[engine.name] = [game for game in games if game['game_id'] not in cached]
+    finally:
+        conn.close()
+
+    start = time.perf_counter()
+    tasks = [(engine_name, chunk) for engine_name, todo in pending.items()
+             for chunk in _chunks(todo, CHUNK_SIZE)]
+    computed: Dict[str, List[Tuple]] = {name: [] for name in pending}
+    if tasks:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [(engine_name, pool.submit(_run_chunk, engine_name, season, chunk, quiet))
+                       for engine_name, chunk in tasks]
+            for engine_name, future in futures:
+                computed[engine_name].extend(future.result())
+    wall_clock = time.perf_counter() - start
+
+    conn = _get_db_connection()
+    try:
+        cursor = conn.cursor()
+        created_at = datetime.now(timezone.utc).isoformat()
+        cursor.executemany('''
+            INSERT OR REPLACE INTO backtest_results
+            (engine, engine_version, code_hash, data_version, game_id, game_date,
+             home_team_id, away_team_id, predicted_total, actual_total, elapsed_ms, error, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (*keys[engine_name], game_id, games_by_id[game_id]['game_date'],
+             games_by_id[game_id]['home_team_id'], games_by_id[game_id]['away_team_id'],
+             predicted, games_by_id[game_id]['actual_total'], elapsed_ms, error, created_at)
+            for engine_name, rows in computed.items()
+            for game_id, predicted, elapsed_ms, error in rows
+        ])
+        conn.commit()
+
+        lines = _load_lines(games_by_id)
+        metrics = {}
+        for engine in engines:
+            results = load_results(cursor, keys[engine.name], list(games_by_id))
+            results['line'] = results['game_id'].map(lines)
+            metrics[engine.name] = calculate_engine_metrics(results)
+            metrics[engine.name].update({
+                'code_hash': keys[engine.name][2],
+                'point_in_time': engine.point_in_time,
+                'computed': len(computed[engine.name]),
+                'cached': len(games) - len(computed[engine.name]),
+                'wall_clock_s': round(wall_clock, 2)
+            })
+        return metrics
+    finally:
+        conn.close()
+
+
+def load_results(cursor, key: Tuple[str, str, str, str], game_ids: List[str]) -> pd.DataFrame:
+    """Stored results for an engine key, limited to the given games"""
+    cursor.execute('''
+        SELECT game_id, game_date, predicted_total, actual_total, elapsed_ms, error
+        FROM backtest_results
+        WHERE engine = ? AND engine_version = ? AND code_hash = ? AND data_version = ?
+    ''', key)
+    results = pd.DataFrame([dict(row) for row in cursor.fetchall()],
+                           columns=['game_id', 'game_date', 'predicted_total', 'actual_total',
+                                    'elapsed_ms', 'error'])
+    return results[results['game_id'].isin(set(game_ids))].reset_index(drop=True)
+
+
+def calculate_engine_metrics(results: pd.DataFrame) -> Dict:
+    """
+    Score one engine's predictions
+
+    Args:
+        results: Rows with predicted_total, actual_total, line (may be NaN),
+                 elapsed_ms and error
+
+    Returns:
+        Dict with games, errors, mae, bias, rmse, ou_games, ou_hit_rate
+        (None without lines) and ms_per_game
+    """
+    scored = results[results['error'].isna() & results['predicted_total'].notna()]
+    diff = scored['predicted_total'] - scored['actual_total']
+
+    # Over/under calls against the line; pushes don't count
+    graded = scored[scored['line'].notna() & (scored['actual_total'] != scored['line'])]
+    hits = ((graded['predicted_total'] > graded['line']) == (graded['actual_total'] > graded['line']))
+
+    return {
+        'games': len(scored),
+        'errors': int(len(results) - len(scored)),
+        'mae': round(float(diff.abs().mean()), 2) if len(scored) else None,
+        'bias': round(float(diff.mean()), 2) if len(scored) else None,
+        'rmse': round(float(np.sqrt((diff ** 2).mean())), 2) if len(scored) else None,
+        'ou_games': len(graded),
+        'ou_hit_rate': round(float(hits.mean()) * 100, 1) if len(graded) else None,
+        'ms_per_game': round(float(results['elapsed_ms'].mean()), 1) if len(results) else None
+    }
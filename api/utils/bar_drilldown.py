@@ -8,6 +8,10 @@ Provides drilldown functionality for chart bars across all metrics:
 
 This module returns the exact games that make up each bar,
 ensuring count and averages match what's shown in the chart.
+
+Tier dimensions bucket each game by the opponent's season-to-date rank in
+team_season_stats, as the split charts do. opponent_rank_snapshots holds the
+as-of-game-date ranks; drilldowns move to them together with the charts.
 """
 
 import sqlite3
@@ -19,17 +23,17 @@ logger = logging.getLogger(__name__)
 # Import centralized database configuration
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
 
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
 
 
 # ============================================================================
@@ -157,31 +161,32 @@ def get_ball_movement_tier_from_rank(rank: int) -> Optional[str]:
         return 'bad'
 
 
+# dimension -> (team_season_stats {metric}_rank column, rank -> tier)
+TIER_DIMENSIONS = {
+    'defense_tier': ('def_rtg', get_defense_tier_from_rank),
+    'threept_def_tier': ('opp_fg3_pct', get_threept_def_tier_from_rank),
+    'pressure_tier': ('opp_tov', get_pressure_tier_from_rank),
+    'ball_movement_tier': ('opp_assists', get_ball_movement_tier_from_rank),
+}
+
+
 # ============================================================================
 # OPPONENT RANK LOOKUP
 # ============================================================================
 
-def get_opponent_def_rank(opponent_team_id: int, game_date: str, season: str) -> Optional[int]:
+def _get_opponent_rank(opponent_team_id: int, season: str, metric: str) -> Optional[int]:
     """
-    Get opponent's defensive rating rank at time of game.
-
-    For now, uses season-to-date rank. In future, could use snapshot ranks.
-
-    Args:
-        opponent_team_id: Opponent team ID
-        game_date: Game date (ISO format)
-        season: Season string
+    Opponent's season-to-date {metric}_rank (the rank the split charts bucket by)
 
-    Returns:
-        Defensive rating rank (1-30) or None
+    As-of-game-date ranks live in opponent_rank_snapshots
+    (opponent_rank_snapshots.get_rank_as_of).
     """
     conn = _get_db_connection()
     cursor = conn.cursor()
 
     try:
-        # Get opponent's defensive rating rank (already computed in team_season_stats)
-        cursor.execute('''
-            SELECT def_rtg_rank
+        cursor.execute(f'''
+            SELECT {metric}_rank as rank
             FROM team_season_stats
             WHERE team_id = ?
                 AND season = ?
@@ -189,106 +194,66 @@ def get_opponent_def_rank(opponent_team_id: int, game_date: str, season: str) ->
         ''', (opponent_team_id, season))
 
         row = cursor.fetchone()
-        return row['def_rtg_rank'] if row and row['def_rtg_rank'] else None
+        return row['rank'] if row and row['rank'] else None
 
     finally:
         conn.close()
 
 
-def get_opponent_threept_def_rank(opponent_team_id: int, game_date: str, season: str) -> Optional[int]:
+def get_opponent_def_rank(opponent_team_id: int, season: str = '2025-26') -> Optional[int]:
     """
-    Get opponent's 3PT% allowed rank at time of game.
+    Get opponent's season-to-date defensive rating rank.
 
     Args:
         opponent_team_id: Opponent team ID
-        game_date: Game date (ISO format)
         season: Season string
 
     Returns:
-        3PT% allowed rank (1-30) or None
+        Defensive rating rank (1-30) or None
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
+    return _get_opponent_rank(opponent_team_id, season, 'def_rtg')
 
-    try:
-        # Get opponent's 3PT defense rank (already computed in team_season_stats)
-        cursor.execute('''
-            SELECT opp_fg3_pct_rank
-            FROM team_season_stats
-            WHERE team_id = ?
-                AND season = ?
-                AND split_type = 'overall'
-        ''', (opponent_team_id, season))
 
-        row = cursor.fetchone()
-        return row['opp_fg3_pct_rank'] if row and row['opp_fg3_pct_rank'] else None
+def get_opponent_threept_def_rank(opponent_team_id: int, season: str = '2025-26') -> Optional[int]:
+    """
+    Get opponent's season-to-date 3PT% allowed rank.
 
-    finally:
-        conn.close()
+    Args:
+        opponent_team_id: Opponent team ID
+        season: Season string
+
+    Returns:
+        3PT% allowed rank (1-30) or None
+    """
+    return _get_opponent_rank(opponent_team_id, season, 'opp_fg3_pct')
 
 
-def get_opponent_pressure_rank(opponent_team_id: int, game_date: str, season: str) -> Optional[int]:
+def get_opponent_pressure_rank(opponent_team_id: int, season: str = '2025-26') -> Optional[int]:
     """
-    Get opponent's defensive pressure rank (based on opponent turnovers forced).
+    Get opponent's season-to-date defensive pressure rank (based on opponent turnovers forced).
 
     Args:
         opponent_team_id: Opponent team ID
-        game_date: Game date
         season: Season string
 
     Returns:
         Pressure rank (1-30) or None
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-
-    try:
-        # Get opponent's turnover pressure rank (already computed in team_season_stats)
-        cursor.execute('''
-            SELECT opp_tov_rank
-            FROM team_season_stats
-            WHERE team_id = ?
-                AND season = ?
-                AND split_type = 'overall'
-        ''', (opponent_team_id, season))
-
-        row = cursor.fetchone()
-        return row['opp_tov_rank'] if row and row['opp_tov_rank'] else None
-
-    finally:
-        conn.close()
+    return _get_opponent_rank(opponent_team_id, season, 'opp_tov')
 
 
-def get_opponent_assists_rank(opponent_team_id: int, game_date: str, season: str) -> Optional[int]:
+def get_opponent_assists_rank(opponent_team_id: int, season: str = '2025-26') -> Optional[int]:
     """
-    Get opponent's ball-movement defense rank (based on opponent assists allowed).
+    Get opponent's season-to-date ball-movement defense rank (based on opponent assists allowed).
 
     Args:
         opponent_team_id: Opponent team ID
-        game_date: Game date
         season: Season string
 
     Returns:
         Assists allowed rank (1-30) or None
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-
-    try:
-        # Get opponent's assists allowed rank (already computed in team_season_stats)
-        cursor.execute('''
-            SELECT opp_assists_rank
-            FROM team_season_stats
-            WHERE team_id = ?
-                AND season = ?
-                AND split_type = 'overall'
-        ''', (opponent_team_id, season))
-
-        row = cursor.fetchone()
-        return row['opp_assists_rank'] if row and row['opp_assists_rank'] else None
-
-    finally:
-        conn.close()
+    return _get_opponent_rank(opponent_team_id, season, 'opp_assists')
 
 
 # ============================================================================
@@ -332,9 +297,21 @@ def get_drilldown_games(
         # Build query based on metric and dimension
         is_home = 1 if context == 'home' else 0
 
+        # Tier dimensions join the opponent's season-to-date rank, the same
+        # rank the split charts bucket by
+        rank_select, rank_join = '', ''
+        if dimension in TIER_DIMENSIONS:
+            rank_metric = TIER_DIMENSIONS[dimension][0]
+            rank_select = f', tss_opp.{rank_metric}_rank as opponent_rank'
+            rank_join = """
+            LEFT JOIN team_season_stats tss_opp
+                ON tss_opp.team_id = tgl.opponent_team_id
+                AND tss_opp.season = tgl.season
+                AND tss_opp.split_type = 'overall'"""
+
         # Base query gets all games for this team in this context
         # FILTER: Only Regular Season + NBA Cup (exclude Summer League, preseason, etc.)
-        query = '''
+        query = f'''
             SELECT
                 tgl.game_id,
                 tgl.game_date,
@@ -349,9 +326,9 @@ def get_drilldown_games(
                 tgl.turnovers as team_tov,
                 tgl.assists as team_ast,
                 tgl.pace as pace_actual,
-                g.actual_total_points as total_points
+                g.actual_total_points as total_points{rank_select}
             FROM team_game_logs tgl
-            LEFT JOIN games g ON tgl.game_id = g.id
+            LEFT JOIN games g ON tgl.game_id = g.id{rank_join}
             WHERE tgl.team_id = ?
                 AND tgl.season = ?
                 AND tgl.is_home = ?
@@ -383,54 +360,11 @@ def get_drilldown_games(
                     game_dict['tier_label'] = game_pace_tier.capitalize() if game_pace_tier else None
                     include_game = (game_pace_tier == bucket)
 
-            elif dimension == 'defense_tier':
-                # Get opponent's defensive rank
-                opp_rank = get_opponent_def_rank(
-                    game['opponent_team_id'],
-                    game['game_date'],
-                    season
-                )
-                if opp_rank:
-                    opp_tier = get_defense_tier_from_rank(opp_rank)
-                    game_dict['opponent_rank'] = opp_rank
-                    game_dict['tier_label'] = opp_tier.capitalize() if opp_tier else None
-                    include_game = (opp_tier == tier)
-
-            elif dimension == 'threept_def_tier':
-                # Get opponent's 3PT defensive rank
-                opp_rank = get_opponent_threept_def_rank(
-                    game['opponent_team_id'],
-                    game['game_date'],
-                    season
-                )
-                if opp_rank:
-                    opp_tier = get_threept_def_tier_from_rank(opp_rank)
-                    game_dict['opponent_rank'] = opp_rank
-                    game_dict['tier_label'] = opp_tier.capitalize() if opp_tier else None
-                    include_game = (opp_tier == tier)
-
-            elif dimension == 'pressure_tier':
-                # Get opponent's pressure rank
-                opp_rank = get_opponent_pressure_rank(
-                    game['opponent_team_id'],
-                    game['game_date'],
-                    season
-                )
-                if opp_rank:
-                    opp_tier = get_pressure_tier_from_rank(opp_rank)
-                    game_dict['opponent_rank'] = opp_rank
-                    game_dict['tier_label'] = opp_tier.capitalize() if opp_tier else None
-                    include_game = (opp_tier == tier)
-
-            elif dimension == 'ball_movement_tier':
-                # Get opponent's ball-movement defense rank
-                opp_rank = get_opponent_assists_rank(
-                    game['opponent_team_id'],
-                    game['game_date'],
-                    season
-                )
+            elif dimension in TIER_DIMENSIONS:
+                # Opponent's rank on this dimension's metric
+                opp_rank = game_dict.pop('opponent_rank')
                 if opp_rank:
-                    opp_tier = get_ball_movement_tier_from_rank(opp_rank)
+                    opp_tier = TIER_DIMENSIONS[dimension][1](opp_rank)
                     game_dict['opponent_rank'] = opp_rank
                     game_dict['tier_label'] = opp_tier.capitalize() if opp_tier else None
                     include_game = (opp_tier == tier)
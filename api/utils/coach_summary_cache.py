@@ -0,0 +1,220 @@
+"""
+Cached Daily Model Coach Summaries
+
+/api/model-review/summary used to send every game_reviews row for the date
+to OpenAI on each page open - seconds of latency and an API charge even when
+no review had changed.
+
+Summaries are now stored in game_reviews.db (coach_summaries), keyed by date
+and a hash of the contributing reviews' (game_id, updated_at). A request
+serves the stored summary straight away. When the hash no longer matches
+(a new or re-uploaded screenshot review for that date), one background job
+(background_jobs, kind 'coach_summary', 'openai' pool) regenerates it and
+the request gets the previous summary, marked stale, in the meantime.
+
+_run_screenshot_review() calls queue_coach_summary() after saving a review,
+so the summary is usually regenerated before anyone opens the drawer.
+
+summary_status values:
+    current      stored summary matches the date's reviews
+    stale        an older summary is served while a new one is generated
+    pending      no summary yet for this date; generation is queued
+    unavailable  nothing stored and no OpenAI key, or the last generation
+                 for this review set failed less than RETRY_AFTER_SECONDS ago
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from api.utils.background_jobs import ACTIVE_STATUSES, latest_job, submit_job
+    from api.utils.db_schema_game_reviews import ensure_coach_summaries_table, get_connection
+    from api.utils.openai_client import has_openai_key
+except ImportError:
+    from background_jobs import ACTIVE_STATUSES, latest_job, submit_job
+    from db_schema_game_reviews import ensure_coach_summaries_table, get_connection
+    from openai_client import has_openai_key
+
+JOB_KIND = 'coach_summary'
+
+COACH_MODEL = 'gpt-4.1-mini'
+
+# Don't retry a failed generation for the same review set more often than this
+RETRY_AFTER_SECONDS = int(os.environ.get('COACH_SUMMARY_RETRY_AFTER', '300'))
+
+
+def get_reviews_for_date(date_str: str) -> List[Dict]:
+    """game_reviews rows for a date, biggest miss first, with ai_review parsed"""
+    with get_connection() as conn:
+        rows = conn.execute('''
+            SELECT * FROM game_reviews
+            WHERE game_date = ?
+            ORDER BY abs_error_total DESC
+        ''', (date_str,)).fetchall()
+
+    reviews = []
+    for row in rows:
+        review_dict = dict(row)
+        if review_dict.get('ai_review_json'):
+            review_dict['ai_review'] = json.loads(review_dict['ai_review_json'])
+        reviews.append(review_dict)
+    return reviews
+
+
+def review_set_hash(reviews: List[Dict]) -> str:
+    """Hash of the (game_id, updated_at) pairs a summary was built from"""
+    key = sorted((str(r['game_id']), str(r['updated_at'])) for r in reviews)
+    return hashlib.sha256(json.dumps(key).encode()).hexdigest()[:16]
+
+
+def get_stored_summary(date_str: str) -> Optional[Tuple[str, Dict]]:
+    """(review_set_hash, summary) stored for a date, or None"""
+    with get_connection() as conn:
+        ensure_coach_summaries_table(conn)
+        row = conn.execute('''
+            SELECT review_set_hash, summary_json FROM coach_summaries WHERE game_date = ?
+        ''', (date_str,)).fetchone()
+    if row is None:
+        return None
+    return row['review_set_hash'], json.loads(row['summary_json'])
+
+
+def save_summary(date_str: str, reviews_hash: str, review_count: int, summary: Dict):
+    with get_connection() as conn:
+        ensure_coach_summaries_table(conn)
+        now = datetime.now(timezone.utc).isoformat()
+        conn.execute('''
+            INSERT INTO coach_summaries
+                (game_date, review_set_hash, review_count, summary_json, model, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(game_date) DO UPDATE SET
+                review_set_hash = excluded.review_set_hash,
+                review_count = excluded.review_count,
+                summary_json = excluded.summary_json,
+                model = excluded.model,
+                updated_at = excluded.updated_at
+        ''', (date_str, reviews_hash, review_count, json.dumps(summary), COACH_MODEL, now, now))
+        conn.commit()
+
+
+def _seconds_since(timestamp: Optional[str]) -> float:
+    if not timestamp:
+        return float('inf')
+    return (datetime.now(timezone.utc) - datetime.fromisoformat(timestamp)).total_seconds()
+
+
+def generate_coach_summary(date_str: str) -> Dict:
+    """
+    Background job: summarize the date's current reviews and store the result.
+
+    Reviews are re-read here, so a review saved while the job was queued is
+    included (the stored hash always describes what was actually sent).
+
+    Returns:
+        {'date': str, 'review_count': int, 'review_set_hash': str}
+    """
+    try:
+        from api.utils.openai_client import generate_daily_coach_summary
+    except ImportError:
+        from openai_client import generate_daily_coach_summary
+
+    reviews = get_reviews_for_date(date_str)
+    if not reviews:
+        raise RuntimeError(f'No reviews for {date_str}')
+
+    reviews_hash = review_set_hash(reviews)
+    print(f"[Model Coach] Generating daily summary for {date_str} ({len(reviews)} games)")
+    summary = generate_daily_coach_summary(reviews, model=COACH_MODEL)
+    summary['date'] = date_str
+    save_summary(date_str, reviews_hash, len(reviews), summary)
+    return {'date': date_str, 'review_count': len(reviews), 'review_set_hash': reviews_hash}
+
+
+def queue_coach_summary(date_str: str, reviews: Optional[List[Dict]] = None,
+                        retry_failed: bool = False) -> Optional[Dict]:
+    """
+    Queue regeneration of a date's summary unless it is current, already
+    queued, or recently failed for the same review set.
+
+    Args:
+        reviews: The date's reviews (loaded if not given)
+        retry_failed: Queue even if the last attempt failed recently
+
+    Returns:
+        The job (new or coalesced), the recent failed job, or None when there
+        is nothing to do (no reviews, summary current, or no OpenAI key)
+    """
+    if not has_openai_key():
+        return None
+    if reviews is None:
+        reviews = get_reviews_for_date(date_str)
+    if not reviews:
+        return None
+
+    reviews_hash = review_set_hash(reviews)
+    stored = get_stored_summary(date_str)
+    if stored is not None and stored[0] == reviews_hash:
+        return None
+
+    dedupe_key = f'{date_str}:{reviews_hash}'
+    last = latest_job(JOB_KIND, dedupe_key)
+    if last is not None and last['status'] in ACTIVE_STATUSES:
+        return last
+    if (last is not None and last['status'] == 'failed' and not retry_failed
+            and _seconds_since(last['finished_at']) < RETRY_AFTER_SECONDS):
+        return last
+
+    job_id = submit_job(JOB_KIND, generate_coach_summary, date_str,
+                        params={'date': date_str, 'review_count': len(reviews)},
+                        dedupe_key=dedupe_key, pool='openai')
+    return {'job_id': job_id, 'status': 'queued'}
+
+
+def get_coach_summary(date_str: str) -> Dict:
+    """
+    The date's Model Coach summary without calling OpenAI in the request.
+
+    Returns:
+        {'summary': dict or None, 'summary_status': str, 'job_id': str (while generating),
+         'error', 'error_code' (why an unavailable summary could not be generated)}
+        With no reviews for the date, summary is the usual total_games=0 message.
+    """
+    reviews = get_reviews_for_date(date_str)
+    if not reviews:
+        return {
+            'summary': {
+                'date': date_str,
+                'total_games': 0,
+                'message': 'No reviews available for this date yet.'
+            },
+            'summary_status': 'current'
+        }
+
+    reviews_hash = review_set_hash(reviews)
+    stored = get_stored_summary(date_str)
+    if stored is not None and stored[0] == reviews_hash:
+        return {'summary': stored[1], 'summary_status': 'current'}
+
+    try:
+        job = queue_coach_summary(date_str, reviews)
+    except Exception as e:
+        # Queueing must never fail the drawer
+        import traceback
+        traceback.print_exc()
+        job = None
+        print(f'[coach_summary_cache] Warning: could not queue summary for {date_str}: {e}')
+
+    result = {'summary': stored[1] if stored is not None else None}
+    if job is not None and job['status'] in ACTIVE_STATUSES:
+        result['summary_status'] = 'stale' if stored is not None else 'pending'
+        result['job_id'] = job['job_id']
+    else:
+        result['summary_status'] = 'stale' if stored is not None else 'unavailable'
+        if job is not None and job.get('error'):
+            result['error'], result['error_code'] = job['error'], job.get('error_code')
+        elif job is None and not has_openai_key():
+            result['error'], result['error_code'] = 'OPENAI_API_KEY environment variable not set', 'OPENAI_KEY_MISSING'
+    return result
@@ -24,8 +24,12 @@ logger = logging.getLogger(__name__)
 # Import DB helper
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
+    from api.utils.team_feature_store import load_feature_history
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
+    from team_feature_store import load_feature_history
 
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
@@ -34,10 +38,8 @@ MIN_R_SQUARED = 0.70
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False, timeout=30.0)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH)
 
 
 def get_games_in_window(start_date: str, end_date: str, season: str = '2025-26') -> pd.DataFrame:
@@ -121,6 +123,46 @@ def get_team_season_averages(df: pd.DataFrame) -> pd.DataFrame:
     return team_stats
 
 
+def get_team_pct_as_of(df: pd.DataFrame, season: str) -> pd.DataFrame:
+    """
+    Team shooting percentages from games before each row's game date
+
+    One bulk read of the point-in-time feature store, so a game's own result
+    never feeds the team average it is regressed against.
+
+    Args:
+        df: Game logs from get_games_in_window()
+        season: NBA season string
+
+    Returns:
+        df with fg3_pct / fg2_pct columns (NaN before a team's first game);
+        empty if the feature store has not been built for the season
+    """
+    rows = [
+        (team_id, features['through_date'], features['fg3_made'], features['fg3_attempted'],
+         features['fg2_made'], features['fg2_attempted'])
+        for team_id, (_, history) in load_feature_history(season)['teams'].items()
+        for features in history
+    ]
+    if not rows:
+        return pd.DataFrame()
+
+    history = pd.DataFrame(rows, columns=['team_id', 'through_date', 'fg3_made', 'fg3_attempted',
+                                          'fg2_made', 'fg2_attempted'])
+    history['fg3_pct'] = history['fg3_made'] / history['fg3_attempted'].replace(0, np.nan)
+    history['fg2_pct'] = history['fg2_made'] / history['fg2_attempted'].replace(0, np.nan)
+    history['as_of'] = pd.to_datetime(history['through_date'])
+
+    games = df.copy()
+    games['as_of'] = pd.to_datetime(games['game_date'])
+    merged = pd.merge_asof(
+        games.reset_index().sort_values('as_of'),
+        history[['team_id', 'as_of', 'fg3_pct', 'fg2_pct']].sort_values('as_of'),
+        on='as_of', by='team_id', allow_exact_matches=False
+    )
+    return merged.set_index('index').sort_index().drop(columns='as_of')
+
+
 def learn_shooting_coefficients(
     season: str = '2025-26',
     start_date: str = '2025-10-21',
@@ -160,8 +202,14 @@ def learn_shooting_coefficients(
         df['attempts'] = df['fg2a']
         pct_col = 'fg2_pct'
 
-    # Merge team season averages
-    df = df.merge(team_avgs[['team_id', pct_col]], on='team_id', how='left')
+    # Team averages as of each game date (whole-window averages if the
+    # feature store has not been built)
+    as_of = get_team_pct_as_of(df, season)
+    if as_of.empty:
+        logger.warning(f"No team feature snapshots for {season}; using window averages")
+        df = df.merge(team_avgs[['team_id', pct_col]], on='team_id', how='left')
+    else:
+        df = as_of
 
     # For opponent defense, we need to get opponent's defensive rating
     # Simplified: use opponent's season FG% allowed (inverse of offense)
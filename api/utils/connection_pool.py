@@ -6,8 +6,24 @@ Provides connection pooling and reuse to eliminate:
 - Repeated connection overhead
 - Disk I/O on every query
 
+Two ways to get a connection:
+
+- get_shared_connection(): one connection per thread per database, reused
+  by every caller on that thread. close() hands it back instead of closing
+  it, so the per-module `conn = _get_db_connection() ... conn.close()`
+  pattern keeps working while connection setup and prepared statements
+  (sqlite3's per-connection statement cache) survive between calls.
+  Request handlers that only read ask for readonly=True connections, which
+  are served from an in-memory snapshot with DB_SNAPSHOT_SERVING=1
+  (see db_snapshot).
+- get_db_pool(): a fixed-size pool handed out as a context manager.
+
 Usage:
-    from api.utils.connection_pool import get_db_pool
+    from api.utils.connection_pool import get_shared_connection, get_db_pool
+
+    conn = get_shared_connection('nba_data', readonly=True)
+    rows = conn.execute("SELECT * FROM team_game_logs").fetchall()
+    conn.close()  # Released for the next caller on this thread
 
     pool = get_db_pool('predictions')
     with pool.get_connection() as conn:
@@ -21,14 +37,43 @@ import os
 import threading
 import time
 from contextlib import contextmanager
-from typing import Literal, Callable, Any
+from typing import Literal, Callable, Any, Dict, Optional
 from queue import Queue, Empty
 
 # Import centralized database configuration
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.db_snapshot import load_snapshot
 except ImportError:
     from db_config import get_db_path
+    from db_snapshot import load_snapshot
+
+# Databases the application opens, by short name
+DATABASES = {
+    'nba_data': 'nba_data.db',
+    'team_similarity': 'team_similarity.db',
+    'predictions': 'predictions.db',
+    'team_rankings': 'team_rankings.db',
+}
+
+DatabaseName = Literal['nba_data', 'team_similarity', 'predictions', 'team_rankings']
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+CACHED_STATEMENTS = 256
+
+
+# team_similarity.db ships with the code in api/data rather than under DB_PATH
+BUNDLED_DATABASES = {'team_similarity'}
+_BUNDLED_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+
+
+def resolve_db_path(db: str) -> str:
+    """Path for a database short name ('nba_data', ...); anything else is taken as a path"""
+    if db in BUNDLED_DATABASES:
+        return os.path.normpath(os.path.join(_BUNDLED_DATA_DIR, DATABASES[db]))
+    if db in DATABASES:
+        return get_db_path(DATABASES[db])
+    return db
 
 
 class ConnectionPool:
@@ -76,7 +121,8 @@ class ConnectionPool:
         conn = sqlite3.connect(
             self.db_path,
             check_same_thread=False,  # Allow connection reuse across threads
-            timeout=60.0  # Wait up to 60s for database locks (increased for idle scenarios)
+            timeout=60.0,  # Wait up to 60s for database locks (increased for idle scenarios)
+            cached_statements=CACHED_STATEMENTS
         )
         conn.row_factory = sqlite3.Row  # Return rows as dictionaries
 
@@ -203,12 +249,12 @@ _pools = {}
 _pools_lock = threading.Lock()
 
 
-def get_db_pool(db_name: Literal['predictions', 'team_rankings']) -> ConnectionPool:
+def get_db_pool(db_name: DatabaseName) -> ConnectionPool:
     """
     Get or create a connection pool for the specified database.
 
     Args:
-        db_name: Database name ('predictions' or 'team_rankings')
+        db_name: Database name (a key of DATABASES, e.g. 'predictions')
 
     Returns:
         ConnectionPool instance (singleton per database)
@@ -223,12 +269,9 @@ def get_db_pool(db_name: Literal['predictions', 'team_rankings']) -> ConnectionP
     with _pools_lock:
         if db_name not in _pools:
             # Determine database path using centralized configuration
-            if db_name == 'predictions':
-                db_path = get_db_path('predictions.db')
-            elif db_name == 'team_rankings':
-                db_path = get_db_path('team_rankings.db')
-            else:
+            if db_name not in DATABASES:
                 raise ValueError(f"Unknown database: {db_name}")
+            db_path = resolve_db_path(db_name)
 
             # Create pool
             _pools[db_name] = ConnectionPool(db_path, pool_size=5)
@@ -244,6 +287,181 @@ def close_all_pools():
             print(f"[connection_pool] Closing pool for {name}")
             pool.close_all()
         _pools.clear()
+    close_shared_connections()
+
+
+# ============================================================================
+# PER-THREAD SHARED CONNECTIONS
+# ============================================================================
+
+class SharedConnection(sqlite3.Connection):
+    """
+    A thread's reusable connection to one database.
+
+    Every get_shared_connection() call checks it out and every close()
+    checks it back in. When the last caller on the thread releases it, an
+    uncommitted transaction is rolled back - what closing would have done -
+    so nothing leaks into the next caller.
+    """
+
+    def _checkout(self, row_factory):
+        self._row_factories.append(self.row_factory)
+        self.row_factory = row_factory
+        self._checkouts += 1
+
+    def close(self):
+        """Release this checkout (the connection stays open for reuse)"""
+        if self._checkouts == 0:
+            return
+        self._checkouts -= 1
+        self.row_factory = self._row_factories.pop()
+        if self._checkouts == 0 and self.in_transaction:
+            self.rollback()
+
+    def close_connection(self):
+        """Really close the underlying connection"""
+        super().close()
+
+
+_local = threading.local()
+
+
+def _open_shared_connection(db_path: str, readonly: bool, timeout: float) -> SharedConnection:
+    """Open and configure a connection for get_shared_connection()"""
+    conn = sqlite3.connect(db_path, timeout=timeout, check_same_thread=False,
+                           cached_statements=CACHED_STATEMENTS, factory=SharedConnection)
+    conn._checkouts = 0
+    conn._row_factories = []
+    try:
+        conn._inode = os.stat(db_path).st_ino
+    except OSError:
+        conn._inode = None  # In-memory or URI database
+    conn.execute(f"PRAGMA busy_timeout={int(timeout * 1000)}")
+    conn.execute("PRAGMA cache_size=-16000")  # 16MB page cache, kept between calls now
+    conn.execute("PRAGMA temp_store=MEMORY")
+    if readonly:
+        conn.execute("PRAGMA query_only=ON")
+    return conn
+
+
+def _open_snapshot_connection(version: tuple, data: bytes) -> SharedConnection:
+    """In-memory read-only copy of a published snapshot (see db_snapshot)"""
+    conn = sqlite3.connect(':memory:', check_same_thread=False,
+                           cached_statements=CACHED_STATEMENTS, factory=SharedConnection)
+    conn.deserialize(data)
+    conn._checkouts = 0
+    conn._row_factories = []
+    conn._inode = None
+    conn._snapshot_version = version
+    conn.execute("PRAGMA query_only=ON")
+    return conn
+
+
+def get_shared_connection(db: str = 'nba_data', readonly: bool = False,
+                          row_factory: Optional[Callable] = sqlite3.Row,
+                          timeout: float = 30.0) -> SharedConnection:
+    """
+    Get this thread's connection to a database (opened once, then reused).
+
+    Call close() when done, exactly as with a private connection; it
+    releases the connection rather than closing it. Nested callers on the
+    same thread share the connection, and each gets the row_factory it
+    asked for until it releases.
+
+    Args:
+        db: Database short name (see DATABASES) or a path to a database file
+        readonly: Open with PRAGMA query_only, for request handlers that only read.
+                  With DB_SNAPSHOT_SERVING=1 these read the published snapshot.
+        row_factory: Row factory for this checkout (None for plain tuples)
+        timeout: Seconds to wait for database locks
+
+    Returns:
+        SharedConnection
+    """
+    db_path = os.path.abspath(resolve_db_path(db))
+    connections: Optional[Dict] = getattr(_local, 'connections', None)
+    if connections is None or _local.pid != os.getpid():
+        # Never reuse a connection inherited across fork()
+        connections = _local.connections = {}
+        _local.pid = os.getpid()
+
+    if readonly:
+        # Serve reads from an in-memory snapshot when snapshot serving is on
+        snapshot = load_snapshot(db_path)
+        if snapshot is not None:
+            key = (db_path, 'snapshot')
+            conn = connections.get(key)
+            if conn is None or conn._snapshot_version != snapshot[0]:
+                if conn is not None and conn._checkouts == 0:
+                    conn.close_connection()
+                conn = connections[key] = _open_snapshot_connection(*snapshot)
+            conn._checkout(row_factory)
+            return conn
+
+    key = (db_path, readonly)
+    conn = connections.get(key)
+    if conn is not None and conn._inode is not None:
+        # The file was replaced or removed: this connection reads a stale copy
+        try:
+            stale = os.stat(db_path).st_ino != conn._inode
+        except OSError:
+            stale = True
+        if stale:
+            if conn._checkouts == 0:
+                conn.close_connection()
+            conn = None
+    if conn is None:
+        conn = connections[key] = _open_shared_connection(db_path, readonly, timeout)
+
+    conn._checkout(row_factory)
+    return conn
+
+
+def shared_connections() -> list:
+    """This thread's open shared connections"""
+    connections = getattr(_local, 'connections', None)
+    if not connections or _local.pid != os.getpid():
+        return []
+    return list(connections.values())
+
+
+def reset_shared_connections() -> int:
+    """
+    Return this thread's shared connections to a released state.
+
+    Called at the end of each request so a caller that never called
+    close() cannot hold a checkout (and an open transaction) into the
+    next request on the same thread.
+
+    Returns:
+        Number of checkouts that were still outstanding
+    """
+    connections = getattr(_local, 'connections', None)
+    if not connections or _local.pid != os.getpid():
+        return 0
+    outstanding = 0
+    for conn in connections.values():
+        if conn._checkouts:
+            outstanding += conn._checkouts
+            conn.row_factory = conn._row_factories[0]
+            conn._row_factories.clear()
+            conn._checkouts = 0
+        if conn.in_transaction:
+            conn.rollback()
+    return outstanding
+
+
+def close_shared_connections():
+    """Close this thread's shared connections (e.g. after a bulk job or in tests)"""
+    connections = getattr(_local, 'connections', None)
+    if not connections or _local.pid != os.getpid():
+        return
+    for conn in connections.values():
+        try:
+            conn.close_connection()
+        except sqlite3.Error:
+            pass
+    connections.clear()
 
 
 def retry_on_db_lock(max_retries: int = 5, initial_delay: float = 0.1, backoff_factor: float = 2.0):
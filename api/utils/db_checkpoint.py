@@ -13,8 +13,10 @@ import logging
 
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +35,7 @@ def checkpoint_database(db_filename: str):
         return
 
     try:
-        conn = sqlite3.connect(db_path)
+        conn = get_shared_connection(db_path, row_factory=None)
         conn.execute('PRAGMA wal_checkpoint(TRUNCATE);')
         conn.close()
         logger.info(f"[DB Checkpoint] Checkpointed {db_filename}")
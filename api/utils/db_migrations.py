@@ -662,6 +662,172 @@ def migrate_to_v14_ppp_metrics():
     print('[db_migrations] PPP metrics columns ready in team_season_stats')
 
 
+def migrate_to_v15_team_archetype_assignments():
+    """
+    Migrate nba_data.db to store team archetype assignments
+
+    Adds:
+    - team_archetype_assignments table, rebuilt by the derived pipeline after each sync
+    - payload: JSON assignment for one team (as returned by assign_all_team_archetypes)
+    - source_stamp: team_game_logs stamp the assignment was computed from
+
+    Safe to run multiple times - will skip if table exists
+    """
+    print('[db_migrations] Running NBA data migration v15 (team_archetype_assignments)...')
+
+    with _get_connection_nba_data() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS team_archetype_assignments (
+                team_id INTEGER NOT NULL,
+                season TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                source_stamp TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (team_id, season)
+            )
+        ''')
+        print('[db_migrations] team_archetype_assignments table created')
+
+        conn.commit()
+
+    print('[db_migrations] Migration v15 completed successfully')
+
+
+def migrate_to_v16_opponent_rank_snapshots():
+    """
+    Migrate nba_data.db to store opponent rank snapshots
+
+    Adds:
+    - opponent_rank_snapshots table: each team's rank per metric going into
+      every game date, rebuilt incrementally by the derived pipeline
+    - idx_rank_snapshots_season_date index for incremental rewrites
+
+    Safe to run multiple times - will skip if table exists
+    """
+    print('[db_migrations] Running NBA data migration v16 (opponent_rank_snapshots)...')
+
+    try:
+        from api.utils.opponent_rank_snapshots import create_snapshot_table
+    except ImportError:
+        from opponent_rank_snapshots import create_snapshot_table
+
+    with _get_connection_nba_data() as conn:
+        create_snapshot_table(conn.cursor())
+        print('[db_migrations] opponent_rank_snapshots table created')
+
+        conn.commit()
+
+    print('[db_migrations] Migration v16 completed successfully')
+
+
+def migrate_to_v17_team_feature_snapshots():
+    """
+    Migrate nba_data.db to store point-in-time team features
+
+    Adds:
+    - team_feature_snapshots table: each team's cumulative season, last-5,
+      home/away and PPP features after every game date, read by backtests
+      and as-of predictions
+
+    Safe to run multiple times - will skip if table exists
+    """
+    print('[db_migrations] Running NBA data migration v17 (team_feature_snapshots)...')
+
+    try:
+        from api.utils.team_feature_store import create_feature_table
+    except ImportError:
+        from team_feature_store import create_feature_table
+
+    with _get_connection_nba_data() as conn:
+        create_feature_table(conn.cursor())
+        print('[db_migrations] team_feature_snapshots table created')
+
+        conn.commit()
+
+    print('[db_migrations] Migration v17 completed successfully')
+
+
+def migrate_to_v18_backtest_results():
+    """
+    Migrate nba_data.db to store engine backtest results
+
+    Adds:
+    - backtest_results table: per-game predictions keyed by engine, engine
+      version, code hash and data version, so the backtest runner only
+      recomputes engines that changed
+
+    Safe to run multiple times - will skip if table exists
+    """
+    print('[db_migrations] Running NBA data migration v18 (backtest_results)...')
+
+    try:
+        from api.utils.backtest_runner import create_results_table
+    except ImportError:
+        from backtest_runner import create_results_table
+
+    with _get_connection_nba_data() as conn:
+        create_results_table(conn.cursor())
+        print('[db_migrations] backtest_results table created')
+
+        conn.commit()
+
+    print('[db_migrations] Migration v18 completed successfully')
+
+
+def migrate_to_v19_game_payloads():
+    """
+    Migrate nba_data.db to store materialized per-game endpoint payloads
+
+    Adds:
+    - game_payloads table: compressed JSON response bodies for the War Room
+      endpoints, one row per game and section, built after each sync
+
+    Safe to run multiple times - will skip if table exists
+    """
+    print('[db_migrations] Running NBA data migration v19 (game_payloads)...')
+
+    try:
+        from api.utils.game_payloads import create_payloads_table
+    except ImportError:
+        from game_payloads import create_payloads_table
+
+    with _get_connection_nba_data() as conn:
+        create_payloads_table(conn.cursor())
+        print('[db_migrations] game_payloads table created')
+
+        conn.commit()
+
+    print('[db_migrations] Migration v19 completed successfully')
+
+
+def migrate_to_v20_team_trends():
+    """
+    Migrate nba_data.db to store materialized last-5 team trends
+
+    Adds:
+    - team_trends table: each team's last-5 trends (with opponent profiles),
+      built for every team in one query after each sync
+
+    Safe to run multiple times - will skip if table exists
+    """
+    print('[db_migrations] Running NBA data migration v20 (team_trends)...')
+
+    try:
+        from api.utils.last_5_trends import create_team_trends_table
+    except ImportError:
+        from last_5_trends import create_team_trends_table
+
+    with _get_connection_nba_data() as conn:
+        create_team_trends_table(conn.cursor())
+        print('[db_migrations] team_trends table created')
+
+        conn.commit()
+
+    print('[db_migrations] Migration v20 completed successfully')
+
+
 if __name__ == '__main__':
     # Run migration when executed directly
     print('=== Database Migration Tool ===')
@@ -693,5 +859,11 @@ if __name__ == '__main__':
     migrate_to_v12_possession_insights()
     migrate_to_v13_learned_coefficients()
     migrate_to_v14_ppp_metrics()
+    migrate_to_v15_team_archetype_assignments()
+    migrate_to_v16_opponent_rank_snapshots()
+    migrate_to_v17_team_feature_snapshots()
+    migrate_to_v18_backtest_results()
+    migrate_to_v19_game_payloads()
+    migrate_to_v20_team_trends()
     print()
     print('All migrations complete!')
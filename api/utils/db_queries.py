@@ -11,6 +11,7 @@ If data is missing, this module returns league-average fallback values
 to ensure predictions can always be generated.
 """
 
+import json
 import sqlite3
 from typing import Dict, List, Optional
 from datetime import datetime, timezone, timedelta
@@ -22,8 +23,14 @@ logger = logging.getLogger(__name__)
 # Import centralized database configuration
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
+    from api.utils.prediction_context import scoped_cache
+    from api.utils.team_context import get_scoped_team_context, get_scoped_league_overall, get_team_context
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
+    from prediction_context import scoped_cache
+    from team_context import get_scoped_team_context, get_scoped_league_overall, get_team_context
 
 # Database path
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
@@ -33,15 +40,14 @@ NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 # ============================================================================
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH)
 
 # ============================================================================
 # TEAMS QUERIES
 # ============================================================================
 
+@scoped_cache
 def get_all_teams(season: str = '2025-26') -> List[Dict]:
     """
     Get all NBA teams
@@ -65,6 +71,7 @@ def get_all_teams(season: str = '2025-26') -> List[Dict]:
     return teams
 
 
+@scoped_cache
 def get_team_by_id(team_id: int) -> Optional[Dict]:
     """Get team by ID"""
     conn = _get_db_connection()
@@ -136,10 +143,39 @@ def get_team_id(team_name: str) -> Optional[int]:
 # SEASON STATS QUERIES
 # ============================================================================
 
-def get_team_stats(team_id: int, season: str = '2025-26') -> Optional[Dict]:
+def _get_overall_season_row(team_id: int, season: str, team_context=None):
+    """Get the overall team_season_stats row from a TeamContext or SQLite"""
+    if team_context is not None:
+        return team_context.overall
+
+    league_overall = get_scoped_league_overall(season)
+    if league_overall is not None:
+        return league_overall.get(int(team_id))
+
+    conn = _get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        SELECT *
+        FROM team_season_stats
+        WHERE team_id = ? AND season = ? AND split_type = 'overall'
+    ''', (team_id, season))
+
+    row = cursor.fetchone()
+    conn.close()
+    return row
+
+
+@scoped_cache
+def get_team_stats(team_id: int, season: str = '2025-26', team_context=None) -> Optional[Dict]:
     """
     Get team traditional stats with home/away splits
 
+    Args:
+        team_id: NBA team ID
+        season: Season string
+        team_context: Optional TeamContext to read from instead of SQLite
+
     Returns:
         {
             'overall': {...},
@@ -149,18 +185,22 @@ def get_team_stats(team_id: int, season: str = '2025-26') -> Optional[Dict]:
 
         Each split contains: PTS, FG_PCT, FG3_PCT, FT_PCT, W, L, etc.
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
+    team_context = team_context or get_scoped_team_context(team_id, season)
+    if team_context is not None:
+        rows = list(team_context.season_rows.values())
+    else:
+        conn = _get_db_connection()
+        cursor = conn.cursor()
 
-    # Query all splits
-    cursor.execute('''
-        SELECT *
-        FROM team_season_stats
-        WHERE team_id = ? AND season = ?
-    ''', (team_id, season))
+        # Query all splits
+        cursor.execute('''
+            SELECT *
+            FROM team_season_stats
+            WHERE team_id = ? AND season = ?
+        ''', (team_id, season))
 
-    rows = cursor.fetchall()
-    conn.close()
+        rows = cursor.fetchall()
+        conn.close()
 
     if not rows:
         logger.warning(f"No stats found for team {team_id}, using fallback")
@@ -192,23 +232,15 @@ def get_team_stats(team_id: int, season: str = '2025-26') -> Optional[Dict]:
     return result
 
 
-def get_team_advanced_stats(team_id: int, season: str = '2025-26') -> Optional[Dict]:
+@scoped_cache
+def get_team_advanced_stats(team_id: int, season: str = '2025-26', team_context=None) -> Optional[Dict]:
     """
     Get team advanced stats (ORTG, DRTG, PACE, etc.)
 
     Returns dict with OFF_RATING, DEF_RATING, NET_RATING, PACE, TS_PCT, EFG_PCT
+    Pass team_context to read from a TeamContext instead of SQLite.
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute('''
-        SELECT *
-        FROM team_season_stats
-        WHERE team_id = ? AND season = ? AND split_type = 'overall'
-    ''', (team_id, season))
-
-    row = cursor.fetchone()
-    conn.close()
+    row = _get_overall_season_row(team_id, season, team_context)
 
     if not row:
         logger.warning(f"No advanced stats found for team {team_id}, using fallback")
@@ -224,23 +256,15 @@ def get_team_advanced_stats(team_id: int, season: str = '2025-26') -> Optional[D
     }
 
 
-def get_team_opponent_stats(team_id: int, season: str = '2025-26') -> Optional[Dict]:
+@scoped_cache
+def get_team_opponent_stats(team_id: int, season: str = '2025-26', team_context=None) -> Optional[Dict]:
     """
     Get opponent stats (what opponents score against this team)
 
     Returns dict with OPP_PTS, etc.
+    Pass team_context to read from a TeamContext instead of SQLite.
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute('''
-        SELECT *
-        FROM team_season_stats
-        WHERE team_id = ? AND season = ? AND split_type = 'overall'
-    ''', (team_id, season))
-
-    row = cursor.fetchone()
-    conn.close()
+    row = _get_overall_season_row(team_id, season, team_context)
 
     if not row:
         logger.warning(f"No opponent stats found for team {team_id}, using fallback")
@@ -252,10 +276,16 @@ def get_team_opponent_stats(team_id: int, season: str = '2025-26') -> Optional[D
     }
 
 
-def get_team_stats_with_ranks(team_id: int, season: str = '2025-26') -> Optional[Dict]:
+@scoped_cache
+def get_team_stats_with_ranks(team_id: int, season: str = '2025-26', team_context=None) -> Optional[Dict]:
     """
     Get team stats with league rankings (replaces team_rankings.py)
 
+    Args:
+        team_id: NBA team ID
+        season: Season string
+        team_context: Optional TeamContext to read from instead of SQLite
+
     Returns:
         {
             'team_id': int,
@@ -268,22 +298,12 @@ def get_team_stats_with_ranks(team_id: int, season: str = '2025-26') -> Optional
             }
         }
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-
     # Get team abbreviation
     team = get_team_by_id(team_id)
     if not team:
         return None
 
-    cursor.execute('''
-        SELECT *
-        FROM team_season_stats
-        WHERE team_id = ? AND season = ? AND split_type = 'overall'
-    ''', (team_id, season))
-
-    row = cursor.fetchone()
-    conn.close()
+    row = _get_overall_season_row(team_id, season, team_context)
 
     if not row:
         return None
@@ -320,7 +340,9 @@ def get_team_stats_with_ranks(team_id: int, season: str = '2025-26') -> Optional
 # GAME LOGS QUERIES
 # ============================================================================
 
-def get_team_last_n_games(team_id: int, n: int = 5, season: str = '2025-26') -> List[Dict]:
+@scoped_cache
+def get_team_last_n_games(team_id: int, n: int = 5, season: str = '2025-26',
+                          team_context=None) -> List[Dict]:
     """
     Get team's last N games
 
@@ -328,13 +350,20 @@ def get_team_last_n_games(team_id: int, n: int = 5, season: str = '2025-26') ->
         List of game dicts with GAME_ID, GAME_DATE, MATCHUP, PTS, OPP_PTS, WL, etc.
 
     Note: If GAME_FILTER_MODE=REGULAR_PLUS_ALL_CUP, only returns Regular Season + NBA Cup games
+    Pass team_context to read from a TeamContext instead of SQLite.
     """
     import os
+    filter_mode = os.environ.get('GAME_FILTER_MODE', 'DISABLED')
+
+    team_context = team_context or get_scoped_team_context(team_id, season)
+    if team_context is not None:
+        rows = team_context.last_n_games(n, eligible_only=(filter_mode == 'REGULAR_PLUS_ALL_CUP'))
+        return _format_game_log_rows(team_id, rows)
+
     conn = _get_db_connection()
     cursor = conn.cursor()
 
     # Apply game filtering if enabled
-    filter_mode = os.environ.get('GAME_FILTER_MODE', 'DISABLED')
     if filter_mode == 'REGULAR_PLUS_ALL_CUP':
         cursor.execute('''
             SELECT *
@@ -356,6 +385,11 @@ def get_team_last_n_games(team_id: int, n: int = 5, season: str = '2025-26') ->
     rows = cursor.fetchall()
     conn.close()
 
+    return _format_game_log_rows(team_id, rows)
+
+
+def _format_game_log_rows(team_id: int, rows) -> List[Dict]:
+    """Convert team_game_logs rows to the nba_api-style game dicts"""
     if not rows:
         logger.warning(f"No game logs found for team {team_id}, returning empty list")
         return []
@@ -617,6 +651,87 @@ def get_todays_games(season: str = '2025-26') -> List[Dict]:
         for row in rows
     ]
 
+
+def get_games_by_ids(game_ids: List[str], season: str = '2025-26') -> List[Dict]:
+    """
+    Get scheduled games by ID (todays_games first, then historical games table)
+
+    Args:
+        game_ids: List of NBA game IDs
+        season: Season string
+
+    Returns:
+        List of game dicts (same shape as get_todays_games) in the order of
+        game_ids. Unknown IDs are skipped.
+    """
+    if not game_ids:
+        return []
+
+    game_ids = [str(gid) for gid in game_ids]
+    placeholders = ','.join('?' * len(game_ids))
+
+    conn = _get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(f'''
+        SELECT *
+        FROM todays_games
+        WHERE game_id IN ({placeholders}) AND season = ?
+    ''', (*game_ids, season))
+
+    found = {
+        row['game_id']: {
+            'game_id': row['game_id'],
+            'game_date': row['game_date'],
+            'game_status': row['game_status_text'],
+            'home_team_id': row['home_team_id'],
+            'home_team_name': row['home_team_name'],
+            'home_team_score': row['home_team_score'],
+            'away_team_id': row['away_team_id'],
+            'away_team_name': row['away_team_name'],
+            'away_team_score': row['away_team_score'],
+        }
+        for row in cursor.fetchall()
+    }
+
+    # Fall back to the games table for historical game IDs
+    missing = [gid for gid in game_ids if gid not in found]
+    if missing:
+        placeholders = ','.join('?' * len(missing))
+        cursor.execute(f'''
+            SELECT
+                g.id as game_id,
+                g.game_date,
+                g.status,
+                g.home_team_id,
+                g.away_team_id,
+                g.home_score,
+                g.away_score,
+                ht.full_name as home_team_name,
+                at.full_name as away_team_name
+            FROM games g
+            JOIN nba_teams ht ON g.home_team_id = ht.team_id
+            JOIN nba_teams at ON g.away_team_id = at.team_id
+            WHERE g.id IN ({placeholders})
+        ''', missing)
+
+        for row in cursor.fetchall():
+            found[row['game_id']] = {
+                'game_id': row['game_id'],
+                'game_date': row['game_date'],
+                'game_status': row['status'],
+                'home_team_id': row['home_team_id'],
+                'home_team_name': row['home_team_name'],
+                'home_team_score': row['home_score'],
+                'away_team_id': row['away_team_id'],
+                'away_team_name': row['away_team_name'],
+                'away_team_score': row['away_score'],
+            }
+
+    conn.close()
+
+    return [found[gid] for gid in game_ids if gid in found]
+
 # ============================================================================
 # MATCHUP DATA (Combines multiple queries)
 # ============================================================================
@@ -648,17 +763,21 @@ def get_matchup_data(home_team_id: int, away_team_id: int,
     """
     logger.info(f"Fetching matchup data for teams {home_team_id} vs {away_team_id} from SQLite")
 
+    # One TeamContext per side serves all four lookups
+    home_ctx = get_team_context(home_team_id, season)
+    away_ctx = get_team_context(away_team_id, season)
+
     # Fetch home team data
-    home_stats = get_team_stats(home_team_id, season)
-    home_advanced = get_team_advanced_stats(home_team_id, season)
-    home_opponent = get_team_opponent_stats(home_team_id, season)
-    home_recent = get_team_last_n_games(home_team_id, n=10, season=season)
+    home_stats = get_team_stats(home_team_id, season, team_context=home_ctx)
+    home_advanced = get_team_advanced_stats(home_team_id, season, team_context=home_ctx)
+    home_opponent = get_team_opponent_stats(home_team_id, season, team_context=home_ctx)
+    home_recent = get_team_last_n_games(home_team_id, n=10, season=season, team_context=home_ctx)
 
     # Fetch away team data
-    away_stats = get_team_stats(away_team_id, season)
-    away_advanced = get_team_advanced_stats(away_team_id, season)
-    away_opponent = get_team_opponent_stats(away_team_id, season)
-    away_recent = get_team_last_n_games(away_team_id, n=10, season=season)
+    away_stats = get_team_stats(away_team_id, season, team_context=away_ctx)
+    away_advanced = get_team_advanced_stats(away_team_id, season, team_context=away_ctx)
+    away_opponent = get_team_opponent_stats(away_team_id, season, team_context=away_ctx)
+    away_recent = get_team_last_n_games(away_team_id, n=10, season=season, team_context=away_ctx)
 
     # Check if we got critical data
     if not home_stats or not away_stats:
@@ -764,6 +883,7 @@ def _get_league_average_fallback(season: str, stat_type: str) -> Dict:
 # TEAM PROFILES QUERIES
 # ============================================================================
 
+@scoped_cache
 def get_team_profile(team_id: int, season: str = '2025-26') -> Optional[Dict]:
     """
     Get team's prediction profile with weights and tier labels
@@ -864,6 +984,7 @@ def get_pace_bucket(pace: float) -> str:
         return 'normal'
 
 
+@scoped_cache
 def get_team_scoring_vs_pace(team_id: int, season: str = '2025-26') -> Optional[Dict]:
     """
     Get team's scoring splits by pace bucket
@@ -929,6 +1050,112 @@ def upsert_team_scoring_vs_pace(team_id: int, season: str, pace_bucket: str,
     conn.close()
 
 
+# ============================================================================
+# TEAM ARCHETYPES (Snapshot written by the derived pipeline)
+# ============================================================================
+
+def _get_game_log_stamp(cursor, season: str) -> str:
+    """
+    Stamp identifying the current contents of team_game_logs for a season.
+
+    Game logs are written with INSERT OR REPLACE, so any new or rewritten
+    row raises MAX(rowid).
+    """
+    cursor.execute('''
+        SELECT COUNT(*), MAX(rowid)
+        FROM team_game_logs
+        WHERE season = ?
+    ''', (season,))
+    count, max_rowid = cursor.fetchone()
+    return f'{count}:{max_rowid}'
+
+
+def get_game_log_stamp(season: str = '2025-26') -> str:
+    """Stamp identifying the current contents of team_game_logs for a season"""
+    conn = _get_db_connection()
+    try:
+        return _get_game_log_stamp(conn.cursor(), season)
+    finally:
+        conn.close()
+
+
+def get_stored_team_archetypes(season: str = '2025-26') -> Optional[Dict]:
+    """
+    Get the stored archetype assignments for all teams
+
+    Returns:
+        {team_id: assignment} as produced by assign_all_team_archetypes(),
+        or None if no snapshot exists or game logs changed since it was built
+    """
+    conn = _get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute('''
+            SELECT team_id, payload, source_stamp
+            FROM team_archetype_assignments
+            WHERE season = ?
+        ''', (season,))
+        rows = cursor.fetchall()
+
+        if not rows:
+            return None
+
+        current_stamp = _get_game_log_stamp(cursor, season)
+        if any(row['source_stamp'] != current_stamp for row in rows):
+            return None
+
+        return {row['team_id']: json.loads(row['payload']) for row in rows}
+
+    except sqlite3.OperationalError:
+        # Table not created yet (migration v15 not applied)
+        return None
+    finally:
+        conn.close()
+
+
+def upsert_team_archetypes(season: str, assignments: Dict, source_stamp: str) -> int:
+    """
+    Replace the stored archetype assignments for a season
+
+    Args:
+        season: Season string
+        assignments: {team_id: assignment} from assign_all_team_archetypes()
+        source_stamp: get_game_log_stamp() taken before the assignments were computed
+
+    Returns:
+        Number of teams stored
+    """
+    conn = _get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS team_archetype_assignments (
+            team_id INTEGER NOT NULL,
+            season TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            source_stamp TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (team_id, season)
+        )
+    ''')
+
+    updated_at = datetime.now(timezone.utc).isoformat()
+    cursor.execute('DELETE FROM team_archetype_assignments WHERE season = ?', (season,))
+    cursor.executemany('''
+        INSERT INTO team_archetype_assignments (team_id, season, payload, source_stamp, updated_at)
+        VALUES (?, ?, ?, ?, ?)
+    ''', [
+        (int(team_id), season, json.dumps(assignment), source_stamp, updated_at)
+        for team_id, assignment in assignments.items()
+    ])
+
+    conn.commit()
+    conn.close()
+
+    return len(assignments)
+
+
 # ============================================================================
 # DATA FRESHNESS
 # ============================================================================
@@ -6,6 +6,7 @@ Reviews include actual scores extracted from screenshots and AI-generated analys
 
 Tables:
 - game_reviews: Post-game review data with AI analysis
+- coach_summaries: Daily Model Coach summary per date (coach_summary_cache)
 
 Usage:
     from api.utils.db_schema_game_reviews import init_game_reviews_db
@@ -19,18 +20,22 @@ from contextlib import contextmanager
 # Import centralized database configuration
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
 
 # Database file location
 GAME_REVIEWS_DB_PATH = get_db_path('game_reviews.db')
 
+# Database paths whose coach_summaries table has been checked this process
+_coach_summaries_ready = set()
+
 
 @contextmanager
 def get_connection():
-    """Get a connection to the game reviews database"""
-    conn = sqlite3.connect(GAME_REVIEWS_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
+    """Get this thread's shared connection to the game reviews database"""
+    conn = get_shared_connection(GAME_REVIEWS_DB_PATH)
     try:
         yield conn
     finally:
@@ -105,9 +110,39 @@ def init_game_reviews_db():
         ''')
 
         conn.commit()
+        ensure_coach_summaries_table(conn)
         print(f"[DB] Game reviews database initialized at: {GAME_REVIEWS_DB_PATH}")
 
 
+def ensure_coach_summaries_table(conn):
+    """
+    Create the coach_summaries table if it doesn't exist.
+
+    Called lazily by coach_summary_cache, since nothing runs
+    init_game_reviews_db() on deploy.
+    """
+    if GAME_REVIEWS_DB_PATH in _coach_summaries_ready:
+        return
+    # ====================================================================
+    # COACH SUMMARIES TABLE (one daily Model Coach summary per date)
+    # ====================================================================
+    # review_set_hash covers the (game_id, updated_at) of the reviews the
+    # summary was generated from; a mismatch means it needs regenerating
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS coach_summaries (
+            game_date TEXT PRIMARY KEY,
+            review_set_hash TEXT NOT NULL,
+            review_count INTEGER NOT NULL,
+            summary_json TEXT NOT NULL,
+            model TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    ''')
+    conn.commit()
+    _coach_summaries_ready.add(GAME_REVIEWS_DB_PATH)
+
+
 if __name__ == '__main__':
     # Initialize database when run directly
     init_game_reviews_db()
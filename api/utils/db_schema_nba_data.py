@@ -24,8 +24,10 @@ from contextlib import contextmanager
 # Import centralized database configuration
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
 
 # Database file location
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
@@ -33,9 +35,8 @@ NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 @contextmanager
 def get_connection():
-    """Get a connection to the NBA data database"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
+    """Get this thread's shared connection to the NBA data database"""
+    conn = get_shared_connection(NBA_DATA_DB_PATH)
     try:
         yield conn
     finally:
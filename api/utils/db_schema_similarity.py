@@ -13,13 +13,17 @@ import sqlite3
 import os
 from typing import Optional
 
+try:
+    from api.utils.connection_pool import get_shared_connection
+except ImportError:
+    from connection_pool import get_shared_connection
+
 DB_PATH = os.path.join(os.path.dirname(__file__), '../data/team_similarity.db')
 
 
 def get_connection():
-    """Get database connection with foreign keys enabled"""
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
+    """Get this thread's shared connection with foreign keys enabled (close() releases it)"""
+    conn = get_shared_connection(DB_PATH)
     conn.execute("PRAGMA foreign_keys = ON")
     return conn
 
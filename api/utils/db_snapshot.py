@@ -0,0 +1,155 @@
+"""
+Read-Only Snapshots of nba_data.db for Request Serving
+
+With DB_SNAPSHOT_SERVING=1, read-only shared connections to nba_data.db
+(get_shared_connection(..., readonly=True)) are served from an in-memory
+copy of the last published snapshot instead of the live WAL database, so
+request reads never wait on the sync writer and never see a half-finished
+sync.
+
+publish_snapshot() copies the live database with the SQLite backup API
+into nba_data.snapshot.db next to it: written to a temporary file, switched
+out of WAL mode, then moved into place with os.replace() so readers see
+either the old file or the new one. Every successful sync publishes when it
+finishes, before any warm-up reads from it (sync_nba_data._after_sync).
+
+Every process notices a new snapshot file on its next read-only checkout
+(one os.stat), loads its bytes once, and each thread deserializes them into
+its own :memory: connection. Queries already running keep the connection
+they started on, so a swap never interrupts them.
+
+Writers, and readers of tables written at request time (summary caches,
+writeups), keep using writable connections to the live database.
+
+Usage:
+    from api.utils.db_snapshot import publish_snapshot, ensure_snapshot
+
+    publish_snapshot()   # After writing nba_data.db
+    ensure_snapshot()    # At startup: publish if missing or older than the live DB
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+try:
+    from api.utils.db_config import get_db_path
+except ImportError:
+    from db_config import get_db_path
+
+# Only databases written by the sync job are served from snapshots
+SNAPSHOT_DATABASES = ('nba_data.db',)
+SNAPSHOT_SUFFIX = '.snapshot.db'
+
+# snapshot path -> (version, database bytes)
+_loaded: Dict[str, Tuple[tuple, bytes]] = {}
+_load_lock = threading.Lock()
+
+
+def snapshot_serving_enabled() -> bool:
+    """True when read-only connections should use published snapshots"""
+    return os.environ.get('DB_SNAPSHOT_SERVING') == '1'
+
+
+def snapshot_path(db_path: str) -> str:
+    """Snapshot file published for a live database path"""
+    return os.path.splitext(db_path)[0] + SNAPSHOT_SUFFIX
+
+
+def publish_snapshot(db_path: Optional[str] = None) -> Dict:
+    """
+    Copy the live database into its snapshot file (atomic replace).
+
+    Args:
+        db_path: Live database (default: nba_data.db)
+
+    Returns:
+        {'path': str, 'bytes': int, 'duration_ms': float}
+    """
+    db_path = db_path or get_db_path('nba_data.db')
+    target = snapshot_path(db_path)
+    temp = f'{target}.{os.getpid()}.{threading.get_ident()}.tmp'
+    start = time.perf_counter()
+
+    source = sqlite3.connect(db_path, timeout=30.0)
+    dest = sqlite3.connect(temp)
+    try:
+        source.backup(dest)
+        # Deserialized databases cannot be in WAL mode
+        dest.execute('PRAGMA journal_mode=DELETE')
+    finally:
+        dest.close()
+        source.close()
+    os.replace(temp, target)
+
+    size = os.path.getsize(target)
+    duration_ms = (time.perf_counter() - start) * 1000
+    print(f"[db_snapshot] Published {os.path.basename(target)} ({size / 1024:.0f} KB in {duration_ms:.0f}ms)")
+    return {'path': target, 'bytes': size, 'duration_ms': round(duration_ms, 1)}
+
+
+def ensure_snapshot(db_path: Optional[str] = None) -> Optional[Dict]:
+    """
+    Publish a snapshot if none exists or the live database changed since.
+
+    Returns:
+        publish_snapshot() result, or None if the snapshot is current
+    """
+    db_path = db_path or get_db_path('nba_data.db')
+    if not os.path.exists(db_path):
+        return None
+    try:
+        published = os.path.getmtime(snapshot_path(db_path))
+    except OSError:
+        return publish_snapshot(db_path)
+
+    live = max(os.path.getmtime(path) for path in (db_path, db_path + '-wal') if os.path.exists(path))
+    if live > published:
+        return publish_snapshot(db_path)
+    return None
+
+
+def load_snapshot(db_path: str) -> Optional[Tuple[tuple, bytes]]:
+    """
+    The current snapshot of db_path if snapshot serving applies to it.
+
+    Returns:
+        (version, database bytes), or None to read the live database
+    """
+    if os.path.basename(db_path) not in SNAPSHOT_DATABASES or not snapshot_serving_enabled():
+        return None
+
+    path = snapshot_path(db_path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    version = (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    loaded = _loaded.get(path)
+    if loaded is not None and loaded[0] == version:
+        return loaded
+
+    with _load_lock:
+        loaded = _loaded.get(path)
+        if loaded is None or loaded[0] != version:
+            with open(path, 'rb') as f:
+                loaded = _loaded[path] = (version, f.read())
+    return loaded
+
+
+def get_snapshot_status(db_path: Optional[str] = None) -> Dict:
+    """Snapshot file age and size, and whether this process serves from it"""
+    db_path = db_path or get_db_path('nba_data.db')
+    path = snapshot_path(db_path)
+    status = {'enabled': snapshot_serving_enabled(), 'path': path, 'exists': os.path.exists(path)}
+    if status['exists']:
+        st = os.stat(path)
+        status['bytes'] = st.st_size
+        status['age_seconds'] = round(time.time() - st.st_mtime, 1)
+        loaded = _loaded.get(path)
+        status['loaded_version_current'] = (loaded is not None and
+                                            loaded[0] == (st.st_ino, st.st_mtime_ns, st.st_size))
+    return status
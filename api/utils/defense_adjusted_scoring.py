@@ -13,9 +13,11 @@ logger = logging.getLogger(__name__)
 # Import database utilities
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
     from api.utils.defense_tiers import get_defense_tier
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
     from defense_tiers import get_defense_tier
 
 import sqlite3
@@ -24,10 +26,8 @@ NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
 
 
 def get_defense_adjusted_ppg(
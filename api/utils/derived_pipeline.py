@@ -0,0 +1,700 @@
+"""
+Derived Table Pipeline
+
+Rebuilds the data derived from synced NBA data after a sync. Each stage
+declares the artifacts it reads and writes. A sync reports which base inputs
+changed (team_season_stats, team_game_logs) and for which teams, and only the
+stages downstream of those changes are rebuilt:
+
+    stage                   scope   reads                                  writes
+    season_opponent_stats   team    team_game_logs                         opp_* columns in team_season_stats
+    ppp_metrics             team    team_game_logs                         ppp_* columns in team_season_stats
+    scoring_vs_pace         team    team_game_logs                         team_scoring_vs_pace
+    rankings                league  team_season_stats, opponent stats      *_rank columns
+    three_pt_defense_ranks  league  opponent stats                         opp_fg3_pct_rank
+    opponent_rank_snapshots league  team_game_logs                         opponent_rank_snapshots
+    team_feature_snapshots  team    team_game_logs                         team_feature_snapshots
+    league_averages         league  team_season_stats                      league_averages
+    team_profiles           league  season stats, game logs, rankings      team_profiles
+    team_archetypes         league  team_game_logs                         team_archetype_assignments
+    similarity              league  team_season_stats, team_game_logs      team_similarity.db
+
+Team-scoped stages only recompute the changed teams. League-scoped stages
+(ranks, z-scores, clustering) recompute everyone once any input changed.
+
+Stages whose upstream stages are done run concurrently. SQLite allows one
+writer per database file, so stages writing the same database take turns on
+a lock; a stage's read-only prepare step runs outside it. Each stage is
+recorded in data_sync_log with its duration, as sync_type 'derived:<stage>'
+under the sync's run_id (a step of that run, not a run of its own).
+
+Usage:
+    from api.utils.derived_pipeline import rebuild_derived_tables
+
+    # Incremental sync where two teams played
+    rebuild_derived_tables('2025-26', {'team_season_stats': None,
+                                       'team_game_logs': {1610612738, 1610612747}})
+
+    # Rebuild everything
+    rebuild_derived_tables('2025-26', {'team_season_stats': None, 'team_game_logs': None})
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from datetime import datetime, timezone, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
+    from api.utils.season_opponent_stats_aggregator import update_team_season_opponent_stats
+    from api.utils.ppp_aggregator import update_team_season_ppp
+except ImportError:
+    from db_config import get_db_path
+    from connection_pool import get_shared_connection
+    from season_opponent_stats_aggregator import update_team_season_opponent_stats
+    from ppp_aggregator import update_team_season_ppp
+
+NBA_DATA_DB_PATH = get_db_path('nba_data.db')
+
+# Stages running at once (writers to the same database still take turns)
+DERIVED_PIPELINE_WORKERS = int(os.environ.get('DERIVED_PIPELINE_WORKERS', '3'))
+
+# data_sync_log sync_type of a stage row: prefix + stage name. Some stage
+# names (team_profiles, scoring_vs_pace) are also standalone sync types.
+STAGE_SYNC_TYPE_PREFIX = 'derived:'
+
+# (stat, higher_is_better) for the overall-split *_rank columns
+RANKED_STATS = [
+    ('ppg', True), ('fg_pct', True), ('fg3_pct', True), ('ft_pct', True),
+    ('off_rtg', True), ('net_rtg', True), ('pace', True), ('opp_tov', True),
+    ('opp_ppg', False), ('def_rtg', False), ('opp_assists', False),
+]
+
+PPP_COLUMNS = ('ppp_season', 'ppp_last10', 'ppp_last5')
+
+
+def _get_db_connection() -> sqlite3.Connection:
+    """Get this thread's shared connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH)
+
+
+def _season_team_ids(cursor, season: str) -> List[int]:
+    """Teams with an overall team_season_stats row"""
+    cursor.execute('''
+        SELECT DISTINCT team_id FROM team_season_stats
+        WHERE season = ? AND split_type = 'overall'
+        ORDER BY team_id
+    ''', (season,))
+    return [row['team_id'] for row in cursor.fetchall()]
+
+
+# ============================================================================
+# STAGE IMPLEMENTATIONS
+# ============================================================================
+
+def _compute_opponent_3pt_stats_from_game_logs(cursor, season: str, team_ids: List[int]):
+    """
+    Compute opponent 3PT stats from game logs.
+    This calculates how many 3PT the opponent made against this team.
+    """
+    for team_id in team_ids:
+        cursor.execute('''
+            SELECT
+                AVG(opp_fg3m) as avg_opp_fg3m,
+                AVG(opp_fg3a) as avg_opp_fg3a
+            FROM (
+                SELECT tgl_opp.fg3m as opp_fg3m, tgl_opp.fg3a as opp_fg3a
+                FROM team_game_logs tgl
+                JOIN team_game_logs tgl_opp
+                    ON tgl.game_id = tgl_opp.game_id
+                    AND tgl.team_id != tgl_opp.team_id
+                WHERE tgl.team_id = ?
+                    AND tgl.season = ?
+                    AND tgl_opp.fg3m IS NOT NULL
+            )
+        ''', (team_id, season))
+
+        result = cursor.fetchone()
+        if result and result['avg_opp_fg3m'] is not None:
+            opp_fg3m = float(result['avg_opp_fg3m'])
+            opp_fg3a = float(result['avg_opp_fg3a'])
+            opp_fg3_pct = (opp_fg3m / opp_fg3a * 100) if opp_fg3a > 0 else 0
+
+            cursor.execute('''
+                UPDATE team_season_stats
+                SET opp_fg3m = ?, opp_fg3a = ?, opp_fg3_pct = ?
+                WHERE team_id = ? AND season = ? AND split_type = 'overall'
+            ''', (opp_fg3m, opp_fg3a, opp_fg3_pct, team_id, season))
+
+    logger.info(f"Computed opponent 3PT stats from game logs for {len(team_ids)} teams")
+
+
+def _build_season_opponent_stats(season: str, team_ids: Optional[List[int]], prepared=None) -> int:
+    """Aggregate per-game opponent stats into team_season_stats for each team"""
+    conn = _get_db_connection()
+    try:
+        cursor = conn.cursor()
+        if team_ids is None:
+            team_ids = _season_team_ids(cursor, season)
+
+        _compute_opponent_3pt_stats_from_game_logs(cursor, season, team_ids)
+        conn.commit()
+    finally:
+        conn.close()
+
+    updated = 0
+    for team_id in team_ids:
+        try:
+            # Update for all three split types: overall, home, away
+            for split_type in ('overall', 'home', 'away'):
+                update_team_season_opponent_stats(team_id, season, split_type)
+            updated += 1
+        except Exception as e:
+            logger.error(f"Error aggregating opponent stats for team {team_id}: {e}")
+
+    return updated
+
+
+def _build_ppp_metrics(season: str, team_ids: Optional[List[int]], prepared=None) -> int:
+    """Recompute season and rolling PPP for each team and split"""
+    conn = _get_db_connection()
+    try:
+        cursor = conn.cursor()
+        columns = {row['name'] for row in cursor.execute('PRAGMA table_info(team_season_stats)')}
+        if not all(col in columns for col in PPP_COLUMNS):
+            logger.warning("PPP columns missing from team_season_stats (run migrate_to_v14_ppp_metrics), skipping")
+            return 0
+
+        cursor.execute('''
+            SELECT team_id, split_type FROM team_season_stats
+            WHERE season = ?
+            ORDER BY team_id, split_type
+        ''', (season,))
+        splits = [(row['team_id'], row['split_type']) for row in cursor.fetchall()
+                  if team_ids is None or row['team_id'] in team_ids]
+    finally:
+        conn.close()
+
+    for team_id, split_type in splits:
+        update_team_season_ppp(team_id, season, split_type)
+
+    return len(splits)
+
+
+def build_scoring_vs_pace(season: str, team_ids: Optional[List[int]] = None, prepared=None) -> int:
+    """
+    Compute each team's scoring average by pace bucket
+
+    Args:
+        season: Season string
+        team_ids: Only recompute these teams (None = all teams). Each team's
+                  splits depend only on its own game logs.
+
+    Returns:
+        Number of team/bucket rows written
+    """
+    try:
+        from api.utils.db_queries import get_pace_bucket, upsert_team_scoring_vs_pace
+        from api.utils.pace_constants import MIN_GAMES_PER_BUCKET
+    except ImportError:
+        from db_queries import get_pace_bucket, upsert_team_scoring_vs_pace
+        from pace_constants import MIN_GAMES_PER_BUCKET
+
+    conn = _get_db_connection()
+    cursor = conn.cursor()
+
+    if team_ids is None:
+        cursor.execute('SELECT team_id FROM nba_teams WHERE season = ?', (season,))
+        team_ids = [row[0] for row in cursor.fetchall()]
+
+    logger.info(f"Computing scoring vs pace for {len(team_ids)} teams")
+
+    records_synced = 0
+
+    for team_id in team_ids:
+        try:
+            cursor.execute('''
+                SELECT team_pts, pace
+                FROM team_game_logs
+                WHERE team_id = ? AND season = ?
+                    AND team_pts IS NOT NULL
+                    AND pace IS NOT NULL
+            ''', (team_id, season))
+
+            games = cursor.fetchall()
+
+            if not games:
+                logger.info(f"Team {team_id} has no game logs with pace data, skipping")
+                continue
+
+            # Classify games into pace buckets and calculate averages
+            buckets = {'slow': [], 'normal': [], 'fast': []}
+            for team_pts, pace in games:
+                buckets[get_pace_bucket(pace)].append(team_pts)
+
+            updated_at = datetime.now(timezone.utc).isoformat()
+
+            for bucket_name, points_list in buckets.items():
+                if len(points_list) >= MIN_GAMES_PER_BUCKET:
+                    avg_points = sum(points_list) / len(points_list)
+                    games_count = len(points_list)
+
+                    # Use separate connection for upsert (avoid nesting issues)
+                    upsert_team_scoring_vs_pace(
+                        team_id=team_id,
+                        season=season,
+                        pace_bucket=bucket_name,
+                        avg_points=avg_points,
+                        games=games_count,
+                        updated_at=updated_at
+                    )
+                    records_synced += 1
+                    logger.info(
+                        f"Team {team_id} {bucket_name} pace: {avg_points:.1f} PPG "
+                        f"({games_count} games)"
+                    )
+                else:
+                    logger.info(
+                        f"Team {team_id} {bucket_name} pace: insufficient games "
+                        f"({len(points_list)} < {MIN_GAMES_PER_BUCKET})"
+                    )
+
+        except Exception as e:
+            logger.error(f"Error computing scoring vs pace for team {team_id}: {e}")
+            # Continue with other teams
+
+    conn.close()
+    return records_synced
+
+
+def _rank_stat(cursor, season: str, stat: str, higher_is_better: bool) -> int:
+    """Write {stat}_rank for the overall split of every NBA team (1 = best)"""
+    order = 'DESC' if higher_is_better else 'ASC'
+    cursor.execute(f'''
+        SELECT team_id FROM team_season_stats
+        WHERE season = ? AND split_type = 'overall' AND {stat} IS NOT NULL
+            AND team_id IN (SELECT team_id FROM nba_teams WHERE season = ?)
+        ORDER BY {stat} {order}, team_id
+    ''', (season, season))
+
+    ranked = [(rank, row['team_id'], season) for rank, row in enumerate(cursor.fetchall(), start=1)]
+    cursor.executemany(f'''
+        UPDATE team_season_stats
+        SET {stat}_rank = ?
+        WHERE team_id = ? AND season = ? AND split_type = 'overall'
+    ''', ranked)
+    return len(ranked)
+
+
+def _build_rankings(season: str, team_ids: Optional[List[int]], prepared=None) -> int:
+    """Rank every team on each stat in RANKED_STATS"""
+    conn = _get_db_connection()
+    try:
+        cursor = conn.cursor()
+        ranked = 0
+        for stat, higher_is_better in RANKED_STATS:
+            ranked = max(ranked, _rank_stat(cursor, season, stat, higher_is_better))
+        conn.commit()
+        return ranked
+    finally:
+        conn.close()
+
+
+def _build_three_pt_defense_ranks(season: str, team_ids: Optional[List[int]], prepared=None) -> int:
+    """Compute 3PT defense rankings (lower opp_fg3_pct is better)"""
+    conn = _get_db_connection()
+    try:
+        ranked = _rank_stat(conn.cursor(), season, 'opp_fg3_pct', higher_is_better=False)
+        conn.commit()
+        logger.info(f"Computed 3PT defense rankings for {ranked} teams")
+        return ranked
+    finally:
+        conn.close()
+
+
+def _build_opponent_rank_snapshots(season: str, team_ids: Optional[List[int]], prepared=None) -> int:
+    """Rewrite the per-game-date rank snapshots from the first changed date onward"""
+    try:
+        from api.utils.opponent_rank_snapshots import refresh_opponent_rank_snapshots
+    except ImportError:
+        from opponent_rank_snapshots import refresh_opponent_rank_snapshots
+
+    return refresh_opponent_rank_snapshots(season)
+
+
+def _build_team_feature_snapshots(season: str, team_ids: Optional[List[int]], prepared=None) -> int:
+    """Rewrite the changed teams' point-in-time features from their first changed game onward"""
+    try:
+        from api.utils.team_feature_store import refresh_team_feature_store
+    except ImportError:
+        from team_feature_store import refresh_team_feature_store
+
+    return refresh_team_feature_store(season, team_ids)
+
+
+def _build_league_averages(season: str, team_ids: Optional[List[int]], prepared=None) -> int:
+    """Calculate and save league averages from the overall season stats"""
+    conn = _get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT AVG(ppg), AVG(pace), AVG(off_rtg), AVG(def_rtg),
+                   AVG(fg_pct), AVG(fg3_pct), AVG(ft_pct), COUNT(*)
+            FROM team_season_stats
+            WHERE season = ? AND split_type = 'overall' AND ppg IS NOT NULL
+                AND team_id IN (SELECT team_id FROM nba_teams WHERE season = ?)
+        ''', (season, season))
+        row = cursor.fetchone()
+        if not row[7]:
+            return 0
+
+        cursor.execute('''
+            INSERT OR REPLACE INTO league_averages (
+                season, ppg, pace, off_rtg, def_rtg, fg_pct, fg3_pct, ft_pct, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (season, *row[:7], datetime.now(timezone.utc).isoformat()))
+        conn.commit()
+        return 1
+    finally:
+        conn.close()
+
+
+def build_team_profiles(season: str, team_ids: Optional[List[int]] = None, prepared=None) -> int:
+    """
+    Compute league references and save a prediction profile for every team
+
+    Profiles are classified against league references, so all teams are
+    rebuilt whenever any input changes.
+
+    Returns:
+        Number of profiles written
+
+    Raises:
+        ValueError: If league references cannot be computed (insufficient data)
+    """
+    try:
+        from api.utils.team_profile_classifier import compute_league_references, create_team_profile
+        from api.utils.db_queries import upsert_team_profile
+    except ImportError:
+        from team_profile_classifier import compute_league_references, create_team_profile
+        from db_queries import upsert_team_profile
+
+    conn = _get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        logger.info(f"Computing league references for {season}")
+        league_refs = compute_league_references(cursor, season)
+
+        if not league_refs:
+            raise ValueError("Failed to compute league references (insufficient data)")
+
+        cursor.execute('SELECT team_id FROM nba_teams WHERE season = ?', (season,))
+        all_team_ids = [row[0] for row in cursor.fetchall()]
+
+        logger.info(f"Creating profiles for {len(all_team_ids)} teams")
+
+        profiles_synced = 0
+        for team_id in all_team_ids:
+            try:
+                profile = create_team_profile(cursor, team_id, season, league_refs)
+
+                if profile:
+                    # Save to database using separate connection (avoid nesting issues)
+                    upsert_team_profile(profile)
+                    profiles_synced += 1
+                else:
+                    # Team doesn't have enough data yet
+                    logger.info(f"Skipping profile for team {team_id} (insufficient data)")
+
+            except Exception as e:
+                logger.error(f"Error creating profile for team {team_id}: {e}")
+                # Continue with other teams
+
+        return profiles_synced
+    finally:
+        conn.close()
+
+
+def _prepare_team_archetypes(season: str, team_ids: Optional[List[int]]) -> Tuple[str, Dict]:
+    """Compute archetype assignments (read-only, runs outside the write lock)"""
+    try:
+        from api.utils.archetype_classifier import assign_all_team_archetypes
+        from api.utils.db_queries import get_game_log_stamp
+    except ImportError:
+        from archetype_classifier import assign_all_team_archetypes
+        from db_queries import get_game_log_stamp
+
+    # Stamp before computing: a sync landing mid-computation leaves the
+    # snapshot looking stale rather than current
+    source_stamp = get_game_log_stamp(season)
+    return source_stamp, assign_all_team_archetypes(season)
+
+
+def _build_team_archetypes(season: str, team_ids: Optional[List[int]], prepared) -> int:
+    """Store the archetype assignments computed by _prepare_team_archetypes"""
+    try:
+        from api.utils.db_queries import upsert_team_archetypes
+    except ImportError:
+        from db_queries import upsert_team_archetypes
+
+    source_stamp, assignments = prepared
+    return upsert_team_archetypes(season, assignments, source_stamp)
+
+
+def _build_similarity(season: str, team_ids: Optional[List[int]], prepared=None) -> int:
+    """Recompute similarity scores and clusters (team_similarity.db)"""
+    try:
+        from api.utils.team_similarity import refresh_similarity_engine
+    except ImportError:
+        from team_similarity import refresh_similarity_engine
+
+    result = refresh_similarity_engine(season)
+    return result['teams_processed']
+
+
+# ============================================================================
+# STAGE GRAPH
+# ============================================================================
+
+@dataclass(frozen=True)
+class DerivedStage:
+    """
+    One derived artifact and how to rebuild it
+
+    build(season, team_ids, prepared) writes the artifact and returns a record
+    count. team_ids is None for league-scoped stages or when every team
+    changed. prepare(season, team_ids), if set, does read-only work outside
+    the database write lock and its result is passed to build.
+    """
+    name: str
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    build: Callable[[str, Optional[List[int]], Any], int]
+    scope: str = 'league'  # 'team' or 'league'
+    database: str = 'nba_data.db'
+    prepare: Optional[Callable[[str, Optional[List[int]]], Any]] = None
+
+
+# Base inputs written by the sync itself
+BASE_INPUTS = ('team_season_stats', 'team_game_logs')
+
+# Declared in dependency order: every stage comes after the stages it reads from
+STAGES = [
+    DerivedStage('season_opponent_stats', ('team_game_logs',), ('season_opponent_stats',),
+                 _build_season_opponent_stats, scope='team'),
+    DerivedStage('ppp_metrics', ('team_game_logs',), ('ppp_metrics',),
+                 _build_ppp_metrics, scope='team'),
+    DerivedStage('scoring_vs_pace', ('team_game_logs',), ('team_scoring_vs_pace',),
+                 build_scoring_vs_pace, scope='team'),
+    DerivedStage('rankings', ('team_season_stats', 'season_opponent_stats'), ('rankings',),
+                 _build_rankings),
+    DerivedStage('three_pt_defense_ranks', ('season_opponent_stats',), ('three_pt_defense_ranks',),
+                 _build_three_pt_defense_ranks),
+    DerivedStage('opponent_rank_snapshots', ('team_game_logs',), ('opponent_rank_snapshots',),
+                 _build_opponent_rank_snapshots),
+    DerivedStage('team_feature_snapshots', ('team_game_logs',), ('team_feature_snapshots',),
+                 _build_team_feature_snapshots, scope='team'),
+    DerivedStage('league_averages', ('team_season_stats',), ('league_averages',),
+                 _build_league_averages),
+    DerivedStage('team_profiles', ('team_season_stats', 'team_game_logs', 'rankings'), ('team_profiles',),
+                 build_team_profiles),
+    DerivedStage('team_archetypes', ('team_game_logs',), ('team_archetypes',),
+                 _build_team_archetypes, prepare=_prepare_team_archetypes),
+    DerivedStage('similarity', ('team_season_stats', 'team_game_logs'), ('team_similarity',),
+                 _build_similarity, database='team_similarity.db'),
+]
+
+
+def plan_rebuild(changed: Dict[str, Optional[Iterable[int]]],
+                 stages: List[DerivedStage] = STAGES) -> List[Tuple[DerivedStage, Optional[List[int]], List[str]]]:
+    """
+    Select the stages downstream of the changed inputs
+
+    Args:
+        changed: {artifact: team_ids that changed, or None for all teams}
+        stages: Stage graph in dependency order
+
+    Returns:
+        [(stage, team_ids or None for all teams, upstream stage names)] in dependency order
+    """
+    # Artifact -> changed teams (None = all); propagated through the graph
+    dirty: Dict[str, Optional[Set[int]]] = {
+        artifact: (None if team_ids is None else set(team_ids))
+        for artifact, team_ids in changed.items()
+    }
+    producers: Dict[str, str] = {}
+    plan = []
+
+    for stage in stages:
+        touched = [artifact for artifact in stage.inputs if artifact in dirty]
+        if not touched:
+            continue
+
+        team_ids: Optional[Set[int]] = set()
+        if stage.scope == 'league' or any(dirty[artifact] is None for artifact in touched):
+            team_ids = None
+        else:
+            for artifact in touched:
+                team_ids |= dirty[artifact]
+            if not team_ids:
+                continue
+
+        upstream = sorted({producers[artifact] for artifact in touched if artifact in producers})
+        plan.append((stage, sorted(team_ids) if team_ids is not None else None, upstream))
+
+        for artifact in stage.outputs:
+            dirty[artifact] = team_ids
+            producers[artifact] = stage.name
+
+    return plan
+
+
+# ============================================================================
+# EXECUTION
+# ============================================================================
+
+_db_locks: Dict[str, threading.Lock] = {}
+_db_locks_guard = threading.Lock()
+
+
+def _db_write_lock(database: str) -> threading.Lock:
+    """One writer per SQLite database file at a time"""
+    with _db_locks_guard:
+        if database not in _db_locks:
+            _db_locks[database] = threading.Lock()
+        return _db_locks[database]
+
+
+def _log_stage(stage_name: str, season: str, started_at: datetime, duration: float,
+               records: int, error: Optional[str], triggered_by: str, run_id: Optional[str]):
+    """Record a finished stage in data_sync_log (sync_type = prefix + stage name)"""
+    try:
+        with _db_write_lock('nba_data.db'):
+            conn = _get_db_connection()
+            try:
+                conn.execute('''
+                    INSERT INTO data_sync_log (
+                        sync_type, season, status, records_synced, error_message,
+                        started_at, completed_at, duration_seconds, triggered_by, run_id
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    STAGE_SYNC_TYPE_PREFIX + stage_name, season, 'success' if error is None else 'failed',
+                    records, error, started_at.isoformat(),
+                    (started_at + timedelta(seconds=duration)).isoformat(),
+                    duration, triggered_by, run_id
+                ))
+                conn.commit()
+            finally:
+                conn.close()
+    except sqlite3.Error as e:
+        logger.warning(f"Could not log derived stage {stage_name}: {e}")
+
+
+def _run_stage(stage: DerivedStage, season: str, team_ids: Optional[List[int]],
+               triggered_by: str, run_id: Optional[str], log_stages: bool) -> Dict:
+    """Run one stage, timing it and recording the outcome in the sync log"""
+    started_at = datetime.now(timezone.utc)
+    start = time.perf_counter()
+    records, error = 0, None
+
+    try:
+        prepared = stage.prepare(season, team_ids) if stage.prepare else None
+        with _db_write_lock(stage.database):
+            records = stage.build(season, team_ids, prepared)
+    except Exception as e:
+        error = f"{stage.name} failed: {e}"
+        logger.error(error)
+        import traceback
+        traceback.print_exc()
+
+    duration = time.perf_counter() - start
+    if log_stages:
+        _log_stage(stage.name, season, started_at, duration, records, error, triggered_by, run_id)
+
+    scope = 'all teams' if team_ids is None else f'{len(team_ids)} teams'
+    logger.info(f"[derived] {stage.name}: {records} records for {scope} in {duration:.2f}s")
+
+    return {
+        'records': records,
+        'error': error,
+        'duration_seconds': round(duration, 3),
+        'teams': None if team_ids is None else len(team_ids),
+    }
+
+
+def rebuild_derived_tables(
+    season: str,
+    changed: Dict[str, Optional[Iterable[int]]],
+    triggered_by: str = 'manual',
+    run_id: Optional[str] = None,
+    max_workers: int = DERIVED_PIPELINE_WORKERS,
+    stages: List[DerivedStage] = STAGES,
+    log_stages: bool = True
+) -> Dict[str, Dict]:
+    """
+    Rebuild the derived tables downstream of changed sync inputs
+
+    Args:
+        season: Season string
+        changed: {input: team_ids that changed, or None for all teams},
+                 e.g. {'team_game_logs': {1610612738, 1610612747}}
+        triggered_by: Recorded in data_sync_log
+        run_id: Sync run this rebuild belongs to
+        max_workers: Stages allowed to run at once
+        stages: Stage graph in dependency order
+        log_stages: Record each stage in data_sync_log
+
+    Returns:
+        {stage_name: {'records', 'error', 'duration_seconds', 'teams'}} for
+        every stage that ran or was skipped because an upstream stage failed
+    """
+    plan = plan_rebuild(changed, stages)
+    if not plan:
+        logger.info("[derived] No derived tables affected")
+        return {}
+
+    logger.info(f"[derived] Rebuilding {len(plan)} stages: {', '.join(stage.name for stage, _, _ in plan)}")
+
+    results: Dict[str, Dict] = {}
+    pending = {stage.name: (stage, team_ids, upstream) for stage, team_ids, upstream in plan}
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        while pending or running:
+            for name in list(pending):
+                stage, team_ids, upstream = pending[name]
+                if any(dep not in results for dep in upstream):
+                    continue
+
+                del pending[name]
+                failed = [dep for dep in upstream if results[dep]['error']]
+                if failed:
+                    results[name] = {
+                        'records': 0,
+                        'error': f"{name} skipped: upstream {', '.join(failed)} failed",
+                        'duration_seconds': 0.0,
+                        'teams': None if team_ids is None else len(team_ids),
+                    }
+                    continue
+
+                future = executor.submit(_run_stage, stage, season, team_ids,
+                                         triggered_by, run_id, log_stages)
+                running[future] = name
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+
+    return results
@@ -19,18 +19,20 @@ logger = logging.getLogger(__name__)
 # Import centralized database configuration
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
+    from api.utils.game_log_store import get_game_log_store, total
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
+    from game_log_store import get_game_log_store, total
 
 # Database path
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
 
 
 def safe_divide(numerator, denominator, decimals=3):
@@ -174,18 +176,6 @@ def calculate_team_conversion_score(normalized_to: float, normalized_oreb: float
     return round(score, 1)
 
 
-def _get_game_type_filter() -> str:
-    """
-    Get SQL WHERE clause for game_type filtering.
-
-    Always filters to Regular Season + NBA Cup (excludes Summer League, Preseason, etc.)
-
-    Returns:
-        SQL WHERE clause string
-    """
-    return "AND game_type IN ('Regular Season', 'NBA Cup')"
-
-
 def calculate_team_rates(team_id: int, season: str = '2025-26', limit: Optional[int] = None) -> Optional[Dict]:
     """
     Calculate team's offensive rates (how they score).
@@ -198,45 +188,25 @@ def calculate_team_rates(team_id: int, season: str = '2025-26', limit: Optional[
     Returns:
         Dict with to_pct, oreb_pct, ftr, games or None if insufficient data
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-
     try:
-        game_type_filter = _get_game_type_filter()
-
-        # Build query
-        query = f'''
-            SELECT
-                fga, fta, offensive_rebounds as oreb, turnovers as tov, opp_defensive_rebounds as opp_dreb
-            FROM team_game_logs
-            WHERE team_id = ?
-                AND season = ?
-                {game_type_filter}
-            ORDER BY game_date DESC
-        '''
-
-        if limit:
-            query += f' LIMIT {limit}'
-
-        cursor.execute(query, (team_id, season))
-        games = cursor.fetchall()
-
-        if not games or len(games) < 3:
-            logger.warning(f"Insufficient data for team {team_id}: {len(games) if games else 0} games")
-            conn.close()
+        # Regular Season + NBA Cup games only (excludes Summer League, Preseason, etc.)
+        store = get_game_log_store(season)
+        games = store.last_n(store.team_rows(team_id, eligible_only=True), limit or None)
+
+        if len(games) < 3:
+            logger.warning(f"Insufficient data for team {team_id}: {len(games)} games")
             return None
 
         # Aggregate totals
-        total_fga = sum(game['fga'] or 0 for game in games)
-        total_fta = sum(game['fta'] or 0 for game in games)
-        total_oreb = sum(game['oreb'] or 0 for game in games)
-        total_tov = sum(game['tov'] or 0 for game in games)
-        total_opp_dreb = sum(game['opp_dreb'] or 0 for game in games)
+        total_fga = total(store.values('fga', games))
+        total_fta = total(store.values('fta', games))
+        total_oreb = total(store.values('offensive_rebounds', games))
+        total_tov = total(store.values('turnovers', games))
+        total_opp_dreb = total(store.values('opp_defensive_rebounds', games))
 
         # Calculate possessions
         possessions = calculate_possessions(total_fga, total_fta, total_oreb, total_tov)
         if possessions is None or possessions == 0:
-            conn.close()
             return None
 
         # Calculate rates - multiply by 100 FIRST, then round
@@ -244,8 +214,6 @@ def calculate_team_rates(team_id: int, season: str = '2025-26', limit: Optional[
         oreb_pct = (safe_divide(total_oreb, total_oreb + total_opp_dreb, decimals=6) * 100) if (total_oreb + total_opp_dreb) > 0 else None
         ftr = (safe_divide(total_fta, total_fga, decimals=6) * 100) if total_fga > 0 else None
 
-        conn.close()
-
         return {
             'to_pct': round(to_pct, 1) if to_pct is not None else None,
             'oreb_pct': round(oreb_pct, 1) if oreb_pct is not None else None,
@@ -255,7 +223,6 @@ def calculate_team_rates(team_id: int, season: str = '2025-26', limit: Optional[
 
     except Exception as e:
         logger.error(f"Error calculating team rates for team {team_id}: {e}")
-        conn.close()
         return None
 
 
@@ -271,45 +238,25 @@ def calculate_opponent_rates_allowed(team_id: int, season: str = '2025-26', limi
     Returns:
         Dict with to_pct, oreb_pct, ftr, games or None if insufficient data
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-
     try:
-        game_type_filter = _get_game_type_filter()
-
-        # Build query - use opponent stats
-        query = f'''
-            SELECT
-                opp_fga, opp_fta, opp_offensive_rebounds as opp_oreb, opp_turnovers as opp_tov, defensive_rebounds as dreb
-            FROM team_game_logs
-            WHERE team_id = ?
-                AND season = ?
-                {game_type_filter}
-            ORDER BY game_date DESC
-        '''
-
-        if limit:
-            query += f' LIMIT {limit}'
-
-        cursor.execute(query, (team_id, season))
-        games = cursor.fetchall()
-
-        if not games or len(games) < 3:
-            logger.warning(f"Insufficient data for team {team_id} opponent rates: {len(games) if games else 0} games")
-            conn.close()
+        # Regular Season + NBA Cup games only (excludes Summer League, Preseason, etc.)
+        store = get_game_log_store(season)
+        games = store.last_n(store.team_rows(team_id, eligible_only=True), limit or None)
+
+        if len(games) < 3:
+            logger.warning(f"Insufficient data for team {team_id} opponent rates: {len(games)} games")
             return None
 
         # Aggregate totals (opponent stats)
-        total_opp_fga = sum(game['opp_fga'] or 0 for game in games)
-        total_opp_fta = sum(game['opp_fta'] or 0 for game in games)
-        total_opp_oreb = sum(game['opp_oreb'] or 0 for game in games)
-        total_opp_tov = sum(game['opp_tov'] or 0 for game in games)
-        total_dreb = sum(game['dreb'] or 0 for game in games)
+        total_opp_fga = total(store.values('opp_fga', games))
+        total_opp_fta = total(store.values('opp_fta', games))
+        total_opp_oreb = total(store.values('opp_offensive_rebounds', games))
+        total_opp_tov = total(store.values('opp_turnovers', games))
+        total_dreb = total(store.values('defensive_rebounds', games))
 
         # Calculate opponent possessions
         opp_possessions = calculate_possessions(total_opp_fga, total_opp_fta, total_opp_oreb, total_opp_tov)
         if opp_possessions is None or opp_possessions == 0:
-            conn.close()
             return None
 
         # Calculate what team allowed - multiply by 100 FIRST, then round
@@ -317,8 +264,6 @@ def calculate_opponent_rates_allowed(team_id: int, season: str = '2025-26', limi
         oreb_pct = (safe_divide(total_opp_oreb, total_opp_oreb + total_dreb, decimals=6) * 100) if (total_opp_oreb + total_dreb) > 0 else None
         ftr = (safe_divide(total_opp_fta, total_opp_fga, decimals=6) * 100) if total_opp_fga > 0 else None
 
-        conn.close()
-
         return {
             'to_pct': round(to_pct, 1) if to_pct is not None else None,
             'oreb_pct': round(oreb_pct, 1) if oreb_pct is not None else None,
@@ -328,7 +273,6 @@ def calculate_opponent_rates_allowed(team_id: int, season: str = '2025-26', limi
 
     except Exception as e:
         logger.error(f"Error calculating opponent rates allowed for team {team_id}: {e}")
-        conn.close()
         return None
 
 
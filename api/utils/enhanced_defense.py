@@ -11,6 +11,11 @@ import sqlite3
 import os
 from typing import Dict, Optional, Tuple
 
+try:
+    from api.utils.connection_pool import get_shared_connection
+except ImportError:
+    from connection_pool import get_shared_connection
+
 
 def get_db_path(db_name='nba_data.db'):
     """Get the path to the database file"""
@@ -93,8 +98,7 @@ def calculate_recent_defensive_trend(team_id: int, season: str = '2025-26', n_ga
     """
     try:
         db_path = get_db_path()
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
+        conn = get_shared_connection(db_path, readonly=True)
         cursor = conn.cursor()
 
         # Get season DRTG from team_season_stats (uses 'def_rtg' column)
@@ -148,8 +152,7 @@ def get_matchup_defensive_performance(
         Points allowed per game vs this opponent (or None if no history)
     """
     db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    conn = get_shared_connection(db_path, readonly=True)
     cursor = conn.cursor()
 
     # Get points allowed by defender when facing this offense
@@ -0,0 +1,249 @@
+"""
+Game Log Store - process-wide columnar copy of team_game_logs
+
+The split modules (scoring_splits, pace_splits, turnover_vs_pace, ...)
+each ran their own per-team SELECT over team_game_logs and walked the
+sqlite3.Row results in Python. The whole season is ~1,200 rows, so one
+query per season loads it into NumPy arrays instead:
+
+    columns     one array per team_game_logs column (float64 with NaN for
+                NULL; text columns as object arrays), plus opp_def_rtg_rank
+                (the opponent's overall def_rtg_rank from team_season_stats)
+    rows        sorted by team_id, then game_date DESC, so each team's
+                games are one contiguous slice, most recent first
+
+A snapshot is stamped with the data version it was loaded under and is
+reloaded the first time it is read after a sync changes that version.
+Snapshots are immutable; readers on other threads keep the one they got.
+
+Selections are arrays of row indices (most recent first), narrowed with
+the vectorized helpers and averaged with average():
+
+    store = get_game_log_store('2025-26')
+    rows = store.team_rows(team_id, eligible_only=True, require=('team_pts',))
+    average(store.values('team_pts', store.last_n(rows, 10)))
+    store.vs_defense_tier(rows, 'elite')
+    store.in_pace_bucket(rows, 'fast')
+
+Prediction scopes still read per-team TeamContext snapshots; the store
+serves the split endpoints and the SQL fallbacks outside a scope.
+"""
+
+import sqlite3
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+try:
+    from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
+    from api.utils.pace_constants import PACE_SLOW_THRESHOLD, PACE_FAST_THRESHOLD
+    from api.utils.prediction_cache import get_cached_data_version
+    from api.utils.team_context import ELIGIBLE_GAME_TYPES
+except ImportError:
+    from db_config import get_db_path
+    from connection_pool import get_shared_connection
+    from pace_constants import PACE_SLOW_THRESHOLD, PACE_FAST_THRESHOLD
+    from prediction_cache import get_cached_data_version
+    from team_context import ELIGIBLE_GAME_TYPES
+
+# Database path
+NBA_DATA_DB_PATH = get_db_path('nba_data.db')
+
+# Inclusive def_rtg_rank bounds per tier (same as defense_tiers.get_defense_tier)
+DEFENSE_TIER_RANKS = {
+    'elite': (1, 10),
+    'average': (11, 20),
+    'bad': (21, 30),
+}
+
+_snapshots: Dict[str, 'GameLogStore'] = {}
+_snapshots_lock = threading.Lock()
+
+
+def _get_db_connection() -> sqlite3.Connection:
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
+
+
+class GameLogStore:
+    """
+    One season of team_game_logs as NumPy columns.
+
+    Row selections are int arrays of row indices, most recent game first.
+    """
+
+    def __init__(self, season: str, data_version: str, columns: Dict[str, np.ndarray]):
+        self.season = season
+        self.data_version = data_version
+        self.columns = columns
+
+        team_ids = columns.get('team_id', np.empty(0))
+        teams, starts, counts = np.unique(team_ids, return_index=True, return_counts=True)
+        self._team_slices: Dict[int, Tuple[int, int]] = {
+            int(team): (int(start), int(start + count))
+            for team, start, count in zip(teams, starts, counts)
+        }
+        self._eligible = np.isin(columns.get('game_type', np.empty(0, dtype=object)), ELIGIBLE_GAME_TYPES)
+
+    def __len__(self):
+        return len(self._eligible)
+
+    def team_rows(self, team_id: int, eligible_only: bool = False,
+                  require: Iterable[str] = (), positive: Iterable[str] = ()) -> np.ndarray:
+        """
+        A team's games, most recent first.
+
+        Args:
+            team_id: NBA team ID
+            eligible_only: Only Regular Season + NBA Cup games
+            require: Columns that must not be NULL
+            positive: Columns that must be > 0 (NULL excluded)
+        """
+        start, stop = self._team_slices.get(int(team_id), (0, 0))
+        mask = np.ones(stop - start, dtype=bool)
+        if eligible_only:
+            mask &= self._eligible[start:stop]
+        for column in require:
+            mask &= ~np.isnan(self.columns[column][start:stop])
+        for column in positive:
+            mask &= self.columns[column][start:stop] > 0
+        return np.arange(start, stop)[mask]
+
+    @staticmethod
+    def last_n(rows: np.ndarray, n: Optional[int]) -> np.ndarray:
+        """The most recent n of a selection (all of them if n is None)"""
+        return rows if n is None else rows[:n]
+
+    def values(self, column: str, rows: np.ndarray) -> np.ndarray:
+        """A column's values for a selection"""
+        return self.columns[column][rows]
+
+    def at_home(self, rows: np.ndarray, home: bool = True) -> np.ndarray:
+        """Home (or away) games of a selection"""
+        return rows[self.columns['is_home'][rows] == (1 if home else 0)]
+
+    def vs_defense_tier(self, rows: np.ndarray, tier: str) -> np.ndarray:
+        """Games against an opponent in a defense tier (see DEFENSE_TIER_RANKS)"""
+        low, high = DEFENSE_TIER_RANKS[tier]
+        rank = self.columns['opp_def_rtg_rank'][rows]
+        return rows[(rank >= low) & (rank <= high)]
+
+    def in_pace_bucket(self, rows: np.ndarray, bucket: str) -> np.ndarray:
+        """
+        Games in a pace bucket (db_queries.get_pace_bucket thresholds):
+        slow < PACE_SLOW_THRESHOLD, fast > PACE_FAST_THRESHOLD, normal between.
+        """
+        pace = self.columns['pace'][rows]
+        if bucket == 'slow':
+            mask = pace < PACE_SLOW_THRESHOLD
+        elif bucket == 'fast':
+            mask = pace > PACE_FAST_THRESHOLD
+        else:
+            mask = (pace >= PACE_SLOW_THRESHOLD) & (pace <= PACE_FAST_THRESHOLD)
+        return rows[mask]
+
+    def in_pace_range(self, rows: np.ndarray, low: Optional[float] = None,
+                      high: Optional[float] = None) -> np.ndarray:
+        """Games with low <= pace < high (either bound optional), for modules with their own tiers"""
+        pace = self.columns['pace'][rows]
+        mask = ~np.isnan(pace)
+        if low is not None:
+            mask &= pace >= low
+        if high is not None:
+            mask &= pace < high
+        return rows[mask]
+
+    def __repr__(self):
+        return f"<GameLogStore {self.season}: {len(self)} games, {len(self._team_slices)} teams>"
+
+
+def average(values: np.ndarray, default=0, digits: Optional[int] = 1):
+    """
+    Mean of a column selection, as the split modules report it.
+
+    Summed left to right in Python so results match the row-by-row
+    sum(x) / len(x) they replace exactly.
+
+    Args:
+        values: Selected values (no NaN)
+        default: Returned when there are no values
+        digits: Decimal places to round to (None = unrounded)
+    """
+    if len(values) == 0:
+        return default
+    mean = sum(values.tolist()) / len(values)
+    return mean if digits is None else round(mean, digits)
+
+
+def total(values: np.ndarray) -> float:
+    """Sum of a column selection, NULLs counted as 0"""
+    return sum(np.nan_to_num(values).tolist())
+
+
+def _to_column(values: list) -> np.ndarray:
+    """float64 array (NaN for NULL) for numeric columns, object array otherwise"""
+    if all(v is None or isinstance(v, (int, float)) for v in values):
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    return np.array(values, dtype=object)
+
+
+def load_game_log_store(season: str = '2025-26', data_version: Optional[str] = None) -> GameLogStore:
+    """
+    Load one season of team_game_logs in a single query.
+
+    Args:
+        season: Season string
+        data_version: Version stamp to record (default: current data version)
+    """
+    if data_version is None:
+        data_version = get_cached_data_version()
+
+    conn = _get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT tgl.*, tss_opp.def_rtg_rank AS opp_def_rtg_rank
+            FROM team_game_logs tgl
+            LEFT JOIN team_season_stats tss_opp
+                ON tgl.opponent_team_id = tss_opp.team_id
+                AND tgl.season = tss_opp.season
+                AND tss_opp.split_type = 'overall'
+            WHERE tgl.season = ?
+            ORDER BY tgl.team_id, tgl.game_date DESC
+        ''', (season,))
+        names = [d[0] for d in cursor.description]
+        rows = cursor.fetchall()
+    finally:
+        conn.close()
+
+    columns = {name: _to_column([row[i] for row in rows]) for i, name in enumerate(names)}
+    return GameLogStore(season, data_version, columns)
+
+
+def get_game_log_store(season: str = '2025-26') -> GameLogStore:
+    """
+    Get the process-wide store for a season, reloaded after a sync.
+
+    The data version is checked with get_cached_data_version(), so a sync
+    in another process is picked up within its re-read interval.
+    """
+    data_version = get_cached_data_version()
+    store = _snapshots.get(season)
+    if store is not None and store.data_version == data_version:
+        return store
+
+    with _snapshots_lock:
+        store = _snapshots.get(season)
+        if store is None or store.data_version != data_version:
+            store = load_game_log_store(season, data_version)
+            _snapshots[season] = store
+            print(f'[game_log_store] Loaded {store!r} for data version {data_version}')
+        return store
+
+
+def reset_game_log_store():
+    """Drop every loaded season (the next read reloads)"""
+    with _snapshots_lock:
+        _snapshots.clear()
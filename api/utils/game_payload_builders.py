@@ -0,0 +1,933 @@
+"""
+Game Payload Builders
+
+One function per War Room endpoint, each building the full JSON response
+body for a game: builder(game_id, season) -> dict. game_payloads stores
+their output and serves it; nothing here reads or writes that table.
+
+Builders raise PayloadUnavailable (with the HTTP status the endpoint
+returns) when the game or its team data cannot be found, so a miss is
+never stored.
+
+The AI-generated game_detail sections (matchup summary, writeup) have
+their own caches and are generated by queued jobs, so they are attached
+per request by ai_generation_queue.attach_ai_sections() rather than stored.
+"""
+
+import logging
+from typing import Dict
+
+try:
+    from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
+    from api.utils.db_queries import get_todays_games, get_matchup_data, get_all_teams, get_team_stats_with_ranks
+    from api.utils.empty_possessions_calculator import calculate_matchup_empty_possessions
+    from api.utils.game_payloads import PayloadUnavailable
+except ImportError:
+    from db_config import get_db_path
+    from connection_pool import get_shared_connection
+    from db_queries import get_todays_games, get_matchup_data, get_all_teams, get_team_stats_with_ranks
+    from empty_possessions_calculator import calculate_matchup_empty_possessions
+    from game_payloads import PayloadUnavailable
+
+logger = logging.getLogger(__name__)
+
+NBA_DATA_DB_PATH = get_db_path('nba_data.db')
+
+
+# ============================================================================
+# GAME DETAIL
+# ============================================================================
+
+def build_game_detail(game_id: str, season: str = '2025-26') -> Dict:
+    """
+    Build the /api/game_detail response (without the AI-generated sections).
+
+    Looks the game up in today's games, then in the games table for
+    historical games.
+
+    Raises:
+        PayloadUnavailable: game not found (404) or no matchup data (500)
+    """
+    games = get_todays_games(season)
+    game = None
+
+    # First try today's games
+    if games:
+        game = next((g for g in games if str(g.get('game_id')) == str(game_id)), None)
+
+    # If not found in today's games, query database for historical game
+    if not game:
+        print(f'[game_detail] Game {game_id} not in today\'s games, checking database for historical game')
+        conn = get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT
+                g.id as game_id,
+                g.game_date,
+                g.home_team_id,
+                g.away_team_id,
+                g.status as game_status_text,
+                ht.full_name as home_team_name,
+                ht.team_abbreviation as home_team_abbr,
+                at.full_name as away_team_name,
+                at.team_abbreviation as away_team_abbr
+            FROM games g
+            JOIN nba_teams ht ON g.home_team_id = ht.team_id
+            JOIN nba_teams at ON g.away_team_id = at.team_id
+            WHERE g.id = ?
+        ''', (game_id,))
+
+        row = cursor.fetchone()
+        conn.close()
+
+        if row:
+            game = {
+                'game_id': row['game_id'],
+                'game_date': row['game_date'],
+                'home_team_id': row['home_team_id'],
+                'away_team_id': row['away_team_id'],
+                'game_status': row['game_status_text'],
+                'home_team_name': row['home_team_name'],
+                'away_team_name': row['away_team_name'],
+                'home_team': {'abbreviation': row['home_team_abbr']},
+                'away_team': {'abbreviation': row['away_team_abbr']}
+            }
+            print(f'[game_detail] Found historical game in database: {game["away_team_name"]} @ {game["home_team_name"]}')
+
+    if not game:
+        print(f'[game_detail] ERROR: Game {game_id} not found')
+        raise PayloadUnavailable(f'Game {game_id} not found')
+
+    print(f'[game_detail] Found game: {game.get("away_team_name")} @ {game.get("home_team_name")}')
+
+    home_team_id = game['home_team_id']
+    away_team_id = game['away_team_id']
+
+    print(f'[game_detail] Fetching matchup data for teams {home_team_id} vs {away_team_id}')
+    matchup_data = get_matchup_data(int(home_team_id), int(away_team_id), season)
+
+    if matchup_data is None:
+        print('[game_detail] ERROR: Failed to fetch matchup data')
+        raise PayloadUnavailable('The NBA API is currently slow or unavailable. Please try again in a moment.', 500)
+
+    print(f'[game_detail] Matchup data ready (DATA ONLY MODE - no predictions)')
+
+    all_teams = get_all_teams()
+    home_team_info = next((t for t in all_teams if t['id'] == int(home_team_id)), {})
+    away_team_info = next((t for t in all_teams if t['id'] == int(away_team_id)), {})
+
+    home_overall = matchup_data['home']['stats'].get('overall', {}) if matchup_data['home'].get('stats') else {}
+    away_overall = matchup_data['away']['stats'].get('overall', {}) if matchup_data['away'].get('stats') else {}
+    home_adv = matchup_data['home'].get('advanced') or {}
+    away_adv = matchup_data['away'].get('advanced') or {}
+    home_opp = matchup_data['home'].get('opponent') or {}
+    away_opp = matchup_data['away'].get('opponent') or {}
+
+    # DATA ONLY MODE: Build matchup data fields needed by frontend (NO PREDICTIONS)
+    # Use FRESH recent_games from NBA API (in matchup_data), not stale database
+
+    # Build factors object (needed for Last5TrendsCard heat check)
+    home_overall_stats = matchup_data['home'].get('stats', {}).get('overall', {})
+    away_overall_stats = matchup_data['away'].get('stats', {}).get('overall', {})
+    home_adv_stats = matchup_data['home'].get('advanced', {})
+    away_adv_stats = matchup_data['away'].get('advanced', {})
+
+    # Helper to build Last 5 trends from database team_game_logs
+    # Simple back-to-back detection
+    def get_simple_rest_status(recent_games):
+        from datetime import datetime, timedelta
+
+        # Default values if no recent games
+        if not recent_games or len(recent_games) == 0:
+            return {
+                'is_b2b': False, 'days_rest': 3, 'b2b_games': 0,
+                'b2b_off_delta': 0.0, 'b2b_def_delta': 0.0, 'b2b_pace_delta': 0.0,
+                'off_adj': 0.0, 'def_adj': 0.0, 'small_sample': True
+            }
+
+        # Get most recent game date (keys are uppercase from db_queries)
+        most_recent_game = recent_games[0]
+        last_game_date_str = most_recent_game.get('GAME_DATE', '')
+
+        if not last_game_date_str:
+            return {
+                'is_b2b': False, 'days_rest': 3, 'b2b_games': 0,
+                'b2b_off_delta': 0.0, 'b2b_def_delta': 0.0, 'b2b_pace_delta': 0.0,
+                'off_adj': 0.0, 'def_adj': 0.0, 'small_sample': True
+            }
+
+        # Parse date (handle both 'YYYY-MM-DD' and 'YYYY-MM-DDTHH:MM:SS' formats)
+        if 'T' in last_game_date_str:
+            last_game_date_str = last_game_date_str.split('T')[0]
+
+        try:
+            last_game_date = datetime.strptime(last_game_date_str, '%Y-%m-%d').date()
+            today = datetime.now().date()
+            days_since_last_game = (today - last_game_date).days
+
+            # Determine if back-to-back (played yesterday)
+            is_b2b = (days_since_last_game == 1)
+
+            print(f'[get_simple_rest_status] Last game: {last_game_date}, Today: {today}, Days since: {days_since_last_game}, is_b2b: {is_b2b}')
+
+            return {
+                'is_b2b': is_b2b,
+                'days_rest': days_since_last_game - 1 if days_since_last_game > 0 else 0,
+                'b2b_games': 0,
+                'b2b_off_delta': 0.0,
+                'b2b_def_delta': 0.0,
+                'b2b_pace_delta': 0.0,
+                'off_adj': 0.0,
+                'def_adj': 0.0,
+                'small_sample': True
+            }
+        except Exception as e:
+            print(f'[get_simple_rest_status] Error calculating rest days: {e}')
+            return {
+                'is_b2b': False, 'days_rest': 3, 'b2b_games': 0,
+                'b2b_off_delta': 0.0, 'b2b_def_delta': 0.0, 'b2b_pace_delta': 0.0,
+                'off_adj': 0.0, 'def_adj': 0.0, 'small_sample': True
+            }
+
+    # Build Last 5 trends from DATABASE team_game_logs using proper function
+    from api.utils.last_5_trends import get_last_5_trends
+    matchup_data_only = {
+        'home_last5_trends': get_last_5_trends(
+            home_team_id,
+            home_team_info.get('abbreviation', 'HOM'),
+            season
+        ),
+        'away_last5_trends': get_last_5_trends(
+            away_team_id,
+            away_team_info.get('abbreviation', 'AWY'),
+            season
+        ),
+        'back_to_back_debug': {
+            'home': get_simple_rest_status(matchup_data['home'].get('recent_games', [])),
+            'away': get_simple_rest_status(matchup_data['away'].get('recent_games', [])),
+        },
+        'factors': {
+            'home_ppg': round(home_overall_stats.get('PTS', 0), 1),
+            'away_ppg': round(away_overall_stats.get('PTS', 0), 1),
+            'home_pace': round(home_adv_stats.get('PACE', 0), 1),
+            'away_pace': round(away_adv_stats.get('PACE', 0), 1),
+            'game_pace': round((home_adv_stats.get('PACE', 100) + away_adv_stats.get('PACE', 100)) / 2, 1),
+        }
+    }
+
+    # Get recent games with ALL fields needed for War Room
+    home_recent_games_full = matchup_data['home'].get('recent_games', [])[:10]
+    away_recent_games_full = matchup_data['away'].get('recent_games', [])[:10]
+
+    # Calculate advanced stats from game logs for War Room indicators
+    def calculate_advanced_stats_from_games(all_games):
+        """Calculate paint pts, assist%, and turnover% from game logs"""
+        if not all_games or len(all_games) == 0:
+            return {
+                'paint_pts_per_game': 0,
+                'ast_pct': 0,
+                'tov_pct': 0
+            }
+
+        # Use all available games for season averages
+        # IMPORTANT: All stats must come from same team, same games, same filters
+        paint_pts = [g.get('PTS_PAINT', 0) or 0 for g in all_games if g.get('PTS_PAINT')]
+        assists = [g.get('AST', 0) or 0 for g in all_games if g.get('AST')]
+        turnovers = [g.get('TOV', 0) or 0 for g in all_games if g.get('TOV')]
+        fg_made = [g.get('FGM', 0) or 0 for g in all_games if g.get('FGM')]
+
+        avg_paint = sum(paint_pts) / len(paint_pts) if paint_pts else 0
+        avg_ast = sum(assists) / len(assists) if assists else 0
+        avg_tov = sum(turnovers) / len(turnovers) if turnovers else 0
+        avg_fgm = sum(fg_made) / len(fg_made) if fg_made else 0
+
+        # Calculate Team Assist Rate (AST%)
+        # Definition: Percentage of made field goals that were assisted
+        # Formula: AST% = (Team Assists ÷ Team Field Goals Made) × 100
+        # Expected range: 50-75% (normal), 40-85% (acceptable edge cases)
+        # Must NEVER exceed 100% - if it does, it's a data pipeline error
+
+        if avg_fgm > 0:
+            ast_rate_pct = (avg_ast / avg_fgm) * 100
+
+            # Validation: AST% should never exceed 100%
+            if ast_rate_pct > 100:
+                logger.warning(
+                    f"[AST_RATE_ERROR] AST% > 100 detected "
+                    f"(AST={avg_ast:.2f}, FGM={avg_fgm:.2f}, AST%={ast_rate_pct:.1f})"
+                )
+                ast_rate_pct = None  # Treat as data error
+            elif ast_rate_pct < 40 or ast_rate_pct > 85:
+                logger.info(
+                    f"[AST_RATE_WARNING] AST% outside normal range: {ast_rate_pct:.1f}% "
+                    f"(AST={avg_ast:.2f}, FGM={avg_fgm:.2f})"
+                )
+        else:
+            ast_rate_pct = None
+
+        # TOV% = (Turnovers / Possessions) approximated by TOV / (FGM + TOV)
+        # For simplicity using TOV / (FGM + TOV) as a rough estimate
+        tov_pct = (avg_tov / (avg_fgm + avg_tov + 1e-6)) * 100
+
+        return {
+            'paint_pts_per_game': round(avg_paint, 1),
+            'ast_pct': round(ast_rate_pct, 1) if ast_rate_pct is not None else None,
+            'tov_pct': round(tov_pct, 1)
+        }
+
+    home_advanced = calculate_advanced_stats_from_games(matchup_data['home'].get('recent_games', []))
+    away_advanced = calculate_advanced_stats_from_games(matchup_data['away'].get('recent_games', []))
+
+    # Calculate scoring environment (deterministic classification)
+    from api.utils.scoring_environment import calculate_scoring_environment
+    scoring_environment = calculate_scoring_environment(
+        home_pace=home_adv.get('PACE', 100),
+        away_pace=away_adv.get('PACE', 100),
+        home_ortg=home_adv.get('OFF_RATING', 105),
+        away_ortg=away_adv.get('OFF_RATING', 105),
+        home_3p_pct=home_overall.get('FG3_PCT', 0) * 100 if home_overall.get('FG3_PCT') else None,
+        away_3p_pct=away_overall.get('FG3_PCT', 0) * 100 if away_overall.get('FG3_PCT') else None
+    )
+
+    # Calculate empty possessions data
+    empty_possessions_data = None
+    try:
+        empty_possessions_data = calculate_matchup_empty_possessions(game_id, season)
+        if empty_possessions_data:
+            print(f'[game_detail] Empty possessions data calculated successfully')
+        else:
+            print(f'[game_detail] Empty possessions data unavailable (insufficient data)')
+    except Exception as e:
+        import traceback
+        print(f'[game_detail] Warning: Failed to calculate empty possessions: {e}')
+        traceback.print_exc()
+
+    # Calculate opponent resistance metrics
+    opponent_resistance_data = None
+    try:
+        from api.utils.opponent_resistance import get_expected_matchup_metrics
+        # Determine as_of_date from game date or use current date
+        game_date_str = game.get('game_date', '2026-01-02')
+        if 'T' in game_date_str:
+            as_of_date = game_date_str.split('T')[0]
+        else:
+            as_of_date = game_date_str[:10] if len(game_date_str) >= 10 else '2026-01-02'
+
+        opponent_resistance_data = get_expected_matchup_metrics(
+            team_id=int(home_team_id),
+            opp_id=int(away_team_id),
+            season=season,
+            as_of_date=as_of_date
+        )
+        if opponent_resistance_data:
+            print(f'[game_detail] Opponent resistance data calculated successfully')
+
+            # Calculate pregame projections
+            try:
+                from api.utils.opponent_resistance import calculate_pregame_projections
+                projections = calculate_pregame_projections(
+                    opponent_resistance_data['team']['season'],
+                    opponent_resistance_data['opp']['season'],
+                    opponent_resistance_data['expected']
+                )
+
+                # Add projections to opponent_resistance_data
+                opponent_resistance_data['projections'] = projections
+
+                # Also add to empty_possessions_data for frontend compatibility
+                if empty_possessions_data:
+                    empty_possessions_data['projected_game_possessions'] = projections['projected_game_possessions']
+                    empty_possessions_data['expected_empty_possessions_game'] = projections['expected_empty_possessions_game']
+                    empty_possessions_data['expected_empty_rate'] = projections['expected_empty_rate']
+                    empty_possessions_data['league_avg_empty_rate'] = projections['league_avg_empty_rate']
+
+                    # Add per-team projections
+                    if 'home_team' not in empty_possessions_data:
+                        empty_possessions_data['home_team'] = {}
+                    if 'away_team' not in empty_possessions_data:
+                        empty_possessions_data['away_team'] = {}
+
+                    empty_possessions_data['home_team']['projected_team_possessions'] = projections['home_projected_team_possessions']
+                    empty_possessions_data['home_team']['expected_empty_possessions'] = projections['home_expected_empty_possessions']
+                    empty_possessions_data['home_team']['expected_scoring_possessions'] = projections['home_expected_scoring_possessions']
+
+                    empty_possessions_data['away_team']['projected_team_possessions'] = projections['away_projected_team_possessions']
+                    empty_possessions_data['away_team']['expected_empty_possessions'] = projections['away_expected_empty_possessions']
+                    empty_possessions_data['away_team']['expected_scoring_possessions'] = projections['away_expected_scoring_possessions']
+
+                print(f'[game_detail] Pregame projections calculated successfully')
+
+            except Exception as proj_err:
+                print(f'[game_detail] Warning: Failed to calculate pregame projections: {proj_err}')
+                import traceback
+                traceback.print_exc()
+
+        else:
+            print(f'[game_detail] Opponent resistance data unavailable')
+    except Exception as e:
+        import traceback
+        print(f'[game_detail] Warning: Failed to calculate opponent resistance: {e}')
+        traceback.print_exc()
+
+    response = {
+        'success': True,
+        'home_team': {
+            'id': home_team_id,
+            'name': home_team_info.get('full_name', 'Home Team'),
+            'abbreviation': home_team_info.get('abbreviation', 'HOM'),
+        },
+        'away_team': {
+            'id': away_team_id,
+            'name': away_team_info.get('full_name', 'Away Team'),
+            'abbreviation': away_team_info.get('abbreviation', 'AWY'),
+        },
+        'prediction': matchup_data_only,  # DATA ONLY MODE: No predictions, just matchup data
+        'scoring_environment': scoring_environment,
+        'empty_possessions': empty_possessions_data,
+        'opponent_resistance': opponent_resistance_data,
+        'home_stats': {
+            # Use field names that match frontend expectations
+            'ppg': round(home_overall.get('PTS', 0), 1),
+            'fg_pct': round(home_overall.get('FG_PCT', 0) * 100, 1),
+            'fg3_pct': round(home_overall.get('FG3_PCT', 0) * 100, 1),
+            'ft_pct': round(home_overall.get('FT_PCT', 0) * 100, 1),
+            'opp_ppg': round(home_opp.get('OPP_PTS', 0), 1),
+            'opp_fg3_pct': round(home_opp.get('OPP_FG3_PCT', 0) * 100, 1) if home_opp.get('OPP_FG3_PCT') else 0,
+            'opp_paint_pts_per_game': home_advanced.get('paint_pts_per_game', 0),  # From game logs
+            'wins': home_overall.get('W', 0),
+            'losses': home_overall.get('L', 0),
+            'off_rating': round(home_adv.get('OFF_RATING', 0), 1),  # Changed from 'ortg'
+            'def_rating': round(home_adv.get('DEF_RATING', 0), 1),  # Changed from 'drtg'
+            'pace': round(home_adv.get('PACE', 0), 1),
+            'net_rtg': round(home_adv.get('NET_RATING', 0), 1),
+            'ast': round(home_overall.get('AST', 0), 1),
+            'tov': round(home_overall.get('TOV', 0), 1),
+            'fga': round(home_overall.get('FGA', 0), 1),
+            'fta': round(home_overall.get('FTA', 0), 1),
+            'fg3a': round(home_overall.get('FG3A', 0), 1),
+            # Additional fields for MatchupIndicators
+            'fg3a_per_game': round(home_overall.get('FG3A', 0), 1),
+            'fta_per_game': round(home_overall.get('FTA', 0), 1),
+            'paint_pts_per_game': home_advanced.get('paint_pts_per_game', 0),
+            'ast_pct': home_advanced.get('ast_pct', 0),
+            'tov_pct': home_advanced.get('tov_pct', 0),
+            # NEW: eFG calculation fields (calculated from FGA * FG_PCT)
+            'fgm': round(home_overall.get('FGA', 0) * home_overall.get('FG_PCT', 0), 1),
+            'fg3m': round(home_overall.get('FG3A', 0) * home_overall.get('FG3_PCT', 0), 1),
+        },
+        'away_stats': {
+            # Use field names that match frontend expectations
+            'ppg': round(away_overall.get('PTS', 0), 1),
+            'fg_pct': round(away_overall.get('FG_PCT', 0) * 100, 1),
+            'fg3_pct': round(away_overall.get('FG3_PCT', 0) * 100, 1),
+            'ft_pct': round(away_overall.get('FT_PCT', 0) * 100, 1),
+            'opp_ppg': round(away_opp.get('OPP_PTS', 0), 1),
+            'opp_fg3_pct': round(away_opp.get('OPP_FG3_PCT', 0) * 100, 1) if away_opp.get('OPP_FG3_PCT') else 0,
+            'opp_paint_pts_per_game': away_advanced.get('paint_pts_per_game', 0),  # From game logs
+            'wins': away_overall.get('W', 0),
+            'losses': away_overall.get('L', 0),
+            'off_rating': round(away_adv.get('OFF_RATING', 0), 1),  # Changed from 'ortg'
+            'def_rating': round(away_adv.get('DEF_RATING', 0), 1),  # Changed from 'drtg'
+            'pace': round(away_adv.get('PACE', 0), 1),
+            'net_rtg': round(away_adv.get('NET_RATING', 0), 1),
+            'ast': round(away_overall.get('AST', 0), 1),
+            'tov': round(away_overall.get('TOV', 0), 1),
+            'fga': round(away_overall.get('FGA', 0), 1),
+            'fta': round(away_overall.get('FTA', 0), 1),
+            'fg3a': round(away_overall.get('FG3A', 0), 1),
+            # Additional fields for MatchupIndicators
+            'fg3a_per_game': round(away_overall.get('FG3A', 0), 1),
+            'fta_per_game': round(away_overall.get('FTA', 0), 1),
+            'paint_pts_per_game': away_advanced.get('paint_pts_per_game', 0),
+            'ast_pct': away_advanced.get('ast_pct', 0),
+            'tov_pct': away_advanced.get('tov_pct', 0),
+            # NEW: eFG calculation fields (calculated from FGA * FG_PCT)
+            'fgm': round(away_overall.get('FGA', 0) * away_overall.get('FG_PCT', 0), 1),
+            'fg3m': round(away_overall.get('FG3A', 0) * away_overall.get('FG3_PCT', 0), 1),
+        },
+        'home_recent_games': [
+            {
+                'matchup': game.get('MATCHUP', ''),
+                'team_pts': game.get('PTS', 0),
+                'opp_pts': game.get('OPP_PTS', 0),
+                'result': game.get('WL', ''),
+                'off_rating': game.get('OFF_RATING', 0),
+                'def_rating': game.get('DEF_RATING', 0),
+                'pace': game.get('PACE', 0),
+                'fg3_pct': game.get('FG3_PCT', 0) * 100 if game.get('FG3_PCT') else 0,
+                'game_date': game.get('GAME_DATE', ''),
+            }
+            for game in home_recent_games_full
+        ],
+        'away_recent_games': [
+            {
+                'matchup': game.get('MATCHUP', ''),
+                'team_pts': game.get('PTS', 0),
+                'opp_pts': game.get('OPP_PTS', 0),
+                'result': game.get('WL', ''),
+                'off_rating': game.get('OFF_RATING', 0),
+                'def_rating': game.get('DEF_RATING', 0),
+                'pace': game.get('PACE', 0),
+                'fg3_pct': game.get('FG3_PCT', 0) * 100 if game.get('FG3_PCT') else 0,
+                'game_date': game.get('GAME_DATE', ''),
+            }
+            for game in away_recent_games_full
+        ],
+    }
+
+    # NEW: Add offensive and defensive archetypes
+    try:
+        from api.utils.archetype_classifier import load_team_archetypes, OFFENSIVE_ARCHETYPES, DEFENSIVE_ARCHETYPES
+
+        # Get all archetype assignments
+        all_archetypes = load_team_archetypes(season)
+
+        # Get archetypes for home and away teams
+        home_archetypes = all_archetypes.get(int(home_team_id))
+        away_archetypes = all_archetypes.get(int(away_team_id))
+
+        if home_archetypes:
+            response['home_archetypes'] = {
+                # LEGACY SCORING ARCHETYPES (for backward compatibility)
+                'season_offensive': {
+                    'id': home_archetypes['season_offensive'],
+                    'name': OFFENSIVE_ARCHETYPES[home_archetypes['season_offensive']]['name'],
+                    'description': OFFENSIVE_ARCHETYPES[home_archetypes['season_offensive']]['description'],
+                    'scoring_profile': OFFENSIVE_ARCHETYPES[home_archetypes['season_offensive']]['scoring_profile']
+                },
+                'season_defensive': {
+                    'id': home_archetypes['season_defensive'],
+                    'name': DEFENSIVE_ARCHETYPES[home_archetypes['season_defensive']]['name'],
+                    'description': DEFENSIVE_ARCHETYPES[home_archetypes['season_defensive']]['description'],
+                    'allows': DEFENSIVE_ARCHETYPES[home_archetypes['season_defensive']]['allows'],
+                    'suppresses': DEFENSIVE_ARCHETYPES[home_archetypes['season_defensive']]['suppresses']
+                },
+                'last10_offensive': {
+                    'id': home_archetypes['last10_offensive'],
+                    'name': OFFENSIVE_ARCHETYPES[home_archetypes['last10_offensive']]['name'],
+                    'description': OFFENSIVE_ARCHETYPES[home_archetypes['last10_offensive']]['description'],
+                    'scoring_profile': OFFENSIVE_ARCHETYPES[home_archetypes['last10_offensive']]['scoring_profile']
+                },
+                'last10_defensive': {
+                    'id': home_archetypes['last10_defensive'],
+                    'name': DEFENSIVE_ARCHETYPES[home_archetypes['last10_defensive']]['name'],
+                    'description': DEFENSIVE_ARCHETYPES[home_archetypes['last10_defensive']]['description'],
+                    'allows': DEFENSIVE_ARCHETYPES[home_archetypes['last10_defensive']]['allows'],
+                    'suppresses': DEFENSIVE_ARCHETYPES[home_archetypes['last10_defensive']]['suppresses']
+                },
+                'style_shifts': {
+                    'offensive': home_archetypes['offensive_style_shift'],
+                    'defensive': home_archetypes['defensive_style_shift'],
+                    'offensive_details': home_archetypes['offensive_shift_details'],
+                    'defensive_details': home_archetypes['defensive_shift_details']
+                },
+                # NEW ARCHETYPE FAMILIES (assists, rebounds, threes, turnovers)
+                'assists': home_archetypes.get('assists'),
+                'rebounds': home_archetypes.get('rebounds'),
+                'threes': home_archetypes.get('threes'),
+                'turnovers': home_archetypes.get('turnovers')
+            }
+
+        if away_archetypes:
+            response['away_archetypes'] = {
+                # LEGACY SCORING ARCHETYPES (for backward compatibility)
+                'season_offensive': {
+                    'id': away_archetypes['season_offensive'],
+                    'name': OFFENSIVE_ARCHETYPES[away_archetypes['season_offensive']]['name'],
+                    'description': OFFENSIVE_ARCHETYPES[away_archetypes['season_offensive']]['description'],
+                    'scoring_profile': OFFENSIVE_ARCHETYPES[away_archetypes['season_offensive']]['scoring_profile']
+                },
+                'season_defensive': {
+                    'id': away_archetypes['season_defensive'],
+                    'name': DEFENSIVE_ARCHETYPES[away_archetypes['season_defensive']]['name'],
+                    'description': DEFENSIVE_ARCHETYPES[away_archetypes['season_defensive']]['description'],
+                    'allows': DEFENSIVE_ARCHETYPES[away_archetypes['season_defensive']]['allows'],
+                    'suppresses': DEFENSIVE_ARCHETYPES[away_archetypes['season_defensive']]['suppresses']
+                },
+                'last10_offensive': {
+                    'id': away_archetypes['last10_offensive'],
+                    'name': OFFENSIVE_ARCHETYPES[away_archetypes['last10_offensive']]['name'],
+                    'description': OFFENSIVE_ARCHETYPES[away_archetypes['last10_offensive']]['description'],
+                    'scoring_profile': OFFENSIVE_ARCHETYPES[away_archetypes['last10_offensive']]['scoring_profile']
+                },
+                'last10_defensive': {
+                    'id': away_archetypes['last10_defensive'],
+                    'name': DEFENSIVE_ARCHETYPES[away_archetypes['last10_defensive']]['name'],
+                    'description': DEFENSIVE_ARCHETYPES[away_archetypes['last10_defensive']]['description'],
+                    'allows': DEFENSIVE_ARCHETYPES[away_archetypes['last10_defensive']]['allows'],
+                    'suppresses': DEFENSIVE_ARCHETYPES[away_archetypes['last10_defensive']]['suppresses']
+                },
+                'style_shifts': {
+                    'offensive': away_archetypes['offensive_style_shift'],
+                    'defensive': away_archetypes['defensive_style_shift'],
+                    'offensive_details': away_archetypes['offensive_shift_details'],
+                    'defensive_details': away_archetypes['defensive_shift_details']
+                },
+                # NEW ARCHETYPE FAMILIES (assists, rebounds, threes, turnovers)
+                'assists': away_archetypes.get('assists'),
+                'rebounds': away_archetypes.get('rebounds'),
+                'threes': away_archetypes.get('threes'),
+                'turnovers': away_archetypes.get('turnovers')
+            }
+
+        print('[game_detail] Archetypes added to response')
+        # DEBUG: Verify new archetype families are included
+        if home_archetypes:
+            print(f'[DEBUG game_detail] home_archetypes keys: {list(response["home_archetypes"].keys())}')
+            print(f'[DEBUG game_detail] Has threes? {"threes" in response["home_archetypes"]}')
+            print(f'[DEBUG game_detail] Has assists? {"assists" in response["home_archetypes"]}')
+            print(f'[DEBUG game_detail] Has rebounds? {"rebounds" in response["home_archetypes"]}')
+            print(f'[DEBUG game_detail] Has turnovers? {"turnovers" in response["home_archetypes"]}')
+            if response["home_archetypes"].get("threes"):
+                print(f'[DEBUG game_detail] threes structure: {list(response["home_archetypes"]["threes"].keys())}')
+
+    except Exception as archetype_error:
+        import traceback
+        print(f'[game_detail] Warning: Could not fetch archetype data: {archetype_error}')
+        traceback.print_exc()
+        # Don't fail the entire request if archetypes fail
+        response['home_archetypes'] = None
+        response['away_archetypes'] = None
+
+    # Calculate combined volatility index
+    def calculate_volatility_index(recent_games):
+        """Calculate 0-10 volatility index from game totals variance"""
+        if not recent_games or len(recent_games) < 5:
+            return 5.0  # Default medium volatility
+
+        totals = [
+            (game.get('PTS', 0) + game.get('OPP_PTS', 0))
+            for game in recent_games[:10]
+        ]
+
+        if len(totals) < 5:
+            return 5.0
+
+        avg = sum(totals) / len(totals)
+        variance = sum(abs(t - avg) for t in totals) / len(totals)
+        return min(10.0, max(0.0, (variance / 15) * 10))
+
+    home_vol_index = calculate_volatility_index(home_recent_games_full)
+    away_vol_index = calculate_volatility_index(away_recent_games_full)
+    combined_volatility_index = (home_vol_index + away_vol_index) / 2
+
+    response['combined_volatility_index'] = round(combined_volatility_index, 1)
+    response['volatility_label'] = (
+        'Stable' if combined_volatility_index <= 3 else
+        'Swingy' if combined_volatility_index <= 6 else
+        'Wild'
+    )
+
+    # Calculate margin risk from net rating gap
+    home_net_rtg = round(home_adv.get('NET_RATING', 0), 1)
+    away_net_rtg = round(away_adv.get('NET_RATING', 0), 1)
+    rating_gap = abs(home_net_rtg - away_net_rtg)
+
+    response['margin_risk'] = {
+        'label': 'Blowout Risk' if rating_gap > 8 else 'Competitive',
+        'rating_gap': round(rating_gap, 1)
+    }
+
+    return response
+
+
+# ============================================================================
+# PER-GAME SPLITS
+# ============================================================================
+
+def _find_todays_game(game_id: str, season: str, log_prefix: str) -> Dict:
+    """Find a game on today's board; raises PayloadUnavailable if absent"""
+    games = get_todays_games(season)
+    game = next((g for g in games if g['game_id'] == game_id), None)
+
+    if not game:
+        raise PayloadUnavailable(f'Game {game_id} not found')
+
+    print(f'[{log_prefix}] Found game: {game.get("away_team_name")} @ {game.get("home_team_name")}')
+    return game
+
+
+def _find_game(game_id: str, season: str, log_prefix: str) -> Dict:
+    """Find a game on today's board, then in the historical games table"""
+    games = get_todays_games(season)
+    game = next((g for g in games if g['game_id'] == game_id), None)
+
+    # If not found in today's games, check historical games table
+    if not game:
+        print(f'[{log_prefix}] Game {game_id} not in today\'s games, checking historical games')
+        conn = get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT
+                g.id as game_id,
+                g.game_date,
+                g.home_team_id,
+                g.away_team_id,
+                ht.full_name as home_team_name,
+                at.full_name as away_team_name
+            FROM games g
+            JOIN nba_teams ht ON g.home_team_id = ht.team_id
+            JOIN nba_teams at ON g.away_team_id = at.team_id
+            WHERE g.id = ? AND g.season = ?
+        ''', (game_id, season))
+        game_row = cursor.fetchone()
+        conn.close()
+
+        if not game_row:
+            raise PayloadUnavailable(f'Game {game_id} not found')
+        game = dict(game_row)
+
+    print(f'[{log_prefix}] Found game: {game.get("away_team_name")} @ {game.get("home_team_name")}')
+    return game
+
+
+def _require_splits(home_splits, away_splits):
+    if not home_splits or not away_splits:
+        raise PayloadUnavailable('Team data not found for one or both teams')
+
+
+def _projected_pace(game: Dict, season: str, log_prefix: str):
+    """Projected game pace, or None if it cannot be calculated"""
+    from api.utils.pace_projection import calculate_projected_pace
+
+    try:
+        projected_pace = calculate_projected_pace(game['home_team_id'], game['away_team_id'], season)
+        print(f'[{log_prefix}] Projected pace: {projected_pace:.1f}')
+    except Exception as e:
+        print(f'[{log_prefix}] Error calculating projected pace: {e}')
+        projected_pace = None
+    return projected_pace
+
+
+def _splits_response(game_id: str, game: Dict, home_splits: Dict, away_splits: Dict, **extra) -> Dict:
+    return {
+        'success': True,
+        'data': {
+            'game_id': game_id,
+            'game_date': game.get('game_date'),
+            **extra,
+            'home_team': home_splits,
+            'away_team': away_splits
+        }
+    }
+
+
+def build_scoring_splits(game_id: str, season: str = '2025-26') -> Dict:
+    """/api/game-scoring-splits: defense-adjusted scoring splits for both teams"""
+    from api.utils.scoring_splits import get_team_scoring_splits
+    from api.utils.pace_splits import get_team_pace_splits
+    from api.utils.pace_projection import calculate_projected_pace
+
+    game = _find_todays_game(game_id, season, 'game_scoring_splits')
+
+    # Get defense splits for both teams
+    home_splits = get_team_scoring_splits(game['home_team_id'], season)
+    away_splits = get_team_scoring_splits(game['away_team_id'], season)
+    _require_splits(home_splits, away_splits)
+
+    # Get pace splits for both teams
+    home_pace_splits = get_team_pace_splits(game['home_team_id'], season)
+    away_pace_splits = get_team_pace_splits(game['away_team_id'], season)
+
+    # Add pace splits to the main data structures
+    if home_pace_splits:
+        home_splits['pace_splits'] = home_pace_splits['pace_splits']
+    if away_pace_splits:
+        away_splits['pace_splits'] = away_pace_splits['pace_splits']
+
+    # Calculate projected game pace (factors in last 5 games + season average)
+    projected_pace = calculate_projected_pace(game['home_team_id'], game['away_team_id'], season)
+    home_splits['projected_pace'] = projected_pace
+    away_splits['projected_pace'] = projected_pace
+
+    print(f'[game_scoring_splits] Projected pace: {projected_pace:.1f}')
+
+    # Get defensive ranks for both teams
+    home_stats = get_team_stats_with_ranks(game['home_team_id'], season)
+    away_stats = get_team_stats_with_ranks(game['away_team_id'], season)
+
+    # Add opponent's defensive rank to each team's data
+    if home_stats:
+        home_splits['opponent_def_rank'] = away_stats['stats'].get('def_rtg', {}).get('rank') if away_stats else None
+
+    if away_stats:
+        away_splits['opponent_def_rank'] = home_stats['stats'].get('def_rtg', {}).get('rank') if home_stats else None
+
+    # Identity tags replaced by archetype system - keeping empty arrays for API compatibility
+    home_splits['identity_tags'] = []
+    away_splits['identity_tags'] = []
+    print(f'[game_scoring_splits] Home opponent def rank: {home_splits.get("opponent_def_rank")}, Away opponent def rank: {away_splits.get("opponent_def_rank")}')
+
+    return _splits_response(game_id, game, home_splits, away_splits)
+
+
+def build_three_pt_splits(game_id: str, season: str = '2025-26') -> Dict:
+    """/api/game-three-pt-scoring-splits: 3PT defense-adjusted scoring splits"""
+    from api.utils.three_pt_scoring_splits import get_team_three_pt_scoring_splits
+
+    game = _find_todays_game(game_id, season, 'game_three_pt_scoring_splits')
+
+    # Get 3PT defense splits for both teams
+    home_splits = get_team_three_pt_scoring_splits(game['home_team_id'], season)
+    away_splits = get_team_three_pt_scoring_splits(game['away_team_id'], season)
+    _require_splits(home_splits, away_splits)
+
+    # Get 3PT defensive ranks for both teams
+    home_stats = get_team_stats_with_ranks(game['home_team_id'], season)
+    away_stats = get_team_stats_with_ranks(game['away_team_id'], season)
+
+    # Add opponent's 3PT defensive rank to each team's data
+    if home_stats:
+        home_splits['opponent_3pt_def_rank'] = away_stats['stats'].get('opp_fg3_pct_rank', {}).get('rank') if away_stats else None
+
+    if away_stats:
+        away_splits['opponent_3pt_def_rank'] = home_stats['stats'].get('opp_fg3_pct_rank', {}).get('rank') if home_stats else None
+
+    print(f'[game_three_pt_scoring_splits] Home opponent 3PT def rank: {home_splits.get("opponent_3pt_def_rank")}, Away opponent 3PT def rank: {away_splits.get("opponent_3pt_def_rank")}')
+
+    return _splits_response(game_id, game, home_splits, away_splits)
+
+
+def build_three_pt_pace(game_id: str, season: str = '2025-26') -> Dict:
+    """/api/game-three-pt-scoring-vs-pace: pace-adjusted 3PT scoring splits"""
+    from api.utils.three_pt_scoring_vs_pace import get_team_three_pt_scoring_vs_pace
+
+    game = _find_todays_game(game_id, season, 'game_three_pt_scoring_vs_pace')
+
+    # Get 3PT pace splits for both teams
+    home_splits = get_team_three_pt_scoring_vs_pace(game['home_team_id'], season)
+    away_splits = get_team_three_pt_scoring_vs_pace(game['away_team_id'], season)
+    _require_splits(home_splits, away_splits)
+
+    # Add projected pace to each team's data
+    projected_pace = _projected_pace(game, season, 'game_three_pt_scoring_vs_pace')
+    home_splits['projected_pace'] = projected_pace
+    away_splits['projected_pace'] = projected_pace
+
+    return _splits_response(game_id, game, home_splits, away_splits, projected_pace=projected_pace)
+
+
+def build_turnover_pressure(game_id: str, season: str = '2025-26') -> Dict:
+    """/api/game-turnover-vs-defense-pressure: turnovers by opponent pressure tier"""
+    from api.utils.turnover_vs_defense_pressure import get_team_turnover_vs_defense_pressure
+    from api.utils.turnover_pressure_tiers import get_turnover_pressure_tier
+
+    game = _find_todays_game(game_id, season, 'game_turnover_vs_defense_pressure')
+
+    # Get turnover pressure splits for both teams
+    home_splits = get_team_turnover_vs_defense_pressure(game['home_team_id'], season)
+    away_splits = get_team_turnover_vs_defense_pressure(game['away_team_id'], season)
+    _require_splits(home_splits, away_splits)
+
+    # Get opponent turnover pressure tier for each team
+    # Home team faces away team's defensive pressure
+    away_team_stats = get_team_stats_with_ranks(game['away_team_id'], season)
+    away_opp_tov_rank = away_team_stats['stats']['opp_tov']['rank'] if away_team_stats and 'opp_tov' in away_team_stats['stats'] else None
+    away_def_rtg_rank = away_team_stats['stats']['def_rtg']['rank'] if away_team_stats and 'def_rtg' in away_team_stats['stats'] else None
+    home_opponent_tier = get_turnover_pressure_tier(away_opp_tov_rank)
+
+    # Away team faces home team's defensive pressure
+    home_team_stats = get_team_stats_with_ranks(game['home_team_id'], season)
+    home_opp_tov_rank = home_team_stats['stats']['opp_tov']['rank'] if home_team_stats and 'opp_tov' in home_team_stats['stats'] else None
+    home_def_rtg_rank = home_team_stats['stats']['def_rtg']['rank'] if home_team_stats and 'def_rtg' in home_team_stats['stats'] else None
+    away_opponent_tier = get_turnover_pressure_tier(home_opp_tov_rank)
+
+    # Add opponent tier and stats to each team's data
+    home_splits['opponent_turnover_pressure_tier'] = home_opponent_tier
+    home_splits['opponent_opp_tov_rank'] = away_opp_tov_rank
+    home_splits['opponent_def_rtg_rank'] = away_def_rtg_rank
+
+    away_splits['opponent_turnover_pressure_tier'] = away_opponent_tier
+    away_splits['opponent_opp_tov_rank'] = home_opp_tov_rank
+    away_splits['opponent_def_rtg_rank'] = home_def_rtg_rank
+
+    print(f'[game_turnover_vs_defense_pressure] Home faces {home_opponent_tier} pressure, Away faces {away_opponent_tier} pressure')
+
+    return _splits_response(game_id, game, home_splits, away_splits)
+
+
+def build_turnover_pace(game_id: str, season: str = '2025-26') -> Dict:
+    """/api/game-turnover-vs-pace: turnovers by game pace tier"""
+    from api.utils.turnover_vs_pace import get_team_turnover_vs_pace
+
+    game = _find_todays_game(game_id, season, 'game_turnover_vs_pace')
+
+    # Get turnover pace splits for both teams
+    home_splits = get_team_turnover_vs_pace(game['home_team_id'], season)
+    away_splits = get_team_turnover_vs_pace(game['away_team_id'], season)
+    _require_splits(home_splits, away_splits)
+
+    # Add projected pace to each team's data
+    projected_pace = _projected_pace(game, season, 'game_turnover_vs_pace')
+    home_splits['projected_pace'] = projected_pace
+    away_splits['projected_pace'] = projected_pace
+
+    return _splits_response(game_id, game, home_splits, away_splits, projected_pace=projected_pace)
+
+
+def build_assists_defense(game_id: str, season: str = '2025-26') -> Dict:
+    """/api/game-assists-vs-defense: assists by opponent ball-movement defense tier"""
+    from api.utils.assists_splits import get_team_assists_splits, get_ball_movement_defense_tier
+
+    game = _find_game(game_id, season, 'game_assists_vs_defense')
+
+    # Get assist splits for both teams
+    home_splits = get_team_assists_splits(game['home_team_id'], season)
+    away_splits = get_team_assists_splits(game['away_team_id'], season)
+    _require_splits(home_splits, away_splits)
+
+    # Get opponent ball-movement defense tier for each team
+    # Home team faces away team's ball-movement defense
+    away_team_stats = get_team_stats_with_ranks(game['away_team_id'], season)
+    away_opp_ast_rank = away_team_stats['stats']['opp_assists']['rank'] if away_team_stats and 'opp_assists' in away_team_stats['stats'] else None
+    home_opponent_tier = get_ball_movement_defense_tier(away_opp_ast_rank)
+
+    # Away team faces home team's ball-movement defense
+    home_team_stats = get_team_stats_with_ranks(game['home_team_id'], season)
+    home_opp_ast_rank = home_team_stats['stats']['opp_assists']['rank'] if home_team_stats and 'opp_assists' in home_team_stats['stats'] else None
+    away_opponent_tier = get_ball_movement_defense_tier(home_opp_ast_rank)
+
+    # Add opponent tier and rank to each team's data
+    home_splits['opponent_ball_movement_tier'] = home_opponent_tier
+    home_splits['opponent_opp_ast_rank'] = away_opp_ast_rank
+
+    away_splits['opponent_ball_movement_tier'] = away_opponent_tier
+    away_splits['opponent_opp_ast_rank'] = home_opp_ast_rank
+
+    print(f'[game_assists_vs_defense] Home faces {home_opponent_tier} ball-movement defense, Away faces {away_opponent_tier} ball-movement defense')
+
+    return _splits_response(game_id, game, home_splits, away_splits)
+
+
+def build_assists_pace(game_id: str, season: str = '2025-26') -> Dict:
+    """/api/game-assists-vs-pace: assists by game pace tier"""
+    from api.utils.assists_vs_pace import get_team_assists_vs_pace
+
+    game = _find_game(game_id, season, 'game_assists_vs_pace')
+
+    # Get assist pace splits for both teams
+    home_splits = get_team_assists_vs_pace(game['home_team_id'], season)
+    away_splits = get_team_assists_vs_pace(game['away_team_id'], season)
+    _require_splits(home_splits, away_splits)
+
+    # Add projected pace to each team's data
+    projected_pace = _projected_pace(game, season, 'game_assists_vs_pace')
+    home_splits['projected_pace'] = projected_pace
+    away_splits['projected_pace'] = projected_pace
+
+    return _splits_response(game_id, game, home_splits, away_splits, projected_pace=projected_pace)
+
+
+# Section name (game_payloads.section) -> builder
+PAYLOAD_BUILDERS = {
+    'game_detail': build_game_detail,
+    'scoring_splits': build_scoring_splits,
+    'three_pt_splits': build_three_pt_splits,
+    'three_pt_pace': build_three_pt_pace,
+    'turnover_pressure': build_turnover_pressure,
+    'turnover_pace': build_turnover_pace,
+    'assists_defense': build_assists_defense,
+    'assists_pace': build_assists_pace,
+}
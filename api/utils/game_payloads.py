@@ -0,0 +1,317 @@
+"""
+Materialized Per-Game Payloads
+
+The War Room endpoints (/api/game_detail and the per-game split endpoints)
+used to assemble their responses from dozens of queries on every hit. This
+module stores each endpoint's finished response body per game in the
+game_payloads table (nba_data.db) as zlib-compressed JSON, so a page load
+costs one primary-key lookup per endpoint.
+
+    section          endpoint
+    game_detail      /api/game_detail (minus the AI-generated sections)
+    scoring_splits   /api/game-scoring-splits
+    three_pt_splits  /api/game-three-pt-scoring-splits
+    three_pt_pace    /api/game-three-pt-scoring-vs-pace
+    turnover_pressure /api/game-turnover-vs-defense-pressure
+    turnover_pace    /api/game-turnover-vs-pace
+    assists_defense  /api/game-assists-vs-defense
+    assists_pace     /api/game-assists-vs-pace
+
+The builders live in game_payload_builders. sync_all() and
+sync_todays_games() call materialize_game_payloads() when they finish, so
+today's games are built once per sync; a request for anything else (or a
+stale row) builds that one section on demand and stores it.
+
+A stored row is served only while it matches:
+- PAYLOAD_VERSION (bump when a builder's output changes)
+- the data version (last successful sync, see prediction_cache)
+- today's date (game_detail's rest-day status is relative to today)
+
+Rows are read and written on the live database, not the read-only
+serving snapshot, because misses are filled at request time.
+
+Usage:
+    from api.utils.game_payloads import get_game_payload, PayloadUnavailable
+
+    try:
+        body = get_game_payload(game_id, 'scoring_splits', season)
+    except PayloadUnavailable as e:
+        return jsonify({'success': False, 'error': str(e)}), e.status
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+try:
+    from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
+    from api.utils.prediction_cache import get_data_version, get_cached_data_version, reset_cached_data_version
+    from api.utils.prediction_context import prediction_scope
+except ImportError:
+    from db_config import get_db_path
+    from connection_pool import get_shared_connection
+    from prediction_cache import get_data_version, get_cached_data_version, reset_cached_data_version
+    from prediction_context import prediction_scope
+
+NBA_DATA_DB_PATH = get_db_path('nba_data.db')
+
+# Bump when any builder's output shape changes so stored rows are rebuilt
+PAYLOAD_VERSION = 'v1'
+
+# zlib level: payloads are written once per sync and read many times
+COMPRESSION_LEVEL = 6
+
+
+class PayloadUnavailable(Exception):
+    """A payload cannot be built (unknown game, missing team data); never stored"""
+
+    def __init__(self, message: str, status: int = 404):
+        super().__init__(message)
+        self.status = status
+
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'stale': 0, 'builds': 0, 'build_ms': 0.0}
+
+
+def _get_db_connection() -> sqlite3.Connection:
+    """Get this thread's writable shared connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, row_factory=None)
+
+
+def create_payloads_table(cursor):
+    """Create game_payloads if migration v19 has not run"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS game_payloads (
+            game_id TEXT NOT NULL,
+            section TEXT NOT NULL,
+            season TEXT NOT NULL,
+            payload_version TEXT NOT NULL,
+            data_version TEXT NOT NULL,
+            built_on TEXT NOT NULL,
+            payload BLOB NOT NULL,
+            build_ms REAL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (game_id, section, season)
+        )
+    ''')
+
+
+def _builders() -> Dict[str, Callable[[str, str], Dict]]:
+    """Section name -> builder(game_id, season)"""
+    try:
+        from api.utils.game_payload_builders import PAYLOAD_BUILDERS
+    except ImportError:
+        from game_payload_builders import PAYLOAD_BUILDERS
+    return PAYLOAD_BUILDERS
+
+
+def _count(stat: str, amount=1):
+    with _stats_lock:
+        _stats[stat] += amount
+
+
+def _encode(payload: Dict) -> bytes:
+    return zlib.compress(json.dumps(payload, separators=(',', ':')).encode(), COMPRESSION_LEVEL)
+
+
+def _decode(blob: bytes) -> Dict:
+    return json.loads(zlib.decompress(blob))
+
+
+def load_payload(game_id: str, section: str, season: str = '2025-26') -> Optional[Dict]:
+    """
+    Read a stored payload if it is current.
+
+    Returns:
+        The stored response body, or None on a miss or stale row
+    """
+    conn = _get_db_connection()
+    try:
+        row = conn.execute('''
+            SELECT payload, payload_version, data_version, built_on
+            FROM game_payloads
+            WHERE game_id = ? AND section = ? AND season = ?
+        ''', (str(game_id), section, season)).fetchone()
+    except sqlite3.OperationalError as e:
+        # Table not created yet: build_payload() creates it
+        if 'no such table' not in str(e):
+            raise
+        row = None
+    finally:
+        conn.close()
+
+    if row is None:
+        _count('misses')
+        return None
+
+    blob, payload_version, data_version, built_on = row
+    if (payload_version != PAYLOAD_VERSION or data_version != get_cached_data_version()
+            or built_on != date.today().isoformat()):
+        _count('stale')
+        return None
+
+    _count('hits')
+    return _decode(blob)
+
+
+def build_payload(game_id: str, section: str, season: str = '2025-26',
+                  data_version: Optional[str] = None) -> Dict:
+    """
+    Build one section and store it (replacing any previous row).
+
+    Args:
+        game_id: NBA game ID
+        section: Key of PAYLOAD_BUILDERS
+        season: Season string
+        data_version: Version to stamp (default: current data version)
+
+    Returns:
+        The freshly built response body
+
+    Raises:
+        PayloadUnavailable: the game or its team data was not found
+    """
+    builders = _builders()
+    if section not in builders:
+        raise ValueError(f'Unknown game payload section: {section}')
+
+    # Read the version before building so a sync finishing mid-build
+    # leaves a row that is already stale rather than mislabelled
+    data_version = data_version or get_cached_data_version()
+    start = time.perf_counter()
+    blob = _encode(builders[section](str(game_id), season))
+    build_ms = (time.perf_counter() - start) * 1000
+    _count('builds')
+    _count('build_ms', build_ms)
+
+    conn = _get_db_connection()
+    try:
+        cursor = conn.cursor()
+        create_payloads_table(cursor)
+        cursor.execute('''
+            INSERT OR REPLACE INTO game_payloads
+            (game_id, section, season, payload_version, data_version, built_on,
+             payload, build_ms, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (str(game_id), section, season, PAYLOAD_VERSION, data_version,
+              date.today().isoformat(), blob, round(build_ms, 1),
+              datetime.now().isoformat()))
+        conn.commit()
+    finally:
+        conn.close()
+    # Decode the stored copy so a miss returns exactly what later hits will
+    return _decode(blob)
+
+
+def get_game_payload(game_id: str, section: str, season: str = '2025-26') -> Dict:
+    """
+    Serve a section from game_payloads, building and storing it on a miss.
+
+    Raises:
+        PayloadUnavailable: the game or its team data was not found
+    """
+    payload = load_payload(game_id, section, season)
+    if payload is not None:
+        return payload
+
+    print(f'[game_payloads] MISS: building {section} for game {game_id}')
+    with prediction_scope():
+        return build_payload(game_id, section, season)
+
+
+def materialize_game_payloads(season: str = '2025-26',
+                              game_ids: Optional[Iterable[str]] = None,
+                              sections: Optional[Iterable[str]] = None) -> Dict:
+    """
+    Build and store every section for a set of games (default: today's games).
+
+    Runs in one prediction scope so team lookups are shared across games
+    and sections, then deletes rows from older payload or data versions.
+
+    Returns:
+        {'games': int, 'payloads': int, 'unavailable': int,
+         'errors': [str], 'duration_ms': float}
+    """
+    if game_ids is None:
+        try:
+            from api.utils.db_queries import get_todays_games
+        except ImportError:
+            from db_queries import get_todays_games
+        game_ids = [g['game_id'] for g in get_todays_games(season)]
+    game_ids = [str(game_id) for game_id in game_ids]
+    sections = list(sections or _builders())
+
+    start = time.perf_counter()
+    data_version = get_data_version()
+    built = unavailable = 0
+    errors: List[str] = []
+
+    with prediction_scope():
+        for game_id in game_ids:
+            for section in sections:
+                try:
+                    build_payload(game_id, section, season, data_version)
+                    built += 1
+                except PayloadUnavailable:
+                    unavailable += 1
+                except Exception as e:
+                    errors.append(f'{game_id}/{section}: {e}')
+
+    purged = purge_stale_payloads(data_version)
+    reset_cached_data_version()
+
+    duration_ms = (time.perf_counter() - start) * 1000
+    print(f'[game_payloads] Materialized {built} payloads for {len(game_ids)} games '
+          f'in {duration_ms:.0f}ms ({unavailable} unavailable, {len(errors)} errors, {purged} purged)')
+    return {
+        'games': len(game_ids),
+        'payloads': built,
+        'unavailable': unavailable,
+        'errors': errors,
+        'duration_ms': round(duration_ms, 1)
+    }
+
+
+def purge_stale_payloads(data_version: str) -> int:
+    """Delete rows from other payload or data versions; returns rows deleted"""
+    conn = _get_db_connection()
+    try:
+        cursor = conn.cursor()
+        create_payloads_table(cursor)
+        cursor.execute('''
+            DELETE FROM game_payloads
+            WHERE payload_version != ? OR data_version != ?
+        ''', (PAYLOAD_VERSION, data_version))
+        conn.commit()
+        return cursor.rowcount
+    finally:
+        conn.close()
+
+
+def get_payload_stats() -> Dict:
+    """Hit/miss counters for this process and stored row counts"""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['misses'] + stats['stale']
+    stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else None
+    stats['avg_build_ms'] = round(stats['build_ms'] / stats['builds'], 1) if stats['builds'] else None
+    stats['build_ms'] = round(stats['build_ms'], 1)
+    stats['payload_version'] = PAYLOAD_VERSION
+
+    try:
+        conn = _get_db_connection()
+        try:
+            create_payloads_table(conn.cursor())
+            stats['stored'] = conn.execute('SELECT COUNT(*) FROM game_payloads').fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        stats['stored'] = None
+        print(f'[game_payloads] Could not count stored payloads: {e}')
+    return stats
@@ -24,10 +24,12 @@ logger = logging.getLogger(__name__)
 # Import existing modules
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
     from api.utils.possession_dataset_builder import build_possession_dataset
     from api.utils.ppp_aggregator import get_team_ppp_metrics
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
     from possession_dataset_builder import build_possession_dataset
     from ppp_aggregator import get_team_ppp_metrics
 
@@ -35,10 +37,8 @@ NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False, timeout=30.0)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH)
 
 
 def _validate_game_data(row: pd.Series) -> bool:
@@ -0,0 +1,171 @@
+"""
+HTTP Revalidation and Compression for Data-Driven API Endpoints
+
+ETags:
+The read-only API endpoints only change when a sync completes, so their
+ETag is derived from the data version (last successful data_sync_log
+completion, see prediction_cache), API_SCHEMA_VERSION, today's date, the
+request path and query string, plus any endpoint-specific stamps. It is
+computed before the view runs: a matching If-None-Match gets a 304 without
+building the payload.
+
+    @app.route('/api/clusters')
+    @conditional_get(lambda: file_stamp(similarity_db_path))
+    def get_all_clusters():
+        ...
+
+Responses with an ETag are sent with Cache-Control: no-cache (store, but
+revalidate every time) instead of no-store. A view can call skip_etag()
+when its response is incomplete and should not be revalidated.
+
+Compression:
+create_compression_middleware(app) gzips JSON responses of at least
+MIN_COMPRESS_BYTES when the client accepts it, or uses brotli when the
+optional brotli package is installed and the client prefers it. The ETag
+of a compressed response gets an encoding suffix, as strong ETags must
+differ between encodings; If-None-Match accepts any variant.
+"""
+
+import gzip
+import hashlib
+import os
+from datetime import date
+from functools import wraps
+from typing import Callable
+
+from flask import g, make_response, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from api.utils.prediction_cache import get_cached_data_version
+except ImportError:
+    from prediction_cache import get_cached_data_version
+
+# Bump when a response shape changes so browsers refetch after a deploy
+API_SCHEMA_VERSION = 'v1'
+
+# Smaller bodies are not worth the CPU or the extra headers
+MIN_COMPRESS_BYTES = 1024
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+ENCODING_SUFFIXES = ('-gzip', '-br')
+
+
+def file_stamp(db_path: str) -> int:
+    """Latest modification time of a SQLite database and its WAL (0 if missing)"""
+    stamp = 0
+    for path in (db_path, db_path + '-wal'):
+        try:
+            stamp = max(stamp, os.stat(path).st_mtime_ns)
+        except OSError:
+            pass
+    return stamp
+
+
+def compute_etag(*stamps) -> str:
+    """ETag for the current request (without quotes)"""
+    key = '|'.join(str(part) for part in (
+        API_SCHEMA_VERSION, get_cached_data_version(), date.today().isoformat(),
+        request.full_path, *stamps
+    ))
+    return hashlib.sha1(key.encode()).hexdigest()[:20]
+
+
+def _etag_matches(etag: str) -> bool:
+    """True if If-None-Match names this ETag in any encoding"""
+    if_none_match = request.if_none_match
+    if not if_none_match:
+        return False
+    if if_none_match.star_tag:
+        return True
+    for tag in if_none_match.as_set():
+        for suffix in ENCODING_SUFFIXES:
+            if tag.endswith(suffix):
+                tag = tag[:-len(suffix)]
+                break
+        if tag == etag:
+            return True
+    return False
+
+
+def skip_etag():
+    """Send this response without an ETag (e.g. a section is still being generated)"""
+    g.skip_etag = True
+
+
+def conditional_get(*stamp_fns: Callable[[], object]):
+    """
+    Answer If-None-Match with 304 before running the view.
+
+    Args:
+        stamp_fns: Extra inputs to the ETag beyond the data version, for
+                   endpoints that read other databases or depend on time
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = compute_etag(*(fn() for fn in stamp_fns))
+            if _etag_matches(etag):
+                response = make_response('', 304)
+                response.set_etag(etag)
+                response.vary.add('Accept-Encoding')
+                return response
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not g.pop('skip_etag', False):
+                response.set_etag(etag)
+            return response
+        return wrapper
+    return decorator
+
+
+def _choose_encoding(accept_encoding) -> str:
+    if brotli is not None and accept_encoding['br']:
+        return 'br'
+    if accept_encoding['gzip']:
+        return 'gzip'
+    return ''
+
+
+def create_compression_middleware(app, min_size: int = MIN_COMPRESS_BYTES):
+    """
+    Compress JSON responses the client can decode.
+
+    Args:
+        app: Flask application instance
+        min_size: Smallest body (bytes) worth compressing
+    """
+    @app.after_request
+    def compress_response(response):
+        if (response.status_code != 200 or response.direct_passthrough
+                or response.mimetype != 'application/json'
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = _choose_encoding(request.accept_encodings)
+        if not encoding:
+            return response
+
+        body = response.get_data()
+        if len(body) < min_size:
+            return response
+
+        if encoding == 'br':
+            response.set_data(brotli.compress(body, quality=BROTLI_QUALITY))
+        else:
+            response.set_data(gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0))
+        response.headers['Content-Encoding'] = encoding
+
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(f'{etag}-{encoding}', weak)
+        return response
+
+    print(f"[http_cache] Response compression enabled ({'brotli, ' if brotli else ''}gzip)")
@@ -6,26 +6,123 @@ and generates human-readable tags for UI display.
 
 This module is part of the deterministic prediction system. All trend analysis
 is based on hand-coded formulas with no machine learning.
+
+Trends are a per-sync artifact: materialize_team_trends() builds every
+team's trends after a sync in one query (each game log joined to its
+opponent's overall season row) and stores them in team_trends
+(nba_data.db). get_last_5_trends() - called by the prediction engine and
+the game_detail payload builder for both teams - reads the stored copy and
+only builds (and stores) a team on a miss or after a newer sync.
 """
 
-from typing import Dict, List, Optional
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
 from datetime import datetime
 
 # Import existing infrastructure
 try:
-    from api.utils.db_queries import get_team_last_n_games, get_team_stats_with_ranks
+    from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
+    from api.utils.db_queries import _format_game_log_rows
+    from api.utils.prediction_cache import get_data_version, get_cached_data_version, reset_cached_data_version
+    from api.utils.prediction_context import scoped_cache
 except ImportError:
-    from db_queries import get_team_last_n_games, get_team_stats_with_ranks
-
-
-def get_last_5_trends(team_id: int, team_tricode: str, season: str = '2025-26') -> Dict:
+    from db_config import get_db_path
+    from connection_pool import get_shared_connection
+    from db_queries import _format_game_log_rows
+    from prediction_cache import get_data_version, get_cached_data_version, reset_cached_data_version
+    from prediction_context import scoped_cache
+
+NBA_DATA_DB_PATH = get_db_path('nba_data.db')
+
+# Bump when the trends output changes so stored rows are rebuilt
+TRENDS_VERSION = 'v1'
+
+# Every team's last N game logs with the team's and each opponent's overall
+# season row joined in. The opponent is parsed from the matchup string
+# ("BOS vs. LAL" / "BOS @ LAL") and matched on abbreviation.
+_LAST_GAMES_SQL = '''
+    WITH logs AS (
+        SELECT *,
+               AVG(points_in_paint) OVER (PARTITION BY team_id) AS season_avg_pitp,
+               CASE
+                   WHEN instr(matchup, ' vs. ') > 0 THEN substr(matchup, instr(matchup, ' vs. ') + 5)
+                   WHEN instr(matchup, ' @ ') > 0 THEN substr(matchup, instr(matchup, ' @ ') + 3)
+               END AS parsed_opponent_abbr
+        FROM team_game_logs
+        WHERE season = ? {team_filter}
+    ),
+    recent AS (
+        SELECT *, ROW_NUMBER() OVER (PARTITION BY team_id ORDER BY game_date DESC) AS recency
+        FROM logs
+        {eligible_filter}
+    )
+    SELECT recent.*,
+           EXISTS (SELECT 1 FROM nba_teams team WHERE team.team_id = recent.team_id) AS team_found,
+           team_row.off_rtg AS season_off_rtg,
+           team_row.def_rtg AS season_def_rtg,
+           team_row.pace AS season_pace,
+           team_row.ppg AS season_ppg,
+           team_row.assists AS season_apg,
+           team_row.efg_pct AS season_efg,
+           team_row.ft_ppg AS season_ft_ppg,
+           team_row.turnovers AS season_tov,
+           team_row.team_id IS NOT NULL AS season_row_found,
+           opp_team.team_id AS opp_team_id,
+           opp_row.team_id IS NOT NULL AS opp_row_found,
+           opp_row.off_rtg AS opp_off_rtg,
+           opp_row.off_rtg_rank AS opp_off_rtg_rank,
+           opp_row.def_rtg AS opp_def_rtg,
+           opp_row.def_rtg_rank AS opp_def_rtg_rank,
+           opp_row.pace AS opp_season_pace,
+           opp_row.pace_rank AS opp_pace_rank
+    FROM recent
+    LEFT JOIN team_season_stats team_row
+           ON team_row.team_id = recent.team_id AND team_row.season = recent.season
+          AND team_row.split_type = 'overall'
+    LEFT JOIN nba_teams opp_team
+           ON opp_team.team_abbreviation = recent.parsed_opponent_abbr AND opp_team.season = recent.season
+    LEFT JOIN team_season_stats opp_row
+           ON opp_row.team_id = opp_team.team_id AND opp_row.season = recent.season
+          AND opp_row.split_type = 'overall'
+    WHERE recent.recency <= ?
+    ORDER BY recent.team_id, recent.recency
+'''
+
+_memory_lock = threading.Lock()
+# (team_id, season, filter_mode) -> (data_version, trends) for this process
+_memory: Dict[tuple, tuple] = {}
+
+
+def _get_db_connection() -> sqlite3.Connection:
+    """Get this thread's writable shared connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH)
+
+
+def _filter_mode() -> str:
+    return os.environ.get('GAME_FILTER_MODE', 'DISABLED')
+
+
+@scoped_cache
+def get_last_5_trends(team_id: int, team_tricode: str, season: str = '2025-26',
+                      team_context=None) -> Dict:
     """
     Fetch last 5 games, enrich with opponent profiles, analyze trends.
 
+    Served from the team_trends artifact when it matches the current data
+    version; otherwise built with one query and stored.
+
     Args:
         team_id: NBA team ID
         team_tricode: Team abbreviation (e.g., 'BOS', 'LAL')
         season: Season string (e.g., '2025-26')
+        team_context: Accepted for compatibility with the other team helpers;
+                      trends come from the stored artifact or one query
 
     Returns:
         Dict containing:
@@ -47,29 +144,203 @@ def get_last_5_trends(team_id: int, team_tricode: str, season: str = '2025-26')
             'data_quality': 'excellent'
         }
     """
-    print(f'[last_5_trends] Analyzing last 5 games for {team_tricode} (team_id={team_id})')
+    trends = load_stored_trends(team_id, season)
+    if trends is None:
+        print(f'[last_5_trends] Analyzing last 5 games for {team_tricode} (team_id={team_id})')
+        # Read the version before building so a sync finishing mid-build
+        # leaves a row that is already stale rather than mislabelled
+        data_version = get_cached_data_version()
+        try:
+            built = build_team_trends(season, team_ids=[team_id])
+        except Exception as e:
+            # A failed read is never stored, so the next call retries
+            print(f'[last_5_trends] Error fetching games: {e}')
+            return _empty_trends(team_tricode)
+        store_trends(built, season, data_version)
+        # Round-trip so a miss returns exactly what later hits will
+        trends = json.loads(json.dumps(built[int(team_id)]))
+
+    trends['team_tricode'] = team_tricode
+    return trends
+
+
+def build_team_trends(season: str = '2025-26',
+                      team_ids: Optional[Iterable[int]] = None) -> Dict[int, Dict]:
+    """
+    Build last-5 trends for a set of teams (default: every team) in one query.
 
-    # Fetch last 5 games from NBA API
+    Returns:
+        {team_id: trends}; teams without usable data get _empty_trends()
+
+    Raises:
+        sqlite3.Error: the game logs could not be read (nothing to store)
+    """
+    if team_ids is not None:
+        team_ids = [int(team_id) for team_id in team_ids]
+
+    conn = _get_db_connection()
     try:
-        games_raw = get_team_last_n_games(team_id, n=5, season=season)
-    except Exception as e:
-        print(f'[last_5_trends] Error fetching games: {e}')
-        return _empty_trends(team_tricode)
+        if team_ids is None:
+            team_ids = [row['team_id'] for row in conn.execute(
+                'SELECT team_id FROM nba_teams WHERE season = ?', (season,))]
+        rows_by_team = _load_last_games(conn, season, team_ids)
+        abbreviations = {row['team_id']: row['team_abbreviation'] for row in conn.execute(
+            'SELECT team_id, team_abbreviation FROM nba_teams')}
+    finally:
+        conn.close()
+
+    return {
+        team_id: _build_trends(team_id, abbreviations.get(team_id, str(team_id)),
+                               rows_by_team.get(team_id, []))
+        for team_id in team_ids
+    }
+
+
+def create_team_trends_table(cursor):
+    """Create team_trends if migration v20 has not run"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS team_trends (
+            team_id INTEGER NOT NULL,
+            season TEXT NOT NULL,
+            filter_mode TEXT NOT NULL,
+            trends_version TEXT NOT NULL,
+            data_version TEXT NOT NULL,
+            trends_json TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (team_id, season, filter_mode)
+        )
+    ''')
+
+
+def load_stored_trends(team_id: int, season: str = '2025-26') -> Optional[Dict]:
+    """
+    Read a team's stored trends if they match the current data version.
+
+    Returns:
+        A copy of the stored trends, or None on a miss or stale row
+    """
+    data_version = get_cached_data_version()
+    key = (int(team_id), season, _filter_mode())
+
+    with _memory_lock:
+        entry = _memory.get(key)
+    if entry is not None and entry[0] == data_version:
+        return copy.deepcopy(entry[1])
+
+    conn = _get_db_connection()
+    try:
+        row = conn.execute('''
+            SELECT trends_version, data_version, trends_json
+            FROM team_trends
+            WHERE team_id = ? AND season = ? AND filter_mode = ?
+        ''', key).fetchone()
+    except sqlite3.OperationalError as e:
+        # Table not created yet: store_trends() creates it
+        if 'no such table' not in str(e):
+            raise
+        row = None
+    finally:
+        conn.close()
+
+    if row is None or row['trends_version'] != TRENDS_VERSION or row['data_version'] != data_version:
+        return None
+
+    trends = json.loads(row['trends_json'])
+    with _memory_lock:
+        _memory[key] = (data_version, trends)
+    return copy.deepcopy(trends)
+
+
+def store_trends(trends_by_team: Dict[int, Dict], season: str, data_version: str):
+    """Store built trends (replacing previous rows) stamped with data_version"""
+    filter_mode = _filter_mode()
+    now = datetime.now().isoformat()
+    conn = _get_db_connection()
+    try:
+        cursor = conn.cursor()
+        create_team_trends_table(cursor)
+        cursor.executemany('''
+            INSERT OR REPLACE INTO team_trends
+            (team_id, season, filter_mode, trends_version, data_version, trends_json, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [(team_id, season, filter_mode, TRENDS_VERSION, data_version, json.dumps(trends), now)
+              for team_id, trends in trends_by_team.items()])
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def materialize_team_trends(season: str = '2025-26') -> Dict:
+    """
+    Build and store every team's trends in one query, then delete rows from
+    older trends or data versions. Called after each sync.
 
-    if not games_raw:
+    Returns:
+        {'teams': int, 'purged': int, 'duration_ms': float}
+    """
+    start = time.perf_counter()
+    data_version = get_data_version()
+    trends_by_team = build_team_trends(season)
+    store_trends(trends_by_team, season, data_version)
+
+    conn = _get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute('''
+            DELETE FROM team_trends
+            WHERE trends_version != ? OR data_version != ?
+        ''', (TRENDS_VERSION, data_version))
+        conn.commit()
+        purged = cursor.rowcount
+    finally:
+        conn.close()
+
+    with _memory_lock:
+        _memory.clear()
+    reset_cached_data_version()
+
+    duration_ms = (time.perf_counter() - start) * 1000
+    print(f'[last_5_trends] Materialized trends for {len(trends_by_team)} teams '
+          f'in {duration_ms:.0f}ms ({purged} purged)')
+    return {'teams': len(trends_by_team), 'purged': purged, 'duration_ms': round(duration_ms, 1)}
+
+
+def _load_last_games(conn, season: str, team_ids: List[int], n: int = 5) -> Dict[int, List[Dict]]:
+    """Run _LAST_GAMES_SQL; rows grouped by team_id, most recent first"""
+    params = [season]
+    team_filter = ''
+    if len(team_ids) == 1:
+        team_filter = 'AND team_id = ?'
+        params.append(team_ids[0])
+
+    eligible_filter = ''
+    if _filter_mode() == 'REGULAR_PLUS_ALL_CUP':
+        eligible_filter = "WHERE game_type IN ('Regular Season', 'NBA Cup')"
+
+    sql = _LAST_GAMES_SQL.format(team_filter=team_filter, eligible_filter=eligible_filter)
+    rows_by_team: Dict[int, List[Dict]] = {}
+    for row in conn.execute(sql, (*params, n)):
+        rows_by_team.setdefault(row['team_id'], []).append(dict(row))
+    return rows_by_team
+
+
+def _build_trends(team_id: int, team_tricode: str, rows: List[Dict]) -> Dict:
+    """Trends for one team from its joined _LAST_GAMES_SQL rows"""
+    if not rows:
         print(f'[last_5_trends] No games found for {team_tricode}')
         return _empty_trends(team_tricode)
 
-    # Get season stats for this team
-    season_stats = get_team_stats_with_ranks(team_id, season)
-    if not season_stats or not season_stats.get('stats'):
+    # Season stats for this team (same row get_team_stats_with_ranks reads)
+    first = rows[0]
+    if not first['team_found'] or not first['season_row_found']:
         print(f'[last_5_trends] No season stats found for {team_tricode}')
         return _empty_trends(team_tricode)
 
     # Enrich each game with opponent data
+    games_raw = _format_game_log_rows(team_id, rows)
     enriched_games = []
-    for game in games_raw[:5]:  # Take only first 5
-        enriched_game = _enrich_game_with_opponent(game, season)
+    for game, row in zip(games_raw, rows):
+        enriched_game = _enrich_game_with_opponent(game, row)
         if enriched_game:
             enriched_games.append(enriched_game)
 
@@ -81,27 +352,17 @@ def get_last_5_trends(team_id: int, team_tricode: str, season: str = '2025-26')
     averages = _compute_averages(enriched_games)
 
     # Extract season stats for comparison
-    season_off_rtg = season_stats['stats']['off_rtg']['value']
-    season_def_rtg = season_stats['stats']['def_rtg']['value']
-    season_pace = season_stats['stats']['pace']['value']
-    season_ppg = season_stats['stats']['ppg']['value']
-    season_apg = season_stats['stats']['apg']['value'] if season_stats['stats'].get('apg') and season_stats['stats']['apg']['value'] else 0.0
-    season_efg = season_stats['stats']['efg_pct']['value'] if season_stats['stats'].get('efg_pct') and season_stats['stats']['efg_pct']['value'] else 0.0
-    season_ft_ppg = season_stats['stats']['ft_ppg']['value'] if season_stats['stats'].get('ft_ppg') and season_stats['stats']['ft_ppg']['value'] else 0.0
-    season_tov = season_stats['stats']['turnovers']['value'] if season_stats['stats'].get('turnovers') and season_stats['stats']['turnovers']['value'] else 0.0
-
-    # Get season average paint points from game logs
-    from api.utils.db_queries import _get_db_connection
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT AVG(points_in_paint) as avg_pitp
-        FROM team_game_logs
-        WHERE team_id = ? AND season = ?
-    """, (team_id, season))
-    pitp_result = cursor.fetchone()
-    conn.close()
-    season_paint_points = round(pitp_result[0], 1) if pitp_result and pitp_result[0] else 0.0
+    season_off_rtg = first['season_off_rtg']
+    season_def_rtg = first['season_def_rtg']
+    season_pace = first['season_pace']
+    season_ppg = first['season_ppg']
+    season_apg = first['season_apg'] if first['season_apg'] else 0.0
+    season_efg = first['season_efg'] if first['season_efg'] else 0.0
+    season_ft_ppg = first['season_ft_ppg'] if first['season_ft_ppg'] else 0.0
+    season_tov = first['season_tov'] if first['season_tov'] else 0.0
+
+    # Season average paint points from game logs
+    season_paint_points = round(first['season_avg_pitp'], 1) if first['season_avg_pitp'] else 0.0
 
     # Build season averages dict
     season_avg = {
@@ -149,7 +410,6 @@ def get_last_5_trends(team_id: int, team_tricode: str, season: str = '2025-26')
         data_quality = 'poor'
 
     print(f'[last_5_trends] {team_tricode}: {len(enriched_games)} games, quality={data_quality}')
-    print(f'[last_5_trends] {team_tricode}: Deltas - PACE:{delta_vs_season["pace"]:+.1f}, OFF:{delta_vs_season["off_rtg"]:+.1f}, DEF:{delta_vs_season["def_rtg"]:+.1f}')
 
     return {
         'team_tricode': team_tricode,
@@ -164,13 +424,13 @@ def get_last_5_trends(team_id: int, team_tricode: str, season: str = '2025-26')
     }
 
 
-def _enrich_game_with_opponent(game: Dict, season: str) -> Optional[Dict]:
+def _enrich_game_with_opponent(game: Dict, row: Dict) -> Optional[Dict]:
     """
     Enrich a single game record with opponent profile data.
 
     Args:
-        game: Raw game record from NBA API
-        season: Season string
+        game: Raw game record (nba_api-style keys)
+        row: The game's _LAST_GAMES_SQL row, with the opponent's season row joined
 
     Returns:
         Enriched game dict with opponent stats/ranks, or None if enrichment fails
@@ -188,20 +448,10 @@ def _enrich_game_with_opponent(game: Dict, season: str) -> Optional[Dict]:
             print(f'[last_5_trends] Could not parse opponent from matchup: {matchup}')
             return None
 
-        # Get opponent's team_id
-        from api.utils.db_queries import get_all_teams
-        all_teams = get_all_teams()
-        opponent_team = next((t for t in all_teams if t['abbreviation'] == opponent_abbr), None)
-
-        if not opponent_team:
+        if row['opp_team_id'] is None:
             print(f'[last_5_trends] Could not find opponent team: {opponent_abbr}')
             return None
 
-        opponent_id = opponent_team['id']
-
-        # Get opponent's season stats
-        opponent_stats = get_team_stats_with_ranks(opponent_id, season)
-
         # Extract shooting data for calculations
         fgm = game.get('FGM', 0)
         fga = game.get('FGA', 0)
@@ -251,12 +501,10 @@ def _enrich_game_with_opponent(game: Dict, season: str) -> Optional[Dict]:
         }
 
         # Add opponent profile if available
-        if opponent_stats and opponent_stats.get('stats'):
-            stats = opponent_stats['stats']
-
+        if row['opp_row_found']:
             # Determine opponent strength tier
-            off_rank = stats['off_rtg']['rank']
-            def_rank = stats['def_rtg']['rank']
+            off_rank = row['opp_off_rtg_rank']
+            def_rank = row['opp_def_rtg_rank']
 
             # Top 10 = 'top', 11-20 = 'mid', 21-30 = 'bottom'
             if off_rank <= 10:
@@ -268,12 +516,12 @@ def _enrich_game_with_opponent(game: Dict, season: str) -> Optional[Dict]:
 
             enriched['opponent'] = {
                 'tricode': opponent_abbr,
-                'off_rtg': stats['off_rtg']['value'],
+                'off_rtg': row['opp_off_rtg'],
                 'off_rtg_rank': off_rank,
-                'def_rtg': stats['def_rtg']['value'],
+                'def_rtg': row['opp_def_rtg'],
                 'def_rtg_rank': def_rank,
-                'pace': stats['pace']['value'],
-                'pace_rank': stats['pace']['rank'],
+                'pace': row['opp_season_pace'],
+                'pace_rank': row['opp_pace_rank'],
                 'strength': off_strength
             }
         else:
@@ -22,9 +22,11 @@ import os
 try:
     from api.utils import team_rankings
     from api.utils.db_queries import get_all_teams
+    from api.utils.connection_pool import get_shared_connection
 except ImportError:
     import team_rankings
     from db_queries import get_all_teams
+    from connection_pool import get_shared_connection
 
 # Database path
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'predictions.db')
@@ -119,7 +121,7 @@ def _compute_matchup_profile_from_history(team_tricode: str, season: str) -> Dic
     Groups games by opponent bucket and calculates averages
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_shared_connection(DB_PATH, row_factory=None)
         cursor = conn.cursor()
 
         # Query all games for this team
@@ -192,7 +194,7 @@ def _compute_matchup_profile_from_history(team_tricode: str, season: str) -> Dic
 def _get_cached_profile(team_tricode: str) -> Optional[Dict]:
     """Get cached matchup profile from database"""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_shared_connection(DB_PATH, row_factory=None)
         cursor = conn.cursor()
 
         # Get all bucket profiles for this team
@@ -225,7 +227,7 @@ def _get_cached_profile(team_tricode: str) -> Optional[Dict]:
 def _save_profile_to_cache(team_tricode: str, profile: Dict):
     """Save matchup profile to cache"""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_shared_connection(DB_PATH, row_factory=None)
         cursor = conn.cursor()
 
         timestamp = datetime.now().isoformat()
@@ -341,7 +343,7 @@ def update_team_game_history_entry(
 
     # Insert into database
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_shared_connection(DB_PATH, row_factory=None)
         cursor = conn.cursor()
 
         cursor.execute('''
@@ -396,7 +398,7 @@ def update_team_game_history_entry(
 def _invalidate_cache(team_tricode: str):
     """Invalidate matchup profile cache for a team"""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_shared_connection(DB_PATH, row_factory=None)
         cursor = conn.cursor()
         cursor.execute('DELETE FROM matchup_profile_cache WHERE team_tricode = ?', (team_tricode,))
         conn.commit()
@@ -19,6 +19,7 @@ DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'nba_data.db')
 
 # Import versions from generator (single source of truth)
 from api.utils.matchup_summary_generator import ENGINE_VERSION, PAYLOAD_VERSION
+from api.utils.connection_pool import get_shared_connection
 
 
 def get_cache_key(game_id: str, payload_version: str = PAYLOAD_VERSION,
@@ -46,7 +47,7 @@ def get_cached_summary(game_id: str, payload_version: str = PAYLOAD_VERSION,
         Dictionary with summary sections, or None if not found
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_shared_connection(DB_PATH, row_factory=None)
         cursor = conn.cursor()
 
         # Query with composite key (game_id + payload_version + engine_version)
@@ -93,7 +94,7 @@ def save_summary(game_id: str, summary: Dict, payload_version: str = PAYLOAD_VER
         True if save succeeded, False otherwise
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_shared_connection(DB_PATH, row_factory=None)
         cursor = conn.cursor()
 
         # Ensure version metadata is in summary
@@ -185,7 +186,7 @@ def _get_any_cached_summary(game_id: str) -> Optional[Dict]:
     Used for extracting reusable sections from older cache entries.
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_shared_connection(DB_PATH, row_factory=None)
         cursor = conn.cursor()
 
         cursor.execute('''
@@ -242,7 +243,7 @@ def clear_cache_for_game(game_id: str) -> bool:
     Useful for manual cache invalidation.
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_shared_connection(DB_PATH, row_factory=None)
         cursor = conn.cursor()
 
         cursor.execute('DELETE FROM matchup_summaries WHERE game_id = ?', (game_id,))
@@ -270,7 +271,7 @@ def get_cache_stats() -> Dict:
     Returns dictionary with total_entries, engine_versions, etc.
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_shared_connection(DB_PATH, row_factory=None)
         cursor = conn.cursor()
 
         # Total entries
@@ -18,6 +18,7 @@ import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
 from api.utils.game_classifier import classify_game, get_game_type_label
+from api.utils.connection_pool import get_shared_connection
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -36,8 +37,7 @@ def migrate_add_game_type():
     'Summer League', 'All-Star', 'Unknown'
     """
     db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    conn = get_shared_connection(db_path)
     cursor = conn.cursor()
 
     try:
@@ -87,8 +87,7 @@ def backfill_game_types():
     This uses the game_classifier to determine game types based on game_id.
     """
     db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    conn = get_shared_connection(db_path)
     cursor = conn.cursor()
 
     try:
@@ -7,6 +7,10 @@ Provides unified access to OpenAI API for:
 
 Usage:
     from api.utils.openai_client import extract_scores_from_screenshot, generate_game_review
+
+Set OPENAI_BACKEND=replay to answer every call locally from recorded
+responses (no key, no network), or OPENAI_BACKEND=record to capture real
+responses for replay - see openai_replay.py.
 """
 
 import os
@@ -32,30 +36,66 @@ client = None
 
 class OpenAIKeyMissingError(Exception):
     """Raised when OPENAI_API_KEY is not configured"""
-    pass
+    code = 'OPENAI_KEY_MISSING'
+
+
+OPENAI_BACKENDS = ('openai', 'replay', 'record')
+
+
+def get_backend() -> str:
+    """OPENAI_BACKEND: 'openai' (default), 'replay' or 'record'"""
+    backend = os.environ.get('OPENAI_BACKEND', 'openai').strip().lower()
+    if backend not in OPENAI_BACKENDS:
+        raise ValueError(f"OPENAI_BACKEND must be one of {OPENAI_BACKENDS}, got {backend!r}")
+    return backend
 
 
 def has_openai_key() -> bool:
-    """Check if OPENAI_API_KEY is configured (without revealing the value)"""
-    return bool(os.environ.get('OPENAI_API_KEY'))
+    """
+    Check if OPENAI_API_KEY is configured (without revealing the value).
+
+    Always True for the replay backend, which needs no key.
+    """
+    return get_backend() == 'replay' or bool(os.environ.get('OPENAI_API_KEY'))
 
 
 def get_client() -> OpenAI:
     """
-    Get or create OpenAI client instance.
+    Get or create the client instance for OPENAI_BACKEND.
 
     Raises:
         OpenAIKeyMissingError: If OPENAI_API_KEY environment variable is not set
+                               (openai and record backends)
     """
     global client
     if client is None:
+        try:
+            from api.utils import openai_replay
+        except ImportError:
+            import openai_replay
+
+        backend = get_backend()
+        if backend == 'replay':
+            client = openai_replay.ReplayClient.from_env()
+            logger.info("[OpenAI] Using replay backend (no API calls)")
+            return client
+
         api_key = os.environ.get('OPENAI_API_KEY')
         if not api_key:
             raise OpenAIKeyMissingError("OPENAI_API_KEY environment variable not set")
         client = OpenAI(api_key=api_key)
+        if backend == 'record':
+            client = openai_replay.RecordingClient(client)
+            logger.info(f"[OpenAI] Recording responses to {client.recordings_path}")
     return client
 
 
+def reset_client():
+    """Drop the cached client so the next get_client() re-reads OPENAI_BACKEND"""
+    global client
+    client = None
+
+
 def encode_image_to_base64(image_path: str) -> str:
     """
     Encode image file to base64 data URL for OpenAI Vision API.
@@ -0,0 +1,263 @@
+"""
+Local OpenAI Stand-in: Recorded-Response Replay
+
+Every AI path (screenshot Vision reads, game reviews, the daily Model Coach
+summary, AI writeups, matchup summaries) calls
+get_client().chat.completions.create(). openai_client.get_client() returns
+one of these instead of the real client depending on OPENAI_BACKEND:
+
+    openai   (default) the OpenAI API; needs OPENAI_API_KEY
+    replay   ReplayClient - no network, no key. Answers each call with a
+             recorded response for its route (or a built-in canned one),
+             after a configurable delay, failing a configurable share of calls
+    record   the OpenAI API, but every response is also appended to the
+             recordings file for later replay
+
+This lets the AI endpoints be load-tested offline (see load_test_ai.py):
+worker saturation, job queueing and cache hit rates behave as in
+production, without an API key or charges.
+
+Replay settings (environment):
+    OPENAI_RECORDINGS_PATH    JSONL recordings (default: openai_recordings.jsonl under DB_PATH)
+    OPENAI_REPLAY_LATENCY_MS  '800' or '500-2500' (uniform); default: each recording's own latency
+    OPENAI_REPLAY_ERROR_RATE  share of calls that fail, 0.0-1.0 (default 0)
+    OPENAI_REPLAY_ERROR       rate_limit | timeout | server (default rate_limit)
+
+Recording format (one JSON object per line):
+    {"route": "game_review", "model": "gpt-4.1-mini", "content": "...", "latency_ms": 2140.5}
+
+Routes: extract_scores, game_review, daily_coach_summary, game_writeup, matchup_summary
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+import openai
+from openai.types.chat import ChatCompletion
+
+try:
+    from api.utils.db_config import get_db_path
+except ImportError:
+    from db_config import get_db_path
+
+ROUTES = ('extract_scores', 'game_review', 'daily_coach_summary', 'game_writeup', 'matchup_summary')
+
+ERROR_KINDS = ('rate_limit', 'timeout', 'server')
+
+# Used when a route has no recordings; shaped like what each caller parses
+DEFAULT_RESPONSES = {
+    'extract_scores': json.dumps({
+        'home_team': 'HOME', 'away_team': 'AWAY',
+        'home_score': 114, 'away_score': 109, 'confidence': 'high'
+    }),
+    'game_review': json.dumps({
+        'verdict': 'WIN',
+        'headline': 'Replayed review: the model read this game well',
+        'game_summary': 'Both teams played close to their expected pace and shooting.',
+        'expected_vs_actual': {
+            'pace': 'Pace was close to the prediction.',
+            'shooting': 'Shooting was slightly colder than predicted.',
+            'free_throws': 'Free throw attempts were near expectations.',
+            'turnovers': 'Turnovers took away a few possessions.',
+            'three_point_volume': '3PT attempts matched the expected volume.'
+        },
+        'trend_notes': 'Last-5 trends held up.',
+        'game_style': 'Balanced half-court game',
+        'pipeline_analysis': {
+            'baseline': 'Baseline was accurate.',
+            'defense_adjustment': 'Defense adjustment was correct.',
+            'pace_adjustment': 'Pace adjustment was correct.',
+            'overall': 'The pipeline was accurate.'
+        },
+        'key_drivers': ['Pace', 'Free throws', '3PT variance'],
+        'model_lessons': ['Keep the current pace weight.']
+    }),
+    'daily_coach_summary': json.dumps({
+        'overall_performance': 'Replayed summary: the model stayed close on most games.',
+        'patterns': ['Pace projections were reliable.', 'High-3PT games were the biggest misses.'],
+        'action_items': ['Add a 3PT volatility flag when both teams take 35+ threes.']
+    }),
+    'game_writeup': (
+        'Replayed writeup. Both teams protect the ball well, with an Empty Poss Score of **60/100**.\n\n'
+        'The archetype matchups point to a balanced game across all **5** categories.\n\n'
+        'Recent form has both teams scoring near their season averages over the last **5** games.'
+    ),
+    'matchup_summary': json.dumps({
+        key: {'title': title, 'content': f'Replayed {title.lower()} section.'}
+        for key, title in (
+            ('pace_and_flow', 'Pace & Game Flow'),
+            ('offensive_style', 'Offensive Style'),
+            ('shooting_profile', 'Shooting Profile'),
+            ('rim_and_paint', 'Rim & Paint'),
+            ('recent_form', 'Recent Form'),
+            ('volatility_profile', 'Volatility Profile'),
+            ('matchup_dna_summary', 'Matchup DNA Summary'),
+        )
+    }),
+}
+
+
+def get_recordings_path() -> str:
+    return os.environ.get('OPENAI_RECORDINGS_PATH') or get_db_path('openai_recordings.jsonl')
+
+
+def classify_request(messages: List[Dict]) -> str:
+    """Which AI path a chat.completions.create() call came from (a ROUTES name)"""
+    text_parts = []
+    for message in messages:
+        content = message.get('content')
+        if isinstance(content, list):
+            if any(part.get('type') == 'image_url' for part in content):
+                return 'extract_scores'
+            text_parts.extend(part.get('text', '') for part in content)
+        elif content:
+            text_parts.append(content)
+    text = '\n'.join(text_parts)
+
+    if 'daily model reviews' in text:
+        return 'daily_coach_summary'
+    if 'matchup_payload' in text:
+        return 'matchup_summary'
+    if '3-section analytical write-up' in text:
+        return 'game_writeup'
+    return 'game_review'
+
+
+def load_recordings(path: str) -> Dict[str, List[Dict]]:
+    """Recordings grouped by route ({} if the file doesn't exist)"""
+    recordings = defaultdict(list)
+    if not os.path.exists(path):
+        return recordings
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entry = json.loads(line)
+                recordings[entry['route']].append(entry)
+    return recordings
+
+
+def parse_latency(value: Optional[str]) -> Optional[Tuple[float, float]]:
+    """'800' -> (800, 800), '500-2500' -> (500, 2500), unset -> None"""
+    if not value:
+        return None
+    low, _, high = value.partition('-')
+    return float(low), float(high or low)
+
+
+def make_error(kind: str) -> openai.OpenAIError:
+    """The exception the openai library raises for a failure kind"""
+    request = httpx.Request('POST', 'https://api.openai.com/v1/chat/completions')
+    if kind == 'timeout':
+        return openai.APITimeoutError(request=request)
+    if kind == 'server':
+        return openai.InternalServerError('Replayed server error', body=None,
+                                          response=httpx.Response(500, request=request))
+    return openai.RateLimitError('Replayed rate limit', body=None,
+                                 response=httpx.Response(429, request=request))
+
+
+def _completion(content: str, model: str) -> ChatCompletion:
+    return ChatCompletion.model_validate({
+        'id': f'chatcmpl-replay-{random.getrandbits(48):x}',
+        'object': 'chat.completion',
+        'created': int(time.time()),
+        'model': model,
+        'choices': [{
+            'index': 0,
+            'finish_reason': 'stop',
+            'message': {'role': 'assistant', 'content': content}
+        }]
+    })
+
+
+class _Completions:
+    def __init__(self, create):
+        self.create = create
+
+
+class _Chat:
+    def __init__(self, create):
+        self.completions = _Completions(create)
+
+
+class ReplayClient:
+    """
+    Drop-in for OpenAI() that answers chat.completions.create() from recordings.
+
+    Recordings for a route are served round-robin; routes without any get
+    DEFAULT_RESPONSES. calls counts calls per route.
+    """
+
+    def __init__(self, recordings_path: Optional[str] = None,
+                 latency_ms: Optional[Tuple[float, float]] = None,
+                 error_rate: float = 0.0, error_kind: str = 'rate_limit',
+                 seed: Optional[int] = None):
+        if error_kind not in ERROR_KINDS:
+            raise ValueError(f'OPENAI_REPLAY_ERROR must be one of {ERROR_KINDS}, got {error_kind!r}')
+        self.recordings = load_recordings(recordings_path or get_recordings_path())
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.error_kind = error_kind
+        self.calls = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.chat = _Chat(self._create)
+
+    @classmethod
+    def from_env(cls) -> 'ReplayClient':
+        return cls(latency_ms=parse_latency(os.environ.get('OPENAI_REPLAY_LATENCY_MS')),
+                   error_rate=float(os.environ.get('OPENAI_REPLAY_ERROR_RATE', '0')),
+                   error_kind=os.environ.get('OPENAI_REPLAY_ERROR', 'rate_limit'))
+
+    def _next(self, route: str) -> Tuple[Dict, float, bool]:
+        """(recording, delay_ms, fail) for the next call on a route"""
+        with self._lock:
+            entries = self.recordings.get(route)
+            if entries:
+                entry = entries[self.calls[route] % len(entries)]
+            else:
+                entry = {'route': route, 'content': DEFAULT_RESPONSES[route]}
+            self.calls[route] += 1
+
+            if self.latency_ms is not None:
+                delay_ms = self._rng.uniform(*self.latency_ms)
+            else:
+                delay_ms = entry.get('latency_ms') or 0
+            return entry, delay_ms, self._rng.random() < self.error_rate
+
+    def _create(self, *, model: str, messages: List[Dict], **kwargs) -> ChatCompletion:
+        entry, delay_ms, fail = self._next(classify_request(messages))
+        time.sleep(delay_ms / 1000.0)
+        if fail:
+            raise make_error(self.error_kind)
+        return _completion(entry['content'], model)
+
+
+class RecordingClient:
+    """Wraps a real OpenAI client and appends each response to a recordings file"""
+
+    def __init__(self, client, recordings_path: Optional[str] = None):
+        self._client = client
+        self.recordings_path = recordings_path or get_recordings_path()
+        self._lock = threading.Lock()
+        self.chat = _Chat(self._create)
+
+    def _create(self, **kwargs):
+        start = time.perf_counter()
+        response = self._client.chat.completions.create(**kwargs)
+        entry = {
+            'route': classify_request(kwargs.get('messages', [])),
+            'model': kwargs.get('model'),
+            'content': response.choices[0].message.content,
+            'latency_ms': round((time.perf_counter() - start) * 1000, 1)
+        }
+        with self._lock, open(self.recordings_path, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+        return response
@@ -30,12 +30,17 @@ logger = logging.getLogger(__name__)
 # Import centralized database configuration
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
+    from api.utils.prediction_context import scoped_cache
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
+    from prediction_context import scoped_cache
 
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
+@scoped_cache
 def get_team_opponent_stats(team_id: int, season: str = '2025-26', split_type: str = 'overall') -> Dict:
     """
     Get opponent stats allowed by a team (defensive metrics).
@@ -55,7 +60,7 @@ def get_team_opponent_stats(team_id: int, season: str = '2025-26', split_type: s
         Dictionary of opponent stats, or empty dict if no data
     """
     try:
-        conn = sqlite3.connect(NBA_DATA_DB_PATH)
+        conn = get_shared_connection(NBA_DATA_DB_PATH, readonly=True, row_factory=None)
         cursor = conn.cursor()
 
         cursor.execute('''
@@ -0,0 +1,306 @@
+"""
+Opponent Rank Snapshots
+
+Materializes each team's league rank on the opponent-quality metrics used by
+drilldowns and archetype game lists, as it stood on every game date of the
+season:
+
+    opponent_rank_snapshots(team_id, season, game_date, metric, value, rank, games_played)
+
+A snapshot for game_date D ranks every team on its games played strictly
+before D, so joining a game log row on (opponent_team_id, game_date) gives
+the opponent's rank going into that game. Teams with no games before D have
+no row. Only Regular Season and NBA Cup games count, and only teams in
+nba_teams are ranked (the same population as the *_rank columns in
+team_season_stats).
+
+Archetype game lists show these ranks. Bar drilldowns still bucket by the
+season-to-date ranks until the split charts switch, so a bar and its
+drilldown always list the same games.
+
+The derived pipeline refreshes the table after each sync. Snapshots are
+rewritten from the first game date whose inputs changed onward; earlier
+dates are left alone.
+
+Usage:
+    from api.utils.opponent_rank_snapshots import refresh_opponent_rank_snapshots
+
+    refresh_opponent_rank_snapshots('2025-26')             # Changed dates only
+    refresh_opponent_rank_snapshots('2025-26', full=True)  # Rewrite the season
+"""
+
+import sqlite3
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Import centralized database configuration
+try:
+    from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
+except ImportError:
+    from db_config import get_db_path
+    from connection_pool import get_shared_connection
+
+NBA_DATA_DB_PATH = get_db_path('nba_data.db')
+
+# metric -> (numerator column, denominator column or None for a per-game average,
+#            scale, higher_is_better). Names match the team_season_stats columns
+#            whose *_rank they stand in for.
+SNAPSHOT_METRICS = {
+    'off_rtg': ('off_rating', None, 1.0, True),
+    'def_rtg': ('def_rating', None, 1.0, False),
+    'opp_fg3_pct': ('opp_fg3m', 'opp_fg3a', 100.0, False),
+    'opp_tov': ('opp_turnovers', None, 1.0, True),
+    'opp_assists': ('opp_assists', None, 1.0, False),
+}
+
+GAME_FILTER = "AND game_type IN ('Regular Season', 'NBA Cup')"
+
+
+def _get_db_connection() -> sqlite3.Connection:
+    """Get this thread's shared connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH)
+
+
+def create_snapshot_table(cursor):
+    """Create opponent_rank_snapshots if migration v16 has not run"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS opponent_rank_snapshots (
+            team_id INTEGER NOT NULL,
+            season TEXT NOT NULL,
+            game_date TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            value REAL,
+            rank INTEGER NOT NULL,
+            games_played INTEGER NOT NULL,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (team_id, season, game_date, metric)
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_rank_snapshots_season_date
+        ON opponent_rank_snapshots(season, game_date)
+    ''')
+
+
+def has_rank_snapshots(cursor, season: str) -> bool:
+    """True if snapshots were built for the season (False before migration v16)"""
+    try:
+        cursor.execute('SELECT 1 FROM opponent_rank_snapshots WHERE season = ? LIMIT 1', (season,))
+        return cursor.fetchone() is not None
+    except sqlite3.OperationalError:
+        return False
+
+
+def _load_daily_totals(cursor, season: str) -> Tuple[List[str], List[int], np.ndarray, np.ndarray]:
+    """
+    Per-team sums and non-null counts of every metric column on each game date
+
+    Returns:
+        (dates, team_ids, sums, counts) where sums/counts are
+        (dates, teams, columns) arrays and columns follow _metric_columns()
+    """
+    columns = _metric_columns()
+    cursor.execute(f'''
+        SELECT team_id, game_date, COUNT(*) as games,
+               {', '.join(f'SUM({col}), COUNT({col})' for col in columns)}
+        FROM team_game_logs
+        WHERE season = ? AND team_pts IS NOT NULL {GAME_FILTER}
+            AND team_id IN (SELECT team_id FROM nba_teams WHERE season = ?)
+        GROUP BY team_id, game_date
+    ''', (season, season))
+    rows = cursor.fetchall()
+
+    dates = sorted({row['game_date'] for row in rows})
+    team_ids = sorted({row['team_id'] for row in rows})
+    date_index = {date: i for i, date in enumerate(dates)}
+    team_index = {team_id: i for i, team_id in enumerate(team_ids)}
+
+    # Column 0 is the game count; then one slot per metric column
+    sums = np.zeros((len(dates), len(team_ids), len(columns) + 1))
+    counts = np.zeros_like(sums)
+    for row in rows:
+        i, j = date_index[row['game_date']], team_index[row['team_id']]
+        sums[i, j, 0] = counts[i, j, 0] = row['games']
+        for k in range(len(columns)):
+            sums[i, j, k + 1] = row[3 + 2 * k] or 0.0
+            counts[i, j, k + 1] = row[4 + 2 * k]
+
+    return dates, team_ids, sums, counts
+
+
+def _metric_columns() -> List[str]:
+    """Distinct game log columns read by SNAPSHOT_METRICS"""
+    columns = []
+    for numerator, denominator, _, _ in SNAPSHOT_METRICS.values():
+        for col in (numerator, denominator):
+            if col and col not in columns:
+                columns.append(col)
+    return columns
+
+
+def compute_rank_snapshots(dates: List[str], team_ids: List[int],
+                           sums: np.ndarray, counts: np.ndarray) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Rank every team on each metric using games before each date
+
+    Args:
+        dates, team_ids, sums, counts: _load_daily_totals() output
+
+    Returns:
+        {metric: {'value': (dates, teams), 'rank': (dates, teams), 'games': (dates, teams)}};
+        rank is 0 where a team had no games before the date
+    """
+    columns = _metric_columns()
+    # Totals through the previous game date: shift the cumulative sums down one row
+    before_sums = np.cumsum(sums, axis=0) - sums
+    before_counts = np.cumsum(counts, axis=0) - counts
+    games = before_counts[:, :, 0].astype(int)
+    team_order = np.arange(len(team_ids))
+
+    snapshots = {}
+    for metric, (numerator, denominator, scale, higher_is_better) in SNAPSHOT_METRICS.items():
+        num = 1 + columns.index(numerator)
+        if denominator:
+            den_sum = before_sums[:, :, 1 + columns.index(denominator)]
+            valid = den_sum > 0
+            values = np.where(valid, before_sums[:, :, num] * scale / np.where(valid, den_sum, 1.0), np.nan)
+        else:
+            den_count = before_counts[:, :, num]
+            valid = den_count > 0
+            values = np.where(valid, before_sums[:, :, num] * scale / np.where(valid, den_count, 1.0), np.nan)
+
+        ranks = np.zeros(values.shape, dtype=int)
+        for i in range(len(dates)):
+            ranked = np.flatnonzero(valid[i])
+            if not len(ranked):
+                continue
+            keys = values[i, ranked] if not higher_is_better else -values[i, ranked]
+            # Ties go to the lower team_id, as in the team_season_stats ranks
+            order = ranked[np.lexsort((team_order[ranked], keys))]
+            ranks[i, order] = np.arange(1, len(order) + 1)
+
+        snapshots[metric] = {'value': values, 'rank': ranks, 'games': games}
+
+    return snapshots
+
+
+def _first_stale_date(cursor, season: str, dates: List[str], snapshot: Dict[str, np.ndarray]) -> Optional[str]:
+    """
+    First game date whose stored snapshots don't match the game logs
+
+    A date is stale when it has no snapshots, when the games behind them
+    changed (a game was added or removed on an earlier date), or when its
+    games were removed. Stat corrections that keep game counts the same need
+    a full refresh.
+
+    Args:
+        snapshot: compute_rank_snapshots() output for the first SNAPSHOT_METRICS metric
+
+    Returns:
+        The stale game_date, or None if every stored date is current
+    """
+    cursor.execute('''
+        SELECT game_date, SUM(games_played) as games
+        FROM opponent_rank_snapshots
+        WHERE season = ? AND metric = ?
+        GROUP BY game_date
+    ''', (season, next(iter(SNAPSHOT_METRICS))))
+    stored = {row['game_date']: row['games'] for row in cursor.fetchall()}
+
+    stale = [date for date in stored if date not in set(dates)]
+    for i, date in enumerate(dates):
+        expected = int(snapshot['games'][i][snapshot['rank'][i] > 0].sum())
+        if stored.get(date, 0) != expected:
+            stale.append(date)
+            break
+
+    return min(stale) if stale else None
+
+
+def refresh_opponent_rank_snapshots(season: str, full: bool = False) -> int:
+    """
+    Rebuild opponent rank snapshots for a season
+
+    Args:
+        season: Season string (e.g., '2025-26')
+        full: Rewrite every date instead of only those from the first changed date
+
+    Returns:
+        Number of snapshot rows written
+    """
+    conn = _get_db_connection()
+    try:
+        cursor = conn.cursor()
+        create_snapshot_table(cursor)
+
+        dates, team_ids, sums, counts = _load_daily_totals(cursor, season)
+        snapshots = compute_rank_snapshots(dates, team_ids, sums, counts)
+
+        first_date = '' if full else _first_stale_date(cursor, season, dates, next(iter(snapshots.values())))
+        if first_date is None:
+            logger.info(f"Opponent rank snapshots for {season} are up to date")
+            return 0
+
+        cursor.execute('DELETE FROM opponent_rank_snapshots WHERE season = ? AND game_date >= ?',
+                       (season, first_date))
+
+        start = bisect_left(dates, first_date)
+        updated_at = datetime.now(timezone.utc).isoformat()
+        rows = []
+        for metric, snapshot in snapshots.items():
+            date_idx, team_idx = np.nonzero(snapshot['rank'][start:])
+            for i, j in zip(date_idx + start, team_idx):
+                rows.append((
+                    team_ids[j], season, dates[i], metric,
+                    float(snapshot['value'][i, j]), int(snapshot['rank'][i, j]),
+                    int(snapshot['games'][i, j]), updated_at
+                ))
+
+        cursor.executemany('''
+            INSERT INTO opponent_rank_snapshots
+            (team_id, season, game_date, metric, value, rank, games_played, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        conn.commit()
+
+        logger.info(f"Wrote {len(rows)} opponent rank snapshots for {season} "
+                    f"({len(dates) - start} game dates rewritten)")
+        return len(rows)
+    finally:
+        conn.close()
+
+
+def get_rank_as_of(team_id: int, game_date: str, season: str, metric: str) -> Optional[int]:
+    """
+    A team's rank on a snapshot metric going into a game date
+
+    Args:
+        team_id: Team ID
+        game_date: Game date (same format as team_game_logs.game_date)
+        season: Season string
+        metric: Key of SNAPSHOT_METRICS
+
+    Returns:
+        Rank (1-30), or None if the team had no games before that date or
+        no snapshots exist
+    """
+    conn = _get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT rank FROM opponent_rank_snapshots
+            WHERE team_id = ? AND season = ? AND game_date = ? AND metric = ?
+        ''', (team_id, season, game_date, metric))
+        row = cursor.fetchone()
+        return row['rank'] if row else None
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
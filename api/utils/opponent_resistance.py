@@ -25,8 +25,10 @@ logger = logging.getLogger(__name__)
 # Import DB helper
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
 
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
@@ -35,10 +37,8 @@ _SEASON_CACHE = {}
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False, timeout=30.0)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
 
 
 def _calculate_possessions(row: Dict, fta_coefficient: float = 0.44) -> float:
@@ -34,8 +34,10 @@ logger = logging.getLogger(__name__)
 # Import centralized database configuration
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
 
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
@@ -252,7 +254,7 @@ def backfill_all_opponent_stats(season: Optional[str] = None, limit: Optional[in
     Returns:
         Dictionary with counts: {'total_games': X, 'updated': Y, 'errors': Z}
     """
-    conn = sqlite3.connect(NBA_DATA_DB_PATH)
+    conn = get_shared_connection(NBA_DATA_DB_PATH, row_factory=None)
     cursor = conn.cursor()
 
     print("=" * 80)
@@ -324,7 +326,7 @@ if __name__ == '__main__':
     results = backfill_all_opponent_stats(season='2025-26')
 
     print("\n3. Sample query to verify:")
-    conn = sqlite3.connect(NBA_DATA_DB_PATH)
+    conn = get_shared_connection(NBA_DATA_DB_PATH, row_factory=None)
     cursor = conn.cursor()
     cursor.execute('''
         SELECT
@@ -13,21 +13,29 @@ logger = logging.getLogger(__name__)
 # Import centralized database configuration
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
+    from api.utils.game_log_store import get_game_log_store
+    from api.utils.prediction_context import scoped_cache
+    from api.utils.team_context import get_scoped_team_context
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
+    from game_log_store import get_game_log_store
+    from prediction_context import scoped_cache
+    from team_context import get_scoped_team_context
 
 # Database path
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
 
 
-def get_team_recent_pace(team_id: int, season: str = '2025-26', n_games: int = 5) -> Optional[float]:
+@scoped_cache
+def get_team_recent_pace(team_id: int, season: str = '2025-26', n_games: int = 5,
+                         team_context=None) -> Optional[float]:
     """
     Get team's average pace over last N games.
 
@@ -35,24 +43,19 @@ def get_team_recent_pace(team_id: int, season: str = '2025-26', n_games: int = 5
         team_id: Team's NBA ID
         season: Season string
         n_games: Number of recent games to average (default 5)
+        team_context: Optional TeamContext to read from instead of the game log store
 
     Returns:
         Average pace over last N games, or None if insufficient data
     """
     try:
-        conn = _get_db_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT pace
-            FROM team_game_logs
-            WHERE team_id = ? AND season = ? AND pace IS NOT NULL
-            ORDER BY game_date DESC
-            LIMIT ?
-        ''', (team_id, season, n_games))
-
-        pace_values = [row['pace'] for row in cursor.fetchall()]
-        conn.close()
+        team_context = team_context or get_scoped_team_context(team_id, season)
+        if team_context is not None:
+            pace_values = [g['pace'] for g in team_context.games() if g['pace'] is not None][:n_games]
+        else:
+            store = get_game_log_store(season)
+            recent = store.last_n(store.team_rows(team_id, require=('pace',)), n_games)
+            pace_values = store.values('pace', recent).tolist()
 
         if not pace_values:
             return None
@@ -13,18 +13,20 @@ logger = logging.getLogger(__name__)
 # Import centralized database configuration
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
+    from api.utils.game_log_store import average, get_game_log_store
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
+    from game_log_store import average, get_game_log_store
 
 # Database path
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
 
 
 def get_team_pace_splits(team_id: int, season: str = '2025-26') -> Optional[Dict]:
@@ -81,50 +83,27 @@ def get_team_pace_splits(team_id: int, season: str = '2025-26') -> Optional[Dict
         ppg_row = cursor.fetchone()
         season_avg_ppg = ppg_row['ppg'] if ppg_row and ppg_row['ppg'] else None
 
-        # Get all game logs with pace data
-        cursor.execute('''
-            SELECT team_pts, pace, is_home
-            FROM team_game_logs
-            WHERE team_id = ? AND season = ?
-                AND team_pts IS NOT NULL
-                AND pace IS NOT NULL
-        ''', (team_id, season))
-
-        games = cursor.fetchall()
         conn.close()
 
-        if not games:
+        # Game logs with pace data, from the in-memory store
+        store = get_game_log_store(season)
+        games = store.team_rows(team_id, require=('team_pts', 'pace'))
+
+        if len(games) == 0:
             logger.warning(f'No game logs found for team {team_id}')
             return None
 
-        # Classify games into pace buckets and split by location
-        from api.utils.db_queries import get_pace_bucket
-
-        buckets = {
-            'slow': {'home': [], 'away': []},
-            'normal': {'home': [], 'away': []},
-            'fast': {'home': [], 'away': []}
-        }
-
-        for game in games:
-            team_pts = game['team_pts']
-            pace = game['pace']
-            is_home = bool(game['is_home'])
-
-            bucket = get_pace_bucket(pace)
-            location = 'home' if is_home else 'away'
-            buckets[bucket][location].append(team_pts)
-
-        # Calculate averages for each bucket and location
+        # Average points per pace bucket and location
         pace_splits = {}
 
         for bucket_name in ['slow', 'normal', 'fast']:
-            home_games = buckets[bucket_name]['home']
-            away_games = buckets[bucket_name]['away']
+            bucket_games = store.in_pace_bucket(games, bucket_name)
+            home_games = store.at_home(bucket_games)
+            away_games = store.at_home(bucket_games, home=False)
 
             pace_splits[bucket_name] = {
-                'home_ppg': sum(home_games) / len(home_games) if home_games else None,
-                'away_ppg': sum(away_games) / len(away_games) if away_games else None,
+                'home_ppg': average(store.values('team_pts', home_games), default=None, digits=None),
+                'away_ppg': average(store.values('team_pts', away_games), default=None, digits=None),
                 'home_games': len(home_games),
                 'away_games': len(away_games)
             }
@@ -12,12 +12,16 @@ import os
 from typing import Dict, Optional, Tuple
 import statistics
 
+from api.utils.prediction_context import scoped_cache
+from api.utils.connection_pool import get_shared_connection
+
 
 def get_db_path(db_name='nba_data.db'):
     """Get the path to the database file"""
     return os.path.join(os.path.dirname(__file__), '..', 'data', db_name)
 
 
+@scoped_cache
 def calculate_pace_volatility(team_id: int, season: str = '2025-26', n_games: int = 10) -> Dict:
     """
     Calculate pace volatility for a team based on recent games.
@@ -39,8 +43,7 @@ def calculate_pace_volatility(team_id: int, season: str = '2025-26', n_games: in
         }
     """
     db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    conn = get_shared_connection(db_path, readonly=True)
     cursor = conn.cursor()
 
     # Get recent game paces
@@ -96,8 +99,7 @@ def get_opponent_pace_impact(team_id: int, opp_team_id: int, season: str = '2025
         None if no historical data
     """
     db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    conn = get_shared_connection(db_path, readonly=True)
     cursor = conn.cursor()
 
     # Get team's average pace vs this opponent
@@ -185,8 +187,7 @@ def get_defensive_pace_pressure(team_id: int, season: str = '2025-26') -> float:
         Pace pressure factor (e.g., 0.96 = slows opponents by 4%)
     """
     db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    conn = get_shared_connection(db_path, readonly=True)
     cursor = conn.cursor()
 
     # Get opponent pace when facing this team
@@ -17,11 +17,22 @@ Usage:
     with log_slow_operation("Fetching team stats", threshold_ms=500):
         # ... operation ...
         pass
+
+    # Per-stage breakdown of a long function split with mark_stage()
+    profiler = StageProfiler()
+    with profiler.profile():
+        predict_game_total(...)
+    print(profiler.get_stage_stats())
 """
 
+import sqlite3
+import statistics
+import sys
 import time
+import tracemalloc
 import functools
 from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Optional, Callable
 
 
@@ -196,3 +207,149 @@ _global_tracker = PerformanceTracker()
 def get_performance_tracker() -> PerformanceTracker:
     """Get the global performance tracker instance."""
     return _global_tracker
+
+
+# ============================================================================
+# STAGE PROFILING
+# ============================================================================
+
+_active_profiler: ContextVar[Optional['StageProfiler']] = ContextVar('stage_profiler', default=None)
+
+
+def mark_stage(name: str):
+    """
+    Start the next stage of the running function if a StageProfiler is active.
+
+    Costs one context variable lookup when nothing is profiling, so marks can
+    stay in production code.
+
+    Args:
+        name: Stage name (the previous stage ends here)
+    """
+    profiler = _active_profiler.get()
+    if profiler is not None:
+        profiler.mark(name)
+
+
+class StageProfiler:
+    """
+    Lap timer for functions split into stages with mark_stage().
+
+    Each mark ends the running stage and starts the next. Wall time, SQL
+    statements and net allocated memory blocks are charged to the stage that
+    was running, and stage durations are recorded on a PerformanceTracker.
+
+    SQL statements are counted on connections opened with sqlite3.connect()
+    while profiling; connections opened earlier (pools) are not seen.
+    """
+
+    def __init__(self, tracker: Optional[PerformanceTracker] = None,
+                 count_queries: bool = True, trace_memory: bool = False):
+        """
+        Args:
+            tracker: Tracker to record stage durations on (default: a new one)
+            count_queries: Count SQL statements per stage
+            trace_memory: Also record each stage's peak traced memory
+                          (tracemalloc; slows everything down)
+        """
+        self.tracker = tracker or PerformanceTracker()
+        self.count_queries = count_queries
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self._current = None
+        self._started = 0.0
+        self._queries = 0
+        self._blocks = 0
+
+    def mark(self, name: str):
+        """End the running stage and start a new one."""
+        self._close_stage()
+        self._current = name
+        self._queries = 0
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        self._blocks = sys.getallocatedblocks()
+        self._started = time.perf_counter()
+
+    def _close_stage(self):
+        if self._current is None:
+            return
+        elapsed_ms = (time.perf_counter() - self._started) * 1000
+        stage = self.stages.setdefault(self._current, {
+            'durations_ms': [], 'queries': [], 'alloc_blocks': [], 'peak_kb': []
+        })
+        stage['durations_ms'].append(elapsed_ms)
+        stage['queries'].append(self._queries)
+        stage['alloc_blocks'].append(sys.getallocatedblocks() - self._blocks)
+        if self.trace_memory:
+            stage['peak_kb'].append(tracemalloc.get_traced_memory()[1] / 1024)
+        self.tracker.record(self._current, elapsed_ms)
+        self._current = None
+
+    def _count_query(self, statement: str):
+        if self._current is not None:
+            self._queries += 1
+
+    @contextmanager
+    def profile(self, first_stage: str = 'start'):
+        """
+        Profile the block; code before the first mark_stage() is first_stage.
+
+        Example:
+            with profiler.profile('inputs'):
+                predict_game_total(...)
+        """
+        connect = sqlite3.connect
+
+        def traced_connect(*args, **kwargs):
+            conn = connect(*args, **kwargs)
+            conn.set_trace_callback(self._count_query)
+            return conn
+
+        # Shared per-thread connections opened before the block are counted too
+        try:
+            from api.utils.connection_pool import shared_connections
+        except ImportError:
+            from connection_pool import shared_connections
+
+        if self.count_queries:
+            sqlite3.connect = traced_connect
+            for conn in shared_connections():
+                conn.set_trace_callback(self._count_query)
+        if self.trace_memory:
+            tracemalloc.start()
+        token = _active_profiler.set(self)
+        try:
+            self.mark(first_stage)
+            yield self
+        finally:
+            self._close_stage()
+            _active_profiler.reset(token)
+            if self.trace_memory:
+                tracemalloc.stop()
+            if self.count_queries:
+                sqlite3.connect = connect
+                for conn in shared_connections():
+                    conn.set_trace_callback(None)
+
+    def get_stage_stats(self) -> dict:
+        """
+        Per-stage statistics in the order stages first ran.
+
+        Returns:
+            {stage: {'calls', 'median_ms', 'mean_ms', 'max_ms',
+                     'queries_per_call', 'alloc_blocks_per_call', 'peak_kb'}}
+        """
+        stats = {}
+        for name, stage in self.stages.items():
+            durations = stage['durations_ms']
+            stats[name] = {
+                'calls': len(durations),
+                'median_ms': round(statistics.median(durations), 3),
+                'mean_ms': round(statistics.mean(durations), 3),
+                'max_ms': round(max(durations), 3),
+                'queries_per_call': round(statistics.mean(stage['queries']), 2),
+                'alloc_blocks_per_call': round(statistics.median(stage['alloc_blocks'])),
+                'peak_kb': round(max(stage['peak_kb']), 1) if stage['peak_kb'] else None
+            }
+        return stats
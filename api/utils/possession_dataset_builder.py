@@ -24,6 +24,7 @@ logger = logging.getLogger(__name__)
 # Import existing utilities
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
     from api.utils.empty_possessions_calculator import (
         calculate_possessions,
         safe_divide,
@@ -34,6 +35,7 @@ try:
     )
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
     from empty_possessions_calculator import (
         calculate_possessions,
         safe_divide,
@@ -47,10 +49,8 @@ NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False, timeout=30.0)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
 
 
 def _parse_season_dates(season: str, start_date: str, end_date: str) -> tuple:
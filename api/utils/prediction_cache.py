@@ -0,0 +1,399 @@
+"""
+Prediction Cache - Versioned LRU cache for game predictions
+
+Replaces the FIFO dict that used to live in server.py:
+- True LRU eviction (a hit moves the entry to the back of the queue)
+- Per-entry TTL (PREDICTION_CACHE_TTL, default 1 hour)
+- Data-version aware: every key is stamped with the last successful sync
+  in data_sync_log, so entries from before a sync are never served after it
+
+The data version is re-read at most once every VERSION_CHECK_INTERVAL
+seconds so a cache hit does not cost a database round trip.
+
+Shared backend (PREDICTION_CACHE_BACKEND, default sqlite):
+Each gunicorn worker has its own in-memory LRU, so a game computed by one
+worker used to miss in the other. With the SQLite backend every worker
+also reads and writes a small WAL-mode cache database on local disk
+(PREDICTION_CACHE_DB, default api/data/prediction_cache.db). Local misses
+fall through to it, so hits are shared across workers, survive
+max_requests recycling, and include the predictions the sync process
+warmed after it exits. Set PREDICTION_CACHE_BACKEND=memory for a
+per-process cache only.
+
+Usage:
+    from api.utils.prediction_cache import get_prediction_cache
+
+    cache = get_prediction_cache()
+    found, value = cache.get((home_id, away_id, line))
+    if not found:
+        value = compute()
+        cache.put((home_id, away_id, line), value)
+    cache.get_stats()  # hits, misses, evictions, ...
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+try:
+    from api.utils.db_config import get_db_path
+except ImportError:
+    from db_config import get_db_path
+
+# Database path
+NBA_DATA_DB_PATH = get_db_path('nba_data.db')
+
+# Defaults (override with environment variables)
+DEFAULT_MAX_SIZE = int(os.environ.get('PREDICTION_CACHE_MAX_SIZE', '128'))
+DEFAULT_TTL_SECONDS = float(os.environ.get('PREDICTION_CACHE_TTL', '3600'))
+VERSION_CHECK_INTERVAL = float(os.environ.get('PREDICTION_CACHE_VERSION_INTERVAL', '5'))
+
+# Shared backend: 'memory' (per process) or 'sqlite' (shared by all workers on the host)
+CACHE_BACKEND = os.environ.get('PREDICTION_CACHE_BACKEND', 'sqlite')
+SHARED_CACHE_DB_PATH = os.environ.get('PREDICTION_CACHE_DB', get_db_path('prediction_cache.db'))
+SHARED_CACHE_MAX_SIZE = int(os.environ.get('PREDICTION_CACHE_SHARED_MAX_SIZE', '1024'))
+
+# data_sync_log rows written by slate_warmup after a sync; they record cache
+# warming, not new data, so they must not change the data version
+WARMUP_SYNC_TYPE = 'slate_warmup'
+
+
+def get_data_version() -> str:
+    """
+    Get a stamp that changes whenever a sync completes successfully
+    (slate warm-up rows excluded).
+
+    Returns:
+        '<success count>:<latest completed_at>' or 'unknown' if the
+        sync log cannot be read
+    """
+    try:
+        conn = sqlite3.connect(NBA_DATA_DB_PATH, timeout=5.0)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT COUNT(*), MAX(completed_at)
+            FROM data_sync_log
+            WHERE status = 'success' AND sync_type != ?
+        ''', (WARMUP_SYNC_TYPE,))
+        count, completed_at = cursor.fetchone()
+        conn.close()
+        return f'{count}:{completed_at}'
+    except Exception as e:
+        print(f'[prediction_cache] Could not read data version: {e}')
+        return 'unknown'
+
+
+_version_lock = threading.Lock()
+_cached_version: Optional[str] = None
+_cached_version_at = 0.0
+
+
+def get_cached_data_version(max_age: float = VERSION_CHECK_INTERVAL) -> str:
+    """
+    get_data_version(), re-read at most once every max_age seconds.
+
+    For per-request checks (stored payloads, ETags) that must not cost a
+    database round trip each time.
+    """
+    global _cached_version, _cached_version_at
+    with _version_lock:
+        now = time.monotonic()
+        if _cached_version is None or now - _cached_version_at >= max_age:
+            _cached_version = get_data_version()
+            _cached_version_at = now
+        return _cached_version
+
+
+def reset_cached_data_version():
+    """Make the next get_cached_data_version() re-read (after a sync in this process)"""
+    global _cached_version
+    with _version_lock:
+        _cached_version = None
+
+
+class SQLiteCacheBackend:
+    """
+    Cross-process cache store in a local SQLite database (WAL mode).
+
+    Values are pickled; the database is a private cache file written only
+    by this application. Expiry uses wall-clock time so every process
+    agrees on it, and the least recently read rows are trimmed once the
+    table grows past max_size.
+    """
+
+    def __init__(self, db_path: str = SHARED_CACHE_DB_PATH, max_size: int = SHARED_CACHE_MAX_SIZE):
+        self.db_path = db_path
+        self.max_size = max_size
+        self._local = threading.local()
+        self._init_schema()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get this thread's connection (opened once per thread and process, reused)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA busy_timeout=5000')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_schema(self):
+        """Create the cache table if needed"""
+        conn = self._get_connection()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS prediction_cache (
+                cache_key TEXT PRIMARY KEY,
+                data_version TEXT NOT NULL,
+                value BLOB NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_prediction_cache_last_access
+            ON prediction_cache(last_access)
+        ''')
+
+    @staticmethod
+    def _serialize_key(version: str, key: Hashable) -> str:
+        return f'{version}|{key!r}'
+
+    def get(self, version: str, key: Hashable) -> Tuple[bool, Any, Optional[float]]:
+        """
+        Look up a key.
+
+        Returns:
+            (found, value, expires_at) with expires_at as wall-clock time
+        """
+        conn = self._get_connection()
+        cache_key = self._serialize_key(version, key)
+        now = time.time()
+        row = conn.execute('''
+            SELECT value, expires_at FROM prediction_cache WHERE cache_key = ?
+        ''', (cache_key,)).fetchone()
+
+        if row is None:
+            return False, None, None
+        if row[1] <= now:
+            conn.execute('DELETE FROM prediction_cache WHERE cache_key = ?', (cache_key,))
+            return False, None, None
+
+        conn.execute('''
+            UPDATE prediction_cache SET last_access = ? WHERE cache_key = ?
+        ''', (now, cache_key))
+        return True, pickle.loads(row[0]), row[1]
+
+    def put(self, version: str, key: Hashable, value: Any, ttl_seconds: float):
+        """Store a value and trim the least recently read rows past max_size."""
+        conn = self._get_connection()
+        now = time.time()
+        conn.execute('''
+            INSERT OR REPLACE INTO prediction_cache
+                (cache_key, data_version, value, expires_at, last_access)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (self._serialize_key(version, key), version,
+              pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+              now + ttl_seconds, now))
+        conn.execute('''
+            DELETE FROM prediction_cache
+            WHERE cache_key IN (
+                SELECT cache_key FROM prediction_cache
+                ORDER BY last_access DESC
+                LIMIT -1 OFFSET ?
+            )
+        ''', (self.max_size,))
+
+    def purge_other_versions(self, version: str) -> int:
+        """Delete rows written for any other data version"""
+        cursor = self._get_connection().execute(
+            'DELETE FROM prediction_cache WHERE data_version != ?', (version,))
+        return cursor.rowcount
+
+    def clear(self):
+        """Delete every row"""
+        self._get_connection().execute('DELETE FROM prediction_cache')
+
+    def count(self) -> int:
+        """Number of stored rows"""
+        return self._get_connection().execute('SELECT COUNT(*) FROM prediction_cache').fetchone()[0]
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache with TTL, keyed by (data_version, key).
+
+    With a shared backend, local misses fall through to it and every put
+    is written through, so other processes see the entry.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 version_fn: Callable[[], str] = get_data_version,
+                 version_check_interval: float = VERSION_CHECK_INTERVAL,
+                 shared: Optional[SQLiteCacheBackend] = None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.shared = shared
+        self._version_fn = version_fn
+        self._version_check_interval = version_check_interval
+        self._version = None
+        self._version_checked_at = 0.0
+        self._entries = OrderedDict()  # (version, key) -> (value, expires_at)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _current_version(self) -> str:
+        """Get the data version, re-reading it at most once per interval (lock held)"""
+        now = time.monotonic()
+        if self._version is None or now - self._version_checked_at >= self._version_check_interval:
+            version = self._version_fn()
+            self._version_checked_at = now
+            if version != self._version:
+                if self._version is not None:
+                    # Entries from the old version can never be hit again
+                    self.invalidations += len(self._entries)
+                    self._entries.clear()
+                    print(f'[prediction_cache] Data version changed {self._version} -> {version}, cache cleared')
+                if self.shared is not None:
+                    self._shared_call(self.shared.purge_other_versions, version)
+                self._version = version
+        return self._version
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a key for the current data version.
+
+        Returns:
+            (found, value)
+        """
+        with self._lock:
+            version = self._current_version()
+            full_key = (version, key)
+            entry = self._entries.get(full_key)
+
+            if entry is None:
+                return self._get_shared(version, key)
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[full_key]
+                self.expirations += 1
+                return self._get_shared(version, key)
+
+            self._entries.move_to_end(full_key)
+            self.hits += 1
+            return True, value
+
+    def _shared_call(self, method, *args):
+        """Call a shared backend method; backend errors degrade to a local-only cache"""
+        try:
+            return method(*args)
+        except Exception as e:
+            print(f'[prediction_cache] Shared cache error: {e}')
+            return None
+
+    def _get_shared(self, version: str, key: Hashable) -> Tuple[bool, Any]:
+        """Fall through to the shared backend after a local miss (lock held)"""
+        if self.shared is not None:
+            result = self._shared_call(self.shared.get, version, key)
+            if result and result[0]:
+                _, value, expires_at = result
+                remaining = expires_at - time.time()
+                self._store_local((version, key), value, remaining)
+                self.shared_hits += 1
+                self.hits += 1
+                return True, value
+
+        self.misses += 1
+        return False, None
+
+    def _store_local(self, full_key, value: Any, ttl: float):
+        """Insert into the local LRU and evict past max_size (lock held)"""
+        if full_key in self._entries:
+            self._entries.move_to_end(full_key)
+        self._entries[full_key] = (value, time.monotonic() + ttl)
+
+        while len(self._entries) > self.max_size:
+            evicted_key, _ = self._entries.popitem(last=False)
+            self.evictions += 1
+            print(f'[prediction_cache] EVICT: {evicted_key[1]}')
+
+    def put(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        """Store a value for the current data version, evicting the LRU entry if full."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            version = self._current_version()
+            self._store_local((version, key), value, ttl)
+            if self.shared is not None:
+                self._shared_call(self.shared.put, version, key, value, ttl)
+
+    def invalidate(self):
+        """Drop every entry and force a data version re-read on next access."""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._version = None
+            if self.shared is not None:
+                self._shared_call(self.shared.clear)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_stats(self) -> Dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with size, limits, counters and the current data version
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'backend': 'sqlite' if self.shared is not None else 'memory',
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'data_version': self._version
+            }
+
+
+# Global instance (one per process)
+_prediction_cache = None
+_prediction_cache_lock = threading.Lock()
+
+
+def get_prediction_cache() -> PredictionCache:
+    """Get the process-wide prediction cache (shared backend per PREDICTION_CACHE_BACKEND)"""
+    global _prediction_cache
+    if _prediction_cache is None:
+        with _prediction_cache_lock:
+            if _prediction_cache is None:
+                shared = None
+                if CACHE_BACKEND == 'sqlite':
+                    try:
+                        shared = SQLiteCacheBackend()
+                        print(f'[prediction_cache] Shared SQLite backend: {SHARED_CACHE_DB_PATH}')
+                    except Exception as e:
+                        print(f'[prediction_cache] Shared backend unavailable, using memory only: {e}')
+                _prediction_cache = PredictionCache(shared=shared)
+    return _prediction_cache
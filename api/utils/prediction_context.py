@@ -0,0 +1,161 @@
+"""
+Prediction Context - Scoped memoization for team-level lookups
+
+The prediction engine calls dozens of read-only helpers per matchup
+(get_team_stats_with_ranks, get_last_5_trends, get_shootout_stats inputs,
+3PT splits, ...). On a full slate the same 30 teams get re-read for every game.
+
+This module provides a scope in which those helpers are memoized:
+- Outside a scope every decorated helper behaves exactly as before (no caching)
+- Inside a scope the first call hits SQLite, later calls with the same
+  arguments are served from memory
+- Cached values are deep-copied on the way out so callers that mutate
+  results can never leak changes into the next game
+
+Usage:
+    from api.utils.prediction_context import prediction_scope, scoped_cache
+
+    @scoped_cache
+    def get_team_stats(team_id, season='2025-26'):
+        ...
+
+    with prediction_scope() as ctx:
+        for game in games:
+            predict_game_total(...)
+        print(ctx.get_stats())
+"""
+
+import copy
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+
+class PredictionContext:
+    """In-memory store for scoped helper results."""
+
+    def __init__(self):
+        self._values = {}
+        self.hits = 0
+        self.misses = 0
+        self.created_at = time.time()
+
+    def get(self, key):
+        """Return (found, value) for a cache key."""
+        if key in self._values:
+            self.hits += 1
+            return True, self._values[key]
+        self.misses += 1
+        return False, None
+
+    def put(self, key, value):
+        """Store a value for a cache key."""
+        self._values[key] = value
+
+    def get_or_build(self, key, builder: Callable[[], Any]) -> Any:
+        """
+        Return the stored value for key, building it on first use.
+
+        Unlike scoped_cache the value is shared, not copied, so it must be
+        treated as read-only by callers.
+        """
+        found, value = self.get(key)
+        if not found:
+            value = builder()
+            self.put(key, value)
+        return value
+
+    def get_stats(self) -> Dict:
+        """
+        Get scope statistics.
+
+        Returns:
+            Dict with entries, hits, misses and age
+        """
+        return {
+            'entries': len(self._values),
+            'hits': self.hits,
+            'misses': self.misses,
+            'age_ms': round((time.time() - self.created_at) * 1000, 1)
+        }
+
+
+# Active scope for the current thread / request (None = caching disabled)
+_active_context: ContextVar[Optional[PredictionContext]] = ContextVar('prediction_context', default=None)
+
+
+def get_active_context() -> Optional[PredictionContext]:
+    """Get the active prediction context, or None outside a scope."""
+    return _active_context.get()
+
+
+@contextmanager
+def prediction_scope():
+    """
+    Open a memoization scope for team-level lookups.
+
+    Nested scopes reuse the outer context so a slate run that calls into
+    code which opens its own scope still shares one store.
+
+    Yields:
+        PredictionContext for the scope
+    """
+    existing = _active_context.get()
+    if existing is not None:
+        yield existing
+        return
+
+    ctx = PredictionContext()
+    token = _active_context.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _active_context.reset(token)
+
+
+def with_prediction_scope(func: Callable) -> Callable:
+    """Decorator that runs the whole call inside a prediction scope."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs) -> Any:
+        with prediction_scope():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def scoped_cache(func: Callable) -> Callable:
+    """
+    Decorator that memoizes a read-only helper inside a prediction scope.
+
+    Arguments are normalized through the function signature so
+    f(1, '2025-26') and f(team_id=1, season='2025-26') share one entry.
+    Calls with unhashable arguments fall through to the real function.
+    """
+    signature = inspect.signature(func)
+    func_key = f'{func.__module__}.{func.__qualname__}'
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs) -> Any:
+        ctx = _active_context.get()
+        if ctx is None:
+            return func(*args, **kwargs)
+
+        try:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (func_key, tuple(bound.arguments.items()))
+            hash(key)
+        except TypeError:
+            return func(*args, **kwargs)
+
+        found, value = ctx.get(key)
+        if not found:
+            value = func(*args, **kwargs)
+            ctx.put(key, value)
+
+        return copy.deepcopy(value)
+
+    return wrapper
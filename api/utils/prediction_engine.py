@@ -3,6 +3,13 @@ Enhanced prediction engine for calculating Over/Under predictions
 Uses comprehensive NBA stats from nba_api
 """
 
+try:
+    from api.utils.prediction_context import with_prediction_scope
+    from api.utils.performance import mark_stage
+except ImportError:
+    from prediction_context import with_prediction_scope
+    from performance import mark_stage
+
 # ============================================================================
 # SHOOTOUT DETECTION CONSTANTS
 # NOTE: Shootout bonus disabled based on live results - these constants are
@@ -781,6 +788,7 @@ def is_shootout_candidate(
     return (True, reason)
 
 
+@with_prediction_scope
 def predict_game_total(home_data, away_data, betting_line=None, home_team_id=None, away_team_id=None, home_team_abbr=None, away_team_abbr=None, season='2025-26', game_id=None):
     """
     Main prediction function for game total
@@ -881,6 +889,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
         if not away_advanced or not away_advanced.get('PACE'):
             debug_info['missing_data'].append('away_season_pace')
 
+        mark_stage('team_ranks')
         # ========================================================================
         # EARLY SETUP: Get team stats with ranks and defense ranks
         # ========================================================================
@@ -916,6 +925,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
             except Exception as e:
                 print(f'[prediction_engine] Warning: Could not load stats with ranks: {e}')
 
+        mark_stage('similarity_data')
         # ========================================================================
         # SIMILARITY DATA: Fetch cluster assignments and similar teams
         # ========================================================================
@@ -933,6 +943,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
                 print(f'[prediction_engine] Warning: Could not fetch similarity data: {e}')
                 similarity_data = None
 
+        mark_stage('smart_baseline')
         # ========================================================================
         # SMART BASELINE: Blend season + recent form to avoid double-counting
         # ========================================================================
@@ -978,6 +989,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
             away_season_ppg, away_recent_ppg, away_recent_ortg_change
         )
 
+        mark_stage('contextual_baseline')
         # ========================================================================
         # CONTEXTUAL BASELINE ENHANCEMENT (Team-Specific vs Defense Tiers)
         # ========================================================================
@@ -1097,6 +1109,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
         print(f'  Away: {away_season_ppg:.1f} season, {away_recent_ppg:.1f} recent (L5), ORTG Δ{away_recent_ortg_change:+.1f}')
         print(f'    → {away_trend_type} trend ({away_season_weight:.0%} season / {away_recent_weight:.0%} recent) = {away_baseline:.1f} PPG')
 
+        mark_stage('true_pace')
         # ========================================================================
         # Apply TRUE PACE EFFECT (MUTED) - New Volume-Based Model
         # ========================================================================
@@ -1127,6 +1140,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
         print(f'  Home: {home_baseline:.1f} → {home_projected:.1f}')
         print(f'  Away: {away_baseline:.1f} → {away_projected:.1f}')
 
+        mark_stage('defense_adjustment')
         # ========================================================================
         # STEP 3: DEFENSE ADJUSTMENT (Dynamic - scales with offensive form)
         # ========================================================================
@@ -1219,6 +1233,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
             except Exception as e:
                 print(f'[prediction_engine] Error getting defense adjustment: {e}')
 
+        mark_stage('enhanced_defense')
         # ========================================================================
         # ENHANCED DEFENSIVE ADJUSTMENTS
         # ========================================================================
@@ -1276,6 +1291,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
                 print(f'  (Check that team_season_stats has def_rtg and team_game_logs has def_rating)')
                 # Continue with pipeline - this adjustment is optional
 
+        mark_stage('trend_style')
         # ========================================================================
         # STEP 4: TREND-BASED STYLE ADJUSTMENT (NEW in v4.6)
         # ========================================================================
@@ -1333,6 +1349,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
         else:
             print(f'  Missing team IDs - skipping trend style adjustment')
 
+        mark_stage('matchup')
         # ========================================================================
         # STEP 6: MATCHUP ADJUSTMENTS
         # ========================================================================
@@ -1363,6 +1380,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
         else:
             print(f'  Missing stats - skipping matchup adjustments')
 
+        mark_stage('opponent_matchup')
         # ========================================================================
         # STEP 6B: OPPONENT MATCHUP ADJUSTMENTS (Defense-Based)
         # ========================================================================
@@ -1441,6 +1459,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
         home_confidence_mod = 0
         away_confidence_mod = 0
 
+        mark_stage('last_5_trends')
         # ========================================================================
         # GET LAST 5 TRENDS (For display, not applied to prediction)
         # ========================================================================
@@ -1465,6 +1484,26 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
             except Exception as e:
                 print(f'[prediction_engine] Error getting last 5 trends: {e}')
 
+        mark_stage('team_context')
+        # ========================================================================
+        # LOAD TEAM CONTEXTS (game logs + season rows for the steps below)
+        # ========================================================================
+        # The shootout, home/road edge and split helpers read both teams'
+        # scoped TeamContext and the team list. get_last_5_trends() used to
+        # load them as a side effect; it now reads the team_trends artifact,
+        # so load them here.
+        # ========================================================================
+        try:
+            from api.utils.db_queries import get_all_teams
+            from api.utils.team_context import get_scoped_team_context
+
+            get_scoped_team_context(home_team_id, season)
+            get_scoped_team_context(away_team_id, season)
+            get_all_teams(season)
+        except Exception as e:
+            print(f'[prediction_engine] Error loading team contexts: {e}')
+
+        mark_stage('shootout')
         # ========================================================================
         # STEP 7: DYNAMIC 3PT SHOOTOUT ADJUSTMENT
         # ========================================================================
@@ -1573,6 +1612,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
         home_shootout_reason = f"Dynamic shootout: +{home_shootout_bonus:.1f} pts" if home_shootout_bonus > 0 else "No shootout bonus"
         away_shootout_reason = f"Dynamic shootout: +{away_shootout_bonus:.1f} pts" if away_shootout_bonus > 0 else "No shootout bonus"
 
+        mark_stage('volume')
         # ========================================================================
         # STEP 7.5: VOLUME-BASED ADJUSTMENTS
         # ========================================================================
@@ -1652,6 +1692,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
 
         print(f'  After Volume: Home {home_projected:.1f} | Away {away_projected:.1f}')
 
+        mark_stage('defense_quality')
         # ========================================================================
         # STEP 4: DEFENSE QUALITY ADJUSTMENT (Supplementary rank-based adjustment)
         # ========================================================================
@@ -1691,6 +1732,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
         else:
             print(f'  Missing stats - skipping defense quality adjustment')
 
+        mark_stage('home_road_edge')
         # ========================================================================
         # STEP 5: CONTEXT HOME/ROAD EDGE (Replaces old HCA + Road Penalty)
         # ========================================================================
@@ -1796,6 +1838,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
         home_court_points = home_edge_points
         road_penalty_points = away_edge_points
 
+        mark_stage('advanced_pace')
         # ========================================================================
         # ADVANCED PACE CALCULATION (Multi-factor pace projection)
         # ========================================================================
@@ -1890,6 +1933,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
             game_pace = calculate_pace_projection(home_season_pace, away_season_pace)
             print(f'[prediction_engine] Missing team IDs - using simple pace: {game_pace:.1f}')
 
+        mark_stage('similarity_adjustments')
         # ========================================================================
         # CLUSTER-BASED ADJUSTMENTS (Team Similarity Engine)
         # ========================================================================
@@ -1963,6 +2007,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
         else:
             print(f'[prediction_engine] CLUSTER-BASED ADJUSTMENTS: Skipped (no similarity data)')
 
+        mark_stage('pace_volatility')
         # ========================================================================
         # ENHANCED PACE VOLATILITY AND CONTEXTUAL PACE DAMPENING
         # ========================================================================
@@ -2010,6 +2055,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
             except Exception as e:
                 print(f'  Warning: Could not calculate pace volatility: {e}')
 
+        mark_stage('turnover_pressure')
         # ========================================================================
         # STEP 2: TURNOVER ADJUSTMENT (Lost possessions/scoring efficiency)
         # ========================================================================
@@ -2098,6 +2144,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
         else:
             print(f'  Missing team IDs - skipping turnover adjustment')
 
+        mark_stage('three_pt_splits')
         # ========================================================================
         # 3PT SCORING DATA COLLECTION (For STEP 7 shootout detection)
         # ========================================================================
@@ -2136,6 +2183,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
             except Exception as e:
                 print(f'[prediction_engine] Error in 3PT scoring analysis: {e}')
 
+        mark_stage('back_to_back')
         # ========================================================================
         # STEP 8: BACK-TO-BACK ADJUSTMENT (Replaces old Fatigue/Rest Adjustment)
         # ========================================================================
@@ -2204,6 +2252,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
         elif not away_is_b2b:
             print(f'  Away Team: Not on B2B')
 
+        mark_stage('h2h')
         # ========================================================================
         # H2H MATCHUP ADJUSTMENT (Optional Tiebreaker)
         # ========================================================================
@@ -2263,6 +2312,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
         else:
             print(f'[h2h_matchup] No H2H adjustment (need 2+ games, have {h2h_data["games"] if h2h_data else 0})')
 
+        mark_stage('assist_bonus')
         # ========================================================================
         # OPTIONAL ASSIST-BASED BONUS
         # ========================================================================
@@ -2299,6 +2349,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
         # This bonus represents overall game flow, not individual team scoring
         assist_bonus_to_total = assist_bonus
 
+        mark_stage('scoring_compression')
         # ========================================================================
         # SCORING COMPRESSION AND BIAS CORRECTION
         # ========================================================================
@@ -2401,6 +2452,7 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
             except (KeyError, TypeError):
                 pass  # Rankings not available
 
+        mark_stage('response')
         # ========================================================================
         # CONSTRUCT API RESPONSE
         # ========================================================================
@@ -2608,3 +2660,154 @@ def predict_game_total(home_data, away_data, betting_line=None, home_team_id=Non
             'error': str(e),
             'debug': debug_info
         }
+
+
+def _prefetch_team_inputs(team_id, team_abbr, season='2025-26'):
+    """
+    Load every team-level input used by predict_game_total into the active
+    prediction scope. Failures are logged and left for the per-game path.
+    """
+    from api.utils import db_queries
+    from api.utils.last_5_trends import get_last_5_trends
+    from api.utils.shootout_stats import (
+        get_team_season_3pt_pct,
+        get_opponent_3pt_pct_allowed,
+        get_last5_3pt_pct,
+        get_rest_days
+    )
+    from api.utils.pace_projection import get_team_recent_pace
+    from api.utils.pace_volatility import calculate_pace_volatility
+    from api.utils.turnover_vs_defense_pressure import get_team_turnover_vs_defense_pressure
+    from api.utils.three_pt_scoring_splits import get_team_three_pt_scoring_splits
+    from api.utils.three_pt_scoring_vs_pace import get_team_three_pt_scoring_vs_pace
+    from api.utils.opponent_matchup_stats import get_team_opponent_stats
+    from api.utils.back_to_back_profiles import get_back_to_back_profile
+    from api.utils.team_similarity import get_team_cluster_assignment
+    from api.utils.team_context import get_team_context
+
+    loaders = [
+        lambda: get_team_context(team_id, season),
+        lambda: db_queries.get_team_stats(team_id, season),
+        lambda: db_queries.get_team_advanced_stats(team_id, season),
+        lambda: db_queries.get_team_opponent_stats(team_id, season),
+        lambda: db_queries.get_team_last_n_games(team_id, n=10, season=season),
+        lambda: db_queries.get_team_last_n_games(team_id, n=5, season=season),
+        lambda: db_queries.get_team_stats_with_ranks(team_id, season),
+        lambda: db_queries.get_team_profile(team_id, season),
+        lambda: db_queries.get_team_scoring_vs_pace(team_id, season),
+        lambda: get_team_season_3pt_pct(team_id, season),
+        lambda: get_opponent_3pt_pct_allowed(team_id, season),
+        lambda: get_last5_3pt_pct(team_id, season),
+        lambda: get_rest_days(team_id, season),
+        lambda: get_team_recent_pace(team_id, season, n_games=5),
+        lambda: calculate_pace_volatility(team_id, season, n_games=10),
+        lambda: get_team_turnover_vs_defense_pressure(team_id, season),
+        lambda: get_team_three_pt_scoring_splits(team_id, season),
+        lambda: get_team_three_pt_scoring_vs_pace(team_id, season),
+        lambda: get_team_opponent_stats(team_id, season, 'overall'),
+        lambda: get_back_to_back_profile(team_id, season),
+        lambda: get_team_cluster_assignment(team_id, season),
+    ]
+    if team_abbr:
+        loaders.append(lambda: get_last_5_trends(team_id, team_abbr, season))
+
+    for loader in loaders:
+        try:
+            loader()
+        except Exception as e:
+            print(f'[prediction_engine] Slate prefetch warning for team {team_id}: {e}')
+
+
+def predict_slate(game_ids, betting_lines=None, season='2025-26'):
+    """
+    Predict every game on a slate in one pass.
+
+    All team-level inputs for the slate are loaded once into a prediction
+    scope (see prediction_context.py), then predict_game_total runs per game
+    against that in-memory context. Each game goes through exactly the same
+    code path as a single-game prediction, so results match it exactly.
+
+    Args:
+        game_ids: List of NBA game IDs
+        betting_lines: Optional dict of game_id -> betting line
+        season: Season string (default '2025-26')
+
+    Returns:
+        Dictionary with:
+        - games: List of {game_id, home_team_id, away_team_id, betting_line,
+                 prediction, matchup_data} in the order of game_ids
+        - missing_game_ids: IDs that could not be found or had no matchup data
+        - context: Scope statistics (entries, hits, misses, age_ms)
+    """
+    from api.utils.db_queries import get_games_by_ids, get_matchup_data, get_all_teams
+    from api.utils.prediction_context import prediction_scope
+
+    betting_lines = betting_lines or {}
+    game_ids = [str(gid) for gid in game_ids]
+
+    with prediction_scope() as ctx:
+        games = get_games_by_ids(game_ids, season)
+        teams_by_id = {t['id']: t for t in get_all_teams(season)}
+
+        # Load every team-level input once
+        team_ids = []
+        for game in games:
+            for team_id in (int(game['home_team_id']), int(game['away_team_id'])):
+                if team_id not in team_ids:
+                    team_ids.append(team_id)
+
+        print(f'[prediction_engine] Slate: {len(games)} games, {len(team_ids)} teams')
+        for team_id in team_ids:
+            team_info = teams_by_id.get(team_id)
+            _prefetch_team_inputs(team_id, team_info['abbreviation'] if team_info else None, season)
+
+        # Per-game math over the shared context
+        results = []
+        missing_game_ids = [gid for gid in game_ids if gid not in {str(g['game_id']) for g in games}]
+
+        for game in games:
+            game_id = str(game['game_id'])
+            home_team_id = int(game['home_team_id'])
+            away_team_id = int(game['away_team_id'])
+            betting_line = betting_lines.get(game_id)
+
+            matchup_data = get_matchup_data(home_team_id, away_team_id, season)
+            if matchup_data is None:
+                print(f'[prediction_engine] Slate: no matchup data for game {game_id}')
+                missing_game_ids.append(game_id)
+                continue
+
+            home_team_info = teams_by_id.get(home_team_id)
+            away_team_info = teams_by_id.get(away_team_id)
+
+            prediction = predict_game_total(
+                matchup_data['home'],
+                matchup_data['away'],
+                betting_line,
+                home_team_id=home_team_id,
+                away_team_id=away_team_id,
+                home_team_abbr=home_team_info['abbreviation'] if home_team_info else None,
+                away_team_abbr=away_team_info['abbreviation'] if away_team_info else None,
+                season=season,
+                game_id=game_id
+            )
+
+            results.append({
+                'game_id': game_id,
+                'home_team_id': home_team_id,
+                'away_team_id': away_team_id,
+                'betting_line': betting_line,
+                'prediction': prediction,
+                'matchup_data': matchup_data
+            })
+
+        context_stats = ctx.get_stats()
+
+    print(f'[prediction_engine] Slate complete: {len(results)} predictions, '
+          f'context hits={context_stats["hits"]} misses={context_stats["misses"]}')
+
+    return {
+        'games': results,
+        'missing_game_ids': missing_game_ids,
+        'context': context_stats
+    }
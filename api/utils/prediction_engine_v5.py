@@ -30,22 +30,23 @@ from api.utils.team_profiles_v5 import (
     TeamProfile, MatchupProfile,
     build_team_profile, build_matchup_profile
 )
+from api.utils.team_feature_store import get_def_rtg_rank_as_of, has_feature_snapshots
 
 logger = logging.getLogger(__name__)
 
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
 
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
 
 
 # ============================================================================
@@ -188,7 +189,8 @@ def calculate_defense_adjustment_v5(
     opponent_profile: TeamProfile,
     team_matchup: MatchupProfile,
     projected_pace: float,
-    is_home: bool
+    is_home: bool,
+    as_of_date: Optional[str] = None
 ) -> Tuple[float, Dict]:
     """
     Calculate defense-based scoring adjustment with small matchup tweaks.
@@ -203,6 +205,8 @@ def calculate_defense_adjustment_v5(
         team_matchup: Scoring team's matchup profile
         projected_pace: Game pace
         is_home: Is scoring team home?
+        as_of_date: Optional date cutoff (ISO format); ranks opponents on games
+            before it when the feature store is built
 
     Returns:
         (total_adjustment, details_dict)
@@ -211,22 +215,27 @@ def calculate_defense_adjustment_v5(
     details = {}
 
     # Get opponent defense rank
-    conn = _get_db_connection()
-    cursor = conn.cursor()
+    if as_of_date and has_feature_snapshots(team_profile.season):
+        opponent_def_rank = get_def_rtg_rank_as_of(
+            opponent_profile.team_id, as_of_date, team_profile.season
+        ) or 15
+    else:
+        conn = _get_db_connection()
+        cursor = conn.cursor()
 
-    cursor.execute("""
-        SELECT COUNT(*) + 1 as rank
-        FROM team_season_stats
-        WHERE season = ? AND split_type = 'Overall' AND def_rtg < (
-            SELECT def_rtg FROM team_season_stats
-            WHERE team_id = ? AND season = ? AND split_type = 'Overall'
-        )
-    """, (team_profile.season, opponent_profile.team_id, team_profile.season))
+        cursor.execute("""
+            SELECT COUNT(*) + 1 as rank
+            FROM team_season_stats
+            WHERE season = ? AND split_type = 'Overall' AND def_rtg < (
+                SELECT def_rtg FROM team_season_stats
+                WHERE team_id = ? AND season = ? AND split_type = 'Overall'
+            )
+        """, (team_profile.season, opponent_profile.team_id, team_profile.season))
 
-    def_rank_row = cursor.fetchone()
-    opponent_def_rank = def_rank_row['rank'] if def_rank_row else 15
+        def_rank_row = cursor.fetchone()
+        opponent_def_rank = def_rank_row['rank'] if def_rank_row else 15
 
-    conn.close()
+        conn.close()
 
     # Defense quality adjustment (from v4.4)
     if opponent_def_rank <= 5:
@@ -547,10 +556,12 @@ def predict_total_for_game_v5(
 
     # Step 3: Defense + Matchup Tweaks
     home_def_adj, home_def_details = calculate_defense_adjustment_v5(
-        home_profile, away_profile, home_matchup, projected_pace, is_home=True
+        home_profile, away_profile, home_matchup, projected_pace, is_home=True,
+        as_of_date=as_of_date
     )
     away_def_adj, away_def_details = calculate_defense_adjustment_v5(
-        away_profile, home_profile, away_matchup, projected_pace, is_home=False
+        away_profile, home_profile, away_matchup, projected_pace, is_home=False,
+        as_of_date=as_of_date
     )
 
     home_projected += home_def_adj
@@ -31,29 +31,33 @@ from api.utils.team_profiles_v5 import (
     build_team_profile, build_matchup_profile
 )
 from api.utils.ppp_aggregator import get_team_ppp_metrics
+from api.utils.team_feature_store import (
+    get_def_rtg_rank_as_of, get_team_features_as_of, has_feature_snapshots
+)
 
 logger = logging.getLogger(__name__)
 
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
 
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
 
 
 # ============================================================================
 # STEP 1: BLENDED PPP (replaces Smart Baseline from v5)
 # ============================================================================
 
-def compute_blended_ppp(team_id: int, season: str) -> Tuple[Optional[float], Dict]:
+def compute_blended_ppp(team_id: int, season: str,
+                        as_of_date: Optional[str] = None) -> Tuple[Optional[float], Dict]:
     """
     Compute blended PPP using 60% recent + 40% season.
 
@@ -62,6 +66,8 @@ def compute_blended_ppp(team_id: int, season: str) -> Tuple[Optional[float], Dic
     Args:
         team_id: Team ID
         season: Season string
+        as_of_date: Optional date cutoff (ISO format); uses games before it
+            from the feature store when it is built
 
     Returns:
         (blended_ppp, details_dict)
@@ -70,7 +76,10 @@ def compute_blended_ppp(team_id: int, season: str) -> Tuple[Optional[float], Dic
         - If ppp_last10 unavailable (< 10 games), use ppp_season only
         - If ppp_season unavailable, return None
     """
-    ppp_metrics = get_team_ppp_metrics(team_id, season, split_type='overall')
+    if as_of_date and has_feature_snapshots(season):
+        ppp_metrics = get_team_features_as_of(team_id, as_of_date, season)
+    else:
+        ppp_metrics = get_team_ppp_metrics(team_id, season, split_type='overall')
 
     if not ppp_metrics or ppp_metrics['ppp_season'] is None:
         return None, {'error': 'insufficient_ppp_data'}
@@ -136,7 +145,8 @@ def calculate_ppp_defense_adjustment(
     team_profile: TeamProfile,
     opponent_profile: TeamProfile,
     projected_possessions: float,
-    blended_ppp: float
+    blended_ppp: float,
+    as_of_date: Optional[str] = None
 ) -> Tuple[float, Dict]:
     """
     Calculate defense-based adjustment for PPP system.
@@ -150,27 +160,34 @@ def calculate_ppp_defense_adjustment(
         opponent_profile: Defending team
         projected_possessions: Possessions for this team
         blended_ppp: Team's blended PPP
+        as_of_date: Optional date cutoff (ISO format); ranks opponents on games
+            before it when the feature store is built
 
     Returns:
         (adjustment_points, details_dict)
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-
     # Get opponent defense rank
-    cursor.execute("""
-        SELECT COUNT(*) + 1 as rank
-        FROM team_season_stats
-        WHERE season = ? AND split_type = 'overall' AND def_rtg < (
-            SELECT def_rtg FROM team_season_stats
-            WHERE team_id = ? AND season = ? AND split_type = 'overall'
-        )
-    """, (team_profile.season, opponent_profile.team_id, team_profile.season))
+    if as_of_date and has_feature_snapshots(team_profile.season):
+        opponent_def_rank = get_def_rtg_rank_as_of(
+            opponent_profile.team_id, as_of_date, team_profile.season
+        ) or 15
+    else:
+        conn = _get_db_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT COUNT(*) + 1 as rank
+            FROM team_season_stats
+            WHERE season = ? AND split_type = 'overall' AND def_rtg < (
+                SELECT def_rtg FROM team_season_stats
+                WHERE team_id = ? AND season = ? AND split_type = 'overall'
+            )
+        """, (team_profile.season, opponent_profile.team_id, team_profile.season))
 
-    def_rank_row = cursor.fetchone()
-    opponent_def_rank = def_rank_row['rank'] if def_rank_row else 15
+        def_rank_row = cursor.fetchone()
+        opponent_def_rank = def_rank_row['rank'] if def_rank_row else 15
 
-    conn.close()
+        conn.close()
 
     # Defense quality adjustment (percentage-based)
     if opponent_def_rank <= 5:
@@ -266,8 +283,8 @@ def predict_total_for_game_v5_ppp(
     away_matchup = build_matchup_profile(away_team_id, home_team_id, season, as_of_date)
 
     # Step 2: Get blended PPP
-    home_ppp, home_ppp_details = compute_blended_ppp(home_team_id, season)
-    away_ppp, away_ppp_details = compute_blended_ppp(away_team_id, season)
+    home_ppp, home_ppp_details = compute_blended_ppp(home_team_id, season, as_of_date)
+    away_ppp, away_ppp_details = compute_blended_ppp(away_team_id, season, as_of_date)
 
     if home_ppp is None or away_ppp is None:
         raise ValueError("Insufficient PPP data for prediction")
@@ -286,10 +303,10 @@ def predict_total_for_game_v5_ppp(
 
     # Step 5: Defense adjustments
     home_def_adj, home_def_details = calculate_ppp_defense_adjustment(
-        home_profile, away_profile, projected_possessions, home_ppp
+        home_profile, away_profile, projected_possessions, home_ppp, as_of_date
     )
     away_def_adj, away_def_details = calculate_ppp_defense_adjustment(
-        away_profile, home_profile, projected_possessions, away_ppp
+        away_profile, home_profile, projected_possessions, away_ppp, as_of_date
     )
 
     home_projected += home_def_adj
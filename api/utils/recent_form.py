@@ -19,8 +19,10 @@ import os
 # Import NBA data fetcher (now from db_queries - SQLite only, no live API calls)
 try:
     from api.utils.db_queries import get_team_last_n_games, get_team_stats_with_ranks
+    from api.utils.connection_pool import get_shared_connection
 except ImportError:
     from db_queries import get_team_last_n_games, get_team_stats_with_ranks
+    from connection_pool import get_shared_connection
 
 # Database path for team game history
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'predictions.db')
@@ -126,7 +128,7 @@ def compute_recent_form_features(
 def _get_recent_games_from_db(team_tricode: str, as_of_date: str, n: int) -> list:
     """Get recent games from team_game_history table"""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_shared_connection(DB_PATH, readonly=True, row_factory=None)
         cursor = conn.cursor()
 
         cursor.execute('''
@@ -270,8 +272,7 @@ def get_last_n_opponents_avg_ranks(team_tricode: str, as_of_date: str, n: int =
     import sqlite3
 
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
+        conn = get_shared_connection(DB_PATH, readonly=True)
         cursor = conn.cursor()
 
         # Query last N games with opponent rank data
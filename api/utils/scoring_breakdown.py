@@ -23,6 +23,7 @@ import logging
 from api.utils.defense_tiers import get_defense_tier
 from api.utils.three_pt_defense_tiers import get_3pt_defense_tier, get_3pt_defense_tier_range
 from api.utils.db_config import get_db_path
+from api.utils.connection_pool import get_shared_connection
 
 logger = logging.getLogger(__name__)
 
@@ -131,8 +132,7 @@ def _query_scoring_breakdown_vs_defense_tiers(
     overall_min, overall_max = get_defense_tier_range(overall_def_tier)
     threept_min, threept_max = get_3pt_defense_tier_range(threept_def_tier)
 
-    conn = sqlite3.connect(NBA_DATA_DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
     cursor = conn.cursor()
 
     cursor.execute('''
@@ -173,8 +173,7 @@ def _query_scoring_breakdown_vs_defense_tier_only(
 
     overall_min, overall_max = get_defense_tier_range(overall_def_tier)
 
-    conn = sqlite3.connect(NBA_DATA_DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
     cursor = conn.cursor()
 
     cursor.execute('''
@@ -211,8 +210,7 @@ def _get_season_average_breakdown(
     """Get season average scoring breakdown from team_season_stats"""
     split_type = 'home' if is_home else 'away'
 
-    conn = sqlite3.connect(NBA_DATA_DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
     cursor = conn.cursor()
 
     cursor.execute('''
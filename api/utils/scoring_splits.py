@@ -18,20 +18,22 @@ logger = logging.getLogger(__name__)
 # Import centralized database configuration
 try:
     from api.utils.db_config import get_db_path
-    from api.utils.defense_tiers import get_defense_tier, get_all_defense_tiers
+    from api.utils.connection_pool import get_shared_connection
+    from api.utils.defense_tiers import get_all_defense_tiers
+    from api.utils.game_log_store import average, get_game_log_store
 except ImportError:
     from db_config import get_db_path
-    from defense_tiers import get_defense_tier, get_all_defense_tiers
+    from connection_pool import get_shared_connection
+    from defense_tiers import get_all_defense_tiers
+    from game_log_store import average, get_game_log_store
 
 # Database path
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
 
 
 def get_team_scoring_splits(team_id: int, season: str = '2025-26') -> Optional[Dict]:
@@ -120,168 +122,89 @@ def get_team_scoring_splits(team_id: int, season: str = '2025-26') -> Optional[D
             'avg_rebounds': team_row['rebounds']                # Alternative field name
         }
 
+        store = get_game_log_store(season)
+
         # SAFE MODE ADDITION: Calculate offensive/defensive rebounds from game logs with home/away splits
         # (team_season_stats doesn't have these broken down)
-        cursor.execute('''
-            SELECT
-                offensive_rebounds,
-                defensive_rebounds,
-                opp_offensive_rebounds,
-                opp_defensive_rebounds,
-                is_home,
-                game_date
-            FROM team_game_logs
-            WHERE team_id = ?
-                AND season = ?
-                AND game_type IN ('Regular Season', 'NBA Cup')
-                AND offensive_rebounds IS NOT NULL
-                AND defensive_rebounds IS NOT NULL
-                AND opp_offensive_rebounds IS NOT NULL
-                AND opp_defensive_rebounds IS NOT NULL
-            ORDER BY game_date DESC
-        ''', (team_id, season))
-
-        reb_games = cursor.fetchall()
-
-        # Calculate season and last10 rebounds (offensive and defensive)
-        all_orebs = [g['offensive_rebounds'] for g in reb_games]
-        all_drebs = [g['defensive_rebounds'] for g in reb_games]
-        last10_orebs = [g['offensive_rebounds'] for g in reb_games[:10]]
-        last10_drebs = [g['defensive_rebounds'] for g in reb_games[:10]]
-
-        # Home/Away splits
-        home_orebs = [g['offensive_rebounds'] for g in reb_games if g['is_home'] == 1]
-        away_orebs = [g['offensive_rebounds'] for g in reb_games if g['is_home'] == 0]
-        home_drebs = [g['defensive_rebounds'] for g in reb_games if g['is_home'] == 1]
-        away_drebs = [g['defensive_rebounds'] for g in reb_games if g['is_home'] == 0]
-
-        last10_home_orebs = [g['offensive_rebounds'] for g in reb_games[:10] if g['is_home'] == 1]
-        last10_away_orebs = [g['offensive_rebounds'] for g in reb_games[:10] if g['is_home'] == 0]
-        last10_home_drebs = [g['defensive_rebounds'] for g in reb_games[:10] if g['is_home'] == 1]
-        last10_away_drebs = [g['defensive_rebounds'] for g in reb_games[:10] if g['is_home'] == 0]
+        reb_games = store.team_rows(team_id, eligible_only=True, require=(
+            'offensive_rebounds', 'defensive_rebounds', 'opp_offensive_rebounds', 'opp_defensive_rebounds'))
+        last10 = store.last_n(reb_games, 10)
+        home, away = store.at_home(reb_games), store.at_home(reb_games, home=False)
+        last10_home, last10_away = store.at_home(last10), store.at_home(last10, home=False)
 
         # Offensive rebounds - season
-        team_info['overall_avg_offensive_rebounds'] = round(sum(all_orebs) / len(all_orebs), 1) if all_orebs else 0
+        team_info['overall_avg_offensive_rebounds'] = average(store.values('offensive_rebounds', reb_games))
         team_info['season_avg_oreb'] = team_info['overall_avg_offensive_rebounds']
         team_info['avg_offensive_rebounds'] = team_info['overall_avg_offensive_rebounds']
-        team_info['last10_avg_oreb'] = round(sum(last10_orebs) / len(last10_orebs), 1) if last10_orebs else 0
+        team_info['last10_avg_oreb'] = average(store.values('offensive_rebounds', last10))
 
         # Offensive rebounds - home/away
-        team_info['season_avg_oreb_home'] = round(sum(home_orebs) / len(home_orebs), 1) if home_orebs else 0
-        team_info['season_avg_oreb_away'] = round(sum(away_orebs) / len(away_orebs), 1) if away_orebs else 0
-        team_info['last10_avg_oreb_home'] = round(sum(last10_home_orebs) / len(last10_home_orebs), 1) if last10_home_orebs else 0
-        team_info['last10_avg_oreb_away'] = round(sum(last10_away_orebs) / len(last10_away_orebs), 1) if last10_away_orebs else 0
+        team_info['season_avg_oreb_home'] = average(store.values('offensive_rebounds', home))
+        team_info['season_avg_oreb_away'] = average(store.values('offensive_rebounds', away))
+        team_info['last10_avg_oreb_home'] = average(store.values('offensive_rebounds', last10_home))
+        team_info['last10_avg_oreb_away'] = average(store.values('offensive_rebounds', last10_away))
 
         # Defensive rebounds - season
-        team_info['overall_avg_defensive_rebounds'] = round(sum(all_drebs) / len(all_drebs), 1) if all_drebs else 0
+        team_info['overall_avg_defensive_rebounds'] = average(store.values('defensive_rebounds', reb_games))
         team_info['season_avg_dreb'] = team_info['overall_avg_defensive_rebounds']
         team_info['avg_defensive_rebounds'] = team_info['overall_avg_defensive_rebounds']
-        team_info['last10_avg_dreb'] = round(sum(last10_drebs) / len(last10_drebs), 1) if last10_drebs else 0
+        team_info['last10_avg_dreb'] = average(store.values('defensive_rebounds', last10))
 
         # Defensive rebounds - home/away
-        team_info['season_avg_dreb_home'] = round(sum(home_drebs) / len(home_drebs), 1) if home_drebs else 0
-        team_info['season_avg_dreb_away'] = round(sum(away_drebs) / len(away_drebs), 1) if away_drebs else 0
-        team_info['last10_avg_dreb_home'] = round(sum(last10_home_drebs) / len(last10_home_drebs), 1) if last10_home_drebs else 0
-        team_info['last10_avg_dreb_away'] = round(sum(last10_away_drebs) / len(last10_away_drebs), 1) if last10_away_drebs else 0
+        team_info['season_avg_dreb_home'] = average(store.values('defensive_rebounds', home))
+        team_info['season_avg_dreb_away'] = average(store.values('defensive_rebounds', away))
+        team_info['last10_avg_dreb_home'] = average(store.values('defensive_rebounds', last10_home))
+        team_info['last10_avg_dreb_away'] = average(store.values('defensive_rebounds', last10_away))
 
         # DEFENSIVE: Opponent rebounds (rebounds allowed)
-        all_opp_orebs = [g['opp_offensive_rebounds'] for g in reb_games]
-        all_opp_drebs = [g['opp_defensive_rebounds'] for g in reb_games]
-        last10_opp_orebs = [g['opp_offensive_rebounds'] for g in reb_games[:10]]
-        last10_opp_drebs = [g['opp_defensive_rebounds'] for g in reb_games[:10]]
-
-        # Home/Away splits for opponent rebounds
-        home_opp_orebs = [g['opp_offensive_rebounds'] for g in reb_games if g['is_home'] == 1]
-        away_opp_orebs = [g['opp_offensive_rebounds'] for g in reb_games if g['is_home'] == 0]
-        home_opp_drebs = [g['opp_defensive_rebounds'] for g in reb_games if g['is_home'] == 1]
-        away_opp_drebs = [g['opp_defensive_rebounds'] for g in reb_games if g['is_home'] == 0]
-
-        last10_home_opp_orebs = [g['opp_offensive_rebounds'] for g in reb_games[:10] if g['is_home'] == 1]
-        last10_away_opp_orebs = [g['opp_offensive_rebounds'] for g in reb_games[:10] if g['is_home'] == 0]
-        last10_home_opp_drebs = [g['opp_defensive_rebounds'] for g in reb_games[:10] if g['is_home'] == 1]
-        last10_away_opp_drebs = [g['opp_defensive_rebounds'] for g in reb_games[:10] if g['is_home'] == 0]
-
         # Opponent offensive rebounds - season
-        team_info['overall_avg_opp_offensive_rebounds'] = round(sum(all_opp_orebs) / len(all_opp_orebs), 1) if all_opp_orebs else 0
+        team_info['overall_avg_opp_offensive_rebounds'] = average(store.values('opp_offensive_rebounds', reb_games))
         team_info['season_avg_opp_oreb'] = team_info['overall_avg_opp_offensive_rebounds']
-        team_info['last10_avg_opp_oreb'] = round(sum(last10_opp_orebs) / len(last10_opp_orebs), 1) if last10_opp_orebs else 0
+        team_info['last10_avg_opp_oreb'] = average(store.values('opp_offensive_rebounds', last10))
 
         # Opponent offensive rebounds - home/away
-        team_info['season_avg_opp_oreb_home'] = round(sum(home_opp_orebs) / len(home_opp_orebs), 1) if home_opp_orebs else 0
-        team_info['season_avg_opp_oreb_away'] = round(sum(away_opp_orebs) / len(away_opp_orebs), 1) if away_opp_orebs else 0
-        team_info['last10_avg_opp_oreb_home'] = round(sum(last10_home_opp_orebs) / len(last10_home_opp_orebs), 1) if last10_home_opp_orebs else 0
-        team_info['last10_avg_opp_oreb_away'] = round(sum(last10_away_opp_orebs) / len(last10_away_opp_orebs), 1) if last10_away_opp_orebs else 0
+        team_info['season_avg_opp_oreb_home'] = average(store.values('opp_offensive_rebounds', home))
+        team_info['season_avg_opp_oreb_away'] = average(store.values('opp_offensive_rebounds', away))
+        team_info['last10_avg_opp_oreb_home'] = average(store.values('opp_offensive_rebounds', last10_home))
+        team_info['last10_avg_opp_oreb_away'] = average(store.values('opp_offensive_rebounds', last10_away))
 
         # Opponent defensive rebounds - season
-        team_info['overall_avg_opp_defensive_rebounds'] = round(sum(all_opp_drebs) / len(all_opp_drebs), 1) if all_opp_drebs else 0
+        team_info['overall_avg_opp_defensive_rebounds'] = average(store.values('opp_defensive_rebounds', reb_games))
         team_info['season_avg_opp_dreb'] = team_info['overall_avg_opp_defensive_rebounds']
-        team_info['last10_avg_opp_dreb'] = round(sum(last10_opp_drebs) / len(last10_opp_drebs), 1) if last10_opp_drebs else 0
+        team_info['last10_avg_opp_dreb'] = average(store.values('opp_defensive_rebounds', last10))
 
         # Opponent defensive rebounds - home/away
-        team_info['season_avg_opp_dreb_home'] = round(sum(home_opp_drebs) / len(home_opp_drebs), 1) if home_opp_drebs else 0
-        team_info['season_avg_opp_dreb_away'] = round(sum(away_opp_drebs) / len(away_opp_drebs), 1) if away_opp_drebs else 0
-        team_info['last10_avg_opp_dreb_home'] = round(sum(last10_home_opp_drebs) / len(last10_home_opp_drebs), 1) if last10_home_opp_drebs else 0
-        team_info['last10_avg_opp_dreb_away'] = round(sum(last10_away_opp_drebs) / len(last10_away_opp_drebs), 1) if last10_away_opp_drebs else 0
+        team_info['season_avg_opp_dreb_home'] = average(store.values('opp_defensive_rebounds', home))
+        team_info['season_avg_opp_dreb_away'] = average(store.values('opp_defensive_rebounds', away))
+        team_info['last10_avg_opp_dreb_home'] = average(store.values('opp_defensive_rebounds', last10_home))
+        team_info['last10_avg_opp_dreb_away'] = average(store.values('opp_defensive_rebounds', last10_away))
 
-        # Step 2: Fetch game logs with opponent defensive rankings
+        # Step 2: Game logs with scores (opponent defensive rank comes with the store)
         # FILTER: Only Regular Season + NBA Cup (exclude Summer League, preseason, etc.)
-        cursor.execute('''
-            SELECT
-                tgl.is_home,
-                tgl.team_pts,
-                tgl.opp_pts,
-                tss_opp.def_rtg_rank
-            FROM team_game_logs tgl
-            LEFT JOIN team_season_stats tss_opp
-                ON tgl.opponent_team_id = tss_opp.team_id
-                AND tgl.season = tss_opp.season
-                AND tss_opp.split_type = 'overall'
-            WHERE tgl.team_id = ?
-                AND tgl.season = ?
-                AND tgl.team_pts IS NOT NULL
-                AND tgl.opp_pts IS NOT NULL
-                AND tgl.game_type IN ('Regular Season', 'NBA Cup')
-            ORDER BY tgl.game_date DESC
-        ''', (team_id, season))
-
-        game_logs = cursor.fetchall()
-
-        # Step 2.5: Calculate season and last10 home/away splits for PPG (OFFENSIVE)
-        all_pts = [g['team_pts'] for g in game_logs if g['team_pts'] is not None]
-        last10_pts = [g['team_pts'] for g in game_logs[:10] if g['team_pts'] is not None]
-
-        home_pts = [g['team_pts'] for g in game_logs if g['team_pts'] is not None and g['is_home'] == 1]
-        away_pts = [g['team_pts'] for g in game_logs if g['team_pts'] is not None and g['is_home'] == 0]
-        last10_home_pts = [g['team_pts'] for g in game_logs[:10] if g['team_pts'] is not None and g['is_home'] == 1]
-        last10_away_pts = [g['team_pts'] for g in game_logs[:10] if g['team_pts'] is not None and g['is_home'] == 0]
-
-        # OFFENSIVE: Points scored by team
-        team_info['season_avg_ppg'] = round(sum(all_pts) / len(all_pts), 1) if all_pts else 0
-        team_info['last10_avg_ppg'] = round(sum(last10_pts) / len(last10_pts), 1) if last10_pts else 0
+        game_logs = store.team_rows(team_id, eligible_only=True, require=('team_pts', 'opp_pts'))
+        last10 = store.last_n(game_logs, 10)
+        home, away = store.at_home(game_logs), store.at_home(game_logs, home=False)
+        last10_home, last10_away = store.at_home(last10), store.at_home(last10, home=False)
+
+        # Step 2.5: Season and last10 home/away splits for PPG (OFFENSIVE)
+        team_info['season_avg_ppg'] = average(store.values('team_pts', game_logs))
+        team_info['last10_avg_ppg'] = average(store.values('team_pts', last10))
 
         # Home/Away splits for offensive PPG
-        team_info['season_avg_ppg_home'] = round(sum(home_pts) / len(home_pts), 1) if home_pts else 0
-        team_info['season_avg_ppg_away'] = round(sum(away_pts) / len(away_pts), 1) if away_pts else 0
-        team_info['last10_avg_ppg_home'] = round(sum(last10_home_pts) / len(last10_home_pts), 1) if last10_home_pts else 0
-        team_info['last10_avg_ppg_away'] = round(sum(last10_away_pts) / len(last10_away_pts), 1) if last10_away_pts else 0
+        team_info['season_avg_ppg_home'] = average(store.values('team_pts', home))
+        team_info['season_avg_ppg_away'] = average(store.values('team_pts', away))
+        team_info['last10_avg_ppg_home'] = average(store.values('team_pts', last10_home))
+        team_info['last10_avg_ppg_away'] = average(store.values('team_pts', last10_away))
 
         # DEFENSIVE: Points allowed (opponent points)
-        all_opp_pts = [g['opp_pts'] for g in game_logs if g['opp_pts'] is not None]
-        last10_opp_pts = [g['opp_pts'] for g in game_logs[:10] if g['opp_pts'] is not None]
-
-        home_opp_pts = [g['opp_pts'] for g in game_logs if g['opp_pts'] is not None and g['is_home'] == 1]
-        away_opp_pts = [g['opp_pts'] for g in game_logs if g['opp_pts'] is not None and g['is_home'] == 0]
-        last10_home_opp_pts = [g['opp_pts'] for g in game_logs[:10] if g['opp_pts'] is not None and g['is_home'] == 1]
-        last10_away_opp_pts = [g['opp_pts'] for g in game_logs[:10] if g['opp_pts'] is not None and g['is_home'] == 0]
-
-        team_info['season_avg_opp_ppg'] = round(sum(all_opp_pts) / len(all_opp_pts), 1) if all_opp_pts else 0
-        team_info['last10_avg_opp_ppg'] = round(sum(last10_opp_pts) / len(last10_opp_pts), 1) if last10_opp_pts else 0
+        team_info['season_avg_opp_ppg'] = average(store.values('opp_pts', game_logs))
+        team_info['last10_avg_opp_ppg'] = average(store.values('opp_pts', last10))
 
         # Home/Away splits for defensive PPG (points allowed)
-        team_info['season_avg_opp_ppg_home'] = round(sum(home_opp_pts) / len(home_opp_pts), 1) if home_opp_pts else 0
-        team_info['season_avg_opp_ppg_away'] = round(sum(away_opp_pts) / len(away_opp_pts), 1) if away_opp_pts else 0
-        team_info['last10_avg_opp_ppg_home'] = round(sum(last10_home_opp_pts) / len(last10_home_opp_pts), 1) if last10_home_opp_pts else 0
-        team_info['last10_avg_opp_ppg_away'] = round(sum(last10_away_opp_pts) / len(last10_away_opp_pts), 1) if last10_away_opp_pts else 0
+        team_info['season_avg_opp_ppg_home'] = average(store.values('opp_pts', home))
+        team_info['season_avg_opp_ppg_away'] = average(store.values('opp_pts', away))
+        team_info['last10_avg_opp_ppg_home'] = average(store.values('opp_pts', last10_home))
+        team_info['last10_avg_opp_ppg_away'] = average(store.values('opp_pts', last10_away))
 
         # Update all field aliases
         team_info['overall_avg_points'] = team_info['season_avg_ppg']
@@ -289,35 +212,18 @@ def get_team_scoring_splits(team_id: int, season: str = '2025-26') -> Optional[D
         team_info['overall_avg_opp_points'] = team_info['season_avg_opp_ppg']
         team_info['season_avg_opp_pts'] = team_info['season_avg_opp_ppg']
 
-        # Step 3: Aggregate games by tier and location
-        # Initialize buckets: {tier: {home: [pts], away: [pts]}}
-        buckets = {
-            tier: {'home': [], 'away': []}
-            for tier in get_all_defense_tiers()
-        }
-
-        for game in game_logs:
-            def_rank = game['def_rtg_rank']
-            tier = get_defense_tier(def_rank)
-
-            # Skip games where opponent defense tier can't be determined
-            if tier is None:
-                logger.debug(f"Skipping game with missing opponent def_rtg_rank: {def_rank}")
-                continue
-
-            location = 'home' if game['is_home'] == 1 else 'away'
-            buckets[tier][location].append(game['team_pts'])
-
-        # Step 4: Calculate averages and build response structure
+        # Step 3: Average points per opponent defense tier and location
+        # (games against opponents without a def_rtg_rank fall in no tier)
         splits = {}
         for tier in get_all_defense_tiers():
-            home_games = buckets[tier]['home']
-            away_games = buckets[tier]['away']
+            tier_games = store.vs_defense_tier(game_logs, tier)
+            home_games = store.at_home(tier_games)
+            away_games = store.at_home(tier_games, home=False)
 
             splits[tier] = {
-                'home_ppg': round(sum(home_games) / len(home_games), 1) if home_games else None,
+                'home_ppg': average(store.values('team_pts', home_games), default=None),
                 'home_games': len(home_games),
-                'away_ppg': round(sum(away_games) / len(away_games), 1) if away_games else None,
+                'away_ppg': average(store.values('team_pts', away_games), default=None),
                 'away_games': len(away_games)
             }
 
@@ -30,8 +30,10 @@ logger = logging.getLogger(__name__)
 # Import centralized database configuration
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
 
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
@@ -62,7 +64,7 @@ def aggregate_season_opponent_stats(
     """
     should_close = False
     if conn is None:
-        conn = sqlite3.connect(NBA_DATA_DB_PATH)
+        conn = get_shared_connection(NBA_DATA_DB_PATH, row_factory=None)
         should_close = True
 
     cursor = conn.cursor()
@@ -166,7 +168,7 @@ def update_team_season_opponent_stats(team_id: int, season: str, split_type: str
         season: Season (e.g., '2025-26')
         split_type: 'overall', 'home', or 'away'
     """
-    conn = sqlite3.connect(NBA_DATA_DB_PATH)
+    conn = get_shared_connection(NBA_DATA_DB_PATH, row_factory=None)
     cursor = conn.cursor()
 
     # Get aggregated stats
@@ -240,7 +242,7 @@ def backfill_all_season_opponent_stats(season: str = '2025-26'):
     Args:
         season: Season (e.g., '2025-26')
     """
-    conn = sqlite3.connect(NBA_DATA_DB_PATH)
+    conn = get_shared_connection(NBA_DATA_DB_PATH, row_factory=None)
     cursor = conn.cursor()
 
     print("=" * 80)
@@ -282,7 +284,7 @@ if __name__ == '__main__':
     backfill_all_season_opponent_stats('2025-26')
 
     print("\n2. Sample query to verify:")
-    conn = sqlite3.connect(NBA_DATA_DB_PATH)
+    conn = get_shared_connection(NBA_DATA_DB_PATH, row_factory=None)
     cursor = conn.cursor()
 
     cursor.execute('''
@@ -13,10 +13,20 @@ import sqlite3
 from typing import Optional, Dict
 from datetime import datetime, timedelta
 
+import numpy as np
+
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
+    from api.utils.game_log_store import average, get_game_log_store
+    from api.utils.prediction_context import scoped_cache
+    from api.utils.team_context import get_scoped_team_context
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
+    from game_log_store import average, get_game_log_store
+    from prediction_context import scoped_cache
+    from team_context import get_scoped_team_context
 
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
@@ -25,42 +35,46 @@ LEAGUE_AVG_3P_PCT = 0.365
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
+
+
+def _avg_3pt_pct(games) -> Optional[float]:
+    """Average per-game 3PT% over games with at least one attempt"""
+    pcts = [g['fg3m'] / g['fg3a'] for g in games if g['fg3a'] and g['fg3a'] > 0 and g['fg3m'] is not None]
+    if not pcts:
+        return None
+    return sum(pcts) / len(pcts)
+
+
+def _store_avg_3pt_pct(store, rows) -> Optional[float]:
+    """_avg_3pt_pct() over a game log store selection"""
+    pcts = store.values('fg3m', rows) / store.values('fg3a', rows)
+    return average(pcts[~np.isnan(pcts)], default=None, digits=None)
 
 
-def get_team_season_3pt_pct(team_id: int, season: str = '2025-26') -> Optional[float]:
+@scoped_cache
+def get_team_season_3pt_pct(team_id: int, season: str = '2025-26', team_context=None) -> Optional[float]:
     """
     Get team's season 3PT percentage.
 
     Args:
         team_id: Team's NBA ID
         season: Season string
+        team_context: Optional TeamContext to read from instead of the game log store
 
     Returns:
         3PT% as decimal (e.g., 0.380 for 38.0%) or None if no data
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute('''
-        SELECT AVG(CAST(fg3m AS REAL) / NULLIF(fg3a, 0)) as season_3p_pct
-        FROM team_game_logs
-        WHERE team_id = ?
-          AND season = ?
-          AND fg3a > 0
-    ''', (team_id, season))
+    team_context = team_context or get_scoped_team_context(team_id, season)
+    if team_context is not None:
+        return _avg_3pt_pct(team_context.games())
 
-    row = cursor.fetchone()
-    conn.close()
-
-    if row and row['season_3p_pct'] is not None:
-        return row['season_3p_pct']
-    return None
+    store = get_game_log_store(season)
+    return _store_avg_3pt_pct(store, store.team_rows(team_id, positive=('fg3a',)))
 
 
+@scoped_cache
 def get_opponent_3pt_pct_allowed(team_id: int, season: str = '2025-26') -> Optional[float]:
     """
     Get opponent's 3PT% allowed (defensive 3PT%).
@@ -102,78 +116,57 @@ def get_opponent_3pt_pct_allowed(team_id: int, season: str = '2025-26') -> Optio
     return None
 
 
-def get_last5_3pt_pct(team_id: int, season: str = '2025-26') -> Optional[float]:
+@scoped_cache
+def get_last5_3pt_pct(team_id: int, season: str = '2025-26', team_context=None) -> Optional[float]:
     """
     Get team's 3PT% over last 5 games.
 
     Args:
         team_id: Team's NBA ID
         season: Season string
+        team_context: Optional TeamContext to read from instead of the game log store
 
     Returns:
         Last 5 games 3PT% as decimal or None if insufficient data
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
+    team_context = team_context or get_scoped_team_context(team_id, season)
+    if team_context is not None:
+        attempted = [g for g in team_context.games() if g['fg3a'] and g['fg3a'] > 0]
+        return _avg_3pt_pct(attempted[:5])
 
-    cursor.execute('''
-        SELECT
-            AVG(CAST(fg3m AS REAL) / NULLIF(fg3a, 0)) as last5_3p_pct
-        FROM (
-            SELECT fg3m, fg3a
-            FROM team_game_logs
-            WHERE team_id = ?
-              AND season = ?
-              AND fg3a > 0
-            ORDER BY game_date DESC
-            LIMIT 5
-        )
-    ''', (team_id, season))
+    store = get_game_log_store(season)
+    return _store_avg_3pt_pct(store, store.last_n(store.team_rows(team_id, positive=('fg3a',)), 5))
 
-    row = cursor.fetchone()
-    conn.close()
 
-    if row and row['last5_3p_pct'] is not None:
-        return row['last5_3p_pct']
-    return None
-
-
-def get_rest_days(team_id: int, season: str = '2025-26') -> tuple[int, bool]:
+@scoped_cache
+def get_rest_days(team_id: int, season: str = '2025-26', team_context=None) -> tuple[int, bool]:
     """
     Calculate rest days before today's game.
 
     Args:
         team_id: Team's NBA ID
         season: Season string
+        team_context: Optional TeamContext to read from instead of the game log store
 
     Returns:
         Tuple of (rest_days, on_back_to_back)
             rest_days: Number of days since last game (0, 1, 2, 3+)
             on_back_to_back: True if playing back-to-back (played yesterday)
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-
-    # Get most recent game
-    cursor.execute('''
-        SELECT game_date
-        FROM team_game_logs
-        WHERE team_id = ?
-          AND season = ?
-        ORDER BY game_date DESC
-        LIMIT 1
-    ''', (team_id, season))
-
-    row = cursor.fetchone()
-    conn.close()
-
-    if not row or not row['game_date']:
+    team_context = team_context or get_scoped_team_context(team_id, season)
+    if team_context is not None:
+        recent = team_context.last_n_games(1)
+        last_game_date_str = recent[0]['game_date'] if recent else None
+    else:
+        store = get_game_log_store(season)
+        dates = store.values('game_date', store.last_n(store.team_rows(team_id), 1))
+        last_game_date_str = dates[0] if len(dates) else None
+
+    if not last_game_date_str:
         # No recent games found, assume well-rested
         return (3, False)
 
     try:
-        last_game_date_str = row['game_date']
-
         # Handle datetime format (strip time if present)
         if 'T' in last_game_date_str:
             last_game_date_str = last_game_date_str.split('T')[0]
@@ -16,25 +16,23 @@ Usage:
     )
 """
 
-import os
 import sqlite3
 from typing import Dict, List, Optional, Tuple
 
+try:
+    from api.utils.connection_pool import get_shared_connection
+except ImportError:
+    from connection_pool import get_shared_connection
+
 
 def get_nba_db_connection():
-    """Connect to NBA data database"""
-    db_path = os.path.join(os.path.dirname(__file__), '../data/nba_data.db')
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Shared read-only connection to the NBA data database"""
+    return get_shared_connection('nba_data', readonly=True)
 
 
 def get_similarity_db_connection():
-    """Connect to Team Similarity database"""
-    db_path = os.path.join(os.path.dirname(__file__), '../data/team_similarity.db')
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Shared read-only connection to the Team Similarity database"""
+    return get_shared_connection('team_similarity', readonly=True)
 
 
 def get_cluster_glossary_name(cluster_id: int, cluster_name: str) -> Tuple[str, str]:
@@ -0,0 +1,221 @@
+"""
+Slate Warm-up After a Sync
+
+After sync_todays_games() / sync_all(), the first user to open each game
+used to pay the full cold cost: the prediction (with its similarity and
+trend lookups), possession insights and every War Room payload section.
+
+warm_slate() walks every game in todays_games and, per game on a bounded
+thread pool (SLATE_WARMUP_WORKERS, default 4), in its own prediction scope:
+
+    prediction  predict_slate() for the game, stored in the prediction cache
+                under the same key /api/predict and /api/predict/slate use
+                (no betting line)
+    insights    get_or_generate_insights() -> possession_insights_cache
+    payloads    build_payload() for every game_payloads section
+
+Each game's timings are recorded in data_sync_log (sync_type
+'slate_warmup', game ID in game_ids_sample, run_id of the sync). These
+rows do not change the data version, so they never invalidate what they
+warmed, and the sync run views (sync_nba_data.get_sync_runs) nest them
+under their run rather than listing them as runs. AI sections are still
+queued separately (queue_slate_ai_sections).
+
+Prediction cache entries reach the server workers through the shared
+SQLite cache backend (the default; not with PREDICTION_CACHE_BACKEND=memory);
+the other artifacts are stored in nba_data.db and are shared by every worker.
+"""
+
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+try:
+    from api.utils.connection_pool import get_shared_connection
+    from api.utils.db_config import get_db_path
+    from api.utils.game_payloads import PayloadUnavailable, build_payload, purge_stale_payloads, _builders
+    from api.utils.prediction_cache import (
+        WARMUP_SYNC_TYPE, get_data_version, get_prediction_cache, reset_cached_data_version
+    )
+    from api.utils.prediction_context import prediction_scope
+except ImportError:
+    from connection_pool import get_shared_connection
+    from db_config import get_db_path
+    from game_payloads import PayloadUnavailable, build_payload, purge_stale_payloads, _builders
+    from prediction_cache import (
+        WARMUP_SYNC_TYPE, get_data_version, get_prediction_cache, reset_cached_data_version
+    )
+    from prediction_context import prediction_scope
+
+NBA_DATA_DB_PATH = get_db_path('nba_data.db')
+
+# Games warmed concurrently (each worker is one game at a time)
+WARMUP_WORKERS = int(os.environ.get('SLATE_WARMUP_WORKERS', '4'))
+
+
+def _get_db_connection():
+    """Get this thread's writable shared connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH)
+
+
+def _warm_prediction(game_id: str, season: str) -> bool:
+    """Predict one game and store it in the prediction cache; False if the game has no data"""
+    try:
+        from api.utils.prediction_engine import predict_slate
+    except ImportError:
+        from prediction_engine import predict_slate
+
+    result = predict_slate([game_id], season=season)
+    for entry in result['games']:
+        cache_key = (entry['home_team_id'], entry['away_team_id'], entry['betting_line'])
+        get_prediction_cache().put(cache_key, (entry['prediction'], entry['matchup_data']))
+    return bool(result['games'])
+
+
+def _warm_insights(game_id: str, season: str) -> bool:
+    """Generate (or confirm cached) possession insights; False if unavailable"""
+    try:
+        from api.utils.game_possession_insights import get_or_generate_insights
+    except ImportError:
+        from game_possession_insights import get_or_generate_insights
+
+    insights = get_or_generate_insights(game_id, season)
+    return bool(insights) and 'error' not in insights
+
+
+def _warm_payloads(game_id: str, season: str, sections: List[str], data_version: str) -> Dict:
+    """Build every payload section for a game"""
+    counts = {'built': 0, 'unavailable': 0}
+    for section in sections:
+        try:
+            build_payload(game_id, section, season, data_version)
+            counts['built'] += 1
+        except PayloadUnavailable:
+            counts['unavailable'] += 1
+    return counts
+
+
+def warm_game(game_id: str, season: str, sections: List[str], data_version: str) -> Dict:
+    """
+    Warm everything the first page view of one game would compute.
+
+    Returns:
+        {'game_id', 'started_at', 'prediction', 'insights', 'payloads',
+         'prediction_ms', 'insights_ms', 'payloads_ms', 'total_ms', 'errors': [str]}
+    """
+    timing = {'game_id': game_id, 'started_at': datetime.now(timezone.utc), 'errors': []}
+    start = time.perf_counter()
+
+    with prediction_scope():
+        steps = (
+            ('prediction', lambda: _warm_prediction(game_id, season)),
+            ('insights', lambda: _warm_insights(game_id, season)),
+            ('payloads', lambda: _warm_payloads(game_id, season, sections, data_version)),
+        )
+        for name, step in steps:
+            step_start = time.perf_counter()
+            try:
+                timing[name] = step()
+            except Exception as e:
+                timing[name] = None
+                timing['errors'].append(f'{name}: {e}')
+            timing[f'{name}_ms'] = round((time.perf_counter() - step_start) * 1000, 1)
+
+    timing['total_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    return timing
+
+
+def warm_slate(season: str = '2025-26', game_ids: Optional[Iterable[str]] = None,
+               sections: Optional[Iterable[str]] = None, max_workers: Optional[int] = None,
+               triggered_by: str = 'sync', run_id: Optional[str] = None) -> Dict:
+    """
+    Warm the prediction cache, possession insights and game payloads for
+    every game on the slate (default: today's games).
+
+    Args:
+        season: Season string
+        game_ids: Games to warm (default: todays_games)
+        sections: Payload sections to build (default: all)
+        max_workers: Games warmed concurrently (default SLATE_WARMUP_WORKERS)
+        triggered_by: Recorded in data_sync_log
+        run_id: The sync's run_id, so its warm-up rows can be found with it
+
+    Returns:
+        {'games': int, 'predictions': int, 'insights': int, 'payloads': int,
+         'unavailable': int, 'errors': [str], 'duration_ms': float,
+         'timings': [per-game timing dicts, in slate order]}
+    """
+    if game_ids is None:
+        try:
+            from api.utils.db_queries import get_todays_games
+        except ImportError:
+            from db_queries import get_todays_games
+        game_ids = [g['game_id'] for g in get_todays_games(season)]
+    game_ids = [str(game_id) for game_id in game_ids]
+    sections = list(sections or _builders())
+    run_id = run_id or str(uuid.uuid4())
+
+    start = time.perf_counter()
+    # The sync just changed the data version: drop everything cached for the
+    # old one so warmed entries are stamped with the new version
+    reset_cached_data_version()
+    get_prediction_cache().invalidate()
+    data_version = get_data_version()
+
+    workers = max(1, min(max_workers or WARMUP_WORKERS, len(game_ids) or 1))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='slate-warmup') as pool:
+        timings = list(pool.map(lambda game_id: warm_game(game_id, season, sections, data_version), game_ids))
+
+    purge_stale_payloads(data_version)
+    reset_cached_data_version()
+    _log_timings(timings, season, triggered_by, run_id)
+
+    errors = [f"{t['game_id']}/{error}" for t in timings for error in t['errors']]
+    result = {
+        'games': len(game_ids),
+        'predictions': sum(1 for t in timings if t.get('prediction')),
+        'insights': sum(1 for t in timings if t.get('insights')),
+        'payloads': sum(t['payloads']['built'] for t in timings if t.get('payloads')),
+        'unavailable': sum(t['payloads']['unavailable'] for t in timings if t.get('payloads')),
+        'errors': errors,
+        'duration_ms': round((time.perf_counter() - start) * 1000, 1),
+        'timings': [{k: v for k, v in t.items() if k != 'started_at'} for t in timings]
+    }
+    slowest = max((t['total_ms'] for t in timings), default=0)
+    print(f"[slate_warmup] Warmed {len(game_ids)} games with {workers} workers in "
+          f"{result['duration_ms']:.0f}ms (slowest game {slowest:.0f}ms, {len(errors)} errors)")
+    return result
+
+
+def _log_timings(timings: List[Dict], season: str, triggered_by: str, run_id: str):
+    """One data_sync_log row per game (sync_type WARMUP_SYNC_TYPE)"""
+    rows = []
+    for timing in timings:
+        started_at = timing['started_at']
+        completed_at = datetime.fromtimestamp(started_at.timestamp() + timing['total_ms'] / 1000.0, timezone.utc)
+        payloads = timing.get('payloads') or {'built': 0}
+        records = payloads['built'] + bool(timing.get('prediction')) + bool(timing.get('insights'))
+        rows.append((
+            WARMUP_SYNC_TYPE, season, 'failed' if timing['errors'] else 'success', records,
+            '; '.join(timing['errors']) or None, started_at.isoformat(), completed_at.isoformat(),
+            round(timing['total_ms'] / 1000.0, 3), triggered_by, run_id, timing['game_id']
+        ))
+
+    try:
+        conn = _get_db_connection()
+        try:
+            conn.executemany('''
+                INSERT INTO data_sync_log (
+                    sync_type, season, status, records_synced, error_message, started_at,
+                    completed_at, duration_seconds, triggered_by, run_id, game_ids_sample
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            conn.commit()
+        finally:
+            conn.close()
+    except Exception as e:
+        # Timings are diagnostic; never fail the sync over them
+        print(f'[slate_warmup] Could not record warm-up timings: {e}')
@@ -0,0 +1,358 @@
+"""
+SQL Query Tracing
+
+Times every SQLite statement a request runs and flags N+1 query patterns.
+
+install_sql_tracing() replaces sqlite3.connect so every connection opened
+afterwards - pooled, shared per-thread, or raw - is a TracedConnection
+(mixed into the caller's own factory class when it passes one). Its
+cursors time each execute() and fetch while a QueryTrace is active, and
+cost nothing beyond a context variable lookup otherwise.
+
+create_sql_trace_middleware(app) opens a QueryTrace per Flask request and
+keeps per-endpoint totals for /api/admin/sql-trace. In debug mode (or with
+SQL_TRACE_HEADERS=1) responses carry X-SQL-Query-Count, X-SQL-Time-Ms and
+X-SQL-Max-Repeats headers. Set SQL_TRACE=0 to disable tracing entirely.
+
+Usage:
+    from api.utils.sql_trace import install_sql_tracing, create_sql_trace_middleware
+
+    install_sql_tracing()           # Before connections are opened
+    create_sql_trace_middleware(app)
+
+    # Outside Flask
+    with trace_queries() as trace:
+        build_everything()
+    print(trace.summary())
+"""
+
+import hashlib
+import heapq
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+# A statement run at least this many times in one request is reported as N+1
+N_PLUS_ONE_THRESHOLD = 10
+
+# Recent request summaries kept for the admin endpoint
+RECENT_REQUESTS = 50
+
+_active_trace: ContextVar[Optional['QueryTrace']] = ContextVar('sql_trace', default=None)
+_original_connect = sqlite3.connect
+
+
+def _normalize(sql: str) -> str:
+    """Collapse whitespace so the same statement from one call site groups together"""
+    return re.sub(r'\s+', ' ', sql).strip()
+
+
+class QueryTrace:
+    """Statements executed while a trace is active, grouped by statement text"""
+
+    def __init__(self, slowest: int = 5):
+        self.query_count = 0
+        self.total_ms = 0.0
+        self.statements: Dict[str, Dict] = {}
+        self._slowest: List = []
+        self._slowest_n = slowest
+        self._sequence = 0
+
+    def record(self, sql: str, params, elapsed_ms: float):
+        """Count one execution of sql with params"""
+        text = _normalize(sql)
+        stats = self.statements.get(text)
+        if stats is None:
+            stats = self.statements[text] = {'count': 0, 'total_ms': 0.0, 'params': set()}
+        stats['count'] += 1
+        stats['total_ms'] += elapsed_ms
+        stats['params'].add(hashlib.md5(repr(params).encode()).hexdigest())
+
+        self.query_count += 1
+        self.total_ms += elapsed_ms
+        self._sequence += 1
+        entry = (elapsed_ms, self._sequence, text)
+        if len(self._slowest) < self._slowest_n:
+            heapq.heappush(self._slowest, entry)
+        else:
+            heapq.heappushpop(self._slowest, entry)
+
+    def add_fetch_time(self, sql: str, elapsed_ms: float):
+        """Charge row fetching to the statement that produced the rows"""
+        stats = self.statements.get(_normalize(sql))
+        if stats is not None:
+            stats['total_ms'] += elapsed_ms
+            self.total_ms += elapsed_ms
+
+    def summary(self, repeated_min: int = 2) -> Dict:
+        """
+        Returns:
+            {
+                'query_count': int, 'sql_ms': float, 'distinct_statements': int,
+                'slowest': [{'sql', 'ms'}],
+                'repeated': [{'sql', 'count', 'distinct_params', 'total_ms'}] (most first),
+                'n_plus_one': same shape, statements run >= N_PLUS_ONE_THRESHOLD times
+            }
+        """
+        repeated = sorted((
+            {'sql': sql[:300], 'count': s['count'], 'distinct_params': len(s['params']),
+             'total_ms': round(s['total_ms'], 2)}
+            for sql, s in self.statements.items() if s['count'] >= repeated_min
+        ), key=lambda r: r['count'], reverse=True)
+
+        return {
+            'query_count': self.query_count,
+            'sql_ms': round(self.total_ms, 2),
+            'distinct_statements': len(self.statements),
+            'slowest': [{'sql': sql[:300], 'ms': round(ms, 2)}
+                        for ms, _, sql in sorted(self._slowest, reverse=True)],
+            'repeated': repeated[:10],
+            'n_plus_one': [r for r in repeated if r['count'] >= N_PLUS_ONE_THRESHOLD]
+        }
+
+
+class TracedCursor(sqlite3.Cursor):
+    """Cursor that reports executes and fetches to the active QueryTrace"""
+
+    _last_sql = None
+
+    def execute(self, sql, parameters=()):
+        trace = _active_trace.get()
+        if trace is None:
+            return super().execute(sql, parameters)
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._last_sql = sql
+            trace.record(sql, parameters, (time.perf_counter() - start) * 1000)
+
+    def executemany(self, sql, seq_of_parameters):
+        trace = _active_trace.get()
+        if trace is None:
+            return super().executemany(sql, seq_of_parameters)
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._last_sql = sql
+            trace.record(sql, 'executemany', (time.perf_counter() - start) * 1000)
+
+    def executescript(self, sql_script):
+        trace = _active_trace.get()
+        if trace is None:
+            return super().executescript(sql_script)
+        start = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            trace.record(sql_script, 'script', (time.perf_counter() - start) * 1000)
+
+    def _timed_fetch(self, fetch, *args):
+        trace = _active_trace.get()
+        if trace is None or self._last_sql is None:
+            return fetch(*args)
+        start = time.perf_counter()
+        try:
+            return fetch(*args)
+        finally:
+            trace.add_fetch_time(self._last_sql, (time.perf_counter() - start) * 1000)
+
+    def fetchone(self):
+        return self._timed_fetch(super().fetchone)
+
+    def fetchmany(self, *args):
+        return self._timed_fetch(super().fetchmany, *args)
+
+    def fetchall(self):
+        return self._timed_fetch(super().fetchall)
+
+
+class TracedConnection(sqlite3.Connection):
+    """Connection whose cursors (including conn.execute shortcuts) are traced"""
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+_traced_factories: Dict[type, type] = {}
+
+
+def _traced_factory(factory: type) -> type:
+    """TracedConnection mixed into a caller's own Connection subclass"""
+    if issubclass(factory, TracedConnection):
+        return factory
+    traced = _traced_factories.get(factory)
+    if traced is None:
+        traced = _traced_factories[factory] = type(f'Traced{factory.__name__}', (TracedConnection, factory), {})
+    return traced
+
+
+def _traced_connect(database, *args, **kwargs):
+    # factory is the 5th optional positional argument
+    if len(args) >= 5:
+        args = args[:4] + (_traced_factory(args[4]),) + args[5:]
+    else:
+        kwargs['factory'] = _traced_factory(kwargs.get('factory', sqlite3.Connection))
+    return _original_connect(database, *args, **kwargs)
+
+
+def install_sql_tracing() -> bool:
+    """
+    Make sqlite3.connect return TracedConnections (idempotent)
+
+    Returns:
+        True if tracing is installed, False if disabled with SQL_TRACE=0
+    """
+    if os.environ.get('SQL_TRACE', '1') == '0':
+        return False
+    if sqlite3.connect is not _traced_connect:
+        sqlite3.connect = _traced_connect
+        print('[sql_trace] SQL tracing enabled')
+    return True
+
+
+def uninstall_sql_tracing():
+    """Restore the original sqlite3.connect (already-open connections stay traced)"""
+    if sqlite3.connect is _traced_connect:
+        sqlite3.connect = _original_connect
+
+
+@contextmanager
+def trace_queries():
+    """Trace every statement run in the block (on this thread / context)"""
+    trace = QueryTrace()
+    token = _active_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _active_trace.reset(token)
+
+
+# ============================================================================
+# PER-ENDPOINT STATISTICS
+# ============================================================================
+
+class EndpointStats:
+    """Thread-safe per-endpoint query totals and recent request summaries"""
+
+    def __init__(self, recent: int = RECENT_REQUESTS):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict] = {}
+        self._recent = deque(maxlen=recent)
+
+    def record(self, endpoint: str, summary: Dict, elapsed_ms: float):
+        with self._lock:
+            stats = self._endpoints.setdefault(endpoint, {
+                'requests': 0, 'queries': 0, 'max_queries': 0, 'sql_ms': 0.0, 'n_plus_one': {}
+            })
+            stats['requests'] += 1
+            stats['queries'] += summary['query_count']
+            stats['max_queries'] = max(stats['max_queries'], summary['query_count'])
+            stats['sql_ms'] += summary['sql_ms']
+            for statement in summary['n_plus_one']:
+                worst = stats['n_plus_one'].get(statement['sql'], 0)
+                stats['n_plus_one'][statement['sql']] = max(worst, statement['count'])
+
+            self._recent.append({
+                'endpoint': endpoint,
+                'timestamp': time.time(),
+                'elapsed_ms': round(elapsed_ms, 1),
+                **summary
+            })
+
+    def snapshot(self) -> Dict:
+        """Endpoints sorted by average queries per request (most first)"""
+        with self._lock:
+            endpoints = [{
+                'endpoint': endpoint,
+                'requests': s['requests'],
+                'avg_queries': round(s['queries'] / s['requests'], 1),
+                'max_queries': s['max_queries'],
+                'avg_sql_ms': round(s['sql_ms'] / s['requests'], 2),
+                'n_plus_one': [{'sql': sql, 'max_count': count}
+                               for sql, count in sorted(s['n_plus_one'].items(), key=lambda kv: -kv[1])]
+            } for endpoint, s in self._endpoints.items()]
+            recent = list(self._recent)
+
+        endpoints.sort(key=lambda e: e['avg_queries'], reverse=True)
+        return {'endpoints': endpoints, 'recent': recent[::-1]}
+
+    def clear(self):
+        with self._lock:
+            self._endpoints.clear()
+            self._recent.clear()
+
+
+_endpoint_stats = EndpointStats()
+
+
+def get_endpoint_stats() -> EndpointStats:
+    """Get the process-wide per-endpoint SQL statistics."""
+    return _endpoint_stats
+
+
+def create_sql_trace_middleware(app, headers: Optional[bool] = None):
+    """
+    Trace the SQL of every Flask request.
+
+    Args:
+        app: Flask application instance
+        headers: Add X-SQL-* response headers (default: app.debug or
+                 SQL_TRACE_HEADERS=1)
+    """
+    if headers is None:
+        headers = app.debug or os.environ.get('SQL_TRACE_HEADERS') == '1'
+
+    @app.before_request
+    def start_sql_trace():
+        from flask import g
+        g.sql_trace = QueryTrace()
+        g.sql_trace_token = _active_trace.set(g.sql_trace)
+        g.sql_trace_start = time.perf_counter()
+
+    @app.after_request
+    def finish_sql_trace(response):
+        from flask import g, request
+        trace = g.pop('sql_trace', None)
+        if trace is None:
+            return response
+
+        summary = trace.summary()
+        endpoint = f'{request.method} {request.endpoint or request.path}'
+        _endpoint_stats.record(endpoint, summary, (time.perf_counter() - g.sql_trace_start) * 1000)
+
+        if summary['n_plus_one']:
+            worst = summary['n_plus_one'][0]
+            print(f"[sql_trace] N+1: {endpoint} ran {worst['count']}x: {worst['sql'][:120]}")
+
+        if headers or app.debug:
+            response.headers['X-SQL-Query-Count'] = str(summary['query_count'])
+            response.headers['X-SQL-Time-Ms'] = f"{summary['sql_ms']:.1f}"
+            max_repeats = summary['repeated'][0]['count'] if summary['repeated'] else 1
+            response.headers['X-SQL-Max-Repeats'] = str(max_repeats if summary['query_count'] else 0)
+        return response
+
+    @app.teardown_request
+    def reset_sql_trace(exc):
+        from flask import g
+        token = g.pop('sql_trace_token', None)
+        if token is not None:
+            _active_trace.reset(token)
+
+    print('[sql_trace] Per-request SQL tracing enabled')
@@ -16,8 +16,11 @@ import logging
 from datetime import datetime, timezone, timedelta
 from zoneinfo import ZoneInfo
 from typing import Dict, List, Optional, Tuple
+import os
 import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # THIS IS THE ONLY MODULE ALLOWED TO IMPORT nba_api
 from nba_api.stats.endpoints import (
@@ -37,14 +40,30 @@ logger = logging.getLogger(__name__)
 # Import centralized database configuration
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
     from api.utils.sync_lock import sync_lock, SyncLockError
     from api.utils.opponent_stats_calculator import compute_opponent_stats_for_game
-    from api.utils.season_opponent_stats_aggregator import update_team_season_opponent_stats
+    from api.utils.derived_pipeline import (
+        rebuild_derived_tables, build_team_profiles, build_scoring_vs_pace, STAGE_SYNC_TYPE_PREFIX
+    )
+    from api.utils.db_snapshot import publish_snapshot
+    from api.utils.slate_warmup import warm_slate
+    from api.utils.last_5_trends import materialize_team_trends
+    from api.utils.ai_generation_queue import queue_slate_ai_sections
+    from api.utils.prediction_cache import WARMUP_SYNC_TYPE
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
     from sync_lock import sync_lock, SyncLockError
     from opponent_stats_calculator import compute_opponent_stats_for_game
-    from season_opponent_stats_aggregator import update_team_season_opponent_stats
+    from derived_pipeline import (
+        rebuild_derived_tables, build_team_profiles, build_scoring_vs_pace, STAGE_SYNC_TYPE_PREFIX
+    )
+    from db_snapshot import publish_snapshot
+    from slate_warmup import warm_slate
+    from last_5_trends import materialize_team_trends
+    from ai_generation_queue import queue_slate_ai_sections
+    from prediction_cache import WARMUP_SYNC_TYPE
 
 # Database path
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
@@ -57,21 +76,52 @@ NBA_CDN_SCHEDULE_URL = "https://cdn.nba.com/static/json/staticData/scheduleLeagu
 
 # Rate limiting
 MIN_REQUEST_INTERVAL = 0.6  # 600ms between requests (100 req/min max)
-_last_request_time = 0
+API_BURST = int(os.environ.get('NBA_API_BURST', '1'))  # Requests allowed back-to-back
+
+# Concurrent fetch workers for game logs and box scores (I/O overlaps, rate stays capped)
+SYNC_FETCH_WORKERS = int(os.environ.get('SYNC_FETCH_WORKERS', '4'))
 
 # ============================================================================
 # RATE LIMITING & ERROR HANDLING
 # ============================================================================
 
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every fetch worker.
+
+    Tokens refill at `rate` per second up to `capacity`. Each nba_api call
+    takes one token, so the combined request rate of all workers never
+    exceeds the rate (plus an initial burst of `capacity`).
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                sleep_time = (1 - self._tokens) / self.rate
+            logger.debug(f"Rate limiting: sleeping {sleep_time:.2f}s")
+            time.sleep(sleep_time)
+
+
+_api_rate_limiter = TokenBucket(rate=1.0 / MIN_REQUEST_INTERVAL, capacity=API_BURST)
+
+
 def _rate_limit():
-    """Enforce rate limit between nba_api calls"""
-    global _last_request_time
-    elapsed = time.time() - _last_request_time
-    if elapsed < MIN_REQUEST_INTERVAL:
-        sleep_time = MIN_REQUEST_INTERVAL - elapsed
-        logger.debug(f"Rate limiting: sleeping {sleep_time:.2f}s")
-        time.sleep(sleep_time)
-    _last_request_time = time.time()
+    """Enforce the shared nba_api rate limit (safe to call from worker threads)"""
+    _api_rate_limiter.acquire()
 
 
 def _safe_api_call(func, *args, max_retries=3, **kwargs):
@@ -107,19 +157,12 @@ def _safe_api_call(func, *args, max_retries=3, **kwargs):
 # ============================================================================
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory and proper timeout/WAL mode"""
-    conn = sqlite3.connect(
-        NBA_DATA_DB_PATH,
-        timeout=30.0,  # Wait up to 30 seconds for lock
-        check_same_thread=False
-    )
-    conn.row_factory = sqlite3.Row
+    """Get this thread's shared connection with proper timeout/WAL mode (close() releases it)"""
+    conn = get_shared_connection(NBA_DATA_DB_PATH, timeout=30.0)  # Wait up to 30 seconds for lock
 
     # Enable WAL mode for better concurrency (allows simultaneous reads/writes)
-    conn.execute("PRAGMA journal_mode=WAL")
-
-    # Set busy timeout at the connection level as well
-    conn.execute("PRAGMA busy_timeout=30000")  # 30 seconds in milliseconds
+    if not conn.in_transaction:
+        conn.execute("PRAGMA journal_mode=WAL")
 
     return conn
 
@@ -256,7 +299,10 @@ def sync_teams(season: str = '2025-26') -> Tuple[int, Optional[str]]:
     """
     try:
         with sync_lock('teams', timeout=5.0, wait=True):
-            return _sync_teams_impl(season)
+            records, error = _sync_teams_impl(season)
+            if error is None:
+                _after_sync(season)
+            return records, error
     except SyncLockError as e:
         error_msg = f"Sync already in progress: {str(e)}"
         logger.warning(error_msg)
@@ -319,7 +365,10 @@ def sync_season_stats(season: str = '2025-26',
     """
     try:
         with sync_lock('season_stats', timeout=10.0, wait=True):
-            return _sync_season_stats_impl(season, team_ids)
+            records, error = _sync_season_stats_impl(season, team_ids)
+            if error is None:
+                _after_sync(season)
+            return records, error
     except SyncLockError as e:
         error_msg = f"Sync already in progress: {str(e)}"
         logger.warning(error_msg)
@@ -327,8 +376,18 @@ def sync_season_stats(season: str = '2025-26',
 
 
 def _sync_season_stats_impl(season: str = '2025-26',
-                            team_ids: Optional[List[int]] = None) -> Tuple[int, Optional[str]]:
-    """Internal implementation of sync_season_stats (wrapped by sync_lock)"""
+                            team_ids: Optional[List[int]] = None,
+                            rebuild_derived: bool = True) -> Tuple[int, Optional[str]]:
+    """
+    Internal implementation of sync_season_stats (wrapped by sync_lock)
+
+    Args:
+        season: Season string
+        team_ids: Optional list of specific team IDs to sync (None = all teams)
+        rebuild_derived: Rebuild rankings and other derived tables afterwards.
+                         sync_all passes False and runs the derived pipeline
+                         once at the end instead.
+    """
     sync_id = _log_sync_start('season_stats', season)
 
     try:
@@ -342,7 +401,6 @@ def _sync_season_stats_impl(season: str = '2025-26',
         synced_at = datetime.now(timezone.utc).isoformat()
 
         records_synced = 0
-        stats_data = []  # Collect for ranking computation
 
         # Fetch stats for each team
         for team_id in team_ids:
@@ -451,16 +509,12 @@ def _sync_season_stats_impl(season: str = '2025-26',
                 three_pt_ppg = fg3m * 3
                 ft_ppg = ftm
 
-                # Extract opponent 3PT stats (will compute from team_game_logs later)
-                # For now, set to None - will be calculated in post-processing
-                opp_fg3m = None
-                opp_fg3a = None
-                opp_fg3_pct = None
-
-                # Insert into database
+                # Insert into database. Upsert only the API columns so the
+                # derived columns (ranks, opponent aggregates, PPP) survive
+                # until the derived pipeline recomputes them.
                 # Convert pandas/numpy types to Python native types to avoid BLOB storage
                 cursor.execute('''
-                    INSERT OR REPLACE INTO team_season_stats (
+                    INSERT INTO team_season_stats (
                         team_id, season, split_type,
                         games_played, wins, losses,
                         ppg, opp_ppg, fg_pct, fg3_pct, ft_pct,
@@ -470,8 +524,20 @@ def _sync_season_stats_impl(season: str = '2025-26',
                         synced_at,
                         fg2m, fg2a, fg2_pct, fg3m, fg3a, ftm, fta,
                         two_pt_ppg, three_pt_ppg, ft_ppg,
-                        opp_fg3m, opp_fg3a, opp_fg3_pct, opp_tov
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        opp_tov
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(team_id, season, split_type) DO UPDATE SET
+                        games_played = excluded.games_played, wins = excluded.wins, losses = excluded.losses,
+                        ppg = excluded.ppg, opp_ppg = excluded.opp_ppg, fg_pct = excluded.fg_pct,
+                        fg3_pct = excluded.fg3_pct, ft_pct = excluded.ft_pct, rebounds = excluded.rebounds,
+                        assists = excluded.assists, steals = excluded.steals, blocks = excluded.blocks,
+                        turnovers = excluded.turnovers, off_rtg = excluded.off_rtg, def_rtg = excluded.def_rtg,
+                        net_rtg = excluded.net_rtg, pace = excluded.pace, true_shooting_pct = excluded.true_shooting_pct,
+                        efg_pct = excluded.efg_pct, synced_at = excluded.synced_at, fg2m = excluded.fg2m,
+                        fg2a = excluded.fg2a, fg2_pct = excluded.fg2_pct, fg3m = excluded.fg3m,
+                        fg3a = excluded.fg3a, ftm = excluded.ftm, fta = excluded.fta,
+                        two_pt_ppg = excluded.two_pt_ppg, three_pt_ppg = excluded.three_pt_ppg, ft_ppg = excluded.ft_ppg,
+                        opp_tov = excluded.opp_tov
                 ''', (
                     int(team_id), season, db_split_type,
                     int(split_row.get('GP', 0)),
@@ -505,81 +571,20 @@ def _sync_season_stats_impl(season: str = '2025-26',
                     float(two_pt_ppg),
                     float(three_pt_ppg),
                     float(ft_ppg),
-                    float(opp_fg3m) if opp_fg3m is not None else None,
-                    float(opp_fg3a) if opp_fg3a is not None else None,
-                    float(opp_fg3_pct) if opp_fg3_pct is not None else None,
                     float(opp_tov)
                 ))
 
                 records_synced += 1
 
-                # Collect overall stats for ranking
-                if db_split_type == 'overall':
-                    stats_data.append({
-                        'team_id': team_id,
-                        'ppg': split_row.get('PTS', 0),
-                        'opp_ppg': opp_ppg,
-                        'fg_pct': split_row.get('FG_PCT', 0),
-                        'fg3_pct': split_row.get('FG3_PCT', 0),
-                        'ft_pct': split_row.get('FT_PCT', 0),
-                        'off_rtg': adv_row.get('OFF_RATING', 0) if adv_row is not None else 0,
-                        'def_rtg': adv_row.get('DEF_RATING', 0) if adv_row is not None else 0,
-                        'net_rtg': adv_row.get('NET_RATING', 0) if adv_row is not None else 0,
-                        'pace': adv_row.get('PACE', 0) if adv_row is not None else 0,
-                        'opp_tov': opp_tov,
-                    })
-
-        # Compute rankings for overall stats
-        _compute_and_save_rankings(cursor, stats_data, season)
-
-        # Compute opponent 3PT stats from game logs
-        _compute_opponent_3pt_stats_from_game_logs(cursor, season)
-
-        # Compute 3PT defense rankings
-        _compute_3pt_defense_rankings(cursor, season)
-
-        # Update league averages
-        _update_league_averages(cursor, stats_data, season)
-
-        # Aggregate opponent stats for all teams
-        logger.info(f"Aggregating season opponent stats for {len(team_ids)} teams...")
-        for idx, team_id in enumerate(team_ids, 1):
-            try:
-                # Update for all three split types: overall, home, away
-                update_team_season_opponent_stats(team_id, season, 'overall')
-                update_team_season_opponent_stats(team_id, season, 'home')
-                update_team_season_opponent_stats(team_id, season, 'away')
-                if idx % 10 == 0:
-                    logger.info(f"  Aggregated opponent stats for {idx}/{len(team_ids)} teams")
-            except Exception as e:
-                logger.error(f"Error aggregating opponent stats for team {team_id}: {e}")
-
-        logger.info(f"✓ Season opponent stats aggregated for all {len(team_ids)} teams")
-
-        # Compute opp_assists rankings after aggregation
-        logger.info("Computing opp_assists rankings...")
-        cursor.execute('''
-            SELECT team_id, opp_assists
-            FROM team_season_stats
-            WHERE season = ? AND split_type = 'overall' AND opp_assists IS NOT NULL
-            ORDER BY opp_assists ASC
-        ''', (season,))
-
-        ranked_teams = cursor.fetchall()
-        for rank, team in enumerate(ranked_teams, start=1):
-            cursor.execute('''
-                UPDATE team_season_stats
-                SET opp_assists_rank = ?
-                WHERE team_id = ? AND season = ? AND split_type = 'overall'
-            ''', (rank, team['team_id'], season))
-
-        logger.info(f"✓ Ranked {len(ranked_teams)} teams by opp_assists")
-
         conn.commit()
         conn.close()
 
         _log_sync_complete(sync_id, records_synced)
         logger.info(f"Synced {records_synced} stat records for {len(team_ids)} teams")
+
+        if rebuild_derived:
+            rebuild_derived_tables(season, {'team_season_stats': team_ids})
+
         return records_synced, None
 
     except Exception as e:
@@ -593,7 +598,8 @@ def _sync_season_stats_impl(season: str = '2025-26',
 
 def sync_game_logs(season: str = '2025-26',
                    team_ids: Optional[List[int]] = None,
-                   last_n_games: int = 10) -> Tuple[int, Optional[str]]:
+                   last_n_games: int = 10,
+                   incremental: bool = False) -> Tuple[int, Optional[str]]:
     """
     Sync team game logs (last N games)
 
@@ -601,13 +607,17 @@ def sync_game_logs(season: str = '2025-26',
         season: Season string
         team_ids: Optional list of specific team IDs (None = all teams)
         last_n_games: Number of recent games to fetch per team
+        incremental: Only fetch games newer than each team's latest synced game
 
     Returns:
         (records_synced, error_message)
     """
     try:
         with sync_lock('game_logs', timeout=10.0, wait=True):
-            return _sync_game_logs_impl(season, team_ids, last_n_games)
+            records, error = _sync_game_logs_impl(season, team_ids, last_n_games, incremental)
+            if error is None:
+                _after_sync(season)
+            return records, error
     except SyncLockError as e:
         error_msg = f"Sync already in progress: {str(e)}"
         logger.warning(error_msg)
@@ -786,18 +796,49 @@ def _fetch_box_score_stats(game_id: str, team_id: int) -> Dict:
     Returns:
         Dict with box score stats, or empty dict if unavailable
     """
-    try:
-        logger.debug(f"Fetching box score stats for game {game_id}, team {team_id}")
+    return _fetch_game_box_score_stats(game_id, [team_id]).get(team_id, {})
 
-        # Fetch traditional box score (FGM, FGA, rebounds, steals, blocks)
-        trad_box = _safe_api_call(boxscoretraditionalv3.BoxScoreTraditionalV3, game_id=game_id)
 
-        # Fetch scoring box score (fast break %, paint %, off turnovers %)
-        scoring_box = _safe_api_call(boxscorescoringv3.BoxScoreScoringV3, game_id=game_id)
+def _fetch_game_box_score_stats(game_id: str, team_ids: List[int]) -> Dict[int, Dict]:
+    """
+    Fetch box score statistics for every team in a game with one call per endpoint.
 
-        if not trad_box or not scoring_box:
-            logger.warning(f"Failed to fetch box score data for game {game_id}")
-            return {}
+    Both teams' rows come back in the same responses, so a game costs two
+    API calls instead of four.
+
+    Args:
+        game_id: NBA game ID
+        team_ids: Team IDs to extract
+
+    Returns:
+        Dict of team_id -> box score stats (empty dict per team if unavailable)
+    """
+    logger.debug(f"Fetching box score stats for game {game_id}")
+
+    # Fetch traditional box score (FGM, FGA, rebounds, steals, blocks)
+    trad_box = _safe_api_call(boxscoretraditionalv3.BoxScoreTraditionalV3, game_id=game_id)
+
+    # Fetch scoring box score (fast break %, paint %, off turnovers %)
+    scoring_box = _safe_api_call(boxscorescoringv3.BoxScoreScoringV3, game_id=game_id)
+
+    if not trad_box or not scoring_box:
+        logger.warning(f"Failed to fetch box score data for game {game_id}")
+        return {tid: {} for tid in team_ids}
+
+    return {
+        tid: _extract_box_score_stats(trad_box, scoring_box, game_id, tid)
+        for tid in team_ids
+    }
+
+
+def _extract_box_score_stats(trad_box, scoring_box, game_id: str, team_id: int) -> Dict:
+    """
+    Extract one team's stats from fetched box score endpoints.
+
+    Returns:
+        Dict with box score stats, or empty dict if unavailable
+    """
+    try:
 
         # Extract team-level data from traditional box score
         trad_dfs = trad_box.get_data_frames()
@@ -864,9 +905,110 @@ def _fetch_box_score_stats(game_id: str, team_id: int) -> Dict:
         return {}
 
 
+def _fetch_team_game_logs(team_id: int, season: str, last_n_games: Optional[int],
+                          date_from: Optional[str] = None):
+    """
+    Fetch one team's game logs (runs on a fetch worker thread).
+
+    Args:
+        team_id: NBA team ID
+        season: Season string
+        last_n_games: Number of recent games (None = all)
+        date_from: Only games on or after this date (MM/DD/YYYY, incremental mode)
+
+    Returns:
+        DataFrame of games, or None on failure
+    """
+    if date_from is not None:
+        logger.info(f"Fetching game logs for team {team_id} since {date_from}")
+        gamelogs = _safe_api_call(
+            teamgamelogs.TeamGameLogs,
+            team_id_nullable=team_id,
+            season_nullable=season,
+            season_type_nullable='Regular Season',
+            date_from_nullable=date_from
+        )
+        return gamelogs.get_data_frames()[0] if gamelogs else None
+
+    logger.info(f"Fetching game logs for team {team_id}")
+
+    # Use teamgamelogs endpoint with last_n_games parameter
+    # When last_n_games is None, omit the parameter to fetch all games
+    if last_n_games is None:
+        gamelogs = _safe_api_call(
+            teamgamelogs.TeamGameLogs,
+            team_id_nullable=team_id,
+            season_nullable=season,
+            season_type_nullable='Regular Season'
+        )
+    else:
+        gamelogs = _safe_api_call(
+            teamgamelogs.TeamGameLogs,
+            team_id_nullable=team_id,
+            season_nullable=season,
+            season_type_nullable='Regular Season',
+            last_n_games_nullable=last_n_games
+        )
+
+    if not gamelogs:
+        return None
+    return gamelogs.get_data_frames()[0]
+
+
+def _get_game_log_high_water_marks(cursor, season: str) -> Dict[int, Tuple[str, str]]:
+    """
+    Get the latest synced game per team (the incremental sync high-water mark).
+
+    Returns:
+        Dict of team_id -> (latest game_date, latest game_id)
+    """
+    # SQLite returns the bare game_id column from the row holding MAX(game_date)
+    cursor.execute('''
+        SELECT team_id, MAX(game_date) as last_game_date, game_id as last_game_id
+        FROM team_game_logs
+        WHERE season = ?
+          AND game_type IN ('Regular Season', 'NBA Cup')
+        GROUP BY team_id
+    ''', (season,))
+    return {row['team_id']: (row['last_game_date'], row['last_game_id']) for row in cursor.fetchall()}
+
+
+def _get_populated_box_scores(cursor, season: str) -> Dict[Tuple[str, int], Dict]:
+    """
+    Get box score stats already stored in team_game_logs.
+
+    Rows with every box score column filled need no new box score fetch;
+    their stored values are reused when the row is rewritten.
+
+    Returns:
+        Dict of (game_id, team_id) -> box score stats
+    """
+    cursor.execute('''
+        SELECT game_id, team_id, fgm, fga, offensive_rebounds, defensive_rebounds,
+               steals, blocks, points_off_turnovers, fast_break_points,
+               points_in_paint, second_chance_points
+        FROM team_game_logs
+        WHERE season = ?
+          AND steals IS NOT NULL
+          AND blocks IS NOT NULL
+          AND points_off_turnovers IS NOT NULL
+          AND fast_break_points IS NOT NULL
+          AND points_in_paint IS NOT NULL
+          AND second_chance_points IS NOT NULL
+    ''', (season,))
+
+    populated = {}
+    for row in cursor.fetchall():
+        stats = dict(row)
+        key = (stats.pop('game_id'), stats.pop('team_id'))
+        populated[key] = stats
+    return populated
+
+
 def _sync_game_logs_impl(season: str = '2025-26',
                          team_ids: Optional[List[int]] = None,
-                         last_n_games: Optional[int] = 10) -> Tuple[int, Optional[str]]:
+                         last_n_games: Optional[int] = 10,
+                         incremental: bool = False) -> Tuple[int, Optional[str]]:
     """
     Internal implementation of sync_game_logs (wrapped by sync_lock)
 
@@ -874,10 +1016,34 @@ def _sync_game_logs_impl(season: str = '2025-26',
         season: NBA season (e.g., '2025-26')
         team_ids: List of team IDs to sync. If None, syncs all teams.
         last_n_games: Number of recent games to fetch per team. If None, fetches ALL games for the season.
+        incremental: Only fetch games newer than each team's high-water mark
 
     Returns:
         Tuple of (records_synced, error_message)
     """
+    records_synced, error, _ = _sync_game_logs_core(season, team_ids, last_n_games, incremental)
+    return records_synced, error
+
+
+def _sync_game_logs_core(season: str = '2025-26',
+                         team_ids: Optional[List[int]] = None,
+                         last_n_games: Optional[int] = 10,
+                         incremental: bool = False) -> Tuple[int, Optional[str], set]:
+    """
+    Sync game logs and report which teams changed.
+
+    API calls run on SYNC_FETCH_WORKERS threads sharing one token-bucket
+    rate limiter; all database writes stay on the calling thread.
+
+    In incremental mode each team is asked only for games on or after its
+    latest synced game_date, and games already stored for every team in
+    them are dropped before any box score fetch or upsert. In every mode,
+    rows whose box score columns are already filled reuse the stored values
+    instead of re-fetching box scores.
+
+    Returns:
+        Tuple of (records_synced, error_message, changed_team_ids)
+    """
     sync_id = _log_sync_start('game_logs', season)
 
     try:
@@ -893,43 +1059,47 @@ def _sync_game_logs_impl(season: str = '2025-26',
         new_games = 0
         updated_games = 0
 
+        # High-water marks (incremental mode) and already-populated box scores
+        high_water_marks = _get_game_log_high_water_marks(cursor, season) if incremental else {}
+        populated_box_scores = _get_populated_box_scores(cursor, season)
+
         # Log sync mode
-        if last_n_games is None:
+        if incremental:
+            logger.info(f"Starting INCREMENTAL sync for {season} "
+                        f"({len(high_water_marks)} teams with a high-water mark)")
+        elif last_n_games is None:
             logger.info(f"Starting FULL SEASON sync for {season} (all completed games)")
         else:
             logger.info(f"Starting sync for {season} (last {last_n_games} games per team)")
 
+        def _date_from(team_id):
+            """MM/DD/YYYY of the team's latest synced game (None = no mark, fetch normally)"""
+            mark = high_water_marks.get(team_id)
+            if not mark or not mark[0]:
+                return None
+            return datetime.fromisoformat(mark[0].replace('Z', '+00:00')).strftime('%m/%d/%Y')
+
         # PHASE 1: Collect all game data for all teams first
         # This allows us to calculate game pace using both teams' data
         game_data_by_id = {}  # game_id -> list of team data dicts
 
-        for team_id in team_ids:
-            logger.info(f"Fetching game logs for team {team_id}")
-
-            # Use teamgamelogs endpoint with last_n_games parameter
-            # When last_n_games is None, omit the parameter to fetch all games
-            if last_n_games is None:
-                gamelogs = _safe_api_call(
-                    teamgamelogs.TeamGameLogs,
-                    team_id_nullable=team_id,
-                    season_nullable=season,
-                    season_type_nullable='Regular Season'
-                )
-            else:
-                gamelogs = _safe_api_call(
-                    teamgamelogs.TeamGameLogs,
-                    team_id_nullable=team_id,
-                    season_nullable=season,
-                    season_type_nullable='Regular Season',
-                    last_n_games_nullable=last_n_games
-                )
+        # Opponent abbreviation -> team_id (one query instead of one per game)
+        cursor.execute('SELECT team_abbreviation, team_id FROM nba_teams')
+        team_id_by_abbr = {row['team_abbreviation']: row['team_id'] for row in cursor.fetchall()}
+
+        fetch_start = time.time()
+        with ThreadPoolExecutor(max_workers=SYNC_FETCH_WORKERS) as executor:
+            game_log_frames = list(executor.map(
+                lambda tid: _fetch_team_game_logs(tid, season, last_n_games, _date_from(tid)), team_ids
+            ))
+        logger.info(f"Fetched game logs for {len(team_ids)} teams in {time.time() - fetch_start:.1f}s "
+                    f"({SYNC_FETCH_WORKERS} workers)")
 
-            if not gamelogs:
+        for team_id, games_df in zip(team_ids, game_log_frames):
+            if games_df is None:
                 logger.warning(f"Skipping team {team_id}: failed to fetch game logs")
                 continue
 
-            games_df = gamelogs.get_data_frames()[0]
-
             for _, game in games_df.iterrows():
                 game_id = str(game.get('GAME_ID'))
 
@@ -944,15 +1114,7 @@ def _sync_game_logs_impl(season: str = '2025-26',
                     opponent_abbr = None
 
                 # Get opponent team_id
-                opponent_team_id = None
-                if opponent_abbr:
-                    cursor.execute(
-                        'SELECT team_id FROM nba_teams WHERE team_abbreviation = ?',
-                        (opponent_abbr,)
-                    )
-                    opp_row = cursor.fetchone()
-                    if opp_row:
-                        opponent_team_id = opp_row['team_id']
+                opponent_team_id = team_id_by_abbr.get(opponent_abbr) if opponent_abbr else None
 
                 # Calculate stats from available data
                 team_pts = float(game.get('PTS', 0))
@@ -1011,11 +1173,42 @@ def _sync_game_logs_impl(season: str = '2025-26',
                     game_data_by_id[game_id] = []
                 game_data_by_id[game_id].append(game_info)
 
+        # Incremental: drop games already stored for every team in them
+        if incremental:
+            fetched_games = len(game_data_by_id)
+            game_data_by_id = {
+                game_id: teams_data for game_id, teams_data in game_data_by_id.items()
+                if not all((game_id, td['team_id']) in populated_box_scores for td in teams_data)
+            }
+            logger.info(f"Incremental: {len(game_data_by_id)} new games "
+                        f"({fetched_games - len(game_data_by_id)} already synced)")
+
+        changed_team_ids = {td['team_id'] for teams_data in game_data_by_id.values() for td in teams_data}
+
         # PHASE 2: Calculate game pace and insert records
         logger.info(f"Processing {len(game_data_by_id)} unique games with game pace calculation")
 
-        # Cache box score data to avoid duplicate API calls for same game
+        # Reuse box scores already stored for both teams; fetch the rest concurrently
+        # (two API calls per game, both teams extracted from the same responses)
         box_score_cache = {}
+        games_to_fetch = {}
+        for game_id, teams_data in game_data_by_id.items():
+            tids = [td['team_id'] for td in teams_data]
+            if all((game_id, tid) in populated_box_scores for tid in tids):
+                box_score_cache[game_id] = {tid: populated_box_scores[(game_id, tid)] for tid in tids}
+            else:
+                games_to_fetch[game_id] = tids
+
+        fetch_start = time.time()
+        with ThreadPoolExecutor(max_workers=SYNC_FETCH_WORKERS) as executor:
+            box_score_futures = {
+                game_id: executor.submit(_fetch_game_box_score_stats, game_id, tids)
+                for game_id, tids in games_to_fetch.items()
+            }
+            for game_id, future in box_score_futures.items():
+                box_score_cache[game_id] = future.result()
+        logger.info(f"Fetched box scores for {len(games_to_fetch)} games in {time.time() - fetch_start:.1f}s "
+                    f"({len(box_score_cache) - len(games_to_fetch)} reused, {SYNC_FETCH_WORKERS} workers)")
 
         for game_id, teams_data in game_data_by_id.items():
             # Calculate game pace once per game using both teams' data
@@ -1026,14 +1219,6 @@ def _sync_game_logs_impl(season: str = '2025-26',
             if len(team_ids_in_game) != len(set(team_ids_in_game)):
                 logger.warning(f"Game {game_id}: Duplicate team IDs detected! {team_ids_in_game}")
 
-            # Fetch box score data for both teams (once per game)
-            if game_id not in box_score_cache:
-                box_score_cache[game_id] = {}
-                for team_data in teams_data:
-                    tid = team_data['team_id']
-                    logger.info(f"Fetching box score for game {game_id}, team {tid}")
-                    box_score_cache[game_id][tid] = _fetch_box_score_stats(game_id, tid)
-
             # Upsert into games table (one record per game)
             if len(teams_data) >= 2:
                 # Find home and away teams
@@ -1159,8 +1344,9 @@ def _sync_game_logs_impl(season: str = '2025-26',
 
         conn.commit()
 
-        # After syncing game logs, compute rest_days and is_back_to_back
-        _compute_rest_days_for_team(cursor, team_id)
+        # After syncing game logs, compute rest_days and is_back_to_back for teams that changed
+        for changed_team_id in changed_team_ids:
+            _compute_rest_days_for_team(cursor, changed_team_id)
         conn.commit()
 
         # Compute opponent stats for all games that were synced
@@ -1179,8 +1365,9 @@ def _sync_game_logs_impl(season: str = '2025-26',
         conn.close()
 
         _log_sync_complete(sync_id, records_synced)
-        logger.info(f"Synced {records_synced} game log records ({new_games} new games, {updated_games} updated games)")
-        return records_synced, None
+        logger.info(f"Synced {records_synced} game log records ({new_games} new games, {updated_games} updated games, "
+                    f"{len(changed_team_ids)} teams changed)")
+        return records_synced, None, changed_team_ids
 
     except Exception as e:
         error_msg = f"Game logs sync failed: {str(e)}"
@@ -1188,7 +1375,7 @@ def _sync_game_logs_impl(season: str = '2025-26',
         logger.error(error_msg)
         import traceback
         traceback.print_exc()
-        return 0, error_msg
+        return 0, error_msg, set()
 
 
 def sync_todays_games(season: str = '2025-26') -> Tuple[int, Optional[str]]:
@@ -1200,7 +1387,10 @@ def sync_todays_games(season: str = '2025-26') -> Tuple[int, Optional[str]]:
     """
     try:
         with sync_lock('todays_games', timeout=5.0, wait=True):
-            return _sync_todays_games_impl(season)
+            records, error = _sync_todays_games_impl(season)
+            if error is None:
+                _after_sync(season, warm=True)
+            return records, error
     except SyncLockError as e:
         error_msg = f"Sync already in progress: {str(e)}"
         logger.warning(error_msg)
@@ -1604,7 +1794,10 @@ def sync_team_profiles(season: str = '2025-26') -> Tuple[int, Optional[str]]:
     """
     try:
         with sync_lock('team_profiles', timeout=10.0, wait=True):
-            return _sync_team_profiles_impl(season)
+            records, error = _sync_team_profiles_impl(season)
+            if error is None:
+                _after_sync(season)
+            return records, error
     except SyncLockError as e:
         error_msg = f"Sync already in progress: {str(e)}"
         logger.warning(error_msg)
@@ -1616,49 +1809,7 @@ def _sync_team_profiles_impl(season: str = '2025-26') -> Tuple[int, Optional[str
     sync_id = _log_sync_start('team_profiles', season)
 
     try:
-        from api.utils.team_profile_classifier import compute_league_references, create_team_profile
-        from api.utils.db_queries import upsert_team_profile
-
-        conn = _get_db_connection()
-        cursor = conn.cursor()
-
-        # Step 1: Compute league references
-        logger.info(f"Computing league references for {season}")
-        league_refs = compute_league_references(cursor, season)
-
-        if not league_refs:
-            error_msg = "Failed to compute league references (insufficient data)"
-            _log_sync_complete(sync_id, 0, error_msg)
-            logger.error(error_msg)
-            conn.close()
-            return 0, error_msg
-
-        # Step 2: Get all teams
-        cursor.execute('SELECT team_id FROM nba_teams WHERE season = ?', (season,))
-        team_ids = [row[0] for row in cursor.fetchall()]
-
-        logger.info(f"Creating profiles for {len(team_ids)} teams")
-
-        profiles_synced = 0
-
-        # Step 3: Create profile for each team
-        for team_id in team_ids:
-            try:
-                profile = create_team_profile(cursor, team_id, season, league_refs)
-
-                if profile:
-                    # Save to database using separate connection (avoid nesting issues)
-                    upsert_team_profile(profile)
-                    profiles_synced += 1
-                else:
-                    # Team doesn't have enough data yet
-                    logger.info(f"Skipping profile for team {team_id} (insufficient data)")
-
-            except Exception as e:
-                logger.error(f"Error creating profile for team {team_id}: {e}")
-                # Continue with other teams
-
-        conn.close()
+        profiles_synced = build_team_profiles(season)
 
         _log_sync_complete(sync_id, profiles_synced)
         logger.info(f"Synced {profiles_synced} team profiles")
@@ -1685,94 +1836,30 @@ def sync_scoring_vs_pace(season: str = '2025-26') -> Tuple[int, Optional[str]]:
     """
     try:
         with sync_lock('scoring_vs_pace', timeout=10.0, wait=True):
-            return _sync_scoring_vs_pace_impl(season)
+            records, error = _sync_scoring_vs_pace_impl(season)
+            if error is None:
+                _after_sync(season)
+            return records, error
     except SyncLockError as e:
         error_msg = f"Sync already in progress: {str(e)}"
         logger.warning(error_msg)
         return 0, error_msg
 
 
-def _sync_scoring_vs_pace_impl(season: str = '2025-26') -> Tuple[int, Optional[str]]:
-    """Internal implementation of sync_scoring_vs_pace (wrapped by sync_lock)"""
+def _sync_scoring_vs_pace_impl(season: str = '2025-26',
+                               team_ids: Optional[List[int]] = None) -> Tuple[int, Optional[str]]:
+    """
+    Internal implementation of sync_scoring_vs_pace (wrapped by sync_lock)
+
+    Args:
+        season: Season string
+        team_ids: Only recompute these teams (None = all teams). Each team's
+                  splits depend only on its own game logs.
+    """
     sync_id = _log_sync_start('scoring_vs_pace', season)
 
     try:
-        from api.utils.db_queries import get_pace_bucket, upsert_team_scoring_vs_pace
-        from api.utils.pace_constants import MIN_GAMES_PER_BUCKET
-        from datetime import datetime, timezone
-
-        conn = _get_db_connection()
-        cursor = conn.cursor()
-
-        # Get all teams
-        cursor.execute('SELECT team_id FROM nba_teams WHERE season = ?', (season,))
-        team_ids = [row[0] for row in cursor.fetchall()]
-
-        logger.info(f"Computing scoring vs pace for {len(team_ids)} teams")
-
-        records_synced = 0
-
-        # For each team, compute scoring by pace bucket
-        for team_id in team_ids:
-            try:
-                # Fetch all game logs with pace data
-                cursor.execute('''
-                    SELECT team_pts, pace
-                    FROM team_game_logs
-                    WHERE team_id = ? AND season = ?
-                        AND team_pts IS NOT NULL
-                        AND pace IS NOT NULL
-                ''', (team_id, season))
-
-                games = cursor.fetchall()
-
-                if not games:
-                    logger.info(f"Team {team_id} has no game logs with pace data, skipping")
-                    continue
-
-                # Classify games into pace buckets and calculate averages
-                buckets = {'slow': [], 'normal': [], 'fast': []}
-
-                for game in games:
-                    team_pts = game[0]
-                    pace = game[1]
-                    bucket = get_pace_bucket(pace)
-                    buckets[bucket].append(team_pts)
-
-                # Save each bucket if it has enough games
-                updated_at = datetime.now(timezone.utc).isoformat()
-
-                for bucket_name, points_list in buckets.items():
-                    if len(points_list) >= MIN_GAMES_PER_BUCKET:
-                        avg_points = sum(points_list) / len(points_list)
-                        games_count = len(points_list)
-
-                        # Use separate connection for upsert (avoid nesting issues)
-                        upsert_team_scoring_vs_pace(
-                            team_id=team_id,
-                            season=season,
-                            pace_bucket=bucket_name,
-                            avg_points=avg_points,
-                            games=games_count,
-                            updated_at=updated_at
-                        )
-
-                        records_synced += 1
-                        logger.info(
-                            f"Team {team_id} {bucket_name} pace: {avg_points:.1f} PPG "
-                            f"({games_count} games)"
-                        )
-                    else:
-                        logger.info(
-                            f"Team {team_id} {bucket_name} pace: insufficient games "
-                            f"({len(points_list)} < {MIN_GAMES_PER_BUCKET})"
-                        )
-
-            except Exception as e:
-                logger.error(f"Error computing scoring vs pace for team {team_id}: {e}")
-                # Continue with other teams
-
-        conn.close()
+        records_synced = build_scoring_vs_pace(season, team_ids)
 
         _log_sync_complete(sync_id, records_synced)
         logger.info(f"Synced {records_synced} scoring vs pace records")
@@ -1791,7 +1878,8 @@ def sync_all(
     season: str = '2025-26',
     triggered_by: str = 'manual',
     run_id: Optional[str] = None,
-    target_date_mt: Optional[str] = None
+    target_date_mt: Optional[str] = None,
+    incremental: bool = False
 ) -> Dict:
     """
     Full data sync (teams, stats, game logs, today's games)
@@ -1803,14 +1891,23 @@ def sync_all(
         triggered_by: 'cron', 'manual', 'admin_api', or 'startup'
         run_id: Optional UUID for tracking this run
         target_date_mt: Optional MT date (YYYY-MM-DD) to sync
+        incremental: Only sync games newer than each team's high-water mark
+                     and rebuild derived data only for teams that changed
 
     Returns:
         Dict with sync results
     """
+    import uuid
+
+    # Generated here so the slate warm-up rows share the sync's run_id
+    if run_id is None:
+        run_id = str(uuid.uuid4())
+
     try:
         # Use a longer timeout for full sync (up to 5 minutes)
         with sync_lock('full', timeout=300.0, wait=False):
-            return _sync_all_impl(season, triggered_by, run_id, target_date_mt)
+            results = _sync_all_impl(season, triggered_by, run_id, target_date_mt, incremental)
+            return _after_sync(season, results, warm=True, triggered_by=triggered_by, run_id=run_id)
     except SyncLockError as e:
         logger.warning(f"Full sync blocked: {str(e)}")
         return {
@@ -1827,13 +1924,94 @@ def sync_all(
         }
 
 
+def _after_sync(season: str, results: Optional[Dict] = None, warm: bool = False,
+                triggered_by: str = 'sync', run_id: Optional[str] = None) -> Dict:
+    """
+    Post-sync hook, run after every sync that wrote nba_data.db.
+
+    The sync moved the data version forward, so the serving snapshot is
+    published first: with DB_SNAPSHOT_SERVING=1 everything built from here
+    on (warm-up, request-time payload/trend/prediction fills stamped with
+    the new version) reads through it and must see the synced data.
+
+    Args:
+        season: Season string
+        results: sync_all() results to record steps in (default: new dict)
+        warm: Also materialize team trends, warm the slate and queue AI
+              sections (sync_all, sync_todays_games)
+        triggered_by: Recorded with the warm-up timings
+        run_id: The sync's run_id
+
+    Returns:
+        results
+    """
+    results = {} if results is None else results
+    _publish_serving_snapshot(results)
+    if warm:
+        results['team_trends'] = _materialize_team_trends(season)
+        results['slate_warmup'] = _warm_slate(season, triggered_by, run_id)
+        results['ai_sections'] = _queue_ai_sections(season)
+    return results
+
+
+def _materialize_team_trends(season: str) -> Dict:
+    """Rebuild every team's stored last-5 trends from the synced game logs"""
+    try:
+        return materialize_team_trends(season)
+    except Exception as e:
+        # get_last_5_trends() builds each team on demand instead
+        logger.error(f"Team trends materialization failed: {e}")
+        return {'error': str(e)}
+
+
+def _warm_slate(season: str, triggered_by: str = 'sync', run_id: Optional[str] = None) -> Dict:
+    """Warm predictions, possession insights and War Room payloads for today's games"""
+    try:
+        return warm_slate(season, triggered_by=triggered_by, run_id=run_id)
+    except Exception as e:
+        # Endpoints still build everything on demand
+        logger.error(f"Slate warm-up failed: {e}")
+        return {'error': str(e)}
+
+
+def _queue_ai_sections(season: str) -> Dict:
+    """Queue matchup summary / writeup generation for today's games (background jobs)"""
+    try:
+        return queue_slate_ai_sections(season)
+    except Exception as e:
+        # game_detail queues each game on first view instead
+        logger.error(f"Queueing AI sections failed: {e}")
+        return {'error': str(e)}
+
+
+def _publish_serving_snapshot(results: Dict):
+    """Publish the read-only serving snapshot so request workers swap to the synced data"""
+    try:
+        results['snapshot'] = publish_snapshot(NBA_DATA_DB_PATH)
+    except Exception as e:
+        # Workers keep serving the previous snapshot
+        logger.error(f"Snapshot publish failed: {e}")
+        results.setdefault('errors', []).append(f"Snapshot publish failed: {e}")
+
+
 def _sync_all_impl(
     season: str = '2025-26',
     triggered_by: str = 'manual',
     run_id: Optional[str] = None,
-    target_date_mt: Optional[str] = None
+    target_date_mt: Optional[str] = None,
+    incremental: bool = False
 ) -> Dict:
-    """Internal implementation of sync_all (wrapped by sync_lock)"""
+    """
+    Internal implementation of sync_all (wrapped by sync_lock)
+
+    Incremental mode runs one game-log pass after today's games (instead of
+    one before and one after) and refetches season stats only when game logs
+    changed.
+
+    Derived tables (rankings, opponent aggregates, PPP, profiles, archetypes,
+    similarity, ...) are rebuilt once at the end by the derived pipeline,
+    limited to the stages downstream of what changed.
+    """
     import uuid
 
     # Generate run_id if not provided
@@ -1870,19 +2048,20 @@ def _sync_all_impl(
         results['errors'].append(teams_error)
         results['success'] = False
 
-    # Sync season stats
-    stats_count, stats_error = _sync_season_stats_impl(season)
-    results['season_stats'] = stats_count
-    if stats_error:
-        results['errors'].append(stats_error)
-        results['success'] = False
-
-    # Sync game logs - fetch ALL completed games for the season
-    logs_count, logs_error = _sync_game_logs_impl(season, last_n_games=None)
-    results['game_logs'] = logs_count
-    if logs_error:
-        results['errors'].append(logs_error)
-        results['success'] = False
+    if not incremental:
+        # Sync season stats
+        stats_count, stats_error = _sync_season_stats_impl(season, rebuild_derived=False)
+        results['season_stats'] = stats_count
+        if stats_error:
+            results['errors'].append(stats_error)
+            results['success'] = False
+
+        # Sync game logs - fetch ALL completed games for the season
+        logs_count, logs_error = _sync_game_logs_impl(season, last_n_games=None)
+        results['game_logs'] = logs_count
+        if logs_error:
+            results['errors'].append(logs_error)
+            results['success'] = False
 
     # Sync today's games
     games_count, games_error = _sync_todays_games_impl(
@@ -1898,25 +2077,46 @@ def _sync_all_impl(
     # Re-sync game logs after today's games to pick up newly completed games
     # This ensures Last 5 trends include games that just finished
     logger.info("Re-syncing game logs to include newly completed games...")
-    logs_count_refresh, logs_error_refresh = _sync_game_logs_impl(season, last_n_games=None)
+    logs_count_refresh, logs_error_refresh, changed_team_ids = _sync_game_logs_core(
+        season, last_n_games=None, incremental=incremental
+    )
     results['game_logs'] = logs_count_refresh  # Update with latest count
+    results['changed_teams'] = len(changed_team_ids)
     if logs_error_refresh:
         results['errors'].append(f"Game logs refresh: {logs_error_refresh}")
         # Don't fail entire sync - we already have some game logs
 
-    # Sync team profiles (after game logs so we have fresh data)
-    profiles_count, profiles_error = _sync_team_profiles_impl(season)
-    results['team_profiles'] = profiles_count
-    if profiles_error:
-        results['errors'].append(profiles_error)
-        # Don't fail entire sync if profiles fail (predictions have fallback)
+    # Inputs the derived pipeline rebuilds from: {input: changed team ids, None = all}
+    changed_inputs = {}
+    if not incremental:
+        changed_inputs = {'team_season_stats': None, 'team_game_logs': None}
+    elif changed_team_ids or logs_error_refresh:
+        # Season stats and rankings are league-wide, so any change refetches them
+        stats_count, stats_error = _sync_season_stats_impl(season, rebuild_derived=False)
+        results['season_stats'] = stats_count
+        if stats_error:
+            results['errors'].append(stats_error)
+            results['success'] = False
+
+        changed_inputs = {
+            'team_season_stats': None,
+            # A failed refresh may have written some teams; rebuild them all
+            'team_game_logs': None if logs_error_refresh else changed_team_ids,
+        }
 
-    # Sync scoring vs pace (after game logs so we have fresh data)
-    pace_count, pace_error = _sync_scoring_vs_pace_impl(season)
-    results['scoring_vs_pace'] = pace_count
-    if pace_error:
-        results['errors'].append(pace_error)
-        # Don't fail entire sync if pace splits fail (predictions have fallback)
+    if not changed_inputs:
+        logger.info("Incremental sync: no game logs changed, skipping season stats and derived tables")
+    else:
+        derived = rebuild_derived_tables(
+            season, changed_inputs, triggered_by=triggered_by, run_id=run_id
+        )
+        results['derived'] = derived
+        results['team_profiles'] = derived.get('team_profiles', {}).get('records', 0)
+        results['scoring_vs_pace'] = derived.get('scoring_vs_pace', {}).get('records', 0)
+        for stage_result in derived.values():
+            if stage_result['error']:
+                # Don't fail entire sync if derived tables fail (predictions have fallback)
+                results['errors'].append(stage_result['error'])
 
     # Calculate totals
     results['total_records'] = (
@@ -1946,131 +2146,14 @@ def _is_current_season_game(game_id: str, season: str) -> bool:
     return any(str(game_id).startswith(prefix) for prefix in valid_prefixes)
 
 
-def _compute_and_save_rankings(cursor, stats_data: List[Dict], season: str):
-    """Compute rankings and update database"""
-    if not stats_data:
-        return
-
-    # Stats where higher is better
-    stats_high = ['ppg', 'fg_pct', 'fg3_pct', 'ft_pct', 'off_rtg', 'net_rtg', 'pace', 'opp_tov']
-    # Stats where lower is better
-    stats_low = ['opp_ppg', 'def_rtg', 'opp_assists']
-
-    # Rank high stats (descending)
-    for stat in stats_high:
-        sorted_teams = sorted(stats_data, key=lambda x: x[stat], reverse=True)
-        for rank, team in enumerate(sorted_teams, start=1):
-            cursor.execute(f'''
-                UPDATE team_season_stats
-                SET {stat}_rank = ?
-                WHERE team_id = ? AND season = ? AND split_type = 'overall'
-            ''', (rank, team['team_id'], season))
-
-    # Rank low stats (ascending)
-    for stat in stats_low:
-        sorted_teams = sorted(stats_data, key=lambda x: x[stat])
-        for rank, team in enumerate(sorted_teams, start=1):
-            cursor.execute(f'''
-                UPDATE team_season_stats
-                SET {stat}_rank = ?
-                WHERE team_id = ? AND season = ? AND split_type = 'overall'
-            ''', (rank, team['team_id'], season))
-
-
-def _compute_opponent_3pt_stats_from_game_logs(cursor, season: str):
-    """
-    Compute opponent 3PT stats from game logs.
-    This calculates how many 3PT the opponent made against this team.
-    """
-    # For each team, calculate opponent 3PT stats from game logs
-    cursor.execute('SELECT DISTINCT team_id FROM team_season_stats WHERE season = ? AND split_type = ?', (season, 'overall'))
-    teams = [row['team_id'] for row in cursor.fetchall()]
-
-    for team_id in teams:
-        # Get all game logs where this team played
-        cursor.execute('''
-            SELECT
-                AVG(opp_fg3m) as avg_opp_fg3m,
-                AVG(opp_fg3a) as avg_opp_fg3a
-            FROM (
-                SELECT tgl_opp.fg3m as opp_fg3m, tgl_opp.fg3a as opp_fg3a
-                FROM team_game_logs tgl
-                JOIN team_game_logs tgl_opp
-                    ON tgl.game_id = tgl_opp.game_id
-                    AND tgl.team_id != tgl_opp.team_id
-                WHERE tgl.team_id = ?
-                    AND tgl.season = ?
-                    AND tgl_opp.fg3m IS NOT NULL
-            )
-        ''', (team_id, season))
-
-        result = cursor.fetchone()
-        if result and result['avg_opp_fg3m'] is not None:
-            opp_fg3m = float(result['avg_opp_fg3m'])
-            opp_fg3a = float(result['avg_opp_fg3a'])
-            opp_fg3_pct = (opp_fg3m / opp_fg3a * 100) if opp_fg3a > 0 else 0
+# data_sync_log rows a sync writes for its steps (derived stages, slate
+# warm-up): they carry the sync's run_id but are not sync runs themselves
+_STEP_ROWS_SQL = '(sync_type LIKE ? OR sync_type = ?)'
+_STEP_ROWS_PARAMS = (STAGE_SYNC_TYPE_PREFIX + '%', WARMUP_SYNC_TYPE)
 
-            # Update team_season_stats
-            cursor.execute('''
-                UPDATE team_season_stats
-                SET opp_fg3m = ?, opp_fg3a = ?, opp_fg3_pct = ?
-                WHERE team_id = ? AND season = ? AND split_type = 'overall'
-            ''', (opp_fg3m, opp_fg3a, opp_fg3_pct, team_id, season))
 
-    logger.info(f"Computed opponent 3PT stats from game logs for {len(teams)} teams")
-
-
-def _compute_3pt_defense_rankings(cursor, season: str):
-    """Compute 3PT defense rankings (lower opp_fg3_pct is better)"""
-    cursor.execute('''
-        SELECT team_id, opp_fg3_pct
-        FROM team_season_stats
-        WHERE season = ? AND split_type = 'overall' AND opp_fg3_pct IS NOT NULL
-        ORDER BY opp_fg3_pct ASC
-    ''', (season,))
-
-    teams = cursor.fetchall()
-    for rank, team in enumerate(teams, start=1):
-        cursor.execute('''
-            UPDATE team_season_stats
-            SET opp_fg3_pct_rank = ?
-            WHERE team_id = ? AND season = ? AND split_type = 'overall'
-        ''', (rank, team['team_id'], season))
-
-    logger.info(f"Computed 3PT defense rankings for {len(teams)} teams")
-
-
-def _update_league_averages(cursor, stats_data: List[Dict], season: str):
-    """Calculate and save league averages"""
-    if not stats_data:
-        return
-
-    n = len(stats_data)
-    averages = {
-        'ppg': sum(t['ppg'] for t in stats_data) / n,
-        'pace': sum(t['pace'] for t in stats_data) / n,
-        'off_rtg': sum(t['off_rtg'] for t in stats_data) / n,
-        'def_rtg': sum(t['def_rtg'] for t in stats_data) / n,
-        'fg_pct': sum(t['fg_pct'] for t in stats_data) / n,
-        'fg3_pct': sum(t['fg3_pct'] for t in stats_data) / n,
-        'ft_pct': sum(t['ft_pct'] for t in stats_data) / n,
-    }
-
-    cursor.execute('''
-        INSERT OR REPLACE INTO league_averages (
-            season, ppg, pace, off_rtg, def_rtg, fg_pct, fg3_pct, ft_pct, updated_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        season,
-        averages['ppg'],
-        averages['pace'],
-        averages['off_rtg'],
-        averages['def_rtg'],
-        averages['fg_pct'],
-        averages['fg3_pct'],
-        averages['ft_pct'],
-        datetime.now(timezone.utc).isoformat()
-    ))
+def _is_step_row(row: Dict) -> bool:
+    return row['sync_type'].startswith(STAGE_SYNC_TYPE_PREFIX) or row['sync_type'] == WARMUP_SYNC_TYPE
 
 
 def get_last_sync_status(sync_type: Optional[str] = None) -> Optional[Dict]:
@@ -2078,7 +2161,8 @@ def get_last_sync_status(sync_type: Optional[str] = None) -> Optional[Dict]:
     Get status of last sync operation
 
     Args:
-        sync_type: Optional filter by sync type
+        sync_type: Optional filter by sync type (default: any sync run,
+                   derived stage and warm-up rows excluded)
 
     Returns:
         Dict with sync status or None
@@ -2094,11 +2178,12 @@ def get_last_sync_status(sync_type: Optional[str] = None) -> Optional[Dict]:
             LIMIT 1
         ''', (sync_type,))
     else:
-        cursor.execute('''
+        cursor.execute(f'''
             SELECT * FROM data_sync_log
+            WHERE NOT {_STEP_ROWS_SQL}
             ORDER BY started_at DESC
             LIMIT 1
-        ''')
+        ''', _STEP_ROWS_PARAMS)
 
     row = cursor.fetchone()
     conn.close()
@@ -2109,6 +2194,58 @@ def get_last_sync_status(sync_type: Optional[str] = None) -> Optional[Dict]:
     return dict(row)
 
 
+def get_sync_runs(run_id: Optional[str] = None, target_date_mt: Optional[str] = None,
+                  limit: int = 10) -> List[Dict]:
+    """
+    Sync runs from data_sync_log, newest first (derived stage and warm-up
+    rows excluded).
+
+    Args:
+        run_id: Only this run: its 'full' row (or latest sync row), with
+                every other row logged under the run_id - the today's games
+                sync, derived stages, slate warm-up - in 'steps'
+        target_date_mt: Only runs for this MT date (YYYY-MM-DD)
+        limit: Maximum runs (without run_id)
+
+    Returns:
+        List of data_sync_log rows as dicts
+    """
+    conn = get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
+    try:
+        cursor = conn.cursor()
+        if run_id:
+            cursor.execute('''
+                SELECT * FROM data_sync_log
+                WHERE run_id = ?
+                ORDER BY started_at
+            ''', (run_id,))
+            rows = [dict(row) for row in cursor.fetchall()]
+            candidates = [row for row in rows if not _is_step_row(row)]
+            if not candidates:
+                return []
+            run = max(candidates, key=lambda row: (row['sync_type'] == 'full', row['started_at']))
+            run['steps'] = [row for row in rows if row is not run]
+            return [run]
+
+        if target_date_mt:
+            cursor.execute(f'''
+                SELECT * FROM data_sync_log
+                WHERE target_date_mt = ? AND NOT {_STEP_ROWS_SQL}
+                ORDER BY started_at DESC
+                LIMIT ?
+            ''', (target_date_mt, *_STEP_ROWS_PARAMS, limit))
+        else:
+            cursor.execute(f'''
+                SELECT * FROM data_sync_log
+                WHERE NOT {_STEP_ROWS_SQL}
+                ORDER BY started_at DESC
+                LIMIT ?
+            ''', (*_STEP_ROWS_PARAMS, limit))
+        return [dict(row) for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
 if __name__ == '__main__':
     # Example usage for manual testing
     print("Starting manual sync...")
@@ -0,0 +1,222 @@
+"""
+Team Context - One bundle of team data per team per request
+
+Most adjustment modules used to open their own connection and re-query
+team_game_logs / team_season_stats for the same team. A TeamContext loads
+everything those modules read in a handful of queries:
+- nba_teams row (id, abbreviation, full name)
+- team_season_stats rows for every split (overall, home, away)
+- all team_game_logs rows for the season (most recent first)
+- league-wide overall rows (shared by every TeamContext in a scope, used
+  for opponent ranks)
+
+Helpers accept an optional team_context argument. When it is omitted they
+call get_scoped_team_context(), which returns the shared context inside a
+prediction scope and None outside one (so they fall back to SQL).
+
+Usage:
+    from api.utils.prediction_context import prediction_scope
+    from api.utils.team_context import get_team_context
+
+    with prediction_scope():
+        ctx = get_team_context(1610612738, '2025-26')
+        ctx.overall['ppg'], ctx.ranks['def_rtg_rank'], ctx.last_n_games(5)
+"""
+
+import sqlite3
+from typing import Dict, List, Optional
+
+try:
+    from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
+    from api.utils.prediction_context import get_active_context
+except ImportError:
+    from db_config import get_db_path
+    from connection_pool import get_shared_connection
+    from prediction_context import get_active_context
+
+# Database path
+NBA_DATA_DB_PATH = get_db_path('nba_data.db')
+
+# Game types counted by the Regular Season + NBA Cup filters
+ELIGIBLE_GAME_TYPES = ('Regular Season', 'NBA Cup')
+
+
+def _get_db_connection() -> sqlite3.Connection:
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
+
+
+class TeamContext:
+    """
+    Read-only snapshot of one team's season data.
+
+    Rows are plain dicts with the same column names as the source tables,
+    so code written against sqlite3.Row (row['col'], row.keys()) works
+    unchanged.
+    """
+
+    def __init__(self, team_id: int, season: str, team: Optional[Dict],
+                 season_rows: Dict[str, Dict], game_logs: List[Dict],
+                 league_overall: Dict[int, Dict]):
+        self.team_id = team_id
+        self.season = season
+        self.team = team
+        self.season_rows = season_rows
+        self.game_logs = game_logs
+        self.league_overall = league_overall
+
+    @property
+    def overall(self) -> Optional[Dict]:
+        """team_season_stats row for split_type='overall' (or None)"""
+        return self.season_rows.get('overall')
+
+    @property
+    def ranks(self) -> Dict[str, Optional[int]]:
+        """All *_rank columns from the overall season row"""
+        if not self.overall:
+            return {}
+        return {k: v for k, v in self.overall.items() if k.endswith('_rank')}
+
+    def opponent_overall(self, opponent_team_id: Optional[int]) -> Optional[Dict]:
+        """League overall season row for an opponent (or None)"""
+        if opponent_team_id is None:
+            return None
+        return self.league_overall.get(int(opponent_team_id))
+
+    def games(self, eligible_only: bool = False) -> List[Dict]:
+        """
+        Season game logs, most recent first.
+
+        Args:
+            eligible_only: Only Regular Season + NBA Cup games
+        """
+        if not eligible_only:
+            return self.game_logs
+        return [g for g in self.game_logs if g.get('game_type') in ELIGIBLE_GAME_TYPES]
+
+    def last_n_games(self, n: int, eligible_only: bool = False) -> List[Dict]:
+        """Most recent N game logs (most recent first)"""
+        return self.games(eligible_only)[:n]
+
+    def __repr__(self):
+        abbr = self.team['team_abbreviation'] if self.team else self.team_id
+        return f"<TeamContext {abbr} {self.season}: {len(self.game_logs)} games>"
+
+
+def _load_league_overall(cursor, season: str) -> Dict[int, Dict]:
+    """Load every team's overall season row keyed by team_id"""
+    cursor.execute('''
+        SELECT *
+        FROM team_season_stats
+        WHERE season = ? AND split_type = 'overall'
+    ''', (season,))
+    return {row['team_id']: dict(row) for row in cursor.fetchall()}
+
+
+def build_team_context(team_id: int, season: str = '2025-26',
+                       league_overall: Optional[Dict[int, Dict]] = None) -> TeamContext:
+    """
+    Build a TeamContext with one connection and at most four queries.
+
+    Args:
+        team_id: NBA team ID
+        season: Season string
+        league_overall: Pre-loaded league overall rows (loaded here if None)
+
+    Returns:
+        TeamContext
+    """
+    conn = _get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute('''
+            SELECT *
+            FROM nba_teams
+            WHERE team_id = ?
+        ''', (team_id,))
+        team_row = cursor.fetchone()
+
+        cursor.execute('''
+            SELECT *
+            FROM team_season_stats
+            WHERE team_id = ? AND season = ?
+        ''', (team_id, season))
+        season_rows = {row['split_type']: dict(row) for row in cursor.fetchall()}
+
+        cursor.execute('''
+            SELECT *
+            FROM team_game_logs
+            WHERE team_id = ? AND season = ?
+            ORDER BY game_date DESC
+        ''', (team_id, season))
+        game_logs = [dict(row) for row in cursor.fetchall()]
+
+        if league_overall is None:
+            league_overall = _load_league_overall(cursor, season)
+    finally:
+        conn.close()
+
+    return TeamContext(
+        team_id=int(team_id),
+        season=season,
+        team=dict(team_row) if team_row else None,
+        season_rows=season_rows,
+        game_logs=game_logs,
+        league_overall=league_overall
+    )
+
+
+def _get_league_overall(scope, season: str) -> Dict[int, Dict]:
+    """Get league overall rows, loaded once per prediction scope"""
+    def _build():
+        conn = _get_db_connection()
+        try:
+            return _load_league_overall(conn.cursor(), season)
+        finally:
+            conn.close()
+
+    return scope.get_or_build(('league_overall', season), _build)
+
+
+def get_team_context(team_id: int, season: str = '2025-26') -> TeamContext:
+    """
+    Get a TeamContext, shared across the active prediction scope.
+
+    Outside a scope a fresh context is built on every call.
+    """
+    scope = get_active_context()
+    if scope is None:
+        return build_team_context(team_id, season)
+
+    league_overall = _get_league_overall(scope, season)
+    return scope.get_or_build(
+        ('team_context', int(team_id), season),
+        lambda: build_team_context(team_id, season, league_overall=league_overall)
+    )
+
+
+def get_scoped_team_context(team_id: Optional[int], season: str = '2025-26') -> Optional[TeamContext]:
+    """
+    Get the shared TeamContext inside a prediction scope, None outside one.
+
+    Helpers call this when no team_context was passed so request handlers
+    that open a scope get context-backed reads without any call-site changes.
+    """
+    if team_id is None or get_active_context() is None:
+        return None
+    return get_team_context(team_id, season)
+
+
+def get_scoped_league_overall(season: str = '2025-26') -> Optional[Dict[int, Dict]]:
+    """
+    Get every team's overall season row inside a prediction scope, None outside one.
+
+    Opponent lookups (ranks, defensive tiers) only need this one row, so they
+    read it from the shared league map instead of building a full TeamContext.
+    """
+    scope = get_active_context()
+    if scope is None:
+        return None
+    return _get_league_overall(scope, season)
@@ -26,17 +26,19 @@ logger = logging.getLogger(__name__)
 # Import centralized database configuration
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
+    from api.utils.prediction_context import scoped_cache
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
+    from prediction_context import scoped_cache
 
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
 
 
 def _determine_confidence(games: int) -> str:
@@ -57,6 +59,7 @@ def _determine_confidence(games: int) -> str:
         return "low"
 
 
+@scoped_cache
 def get_team_scoring_vs_defense_tier(
     team_id: int,
     defense_tier: str,
@@ -199,6 +202,7 @@ def get_team_scoring_vs_pace_bucket(
     return None
 
 
+@scoped_cache
 def get_h2h_history(
     home_team_id: int,
     away_team_id: int,
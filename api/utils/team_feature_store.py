@@ -0,0 +1,449 @@
+"""
+Point-in-Time Team Feature Store
+
+Cumulative per-team features as they stood after every game of the season,
+so backtests and historical predictions only ever see games played before
+the date being predicted:
+
+    team_feature_snapshots(team_id, season, game_date, games, season_*, last_5_*,
+                           home_*, away_*, ppp_*, fg*_made/attempted, ...)
+
+The row for (team, game_date) covers the team's games through that date.
+Features as of date D come from the team's latest row with game_date < D,
+which is what build_team_profile(), compute_blended_ppp() and the defense
+rank lookups in the v5 engines read when given an as_of_date.
+
+Feature definitions match the live builders they stand in for:
+- season_*/last_5_*/home_*/away_*: team_profiles_v5.build_team_profile()
+- ppp_*: ppp_aggregator.calculate_season_ppp() / calculate_rolling_ppp()
+
+The derived pipeline refreshes the rows of teams whose game logs changed,
+from their first changed game onward.
+
+Usage:
+    from api.utils.team_feature_store import get_team_features_as_of, preloaded_feature_history
+
+    features = get_team_features_as_of(1610612738, '2025-12-01', '2025-26')
+
+    # Backtests: one bulk read, then in-memory lookups
+    with preloaded_feature_history('2025-26'):
+        for game in games:
+            ...
+"""
+
+import sqlite3
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Import centralized database configuration
+try:
+    from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
+except ImportError:
+    from db_config import get_db_path
+    from connection_pool import get_shared_connection
+
+NBA_DATA_DB_PATH = get_db_path('nba_data.db')
+
+# TeamProfile stats: profile suffix -> team_game_logs column
+PROFILE_STATS = {
+    'ppg': 'team_pts',
+    'opp_ppg': 'opp_pts',
+    'pace': 'pace',
+    'ortg': 'off_rating',
+    'drtg': 'def_rating',
+    'fg3_pct': 'fg3_pct',
+    'ft_pct': 'ft_pct',
+    'assists': 'assists',
+    'turnovers': 'turnovers',
+}
+
+# Not in TeamProfile's last-5 block
+_NO_LAST_5 = ('ft_pct',)
+
+# Running totals: store column -> team_game_logs column
+TOTAL_COLUMNS = {
+    'pts_total': 'team_pts',
+    'possessions_total': 'possessions',
+    'fg3_made': 'fg3m',
+    'fg3_attempted': 'fg3a',
+    'fg2_made': 'fg2m',
+    'fg2_attempted': 'fg2a',
+}
+
+FEATURE_COLUMNS = (
+    ['games']
+    + [f'season_{stat}' for stat in PROFILE_STATS]
+    + [f'last_5_{stat}' for stat in PROFILE_STATS if stat not in _NO_LAST_5]
+    + ['home_games', 'home_ppg', 'away_games', 'away_ppg',
+       'ppp_season', 'ppp_last10', 'ppp_last10_games', 'ppp_last5', 'ppp_last5_games']
+    + list(TOTAL_COLUMNS)
+)
+
+_INTEGER_COLUMNS = ('games', 'home_games', 'away_games', 'ppp_last10_games', 'ppp_last5_games')
+
+
+def _get_db_connection() -> sqlite3.Connection:
+    """Get this thread's shared connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH)
+
+
+def create_feature_table(cursor):
+    """Create team_feature_snapshots if migration v17 has not run"""
+    columns = ',\n            '.join(
+        f"{col} {'INTEGER' if col in _INTEGER_COLUMNS else 'REAL'}" for col in FEATURE_COLUMNS
+    )
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS team_feature_snapshots (
+            team_id INTEGER NOT NULL,
+            season TEXT NOT NULL,
+            game_date TEXT NOT NULL,
+            {columns},
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (team_id, season, game_date)
+        )
+    ''')
+
+
+# ============================================================================
+# FEATURE COMPUTATION
+# ============================================================================
+
+def _load_game_logs(conn, season: str, team_ids: Optional[Iterable[int]] = None) -> pd.DataFrame:
+    """Every game log the profile builders read, oldest first per team"""
+    columns = sorted(set(PROFILE_STATS.values()) | set(TOTAL_COLUMNS.values()))
+    team_filter = ''
+    params: List = [season]
+    if team_ids is not None:
+        team_ids = list(team_ids)
+        team_filter = f"AND team_id IN ({','.join('?' * len(team_ids))})"
+        params += team_ids
+
+    return pd.read_sql_query(f'''
+        SELECT team_id, game_date, is_home, {', '.join(columns)}
+        FROM team_game_logs
+        WHERE season = ? {team_filter}
+        ORDER BY team_id, game_date
+    ''', conn, params=params)
+
+
+def _ratio(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
+    """numerator / denominator, NaN where the denominator is 0"""
+    return numerator / denominator.where(denominator != 0)
+
+
+def compute_team_feature_history(logs: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cumulative features after every game
+
+    Args:
+        logs: _load_game_logs() output (sorted by team_id, game_date)
+
+    Returns:
+        DataFrame with team_id, game_date and FEATURE_COLUMNS, one row per
+        team per game date
+    """
+    logs = logs.reset_index(drop=True)
+    by_team = logs.groupby('team_id', sort=False)
+    out = pd.DataFrame({'team_id': logs['team_id'], 'game_date': logs['game_date']})
+    out['games'] = by_team.cumcount() + 1
+
+    for stat, col in PROFILE_STATS.items():
+        values = logs[col].astype(float)
+
+        # Season: SQL AVG() skips NULLs
+        present = values.notna().astype(float)
+        out[f'season_{stat}'] = _ratio(values.fillna(0.0).groupby(logs['team_id']).cumsum(),
+                                       present.groupby(logs['team_id']).cumsum())
+
+        # Last 5: sum over the window divided by games in it (falsy values add 0)
+        if stat not in _NO_LAST_5:
+            window = values.fillna(0.0).groupby(logs['team_id']).rolling(5, min_periods=1)
+            out[f'last_5_{stat}'] = (window.sum().reset_index(level=0, drop=True)
+                                     / np.minimum(out['games'], 5))
+
+    # Home / away splits
+    for side, flag in (('home', 1), ('away', 0)):
+        on_side = (logs['is_home'] == flag)
+        pts = logs['team_pts'].astype(float).where(on_side)
+        out[f'{side}_games'] = on_side.astype(int).groupby(logs['team_id']).cumsum()
+        out[f'{side}_ppg'] = _ratio(pts.fillna(0.0).groupby(logs['team_id']).cumsum(),
+                                    pts.notna().astype(float).groupby(logs['team_id']).cumsum())
+
+    # PPP over games with possessions, as in ppp_aggregator
+    has_poss = logs['possessions'].notna()
+    pts = logs['team_pts'].astype(float).where(has_poss, 0.0)
+    poss = logs['possessions'].astype(float).where(has_poss, 0.0)
+    out['ppp_season'] = _ratio(pts.groupby(logs['team_id']).cumsum(),
+                               poss.groupby(logs['team_id']).cumsum()).round(3)
+    for n in (10, 5):
+        ppp, used = _rolling_ppp(logs.loc[has_poss], n)
+        out[f'ppp_last{n}'] = ppp.reindex(logs.index)
+        out[f'ppp_last{n}_games'] = used.reindex(logs.index)
+        # Games without possessions keep the previous value
+        out[[f'ppp_last{n}', f'ppp_last{n}_games']] = (
+            out[[f'ppp_last{n}', f'ppp_last{n}_games']].groupby(logs['team_id']).ffill()
+        )
+        out[f'ppp_last{n}_games'] = out[f'ppp_last{n}_games'].fillna(0).astype(int)
+
+    # Running totals (NULLs count as 0)
+    for name, col in TOTAL_COLUMNS.items():
+        out[name] = logs[col].astype(float).fillna(0.0).groupby(logs['team_id']).cumsum()
+
+    # Keep the state after the last game of each date
+    return out.groupby(['team_id', 'game_date'], sort=False).tail(1).reset_index(drop=True)
+
+
+def _rolling_ppp(logs: pd.DataFrame, n: int):
+    """(PPP over the last n games, games used) after each game"""
+    group = logs['team_id']
+    pts = logs['team_pts'].astype(float).groupby(group).rolling(n, min_periods=1).sum()
+    poss = logs['possessions'].astype(float).groupby(group).rolling(n, min_periods=1).sum()
+    used = logs['possessions'].groupby(group).rolling(n, min_periods=1).count()
+    pts, poss, used = (s.reset_index(level=0, drop=True) for s in (pts, poss, used))
+    return _ratio(pts, poss).round(3), used.astype(int)
+
+
+# ============================================================================
+# STORE REFRESH
+# ============================================================================
+
+def refresh_team_feature_store(season: str, team_ids: Optional[Iterable[int]] = None,
+                               full: bool = False) -> int:
+    """
+    Rebuild feature snapshots for a season
+
+    Each team's rows are rewritten from its first game date whose stored
+    game count no longer matches the game logs. Stat corrections that keep
+    game counts the same need full=True.
+
+    Args:
+        season: Season string (e.g., '2025-26')
+        team_ids: Teams whose game logs changed (None = every team)
+        full: Rewrite every row instead of only changed dates
+
+    Returns:
+        Number of snapshot rows written
+    """
+    conn = _get_db_connection()
+    try:
+        cursor = conn.cursor()
+        create_feature_table(cursor)
+
+        history = compute_team_feature_history(_load_game_logs(conn, season, team_ids))
+
+        team_filter, params = '', [season]
+        if team_ids is not None:
+            team_ids = list(team_ids)
+            team_filter = f"AND team_id IN ({','.join('?' * len(team_ids))})"
+            params += team_ids
+        cursor.execute(f'''
+            SELECT team_id, game_date, games FROM team_feature_snapshots
+            WHERE season = ? {team_filter}
+        ''', params)
+        stored = {(row['team_id'], row['game_date']): row['games'] for row in cursor.fetchall()}
+
+        # First changed date per team; dates dropped from the logs count as changed
+        current = dict(zip(zip(history['team_id'], history['game_date']), history['games']))
+        first_changed: Dict[int, str] = {}
+        for (team_id, game_date), games in list(current.items()) + [(key, None) for key in stored]:
+            if full or stored.get((team_id, game_date)) != current.get((team_id, game_date)):
+                if team_id not in first_changed or game_date < first_changed[team_id]:
+                    first_changed[team_id] = game_date
+
+        if not first_changed:
+            logger.info(f"Team feature snapshots for {season} are up to date")
+            return 0
+
+        cursor.executemany('''
+            DELETE FROM team_feature_snapshots
+            WHERE season = ? AND team_id = ? AND game_date >= ?
+        ''', [(season, int(team_id), game_date) for team_id, game_date in first_changed.items()])
+
+        cutoff = history['team_id'].map(first_changed)
+        changed = history[cutoff.notna() & (history['game_date'] >= cutoff.fillna(''))]
+
+        updated_at = datetime.now(timezone.utc).isoformat()
+        records = changed[['team_id', 'game_date'] + FEATURE_COLUMNS].astype(object)
+        records = records.where(records.notna(), None)
+        cursor.executemany(f'''
+            INSERT INTO team_feature_snapshots
+            (team_id, season, game_date, {', '.join(FEATURE_COLUMNS)}, updated_at)
+            VALUES (?, ?, ?, {', '.join('?' * len(FEATURE_COLUMNS))}, ?)
+        ''', [
+            (int(row[0]), season, row[1], *row[2:], updated_at)
+            for row in records.itertuples(index=False, name=None)
+        ])
+        conn.commit()
+
+        logger.info(f"Wrote {len(changed)} team feature snapshots for {season} "
+                    f"({len(first_changed)} teams)")
+        return len(changed)
+    finally:
+        conn.close()
+
+
+# ============================================================================
+# AS-OF READS
+# ============================================================================
+
+# season -> load_feature_history() output while preloaded
+_preloaded: Dict[str, Dict] = {}
+
+
+def _row_to_features(row: Dict) -> Dict:
+    features = {col: row[col] for col in FEATURE_COLUMNS}
+    features['team_id'] = row['team_id']
+    features['team_name'] = row['team_name']
+    features['through_date'] = row['game_date']
+    return features
+
+
+def load_feature_history(season: str) -> Dict:
+    """
+    Every stored snapshot for a season in one read
+
+    Returns:
+        {'teams': {team_id: (sorted game_dates, feature dicts)}} (empty before migration v17)
+    """
+    conn = _get_db_connection()
+    try:
+        rows = conn.execute(f'''
+            SELECT s.team_id, s.game_date, nt.full_name as team_name,
+                   {', '.join(f's.{col}' for col in FEATURE_COLUMNS)}
+            FROM team_feature_snapshots s
+            JOIN nba_teams nt ON nt.team_id = s.team_id
+            WHERE s.season = ?
+            ORDER BY s.team_id, s.game_date
+        ''', (season,)).fetchall()
+    except sqlite3.OperationalError:
+        rows = []
+    finally:
+        conn.close()
+
+    teams: Dict[int, tuple] = {}
+    for row in rows:
+        dates, features = teams.setdefault(row['team_id'], ([], []))
+        dates.append(row['game_date'])
+        features.append(_row_to_features(dict(row)))
+    return {'teams': teams}
+
+
+@contextmanager
+def preloaded_feature_history(season: str):
+    """Serve get_team_features_as_of() for a season from memory inside the block"""
+    _preloaded[season] = load_feature_history(season)
+    try:
+        yield _preloaded[season]
+    finally:
+        _preloaded.pop(season, None)
+
+
+def has_feature_snapshots(season: str) -> bool:
+    """True if the store was built for the season (False before migration v17)"""
+    if season in _preloaded:
+        return bool(_preloaded[season]['teams'])
+
+    conn = _get_db_connection()
+    try:
+        row = conn.execute('SELECT 1 FROM team_feature_snapshots WHERE season = ? LIMIT 1',
+                           (season,)).fetchone()
+        return row is not None
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+
+def get_team_features_as_of(team_id: int, as_of_date: str, season: str = '2025-26') -> Optional[Dict]:
+    """
+    A team's features from its games before a date
+
+    Args:
+        team_id: NBA team ID
+        as_of_date: Only games with game_date < as_of_date count
+        season: Season string
+
+    Returns:
+        {FEATURE_COLUMNS..., 'team_id', 'team_name', 'through_date'}, or None
+        if the team has no games before the date (or no snapshots exist)
+    """
+    if season in _preloaded:
+        dates, features = _preloaded[season]['teams'].get(team_id, ([], []))
+        i = bisect_left(dates, as_of_date)
+        return features[i - 1] if i else None
+
+    conn = _get_db_connection()
+    try:
+        row = conn.execute(f'''
+            SELECT s.team_id, s.game_date, nt.full_name as team_name,
+                   {', '.join(f's.{col}' for col in FEATURE_COLUMNS)}
+            FROM team_feature_snapshots s
+            JOIN nba_teams nt ON nt.team_id = s.team_id
+            WHERE s.team_id = ? AND s.season = ? AND s.game_date < ?
+            ORDER BY s.game_date DESC
+            LIMIT 1
+        ''', (team_id, season, as_of_date)).fetchone()
+        return _row_to_features(dict(row)) if row else None
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+
+
+def get_league_features_as_of(as_of_date: str, season: str = '2025-26') -> Dict[int, Dict]:
+    """
+    Every team's features from games before a date
+
+    Returns:
+        {team_id: features} for teams with at least one game before the date
+    """
+    if season in _preloaded:
+        league = {}
+        for team_id in _preloaded[season]['teams']:
+            features = get_team_features_as_of(team_id, as_of_date, season)
+            if features:
+                league[team_id] = features
+        return league
+
+    conn = _get_db_connection()
+    try:
+        rows = conn.execute(f'''
+            SELECT * FROM (
+                SELECT s.team_id, s.game_date, nt.full_name as team_name,
+                       {', '.join(f's.{col}' for col in FEATURE_COLUMNS)},
+                       ROW_NUMBER() OVER (PARTITION BY s.team_id ORDER BY s.game_date DESC) as recency
+                FROM team_feature_snapshots s
+                JOIN nba_teams nt ON nt.team_id = s.team_id
+                WHERE s.season = ? AND s.game_date < ?
+            )
+            WHERE recency = 1
+        ''', (season, as_of_date)).fetchall()
+        return {row['team_id']: _row_to_features(dict(row)) for row in rows}
+    except sqlite3.OperationalError:
+        return {}
+    finally:
+        conn.close()
+
+
+def get_def_rtg_rank_as_of(team_id: int, as_of_date: str, season: str = '2025-26') -> Optional[int]:
+    """
+    Defensive rating rank (1 = lowest season_drtg) among teams before a date
+
+    Returns:
+        Rank, or None if the team has no games before the date
+    """
+    league = get_league_features_as_of(as_of_date, season)
+    team = league.get(team_id)
+    if not team or team['season_drtg'] is None:
+        return None
+    return 1 + sum(1 for other in league.values()
+                   if other['season_drtg'] is not None and other['season_drtg'] < team['season_drtg'])
@@ -17,17 +17,19 @@ logger = logging.getLogger(__name__)
 
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
+    from api.utils.team_feature_store import get_team_features_as_of, has_feature_snapshots
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
+    from team_feature_store import get_team_features_as_of, has_feature_snapshots
 
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
 
 
 @dataclass
@@ -131,6 +133,9 @@ def build_team_profile(team_id: int, season: str = '2025-26',
     """
     Build comprehensive TeamProfile from team_game_logs.
 
+    With as_of_date, reads the point-in-time feature store when it has been
+    built for the season.
+
     Args:
         team_id: NBA team ID
         season: NBA season (e.g., '2025-26')
@@ -139,6 +144,10 @@ def build_team_profile(team_id: int, season: str = '2025-26',
     Returns:
         TeamProfile object or None if insufficient data
     """
+    if as_of_date and has_feature_snapshots(season):
+        features = get_team_features_as_of(team_id, as_of_date, season)
+        return _profile_from_features(features, season) if features else None
+
     conn = _get_db_connection()
     cursor = conn.cursor()
 
@@ -266,6 +275,49 @@ def build_team_profile(team_id: int, season: str = '2025-26',
     return profile
 
 
+def _profile_from_features(features: Dict, season: str) -> Optional[TeamProfile]:
+    """TeamProfile from a team_feature_store row (same defaults as the live query)"""
+    if features['games'] < 5:
+        return None
+
+    return TeamProfile(
+        team_id=features['team_id'],
+        team_name=features['team_name'],
+        season=season,
+
+        # Season averages
+        season_ppg=float(features['season_ppg']),
+        season_opp_ppg=float(features['season_opp_ppg']),
+        season_pace=float(features['season_pace'] or 100.0),
+        season_ortg=float(features['season_ortg'] or 110.0),
+        season_drtg=float(features['season_drtg'] or 110.0),
+        season_fg3_pct=float(features['season_fg3_pct'] or 0.35),
+        season_ft_pct=float(features['season_ft_pct'] or 0.75),
+        season_assists=float(features['season_assists'] or 25.0),
+        season_turnovers=float(features['season_turnovers'] or 13.0),
+        season_games=int(features['games']),
+
+        # Last 5 games
+        last_5_ppg=float(features['last_5_ppg']),
+        last_5_opp_ppg=float(features['last_5_opp_ppg']),
+        last_5_pace=float(features['last_5_pace']),
+        last_5_ortg=float(features['last_5_ortg']),
+        last_5_drtg=float(features['last_5_drtg']),
+        last_5_fg3_pct=float(features['last_5_fg3_pct']),
+        last_5_assists=float(features['last_5_assists']),
+        last_5_turnovers=float(features['last_5_turnovers']),
+
+        # Home/Away splits
+        home_ppg=float(features['home_ppg'] or features['season_ppg']),
+        home_games=int(features['home_games']),
+        away_ppg=float(features['away_ppg'] or features['season_ppg']),
+        away_games=int(features['away_games']),
+
+        # Derived
+        recent_ortg_change=float(features['last_5_ortg'] - features['season_ortg'])
+    )
+
+
 def build_matchup_profile(team_id: int, opponent_id: int, season: str = '2025-26',
                          as_of_date: Optional[str] = None) -> MatchupProfile:
     """
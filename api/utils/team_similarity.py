@@ -4,17 +4,26 @@ Team Similarity Engine - Core Module
 Analyzes playstyle profiles of all NBA teams using season stats and box score data.
 Computes similarity scores, assigns clusters, tracks performance vs cluster types.
 
+Features for the whole league are held in one (teams x 20) NumPy matrix, so
+distances, top-k lookups, cluster fits and centroids are matrix operations
+rather than per-pair Python loops.
+
 100% deterministic - no machine learning.
 """
 
 import json
 import math
+import os
 import sqlite3
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Sequence
 from datetime import datetime
 
+import numpy as np
+
 from api.utils.db_schema_similarity import get_connection
+from api.utils.connection_pool import get_shared_connection
 from api.utils.db_queries import get_all_teams, get_team_by_id
+from api.utils.prediction_context import scoped_cache
 
 
 # Feature weights for distance calculation
@@ -41,6 +50,32 @@ FEATURE_WEIGHTS = {
     'second_chance_pts_rate': 1.0
 }
 
+# Column order of every feature matrix in this module
+FEATURE_NAMES = list(FEATURE_WEIGHTS.keys())
+_WEIGHT_VECTOR = np.array([FEATURE_WEIGHTS[name] for name in FEATURE_NAMES])
+
+# All features maximally different (used to scale distances to 0-100)
+MAX_DISTANCE = math.sqrt(sum(FEATURE_WEIGHTS.values()))
+
+CLUSTER_IDS = (1, 2, 3, 4, 5, 6)
+
+# Window modes refreshed for conditional similarity, with their game limits
+CONDITIONAL_WINDOW_MODES = ('season', 'last20', 'last10')
+_WINDOW_LIMITS = {'season': None, 'last20': 20, 'last10': 10}
+MIN_CONDITIONAL_GAMES = 5
+
+# team_game_logs columns aggregated for conditional feature vectors
+_CONDITIONAL_LOG_COLUMNS = (
+    'team_pts', 'opp_pts', 'pace',
+    'fg3a', 'fg3m', 'fga', 'fgm', 'fta', 'ftm',
+    'assists', 'turnovers', 'steals', 'blocks',
+    'offensive_rebounds', 'defensive_rebounds',
+    'opp_offensive_rebounds', 'opp_defensive_rebounds',
+    'opp_fg3m', 'opp_fg3a',
+    'points_in_paint', 'fast_break_points', 'second_chance_points'
+)
+_LOG_COL = {name: i for i, name in enumerate(_CONDITIONAL_LOG_COLUMNS)}
+
 
 def normalize_value(value: float, min_val: float, max_val: float) -> float:
     """Min-max normalization to 0-1 range"""
@@ -49,194 +84,373 @@ def normalize_value(value: float, min_val: float, max_val: float) -> float:
     return (value - min_val) / (max_val - min_val)
 
 
+def _get_nba_connection():
+    """Shared read-only connection to the main NBA database (season stats and game logs)"""
+    return get_shared_connection('nba_data', readonly=True, row_factory=None)
+
+
+def _fill(values: np.ndarray, default: float) -> np.ndarray:
+    """Replace NULL (NaN) and zero entries with a default, like `x if x else default`"""
+    return np.where(np.isnan(values) | (values == 0), default, values)
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray, default: float) -> np.ndarray:
+    """Element-wise numerator / denominator, or default where the denominator is not positive"""
+    positive = denominator > 0
+    return np.where(positive, numerator / np.where(positive, denominator, 1.0), default)
+
+
+def _raw_feature_matrix(pace, pace_variance, fg3a, fga, fgm, fta, ast, tov, stl, blk,
+                        paint_pts, fastbreak_pts, second_chance_pts, scoring_pts, rim_pts,
+                        oreb, dreb, opp_oreb, opp_dreb,
+                        def_paint_pts_allowed, def_three_pct_allowed) -> np.ndarray:
+    """
+    Assemble the raw (unnormalized) feature matrix from per-team averages.
+
+    Every argument is a 1-D array with one entry per team. scoring_pts is the
+    denominator for the paint/fastbreak/second-chance rates, rim_pts the one
+    for the rim attempt proxy.
+
+    Returns:
+        (n, 20) array in FEATURE_NAMES order
+    """
+    # rim_attempt_rate: PROXY using points in paint (no shot zone data)
+    rim_attempt_rate = np.clip(_ratio(paint_pts, rim_pts, 0.30), 0.0, 1.0)
+
+    # midrange_rate: PROXY computed as residual (1 - 3pt - rim)
+    three_pt_rate = _ratio(fg3a, fga, 0.35)
+    midrange_rate = np.clip(1.0 - three_pt_rate - rim_attempt_rate, 0.0, 1.0)
+
+    columns = {
+        'pace': pace,
+        'pace_variance': pace_variance,  # STDDEV of pace from game logs
+        'three_pt_rate': three_pt_rate,
+        'midrange_rate': midrange_rate,
+        'paint_scoring_rate': _ratio(paint_pts, scoring_pts, 0.45),
+        'rim_attempt_rate': rim_attempt_rate,
+        'ast_ratio': _ratio(ast, fgm, 0.6),
+        'ast_to_ratio': _ratio(ast, tov, 1.7),
+        'turnover_rate': _ratio(tov, pace, 0.13),
+        'fta_rate': _ratio(fta, fga, 0.23),
+        'fouls_drawn_rate': _ratio(fta, pace, 0.20),
+        # TODO: Add PF column to team_game_logs for real calculation
+        'fouls_committed_rate': np.full(len(pace), 0.20),
+        'oreb_pct': _ratio(oreb, oreb + opp_dreb, 0.23),  # OREB / (OREB + Opp_DREB)
+        'dreb_pct': _ratio(dreb, dreb + opp_oreb, 0.77),  # DREB / (DREB + Opp_OREB)
+        'def_paint_pts_allowed': def_paint_pts_allowed,
+        'def_three_pct_allowed': def_three_pct_allowed,
+        'steals_per_game': stl,
+        'blocks_per_game': blk,
+        'fastbreak_pts_rate': _ratio(fastbreak_pts, scoring_pts, 0.12),
+        'second_chance_pts_rate': _ratio(second_chance_pts, scoring_pts, 0.12)
+    }
+
+    return np.column_stack([np.asarray(columns[name], dtype=float) for name in FEATURE_NAMES])
+
+
+def build_feature_matrix(season: str = '2025-26',
+                         team_ids: Optional[Sequence[int]] = None) -> Tuple[List[int], np.ndarray]:
+    """
+    Build the raw feature matrix for all teams with one bulk query.
+
+    Season averages come from team_season_stats; box score averages and pace
+    variance are aggregated from team_game_logs in the same query.
+
+    Args:
+        season: NBA season (e.g., '2025-26')
+        team_ids: Teams to include (default: every team from get_all_teams())
+
+    Returns:
+        (team_ids, matrix): row i of the (n, 20) matrix holds the raw features of
+        team_ids[i], in FEATURE_NAMES order. Teams without season stats are left out.
+    """
+    if team_ids is None:
+        team_ids = [team['id'] for team in get_all_teams()]
+    team_ids = list(team_ids)
+    if not team_ids:
+        return [], np.empty((0, len(FEATURE_NAMES)))
+
+    conn = _get_nba_connection()
+    cursor = conn.cursor()
+
+    placeholders = ','.join('?' * len(team_ids))
+    cursor.execute(f"""
+        SELECT
+            s.team_id,
+            s.pace, s.def_rtg, s.fg3a,
+            s.fg2a + s.fg3a as fga, s.fg2m + s.fg3m as fgm,
+            s.fta, s.assists, s.turnovers, s.steals, s.blocks, s.ppg,
+            g.avg_paint_pts, g.avg_fastbreak_pts, g.avg_second_chance_pts,
+            g.avg_oreb, g.avg_dreb, g.avg_opp_oreb, g.avg_opp_dreb,
+            g.def_three_pct, g.avg_pts,
+            g.pace_games, g.pace_sum, g.pace_sum_sq
+        FROM team_season_stats s
+        LEFT JOIN (
+            SELECT
+                team_id,
+                AVG(points_in_paint) as avg_paint_pts,
+                AVG(fast_break_points) as avg_fastbreak_pts,
+                AVG(second_chance_points) as avg_second_chance_pts,
+                AVG(offensive_rebounds) as avg_oreb,
+                AVG(defensive_rebounds) as avg_dreb,
+                AVG(opp_offensive_rebounds) as avg_opp_oreb,
+                AVG(opp_defensive_rebounds) as avg_opp_dreb,
+                SUM(opp_fg3m) * 1.0 / NULLIF(SUM(opp_fg3a), 0) as def_three_pct,
+                AVG(team_pts) as avg_pts,
+                COUNT(pace) as pace_games,
+                SUM(pace) as pace_sum,
+                SUM(pace * pace) as pace_sum_sq
+            FROM team_game_logs
+            WHERE season = ?
+            GROUP BY team_id
+        ) g ON g.team_id = s.team_id
+        WHERE s.season = ? AND s.split_type = 'overall'
+          AND s.team_id IN ({placeholders})
+    """, (season, season, *team_ids))
+
+    rows_by_team = {row[0]: row[1:] for row in cursor.fetchall()}
+    conn.close()
+
+    for team_id in team_ids:
+        if team_id not in rows_by_team:
+            print(f"[Similarity] No season stats for team {team_id}")
+
+    found_ids = [team_id for team_id in team_ids if team_id in rows_by_team]
+    if not found_ids:
+        return [], np.empty((0, len(FEATURE_NAMES)))
+
+    # NULLs become NaN; _fill() applies the same defaults as the per-team code did
+    data = np.array([rows_by_team[team_id] for team_id in found_ids], dtype=float)
+    (pace, drtg, fg3a, fga, fgm, fta, ast, tov, stl, blk, pts_pg,
+     paint_pts, fastbreak_pts, second_chance_pts,
+     avg_oreb, avg_dreb, avg_opp_oreb, avg_opp_dreb,
+     def_three_pct, avg_pts,
+     pace_games, pace_sum, pace_sum_sq) = data.T
+
+    # pace_variance: population STDDEV of game pace, 0.0 with fewer than 5 games
+    pace_games = np.nan_to_num(pace_games)
+    enough_games = pace_games >= 5
+    safe_games = np.where(enough_games, pace_games, 1.0)
+    pace_mean = np.nan_to_num(pace_sum) / safe_games
+    pace_var = np.maximum(np.nan_to_num(pace_sum_sq) / safe_games - pace_mean ** 2, 0.0)
+    pace_variance = np.where(enough_games, np.sqrt(pace_var), 0.0)
+
+    pace = _fill(pace, 98.0)
+    drtg = _fill(drtg, 110.0)
+
+    raw = _raw_feature_matrix(
+        pace=pace,
+        pace_variance=pace_variance,
+        fg3a=_fill(fg3a, 30.0),
+        fga=_fill(fga, 85.0),
+        fgm=_fill(fgm, 38.0),
+        fta=_fill(fta, 20.0),
+        ast=_fill(ast, 23.0),
+        tov=_fill(tov, 13.0),
+        stl=_fill(stl, 7.0),
+        blk=_fill(blk, 5.0),
+        paint_pts=_fill(paint_pts, 50.0),
+        fastbreak_pts=_fill(fastbreak_pts, 12.0),
+        second_chance_pts=_fill(second_chance_pts, 12.0),
+        scoring_pts=_fill(pts_pg, 110.0),
+        rim_pts=_fill(avg_pts, 110.0),
+        oreb=_fill(avg_oreb, 10.0),
+        dreb=_fill(avg_dreb, 33.0),
+        opp_oreb=_fill(avg_opp_oreb, 10.0),
+        opp_dreb=_fill(avg_opp_dreb, 33.0),
+        def_paint_pts_allowed=115 - drtg,  # Proxy, inverted
+        def_three_pct_allowed=_fill(def_three_pct, 0.36)  # SUM(opp_fg3m) / SUM(opp_fg3a)
+    )
+
+    return found_ids, raw
+
+
 def compute_team_feature_vector(team_id: int, season: str = '2025-26') -> Optional[Dict]:
     """
-    Compute 20-dimensional feature vector for a team.
+    Compute the 20-dimensional raw feature vector for a single team.
+
+    Single-row view of build_feature_matrix(); use that directly when
+    computing features for more than one team.
 
     Returns:
         {
             'team_id': int,
-            'features': [float, ...],  # 20 values, 0-1 normalized
-            'feature_names': [str, ...],
+            'raw_features': {feature_name: float, ...},  # unnormalized
             'season': str
         }
+        or None if the team has no season stats
     """
-    import os
-    import sqlite3
+    team_ids, raw = build_feature_matrix(season, [team_id])
+    if not team_ids:
+        return None
 
-    # Get team season stats from NBA database
-    nba_db_path = os.path.join(os.path.dirname(__file__), '../data/nba_data.db')
-    conn = sqlite3.connect(nba_db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    return {
+        'team_id': team_id,
+        'raw_features': dict(zip(FEATURE_NAMES, raw[0].tolist())),
+        'season': season
+    }
 
-    # Fetch season averages
-    cursor.execute("""
-        SELECT
-            pace, off_rtg, def_rtg,
-            fg3a, fg3m, fg3_pct,
-            fg2a + fg3a as fga, fg2m + fg3m as fgm,
-            fta, ftm,
-            assists, turnovers,
-            rebounds, steals, blocks,
-            ppg
-        FROM team_season_stats
-        WHERE team_id = ? AND season = ? AND split_type = 'overall'
-    """, (team_id, season))
 
-    stats = cursor.fetchone()
-    if not stats:
-        print(f"[Similarity] No season stats for team {team_id}")
-        conn.close()
-        return None
+def load_season_game_logs(season: str = '2025-26',
+                          team_ids: Optional[Sequence[int]] = None) -> Dict[str, np.ndarray]:
+    """
+    Load a season of team_game_logs into column arrays with one query.
 
-    # Fetch box score aggregates AND game-by-game data for variance/advanced stats
-    cursor.execute("""
-        SELECT
-            AVG(points_in_paint) as avg_paint_pts,
-            AVG(fast_break_points) as avg_fastbreak_pts,
-            AVG(second_chance_points) as avg_second_chance_pts,
-            AVG(offensive_rebounds) as avg_oreb,
-            AVG(defensive_rebounds) as avg_dreb,
-            AVG(opp_offensive_rebounds) as avg_opp_oreb,
-            AVG(opp_defensive_rebounds) as avg_opp_dreb,
-            SUM(opp_fg3m) * 1.0 / NULLIF(SUM(opp_fg3a), 0) as def_three_pct,
-            AVG(team_pts) as avg_pts
-        FROM team_game_logs
-        WHERE team_id = ? AND season = ?
-        GROUP BY team_id
-    """, (team_id, season))
+    Rows are ordered by team, most recent game first, which is what the
+    window modes (last20/last10) rely on.
 
-    box_stats = cursor.fetchone()
+    Returns:
+        {
+            'team_id': int array,
+            'opponent_team_id': int array (-1 where unknown),
+            'game_date': object array of date strings,
+            'stats': float array (games x len(_CONDITIONAL_LOG_COLUMNS)), NULL as NaN
+        }
+    """
+    conn = _get_nba_connection()
+    cursor = conn.cursor()
 
-    # Fetch game-by-game pace for variance calculation
-    cursor.execute("""
-        SELECT pace
+    query = f"""
+        SELECT team_id, opponent_team_id, game_date, {', '.join(_CONDITIONAL_LOG_COLUMNS)}
         FROM team_game_logs
-        WHERE team_id = ? AND season = ? AND pace IS NOT NULL
-        ORDER BY game_date
-    """, (team_id, season))
-
-    pace_values = [row[0] for row in cursor.fetchall()]
+        WHERE season = ? AND team_pts IS NOT NULL
+    """
+    params = [season]
+    if team_ids is not None:
+        query += f" AND team_id IN ({','.join('?' * len(team_ids))})"
+        params.extend(team_ids)
+    query += " ORDER BY team_id, game_date DESC"
 
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
     conn.close()
 
-    # Extract values with defaults
-    pace = stats[0] if stats[0] else 98.0
-    ortg = stats[1] if stats[1] else 110.0
-    drtg = stats[2] if stats[2] else 110.0
-    fg3a = stats[3] if stats[3] else 30.0
-    fg3m = stats[4] if stats[4] else 11.0
-    fga = stats[6] if stats[6] else 85.0
-    fgm = stats[7] if stats[7] else 38.0
-    fta = stats[8] if stats[8] else 20.0
-    ftm = stats[9] if stats[9] else 15.0
-    ast = stats[10] if stats[10] else 23.0
-    tov = stats[11] if stats[11] else 13.0
-    reb = stats[12] if stats[12] else 43.0
-    stl = stats[13] if stats[13] else 7.0
-    blk = stats[14] if stats[14] else 5.0
-    pts_pg = stats[15] if stats[15] else 110.0
-
-    paint_pts = box_stats[0] if box_stats and box_stats[0] else 50.0
-    fastbreak_pts = box_stats[1] if box_stats and box_stats[1] else 12.0
-    second_chance_pts = box_stats[2] if box_stats and box_stats[2] else 12.0
-    avg_oreb = box_stats[3] if box_stats and box_stats[3] else 10.0
-    avg_dreb = box_stats[4] if box_stats and box_stats[4] else 33.0
-    avg_opp_oreb = box_stats[5] if box_stats and box_stats[5] else 10.0
-    avg_opp_dreb = box_stats[6] if box_stats and box_stats[6] else 33.0
-    def_three_pct = box_stats[7] if box_stats and box_stats[7] else 0.36
-    avg_pts = box_stats[8] if box_stats and box_stats[8] else 110.0
-
-    # ===== REAL FEATURE COMPUTATIONS (replacing 7 placeholders) =====
-
-    # 1) pace_variance: Standard deviation of pace from game logs
-    # Use STDDEV if >= 5 games, else 0.0 (insufficient data)
-    if len(pace_values) >= 5:
-        pace_mean = sum(pace_values) / len(pace_values)
-        pace_variance = math.sqrt(sum((p - pace_mean) ** 2 for p in pace_values) / len(pace_values))
-    else:
-        pace_variance = 0.0
-
-    # 2) oreb_pct: Offensive rebound percentage
-    # Formula: OREB / (OREB + Opp_DREB)
-    oreb_opportunities = avg_oreb + avg_opp_dreb
-    oreb_pct = avg_oreb / oreb_opportunities if oreb_opportunities > 0 else 0.23
-
-    # 3) dreb_pct: Defensive rebound percentage
-    # Formula: DREB / (DREB + Opp_OREB)
-    dreb_opportunities = avg_dreb + avg_opp_oreb
-    dreb_pct = avg_dreb / dreb_opportunities if dreb_opportunities > 0 else 0.77
-
-    # 4) def_three_pct_allowed: Opponent 3PT% allowed
-    # Already computed from game logs as SUM(opp_fg3m) / SUM(opp_fg3a)
-    # def_three_pct is from box_stats query above
-
-    # 5) rim_attempt_rate: PROXY using points in paint
-    # Since we lack shot zone data, estimate rim attempts as:
-    # rim_attempt_rate ≈ (points_in_paint / team_pts)
-    # This assumes paint scoring correlates with rim attempts
-    rim_attempt_rate = paint_pts / avg_pts if avg_pts > 0 else 0.30
-    # Clamp to [0, 1]
-    rim_attempt_rate = max(0.0, min(1.0, rim_attempt_rate))
-
-    # 6) midrange_rate: PROXY computed as residual
-    # midrange ≈ 1 - three_pt_rate - rim_attempt_rate
-    # Since 3PT% = FG3A/FGA and rim_rate is paint_pts/pts, this is imperfect but best available
-    three_pt_rate = fg3a / fga if fga > 0 else 0.35
-    midrange_rate = 1.0 - three_pt_rate - rim_attempt_rate
-    # Clamp to [0, 1]
-    midrange_rate = max(0.0, min(1.0, midrange_rate))
-
-    # 7) fouls_committed_rate: NO PF data available
-    # Proxy: Use turnover rate as weak correlate (high TO teams often play aggressive)
-    # Better option: Use league average constant 0.20 with TODO
-    # Going with constant since no PF data exists
-    fouls_committed_rate = 0.20  # TODO: Add PF column to team_game_logs for real calculation
-
-    # ===== END REAL FEATURE COMPUTATIONS =====
-
-    # Compute remaining features (unchanged)
-    paint_scoring_rate = paint_pts / pts_pg if pts_pg > 0 else 0.45
-    ast_ratio = ast / fgm if fgm > 0 else 0.6
-    ast_to_ratio = ast / tov if tov > 0 else 1.7
-    turnover_rate = tov / pace if pace > 0 else 0.13
-    fta_rate = fta / fga if fga > 0 else 0.23
-    fouls_drawn_rate = fta / pace if pace > 0 else 0.20
-    fastbreak_pts_rate = fastbreak_pts / pts_pg if pts_pg > 0 else 0.12
-    second_chance_pts_rate = second_chance_pts / pts_pg if pts_pg > 0 else 0.12
-
-    # Build feature vector (will normalize later across all teams)
-    raw_features = {
-        'pace': pace,
-        'pace_variance': pace_variance,  # REAL: STDDEV of pace from game logs
-        'three_pt_rate': three_pt_rate,
-        'midrange_rate': midrange_rate,  # REAL: Residual proxy (1 - 3pt - rim)
-        'paint_scoring_rate': paint_scoring_rate,
-        'rim_attempt_rate': rim_attempt_rate,  # REAL: Proxy (paint_pts / pts)
-        'ast_ratio': ast_ratio,
-        'ast_to_ratio': ast_to_ratio,
-        'turnover_rate': turnover_rate,
-        'fta_rate': fta_rate,
-        'fouls_drawn_rate': fouls_drawn_rate,
-        'fouls_committed_rate': fouls_committed_rate,  # Still placeholder (no PF data)
-        'oreb_pct': oreb_pct,  # REAL: OREB / (OREB + Opp_DREB)
-        'dreb_pct': dreb_pct,  # REAL: DREB / (DREB + Opp_OREB)
-        'def_paint_pts_allowed': 115 - drtg,  # Proxy, inverted
-        'def_three_pct_allowed': def_three_pct,  # REAL: SUM(opp_fg3m) / SUM(opp_fg3a)
-        'steals_per_game': stl,
-        'blocks_per_game': blk,
-        'fastbreak_pts_rate': fastbreak_pts_rate,
-        'second_chance_pts_rate': second_chance_pts_rate
-    }
-
     return {
-        'team_id': team_id,
-        'raw_features': raw_features,
-        'season': season
+        'team_id': np.array([row[0] for row in rows], dtype=np.int64),
+        'opponent_team_id': np.array([row[1] if row[1] is not None else -1 for row in rows], dtype=np.int64),
+        'game_date': np.array([row[2] for row in rows], dtype=object),
+        'stats': np.array([row[3:] for row in rows], dtype=float).reshape(len(rows), len(_CONDITIONAL_LOG_COLUMNS))
     }
 
 
+def build_conditional_feature_matrix(
+    logs: Dict[str, np.ndarray],
+    team_ids: Sequence[int],
+    opponent_team_ids: Sequence[int],
+    window_mode: str = 'season'
+) -> Tuple[List[int], np.ndarray, np.ndarray, List[Tuple[str, str]]]:
+    """
+    Raw feature matrix per team using ONLY games against the given opponents.
+
+    Args:
+        logs: Output of load_season_game_logs()
+        team_ids: Teams to build vectors for
+        opponent_team_ids: Opponents to filter games by (e.g. one cluster)
+        window_mode: 'season', 'last20', 'last10' (applied after filtering)
+
+    Returns:
+        (team_ids, raw_matrix, games_used, date_ranges) for the teams with at
+        least MIN_CONDITIONAL_GAMES qualifying games, in the order given
+    """
+    mask = (np.isin(logs['opponent_team_id'], np.asarray(opponent_team_ids, dtype=np.int64))
+            & np.isin(logs['team_id'], np.asarray(team_ids, dtype=np.int64)))
+    teams = logs['team_id'][mask]
+    stats = logs['stats'][mask]
+    dates = logs['game_date'][mask]
+
+    # Rows are grouped by team, most recent first: a row's offset inside its
+    # team's run is its recency rank
+    limit = _WINDOW_LIMITS[window_mode]
+    if limit is not None and len(teams):
+        positions = np.arange(len(teams))
+        run_starts = np.r_[True, teams[1:] != teams[:-1]]
+        recency = positions - np.maximum.accumulate(np.where(run_starts, positions, 0))
+        keep = recency < limit
+        teams, stats, dates = teams[keep], stats[keep], dates[keep]
+
+    empty = ([], np.empty((0, len(FEATURE_NAMES))), np.empty(0, dtype=np.int64), [])
+    if not len(teams):
+        return empty
+
+    group_ids, first_rows, group_index, games = np.unique(
+        teams, return_index=True, return_inverse=True, return_counts=True)
+    sufficient = games >= MIN_CONDITIONAL_GAMES
+    if not sufficient.any():
+        return empty
+
+    # NULL stats count as zero but the game still counts toward the average
+    totals = np.zeros((len(group_ids), stats.shape[1]))
+    np.add.at(totals, group_index, np.nan_to_num(stats))
+    avg = totals / games[:, None]
+
+    def col(name):
+        return avg[:, _LOG_COL[name]]
+
+    # Pace variance over games with a recorded (non-zero) pace
+    pace = stats[:, _LOG_COL['pace']]
+    has_pace = ~np.isnan(pace) & (pace != 0)
+    pace = np.where(has_pace, pace, 0.0)
+    pace_games = np.bincount(group_index, weights=has_pace.astype(float), minlength=len(group_ids))
+    enough_games = pace_games >= 5
+    safe_games = np.where(enough_games, pace_games, 1.0)
+    pace_mean = np.bincount(group_index, weights=pace, minlength=len(group_ids)) / safe_games
+    pace_var = np.maximum(
+        np.bincount(group_index, weights=pace * pace, minlength=len(group_ids)) / safe_games - pace_mean ** 2, 0.0)
+    pace_variance = np.where(enough_games, np.sqrt(pace_var), 0.0)
+
+    avg_pts = col('team_pts')
+    raw = _raw_feature_matrix(
+        pace=col('pace'),
+        pace_variance=pace_variance,
+        fg3a=col('fg3a'),
+        fga=col('fga'),
+        fgm=col('fgm'),
+        fta=col('fta'),
+        ast=col('assists'),
+        tov=col('turnovers'),
+        stl=col('steals'),
+        blk=col('blocks'),
+        paint_pts=col('points_in_paint'),
+        fastbreak_pts=col('fast_break_points'),
+        second_chance_pts=col('second_chance_points'),
+        scoring_pts=avg_pts,
+        rim_pts=avg_pts,
+        oreb=col('offensive_rebounds'),
+        dreb=col('defensive_rebounds'),
+        opp_oreb=col('opp_offensive_rebounds'),
+        opp_dreb=col('opp_defensive_rebounds'),
+        # Proxy: higher opp_pts = worse defense, so invert
+        def_paint_pts_allowed=115 - (col('opp_pts') * 110 / 115),
+        def_three_pct_allowed=_ratio(col('opp_fg3m'), col('opp_fg3a'), 0.36)
+    )
+
+    # Most recent game is first in each run, oldest is last
+    newest = dates[first_rows]
+    oldest = dates[first_rows + games - 1]
+
+    row_of = {int(team_id): i for i, team_id in enumerate(group_ids) if sufficient[i]}
+    order = [row_of[team_id] for team_id in team_ids if team_id in row_of]
+
+    return ([int(group_ids[i]) for i in order],
+            raw[order],
+            games[order],
+            [(oldest[i], newest[i]) for i in order])
+
+
+def _get_cluster_members(cursor, season: str) -> Dict[int, List[int]]:
+    """Team IDs assigned to each cluster: {cluster_id: [team_id, ...]}"""
+    cursor.execute("""
+        SELECT cluster_id, team_id
+        FROM team_cluster_assignments
+        WHERE season = ?
+    """, (season,))
+
+    members = {}
+    for row in cursor.fetchall():
+        members.setdefault(row[0], []).append(row[1])
+    return members
+
+
 def compute_team_feature_vector_vs_cluster(
     team_id: int,
     season: str,
@@ -263,177 +477,32 @@ def compute_team_feature_vector_vs_cluster(
         }
         or None if insufficient games (<5)
     """
-    import os
-    import sqlite3
-
-    nba_db_path = os.path.join(os.path.dirname(__file__), '../data/nba_data.db')
-    sim_db_path = os.path.join(os.path.dirname(__file__), '../data/team_similarity.db')
-
-    nba_conn = sqlite3.connect(nba_db_path)
-    nba_conn.row_factory = sqlite3.Row
-    nba_cursor = nba_conn.cursor()
-
     sim_conn = get_connection()
-    sim_cursor = sim_conn.cursor()
-
-    # Step 1: Get opponent team IDs that belong to the target cluster
-    sim_cursor.execute("""
-        SELECT team_id
-        FROM team_cluster_assignments
-        WHERE cluster_id = ? AND season = ?
-    """, (opponent_cluster_id, season))
-
-    opponent_team_ids = [row[0] for row in sim_cursor.fetchall()]
+    opponent_team_ids = _get_cluster_members(sim_conn.cursor(), season).get(opponent_cluster_id, [])
     sim_conn.close()
 
     if not opponent_team_ids:
-        nba_conn.close()
         return None
 
-    # Step 2: Fetch games where opponent is in that cluster
-    placeholders = ','.join('?' * len(opponent_team_ids))
-    query = f"""
-        SELECT game_id, game_date, team_pts, opp_pts, pace,
-               fg3a, fg3m, fga, fgm, fta, ftm,
-               assists, turnovers, steals, blocks,
-               offensive_rebounds, defensive_rebounds,
-               opp_offensive_rebounds, opp_defensive_rebounds,
-               opp_fg3m, opp_fg3a,
-               points_in_paint, fast_break_points, second_chance_points
-        FROM team_game_logs
-        WHERE team_id = ? AND season = ?
-          AND opponent_team_id IN ({placeholders})
-          AND team_pts IS NOT NULL
-        ORDER BY game_date DESC
-    """
-
-    params = [team_id, season] + opponent_team_ids
-    nba_cursor.execute(query, params)
-    games = nba_cursor.fetchall()
-
-    # Apply window mode
-    if window_mode == 'last20':
-        games = games[:20]
-    elif window_mode == 'last10':
-        games = games[:10]
-    # else 'season' = use all
-
-    games_count = len(games)
-
-    # Step 3: Check minimum games threshold
-    if games_count < 5:
-        nba_conn.close()
-        return None
+    logs = load_season_game_logs(season, [team_id])
+    team_ids, raw, games_used, date_ranges = build_conditional_feature_matrix(
+        logs, [team_id], opponent_team_ids, window_mode)
 
-    # Step 4: Aggregate stats from filtered games
-    if games_count == 0:
-        nba_conn.close()
+    if not team_ids:
         return None
 
-    # Calculate averages
-    total_pts = sum(g['team_pts'] for g in games)
-    avg_pace = sum(g['pace'] for g in games if g['pace']) / games_count
-    avg_fg3a = sum(g['fg3a'] for g in games if g['fg3a']) / games_count
-    avg_fg3m = sum(g['fg3m'] for g in games if g['fg3m']) / games_count
-    avg_fga = sum(g['fga'] for g in games if g['fga']) / games_count
-    avg_fgm = sum(g['fgm'] for g in games if g['fgm']) / games_count
-    avg_fta = sum(g['fta'] for g in games if g['fta']) / games_count
-    avg_ast = sum(g['assists'] for g in games if g['assists']) / games_count
-    avg_tov = sum(g['turnovers'] for g in games if g['turnovers']) / games_count
-    avg_stl = sum(g['steals'] for g in games if g['steals']) / games_count
-    avg_blk = sum(g['blocks'] for g in games if g['blocks']) / games_count
-    avg_pts = total_pts / games_count
-
-    avg_oreb = sum(g['offensive_rebounds'] for g in games if g['offensive_rebounds']) / games_count
-    avg_dreb = sum(g['defensive_rebounds'] for g in games if g['defensive_rebounds']) / games_count
-    avg_opp_oreb = sum(g['opp_offensive_rebounds'] for g in games if g['opp_offensive_rebounds']) / games_count
-    avg_opp_dreb = sum(g['opp_defensive_rebounds'] for g in games if g['opp_defensive_rebounds']) / games_count
-
-    avg_opp_fg3m = sum(g['opp_fg3m'] for g in games if g['opp_fg3m']) / games_count
-    avg_opp_fg3a = sum(g['opp_fg3a'] for g in games if g['opp_fg3a']) / games_count
-
-    avg_paint_pts = sum(g['points_in_paint'] for g in games if g['points_in_paint']) / games_count
-    avg_fastbreak = sum(g['fast_break_points'] for g in games if g['fast_break_points']) / games_count
-    avg_second_chance = sum(g['second_chance_points'] for g in games if g['second_chance_points']) / games_count
-
-    # Pace variance
-    pace_values = [g['pace'] for g in games if g['pace']]
-    if len(pace_values) >= 5:
-        pace_mean = sum(pace_values) / len(pace_values)
-        pace_variance = math.sqrt(sum((p - pace_mean) ** 2 for p in pace_values) / len(pace_values))
-    else:
-        pace_variance = 0.0
-
-    # Calculate proxy defensive rating (simplified: avg opponent pts allowed)
-    avg_opp_pts = sum(g['opp_pts'] for g in games) / games_count
-    # Proxy: higher opp_pts = worse defense, so invert for def_paint_pts_allowed
-    def_paint_pts_allowed = 115 - (avg_opp_pts * 110 / 115)  # Rough proxy
-
-    nba_conn.close()
-
-    # Step 5: Compute raw features (same 20D vector as global)
-    three_pt_rate = avg_fg3a / avg_fga if avg_fga > 0 else 0.35
-    paint_scoring_rate = avg_paint_pts / avg_pts if avg_pts > 0 else 0.45
-    rim_attempt_rate = avg_paint_pts / avg_pts if avg_pts > 0 else 0.30
-    rim_attempt_rate = max(0.0, min(1.0, rim_attempt_rate))
-    midrange_rate = 1.0 - three_pt_rate - rim_attempt_rate
-    midrange_rate = max(0.0, min(1.0, midrange_rate))
-
-    ast_ratio = avg_ast / avg_fgm if avg_fgm > 0 else 0.6
-    ast_to_ratio = avg_ast / avg_tov if avg_tov > 0 else 1.7
-    turnover_rate = avg_tov / avg_pace if avg_pace > 0 else 0.13
-    fta_rate = avg_fta / avg_fga if avg_fga > 0 else 0.23
-    fouls_drawn_rate = avg_fta / avg_pace if avg_pace > 0 else 0.20
-
-    oreb_opportunities = avg_oreb + avg_opp_dreb
-    oreb_pct = avg_oreb / oreb_opportunities if oreb_opportunities > 0 else 0.23
-
-    dreb_opportunities = avg_dreb + avg_opp_oreb
-    dreb_pct = avg_dreb / dreb_opportunities if dreb_opportunities > 0 else 0.77
-
-    def_three_pct_allowed = avg_opp_fg3m / avg_opp_fg3a if avg_opp_fg3a > 0 else 0.36
-
-    fastbreak_pts_rate = avg_fastbreak / avg_pts if avg_pts > 0 else 0.12
-    second_chance_pts_rate = avg_second_chance / avg_pts if avg_pts > 0 else 0.12
-
-    raw_features = {
-        'pace': avg_pace,
-        'pace_variance': pace_variance,
-        'three_pt_rate': three_pt_rate,
-        'midrange_rate': midrange_rate,
-        'paint_scoring_rate': paint_scoring_rate,
-        'rim_attempt_rate': rim_attempt_rate,
-        'ast_ratio': ast_ratio,
-        'ast_to_ratio': ast_to_ratio,
-        'turnover_rate': turnover_rate,
-        'fta_rate': fta_rate,
-        'fouls_drawn_rate': fouls_drawn_rate,
-        'fouls_committed_rate': 0.20,  # Placeholder
-        'oreb_pct': oreb_pct,
-        'dreb_pct': dreb_pct,
-        'def_paint_pts_allowed': def_paint_pts_allowed,
-        'def_three_pct_allowed': def_three_pct_allowed,
-        'steals_per_game': avg_stl,
-        'blocks_per_game': avg_blk,
-        'fastbreak_pts_rate': fastbreak_pts_rate,
-        'second_chance_pts_rate': second_chance_pts_rate
-    }
-
-    # Date range
-    dates = [g['game_date'] for g in games]
-    date_range = (min(dates), max(dates)) if dates else (None, None)
-
     return {
         'team_id': team_id,
-        'raw_features': raw_features,
+        'raw_features': dict(zip(FEATURE_NAMES, raw[0].tolist())),
         'season': season,
         'opponent_cluster_id': opponent_cluster_id,
-        'games_used': games_count,
-        'date_range': date_range
+        'games_used': int(games_used[0]),
+        'date_range': date_ranges[0]
     }
 
 
-def refresh_conditional_vectors(season: str = '2025-26', window_mode: str = 'season'):
+def refresh_conditional_vectors(season: str = '2025-26', window_mode: str = 'season',
+                                logs: Optional[Dict[str, np.ndarray]] = None):
     """
     Compute and store conditional feature vectors for all teams vs each opponent cluster.
 
@@ -445,6 +514,7 @@ def refresh_conditional_vectors(season: str = '2025-26', window_mode: str = 'sea
     Args:
         season: NBA season (e.g., '2025-26')
         window_mode: 'season', 'last20', or 'last10'
+        logs: Preloaded load_season_game_logs(season), to share across window modes
 
     IMPORTANT: Normalization is done separately per opponent_cluster_id.
     Do NOT normalize conditional vectors against global vectors.
@@ -458,130 +528,72 @@ def refresh_conditional_vectors(season: str = '2025-26', window_mode: str = 'sea
     teams = get_all_teams(season)
     if not teams:
         print(f"[Conditional Similarity] No teams found for season {season}")
+        conn.close()
         return
 
-    # Get all cluster IDs (should be 1-6)
+    # Get all clusters (should be 1-6)
     cursor.execute("""
-        SELECT DISTINCT cluster_id
+        SELECT cluster_id, cluster_name
         FROM team_similarity_clusters
         WHERE season = ?
         ORDER BY cluster_id
     """, (season,))
 
-    cluster_ids = [row[0] for row in cursor.fetchall()]
+    clusters = [(row[0], row[1]) for row in cursor.fetchall()]
 
-    if not cluster_ids:
+    if not clusters:
         print(f"[Conditional Similarity] No clusters found for season {season}. Run refresh_similarity_engine() first.")
+        conn.close()
         return
 
-    print(f"[Conditional Similarity] Processing {len(teams)} teams against {len(cluster_ids)} opponent clusters...")
+    print(f"[Conditional Similarity] Processing {len(teams)} teams against {len(clusters)} opponent clusters...")
+
+    if logs is None:
+        logs = load_season_game_logs(season)
+    members = _get_cluster_members(cursor, season)
+    team_ids = [team['id'] for team in teams]
 
     # Clear old conditional vectors for this season and window_mode
     cursor.execute("""
         DELETE FROM team_feature_vectors
         WHERE season = ? AND window_mode = ? AND opponent_cluster_id IS NOT NULL
     """, (season, window_mode))
-    conn.commit()
 
-    feature_names = list(FEATURE_WEIGHTS.keys())
     total_stored = 0
     total_skipped = 0
 
     # Process each opponent cluster separately
-    for opponent_cluster_id in cluster_ids:
-        cursor.execute("""
-            SELECT cluster_name FROM team_similarity_clusters
-            WHERE cluster_id = ? AND season = ?
-        """, (opponent_cluster_id, season))
-
-        cluster_row = cursor.fetchone()
-        cluster_name = cluster_row[0] if cluster_row else f"Cluster {opponent_cluster_id}"
-
+    for opponent_cluster_id, cluster_name in clusters:
         print(f"\n[Conditional Similarity] Processing opponent cluster {opponent_cluster_id}: {cluster_name}")
 
-        # Step 1: Compute raw conditional vectors for all teams
-        raw_conditional_features = []
-
-        for team in teams:
-            team_id = team['id']
+        # Step 1: Raw conditional vectors for all teams with 5+ games vs this cluster
+        stored_ids, raw, games_used, _ = build_conditional_feature_matrix(
+            logs, team_ids, members.get(opponent_cluster_id, []), window_mode)
 
-            # Compute conditional vector (returns None if <5 games)
-            conditional_data = compute_team_feature_vector_vs_cluster(
-                team_id=team_id,
-                season=season,
-                window_mode=window_mode,
-                opponent_cluster_id=opponent_cluster_id
-            )
-
-            if conditional_data:
-                raw_conditional_features.append(conditional_data)
-
-        if not raw_conditional_features:
+        if not stored_ids:
             print(f"  No teams with sufficient data vs cluster {opponent_cluster_id} (need 5+ games)")
             continue
 
-        print(f"  {len(raw_conditional_features)}/{len(teams)} teams have sufficient data (5+ games)")
+        print(f"  {len(stored_ids)}/{len(teams)} teams have sufficient data (5+ games)")
 
         # Step 2: Normalize vectors WITHIN this cluster lens only
-        # Find min/max for each feature across teams in THIS cluster lens
-        feature_mins = {name: float('inf') for name in feature_names}
-        feature_maxs = {name: float('-inf') for name in feature_names}
-
-        for team_data in raw_conditional_features:
-            for name in feature_names:
-                val = team_data['raw_features'][name]
-                feature_mins[name] = min(feature_mins[name], val)
-                feature_maxs[name] = max(feature_maxs[name], val)
-
-        # Step 3: Normalize and store each team's conditional vector
-        for team_data in raw_conditional_features:
-            team_id = team_data['team_id']
-            raw_features = team_data['raw_features']
-
-            # Normalize features
-            normalized_features = []
-            for name in feature_names:
-                raw_val = raw_features[name]
-                norm_val = normalize_value(raw_val, feature_mins[name], feature_maxs[name])
-                normalized_features.append(norm_val)
-
-            # Convert to JSON for storage
-            feature_vector_json = json.dumps(normalized_features)
-
-            # Extract specific features for dedicated columns (using actual feature names from FEATURE_WEIGHTS)
-            pace_norm = normalized_features[feature_names.index('pace')]
-            three_pt_rate = normalized_features[feature_names.index('three_pt_rate')]
-            paint_scoring_rate = normalized_features[feature_names.index('paint_scoring_rate')]
-            ast_ratio = normalized_features[feature_names.index('ast_ratio')]
-            # Use def_paint_pts_allowed as a proxy for defensive rating
-            def_rating_norm = normalized_features[feature_names.index('def_paint_pts_allowed')]
-
-            # Store in database
-            cursor.execute("""
-                INSERT INTO team_feature_vectors
-                (team_id, feature_vector, pace_norm, three_pt_rate, paint_scoring_rate,
-                 ast_ratio, def_rating_norm, season, window_mode, opponent_cluster_id, games_used)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                team_id,
-                feature_vector_json,
-                pace_norm,
-                three_pt_rate,
-                paint_scoring_rate,
-                ast_ratio,
-                def_rating_norm,
-                season,
-                window_mode,
-                opponent_cluster_id,
-                team_data['games_used']
-            ))
-
-            total_stored += 1
-
-        conn.commit()
+        normalized = normalize_feature_matrix(raw)
+
+        # Step 3: Store each team's conditional vector
+        cursor.executemany("""
+            INSERT INTO team_feature_vectors
+            (team_id, feature_vector, pace_norm, three_pt_rate, paint_scoring_rate,
+             ast_ratio, def_rating_norm, season, window_mode, opponent_cluster_id, games_used)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (team_id, *_feature_vector_columns(vector), season, window_mode,
+             opponent_cluster_id, int(games))
+            for team_id, vector, games in zip(stored_ids, normalized.tolist(), games_used)
+        ])
+        total_stored += len(stored_ids)
 
         # Log teams that were skipped for this cluster
-        stored_team_ids = {t['team_id'] for t in raw_conditional_features}
+        stored_team_ids = set(stored_ids)
         skipped_teams = [t for t in teams if t['id'] not in stored_team_ids]
 
         if skipped_teams:
@@ -591,6 +603,7 @@ def refresh_conditional_vectors(season: str = '2025-26', window_mode: str = 'sea
                 skipped_names.append(f"... and {len(skipped_teams) - 5} more")
             print(f"  Skipped {len(skipped_teams)} teams with <5 games: {', '.join(skipped_names)}")
 
+    conn.commit()
     conn.close()
 
     print(f"\n[Conditional Similarity] Complete!")
@@ -620,62 +633,40 @@ def compute_all_similarity_scores_conditional(season: str = '2025-26', window_mo
     conn = get_connection()
     cursor = conn.cursor()
 
-    # Get all opponent cluster IDs that have data
+    # All conditional vectors for this window, grouped by opponent cluster
     cursor.execute("""
-        SELECT DISTINCT opponent_cluster_id
-        FROM team_feature_vectors
-        WHERE season = ? AND window_mode = ? AND opponent_cluster_id IS NOT NULL
-        ORDER BY opponent_cluster_id
+        SELECT tfv.opponent_cluster_id, tsc.cluster_name, tfv.team_id, tfv.feature_vector
+        FROM team_feature_vectors tfv
+        LEFT JOIN team_similarity_clusters tsc
+            ON tsc.cluster_id = tfv.opponent_cluster_id AND tsc.season = tfv.season
+        WHERE tfv.season = ? AND tfv.window_mode = ? AND tfv.opponent_cluster_id IS NOT NULL
+        ORDER BY tfv.opponent_cluster_id, tfv.id
     """, (season, window_mode))
 
-    cluster_ids = [row[0] for row in cursor.fetchall()]
+    vectors_by_cluster = {}
+    cluster_names = {}
+    for row in cursor.fetchall():
+        cluster_names[row[0]] = row[1] or f"Cluster {row[0]}"
+        vectors_by_cluster.setdefault(row[0], []).append((row[2], json.loads(row[3])))
 
-    if not cluster_ids:
+    if not vectors_by_cluster:
         print(f"[Conditional Similarity] No conditional vectors found. Run refresh_conditional_vectors() first.")
         conn.close()
         return
 
-    print(f"[Conditional Similarity] Processing {len(cluster_ids)} opponent clusters...")
+    print(f"[Conditional Similarity] Processing {len(vectors_by_cluster)} opponent clusters...")
 
     # Clear old conditional similarity scores for this season and window_mode
     cursor.execute("""
         DELETE FROM team_similarity_scores
         WHERE season = ? AND window_mode = ? AND opponent_cluster_id IS NOT NULL
     """, (season, window_mode))
-    conn.commit()
-
-    # Compute max possible distance (for normalization to 0-100 scale)
-    max_distance = math.sqrt(sum(FEATURE_WEIGHTS.values()))
 
     total_scores_stored = 0
 
     # Process each opponent cluster separately
-    for opponent_cluster_id in cluster_ids:
-        cursor.execute("""
-            SELECT cluster_name FROM team_similarity_clusters
-            WHERE cluster_id = ? AND season = ?
-        """, (opponent_cluster_id, season))
-
-        cluster_row = cursor.fetchone()
-        cluster_name = cluster_row[0] if cluster_row else f"Cluster {opponent_cluster_id}"
-
-        print(f"\n  Processing opponent cluster {opponent_cluster_id}: {cluster_name}")
-
-        # Retrieve all conditional vectors for this cluster
-        cursor.execute("""
-            SELECT team_id, feature_vector
-            FROM team_feature_vectors
-            WHERE season = ? AND window_mode = ? AND opponent_cluster_id = ?
-        """, (season, window_mode, opponent_cluster_id))
-
-        vectors = []
-        for row in cursor.fetchall():
-            team_id = row[0]
-            feature_vector = json.loads(row[1])  # Parse JSON array
-            vectors.append({
-                'team_id': team_id,
-                'features': feature_vector
-            })
+    for opponent_cluster_id, vectors in vectors_by_cluster.items():
+        print(f"\n  Processing opponent cluster {opponent_cluster_id}: {cluster_names[opponent_cluster_id]}")
 
         if len(vectors) < 2:
             print(f"    Skipped: Need at least 2 teams with vectors (found {len(vectors)})")
@@ -683,45 +674,68 @@ def compute_all_similarity_scores_conditional(season: str = '2025-26', window_mo
 
         print(f"    Computing pairwise similarity for {len(vectors)} teams...")
 
-        # Compute pairwise similarities
-        similarity_matrix = {}
+        team_ids = [team_id for team_id, _ in vectors]
+        features = np.array([vector for _, vector in vectors], dtype=float)
+        similarity_matrix = top_k_similar(team_ids, features)
+
+        rows = [
+            (team_id, similar_team_id, score, rank, season, window_mode, opponent_cluster_id)
+            for team_id, top_similar in similarity_matrix.items()
+            for rank, (similar_team_id, score) in enumerate(top_similar, start=1)
+        ]
+        cursor.executemany("""
+            INSERT INTO team_similarity_scores
+            (team_id, similar_team_id, similarity_score, rank, season, window_mode, opponent_cluster_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        total_scores_stored += len(rows)
 
-        for i, team_a in enumerate(vectors):
-            similarities = []
+        print(f"    Stored similarity scores for {len(similarity_matrix)} teams")
 
-            for j, team_b in enumerate(vectors):
-                if i == j:
-                    continue  # Skip self-comparison
+    conn.commit()
+    conn.close()
 
-                distance = compute_weighted_distance(team_a['features'], team_b['features'])
-                similarity = distance_to_similarity(distance, max_distance)
-                similarities.append((team_b['team_id'], similarity))
+    print(f"\n[Conditional Similarity] Complete!")
+    print(f"  Total similarity scores stored: {total_scores_stored}")
+    print(f"  Processed {len(vectors_by_cluster)} opponent clusters")
+    print(f"  Season: {season}, Window: {window_mode}")
 
-            # Sort by similarity (descending) and take top 5
-            similarities.sort(key=lambda x: x[1], reverse=True)
-            similarity_matrix[team_a['team_id']] = similarities[:5]
 
-        # Store in database
-        for team_id, top_similar in similarity_matrix.items():
-            for rank, (similar_team_id, score) in enumerate(top_similar, start=1):
-                cursor.execute("""
-                    INSERT INTO team_similarity_scores
-                    (team_id, similar_team_id, similarity_score, rank, season, window_mode, opponent_cluster_id)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (team_id, similar_team_id, score, rank, season, window_mode, opponent_cluster_id))
+def refresh_conditional_similarity(season: str = '2025-26',
+                                   window_modes: Sequence[str] = CONDITIONAL_WINDOW_MODES) -> Dict:
+    """
+    Refresh conditional vectors and similarity scores for several window modes.
 
-                total_scores_stored += 1
+    The season's game logs are loaded once and shared by every window mode.
 
-        conn.commit()
+    Returns:
+        {'window_modes': [...], 'time_seconds': float}
+    """
+    start_time = datetime.now()
 
-        print(f"    Stored similarity scores for {len(similarity_matrix)} teams")
+    logs = load_season_game_logs(season)
+    for window_mode in window_modes:
+        refresh_conditional_vectors(season, window_mode, logs=logs)
+        compute_all_similarity_scores_conditional(season, window_mode)
 
-    conn.close()
+    return {
+        'window_modes': list(window_modes),
+        'time_seconds': (datetime.now() - start_time).total_seconds()
+    }
 
-    print(f"\n[Conditional Similarity] Complete!")
-    print(f"  Total similarity scores stored: {total_scores_stored}")
-    print(f"  Processed {len(cluster_ids)} opponent clusters")
-    print(f"  Season: {season}, Window: {window_mode}")
+
+def normalize_feature_matrix(raw: np.ndarray) -> np.ndarray:
+    """
+    Min-max normalize each column of a raw feature matrix to 0-1.
+
+    Columns with no variance get 0.5, like normalize_value().
+    """
+    if not len(raw):
+        return raw.copy()
+    mins = raw.min(axis=0)
+    spans = raw.max(axis=0) - mins
+    flat = spans == 0
+    return np.where(flat, 0.5, (raw - mins) / np.where(flat, 1.0, spans))
 
 
 def normalize_all_feature_vectors(all_team_features: List[Dict]) -> List[Dict]:
@@ -734,35 +748,35 @@ def normalize_all_feature_vectors(all_team_features: List[Dict]) -> List[Dict]:
     Returns:
         List of normalized feature vectors with 'features' key
     """
-    feature_names = list(FEATURE_WEIGHTS.keys())
-
-    # Find min/max for each feature across all teams
-    feature_mins = {name: float('inf') for name in feature_names}
-    feature_maxs = {name: float('-inf') for name in feature_names}
-
-    for team_data in all_team_features:
-        for name in feature_names:
-            val = team_data['raw_features'][name]
-            feature_mins[name] = min(feature_mins[name], val)
-            feature_maxs[name] = max(feature_maxs[name], val)
-
-    # Normalize each team
-    normalized_teams = []
-    for team_data in all_team_features:
-        normalized_features = []
-        for name in feature_names:
-            raw_val = team_data['raw_features'][name]
-            norm_val = normalize_value(raw_val, feature_mins[name], feature_maxs[name])
-            normalized_features.append(norm_val)
-
-        normalized_teams.append({
+    if not all_team_features:
+        return []
+
+    raw = np.array([[team_data['raw_features'][name] for name in FEATURE_NAMES]
+                    for team_data in all_team_features], dtype=float)
+    normalized = normalize_feature_matrix(raw)
+
+    return [
+        {
             'team_id': team_data['team_id'],
-            'features': normalized_features,
-            'feature_names': feature_names,
+            'features': features,
+            'feature_names': FEATURE_NAMES,
             'season': team_data['season']
-        })
+        }
+        for team_data, features in zip(all_team_features, normalized.tolist())
+    ]
 
-    return normalized_teams
+
+def _feature_vector_columns(features: List[float]) -> Tuple:
+    """(feature_vector JSON, pace_norm, three_pt_rate, paint_scoring_rate, ast_ratio, def_rating_norm)"""
+    return (
+        json.dumps(features),
+        features[FEATURE_NAMES.index('pace')],
+        features[FEATURE_NAMES.index('three_pt_rate')],
+        features[FEATURE_NAMES.index('paint_scoring_rate')],
+        features[FEATURE_NAMES.index('ast_ratio')],
+        # def_paint_pts_allowed is the proxy for defensive rating
+        features[FEATURE_NAMES.index('def_paint_pts_allowed')]
+    )
 
 
 def compute_weighted_distance(features_a: List[float], features_b: List[float]) -> float:
@@ -775,15 +789,22 @@ def compute_weighted_distance(features_a: List[float], features_b: List[float])
     Returns:
         Distance value (0 = identical, higher = more different)
     """
-    feature_names = list(FEATURE_WEIGHTS.keys())
+    diff = np.asarray(features_a, dtype=float) - np.asarray(features_b, dtype=float)
+    return math.sqrt(float(diff * diff @ _WEIGHT_VECTOR))
+
 
-    distance_sq = 0.0
-    for i, name in enumerate(feature_names):
-        weight = FEATURE_WEIGHTS[name]
-        diff = features_a[i] - features_b[i]
-        distance_sq += weight * (diff ** 2)
+def pairwise_weighted_distances(features: np.ndarray) -> np.ndarray:
+    """
+    Weighted Euclidean distance between every pair of rows.
+
+    Args:
+        features: (n, 20) normalized feature matrix
 
-    return math.sqrt(distance_sq)
+    Returns:
+        (n, n) symmetric distance matrix with zeros on the diagonal
+    """
+    diff = features[:, None, :] - features[None, :, :]
+    return np.sqrt((diff * diff) @ _WEIGHT_VECTOR)
 
 
 def distance_to_similarity(distance: float, max_distance: float) -> float:
@@ -802,85 +823,97 @@ def distance_to_similarity(distance: float, max_distance: float) -> float:
     return max(0.0, min(100.0, similarity))  # Clamp to 0-100
 
 
-def compute_all_similarity_scores(season: str = '2025-26') -> Dict[int, List[Tuple[int, float]]]:
+def top_k_similar(team_ids: Sequence[int], features: np.ndarray,
+                  k: int = 5) -> Dict[int, List[Tuple[int, float]]]:
     """
-    Compute pairwise similarity for all teams and store top 5 for each.
+    Top-k most similar teams for every team in a normalized feature matrix.
+
+    Args:
+        team_ids: Team ID of each row
+        features: (n, 20) normalized feature matrix
+        k: Number of similar teams to keep per team
 
     Returns:
-        {team_id: [(similar_team_id, similarity_score), ...], ...}
+        {team_id: [(similar_team_id, similarity_score), ...], ...}, best first
     """
-    print(f"[Similarity] Computing feature vectors for all teams...")
+    n = len(team_ids)
+    k = min(k, n - 1)
+    if k <= 0:
+        return {team_id: [] for team_id in team_ids}
 
-    # Get all teams
-    teams = get_all_teams()
+    similarity = np.clip(100 * (1 - pairwise_weighted_distances(features) / MAX_DISTANCE), 0.0, 100.0)
+    np.fill_diagonal(similarity, -np.inf)  # Skip self-comparison
 
-    # Compute raw features for all teams
-    all_raw_features = []
-    for team in teams:
-        features = compute_team_feature_vector(team['id'], season)
-        if features:
-            all_raw_features.append(features)
+    candidates = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(similarity, candidates, axis=1)
+    # Best first; equal scores keep row order
+    order = np.lexsort((candidates, -top_scores), axis=1)
+    candidates = np.take_along_axis(candidates, order, axis=1)
 
-    print(f"[Similarity] Computed features for {len(all_raw_features)} teams")
+    return {
+        team_id: [(team_ids[j], float(similarity[i, j])) for j in candidates[i]]
+        for i, team_id in enumerate(team_ids)
+    }
 
-    # Normalize all vectors
-    normalized_teams = normalize_all_feature_vectors(all_raw_features)
 
-    # Compute max possible distance (for normalization)
-    max_distance = math.sqrt(sum(FEATURE_WEIGHTS.values()))  # All features maximally different
+def compute_all_similarity_scores(season: str = '2025-26',
+                                  features: Optional[Tuple[List[int], np.ndarray]] = None
+                                  ) -> Dict[int, List[Tuple[int, float]]]:
+    """
+    Compute pairwise similarity for all teams and store top 5 for each.
 
-    # Compute pairwise similarities
-    similarity_matrix = {}
+    Args:
+        season: NBA season (e.g., '2025-26')
+        features: Precomputed build_feature_matrix(season) result
 
-    for i, team_a in enumerate(normalized_teams):
-        similarities = []
+    Returns:
+        {team_id: [(similar_team_id, similarity_score), ...], ...}
+    """
+    print(f"[Similarity] Computing feature vectors for all teams...")
 
-        for j, team_b in enumerate(normalized_teams):
-            if i == j:
-                continue  # Skip self-comparison
+    team_ids, raw = features if features is not None else build_feature_matrix(season)
 
-            distance = compute_weighted_distance(team_a['features'], team_b['features'])
-            similarity = distance_to_similarity(distance, max_distance)
-            similarities.append((team_b['team_id'], similarity))
+    print(f"[Similarity] Computed features for {len(team_ids)} teams")
 
-        # Sort by similarity (descending) and take top 5
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        similarity_matrix[team_a['team_id']] = similarities[:5]
+    normalized = normalize_feature_matrix(raw)
+    similarity_matrix = top_k_similar(team_ids, normalized)
 
     # Store in database
     conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute("DELETE FROM team_similarity_scores WHERE season = ?", (season,))
-
-    for team_id, top_similar in similarity_matrix.items():
-        for rank, (similar_team_id, score) in enumerate(top_similar, start=1):
-            cursor.execute("""
-                INSERT INTO team_similarity_scores
-                (team_id, similar_team_id, similarity_score, rank, season)
-                VALUES (?, ?, ?, ?, ?)
-            """, (team_id, similar_team_id, score, rank, season))
+    # Conditional rows are owned by refresh_conditional_vectors()
+    cursor.execute("""
+        DELETE FROM team_similarity_scores
+        WHERE season = ? AND opponent_cluster_id IS NULL
+    """, (season,))
 
-    conn.commit()
+    cursor.executemany("""
+        INSERT INTO team_similarity_scores
+        (team_id, similar_team_id, similarity_score, rank, season)
+        VALUES (?, ?, ?, ?, ?)
+    """, [
+        (team_id, similar_team_id, score, rank, season)
+        for team_id, top_similar in similarity_matrix.items()
+        for rank, (similar_team_id, score) in enumerate(top_similar, start=1)
+    ])
+
+    # Also store feature vectors. NULL opponent_cluster_id never conflicts in
+    # the UNIQUE index, so replace the season's global rows explicitly.
+    cursor.execute("""
+        DELETE FROM team_feature_vectors
+        WHERE season = ? AND opponent_cluster_id IS NULL
+    """, (season,))
 
-    # Also store feature vectors
-    for team_data in normalized_teams:
-        feature_json = json.dumps(team_data['features'])
-        cursor.execute("""
-            INSERT OR REPLACE INTO team_feature_vectors
-            (team_id, feature_vector, pace_norm, three_pt_rate, paint_scoring_rate,
-             ast_ratio, def_rating_norm, season)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            team_data['team_id'],
-            feature_json,
-            team_data['features'][0],  # pace_norm
-            team_data['features'][2],  # three_pt_rate
-            team_data['features'][4],  # paint_scoring_rate
-            team_data['features'][6],  # ast_ratio
-            team_data['features'][14],  # def_rating_norm
-            season
-        ))
+    cursor.executemany("""
+        INSERT INTO team_feature_vectors
+        (team_id, feature_vector, pace_norm, three_pt_rate, paint_scoring_rate,
+         ast_ratio, def_rating_norm, season)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, [
+        (team_id, *_feature_vector_columns(vector), season)
+        for team_id, vector in zip(team_ids, normalized.tolist())
+    ])
 
     conn.commit()
     conn.close()
@@ -890,6 +923,7 @@ def compute_all_similarity_scores(season: str = '2025-26') -> Dict[int, List[Tup
     return similarity_matrix
 
 
+@scoped_cache
 def get_team_similarity_ranking(
     team_id: int,
     season: str = '2025-26',
@@ -956,6 +990,7 @@ def get_team_similarity_ranking(
     return results
 
 
+@scoped_cache
 def get_team_cluster_assignment(team_id: int, season: str = '2025-26') -> Optional[Dict]:
     """
     Get cluster assignment for a given team (with primary, secondary, and confidence).
@@ -1033,131 +1068,105 @@ def get_team_cluster_assignment(team_id: int, season: str = '2025-26') -> Option
 
     return result
 
+def _tier(strong: np.ndarray, strong_pts: float, weak: np.ndarray, weak_pts: float) -> np.ndarray:
+    """strong_pts where the strong condition holds, else weak_pts where the weak one does, else 0"""
+    return np.where(strong, strong_pts, np.where(weak, weak_pts, 0.0))
 
-def evaluate_cluster_fit(raw_features: Dict, feature_names: List[str]) -> Dict[int, float]:
+
+def evaluate_cluster_fit_matrix(raw: np.ndarray) -> np.ndarray:
     """
-    Evaluate how well a team's features fit each of the 6 clusters.
+    Evaluate how well every team's raw features fit each of the 6 clusters.
+
+    Args:
+        raw: (n, 20) raw feature matrix in FEATURE_NAMES order
 
     Returns:
-        {cluster_id: fit_score, ...}  # Higher score = better fit
+        (n, 6) fit scores; column c is cluster CLUSTER_IDS[c]. Higher = better fit
     """
-    # Extract key metrics from raw features
-    pace = raw_features.get('pace', 98.0)
-    three_pt_rate = raw_features.get('three_pt_rate', 0.35)
-    paint_scoring_rate = raw_features.get('paint_scoring_rate', 0.45)
-    rim_attempt_rate = raw_features.get('rim_attempt_rate', 0.30)
-    ast_ratio = raw_features.get('ast_ratio', 0.60)
-    ast_to_ratio = raw_features.get('ast_to_ratio', 1.7)
-    fastbreak_pts_rate = raw_features.get('fastbreak_pts_rate', 0.12)
-    oreb_pct = raw_features.get('oreb_pct', 0.23)
-    def_rating = raw_features.get('def_paint_pts_allowed', 5.0)  # Proxy for defense
-    pace_variance = raw_features.get('pace_variance', 0.5)
-
-    fit_scores = {}
+    def feature(name):
+        return raw[:, FEATURE_NAMES.index(name)]
+
+    pace = feature('pace')
+    three_pt_rate = feature('three_pt_rate')
+    paint_scoring_rate = feature('paint_scoring_rate')
+    rim_attempt_rate = feature('rim_attempt_rate')
+    ast_ratio = feature('ast_ratio')
+    ast_to_ratio = feature('ast_to_ratio')
+    fastbreak_pts_rate = feature('fastbreak_pts_rate')
+    oreb_pct = feature('oreb_pct')
+    def_rating = feature('def_paint_pts_allowed')  # Proxy for defense
+    pace_variance = feature('pace_variance')
 
     # Cluster 1: Elite Pace Pushers (pace > 99, fastbreak pts > avg, 3PA > 35%)
-    fit_scores[1] = 0.0
-    if pace > 99:
-        fit_scores[1] += 40.0
-    elif pace > 97:
-        fit_scores[1] += 20.0
-
-    if fastbreak_pts_rate > 0.14:
-        fit_scores[1] += 30.0
-    elif fastbreak_pts_rate > 0.12:
-        fit_scores[1] += 15.0
-
-    if three_pt_rate > 0.38:
-        fit_scores[1] += 30.0
-    elif three_pt_rate > 0.35:
-        fit_scores[1] += 15.0
+    pace_pushers = (_tier(pace > 99, 40.0, pace > 97, 20.0)
+                    + _tier(fastbreak_pts_rate > 0.14, 30.0, fastbreak_pts_rate > 0.12, 15.0)
+                    + _tier(three_pt_rate > 0.38, 30.0, three_pt_rate > 0.35, 15.0))
 
     # Cluster 2: Paint Dominators (paint pts % > 50%, rim attempts > 30%, OREB% > avg)
-    fit_scores[2] = 0.0
-    if paint_scoring_rate > 0.50:
-        fit_scores[2] += 40.0
-    elif paint_scoring_rate > 0.47:
-        fit_scores[2] += 20.0
-
-    if rim_attempt_rate > 0.32:
-        fit_scores[2] += 30.0
-    elif rim_attempt_rate > 0.28:
-        fit_scores[2] += 15.0
-
-    if oreb_pct > 0.25:
-        fit_scores[2] += 30.0
-    elif oreb_pct > 0.23:
-        fit_scores[2] += 15.0
+    paint_dominators = (_tier(paint_scoring_rate > 0.50, 40.0, paint_scoring_rate > 0.47, 20.0)
+                        + _tier(rim_attempt_rate > 0.32, 30.0, rim_attempt_rate > 0.28, 15.0)
+                        + _tier(oreb_pct > 0.25, 30.0, oreb_pct > 0.23, 15.0))
 
     # Cluster 3: Three-Point Hunters (3PA rate > 40%, perimeter pts > 45%)
-    fit_scores[3] = 0.0
-    if three_pt_rate > 0.42:
-        fit_scores[3] += 50.0
-    elif three_pt_rate > 0.38:
-        fit_scores[3] += 25.0
-
     perimeter_rate = 1.0 - paint_scoring_rate
-    if perimeter_rate > 0.55:
-        fit_scores[3] += 30.0
-    elif perimeter_rate > 0.50:
-        fit_scores[3] += 15.0
-
-    if pace > 97:
-        fit_scores[3] += 20.0
-
-    # Cluster 4: Defensive Grinders (pace < 97, elite defense)
-    fit_scores[4] = 0.0
-    if pace < 97:
-        fit_scores[4] += 40.0
-    elif pace < 99:
-        fit_scores[4] += 15.0
-
-    if def_rating > 7.0:  # Good defense (proxy inverted from DRTG)
-        fit_scores[4] += 40.0
-    elif def_rating > 5.0:
-        fit_scores[4] += 20.0
-
-    if paint_scoring_rate > 0.48:  # Grind it out in the paint
-        fit_scores[4] += 20.0
-
-    # Cluster 5: Balanced High-Assist (AST ratio > 65%, AST/TO > 1.8)
-    fit_scores[5] = 0.0
-    if ast_ratio > 0.65:
-        fit_scores[5] += 40.0
-    elif ast_ratio > 0.60:
-        fit_scores[5] += 20.0
-
-    if ast_to_ratio > 1.9:
-        fit_scores[5] += 30.0
-    elif ast_to_ratio > 1.7:
-        fit_scores[5] += 15.0
-
-    # Balanced shot distribution (not too extreme in any direction)
-    if 0.35 < three_pt_rate < 0.42 and 0.45 < paint_scoring_rate < 0.52:
-        fit_scores[5] += 30.0
-
-    # Cluster 6: ISO-Heavy (low assist rate < 60%)
-    fit_scores[6] = 0.0
-    if ast_ratio < 0.58:
-        fit_scores[6] += 50.0
-    elif ast_ratio < 0.62:
-        fit_scores[6] += 25.0
-
-    if ast_to_ratio < 1.6:
-        fit_scores[6] += 30.0
-    elif ast_to_ratio < 1.8:
-        fit_scores[6] += 15.0
-
-    # ISO teams tend to have variance in pace
-    if pace_variance > 0.6:
-        fit_scores[6] += 20.0
-
-    return fit_scores
+    three_point_hunters = (_tier(three_pt_rate > 0.42, 50.0, three_pt_rate > 0.38, 25.0)
+                           + _tier(perimeter_rate > 0.55, 30.0, perimeter_rate > 0.50, 15.0)
+                           + np.where(pace > 97, 20.0, 0.0))
+
+    # Cluster 4: Defensive Grinders (pace < 97, elite defense; proxy inverted from DRTG)
+    defensive_grinders = (_tier(pace < 97, 40.0, pace < 99, 15.0)
+                          + _tier(def_rating > 7.0, 40.0, def_rating > 5.0, 20.0)
+                          + np.where(paint_scoring_rate > 0.48, 20.0, 0.0))  # Grind it out in the paint
+
+    # Cluster 5: Balanced High-Assist (AST ratio > 65%, AST/TO > 1.8, balanced shot distribution)
+    balanced_shots = ((0.35 < three_pt_rate) & (three_pt_rate < 0.42)
+                      & (0.45 < paint_scoring_rate) & (paint_scoring_rate < 0.52))
+    balanced_assist = (_tier(ast_ratio > 0.65, 40.0, ast_ratio > 0.60, 20.0)
+                       + _tier(ast_to_ratio > 1.9, 30.0, ast_to_ratio > 1.7, 15.0)
+                       + np.where(balanced_shots, 30.0, 0.0))
+
+    # Cluster 6: ISO-Heavy (low assist rate < 60%; ISO teams tend to have variance in pace)
+    iso_heavy = (_tier(ast_ratio < 0.58, 50.0, ast_ratio < 0.62, 25.0)
+                 + _tier(ast_to_ratio < 1.6, 30.0, ast_to_ratio < 1.8, 15.0)
+                 + np.where(pace_variance > 0.6, 20.0, 0.0))
+
+    return np.column_stack([pace_pushers, paint_dominators, three_point_hunters,
+                            defensive_grinders, balanced_assist, iso_heavy])
+
+
+# Values evaluate_cluster_fit() assumes for features missing from its input
+_FIT_DEFAULTS = {
+    'pace': 98.0,
+    'three_pt_rate': 0.35,
+    'paint_scoring_rate': 0.45,
+    'rim_attempt_rate': 0.30,
+    'ast_ratio': 0.60,
+    'ast_to_ratio': 1.7,
+    'fastbreak_pts_rate': 0.12,
+    'oreb_pct': 0.23,
+    'def_paint_pts_allowed': 5.0,
+    'pace_variance': 0.5
+}
+
+
+def evaluate_cluster_fit(raw_features: Dict, feature_names: List[str]) -> Dict[int, float]:
+    """
+    Evaluate how well a team's features fit each of the 6 clusters.
+
+    Single-team view of evaluate_cluster_fit_matrix().
+
+    Returns:
+        {cluster_id: fit_score, ...}  # Higher score = better fit
+    """
+    row = np.array([[raw_features.get(name, _FIT_DEFAULTS.get(name, 0.0)) for name in FEATURE_NAMES]],
+                   dtype=float)
+    scores = evaluate_cluster_fit_matrix(row)[0]
+    return {cluster_id: float(score) for cluster_id, score in zip(CLUSTER_IDS, scores)}
 
 
 def compute_cluster_centroid(cluster_id: int, season: str = '2025-26') -> Optional[List[float]]:
     """
-    Compute the centroid (average feature vector) for a cluster.
+    Compute the centroid (average feature vector) for a cluster from stored vectors.
 
     Args:
         cluster_id: The cluster to compute centroid for
@@ -1169,214 +1178,129 @@ def compute_cluster_centroid(cluster_id: int, season: str = '2025-26') -> Option
     conn = get_connection()
     cursor = conn.cursor()
 
-    # Get all teams in this cluster
+    # Global feature vectors of every team assigned to this cluster
     cursor.execute("""
-        SELECT team_id FROM team_cluster_assignments
-        WHERE cluster_id = ? AND season = ?
+        SELECT tfv.feature_vector
+        FROM team_cluster_assignments tca
+        JOIN team_feature_vectors tfv
+            ON tfv.team_id = tca.team_id AND tfv.season = tca.season
+        WHERE tca.cluster_id = ? AND tca.season = ?
+          AND tfv.opponent_cluster_id IS NULL
     """, (cluster_id, season))
 
-    team_ids = [row[0] for row in cursor.fetchall()]
-
-    if not team_ids:
-        conn.close()
-        return None
-
-    # Get feature vectors for all teams in cluster
-    placeholders = ','.join('?' * len(team_ids))
-    cursor.execute(f"""
-        SELECT feature_vector FROM team_feature_vectors
-        WHERE team_id IN ({placeholders}) AND season = ?
-    """, (*team_ids, season))
-
     rows = cursor.fetchall()
     conn.close()
 
     if not rows:
         return None
 
-    # Parse feature vectors and compute average
-    all_vectors = [json.loads(row[0]) for row in rows]
-    num_features = len(all_vectors[0])
+    vectors = np.array([json.loads(row[0]) for row in rows], dtype=float)
+    return vectors.mean(axis=0).tolist()
 
-    centroid = []
-    for i in range(num_features):
-        avg_val = sum(vec[i] for vec in all_vectors) / len(all_vectors)
-        centroid.append(avg_val)
 
-    return centroid
+def compute_cluster_centroids(normalized: np.ndarray, cluster_index: np.ndarray) -> np.ndarray:
+    """
+    Centroid of every cluster from a normalized feature matrix.
 
+    Args:
+        normalized: (n, 20) normalized feature matrix
+        cluster_index: (n,) position in CLUSTER_IDS of each row's cluster
 
-def assign_team_clusters(season: str = '2025-26') -> Dict[int, int]:
+    Returns:
+        (6, 20) centroids; rows for clusters without teams are NaN
+    """
+    totals = np.zeros((len(CLUSTER_IDS), normalized.shape[1]))
+    np.add.at(totals, cluster_index, normalized)
+    counts = np.bincount(cluster_index, minlength=len(CLUSTER_IDS))[:, None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, totals / counts, np.nan)
+
+
+def assign_team_clusters(season: str = '2025-26',
+                         features: Optional[Tuple[List[int], np.ndarray]] = None) -> Dict[int, int]:
     """
     Assign all teams to their best-fit cluster based on playstyle features.
 
+    Args:
+        season: NBA season (e.g., '2025-26')
+        features: Precomputed build_feature_matrix(season) result
+
     Returns:
         {team_id: cluster_id, ...}
     """
     print(f"[Similarity] Assigning teams to clusters...")
 
-    teams = get_all_teams()
-
-    # Compute raw features for all teams
-    all_raw_features = []
-    for team in teams:
-        features = compute_team_feature_vector(team['id'], season)
-        if features:
-            all_raw_features.append(features)
-
-    # Normalize all vectors (we need normalized for distance calculation)
-    normalized_teams = normalize_all_feature_vectors(all_raw_features)
-
-    # Build lookup for raw features by team_id
-    raw_features_by_team = {f['team_id']: f['raw_features'] for f in all_raw_features}
-    normalized_by_team = {f['team_id']: f['features'] for f in normalized_teams}
-
-    # Assign each team to best-fit cluster
-    cluster_assignments = {}
-
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    # Clear old assignments
-    cursor.execute("DELETE FROM team_cluster_assignments WHERE season = ?", (season,))
-
-    feature_names = list(FEATURE_WEIGHTS.keys())
-
-    for team in all_raw_features:
-        team_id = team['team_id']
-        raw_features = raw_features_by_team[team_id]
+    team_ids, raw = features if features is not None else build_feature_matrix(season)
+    team_names = {team['id']: team['full_name'] for team in get_all_teams()}
 
-        # Evaluate fit for all 6 clusters
-        fit_scores = evaluate_cluster_fit(raw_features, feature_names)
+    # Normalized vectors are used for distance to centroid
+    normalized = normalize_feature_matrix(raw)
 
-        # Sort clusters by fit score (descending), break ties by cluster_id (ascending)
-        sorted_clusters = sorted(fit_scores.items(), key=lambda x: (-x[1], x[0]))
+    # Evaluate fit for all 6 clusters; sort by fit score (descending), ties by cluster_id (ascending)
+    fit_scores = evaluate_cluster_fit_matrix(raw)
+    ranked = np.argsort(-fit_scores, axis=1, kind='stable')
+    rows = np.arange(len(team_ids))
+    primary_index, secondary_index = ranked[:, 0], ranked[:, 1]
+    primary_fit = fit_scores[rows, primary_index]
+    secondary_fit = fit_scores[rows, secondary_index]
+    cluster_ids = np.array(CLUSTER_IDS)
 
-        # Primary = top 1, Secondary = top 2
-        primary_cluster_id = sorted_clusters[0][0]
-        primary_fit_score = sorted_clusters[0][1]
-        secondary_cluster_id = sorted_clusters[1][0] if len(sorted_clusters) > 1 else None
-        secondary_fit_score = sorted_clusters[1][1] if len(sorted_clusters) > 1 else None
+    for i, team_id in enumerate(team_ids):
+        team_name = team_names.get(team_id, f"Team {team_id}")
+        print(f"[Similarity]   {team_name} → Primary: Cluster {cluster_ids[primary_index[i]]} ({primary_fit[i]:.1f}), "
+              f"Secondary: Cluster {cluster_ids[secondary_index[i]]} ({secondary_fit[i]:.1f})")
 
-        cluster_assignments[team_id] = primary_cluster_id
-
-        # Store assignment (distance_to_centroid and confidence will be computed later)
-        cursor.execute("""
-            INSERT INTO team_cluster_assignments
-            (team_id, cluster_id, secondary_cluster_id, primary_fit_score,
-             secondary_fit_score, distance_to_centroid, confidence_label, confidence_score, season)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (team_id, primary_cluster_id, secondary_cluster_id, primary_fit_score,
-              secondary_fit_score, None, None, None, season))
-
-        team_info = get_team_by_id(team_id)
-        team_name = team_info['full_name'] if team_info else f"Team {team_id}"
-
-        print(f"[Similarity]   {team_name} → Primary: Cluster {primary_cluster_id} ({primary_fit_score:.1f}), Secondary: Cluster {secondary_cluster_id} ({secondary_fit_score:.1f})")
-
-    conn.commit()
-
-    # Now compute and update distance to centroid for each team
+    # Distance from each team to its primary cluster's centroid
     print(f"[Similarity] Computing distances to cluster centroids...")
 
-    for cluster_id in range(1, 7):
-        centroid = compute_cluster_centroid(cluster_id, season)
-
-        if not centroid:
-            continue
-
-        # Get all teams in this cluster
-        cursor.execute("""
-            SELECT team_id FROM team_cluster_assignments
-            WHERE cluster_id = ? AND season = ?
-        """, (cluster_id, season))
-
-        team_ids_in_cluster = [row[0] for row in cursor.fetchall()]
-
-        for team_id in team_ids_in_cluster:
-            team_features = normalized_by_team.get(team_id)
-
-            if not team_features:
-                continue
-
-            # Compute distance from team to cluster centroid
-            distance = compute_weighted_distance(team_features, centroid)
-
-            # Update database
-            cursor.execute("""
-                UPDATE team_cluster_assignments
-                SET distance_to_centroid = ?
-                WHERE team_id = ? AND season = ?
-            """, (distance, team_id, season))
-
-    conn.commit()
+    centroids = compute_cluster_centroids(normalized, primary_index)
+    diff = normalized - centroids[primary_index]
+    distances = np.sqrt((diff * diff) @ _WEIGHT_VECTOR)
 
-    # Compute confidence labels based on distance_to_centroid percentiles
+    # Confidence labels based on distance_to_centroid percentiles
     print(f"[Similarity] Computing confidence labels...")
 
-    # Get all distance_to_centroid values for this season
-    cursor.execute("""
-        SELECT distance_to_centroid
-        FROM team_cluster_assignments
-        WHERE season = ? AND distance_to_centroid IS NOT NULL
-        ORDER BY distance_to_centroid
-    """, (season,))
-
-    distances = [row[0] for row in cursor.fetchall()]
+    n = len(distances)
+    if n >= 5:  # Need sufficient data for percentiles
+        ordered = np.sort(distances)
+        p30_threshold = ordered[int(n * 0.30)]
+        p70_threshold = ordered[int(n * 0.70)]
 
-    if len(distances) >= 5:  # Need sufficient data for percentiles
-        # Calculate percentiles
-        n = len(distances)
-        p30_idx = int(n * 0.30)
-        p70_idx = int(n * 0.70)
-        p30_threshold = distances[p30_idx]
-        p70_threshold = distances[p70_idx]
-
-        min_dist = min(distances)
-        max_dist = max(distances)
+        min_dist, max_dist = ordered[0], ordered[-1]
         dist_range = max_dist - min_dist if max_dist > min_dist else 1.0
 
-        # Update each team with confidence label and score
-        cursor.execute("""
-            SELECT team_id, distance_to_centroid
-            FROM team_cluster_assignments
-            WHERE season = ? AND distance_to_centroid IS NOT NULL
-        """, (season,))
-
-        for row in cursor.fetchall():
-            team_id = row[0]
-            distance = row[1]
-
-            # Assign confidence label based on percentile bands
-            if distance <= p30_threshold:
-                confidence_label = "High"
-            elif distance <= p70_threshold:
-                confidence_label = "Medium"
-            else:
-                confidence_label = "Low"
+        confidence_labels = np.where(distances <= p30_threshold, 'High',
+                                     np.where(distances <= p70_threshold, 'Medium', 'Low'))
+        # 0-100, where 100 = closest to centroid
+        confidence_scores = np.clip(100.0 * (1.0 - (distances - min_dist) / dist_range), 0.0, 100.0)
+    else:
+        # Insufficient data, default all to Medium
+        confidence_labels = np.full(n, 'Medium')
+        confidence_scores = np.full(n, 50.0)
 
-            # Compute confidence score (0-100, where 100 = closest to centroid)
-            confidence_score = 100.0 * (1.0 - (distance - min_dist) / dist_range)
-            confidence_score = max(0.0, min(100.0, confidence_score))
+    conn = get_connection()
+    cursor = conn.cursor()
 
-            cursor.execute("""
-                UPDATE team_cluster_assignments
-                SET confidence_label = ?, confidence_score = ?
-                WHERE team_id = ? AND season = ?
-            """, (confidence_label, confidence_score, team_id, season))
+    # Clear old assignments
+    cursor.execute("DELETE FROM team_cluster_assignments WHERE season = ?", (season,))
 
-        conn.commit()
-    else:
-        # Insufficient data, default all to Medium
-        cursor.execute("""
-            UPDATE team_cluster_assignments
-            SET confidence_label = 'Medium', confidence_score = 50.0
-            WHERE season = ? AND confidence_label IS NULL
-        """, (season,))
-        conn.commit()
+    cursor.executemany("""
+        INSERT INTO team_cluster_assignments
+        (team_id, cluster_id, secondary_cluster_id, primary_fit_score,
+         secondary_fit_score, distance_to_centroid, confidence_label, confidence_score, season)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [
+        (team_id, int(cluster_ids[primary_index[i]]), int(cluster_ids[secondary_index[i]]),
+         float(primary_fit[i]), float(secondary_fit[i]), float(distances[i]),
+         str(confidence_labels[i]), float(confidence_scores[i]), season)
+        for i, team_id in enumerate(team_ids)
+    ])
 
+    conn.commit()
     conn.close()
 
+    cluster_assignments = {team_id: int(cluster_ids[primary_index[i]]) for i, team_id in enumerate(team_ids)}
+
     print(f"[Similarity] Assigned {len(cluster_assignments)} teams to clusters")
 
     return cluster_assignments
@@ -1600,17 +1524,21 @@ def get_team_cluster_performance(team_id: int, opponent_cluster_id: Optional[int
 def refresh_similarity_engine(season: str = '2025-26'):
     """
     Master function to rebuild all similarity data.
-    Runs: compute vectors → compute scores → assign clusters
+    Runs: compute vectors → compute scores → assign clusters → conditional similarity
     """
     print(f"[Similarity] Starting full refresh for season {season}")
 
     start_time = datetime.now()
 
-    # Step 1: Compute all similarity scores
-    similarity_matrix = compute_all_similarity_scores(season)
+    # Step 1: Compute all similarity scores (feature matrix is shared with step 2)
+    features = build_feature_matrix(season)
+    similarity_matrix = compute_all_similarity_scores(season, features=features)
 
     # Step 2: Assign clusters
-    cluster_assignments = assign_team_clusters(season)
+    cluster_assignments = assign_team_clusters(season, features=features)
+
+    # Step 3: Conditional similarity for every window mode (needs the new clusters)
+    conditional = refresh_conditional_similarity(season)
 
     elapsed = (datetime.now() - start_time).total_seconds()
     print(f"[Similarity] Refresh complete in {elapsed:.2f}s")
@@ -1619,6 +1547,7 @@ def refresh_similarity_engine(season: str = '2025-26'):
         'success': True,
         'teams_processed': len(similarity_matrix),
         'clusters_assigned': len(cluster_assignments),
+        'conditional_window_modes': conditional['window_modes'],
         'time_seconds': elapsed
     }
 
@@ -18,20 +18,24 @@ logger = logging.getLogger(__name__)
 # Import centralized database configuration
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
     from api.utils.three_pt_defense_tiers import get_3pt_defense_tier
+    from api.utils.prediction_context import scoped_cache
+    from api.utils.team_context import get_scoped_team_context
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
     from three_pt_defense_tiers import get_3pt_defense_tier
+    from prediction_context import scoped_cache
+    from team_context import get_scoped_team_context
 
 # Database path
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
 
 
 def get_all_3pt_defense_tiers():
@@ -39,7 +43,107 @@ def get_all_3pt_defense_tiers():
     return ['elite', 'average', 'bad']
 
 
-def get_team_three_pt_scoring_splits(team_id: int, season: str = '2025-26') -> Optional[Dict]:
+def _query_three_pt_rows(team_id: int, season: str):
+    """
+    Load team info and 3PT game logs (with opponent 3PT defense rank) from SQLite.
+
+    Returns:
+        Tuple of (team_row, game_logs)
+    """
+    conn = _get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute('''
+            SELECT
+                t.team_id,
+                t.team_abbreviation,
+                t.full_name,
+                tss.three_pt_ppg as season_avg_three_pt_ppg,
+                tss.fg3m,
+                tss.fg3_pct
+            FROM nba_teams t
+            LEFT JOIN team_season_stats tss
+                ON t.team_id = tss.team_id
+                AND tss.season = ?
+                AND tss.split_type = 'overall'
+            WHERE t.team_id = ?
+        ''', (season, team_id))
+
+        team_row = cursor.fetchone()
+        if not team_row:
+            return None, []
+
+        # FILTER: Only Regular Season + NBA Cup (exclude Summer League, preseason, etc.)
+        cursor.execute('''
+            SELECT
+                tgl.is_home,
+                tgl.fg3m,
+                tgl.fg3a,
+                tgl.opp_fg3m,
+                tgl.opp_fg3a,
+                tss_opp.opp_fg3_pct_rank
+            FROM team_game_logs tgl
+            LEFT JOIN team_season_stats tss_opp
+                ON tgl.opponent_team_id = tss_opp.team_id
+                AND tgl.season = tss_opp.season
+                AND tss_opp.split_type = 'overall'
+            WHERE tgl.team_id = ?
+                AND tgl.season = ?
+                AND tgl.fg3m IS NOT NULL
+                AND tgl.fg3a IS NOT NULL
+                AND tgl.opp_fg3m IS NOT NULL
+                AND tgl.opp_fg3a IS NOT NULL
+                AND tgl.game_type IN ('Regular Season', 'NBA Cup')
+            ORDER BY tgl.game_date DESC
+        ''', (team_id, season))
+
+        return team_row, cursor.fetchall()
+
+    finally:
+        conn.close()
+
+
+def _three_pt_rows_from_context(team_context):
+    """
+    Build the same rows as _query_three_pt_rows from a TeamContext.
+
+    Returns:
+        Tuple of (team_row, game_logs)
+    """
+    if not team_context.team:
+        return None, []
+
+    overall = team_context.overall or {}
+    team_row = {
+        'team_id': team_context.team['team_id'],
+        'team_abbreviation': team_context.team['team_abbreviation'],
+        'full_name': team_context.team['full_name'],
+        'season_avg_three_pt_ppg': overall.get('three_pt_ppg'),
+        'fg3m': overall.get('fg3m'),
+        'fg3_pct': overall.get('fg3_pct')
+    }
+
+    game_logs = []
+    for g in team_context.games(eligible_only=True):
+        if g['fg3m'] is None or g['fg3a'] is None or g['opp_fg3m'] is None or g['opp_fg3a'] is None:
+            continue
+        opp_row = team_context.opponent_overall(g['opponent_team_id'])
+        game_logs.append({
+            'is_home': g['is_home'],
+            'fg3m': g['fg3m'],
+            'fg3a': g['fg3a'],
+            'opp_fg3m': g['opp_fg3m'],
+            'opp_fg3a': g['opp_fg3a'],
+            'opp_fg3_pct_rank': opp_row['opp_fg3_pct_rank'] if opp_row else None
+        })
+
+    return team_row, game_logs
+
+
+@scoped_cache
+def get_team_three_pt_scoring_splits(team_id: int, season: str = '2025-26',
+                                     team_context=None) -> Optional[Dict]:
     """
     Get 3PT defense-adjusted home/away 3PT scoring splits for a team.
 
@@ -54,6 +158,7 @@ def get_team_three_pt_scoring_splits(team_id: int, season: str = '2025-26') -> O
     Args:
         team_id: NBA team ID
         season: Season string (e.g., '2025-26')
+        team_context: Optional TeamContext to read from instead of SQLite
 
     Returns:
         Dictionary with team info, season average 3PT PPG, and splits by tier/location.
@@ -78,32 +183,17 @@ def get_team_three_pt_scoring_splits(team_id: int, season: str = '2025-26') -> O
             }
         }
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
+    team_context = team_context or get_scoped_team_context(team_id, season)
 
     try:
-        # Step 1: Get team info and season average 3PT PPG
-        cursor.execute('''
-            SELECT
-                t.team_id,
-                t.team_abbreviation,
-                t.full_name,
-                tss.three_pt_ppg as season_avg_three_pt_ppg,
-                tss.fg3m,
-                tss.fg3_pct
-            FROM nba_teams t
-            LEFT JOIN team_season_stats tss
-                ON t.team_id = tss.team_id
-                AND tss.season = ?
-                AND tss.split_type = 'overall'
-            WHERE t.team_id = ?
-        ''', (season, team_id))
-
-        team_row = cursor.fetchone()
+        # Step 1: Get team info and game logs with opponent 3PT defensive rankings
+        if team_context is not None:
+            team_row, game_logs = _three_pt_rows_from_context(team_context)
+        else:
+            team_row, game_logs = _query_three_pt_rows(team_id, season)
 
         if not team_row:
             logger.warning(f"Team {team_id} not found in database")
-            conn.close()
             return None
 
         team_info = {
@@ -119,34 +209,7 @@ def get_team_three_pt_scoring_splits(team_id: int, season: str = '2025-26') -> O
             'season_avg_fg3_pct': team_row['fg3_pct']       # Alternative field name
         }
 
-        # Step 2: Fetch game logs with opponent 3PT defensive rankings
-        # FILTER: Only Regular Season + NBA Cup (exclude Summer League, preseason, etc.)
-        cursor.execute('''
-            SELECT
-                tgl.is_home,
-                tgl.fg3m,
-                tgl.fg3a,
-                tgl.opp_fg3m,
-                tgl.opp_fg3a,
-                tss_opp.opp_fg3_pct_rank
-            FROM team_game_logs tgl
-            LEFT JOIN team_season_stats tss_opp
-                ON tgl.opponent_team_id = tss_opp.team_id
-                AND tgl.season = tss_opp.season
-                AND tss_opp.split_type = 'overall'
-            WHERE tgl.team_id = ?
-                AND tgl.season = ?
-                AND tgl.fg3m IS NOT NULL
-                AND tgl.fg3a IS NOT NULL
-                AND tgl.opp_fg3m IS NOT NULL
-                AND tgl.opp_fg3a IS NOT NULL
-                AND tgl.game_type IN ('Regular Season', 'NBA Cup')
-            ORDER BY tgl.game_date DESC
-        ''', (team_id, season))
-
-        game_logs = cursor.fetchall()
-
-        # Step 2.5: Calculate season and last10 home/away splits for 3PT stats
+        # Step 2: Calculate season and last10 home/away splits for 3PT stats
         all_fg3m = [g['fg3m'] for g in game_logs]
         all_fg3a = [g['fg3a'] for g in game_logs]
         last10_fg3m = [g['fg3m'] for g in game_logs[:10]]
@@ -252,12 +315,10 @@ def get_team_three_pt_scoring_splits(team_id: int, season: str = '2025-26') -> O
             }
 
         team_info['splits'] = splits
-        conn.close()
 
         logger.info(f"Generated 3PT scoring splits for team {team_id} ({team_info['team_abbreviation']}) - {season}")
         return team_info
 
     except Exception as e:
         logger.error(f"Error generating 3PT scoring splits for team {team_id}: {e}")
-        conn.close()
         return None
@@ -18,18 +18,22 @@ logger = logging.getLogger(__name__)
 # Import centralized database configuration
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
+    from api.utils.game_log_store import average, get_game_log_store
+    from api.utils.prediction_context import scoped_cache
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
+    from game_log_store import average, get_game_log_store
+    from prediction_context import scoped_cache
 
 # Database path
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
 
 
 def get_pace_tier(pace: float) -> Optional[str]:
@@ -58,6 +62,23 @@ def get_all_pace_tiers():
     return ['slow', 'normal', 'fast']
 
 
+# (low, high) pace bounds per tier, low <= pace < high (same as get_pace_tier)
+PACE_TIER_RANGES = {
+    'slow': (None, 98),
+    'normal': (98, 102),
+    'fast': (102, None),
+}
+
+
+def _fg3_pct(store, rows, made: str, attempted: str):
+    """3PT% over a selection from summed makes/attempts (0 without attempts)"""
+    attempts = sum(store.values(attempted, rows).tolist())
+    if len(rows) == 0 or attempts <= 0:
+        return 0
+    return round(sum(store.values(made, rows).tolist()) / attempts * 100, 1)
+
+
+@scoped_cache
 def get_team_three_pt_scoring_vs_pace(team_id: int, season: str = '2025-26') -> Optional[Dict]:
     """
     Get pace-adjusted home/away 3PT scoring splits for a team.
@@ -131,132 +152,69 @@ def get_team_three_pt_scoring_vs_pace(team_id: int, season: str = '2025-26') ->
             'season_avg_three_pt_ppg': team_row['season_avg_three_pt_ppg']
         }
 
-        # Step 2: Fetch game logs with pace
+        # Step 2: Game logs with pace (most recent first, for last10)
         # FILTER: Only Regular Season + NBA Cup (exclude Summer League, preseason, etc.)
-        cursor.execute('''
-            SELECT
-                tgl.is_home,
-                tgl.fg3m,
-                tgl.fg3a,
-                tgl.opp_fg3m,
-                tgl.opp_fg3a,
-                tgl.pace
-            FROM team_game_logs tgl
-            WHERE tgl.team_id = ?
-                AND tgl.season = ?
-                AND tgl.fg3m IS NOT NULL
-                AND tgl.fg3a IS NOT NULL
-                AND tgl.opp_fg3m IS NOT NULL
-                AND tgl.opp_fg3a IS NOT NULL
-                AND tgl.pace IS NOT NULL
-                AND tgl.game_type IN ('Regular Season', 'NBA Cup')
-            ORDER BY tgl.game_date DESC
-        ''', (team_id, season))
-
-        game_logs = cursor.fetchall()
-
-        # Step 2.5: Calculate season and last10 home/away splits for 3PT stats
-        all_fg3m = [g['fg3m'] for g in game_logs]
-        all_fg3a = [g['fg3a'] for g in game_logs]
-        last10_fg3m = [g['fg3m'] for g in game_logs[:10]]
-        last10_fg3a = [g['fg3a'] for g in game_logs[:10]]
-
-        home_fg3m = [g['fg3m'] for g in game_logs if g['is_home'] == 1]
-        home_fg3a = [g['fg3a'] for g in game_logs if g['is_home'] == 1]
-        away_fg3m = [g['fg3m'] for g in game_logs if g['is_home'] == 0]
-        away_fg3a = [g['fg3a'] for g in game_logs if g['is_home'] == 0]
-
-        last10_home_fg3m = [g['fg3m'] for g in game_logs[:10] if g['is_home'] == 1]
-        last10_home_fg3a = [g['fg3a'] for g in game_logs[:10] if g['is_home'] == 1]
-        last10_away_fg3m = [g['fg3m'] for g in game_logs[:10] if g['is_home'] == 0]
-        last10_away_fg3a = [g['fg3a'] for g in game_logs[:10] if g['is_home'] == 0]
-
+        store = get_game_log_store(season)
+        game_logs = store.team_rows(team_id, eligible_only=True,
+                                    require=('fg3m', 'fg3a', 'opp_fg3m', 'opp_fg3a', 'pace'))
+        last10 = store.last_n(game_logs, 10)
+        home, away = store.at_home(game_logs), store.at_home(game_logs, home=False)
+        last10_home, last10_away = store.at_home(last10), store.at_home(last10, home=False)
+
+        # Step 2.5: Season and last10 home/away splits for 3PT stats
         # 3PT Makes (3PM)
-        team_info['season_avg_fg3m'] = round(sum(all_fg3m) / len(all_fg3m), 1) if all_fg3m else 0
-        team_info['last10_avg_fg3m'] = round(sum(last10_fg3m) / len(last10_fg3m), 1) if last10_fg3m else 0
-        team_info['season_avg_fg3m_home'] = round(sum(home_fg3m) / len(home_fg3m), 1) if home_fg3m else 0
-        team_info['season_avg_fg3m_away'] = round(sum(away_fg3m) / len(away_fg3m), 1) if away_fg3m else 0
-        team_info['last10_avg_fg3m_home'] = round(sum(last10_home_fg3m) / len(last10_home_fg3m), 1) if last10_home_fg3m else 0
-        team_info['last10_avg_fg3m_away'] = round(sum(last10_away_fg3m) / len(last10_away_fg3m), 1) if last10_away_fg3m else 0
+        team_info['season_avg_fg3m'] = average(store.values('fg3m', game_logs))
+        team_info['last10_avg_fg3m'] = average(store.values('fg3m', last10))
+        team_info['season_avg_fg3m_home'] = average(store.values('fg3m', home))
+        team_info['season_avg_fg3m_away'] = average(store.values('fg3m', away))
+        team_info['last10_avg_fg3m_home'] = average(store.values('fg3m', last10_home))
+        team_info['last10_avg_fg3m_away'] = average(store.values('fg3m', last10_away))
 
         # 3PT Percentage (3P%)
-        team_info['season_avg_fg3_pct'] = round((sum(all_fg3m) / sum(all_fg3a) * 100), 1) if all_fg3a and sum(all_fg3a) > 0 else 0
-        team_info['last10_avg_fg3_pct'] = round((sum(last10_fg3m) / sum(last10_fg3a) * 100), 1) if last10_fg3a and sum(last10_fg3a) > 0 else 0
-        team_info['season_avg_fg3_pct_home'] = round((sum(home_fg3m) / sum(home_fg3a) * 100), 1) if home_fg3a and sum(home_fg3a) > 0 else 0
-        team_info['season_avg_fg3_pct_away'] = round((sum(away_fg3m) / sum(away_fg3a) * 100), 1) if away_fg3a and sum(away_fg3a) > 0 else 0
-        team_info['last10_avg_fg3_pct_home'] = round((sum(last10_home_fg3m) / sum(last10_home_fg3a) * 100), 1) if last10_home_fg3a and sum(last10_home_fg3a) > 0 else 0
-        team_info['last10_avg_fg3_pct_away'] = round((sum(last10_away_fg3m) / sum(last10_away_fg3a) * 100), 1) if last10_away_fg3a and sum(last10_away_fg3a) > 0 else 0
+        team_info['season_avg_fg3_pct'] = _fg3_pct(store, game_logs, 'fg3m', 'fg3a')
+        team_info['last10_avg_fg3_pct'] = _fg3_pct(store, last10, 'fg3m', 'fg3a')
+        team_info['season_avg_fg3_pct_home'] = _fg3_pct(store, home, 'fg3m', 'fg3a')
+        team_info['season_avg_fg3_pct_away'] = _fg3_pct(store, away, 'fg3m', 'fg3a')
+        team_info['last10_avg_fg3_pct_home'] = _fg3_pct(store, last10_home, 'fg3m', 'fg3a')
+        team_info['last10_avg_fg3_pct_away'] = _fg3_pct(store, last10_away, 'fg3m', 'fg3a')
 
         # Field aliases for frontend compatibility
         team_info['overall_avg_fg3m'] = team_info['season_avg_fg3m']
         team_info['overall_avg_fg3_pct'] = team_info['season_avg_fg3_pct']
 
         # DEFENSIVE: Opponent 3PT stats (3PT allowed)
-        all_opp_fg3m = [g['opp_fg3m'] for g in game_logs]
-        all_opp_fg3a = [g['opp_fg3a'] for g in game_logs]
-        last10_opp_fg3m = [g['opp_fg3m'] for g in game_logs[:10]]
-        last10_opp_fg3a = [g['opp_fg3a'] for g in game_logs[:10]]
-
-        home_opp_fg3m = [g['opp_fg3m'] for g in game_logs if g['is_home'] == 1]
-        home_opp_fg3a = [g['opp_fg3a'] for g in game_logs if g['is_home'] == 1]
-        away_opp_fg3m = [g['opp_fg3m'] for g in game_logs if g['is_home'] == 0]
-        away_opp_fg3a = [g['opp_fg3a'] for g in game_logs if g['is_home'] == 0]
-
-        last10_home_opp_fg3m = [g['opp_fg3m'] for g in game_logs[:10] if g['is_home'] == 1]
-        last10_home_opp_fg3a = [g['opp_fg3a'] for g in game_logs[:10] if g['is_home'] == 1]
-        last10_away_opp_fg3m = [g['opp_fg3m'] for g in game_logs[:10] if g['is_home'] == 0]
-        last10_away_opp_fg3a = [g['opp_fg3a'] for g in game_logs[:10] if g['is_home'] == 0]
-
         # Opponent 3PT Makes (3PM allowed)
-        team_info['season_avg_opp_fg3m'] = round(sum(all_opp_fg3m) / len(all_opp_fg3m), 1) if all_opp_fg3m else 0
-        team_info['last10_avg_opp_fg3m'] = round(sum(last10_opp_fg3m) / len(last10_opp_fg3m), 1) if last10_opp_fg3m else 0
-        team_info['season_avg_opp_fg3m_home'] = round(sum(home_opp_fg3m) / len(home_opp_fg3m), 1) if home_opp_fg3m else 0
-        team_info['season_avg_opp_fg3m_away'] = round(sum(away_opp_fg3m) / len(away_opp_fg3m), 1) if away_opp_fg3m else 0
-        team_info['last10_avg_opp_fg3m_home'] = round(sum(last10_home_opp_fg3m) / len(last10_home_opp_fg3m), 1) if last10_home_opp_fg3m else 0
-        team_info['last10_avg_opp_fg3m_away'] = round(sum(last10_away_opp_fg3m) / len(last10_away_opp_fg3m), 1) if last10_away_opp_fg3m else 0
+        team_info['season_avg_opp_fg3m'] = average(store.values('opp_fg3m', game_logs))
+        team_info['last10_avg_opp_fg3m'] = average(store.values('opp_fg3m', last10))
+        team_info['season_avg_opp_fg3m_home'] = average(store.values('opp_fg3m', home))
+        team_info['season_avg_opp_fg3m_away'] = average(store.values('opp_fg3m', away))
+        team_info['last10_avg_opp_fg3m_home'] = average(store.values('opp_fg3m', last10_home))
+        team_info['last10_avg_opp_fg3m_away'] = average(store.values('opp_fg3m', last10_away))
 
         # Opponent 3PT Percentage (3P% allowed)
-        team_info['season_avg_opp_fg3_pct'] = round((sum(all_opp_fg3m) / sum(all_opp_fg3a) * 100), 1) if all_opp_fg3a and sum(all_opp_fg3a) > 0 else 0
-        team_info['last10_avg_opp_fg3_pct'] = round((sum(last10_opp_fg3m) / sum(last10_opp_fg3a) * 100), 1) if last10_opp_fg3a and sum(last10_opp_fg3a) > 0 else 0
-        team_info['season_avg_opp_fg3_pct_home'] = round((sum(home_opp_fg3m) / sum(home_opp_fg3a) * 100), 1) if home_opp_fg3a and sum(home_opp_fg3a) > 0 else 0
-        team_info['season_avg_opp_fg3_pct_away'] = round((sum(away_opp_fg3m) / sum(away_opp_fg3a) * 100), 1) if away_opp_fg3a and sum(away_opp_fg3a) > 0 else 0
-        team_info['last10_avg_opp_fg3_pct_home'] = round((sum(last10_home_opp_fg3m) / sum(last10_home_opp_fg3a) * 100), 1) if last10_home_opp_fg3a and sum(last10_home_opp_fg3a) > 0 else 0
-        team_info['last10_avg_opp_fg3_pct_away'] = round((sum(last10_away_opp_fg3m) / sum(last10_away_opp_fg3a) * 100), 1) if last10_away_opp_fg3a and sum(last10_away_opp_fg3a) > 0 else 0
+        team_info['season_avg_opp_fg3_pct'] = _fg3_pct(store, game_logs, 'opp_fg3m', 'opp_fg3a')
+        team_info['last10_avg_opp_fg3_pct'] = _fg3_pct(store, last10, 'opp_fg3m', 'opp_fg3a')
+        team_info['season_avg_opp_fg3_pct_home'] = _fg3_pct(store, home, 'opp_fg3m', 'opp_fg3a')
+        team_info['season_avg_opp_fg3_pct_away'] = _fg3_pct(store, away, 'opp_fg3m', 'opp_fg3a')
+        team_info['last10_avg_opp_fg3_pct_home'] = _fg3_pct(store, last10_home, 'opp_fg3m', 'opp_fg3a')
+        team_info['last10_avg_opp_fg3_pct_away'] = _fg3_pct(store, last10_away, 'opp_fg3m', 'opp_fg3a')
 
         # Defensive field aliases
         team_info['overall_avg_opp_fg3m'] = team_info['season_avg_opp_fg3m']
         team_info['overall_avg_opp_fg3_pct'] = team_info['season_avg_opp_fg3_pct']
 
-        # Step 3: Aggregate games by pace tier and location
-        # Initialize buckets: {tier: {home: [3pt_pts], away: [3pt_pts]}}
-        buckets = {
-            tier: {'home': [], 'away': []}
-            for tier in get_all_pace_tiers()
-        }
-
-        for game in game_logs:
-            pace = game['pace']
-            tier = get_pace_tier(pace)
-
-            # Skip games where pace tier can't be determined
-            if tier is None:
-                logger.debug(f"Skipping game with missing pace: {pace}")
-                continue
-
-            location = 'home' if game['is_home'] == 1 else 'away'
-            three_pt_pts = game['fg3m'] * 3  # Convert 3PM to points
-            buckets[tier][location].append(three_pt_pts)
-
-        # Step 4: Calculate averages and build response structure
+        # Step 3: Average 3PT points (3PM x 3) per pace tier and location
         splits = {}
         for tier in get_all_pace_tiers():
-            home_games = buckets[tier]['home']
-            away_games = buckets[tier]['away']
+            low, high = PACE_TIER_RANGES[tier]
+            tier_games = store.in_pace_range(game_logs, low, high)
+            home_games = store.at_home(tier_games)
+            away_games = store.at_home(tier_games, home=False)
 
             splits[tier] = {
-                'home_three_pt_ppg': round(sum(home_games) / len(home_games), 1) if home_games else None,
+                'home_three_pt_ppg': average(store.values('fg3m', home_games) * 3, default=None),
                 'home_games': len(home_games),
-                'away_three_pt_ppg': round(sum(away_games) / len(away_games), 1) if away_games else None,
+                'away_three_pt_ppg': average(store.values('fg3m', away_games) * 3, default=None),
                 'away_games': len(away_games)
             }
 
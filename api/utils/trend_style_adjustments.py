@@ -12,6 +12,7 @@ from typing import Dict, List, Tuple, Optional
 import sqlite3
 import os
 from api.utils.db_config import get_db_path
+from api.utils.connection_pool import get_shared_connection
 
 
 @dataclass
@@ -49,8 +50,7 @@ def get_league_thresholds(season: str = '2025-26') -> Dict:
         Dict with league thresholds for style features
     """
     db_path = get_db_path('nba_data.db')
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    conn = get_shared_connection(db_path, readonly=True)
     cursor = conn.cursor()
 
     try:
@@ -349,8 +349,7 @@ def compute_team_specific_trends(
     flags = []
 
     db_path = get_db_path('nba_data.db')
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    conn = get_shared_connection(db_path, readonly=True)
     cursor = conn.cursor()
 
     try:
@@ -17,20 +17,24 @@ logger = logging.getLogger(__name__)
 # Import centralized database configuration
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
     from api.utils.turnover_pressure_tiers import get_turnover_pressure_tier
+    from api.utils.prediction_context import scoped_cache
+    from api.utils.team_context import get_scoped_team_context
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
     from turnover_pressure_tiers import get_turnover_pressure_tier
+    from prediction_context import scoped_cache
+    from team_context import get_scoped_team_context
 
 # Database path
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
 
 
 def get_all_turnover_pressure_tiers():
@@ -38,7 +42,122 @@ def get_all_turnover_pressure_tiers():
     return ['elite', 'average', 'low']
 
 
-def get_team_turnover_vs_defense_pressure(team_id: int, season: str = '2025-26') -> Optional[Dict]:
+def _query_turnover_rows(team_id: int, season: str):
+    """
+    Load team info, turnover games and opponent-turnover games from SQLite.
+
+    Returns:
+        Tuple of (team_row, games, opp_tov_games)
+    """
+    conn = _get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        # Team info and season average turnovers
+        cursor.execute('''
+            SELECT
+                t.team_id,
+                t.team_abbreviation,
+                t.full_name,
+                tss.turnovers as season_avg_turnovers
+            FROM nba_teams t
+            LEFT JOIN team_season_stats tss
+                ON t.team_id = tss.team_id
+                AND tss.season = ?
+                AND tss.split_type = 'overall'
+            WHERE t.team_id = ?
+        ''', (season, team_id))
+
+        team_row = cursor.fetchone()
+        if not team_row:
+            return None, [], []
+
+        # Opponent turnover forcing ranks for all games (ordered by date DESC for last10)
+        # Join team_game_logs with opponent's team_season_stats to get their TOV forced rank
+        # FILTER: Only Regular Season + NBA Cup (exclude Summer League, preseason, etc.)
+        cursor.execute('''
+            SELECT
+                tgl.game_date,
+                tgl.is_home,
+                tgl.turnovers as team_turnovers,
+                opp_stats.opp_tov_rank as opponent_tov_forced_rank
+            FROM team_game_logs tgl
+            LEFT JOIN team_season_stats opp_stats
+                ON tgl.opponent_team_id = opp_stats.team_id
+                AND opp_stats.season = ?
+                AND opp_stats.split_type = 'overall'
+            WHERE tgl.team_id = ?
+                AND tgl.season = ?
+                AND tgl.turnovers IS NOT NULL
+                AND tgl.game_type IN ('Regular Season', 'NBA Cup')
+            ORDER BY tgl.game_date DESC
+        ''', (season, team_id, season))
+
+        games = cursor.fetchall()
+
+        # Opponent turnovers (turnovers FORCED) with is_home for splits
+        cursor.execute('''
+            SELECT
+                opp_turnovers,
+                is_home
+            FROM team_game_logs
+            WHERE team_id = ?
+                AND season = ?
+                AND opp_turnovers IS NOT NULL
+                AND game_type IN ('Regular Season', 'NBA Cup')
+            ORDER BY game_date DESC
+        ''', (team_id, season))
+
+        opp_tov_games = cursor.fetchall()
+
+        return team_row, games, opp_tov_games
+
+    finally:
+        conn.close()
+
+
+def _turnover_rows_from_context(team_context):
+    """
+    Build the same rows as _query_turnover_rows from a TeamContext.
+
+    Returns:
+        Tuple of (team_row, games, opp_tov_games)
+    """
+    if not team_context.team:
+        return None, [], []
+
+    overall = team_context.overall
+    team_row = {
+        'team_id': team_context.team['team_id'],
+        'team_abbreviation': team_context.team['team_abbreviation'],
+        'full_name': team_context.team['full_name'],
+        'season_avg_turnovers': overall['turnovers'] if overall else None
+    }
+
+    eligible = team_context.games(eligible_only=True)
+    games = []
+    for g in eligible:
+        if g['turnovers'] is None:
+            continue
+        opp_row = team_context.opponent_overall(g['opponent_team_id'])
+        games.append({
+            'game_date': g['game_date'],
+            'is_home': g['is_home'],
+            'team_turnovers': g['turnovers'],
+            'opponent_tov_forced_rank': opp_row['opp_tov_rank'] if opp_row else None
+        })
+
+    opp_tov_games = [
+        {'opp_turnovers': g['opp_turnovers'], 'is_home': g['is_home']}
+        for g in eligible if g['opp_turnovers'] is not None
+    ]
+
+    return team_row, games, opp_tov_games
+
+
+@scoped_cache
+def get_team_turnover_vs_defense_pressure(team_id: int, season: str = '2025-26',
+                                          team_context=None) -> Optional[Dict]:
     """
     Get turnover splits by opponent defensive pressure tier and location.
 
@@ -53,6 +172,7 @@ def get_team_turnover_vs_defense_pressure(team_id: int, season: str = '2025-26')
     Args:
         team_id: NBA team ID
         season: Season string (e.g., '2025-26')
+        team_context: Optional TeamContext to read from instead of SQLite
 
     Returns:
         Dictionary with team info, season average turnovers, and splits by tier/location.
@@ -77,26 +197,14 @@ def get_team_turnover_vs_defense_pressure(team_id: int, season: str = '2025-26')
             }
         }
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
+    team_context = team_context or get_scoped_team_context(team_id, season)
 
     try:
-        # Step 1: Get team info and season average turnovers
-        cursor.execute('''
-            SELECT
-                t.team_id,
-                t.team_abbreviation,
-                t.full_name,
-                tss.turnovers as season_avg_turnovers
-            FROM nba_teams t
-            LEFT JOIN team_season_stats tss
-                ON t.team_id = tss.team_id
-                AND tss.season = ?
-                AND tss.split_type = 'overall'
-            WHERE t.team_id = ?
-        ''', (season, team_id))
-
-        team_row = cursor.fetchone()
+        # Step 1: Get team info, game rows and opponent turnover rows
+        if team_context is not None:
+            team_row, games, opp_tov_games = _turnover_rows_from_context(team_context)
+        else:
+            team_row, games, opp_tov_games = _query_turnover_rows(team_id, season)
 
         if not team_row:
             logger.warning(f'Team {team_id} not found')
@@ -114,30 +222,7 @@ def get_team_turnover_vs_defense_pressure(team_id: int, season: str = '2025-26')
             'avg_turnovers': team_row['season_avg_turnovers'] or 0            # Alternative field name
         }
 
-        # Step 2: Get opponent turnover forcing ranks for all games (ordered by date DESC for last10)
-        # Join team_game_logs with opponent's team_season_stats to get their TOV forced rank
-        # FILTER: Only Regular Season + NBA Cup (exclude Summer League, preseason, etc.)
-        cursor.execute('''
-            SELECT
-                tgl.game_date,
-                tgl.is_home,
-                tgl.turnovers as team_turnovers,
-                opp_stats.opp_tov_rank as opponent_tov_forced_rank
-            FROM team_game_logs tgl
-            LEFT JOIN team_season_stats opp_stats
-                ON tgl.opponent_team_id = opp_stats.team_id
-                AND opp_stats.season = ?
-                AND opp_stats.split_type = 'overall'
-            WHERE tgl.team_id = ?
-                AND tgl.season = ?
-                AND tgl.turnovers IS NOT NULL
-                AND tgl.game_type IN ('Regular Season', 'NBA Cup')
-            ORDER BY tgl.game_date DESC
-        ''', (season, team_id, season))
-
-        games = cursor.fetchall()
-
-        # Step 3: Calculate both season and last10 stats
+        # Step 2: Calculate both season and last10 stats
         # Season: all games
         season_splits = {
             'elite': {'home_turnovers': [], 'away_turnovers': []},
@@ -180,20 +265,6 @@ def get_team_turnover_vs_defense_pressure(team_id: int, season: str = '2025-26')
         team_info['last10_avg_tov'] = team_info['last10_avg_turnovers']
 
         # DEFENSIVE STATS: Calculate opponent turnovers (turnovers FORCED)
-        # Need to query opp_turnovers separately with is_home for splits
-        cursor.execute('''
-            SELECT
-                opp_turnovers,
-                is_home
-            FROM team_game_logs
-            WHERE team_id = ?
-                AND season = ?
-                AND opp_turnovers IS NOT NULL
-                AND game_type IN ('Regular Season', 'NBA Cup')
-            ORDER BY game_date DESC
-        ''', (team_id, season))
-
-        opp_tov_games = cursor.fetchall()
         all_opp_tovs = [g['opp_turnovers'] for g in opp_tov_games if g['opp_turnovers'] is not None]
         last10_opp_tovs = [g['opp_turnovers'] for g in opp_tov_games[:10] if g['opp_turnovers'] is not None]
 
@@ -232,7 +303,7 @@ def get_team_turnover_vs_defense_pressure(team_id: int, season: str = '2025-26')
             if idx < 10:
                 last10_splits[pressure_tier][location_key].append(game['team_turnovers'])
 
-        # Step 4: Calculate averages and game counts for season
+        # Step 3: Calculate averages and game counts for season
         result_splits = {}
         for tier in get_all_turnover_pressure_tiers():
             home_tovs = season_splits[tier]['home_turnovers']
@@ -247,7 +318,7 @@ def get_team_turnover_vs_defense_pressure(team_id: int, season: str = '2025-26')
 
         team_info['splits'] = result_splits
 
-        # Step 5: Calculate averages and game counts for last10
+        # Step 4: Calculate averages and game counts for last10
         last10_result_splits = {}
         for tier in get_all_turnover_pressure_tiers():
             home_tovs = last10_splits[tier]['home_turnovers']
@@ -267,6 +338,3 @@ def get_team_turnover_vs_defense_pressure(team_id: int, season: str = '2025-26')
     except Exception as e:
         logger.error(f'Error getting turnover vs defense pressure for team {team_id}: {e}')
         return None
-
-    finally:
-        conn.close()
@@ -22,18 +22,20 @@ logger = logging.getLogger(__name__)
 # Import centralized database configuration
 try:
     from api.utils.db_config import get_db_path
+    from api.utils.connection_pool import get_shared_connection
+    from api.utils.game_log_store import average, get_game_log_store
 except ImportError:
     from db_config import get_db_path
+    from connection_pool import get_shared_connection
+    from game_log_store import average, get_game_log_store
 
 # Database path
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
 def _get_db_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's shared read-only connection (close() releases it)"""
+    return get_shared_connection(NBA_DATA_DB_PATH, readonly=True)
 
 
 def get_pace_tier(pace: float) -> Optional[str]:
@@ -141,59 +143,22 @@ def get_team_turnover_vs_pace(team_id: int, season: str = '2025-26') -> Optional
             'avg_turnovers': team_row['season_avg_turnovers'] or 0            # Alternative field name
         }
 
-        # Step 2: Get all games with pace data (ordered by date DESC for last10)
+        # Step 2: Get all games with pace data (most recent first, for last10)
         # FILTER: Only Regular Season + NBA Cup (exclude Summer League, preseason, etc.)
-        cursor.execute('''
-            SELECT
-                game_date,
-                is_home,
-                turnovers as team_turnovers,
-                pace
-            FROM team_game_logs
-            WHERE team_id = ?
-                AND season = ?
-                AND turnovers IS NOT NULL
-                AND pace IS NOT NULL
-                AND pace > 0
-                AND game_type IN ('Regular Season', 'NBA Cup')
-            ORDER BY game_date DESC
-        ''', (team_id, season))
-
-        games = cursor.fetchall()
-
-        # Step 3: Calculate both season and last10 stats
-        # Season: all games
-        season_splits = {
-            'slow': {'home_turnovers': [], 'away_turnovers': []},
-            'normal': {'home_turnovers': [], 'away_turnovers': []},
-            'fast': {'home_turnovers': [], 'away_turnovers': []}
-        }
+        store = get_game_log_store(season)
+        games = store.team_rows(team_id, eligible_only=True, require=('turnovers',), positive=('pace',))
+        last10 = store.last_n(games, 10)
 
-        # Last10: only most recent 10 games
-        last10_splits = {
-            'slow': {'home_turnovers': [], 'away_turnovers': []},
-            'normal': {'home_turnovers': [], 'away_turnovers': []},
-            'fast': {'home_turnovers': [], 'away_turnovers': []}
-        }
-
-        # Calculate season avg and last10 avg turnovers (OFFENSIVE - turnovers committed)
+        # Step 3: Season avg and last10 avg turnovers (OFFENSIVE - turnovers committed)
         # Split by home/away
-        all_tovs = [g['team_turnovers'] for g in games if g['team_turnovers'] is not None]
-        last10_tovs = [g['team_turnovers'] for g in games[:10] if g['team_turnovers'] is not None]
-
-        home_tovs = [g['team_turnovers'] for g in games if g['team_turnovers'] is not None and g['is_home'] == 1]
-        away_tovs = [g['team_turnovers'] for g in games if g['team_turnovers'] is not None and g['is_home'] == 0]
-        last10_home_tovs = [g['team_turnovers'] for g in games[:10] if g['team_turnovers'] is not None and g['is_home'] == 1]
-        last10_away_tovs = [g['team_turnovers'] for g in games[:10] if g['team_turnovers'] is not None and g['is_home'] == 0]
-
-        team_info['season_avg_turnovers'] = round(sum(all_tovs) / len(all_tovs), 1) if all_tovs else 0
-        team_info['last10_avg_turnovers'] = round(sum(last10_tovs) / len(last10_tovs), 1) if last10_tovs else 0
+        team_info['season_avg_turnovers'] = average(store.values('turnovers', games))
+        team_info['last10_avg_turnovers'] = average(store.values('turnovers', last10))
 
         # Home/Away splits
-        team_info['season_avg_turnovers_home'] = round(sum(home_tovs) / len(home_tovs), 1) if home_tovs else 0
-        team_info['season_avg_turnovers_away'] = round(sum(away_tovs) / len(away_tovs), 1) if away_tovs else 0
-        team_info['last10_avg_turnovers_home'] = round(sum(last10_home_tovs) / len(last10_home_tovs), 1) if last10_home_tovs else 0
-        team_info['last10_avg_turnovers_away'] = round(sum(last10_away_tovs) / len(last10_away_tovs), 1) if last10_away_tovs else 0
+        team_info['season_avg_turnovers_home'] = average(store.values('turnovers', store.at_home(games)))
+        team_info['season_avg_turnovers_away'] = average(store.values('turnovers', store.at_home(games, home=False)))
+        team_info['last10_avg_turnovers_home'] = average(store.values('turnovers', store.at_home(last10)))
+        team_info['last10_avg_turnovers_away'] = average(store.values('turnovers', store.at_home(last10, home=False)))
 
         # Update all field aliases for both season and last10
         team_info['overall_avg_turnovers'] = team_info['season_avg_turnovers']
@@ -203,88 +168,41 @@ def get_team_turnover_vs_pace(team_id: int, season: str = '2025-26') -> Optional
         # Add last10 aliases
         team_info['last10_avg_tov'] = team_info['last10_avg_turnovers']
 
-        # DEFENSIVE STATS: Calculate opponent turnovers (turnovers FORCED)
-        # Need to query opp_turnovers separately with is_home for splits
-        cursor.execute('''
-            SELECT
-                opp_turnovers,
-                is_home
-            FROM team_game_logs
-            WHERE team_id = ?
-                AND season = ?
-                AND opp_turnovers IS NOT NULL
-                AND game_type IN ('Regular Season', 'NBA Cup')
-            ORDER BY game_date DESC
-        ''', (team_id, season))
-
-        opp_tov_games = cursor.fetchall()
-        all_opp_tovs = [g['opp_turnovers'] for g in opp_tov_games if g['opp_turnovers'] is not None]
-        last10_opp_tovs = [g['opp_turnovers'] for g in opp_tov_games[:10] if g['opp_turnovers'] is not None]
-
-        home_opp_tovs = [g['opp_turnovers'] for g in opp_tov_games if g['opp_turnovers'] is not None and g['is_home'] == 1]
-        away_opp_tovs = [g['opp_turnovers'] for g in opp_tov_games if g['opp_turnovers'] is not None and g['is_home'] == 0]
-        last10_home_opp_tovs = [g['opp_turnovers'] for g in opp_tov_games[:10] if g['opp_turnovers'] is not None and g['is_home'] == 1]
-        last10_away_opp_tovs = [g['opp_turnovers'] for g in opp_tov_games[:10] if g['opp_turnovers'] is not None and g['is_home'] == 0]
-
-        team_info['season_avg_opp_turnovers'] = round(sum(all_opp_tovs) / len(all_opp_tovs), 1) if all_opp_tovs else 0
-        team_info['last10_avg_opp_turnovers'] = round(sum(last10_opp_tovs) / len(last10_opp_tovs), 1) if last10_opp_tovs else 0
+        # DEFENSIVE STATS: Opponent turnovers (turnovers FORCED), pace not required
+        opp_tov_games = store.team_rows(team_id, eligible_only=True, require=('opp_turnovers',))
+        opp_last10 = store.last_n(opp_tov_games, 10)
+
+        team_info['season_avg_opp_turnovers'] = average(store.values('opp_turnovers', opp_tov_games))
+        team_info['last10_avg_opp_turnovers'] = average(store.values('opp_turnovers', opp_last10))
 
         # Home/Away splits for defensive
-        team_info['season_avg_opp_turnovers_home'] = round(sum(home_opp_tovs) / len(home_opp_tovs), 1) if home_opp_tovs else 0
-        team_info['season_avg_opp_turnovers_away'] = round(sum(away_opp_tovs) / len(away_opp_tovs), 1) if away_opp_tovs else 0
-        team_info['last10_avg_opp_turnovers_home'] = round(sum(last10_home_opp_tovs) / len(last10_home_opp_tovs), 1) if last10_home_opp_tovs else 0
-        team_info['last10_avg_opp_turnovers_away'] = round(sum(last10_away_opp_tovs) / len(last10_away_opp_tovs), 1) if last10_away_opp_tovs else 0
+        team_info['season_avg_opp_turnovers_home'] = average(store.values('opp_turnovers', store.at_home(opp_tov_games)))
+        team_info['season_avg_opp_turnovers_away'] = average(store.values('opp_turnovers', store.at_home(opp_tov_games, home=False)))
+        team_info['last10_avg_opp_turnovers_home'] = average(store.values('opp_turnovers', store.at_home(opp_last10)))
+        team_info['last10_avg_opp_turnovers_away'] = average(store.values('opp_turnovers', store.at_home(opp_last10, home=False)))
 
         # Add defensive field aliases
         team_info['overall_avg_opp_turnovers'] = team_info['season_avg_opp_turnovers']
         team_info['season_avg_opp_tov'] = team_info['season_avg_opp_turnovers']
         team_info['last10_avg_opp_tov'] = team_info['last10_avg_opp_turnovers']
 
-        for idx, game in enumerate(games):
-            pace = game['pace']
-            pace_tier = get_pace_tier(pace)
-
-            if not pace_tier:
-                continue
-
-            location_key = 'home_turnovers' if game['is_home'] else 'away_turnovers'
-
-            # Add to season splits (all games)
-            season_splits[pace_tier][location_key].append(game['team_turnovers'])
-
-            # Add to last10 splits (only first 10 games, which are most recent due to DESC order)
-            if idx < 10:
-                last10_splits[pace_tier][location_key].append(game['team_turnovers'])
-
-        # Step 4: Calculate averages and game counts for season
-        result_splits = {}
-        for tier in get_all_pace_tiers():
-            home_tovs = season_splits[tier]['home_turnovers']
-            away_tovs = season_splits[tier]['away_turnovers']
-
-            result_splits[tier] = {
-                'home_turnovers': round(sum(home_tovs) / len(home_tovs), 1) if home_tovs else None,
-                'home_games': len(home_tovs),
-                'away_turnovers': round(sum(away_tovs) / len(away_tovs), 1) if away_tovs else None,
-                'away_games': len(away_tovs)
-            }
-
-        team_info['splits'] = result_splits
-
-        # Step 5: Calculate averages and game counts for last10
-        last10_result_splits = {}
-        for tier in get_all_pace_tiers():
-            home_tovs = last10_splits[tier]['home_turnovers']
-            away_tovs = last10_splits[tier]['away_turnovers']
-
-            last10_result_splits[tier] = {
-                'home_turnovers': round(sum(home_tovs) / len(home_tovs), 1) if home_tovs else None,
-                'home_games': len(home_tovs),
-                'away_turnovers': round(sum(away_tovs) / len(away_tovs), 1) if away_tovs else None,
-                'away_games': len(away_tovs)
-            }
-
-        team_info['splits_last10'] = last10_result_splits
+        # Step 4: Averages and game counts per pace tier and location,
+        # for the season and for the last 10 games
+        for splits_key, selection in (('splits', games), ('splits_last10', last10)):
+            result_splits = {}
+            for tier in get_all_pace_tiers():
+                tier_games = store.in_pace_bucket(selection, tier)
+                home_games = store.at_home(tier_games)
+                away_games = store.at_home(tier_games, home=False)
+
+                result_splits[tier] = {
+                    'home_turnovers': average(store.values('turnovers', home_games), default=None),
+                    'home_games': len(home_games),
+                    'away_turnovers': average(store.values('turnovers', away_games), default=None),
+                    'away_games': len(away_games)
+                }
+
+            team_info[splits_key] = result_splits
 
         return team_info
 
@@ -12,13 +12,14 @@ import sqlite3
 import random
 from opponent_resistance import get_expected_matchup_metrics
 from db_config import get_db_path
+from connection_pool import get_shared_connection
 
 NBA_DATA_DB_PATH = get_db_path('nba_data.db')
 
 
 def get_random_games(count=10):
     """Get random game IDs from the date range"""
-    conn = sqlite3.connect(NBA_DATA_DB_PATH)
+    conn = get_shared_connection(NBA_DATA_DB_PATH, readonly=True, row_factory=None)
     cursor = conn.cursor()
 
     cursor.execute('''
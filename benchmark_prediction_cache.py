@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-process prediction cache vs shared SQLite cache
+
+Simulates gunicorn: N worker processes pull requests for game predictions
+from one queue (like accept() on a shared socket). A miss pays the cost of
+the prediction pipeline (simulated with --compute-ms), a hit only the cache
+lookup. Workers are recycled every --max-requests requests, like gunicorn's
+max_requests.
+
+Reports hit rate and p50/p95/p99 request latency for each backend.
+
+Usage:
+    python benchmark_prediction_cache.py
+    python benchmark_prediction_cache.py --workers 2 --requests 2000 --games 40 --compute-ms 80
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import random
+import tempfile
+import time
+
+from api.utils.prediction_cache import PredictionCache, SQLiteCacheBackend
+
+
+def _worker(backend, db_path, requests_q, results_q, max_requests, compute_ms):
+    """One simulated gunicorn worker; exits after max_requests to be recycled."""
+    shared = SQLiteCacheBackend(db_path) if backend == 'sqlite' else None
+    cache = PredictionCache(max_size=128, ttl_seconds=3600,
+                            version_fn=lambda: 'bench', shared=shared)
+
+    served = 0
+    while served < max_requests:
+        key = requests_q.get()
+        if key is None:
+            results_q.put(None)
+            return
+
+        start = time.perf_counter()
+        found, value = cache.get(key)
+        if not found:
+            time.sleep(compute_ms / 1000.0)  # Prediction pipeline
+            value = {'predicted_total': 225.0 + key[0] % 10, 'breakdown': {'key': key}}
+            cache.put(key, value)
+        results_q.put((found, (time.perf_counter() - start) * 1000))
+        served += 1
+
+    results_q.put('recycle')
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def run_backend(backend, args, keys):
+    """Run one backend over the same request stream"""
+    db_path = os.path.join(tempfile.mkdtemp(prefix='pred_cache_bench_'), 'prediction_cache.db')
+    if backend == 'sqlite':
+        SQLiteCacheBackend(db_path)  # Create schema before workers start
+
+    ctx = mp.get_context('fork')
+    requests_q = ctx.Queue()
+    results_q = ctx.Queue()
+
+    def spawn():
+        p = ctx.Process(target=_worker, args=(backend, db_path, requests_q, results_q,
+                                              args.max_requests, args.compute_ms))
+        p.start()
+        return p
+
+    workers = [spawn() for _ in range(args.workers)]
+    for key in keys:
+        requests_q.put(key)
+
+    latencies, hits, done = [], 0, 0
+    recycled = 0
+    while done < len(keys):
+        item = results_q.get()
+        if item == 'recycle':
+            recycled += 1
+            workers.append(spawn())
+            continue
+        found, elapsed_ms = item
+        hits += 1 if found else 0
+        latencies.append(elapsed_ms)
+        done += 1
+
+    for _ in workers:
+        requests_q.put(None)
+    for p in workers:
+        p.join(timeout=5)
+
+    return {
+        'backend': backend,
+        'hit_rate': hits / len(keys),
+        'p50_ms': _percentile(latencies, 50),
+        'p95_ms': _percentile(latencies, 95),
+        'p99_ms': _percentile(latencies, 99),
+        'recycled': recycled
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--games', type=int, default=30, help='Distinct game/line keys requested')
+    parser.add_argument('--compute-ms', type=float, default=60.0, help='Simulated prediction cost on a miss')
+    parser.add_argument('--max-requests', type=int, default=300, help='Requests per worker before recycling')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    # Skewed traffic: a few marquee games get most of the requests
+    rng = random.Random(args.seed)
+    games = [(1610612700 + i, 1610612750 - i, 220.5 + i % 5) for i in range(args.games)]
+    weights = [1.0 / (rank + 1) for rank in range(args.games)]
+    keys = rng.choices(games, weights=weights, k=args.requests)
+
+    print("=" * 70)
+    print(f"PREDICTION CACHE BENCHMARK: {args.workers} workers, {args.requests} requests, "
+          f"{args.games} games, {args.compute_ms:.0f}ms per miss")
+    print("=" * 70)
+    print(f"{'backend':<10}{'hit rate':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'recycled':>10}")
+
+    for backend in ('memory', 'sqlite'):
+        r = run_backend(backend, args, keys)
+        print(f"{r['backend']:<10}{r['hit_rate']:>10.1%}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}"
+              f"{r['p99_ms']:>10.2f}{r['recycled']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Benchmark: predict_game_total per-stage latency
+
+Runs the prediction engine over a fixed set of games against a fixture copy
+of the data directory and reports, for every stage marked with mark_stage()
+in predict_game_total: median wall time, SQL statements per call and net
+allocated memory blocks per call (optionally peak traced memory).
+
+Results are compared to a stored baseline; the script exits 1 when a stage
+got slower than baseline * (1 + tolerance) + slack, or runs more SQL
+statements than the baseline did.
+
+Usage:
+    python benchmark_prediction_engine.py
+    python benchmark_prediction_engine.py --games 10 --repeat 5
+    python benchmark_prediction_engine.py --update-baseline
+    python benchmark_prediction_engine.py --fixture /path/to/data --trace-memory
+"""
+
+import argparse
+import contextlib
+import glob
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FIXTURE = os.path.join(ROOT, 'api', 'data')
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmark_prediction_engine_baseline.json')
+SEASON = '2025-26'
+
+
+def copy_fixture(fixture_dir):
+    """Consistent copies of every SQLite database in fixture_dir (WAL included)"""
+    target = tempfile.mkdtemp(prefix='engine_bench_')
+    for path in glob.glob(os.path.join(fixture_dir, '*.db')):
+        source = sqlite3.connect(path)
+        dest = sqlite3.connect(os.path.join(target, os.path.basename(path)))
+        source.backup(dest)
+        dest.close()
+        source.close()
+    return target
+
+
+def select_games(count):
+    """The most recent completed games in the fixture (deterministic)"""
+    from api.utils.db_config import get_db_path
+
+    conn = sqlite3.connect(get_db_path('nba_data.db'))
+    rows = conn.execute('''
+        SELECT game_id,
+               MAX(CASE WHEN is_home = 1 THEN team_id END),
+               MAX(CASE WHEN is_home = 0 THEN team_id END)
+        FROM team_game_logs
+        WHERE season = ?
+        GROUP BY game_id
+        HAVING COUNT(*) = 2
+        ORDER BY MAX(game_date) DESC, game_id DESC
+        LIMIT ?
+    ''', (SEASON, count)).fetchall()
+    conn.close()
+    return rows
+
+
+def run_benchmark(games, repeat, trace_memory):
+    """Profile predict_game_total over every game, repeat times"""
+    from api.utils.db_queries import get_all_teams, get_matchup_data
+    from api.utils.performance import StageProfiler
+    from api.utils.prediction_engine import predict_game_total
+
+    abbreviations = {team['id']: team['abbreviation'] for team in get_all_teams(SEASON)}
+    inputs = [(game_id, home, away, get_matchup_data(home, away, SEASON)) for game_id, home, away in games]
+    inputs = [item for item in inputs if item[3] is not None]
+
+    def predict(game_id, home, away, matchup_data):
+        return predict_game_total(
+            matchup_data['home'], matchup_data['away'], None,
+            home_team_id=home, away_team_id=away,
+            home_team_abbr=abbreviations.get(home), away_team_abbr=abbreviations.get(away),
+            season=SEASON, game_id=game_id
+        )
+
+    profiler = StageProfiler(trace_memory=trace_memory)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        # Warm-up: imports, module-level caches
+        for item in inputs:
+            predict(*item)
+
+        for _ in range(repeat):
+            for item in inputs:
+                with profiler.profile('inputs'):
+                    predict(*item)
+
+    return profiler.get_stage_stats(), len(inputs)
+
+
+def compare_to_baseline(stats, baseline, tolerance, slack_ms):
+    """List of regression messages (empty when every stage is within budget)"""
+    regressions = []
+    for stage, base in baseline['stages'].items():
+        current = stats.get(stage)
+        if current is None:
+            continue
+        budget = base['median_ms'] * (1 + tolerance) + slack_ms
+        if current['median_ms'] > budget:
+            regressions.append(f"{stage}: {current['median_ms']:.2f}ms > {budget:.2f}ms "
+                               f"(baseline {base['median_ms']:.2f}ms)")
+        if current['queries_per_call'] > base['queries_per_call']:
+            regressions.append(f"{stage}: {current['queries_per_call']} SQL statements per call "
+                               f"(baseline {base['queries_per_call']})")
+    return regressions
+
+
+def print_report(stats, baseline):
+    """One row per stage, slowest total first in the summary line"""
+    base_stages = baseline['stages'] if baseline else {}
+    print(f"\n{'Stage':<24} {'median ms':>10} {'baseline':>10} {'max ms':>8} "
+          f"{'SQL/call':>9} {'blocks/call':>12} {'peak KB':>8}")
+    print("-" * 87)
+    for stage, s in stats.items():
+        base = base_stages.get(stage)
+        base_ms = f"{base['median_ms']:.2f}" if base else '-'
+        peak = f"{s['peak_kb']:.0f}" if s['peak_kb'] is not None else '-'
+        print(f"{stage:<24} {s['median_ms']:>10.2f} {base_ms:>10} {s['max_ms']:>8.2f} "
+              f"{s['queries_per_call']:>9.1f} {s['alloc_blocks_per_call']:>12} {peak:>8}")
+    print("-" * 87)
+    total_ms = sum(s['median_ms'] for s in stats.values())
+    total_queries = sum(s['queries_per_call'] for s in stats.values())
+    print(f"{'total':<24} {total_ms:>10.2f} {'':>10} {'':>8} {total_queries:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-stage latency benchmark for predict_game_total')
+    parser.add_argument('--fixture', default=DEFAULT_FIXTURE, help='Data directory to copy')
+    parser.add_argument('--games', type=int, default=8, help='Games to predict')
+    parser.add_argument('--repeat', type=int, default=3, help='Passes over the games')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON path')
+    parser.add_argument('--update-baseline', action='store_true', help='Store this run as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='Allowed relative slowdown per stage')
+    parser.add_argument('--slack-ms', type=float, default=2.0, help='Allowed absolute slowdown per stage')
+    parser.add_argument('--trace-memory', action='store_true', help='Record peak traced memory per stage')
+    args = parser.parse_args()
+
+    # Point every module at the fixture copy before anything imports db_config
+    os.environ['DB_PATH'] = copy_fixture(args.fixture)
+    sys.path.insert(0, ROOT)
+
+    games = select_games(args.games)
+    stats, predicted = run_benchmark(games, args.repeat, args.trace_memory)
+    print(f"Predicted {predicted} games x {args.repeat} passes from {args.fixture}")
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print_report(stats, baseline)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                'games': predicted,
+                'repeat': args.repeat,
+                'python': platform.python_version(),
+                'stages': {stage: {'median_ms': s['median_ms'], 'queries_per_call': s['queries_per_call'],
+                                   'alloc_blocks_per_call': s['alloc_blocks_per_call']}
+                           for stage, s in stats.items()}
+            }, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print("\nNo baseline to compare against (run with --update-baseline)")
+        return 0
+
+    regressions = compare_to_baseline(stats, baseline, args.tolerance, args.slack_ms)
+    if regressions:
+        print("\n✗ Regressions:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+
+    print("\n✓ All stages within baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
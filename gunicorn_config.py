@@ -1,5 +1,7 @@
 # Gunicorn Configuration for Railway Deployment
 
+import os
+
 # Worker timeout (10 minutes to handle slow NBA API calls)
 # Railway has 10min request timeout, so we set worker timeout to 9 minutes
 timeout = 540  # 9 minutes in seconds
@@ -7,8 +9,13 @@ timeout = 540  # 9 minutes in seconds
 # Number of worker processes
 workers = 2
 
-# Worker class
-worker_class = 'sync'
+# Worker class: threaded, so cheap reads keep flowing while a worker is
+# busy with a slow request. Screenshot reviews and async syncs run as
+# background jobs (api/utils/background_jobs.py) and don't hold a thread.
+worker_class = 'gthread'
+
+# Request threads per worker process
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
 
 # Bind to Railway's PORT
 bind = "0.0.0.0:8080"
@@ -30,5 +37,6 @@ max_requests_jitter = 100
 
 print("[gunicorn] Configuration loaded:")
 print(f"  - Worker timeout: {timeout}s (9 minutes)")
-print(f"  - Workers: {workers}")
+print(f"  - Workers: {workers} ({worker_class}, {threads} threads each)")
 print(f"  - Graceful timeout: {graceful_timeout}s")
+print(f"  - Prediction cache backend: {os.environ.get('PREDICTION_CACHE_BACKEND', 'sqlite')}")
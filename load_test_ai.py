@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Load test: AI endpoints against a server on the replay OpenAI backend
+
+Drives the two AI-heavy paths concurrently over today's slate:
+
+  writeups  GET /api/game_detail for every game, --page-views times, from
+            --concurrency clients. Reports latency and how many views were
+            served AI sections from cache ('ready') vs queued ('pending'),
+            then how long the queued generations took to finish.
+  reviews   POST a screenshot for each game (--reviews uploads), poll the
+            background jobs, and report submit latency, time spent queued
+            (worker saturation) and run time; then read the Model Coach
+            summary for the slate date.
+
+Start the server on a scratch copy of the data with OPENAI_BACKEND=replay
+(reviews write to game_reviews.db), e.g.
+
+    cp -r api/data /tmp/loadtest-data
+    DB_PATH=/tmp/loadtest-data OPENAI_BACKEND=replay OPENAI_REPLAY_LATENCY_MS=1500-4000 \\
+        gunicorn -c gunicorn_config.py server:app
+
+Usage:
+    python load_test_ai.py
+    python load_test_ai.py --base-url http://localhost:8080 --concurrency 32 --page-views 5 --reviews 20
+    python load_test_ai.py --scenario reviews --date 2026-01-04
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+# Smallest valid PNG; the replay backend never looks at the image
+PNG_BYTES = bytes.fromhex(
+    '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+    '1f15c4890000000d49444154789c6300010000000500010d0a2db40000000049454e44ae426082'
+)
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def _latency_line(label, values):
+    return (f"{label:<28}{len(values):>8}{_percentile(values, 50):>10.0f}"
+            f"{_percentile(values, 95):>10.0f}{_percentile(values, 99):>10.0f}{max(values or [0]):>10.0f}")
+
+
+def _seconds_between(start, end):
+    if not start or not end:
+        return None
+    return (datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds()
+
+
+def wait_for_jobs(base_url, job_ids, timeout):
+    """Poll /api/jobs/<id> until every job finishes; returns {job_id: job}"""
+    deadline = time.monotonic() + timeout
+    pending, finished = set(job_ids), {}
+    while pending and time.monotonic() < deadline:
+        for job_id in list(pending):
+            job = requests.get(f'{base_url}/api/jobs/{job_id}', timeout=30).json().get('job')
+            if job is None or job['status'] not in ('queued', 'running'):
+                finished[job_id] = job
+                pending.discard(job_id)
+        if pending:
+            time.sleep(1)
+    for job_id in pending:
+        finished[job_id] = None
+    return finished
+
+
+def report_jobs(jobs):
+    statuses = Counter((job or {}).get('status', 'timed out') for job in jobs.values())
+    queued_s = [_seconds_between(j['created_at'], j['started_at']) for j in jobs.values() if j and j['started_at']]
+    run_s = [j['duration_ms'] / 1000.0 for j in jobs.values() if j and j['duration_ms'] is not None]
+    errors = Counter(j['error_code'] or j['error'] for j in jobs.values() if j and j['status'] == 'failed')
+
+    print(f"  jobs: {dict(statuses)}")
+    if errors:
+        print(f"  errors: {dict(errors)}")
+    print(f"  {'':<26}{'count':>8}{'p50 s':>10}{'p95 s':>10}{'p99 s':>10}{'max s':>10}")
+    print(f"  {'queued (waiting on pool)':<26}{len(queued_s):>8}{_percentile(queued_s, 50):>10.1f}"
+          f"{_percentile(queued_s, 95):>10.1f}{_percentile(queued_s, 99):>10.1f}{max(queued_s or [0]):>10.1f}")
+    print(f"  {'running':<26}{len(run_s):>8}{_percentile(run_s, 50):>10.1f}"
+          f"{_percentile(run_s, 95):>10.1f}{_percentile(run_s, 99):>10.1f}{max(run_s or [0]):>10.1f}")
+
+
+def run_writeups(args, games):
+    """Concurrent game_detail page views; AI sections come from cache or a queued job"""
+    views = [game['game_id'] for game in games for _ in range(args.page_views)]
+    random.Random(args.seed).shuffle(views)
+
+    def view(game_id):
+        start = time.perf_counter()
+        response = requests.get(f'{args.base_url}/api/game_detail', params={'game_id': game_id}, timeout=120)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        ai_status = {}
+        if response.ok:
+            ai_status = response.json().get('ai_status') or {}
+        return response.status_code, elapsed_ms, ai_status
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(view, views))
+    wall = time.perf_counter() - start
+
+    codes = Counter(code for code, _, _ in results)
+    ai = Counter(status.get('status', 'missing') for _, _, status in results)
+    job_ids = {status['job_id'] for _, _, status in results if status.get('job_id')}
+
+    print(f"\nWRITEUPS: {len(views)} page views of {len(games)} games, {args.concurrency} clients, "
+          f"{len(views) / wall:.1f} req/s")
+    print(f"  status codes: {dict(codes)}")
+    print(f"  ai_status: {dict(ai)}  (cache hit rate {ai['ready'] / max(1, len(results)):.0%}, "
+          f"{len(job_ids)} generation jobs for {ai['pending']} pending views)")
+    print(f"  {'':<26}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    print('  ' + _latency_line('game_detail', [ms for _, ms, _ in results]))
+
+    if job_ids:
+        start = time.perf_counter()
+        jobs = wait_for_jobs(args.base_url, job_ids, args.job_timeout)
+        print(f"  all generations finished in {time.perf_counter() - start:.1f}s")
+        report_jobs(jobs)
+
+
+def run_reviews(args, games, date):
+    """Concurrent screenshot uploads; each becomes a screenshot_review job"""
+    uploads = [games[i % len(games)] for i in range(args.reviews)]
+
+    def upload(game):
+        start = time.perf_counter()
+        response = requests.post(
+            f"{args.base_url}/api/games/{game['game_id']}/result-screenshot",
+            files={'screenshot': ('final.png', PNG_BYTES, 'image/png')},
+            data={
+                'home_team': game['home_team']['abbreviation'],
+                'away_team': game['away_team']['abbreviation'],
+                'game_date': date,
+                'sportsbook_line': '225.5',
+                # The projection the UI shows, used when the server has no stored prediction
+                'predicted_home': '113.0',
+                'predicted_away': '109.5',
+                'predicted_total': '222.5',
+            },
+            timeout=120
+        )
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        return response.status_code, elapsed_ms, response.json().get('job_id')
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(upload, uploads))
+
+    print(f"\nREVIEWS: {len(uploads)} screenshot uploads for {len(games)} games, {args.concurrency} clients")
+    print(f"  status codes: {dict(Counter(code for code, _, _ in results))}")
+    print(f"  {'':<26}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    print('  ' + _latency_line('upload (202)', [ms for _, ms, _ in results]))
+
+    job_ids = {job_id for _, _, job_id in results if job_id}
+    if not job_ids:
+        return
+    start = time.perf_counter()
+    jobs = wait_for_jobs(args.base_url, job_ids, args.job_timeout)
+    print(f"  all reviews finished in {time.perf_counter() - start:.1f}s")
+    report_jobs(jobs)
+
+    summary_ms = []
+    statuses = Counter()
+    for _ in range(args.page_views):
+        start = time.perf_counter()
+        response = requests.get(f'{args.base_url}/api/model-review/summary', params={'date': date}, timeout=120)
+        summary_ms.append((time.perf_counter() - start) * 1000)
+        statuses[response.json().get('summary_status', response.status_code)] += 1
+    print(f"  model coach summary: {dict(statuses)}")
+    print('  ' + _latency_line('model-review/summary', summary_ms))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://localhost:8080')
+    parser.add_argument('--scenario', choices=('all', 'writeups', 'reviews'), default='all')
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent clients')
+    parser.add_argument('--page-views', type=int, default=3, help='game_detail views per game')
+    parser.add_argument('--reviews', type=int, default=10, help='Screenshot uploads')
+    parser.add_argument('--job-timeout', type=float, default=600, help='Seconds to wait for background jobs')
+    parser.add_argument('--date', help='Slate date YYYY-MM-DD (default: the server\'s default slate)')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    args.base_url = args.base_url.rstrip('/')
+
+    backend = requests.get(f'{args.base_url}/api/debug/openai-key', timeout=30).json().get('backend')
+    if backend != 'replay':
+        print(f"WARNING: server OpenAI backend is {backend!r}, not 'replay' - this run calls the real API")
+
+    params = {'date': args.date} if args.date else {}
+    slate = requests.get(f'{args.base_url}/api/games', params=params, timeout=120).json()
+    games = slate.get('games') or []
+    if not games:
+        print(f"No games on the slate ({slate.get('date')}); nothing to test")
+        return
+
+    print("=" * 70)
+    print(f"AI LOAD TEST: {args.base_url}, slate {slate.get('date')} ({len(games)} games), backend {backend}")
+    print("=" * 70)
+
+    if args.scenario in ('all', 'writeups'):
+        run_writeups(args, games)
+    if args.scenario in ('all', 'reviews'):
+        run_reviews(args, games, slate.get('date'))
+
+
+if __name__ == '__main__':
+    main()
@@ -21,16 +21,24 @@ logger = logging.getLogger(__name__)
 # Add the api directory to path
 sys.path.append(os.path.dirname(__file__))
 
+# Trace SQL on every connection, so install before any module opens one
+from api.utils.sql_trace import install_sql_tracing, create_sql_trace_middleware
+install_sql_tracing()
+
 from api.utils.db_queries import get_todays_games, get_matchup_data, get_all_teams, get_team_stats_with_ranks
 from api.utils.prediction_engine import predict_game_total
+from api.utils.prediction_context import with_prediction_scope
+from api.utils.prediction_cache import get_prediction_cache
 from api.utils import db
 from api.utils import team_ratings_model
 from api.utils import team_rankings
 from api.utils import db_queries
+from api.utils.db_schema_similarity import DB_PATH as SIMILARITY_DB_PATH
 from api.utils.performance import create_timing_middleware
-from api.utils.matchup_summary_cache import get_or_generate_summary
-from api.utils.empty_possessions_calculator import calculate_matchup_empty_possessions
-from api.utils.ai_writeup_cache import get_or_generate_writeup
+from api.utils.connection_pool import get_shared_connection, reset_shared_connections
+from api.utils.game_payloads import get_game_payload, get_payload_stats, PayloadUnavailable
+from api.utils.ai_generation_queue import attach_ai_sections
+from api.utils.http_cache import conditional_get, create_compression_middleware, file_stamp, skip_etag
 import json
 import os
 
@@ -50,9 +58,23 @@ except Exception as e:
 app = Flask(__name__, static_folder='dist', static_url_path='')
 CORS(app)
 
+# gzip/brotli for large JSON bodies (registered first so it runs after the
+# other after_request hooks and sees the final body and ETag)
+create_compression_middleware(app)
+
 # Enable performance logging middleware
 create_timing_middleware(app)
 
+# Per-request SQL query counts and N+1 detection (X-SQL-* headers in debug)
+create_sql_trace_middleware(app)
+
+
+@app.teardown_request
+def release_shared_connections(exc):
+    """Release shared SQLite connections a handler forgot to close()"""
+    reset_shared_connections()
+
+
 # Add cache control headers to prevent browser caching issues on deployment
 @app.after_request
 def add_cache_headers(response):
@@ -62,7 +84,8 @@ def add_cache_headers(response):
     Strategy:
     - index.html: No cache (always fetch fresh)
     - JS/CSS assets: Cache for 1 year (Vite adds hashes to filenames)
-    - API responses: No cache (always fresh data)
+    - API responses with an ETag: revalidate on every use (304 if unchanged)
+    - Other API responses: No cache (always fresh data)
     """
     # Don't cache index.html - always fetch fresh on reload
     if request.path == '/' or request.path.endswith('.html'):
@@ -74,7 +97,11 @@ def add_cache_headers(response):
     elif request.path.endswith(('.js', '.css', '.woff', '.woff2', '.ttf', '.eot')):
         response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
 
-    # Don't cache API responses
+    # Versioned API responses may be stored but must be revalidated
+    elif request.path.startswith('/api/') and response.headers.get('ETag'):
+        response.headers['Cache-Control'] = 'no-cache'
+
+    # Don't cache other API responses
     elif request.path.startswith('/api/'):
         response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
         response.headers['Pragma'] = 'no-cache'
@@ -108,10 +135,20 @@ try:
 except Exception as e:
     print(f"[startup] Warning: Database initialization had issues: {e}")
 
-# In-memory prediction cache
-_prediction_cache = {}
-_CACHE_MAX_SIZE = 128
+# Serve request reads from an in-memory snapshot of nba_data.db (DB_SNAPSHOT_SERVING=1)
+try:
+    from api.utils.db_snapshot import snapshot_serving_enabled, ensure_snapshot
+
+    if snapshot_serving_enabled():
+        ensure_snapshot()
+        print("[startup] ✓ Serving reads from nba_data.db snapshot")
+except Exception as e:
+    print(f"[startup] Warning: Could not publish nba_data.db snapshot: {e}")
+
+# In-memory prediction cache (LRU + TTL, invalidated by data syncs)
+_prediction_cache = get_prediction_cache()
 
+@with_prediction_scope
 def get_cached_prediction(home_team_id, away_team_id, betting_line, game_id=None):
     """
     Get prediction from cache or generate new one.
@@ -121,9 +158,10 @@ def get_cached_prediction(home_team_id, away_team_id, betting_line, game_id=None
     """
     cache_key = (int(home_team_id), int(away_team_id), betting_line)
 
-    if cache_key in _prediction_cache:
+    found, cached = _prediction_cache.get(cache_key)
+    if found:
         print(f'[cache] HIT: Returning cached prediction for game {away_team_id}@{home_team_id} (line: {betting_line})')
-        cached_prediction, cached_matchup_data = _prediction_cache[cache_key]
+        cached_prediction, cached_matchup_data = cached
         return cached_prediction, cached_matchup_data
 
     print(f'[cache] MISS: Generating prediction for game {away_team_id}@{home_team_id} (line: {betting_line})')
@@ -150,17 +188,16 @@ def get_cached_prediction(home_team_id, away_team_id, betting_line, game_id=None
         game_id=game_id
     )
 
-    if len(_prediction_cache) >= _CACHE_MAX_SIZE:
-        oldest_key = next(iter(_prediction_cache))
-        print(f'[cache] EVICT: Removing oldest entry {oldest_key}')
-        _prediction_cache.pop(oldest_key)
+    _store_cached_prediction(cache_key, prediction, matchup_data)
+
+    return prediction, matchup_data
 
+def _store_cached_prediction(cache_key, prediction, matchup_data):
+    """Store a prediction and its matchup data in the in-memory cache."""
     # Cache both prediction and matchup_data to avoid duplicate API calls
-    _prediction_cache[cache_key] = (prediction, matchup_data)
+    _prediction_cache.put(cache_key, (prediction, matchup_data))
     print(f'[cache] STORE: Cached prediction and matchup data for {cache_key}')
 
-    return prediction, matchup_data
-
 @app.route('/')
 def index():
     """Serve the React app"""
@@ -171,21 +208,95 @@ def health():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
-        'timestamp': datetime.now(timezone.utc).isoformat()
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'prediction_cache': _prediction_cache.get_stats(),
+        'game_payloads': get_payload_stats()
     })
 
 @app.route('/api/admin/sync-status', methods=['GET'])
 def admin_sync_status():
     """Check if a sync operation is currently running"""
     from api.utils.sync_lock import is_sync_in_progress, get_current_sync, get_sync_history
+    from api.utils.db_snapshot import get_snapshot_status
 
     return jsonify({
         'sync_in_progress': is_sync_in_progress(),
         'current_sync': get_current_sync(),
-        'recent_syncs': get_sync_history(limit=5)
+        'recent_syncs': get_sync_history(limit=5),
+        'serving_snapshot': get_snapshot_status()
     })
 
 
+@app.route('/api/admin/sql-trace', methods=['GET'])
+def admin_sql_trace():
+    """
+    Per-endpoint SQL statistics and the most recent request traces
+
+    Query params:
+    - reset: 1 to clear the statistics after reading them
+    """
+    from api.utils.sql_trace import get_endpoint_stats
+
+    try:
+        stats = get_endpoint_stats()
+        snapshot = stats.snapshot()
+        if request.args.get('reset') == '1':
+            stats.clear()
+        return jsonify({'success': True, **snapshot})
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_background_job(job_id):
+    """
+    Status of a background job (screenshot review, sync)
+
+    Returns:
+        {
+            'success': True,
+            'job': {
+                'job_id', 'kind', 'status' (queued|running|succeeded|failed),
+                'params', 'result', 'error', 'error_code',
+                'created_at', 'started_at', 'finished_at', 'duration_ms'
+            }
+        }
+    """
+    from api.utils.background_jobs import get_job
+
+    try:
+        job = get_job(job_id)
+        if job is None:
+            return jsonify({'success': False, 'error': f'Job {job_id} not found'}), 404
+        return jsonify({'success': True, 'job': job})
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/admin/jobs', methods=['GET'])
+def admin_list_jobs():
+    """
+    Most recent background jobs
+
+    Query params:
+    - kind: only jobs of this kind (e.g. 'sync', 'screenshot_review')
+    - limit: number of jobs (default 20)
+    """
+    from api.utils.background_jobs import list_jobs
+
+    try:
+        jobs = list_jobs(kind=request.args.get('kind'), limit=int(request.args.get('limit', 20)))
+        return jsonify({'success': True, 'jobs': jobs, 'count': len(jobs)})
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @app.route('/api/admin/sync/status', methods=['GET'])
 def admin_sync_run_status():
     """
@@ -200,11 +311,12 @@ def admin_sync_run_status():
     - How many games NBA CDN returned
     - How many were inserted/updated/skipped
     - Current games count in DB for that date
+    - With run_id: the run's steps (today's games sync, derived stages,
+      slate warm-up per game) nested under it in 'steps'
     """
-    import sqlite3
     from zoneinfo import ZoneInfo
     from datetime import datetime
-    from api.utils.db_config import get_db_path
+    from api.utils.sync_nba_data import get_sync_runs
 
     # Parse query params
     target_date_param = request.args.get('date')
@@ -216,36 +328,11 @@ def admin_sync_run_status():
         target_date_param = datetime.now(mt_tz).strftime('%Y-%m-%d')
 
     try:
-        conn = sqlite3.connect(get_db_path('nba_data.db'))
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        if run_id_param:
-            # Query specific run by run_id
-            cursor.execute("""
-                SELECT * FROM data_sync_log
-                WHERE run_id = ?
-                ORDER BY started_at DESC
-                LIMIT 1
-            """, (run_id_param,))
-        elif target_date_param:
-            # Query runs for target date
-            cursor.execute("""
-                SELECT * FROM data_sync_log
-                WHERE target_date_mt = ?
-                ORDER BY started_at DESC
-                LIMIT 10
-            """, (target_date_param,))
-        else:
-            # Query recent runs
-            cursor.execute("""
-                SELECT * FROM data_sync_log
-                ORDER BY started_at DESC
-                LIMIT 10
-            """)
+        # Specific run by run_id, runs for the target date, or recent runs
+        runs = get_sync_runs(run_id=run_id_param, target_date_mt=target_date_param)
 
-        rows = cursor.fetchall()
-        runs = [dict(row) for row in rows]
+        conn = get_shared_connection('nba_data', readonly=True)
+        cursor = conn.cursor()
 
         # Also get current games count for target date if specified
         games_in_db = None
@@ -353,25 +440,17 @@ def admin_sync_dry_run():
 @app.route('/api/admin/sync-now', methods=['GET'])
 def admin_sync_now():
     """Temporary GET endpoint to trigger sync (remove after initial sync)"""
-    import threading
+    from api.utils.background_jobs import submit_job
     from api.utils.sync_nba_data import sync_all
 
-    def background_sync():
-        try:
-            print('[admin/sync-now] Starting background sync...')
-            result = sync_all(season='2025-26', triggered_by='admin_get')
-            print(f'[admin/sync-now] Sync completed: {result}')
-        except Exception as e:
-            print(f'[admin/sync-now] Sync failed: {e}')
-            import traceback
-            traceback.print_exc()
-
-    thread = threading.Thread(target=background_sync, daemon=True)
-    thread.start()
+    job_id = submit_job('sync', sync_all, season='2025-26', triggered_by='admin_get',
+                        params={'season': '2025-26', 'triggered_by': 'admin_get'})
 
     return jsonify({
         'success': True,
-        'message': 'Sync started in background. Check logs for progress.'
+        'message': 'Sync started in background. Check logs for progress.',
+        'job_id': job_id,
+        'job_status_endpoint': f'/api/jobs/{job_id}'
     })
 
 
@@ -383,7 +462,7 @@ def check_assists_data():
 
     try:
         db_path = get_db_path('nba_data.db')
-        conn = sqlite3.connect(db_path)
+        conn = get_shared_connection(db_path, readonly=True, row_factory=None)
         cursor = conn.cursor()
 
         cursor.execute('''
@@ -422,8 +501,7 @@ def admin_rank_assists():
     try:
         season = '2025-26'
         db_path = get_db_path('nba_data.db')
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
+        conn = get_shared_connection(db_path)
         cursor = conn.cursor()
 
         print(f'[rank-assists] Aggregating opponent assists for all teams...')
@@ -491,7 +569,7 @@ def admin_rank_assists():
 @app.route('/api/admin/sync', methods=['POST'])
 def admin_sync():
     """Admin endpoint to trigger data sync (protected by secret token)"""
-    import threading
+    from api.utils.background_jobs import submit_job
     from api.utils.sync_nba_data import sync_all
 
     # Check authentication
@@ -523,35 +601,29 @@ def admin_sync():
     # Generate run_id for tracking
     run_id = str(uuid.uuid4())
 
-    # Run sync in background thread if async mode
+    # Run sync as a background job if async mode
     if async_mode:
-        def background_sync(run_id):
-            try:
-                print(f'[admin/sync] [run_id={run_id}] Starting background {sync_type} sync for {season}')
-                result = sync_all(
-                    season=season,
-                    triggered_by='admin_api',
-                    run_id=run_id,
-                    target_date_mt=target_date_mt
-                )
-                print(f'[admin/sync] [run_id={run_id}] Background sync completed: {result}')
-            except Exception as e:
-                print(f'[admin/sync] [run_id={run_id}] Background sync failed: {e}')
-                import traceback
-                traceback.print_exc()
-
-        thread = threading.Thread(target=lambda: background_sync(run_id), daemon=True)
-        thread.start()
+        print(f'[admin/sync] [run_id={run_id}] Queueing background {sync_type} sync for {season}')
+        job_id = submit_job(
+            'sync', sync_all,
+            season=season,
+            triggered_by='admin_api',
+            run_id=run_id,
+            target_date_mt=target_date_mt,
+            params={'season': season, 'sync_type': sync_type, 'run_id': run_id,
+                    'target_date_mt': target_date_mt}
+        )
 
-        print(f'[admin/sync] Started background sync thread (run_id={run_id})')
         return jsonify({
             'success': True,
             'message': 'Sync started in background',
             'run_id': run_id,
+            'job_id': job_id,
             'season': season,
             'sync_type': sync_type,
             'target_date_mt': target_date_mt,
-            'status_endpoint': f'/api/admin/sync/status?run_id={run_id}'
+            'status_endpoint': f'/api/admin/sync/status?run_id={run_id}',
+            'job_status_endpoint': f'/api/jobs/{job_id}'
         }), 202  # 202 Accepted
     else:
         # Synchronous mode (default for cron jobs)
@@ -590,8 +662,7 @@ def debug_game_logs():
         season = request.args.get('season', '2025-26')
         limit = int(request.args.get('limit', '20'))
 
-        conn = sqlite3.connect('api/data/nba_data.db')
-        conn.row_factory = sqlite3.Row
+        conn = get_shared_connection('api/data/nba_data.db', readonly=True)
         cursor = conn.cursor()
 
         # Query games with team names
@@ -689,7 +760,24 @@ def debug_game_logs():
         }), 500
 
 
+def _games_default_date():
+    """
+    Date /api/games shows when none is requested.
+
+    Returns:
+        (today_mt, default_date): yesterday's games stay the default until
+        3:00 AM MT (when cron runs), so they remain visible until new games sync
+    """
+    # America/Denver automatically switches between MST (UTC-7) and MDT (UTC-6)
+    mt_now = datetime.now(ZoneInfo("America/Denver"))
+    today_mt = mt_now.strftime('%Y-%m-%d')
+    if mt_now.hour < 3:
+        return today_mt, (mt_now - timedelta(days=1)).strftime('%Y-%m-%d')
+    return today_mt, today_mt
+
+
 @app.route('/api/games')
+@conditional_get(_games_default_date)
 def get_games():
     """Get all games for the most relevant date (deterministic, DB-first)"""
     from api.utils.performance import log_slow_operation
@@ -701,28 +789,16 @@ def get_games():
         requested_date = request.args.get('date')
 
         with log_slow_operation("Fetch games (smart date selection)", threshold_ms=1000):
-            # Define Mountain Time with proper DST handling
-            # America/Denver automatically switches between MST (UTC-8) and MDT (UTC-7)
             mt_tz = ZoneInfo("America/Denver")
-            mt_now = datetime.now(mt_tz)
-            today_mt = mt_now.strftime('%Y-%m-%d')
-
-            # Show yesterday's games until 3:00 AM MT (when cron runs)
-            # This keeps yesterday's games visible until new games are synced
-            if mt_now.hour < 3:
-                # Before 3:00 AM MT - show yesterday's games
-                yesterday_mt = (mt_now - timedelta(days=1)).strftime('%Y-%m-%d')
-                default_date = yesterday_mt
-                print(f'[games] Before 3:00 AM MT - using yesterday: {yesterday_mt}')
+            today_mt, default_date = _games_default_date()
+            if default_date != today_mt:
+                print(f'[games] Before 3:00 AM MT - using yesterday: {default_date}')
             else:
-                # After 3:00 AM MT - show today's games
-                default_date = today_mt
                 print(f'[games] After 3:00 AM MT - using today: {today_mt}')
 
             # Connect to database
             db_path = os.path.join(os.path.dirname(__file__), 'api/data/nba_data.db')
-            conn = sqlite3.connect(db_path)
-            conn.row_factory = sqlite3.Row
+            conn = get_shared_connection(db_path, readonly=True)
             cursor = conn.cursor()
 
             selected_date = None
@@ -886,10 +962,19 @@ def get_games():
         }), 500
 
 @app.route('/api/game_detail')
+@conditional_get()
 def game_detail():
-    """Get detailed game information"""
+    """
+    Get detailed game information
+
+    The payload is materialized after each sync (api/utils/game_payloads.py);
+    the AI-generated sections are attached from their own caches. A missing
+    one is queued for generation and reported in ai_status
+    (api/utils/ai_generation_queue.py).
+    """
     try:
         game_id = request.args.get('game_id')
+        season = request.args.get('season', '2025-26')
 
         if not game_id:
             print('[game_detail] ERROR: Missing game_id parameter')
@@ -900,943 +985,153 @@ def game_detail():
 
         print(f'[game_detail] Fetching detail for game {game_id}')
 
-        games = get_todays_games()
-        game = None
-
-        # First try today's games
-        if games:
-            game = next((g for g in games if str(g.get('game_id')) == str(game_id)), None)
+        response = attach_ai_sections(get_game_payload(game_id, 'game_detail', season), game_id, season)
+        if response['ai_status']['status'] != 'ready':
+            # Still being generated: don't let the browser revalidate this copy
+            skip_etag()
+        return jsonify(response)
 
-        # If not found in today's games, query database for historical game
-        if not game:
-            print(f'[game_detail] Game {game_id} not in today\'s games, checking database for historical game')
-            import sqlite3
-            import os
-            db_path = os.path.join(os.path.dirname(__file__), 'api/data/nba_data.db')
-            conn = sqlite3.connect(db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+    except PayloadUnavailable as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), e.status
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
 
-            cursor.execute('''
-                SELECT
-                    g.id as game_id,
-                    g.game_date,
-                    g.home_team_id,
-                    g.away_team_id,
-                    g.status as game_status_text,
-                    ht.full_name as home_team_name,
-                    ht.team_abbreviation as home_team_abbr,
-                    at.full_name as away_team_name,
-                    at.team_abbreviation as away_team_abbr
-                FROM games g
-                JOIN nba_teams ht ON g.home_team_id = ht.team_id
-                JOIN nba_teams at ON g.away_team_id = at.team_id
-                WHERE g.id = ?
-            ''', (game_id,))
 
-            row = cursor.fetchone()
-            conn.close()
+@app.route('/api/game_possession_insights')
+def get_game_possession_insights():
+    """
+    Get possession insights for a specific game
 
-            if row:
-                game = {
-                    'game_id': row['game_id'],
-                    'game_date': row['game_date'],
-                    'home_team_id': row['home_team_id'],
-                    'away_team_id': row['away_team_id'],
-                    'game_status': row['game_status_text'],
-                    'home_team_name': row['home_team_name'],
-                    'away_team_name': row['away_team_name'],
-                    'home_team': {'abbreviation': row['home_team_abbr']},
-                    'away_team': {'abbreviation': row['away_team_abbr']}
-                }
-                print(f'[game_detail] Found historical game in database: {game["away_team_name"]} @ {game["home_team_name"]}')
+    Provides 4 sections of possession-only analysis:
+    1. What drives this matchup (Top 3 possession drivers)
+    2. Spread/Margin lens (Opportunity differential percentile)
+    3. Total lens (Combined empty possessions)
+    4. Prop lanes (Rebounds/FT/Assists lanes)
 
-        if not game:
-            print(f'[game_detail] ERROR: Game {game_id} not found')
-            return jsonify({
-                'success': False,
-                'error': f'Game {game_id} not found'
-            }), 404
+    Query params:
+        - game_id (required): NBA game ID
+        - season (optional): Season string (default: '2025-26')
 
-        print(f'[game_detail] Found game: {game.get("away_team_name")} @ {game.get("home_team_name")}')
+    Returns:
+        {
+            success: true,
+            data: {
+                home_team: {...},
+                away_team: {...},
+                metadata: {...}
+            }
+        }
+    """
+    from api.utils.game_possession_insights import get_or_generate_insights
 
-        home_team_id = game['home_team_id']
-        away_team_id = game['away_team_id']
+    game_id = request.args.get('game_id')
+    season = request.args.get('season', '2025-26')
 
-        betting_line_str = request.args.get('betting_line')
-        betting_line = float(betting_line_str) if betting_line_str else None
+    if not game_id:
+        return jsonify({
+            'success': False,
+            'error': 'game_id is required'
+        }), 400
 
-        print(f'[game_detail] Fetching matchup data for teams {home_team_id} vs {away_team_id}')
-        matchup_data = get_matchup_data(int(home_team_id), int(away_team_id))
+    try:
+        insights = get_or_generate_insights(game_id, season)
 
-        if matchup_data is None:
-            print('[game_detail] ERROR: Failed to fetch matchup data')
+        if not insights:
             return jsonify({
                 'success': False,
-                'error': 'The NBA API is currently slow or unavailable. Please try again in a moment.'
+                'error': 'Unable to generate possession insights for this game'
             }), 500
 
-        print(f'[game_detail] Matchup data ready (DATA ONLY MODE - no predictions)')
+        # Check if insights contains an error
+        if isinstance(insights, dict) and 'error' in insights:
+            return jsonify({
+                'success': False,
+                'error': insights['error'],
+                'message': insights.get('message', 'Unable to generate insights')
+            }), 200  # Return 200 with error details for expected failures
 
-        all_teams = get_all_teams()
-        home_team_info = next((t for t in all_teams if t['id'] == int(home_team_id)), {})
-        away_team_info = next((t for t in all_teams if t['id'] == int(away_team_id)), {})
-
-        home_overall = matchup_data['home']['stats'].get('overall', {}) if matchup_data['home'].get('stats') else {}
-        away_overall = matchup_data['away']['stats'].get('overall', {}) if matchup_data['away'].get('stats') else {}
-        home_adv = matchup_data['home'].get('advanced') or {}
-        away_adv = matchup_data['away'].get('advanced') or {}
-        home_opp = matchup_data['home'].get('opponent') or {}
-        away_opp = matchup_data['away'].get('opponent') or {}
-
-        # DATA ONLY MODE: Build matchup data fields needed by frontend (NO PREDICTIONS)
-        # Use FRESH recent_games from NBA API (in matchup_data), not stale database
-
-        # Build factors object (needed for Last5TrendsCard heat check)
-        home_overall_stats = matchup_data['home'].get('stats', {}).get('overall', {})
-        away_overall_stats = matchup_data['away'].get('stats', {}).get('overall', {})
-        home_adv_stats = matchup_data['home'].get('advanced', {})
-        away_adv_stats = matchup_data['away'].get('advanced', {})
-
-        # Helper to build Last 5 trends from database team_game_logs
-        def build_last5_from_database(team_id, team_abbr, season_ppg, season_ortg, season_pace):
-            """Build Last 5 trends structure from database team_game_logs table"""
-            try:
-                import sqlite3
-                import os as os_module
-                db_path = os_module.path.join(os_module.path.dirname(__file__), 'api', 'data', 'nba_data.db')
-                conn = sqlite3.connect(db_path)
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-
-                # Query last 5 games for this team from team_game_logs
-                cursor.execute('''
-                    SELECT game_date, matchup, opponent_abbr, team_pts, opp_pts, win_loss,
-                           pace, off_rating, def_rating, turnovers, assists, rebounds,
-                           fg3m, fg3a
-                    FROM team_game_logs
-                    WHERE team_id = ?
-                    ORDER BY game_date DESC
-                    LIMIT 5
-                ''', (team_id,))
-
-                rows = cursor.fetchall()
-
-                if not rows:
-                    conn.close()
-                    print(f"[build_last5_from_database] No games found for team_id {team_id}")
-                    return None
-
-                # Helper function to get opponent stats
-                def get_opponent_stats(opponent_abbr, season='2025-26'):
-                    """Get opponent's season stats and rankings"""
-                    try:
-                        # Get opponent team_id from abbreviation
-                        cursor.execute('''
-                            SELECT team_id FROM nba_teams
-                            WHERE team_abbreviation = ? AND season = ?
-                        ''', (opponent_abbr, season))
-                        opp_row = cursor.fetchone()
-                        if not opp_row:
-                            return None
-
-                        opp_team_id = opp_row['team_id']
-
-                        # Get opponent's season stats and ranks
-                        cursor.execute('''
-                            SELECT off_rtg, off_rtg_rank, def_rtg, def_rtg_rank,
-                                   pace, pace_rank
-                            FROM team_season_stats
-                            WHERE team_id = ? AND season = ? AND split_type = 'overall'
-                        ''', (opp_team_id, season))
-                        stats_row = cursor.fetchone()
-
-                        if stats_row:
-                            off_rank = stats_row['off_rtg_rank'] or 15
-                            def_rank = stats_row['def_rtg_rank'] or 15
-
-                            # Determine strength based on offensive rank
-                            if off_rank <= 10:
-                                strength = 'top'
-                            elif off_rank <= 20:
-                                strength = 'mid'
-                            else:
-                                strength = 'bottom'
-
-                            return {
-                                'tricode': opponent_abbr,
-                                'off_rtg': stats_row['off_rtg'],
-                                'off_rtg_rank': off_rank,
-                                'def_rtg': stats_row['def_rtg'],
-                                'def_rtg_rank': def_rank,
-                                'pace': stats_row['pace'],
-                                'pace_rank': stats_row['pace_rank'] or 15,
-                                'strength': strength
-                            }
-                    except Exception as e:
-                        print(f"[get_opponent_stats] Error for {opponent_abbr}: {e}")
+        # Enrich insights with FT points data from opponent_resistance
+        try:
+            from api.utils.opponent_resistance import get_expected_matchup_metrics
+            from api.utils.db_config import get_db_path
+            import sqlite3
 
-                    return {
-                        'tricode': opponent_abbr,
-                        'strength': 'mid',
-                        'off_rtg_rank': 15,
-                        'def_rtg_rank': 15
-                    }
+            print(f'[game_possession_insights] Starting enrichment for game {game_id}')
 
-                # Convert rows to list of dicts
-                games_list = []
-                for row in rows:
-                    three_pt_obj = None
-                    if row['fg3a'] and row['fg3a'] > 0:
-                        three_pt_obj = {
-                            'points': row['fg3m'] * 3,
-                            'made': row['fg3m'],
-                            'attempted': row['fg3a'],
-                            'percentage': round((row['fg3m'] / row['fg3a']) * 100, 1)
-                        }
+            # Get home/away team IDs from game (check todays_games table)
+            conn = get_shared_connection('nba_data', readonly=True, row_factory=None)
+            cursor = conn.cursor()
+            cursor.execute('SELECT home_team_id, away_team_id, game_date FROM todays_games WHERE game_id = ?', (game_id,))
+            game = cursor.fetchone()
+            conn.close()
 
-                    # Get opponent stats and rankings
-                    opponent_data = get_opponent_stats(row['opponent_abbr'])
+            print(f'[game_possession_insights] Game found: {game is not None}')
 
-                    games_list.append({
-                        'matchup': row['matchup'] or '',
-                        'result': row['win_loss'] or 'L',
-                        'team_pts': row['team_pts'] or 0,
-                        'pts': row['team_pts'] or 0,
-                        'opp_pts': row['opp_pts'] or 0,
-                        'pace': row['pace'] or 0,
-                        'off_rtg': row['off_rating'] or 0,
-                        'def_rtg': row['def_rating'] or 0,
-                        'game_date': row['game_date'] or '',
-                        'tov': row['turnovers'] or 0,
-                        'ast': row['assists'] or 0,
-                        'reb': row['rebounds'] or 0,
-                        'three_pt': three_pt_obj,
-                        'opponent': opponent_data
-                    })
+            if game:
+                home_team_id, away_team_id, game_date = game
+                as_of_date = game_date[:10] if len(game_date) >= 10 else '2026-01-02'
 
-                # Calculate averages
-                avg_ppg = sum(g['team_pts'] for g in games_list) / len(games_list)
-                avg_pace = sum(g['pace'] for g in games_list) / len(games_list)
-                avg_off_rtg = sum(g['off_rtg'] for g in games_list) / len(games_list)
-                avg_def_rtg = sum(g['def_rtg'] for g in games_list) / len(games_list)
+                resistance_data = get_expected_matchup_metrics(
+                    team_id=home_team_id,
+                    opp_id=away_team_id,
+                    season=season,
+                    as_of_date=as_of_date
+                )
 
-                # Calculate opponent rank averages
-                opp_off_ranks = [g['opponent'].get('off_rtg_rank') for g in games_list if g['opponent'].get('off_rtg_rank')]
-                opp_def_ranks = [g['opponent'].get('def_rtg_rank') for g in games_list if g['opponent'].get('def_rtg_rank')]
-                avg_opp_off_rank = round(sum(opp_off_ranks) / len(opp_off_ranks), 1) if opp_off_ranks else 15
-                avg_opp_def_rank = round(sum(opp_def_ranks) / len(opp_def_ranks), 1) if opp_def_ranks else 15
+                if resistance_data:
+                    # Calculate combined FT points for both teams (using season window)
+                    home_ft = resistance_data['team']['season'].get('free_throw_points', {})
+                    away_ft = resistance_data['opp']['season'].get('free_throw_points', {})
 
-                # Close database connection
-                conn.close()
+                    if home_ft and away_ft:
+                        combined_ft_points = {
+                            'adjusted': round(home_ft.get('expected_ft_points_adjusted', 0) +
+                                            away_ft.get('expected_ft_points_adjusted', 0), 1),
+                            'net_impact': round(home_ft.get('net_ft_points_impact', 0) +
+                                              away_ft.get('net_ft_points_impact', 0), 1)
+                        }
 
-                return {
-                    'team_tricode': team_abbr,
-                    'games': games_list,
-                    'averages': {
-                        'ppg': round(avg_ppg, 1),
-                        'pace': round(avg_pace, 1),
-                        'off_rtg': round(avg_off_rtg, 1),
-                        'def_rtg': round(avg_def_rtg, 1),
-                    },
-                    'season_comparison': {
-                        'ppg_delta': round(avg_ppg - season_ppg, 1),
-                        'pace_delta': round(avg_pace - season_pace, 1),
-                        'off_rtg_delta': round(avg_off_rtg - season_ortg, 1),
-                        'def_rtg_delta': 0.0
-                    },
-                    'opponent_breakdown': {
-                        'avg_opp_off_rank': avg_opp_off_rank,
-                        'avg_opp_def_rank': avg_opp_def_rank
-                    },
-                    'trend_tags': [],
-                    'data_quality': 'excellent' if len(games_list) >= 5 else 'good'
-                }
+                        # Add to section_3_total for both teams
+                        if 'home_team' in insights and 'section_3_total' in insights['home_team']:
+                            insights['home_team']['section_3_total']['combined_ft_points'] = combined_ft_points
+                        if 'away_team' in insights and 'section_3_total' in insights['away_team']:
+                            insights['away_team']['section_3_total']['combined_ft_points'] = combined_ft_points
 
-            except Exception as e:
-                print(f"[build_last5_from_database] ERROR: {e}")
-                import traceback
-                traceback.print_exc()
-                return None
+                    # Add individual team FG points (using season window)
+                    home_fg = resistance_data['team']['season'].get('field_goal_points', {})
+                    away_fg = resistance_data['opp']['season'].get('field_goal_points', {})
 
-        # Simple back-to-back detection
-        def get_simple_rest_status(recent_games):
-            from datetime import datetime, timedelta
+                    if home_fg:
+                        # Add home team's individual FG points
+                        if 'home_team' in insights and 'section_3_total' in insights['home_team']:
+                            insights['home_team']['section_3_total']['team_fg_points'] = home_fg
 
-            # Default values if no recent games
-            if not recent_games or len(recent_games) == 0:
-                return {
-                    'is_b2b': False, 'days_rest': 3, 'b2b_games': 0,
-                    'b2b_off_delta': 0.0, 'b2b_def_delta': 0.0, 'b2b_pace_delta': 0.0,
-                    'off_adj': 0.0, 'def_adj': 0.0, 'small_sample': True
-                }
+                    if away_fg:
+                        # Add away team's individual FG points
+                        if 'away_team' in insights and 'section_3_total' in insights['away_team']:
+                            insights['away_team']['section_3_total']['team_fg_points'] = away_fg
 
-            # Get most recent game date (keys are uppercase from db_queries)
-            most_recent_game = recent_games[0]
-            last_game_date_str = most_recent_game.get('GAME_DATE', '')
+                    # Calculate combined Total points for both teams (using season window)
+                    home_total = resistance_data['team']['season'].get('total_points', {})
+                    away_total = resistance_data['opp']['season'].get('total_points', {})
 
-            if not last_game_date_str:
-                return {
-                    'is_b2b': False, 'days_rest': 3, 'b2b_games': 0,
-                    'b2b_off_delta': 0.0, 'b2b_def_delta': 0.0, 'b2b_pace_delta': 0.0,
-                    'off_adj': 0.0, 'def_adj': 0.0, 'small_sample': True
-                }
-
-            # Parse date (handle both 'YYYY-MM-DD' and 'YYYY-MM-DDTHH:MM:SS' formats)
-            if 'T' in last_game_date_str:
-                last_game_date_str = last_game_date_str.split('T')[0]
-
-            try:
-                last_game_date = datetime.strptime(last_game_date_str, '%Y-%m-%d').date()
-                today = datetime.now().date()
-                days_since_last_game = (today - last_game_date).days
-
-                # Determine if back-to-back (played yesterday)
-                is_b2b = (days_since_last_game == 1)
-
-                print(f'[get_simple_rest_status] Last game: {last_game_date}, Today: {today}, Days since: {days_since_last_game}, is_b2b: {is_b2b}')
-
-                return {
-                    'is_b2b': is_b2b,
-                    'days_rest': days_since_last_game - 1 if days_since_last_game > 0 else 0,
-                    'b2b_games': 0,
-                    'b2b_off_delta': 0.0,
-                    'b2b_def_delta': 0.0,
-                    'b2b_pace_delta': 0.0,
-                    'off_adj': 0.0,
-                    'def_adj': 0.0,
-                    'small_sample': True
-                }
-            except Exception as e:
-                print(f'[get_simple_rest_status] Error calculating rest days: {e}')
-                return {
-                    'is_b2b': False, 'days_rest': 3, 'b2b_games': 0,
-                    'b2b_off_delta': 0.0, 'b2b_def_delta': 0.0, 'b2b_pace_delta': 0.0,
-                    'off_adj': 0.0, 'def_adj': 0.0, 'small_sample': True
-                }
-
-        # Build Last 5 trends from DATABASE team_game_logs using proper function
-        from api.utils.last_5_trends import get_last_5_trends
-        matchup_data_only = {
-            'home_last5_trends': get_last_5_trends(
-                home_team_id,
-                home_team_info.get('abbreviation', 'HOM'),
-                '2025-26'
-            ),
-            'away_last5_trends': get_last_5_trends(
-                away_team_id,
-                away_team_info.get('abbreviation', 'AWY'),
-                '2025-26'
-            ),
-            'back_to_back_debug': {
-                'home': get_simple_rest_status(matchup_data['home'].get('recent_games', [])),
-                'away': get_simple_rest_status(matchup_data['away'].get('recent_games', [])),
-            },
-            'factors': {
-                'home_ppg': round(home_overall_stats.get('PTS', 0), 1),
-                'away_ppg': round(away_overall_stats.get('PTS', 0), 1),
-                'home_pace': round(home_adv_stats.get('PACE', 0), 1),
-                'away_pace': round(away_adv_stats.get('PACE', 0), 1),
-                'game_pace': round((home_adv_stats.get('PACE', 100) + away_adv_stats.get('PACE', 100)) / 2, 1),
-            }
-        }
-
-        # Generate or retrieve cached matchup summary (cache-first logic)
-        print(f'[game_detail] Generating matchup summary for game {game_id}')
-        matchup_summary = get_or_generate_summary(
-            game_id=game_id,
-            prediction=matchup_data_only,  # Pass minimal data structure
-            matchup_data=matchup_data,
-            home_team=home_team_info,
-            away_team=away_team_info
-        )
-
-        # Get recent games with ALL fields needed for War Room
-        home_recent_games_full = matchup_data['home'].get('recent_games', [])[:10]
-        away_recent_games_full = matchup_data['away'].get('recent_games', [])[:10]
-
-        # Calculate advanced stats from game logs for War Room indicators
-        def calculate_advanced_stats_from_games(all_games):
-            """Calculate paint pts, assist%, and turnover% from game logs"""
-            if not all_games or len(all_games) == 0:
-                return {
-                    'paint_pts_per_game': 0,
-                    'ast_pct': 0,
-                    'tov_pct': 0
-                }
-
-            # Use all available games for season averages
-            # IMPORTANT: All stats must come from same team, same games, same filters
-            paint_pts = [g.get('PTS_PAINT', 0) or 0 for g in all_games if g.get('PTS_PAINT')]
-            assists = [g.get('AST', 0) or 0 for g in all_games if g.get('AST')]
-            turnovers = [g.get('TOV', 0) or 0 for g in all_games if g.get('TOV')]
-            fg_made = [g.get('FGM', 0) or 0 for g in all_games if g.get('FGM')]
-
-            avg_paint = sum(paint_pts) / len(paint_pts) if paint_pts else 0
-            avg_ast = sum(assists) / len(assists) if assists else 0
-            avg_tov = sum(turnovers) / len(turnovers) if turnovers else 0
-            avg_fgm = sum(fg_made) / len(fg_made) if fg_made else 0
-
-            # Calculate Team Assist Rate (AST%)
-            # Definition: Percentage of made field goals that were assisted
-            # Formula: AST% = (Team Assists ÷ Team Field Goals Made) × 100
-            # Expected range: 50-75% (normal), 40-85% (acceptable edge cases)
-            # Must NEVER exceed 100% - if it does, it's a data pipeline error
-
-            if avg_fgm > 0:
-                ast_rate_pct = (avg_ast / avg_fgm) * 100
-
-                # Validation: AST% should never exceed 100%
-                if ast_rate_pct > 100:
-                    logger.warning(
-                        f"[AST_RATE_ERROR] AST% > 100 detected "
-                        f"(AST={avg_ast:.2f}, FGM={avg_fgm:.2f}, AST%={ast_rate_pct:.1f})"
-                    )
-                    ast_rate_pct = None  # Treat as data error
-                elif ast_rate_pct < 40 or ast_rate_pct > 85:
-                    logger.info(
-                        f"[AST_RATE_WARNING] AST% outside normal range: {ast_rate_pct:.1f}% "
-                        f"(AST={avg_ast:.2f}, FGM={avg_fgm:.2f})"
-                    )
-            else:
-                ast_rate_pct = None
-
-            # TOV% = (Turnovers / Possessions) approximated by TOV / (FGM + TOV)
-            # For simplicity using TOV / (FGM + TOV) as a rough estimate
-            tov_pct = (avg_tov / (avg_fgm + avg_tov + 1e-6)) * 100
-
-            return {
-                'paint_pts_per_game': round(avg_paint, 1),
-                'ast_pct': round(ast_rate_pct, 1) if ast_rate_pct is not None else None,
-                'tov_pct': round(tov_pct, 1)
-            }
-
-        home_advanced = calculate_advanced_stats_from_games(matchup_data['home'].get('recent_games', []))
-        away_advanced = calculate_advanced_stats_from_games(matchup_data['away'].get('recent_games', []))
-
-        # Calculate scoring environment (deterministic classification)
-        from api.utils.scoring_environment import calculate_scoring_environment
-        scoring_environment = calculate_scoring_environment(
-            home_pace=home_adv.get('PACE', 100),
-            away_pace=away_adv.get('PACE', 100),
-            home_ortg=home_adv.get('OFF_RATING', 105),
-            away_ortg=away_adv.get('OFF_RATING', 105),
-            home_3p_pct=home_overall.get('FG3_PCT', 0) * 100 if home_overall.get('FG3_PCT') else None,
-            away_3p_pct=away_overall.get('FG3_PCT', 0) * 100 if away_overall.get('FG3_PCT') else None
-        )
-
-        # Calculate empty possessions data
-        empty_possessions_data = None
-        try:
-            empty_possessions_data = calculate_matchup_empty_possessions(game_id, '2025-26')
-            if empty_possessions_data:
-                print(f'[game_detail] Empty possessions data calculated successfully')
-            else:
-                print(f'[game_detail] Empty possessions data unavailable (insufficient data)')
-        except Exception as e:
-            import traceback
-            print(f'[game_detail] Warning: Failed to calculate empty possessions: {e}')
-            traceback.print_exc()
-
-        # Calculate opponent resistance metrics
-        opponent_resistance_data = None
-        try:
-            from api.utils.opponent_resistance import get_expected_matchup_metrics
-            # Determine as_of_date from game date or use current date
-            game_date_str = game.get('game_date', '2026-01-02')
-            if 'T' in game_date_str:
-                as_of_date = game_date_str.split('T')[0]
-            else:
-                as_of_date = game_date_str[:10] if len(game_date_str) >= 10 else '2026-01-02'
-
-            opponent_resistance_data = get_expected_matchup_metrics(
-                team_id=int(home_team_id),
-                opp_id=int(away_team_id),
-                season='2025-26',
-                as_of_date=as_of_date
-            )
-            if opponent_resistance_data:
-                print(f'[game_detail] Opponent resistance data calculated successfully')
-
-                # Calculate pregame projections
-                try:
-                    from api.utils.opponent_resistance import calculate_pregame_projections
-                    projections = calculate_pregame_projections(
-                        opponent_resistance_data['team']['season'],
-                        opponent_resistance_data['opp']['season'],
-                        opponent_resistance_data['expected']
-                    )
-
-                    # Add projections to opponent_resistance_data
-                    opponent_resistance_data['projections'] = projections
-
-                    # Also add to empty_possessions_data for frontend compatibility
-                    if empty_possessions_data:
-                        empty_possessions_data['projected_game_possessions'] = projections['projected_game_possessions']
-                        empty_possessions_data['expected_empty_possessions_game'] = projections['expected_empty_possessions_game']
-                        empty_possessions_data['expected_empty_rate'] = projections['expected_empty_rate']
-                        empty_possessions_data['league_avg_empty_rate'] = projections['league_avg_empty_rate']
-
-                        # Add per-team projections
-                        if 'home_team' not in empty_possessions_data:
-                            empty_possessions_data['home_team'] = {}
-                        if 'away_team' not in empty_possessions_data:
-                            empty_possessions_data['away_team'] = {}
-
-                        empty_possessions_data['home_team']['projected_team_possessions'] = projections['home_projected_team_possessions']
-                        empty_possessions_data['home_team']['expected_empty_possessions'] = projections['home_expected_empty_possessions']
-                        empty_possessions_data['home_team']['expected_scoring_possessions'] = projections['home_expected_scoring_possessions']
-
-                        empty_possessions_data['away_team']['projected_team_possessions'] = projections['away_projected_team_possessions']
-                        empty_possessions_data['away_team']['expected_empty_possessions'] = projections['away_expected_empty_possessions']
-                        empty_possessions_data['away_team']['expected_scoring_possessions'] = projections['away_expected_scoring_possessions']
-
-                    print(f'[game_detail] Pregame projections calculated successfully')
-
-                except Exception as proj_err:
-                    print(f'[game_detail] Warning: Failed to calculate pregame projections: {proj_err}')
-                    import traceback
-                    traceback.print_exc()
-
-            else:
-                print(f'[game_detail] Opponent resistance data unavailable')
-        except Exception as e:
-            import traceback
-            print(f'[game_detail] Warning: Failed to calculate opponent resistance: {e}')
-            traceback.print_exc()
-
-        response = {
-            'success': True,
-            'home_team': {
-                'id': home_team_id,
-                'name': home_team_info.get('full_name', 'Home Team'),
-                'abbreviation': home_team_info.get('abbreviation', 'HOM'),
-            },
-            'away_team': {
-                'id': away_team_id,
-                'name': away_team_info.get('full_name', 'Away Team'),
-                'abbreviation': away_team_info.get('abbreviation', 'AWY'),
-            },
-            'prediction': matchup_data_only,  # DATA ONLY MODE: No predictions, just matchup data
-            'matchup_summary': matchup_summary,
-            'scoring_environment': scoring_environment,
-            'empty_possessions': empty_possessions_data,
-            'opponent_resistance': opponent_resistance_data,
-            'home_stats': {
-                # Use field names that match frontend expectations
-                'ppg': round(home_overall.get('PTS', 0), 1),
-                'fg_pct': round(home_overall.get('FG_PCT', 0) * 100, 1),
-                'fg3_pct': round(home_overall.get('FG3_PCT', 0) * 100, 1),
-                'ft_pct': round(home_overall.get('FT_PCT', 0) * 100, 1),
-                'opp_ppg': round(home_opp.get('OPP_PTS', 0), 1),
-                'opp_fg3_pct': round(home_opp.get('OPP_FG3_PCT', 0) * 100, 1) if home_opp.get('OPP_FG3_PCT') else 0,
-                'opp_paint_pts_per_game': home_advanced.get('paint_pts_per_game', 0),  # From game logs
-                'wins': home_overall.get('W', 0),
-                'losses': home_overall.get('L', 0),
-                'off_rating': round(home_adv.get('OFF_RATING', 0), 1),  # Changed from 'ortg'
-                'def_rating': round(home_adv.get('DEF_RATING', 0), 1),  # Changed from 'drtg'
-                'pace': round(home_adv.get('PACE', 0), 1),
-                'net_rtg': round(home_adv.get('NET_RATING', 0), 1),
-                'ast': round(home_overall.get('AST', 0), 1),
-                'tov': round(home_overall.get('TOV', 0), 1),
-                'fga': round(home_overall.get('FGA', 0), 1),
-                'fta': round(home_overall.get('FTA', 0), 1),
-                'fg3a': round(home_overall.get('FG3A', 0), 1),
-                # Additional fields for MatchupIndicators
-                'fg3a_per_game': round(home_overall.get('FG3A', 0), 1),
-                'fta_per_game': round(home_overall.get('FTA', 0), 1),
-                'paint_pts_per_game': home_advanced.get('paint_pts_per_game', 0),
-                'ast_pct': home_advanced.get('ast_pct', 0),
-                'tov_pct': home_advanced.get('tov_pct', 0),
-                # NEW: eFG calculation fields (calculated from FGA * FG_PCT)
-                'fgm': round(home_overall.get('FGA', 0) * home_overall.get('FG_PCT', 0), 1),
-                'fg3m': round(home_overall.get('FG3A', 0) * home_overall.get('FG3_PCT', 0), 1),
-            },
-            'away_stats': {
-                # Use field names that match frontend expectations
-                'ppg': round(away_overall.get('PTS', 0), 1),
-                'fg_pct': round(away_overall.get('FG_PCT', 0) * 100, 1),
-                'fg3_pct': round(away_overall.get('FG3_PCT', 0) * 100, 1),
-                'ft_pct': round(away_overall.get('FT_PCT', 0) * 100, 1),
-                'opp_ppg': round(away_opp.get('OPP_PTS', 0), 1),
-                'opp_fg3_pct': round(away_opp.get('OPP_FG3_PCT', 0) * 100, 1) if away_opp.get('OPP_FG3_PCT') else 0,
-                'opp_paint_pts_per_game': away_advanced.get('paint_pts_per_game', 0),  # From game logs
-                'wins': away_overall.get('W', 0),
-                'losses': away_overall.get('L', 0),
-                'off_rating': round(away_adv.get('OFF_RATING', 0), 1),  # Changed from 'ortg'
-                'def_rating': round(away_adv.get('DEF_RATING', 0), 1),  # Changed from 'drtg'
-                'pace': round(away_adv.get('PACE', 0), 1),
-                'net_rtg': round(away_adv.get('NET_RATING', 0), 1),
-                'ast': round(away_overall.get('AST', 0), 1),
-                'tov': round(away_overall.get('TOV', 0), 1),
-                'fga': round(away_overall.get('FGA', 0), 1),
-                'fta': round(away_overall.get('FTA', 0), 1),
-                'fg3a': round(away_overall.get('FG3A', 0), 1),
-                # Additional fields for MatchupIndicators
-                'fg3a_per_game': round(away_overall.get('FG3A', 0), 1),
-                'fta_per_game': round(away_overall.get('FTA', 0), 1),
-                'paint_pts_per_game': away_advanced.get('paint_pts_per_game', 0),
-                'ast_pct': away_advanced.get('ast_pct', 0),
-                'tov_pct': away_advanced.get('tov_pct', 0),
-                # NEW: eFG calculation fields (calculated from FGA * FG_PCT)
-                'fgm': round(away_overall.get('FGA', 0) * away_overall.get('FG_PCT', 0), 1),
-                'fg3m': round(away_overall.get('FG3A', 0) * away_overall.get('FG3_PCT', 0), 1),
-            },
-            'home_recent_games': [
-                {
-                    'matchup': game.get('MATCHUP', ''),
-                    'team_pts': game.get('PTS', 0),
-                    'opp_pts': game.get('OPP_PTS', 0),
-                    'result': game.get('WL', ''),
-                    'off_rating': game.get('OFF_RATING', 0),
-                    'def_rating': game.get('DEF_RATING', 0),
-                    'pace': game.get('PACE', 0),
-                    'fg3_pct': game.get('FG3_PCT', 0) * 100 if game.get('FG3_PCT') else 0,
-                    'game_date': game.get('GAME_DATE', ''),
-                }
-                for game in home_recent_games_full
-            ],
-            'away_recent_games': [
-                {
-                    'matchup': game.get('MATCHUP', ''),
-                    'team_pts': game.get('PTS', 0),
-                    'opp_pts': game.get('OPP_PTS', 0),
-                    'result': game.get('WL', ''),
-                    'off_rating': game.get('OFF_RATING', 0),
-                    'def_rating': game.get('DEF_RATING', 0),
-                    'pace': game.get('PACE', 0),
-                    'fg3_pct': game.get('FG3_PCT', 0) * 100 if game.get('FG3_PCT') else 0,
-                    'game_date': game.get('GAME_DATE', ''),
-                }
-                for game in away_recent_games_full
-            ],
-        }
-
-        # NEW: Add offensive and defensive archetypes
-        try:
-            from api.utils.archetype_classifier import assign_all_team_archetypes, OFFENSIVE_ARCHETYPES, DEFENSIVE_ARCHETYPES
-
-            # Get all archetype assignments
-            season = '2025-26'
-            all_archetypes = assign_all_team_archetypes(season)
-
-            # Get archetypes for home and away teams
-            home_archetypes = all_archetypes.get(int(home_team_id))
-            away_archetypes = all_archetypes.get(int(away_team_id))
-
-            if home_archetypes:
-                response['home_archetypes'] = {
-                    # LEGACY SCORING ARCHETYPES (for backward compatibility)
-                    'season_offensive': {
-                        'id': home_archetypes['season_offensive'],
-                        'name': OFFENSIVE_ARCHETYPES[home_archetypes['season_offensive']]['name'],
-                        'description': OFFENSIVE_ARCHETYPES[home_archetypes['season_offensive']]['description'],
-                        'scoring_profile': OFFENSIVE_ARCHETYPES[home_archetypes['season_offensive']]['scoring_profile']
-                    },
-                    'season_defensive': {
-                        'id': home_archetypes['season_defensive'],
-                        'name': DEFENSIVE_ARCHETYPES[home_archetypes['season_defensive']]['name'],
-                        'description': DEFENSIVE_ARCHETYPES[home_archetypes['season_defensive']]['description'],
-                        'allows': DEFENSIVE_ARCHETYPES[home_archetypes['season_defensive']]['allows'],
-                        'suppresses': DEFENSIVE_ARCHETYPES[home_archetypes['season_defensive']]['suppresses']
-                    },
-                    'last10_offensive': {
-                        'id': home_archetypes['last10_offensive'],
-                        'name': OFFENSIVE_ARCHETYPES[home_archetypes['last10_offensive']]['name'],
-                        'description': OFFENSIVE_ARCHETYPES[home_archetypes['last10_offensive']]['description'],
-                        'scoring_profile': OFFENSIVE_ARCHETYPES[home_archetypes['last10_offensive']]['scoring_profile']
-                    },
-                    'last10_defensive': {
-                        'id': home_archetypes['last10_defensive'],
-                        'name': DEFENSIVE_ARCHETYPES[home_archetypes['last10_defensive']]['name'],
-                        'description': DEFENSIVE_ARCHETYPES[home_archetypes['last10_defensive']]['description'],
-                        'allows': DEFENSIVE_ARCHETYPES[home_archetypes['last10_defensive']]['allows'],
-                        'suppresses': DEFENSIVE_ARCHETYPES[home_archetypes['last10_defensive']]['suppresses']
-                    },
-                    'style_shifts': {
-                        'offensive': home_archetypes['offensive_style_shift'],
-                        'defensive': home_archetypes['defensive_style_shift'],
-                        'offensive_details': home_archetypes['offensive_shift_details'],
-                        'defensive_details': home_archetypes['defensive_shift_details']
-                    },
-                    # NEW ARCHETYPE FAMILIES (assists, rebounds, threes, turnovers)
-                    'assists': home_archetypes.get('assists'),
-                    'rebounds': home_archetypes.get('rebounds'),
-                    'threes': home_archetypes.get('threes'),
-                    'turnovers': home_archetypes.get('turnovers')
-                }
-
-            if away_archetypes:
-                response['away_archetypes'] = {
-                    # LEGACY SCORING ARCHETYPES (for backward compatibility)
-                    'season_offensive': {
-                        'id': away_archetypes['season_offensive'],
-                        'name': OFFENSIVE_ARCHETYPES[away_archetypes['season_offensive']]['name'],
-                        'description': OFFENSIVE_ARCHETYPES[away_archetypes['season_offensive']]['description'],
-                        'scoring_profile': OFFENSIVE_ARCHETYPES[away_archetypes['season_offensive']]['scoring_profile']
-                    },
-                    'season_defensive': {
-                        'id': away_archetypes['season_defensive'],
-                        'name': DEFENSIVE_ARCHETYPES[away_archetypes['season_defensive']]['name'],
-                        'description': DEFENSIVE_ARCHETYPES[away_archetypes['season_defensive']]['description'],
-                        'allows': DEFENSIVE_ARCHETYPES[away_archetypes['season_defensive']]['allows'],
-                        'suppresses': DEFENSIVE_ARCHETYPES[away_archetypes['season_defensive']]['suppresses']
-                    },
-                    'last10_offensive': {
-                        'id': away_archetypes['last10_offensive'],
-                        'name': OFFENSIVE_ARCHETYPES[away_archetypes['last10_offensive']]['name'],
-                        'description': OFFENSIVE_ARCHETYPES[away_archetypes['last10_offensive']]['description'],
-                        'scoring_profile': OFFENSIVE_ARCHETYPES[away_archetypes['last10_offensive']]['scoring_profile']
-                    },
-                    'last10_defensive': {
-                        'id': away_archetypes['last10_defensive'],
-                        'name': DEFENSIVE_ARCHETYPES[away_archetypes['last10_defensive']]['name'],
-                        'description': DEFENSIVE_ARCHETYPES[away_archetypes['last10_defensive']]['description'],
-                        'allows': DEFENSIVE_ARCHETYPES[away_archetypes['last10_defensive']]['allows'],
-                        'suppresses': DEFENSIVE_ARCHETYPES[away_archetypes['last10_defensive']]['suppresses']
-                    },
-                    'style_shifts': {
-                        'offensive': away_archetypes['offensive_style_shift'],
-                        'defensive': away_archetypes['defensive_style_shift'],
-                        'offensive_details': away_archetypes['offensive_shift_details'],
-                        'defensive_details': away_archetypes['defensive_shift_details']
-                    },
-                    # NEW ARCHETYPE FAMILIES (assists, rebounds, threes, turnovers)
-                    'assists': away_archetypes.get('assists'),
-                    'rebounds': away_archetypes.get('rebounds'),
-                    'threes': away_archetypes.get('threes'),
-                    'turnovers': away_archetypes.get('turnovers')
-                }
-
-            print('[game_detail] Archetypes added to response')
-            # DEBUG: Verify new archetype families are included
-            if home_archetypes:
-                print(f'[DEBUG game_detail] home_archetypes keys: {list(response["home_archetypes"].keys())}')
-                print(f'[DEBUG game_detail] Has threes? {"threes" in response["home_archetypes"]}')
-                print(f'[DEBUG game_detail] Has assists? {"assists" in response["home_archetypes"]}')
-                print(f'[DEBUG game_detail] Has rebounds? {"rebounds" in response["home_archetypes"]}')
-                print(f'[DEBUG game_detail] Has turnovers? {"turnovers" in response["home_archetypes"]}')
-                if response["home_archetypes"].get("threes"):
-                    print(f'[DEBUG game_detail] threes structure: {list(response["home_archetypes"]["threes"].keys())}')
-
-        except Exception as archetype_error:
-            import traceback
-            print(f'[game_detail] Warning: Could not fetch archetype data: {archetype_error}')
-            traceback.print_exc()
-            # Don't fail the entire request if archetypes fail
-            response['home_archetypes'] = None
-            response['away_archetypes'] = None
-
-        # Calculate combined volatility index
-        def calculate_volatility_index(recent_games):
-            """Calculate 0-10 volatility index from game totals variance"""
-            if not recent_games or len(recent_games) < 5:
-                return 5.0  # Default medium volatility
-
-            totals = [
-                (game.get('PTS', 0) + game.get('OPP_PTS', 0))
-                for game in recent_games[:10]
-            ]
-
-            if len(totals) < 5:
-                return 5.0
-
-            avg = sum(totals) / len(totals)
-            variance = sum(abs(t - avg) for t in totals) / len(totals)
-            return min(10.0, max(0.0, (variance / 15) * 10))
-
-        home_vol_index = calculate_volatility_index(home_recent_games_full)
-        away_vol_index = calculate_volatility_index(away_recent_games_full)
-        combined_volatility_index = (home_vol_index + away_vol_index) / 2
-
-        response['combined_volatility_index'] = round(combined_volatility_index, 1)
-        response['volatility_label'] = (
-            'Stable' if combined_volatility_index <= 3 else
-            'Swingy' if combined_volatility_index <= 6 else
-            'Wild'
-        )
-
-        # Calculate margin risk from net rating gap
-        home_net_rtg = round(home_adv.get('NET_RATING', 0), 1)
-        away_net_rtg = round(away_adv.get('NET_RATING', 0), 1)
-        rating_gap = abs(home_net_rtg - away_net_rtg)
-
-        response['margin_risk'] = {
-            'label': 'Blowout Risk' if rating_gap > 8 else 'Competitive',
-            'rating_gap': round(rating_gap, 1)
-        }
-
-        # Generate AI-powered game writeup (3 sections: Empty Possessions, Archetypes, Last 5 Trends)
-        print(f'[game_detail] Generating AI writeup for game {game_id}')
-        try:
-            # Construct game_data dict from response fields
-            game_data_for_writeup = {
-                'game_id': game_id,
-                'home_team': response.get('home_team', {}),
-                'away_team': response.get('away_team', {}),
-                'empty_possessions': response.get('empty_possessions'),
-                'home_archetypes': response.get('home_archetypes'),
-                'away_archetypes': response.get('away_archetypes'),
-                'home_last5_trends': response.get('prediction', {}).get('home_last5_trends', {}),
-                'away_last5_trends': response.get('prediction', {}).get('away_last5_trends', {}),
-                'back_to_back_debug': response.get('prediction', {}).get('back_to_back_debug', {})
-            }
-
-            # Call cache-first writeup generator
-            ai_writeup = get_or_generate_writeup(game_data_for_writeup)
-
-            if ai_writeup:
-                response['ai_writeup'] = ai_writeup
-                print(f'[game_detail] AI writeup generated successfully (length: {len(ai_writeup)} chars)')
-            else:
-                response['ai_writeup'] = None
-                print('[game_detail] AI writeup generation returned None (likely OpenAI key missing or API error)')
-
-        except Exception as writeup_error:
-            import traceback
-            print(f'[game_detail] Warning: AI writeup generation failed: {writeup_error}')
-            traceback.print_exc()
-            # Don't fail the entire request if AI writeup fails
-            response['ai_writeup'] = None
-
-        return jsonify(response)
-
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
-
-
-@app.route('/api/game_possession_insights')
-def get_game_possession_insights():
-    """
-    Get possession insights for a specific game
-
-    Provides 4 sections of possession-only analysis:
-    1. What drives this matchup (Top 3 possession drivers)
-    2. Spread/Margin lens (Opportunity differential percentile)
-    3. Total lens (Combined empty possessions)
-    4. Prop lanes (Rebounds/FT/Assists lanes)
-
-    Query params:
-        - game_id (required): NBA game ID
-        - season (optional): Season string (default: '2025-26')
-
-    Returns:
-        {
-            success: true,
-            data: {
-                home_team: {...},
-                away_team: {...},
-                metadata: {...}
-            }
-        }
-    """
-    from api.utils.game_possession_insights import get_or_generate_insights
-
-    game_id = request.args.get('game_id')
-    season = request.args.get('season', '2025-26')
-
-    if not game_id:
-        return jsonify({
-            'success': False,
-            'error': 'game_id is required'
-        }), 400
-
-    try:
-        insights = get_or_generate_insights(game_id, season)
-
-        if not insights:
-            return jsonify({
-                'success': False,
-                'error': 'Unable to generate possession insights for this game'
-            }), 500
-
-        # Check if insights contains an error
-        if isinstance(insights, dict) and 'error' in insights:
-            return jsonify({
-                'success': False,
-                'error': insights['error'],
-                'message': insights.get('message', 'Unable to generate insights')
-            }), 200  # Return 200 with error details for expected failures
-
-        # Enrich insights with FT points data from opponent_resistance
-        try:
-            from api.utils.opponent_resistance import get_expected_matchup_metrics
-            from api.utils.db_config import get_db_path
-            import sqlite3
-
-            print(f'[game_possession_insights] Starting enrichment for game {game_id}')
-
-            # Get home/away team IDs from game (check todays_games table)
-            conn = sqlite3.connect(get_db_path('nba_data.db'))
-            cursor = conn.cursor()
-            cursor.execute('SELECT home_team_id, away_team_id, game_date FROM todays_games WHERE game_id = ?', (game_id,))
-            game = cursor.fetchone()
-            conn.close()
-
-            print(f'[game_possession_insights] Game found: {game is not None}')
-
-            if game:
-                home_team_id, away_team_id, game_date = game
-                as_of_date = game_date[:10] if len(game_date) >= 10 else '2026-01-02'
-
-                resistance_data = get_expected_matchup_metrics(
-                    team_id=home_team_id,
-                    opp_id=away_team_id,
-                    season=season,
-                    as_of_date=as_of_date
-                )
-
-                if resistance_data:
-                    # Calculate combined FT points for both teams (using season window)
-                    home_ft = resistance_data['team']['season'].get('free_throw_points', {})
-                    away_ft = resistance_data['opp']['season'].get('free_throw_points', {})
-
-                    if home_ft and away_ft:
-                        combined_ft_points = {
-                            'adjusted': round(home_ft.get('expected_ft_points_adjusted', 0) +
-                                            away_ft.get('expected_ft_points_adjusted', 0), 1),
-                            'net_impact': round(home_ft.get('net_ft_points_impact', 0) +
-                                              away_ft.get('net_ft_points_impact', 0), 1)
-                        }
-
-                        # Add to section_3_total for both teams
-                        if 'home_team' in insights and 'section_3_total' in insights['home_team']:
-                            insights['home_team']['section_3_total']['combined_ft_points'] = combined_ft_points
-                        if 'away_team' in insights and 'section_3_total' in insights['away_team']:
-                            insights['away_team']['section_3_total']['combined_ft_points'] = combined_ft_points
-
-                    # Add individual team FG points (using season window)
-                    home_fg = resistance_data['team']['season'].get('field_goal_points', {})
-                    away_fg = resistance_data['opp']['season'].get('field_goal_points', {})
-
-                    if home_fg:
-                        # Add home team's individual FG points
-                        if 'home_team' in insights and 'section_3_total' in insights['home_team']:
-                            insights['home_team']['section_3_total']['team_fg_points'] = home_fg
-
-                    if away_fg:
-                        # Add away team's individual FG points
-                        if 'away_team' in insights and 'section_3_total' in insights['away_team']:
-                            insights['away_team']['section_3_total']['team_fg_points'] = away_fg
-
-                    # Calculate combined Total points for both teams (using season window)
-                    home_total = resistance_data['team']['season'].get('total_points', {})
-                    away_total = resistance_data['opp']['season'].get('total_points', {})
-
-                    if home_total and away_total:
-                        combined_total_points = {
-                            'expected_fg_points': round(home_total.get('expected_fg_points', 0) +
-                                                       away_total.get('expected_fg_points', 0), 1),
-                            'expected_ft_points': round(home_total.get('expected_ft_points', 0) +
-                                                       away_total.get('expected_ft_points', 0), 1),
-                            'expected_total_points': round(home_total.get('expected_total_points', 0) +
-                                                          away_total.get('expected_total_points', 0), 1)
-                        }
+                    if home_total and away_total:
+                        combined_total_points = {
+                            'expected_fg_points': round(home_total.get('expected_fg_points', 0) +
+                                                       away_total.get('expected_fg_points', 0), 1),
+                            'expected_ft_points': round(home_total.get('expected_ft_points', 0) +
+                                                       away_total.get('expected_ft_points', 0), 1),
+                            'expected_total_points': round(home_total.get('expected_total_points', 0) +
+                                                          away_total.get('expected_total_points', 0), 1)
+                        }
 
                         # Add to section_3_total for both teams
                         if 'home_team' in insights and 'section_3_total' in insights['home_team']:
@@ -1864,6 +1159,7 @@ def get_game_possession_insights():
 
 
 @app.route('/api/team-stats-with-ranks')
+@conditional_get(lambda: file_stamp(team_rankings.DB_PATH))
 def team_stats_with_ranks():
     """
     Get team statistics with league rankings
@@ -2030,6 +1326,7 @@ def team_stats_comparison():
 
 
 @app.route('/api/team-archetypes', methods=['GET'])
+@conditional_get()
 def get_team_archetypes():
     """
     Get offensive and defensive archetypes for teams.
@@ -2065,7 +1362,7 @@ def get_team_archetypes():
             }
         }
     """
-    from api.utils.archetype_classifier import assign_all_team_archetypes, OFFENSIVE_ARCHETYPES, DEFENSIVE_ARCHETYPES
+    from api.utils.archetype_classifier import load_team_archetypes, OFFENSIVE_ARCHETYPES, DEFENSIVE_ARCHETYPES
     from api.utils.db_queries import get_team_by_id
 
     try:
@@ -2076,7 +1373,7 @@ def get_team_archetypes():
               (f', team {team_id}' if team_id else ' (all teams)'))
 
         # Get all archetype assignments
-        all_assignments = assign_all_team_archetypes(season)
+        all_assignments = load_team_archetypes(season)
 
         # DEBUG: Log what families are in the assignments
         if all_assignments:
@@ -2397,11 +1694,10 @@ def archetype_match_games():
         # Get DB connection
         import sqlite3
         import os
-        from api.utils.archetype_classifier import assign_all_team_archetypes
+        from api.utils.archetype_classifier import load_team_archetypes
 
         db_path = os.path.join(os.path.dirname(__file__), 'api/data/nba_data.db')
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
+        conn = get_shared_connection(db_path, readonly=True)
         cursor = conn.cursor()
 
         # Get team abbreviation
@@ -2417,7 +1713,7 @@ def archetype_match_games():
         team_abbr = team_result['team_abbreviation']
 
         # Get all team archetypes for the season
-        all_archetypes = assign_all_team_archetypes(season)
+        all_archetypes = load_team_archetypes(season)
 
         # Build opponent archetype lookup map based on category
         opponent_archetypes = {}
@@ -2643,7 +1939,27 @@ def team_scoring_splits():
             'error': str(e)
         }), 500
 
+
+def _serve_game_payload(section, game_id, season):
+    """Serve a per-game payload from game_payloads (built and stored on a miss)"""
+    try:
+        return jsonify(get_game_payload(game_id, section, season))
+    except PayloadUnavailable as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), e.status
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @app.route('/api/game-scoring-splits', methods=['GET'])
+@conditional_get()
 def game_scoring_splits():
     """
     Get defense-adjusted scoring splits for both teams in a game.
@@ -2677,200 +1993,70 @@ def game_scoring_splits():
             }
         }
     """
-    try:
-        game_id = request.args.get('game_id')
-        season = request.args.get('season', '2025-26')
-
-        if not game_id:
-            return jsonify({
-                'success': False,
-                'error': 'game_id parameter is required'
-            }), 400
-
-        print(f'[game_scoring_splits] Fetching scoring splits for game {game_id}')
-
-        from api.utils.scoring_splits import get_team_scoring_splits
-        from api.utils.pace_splits import get_team_pace_splits
-        from api.utils.pace_projection import calculate_projected_pace
-        from api.utils.db_queries import get_team_stats_with_ranks
-
-        # Find the game to get team IDs
-        games = get_todays_games(season)
-        game = next((g for g in games if g['game_id'] == game_id), None)
-
-        if not game:
-            return jsonify({
-                'success': False,
-                'error': f'Game {game_id} not found'
-            }), 404
-
-        print(f'[game_scoring_splits] Found game: {game.get("away_team_name")} @ {game.get("home_team_name")}')
-
-        # Get defense splits for both teams
-        home_splits = get_team_scoring_splits(game['home_team_id'], season)
-        away_splits = get_team_scoring_splits(game['away_team_id'], season)
-
-        if not home_splits or not away_splits:
-            return jsonify({
-                'success': False,
-                'error': 'Team data not found for one or both teams'
-            }), 404
-
-        # Get pace splits for both teams
-        home_pace_splits = get_team_pace_splits(game['home_team_id'], season)
-        away_pace_splits = get_team_pace_splits(game['away_team_id'], season)
-
-        # Add pace splits to the main data structures
-        if home_pace_splits:
-            home_splits['pace_splits'] = home_pace_splits['pace_splits']
-        if away_pace_splits:
-            away_splits['pace_splits'] = away_pace_splits['pace_splits']
-
-        # Calculate projected game pace (factors in last 5 games + season average)
-        projected_pace = calculate_projected_pace(game['home_team_id'], game['away_team_id'], season)
-        home_splits['projected_pace'] = projected_pace
-        away_splits['projected_pace'] = projected_pace
-
-        print(f'[game_scoring_splits] Projected pace: {projected_pace:.1f}')
-
-        # Get defensive ranks for both teams
-        home_stats = get_team_stats_with_ranks(game['home_team_id'], season)
-        away_stats = get_team_stats_with_ranks(game['away_team_id'], season)
-
-        # Add opponent's defensive rank to each team's data
-        if home_stats:
-            home_splits['opponent_def_rank'] = away_stats['stats'].get('def_rtg', {}).get('rank') if away_stats else None
-
-        if away_stats:
-            away_splits['opponent_def_rank'] = home_stats['stats'].get('def_rtg', {}).get('rank') if home_stats else None
-
-        # Identity tags replaced by archetype system - keeping empty arrays for API compatibility
-        home_splits['identity_tags'] = []
-        away_splits['identity_tags'] = []
-        print(f'[game_scoring_splits] Home opponent def rank: {home_splits.get("opponent_def_rank")}, Away opponent def rank: {away_splits.get("opponent_def_rank")}')
-
-        return jsonify({
-            'success': True,
-            'data': {
-                'game_id': game_id,
-                'game_date': game.get('game_date'),
-                'home_team': home_splits,
-                'away_team': away_splits
-            }
-        })
+    game_id = request.args.get('game_id')
+    season = request.args.get('season', '2025-26')
 
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
+    if not game_id:
         return jsonify({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': 'game_id parameter is required'
+        }), 400
+
+    print(f'[game_scoring_splits] Fetching scoring_splits payload for game {game_id}')
+    return _serve_game_payload('scoring_splits', game_id, season)
+
 
 @app.route('/api/game-three-pt-scoring-splits', methods=['GET'])
+@conditional_get()
 def game_three_pt_scoring_splits():
     """
     Get 3PT defense-adjusted scoring splits for both teams in a game.
 
     Query params:
-        - game_id: NBA game ID (required)
-        - season: Season string, defaults to '2025-26'
-
-    Returns:
-        {
-            'success': True,
-            'data': {
-                'game_id': '0022500234',
-                'game_date': '2025-11-30',
-                'home_team': {
-                    'team_id': 1610612738,
-                    'team_abbreviation': 'BOS',
-                    'full_name': 'Boston Celtics',
-                    'season_avg_three_pt_ppg': 42.5,
-                    'splits': {
-                        'elite': {
-                            'home_three_pt_ppg': 40.2,
-                            'home_games': 8,
-                            'away_three_pt_ppg': 38.3,
-                            'away_games': 7
-                        },
-                        'average': { ... },
-                        'bad': { ... }
-                    }
-                },
-                'away_team': { ... }
-            }
-        }
-    """
-    try:
-        game_id = request.args.get('game_id')
-        season = request.args.get('season', '2025-26')
-
-        if not game_id:
-            return jsonify({
-                'success': False,
-                'error': 'game_id parameter is required'
-            }), 400
-
-        print(f'[game_three_pt_scoring_splits] Fetching 3PT scoring splits for game {game_id}')
-
-        from api.utils.three_pt_scoring_splits import get_team_three_pt_scoring_splits
-        from api.utils.db_queries import get_team_stats_with_ranks
-
-        # Find the game to get team IDs
-        games = get_todays_games(season)
-        game = next((g for g in games if g['game_id'] == game_id), None)
-
-        if not game:
-            return jsonify({
-                'success': False,
-                'error': f'Game {game_id} not found'
-            }), 404
-
-        print(f'[game_three_pt_scoring_splits] Found game: {game.get("away_team_name")} @ {game.get("home_team_name")}')
-
-        # Get 3PT defense splits for both teams
-        home_splits = get_team_three_pt_scoring_splits(game['home_team_id'], season)
-        away_splits = get_team_three_pt_scoring_splits(game['away_team_id'], season)
-
-        if not home_splits or not away_splits:
-            return jsonify({
-                'success': False,
-                'error': 'Team data not found for one or both teams'
-            }), 404
-
-        # Get 3PT defensive ranks for both teams
-        home_stats = get_team_stats_with_ranks(game['home_team_id'], season)
-        away_stats = get_team_stats_with_ranks(game['away_team_id'], season)
-
-        # Add opponent's 3PT defensive rank to each team's data
-        if home_stats:
-            home_splits['opponent_3pt_def_rank'] = away_stats['stats'].get('opp_fg3_pct_rank', {}).get('rank') if away_stats else None
-
-        if away_stats:
-            away_splits['opponent_3pt_def_rank'] = home_stats['stats'].get('opp_fg3_pct_rank', {}).get('rank') if home_stats else None
-
-        print(f'[game_three_pt_scoring_splits] Home opponent 3PT def rank: {home_splits.get("opponent_3pt_def_rank")}, Away opponent 3PT def rank: {away_splits.get("opponent_3pt_def_rank")}')
+        - game_id: NBA game ID (required)
+        - season: Season string, defaults to '2025-26'
 
-        return jsonify({
+    Returns:
+        {
             'success': True,
             'data': {
-                'game_id': game_id,
-                'game_date': game.get('game_date'),
-                'home_team': home_splits,
-                'away_team': away_splits
+                'game_id': '0022500234',
+                'game_date': '2025-11-30',
+                'home_team': {
+                    'team_id': 1610612738,
+                    'team_abbreviation': 'BOS',
+                    'full_name': 'Boston Celtics',
+                    'season_avg_three_pt_ppg': 42.5,
+                    'splits': {
+                        'elite': {
+                            'home_three_pt_ppg': 40.2,
+                            'home_games': 8,
+                            'away_three_pt_ppg': 38.3,
+                            'away_games': 7
+                        },
+                        'average': { ... },
+                        'bad': { ... }
+                    }
+                },
+                'away_team': { ... }
             }
-        })
+        }
+    """
+    game_id = request.args.get('game_id')
+    season = request.args.get('season', '2025-26')
 
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
+    if not game_id:
         return jsonify({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': 'game_id parameter is required'
+        }), 400
+
+    print(f'[game_three_pt_scoring_splits] Fetching three_pt_splits payload for game {game_id}')
+    return _serve_game_payload('three_pt_splits', game_id, season)
+
 
 @app.route('/api/game-three-pt-scoring-vs-pace', methods=['GET'])
+@conditional_get()
 def game_three_pt_scoring_vs_pace():
     """
     Get pace-adjusted 3PT scoring splits for both teams in a game.
@@ -2907,75 +2093,21 @@ def game_three_pt_scoring_vs_pace():
             }
         }
     """
-    try:
-        game_id = request.args.get('game_id')
-        season = request.args.get('season', '2025-26')
-
-        if not game_id:
-            return jsonify({
-                'success': False,
-                'error': 'game_id parameter is required'
-            }), 400
-
-        print(f'[game_three_pt_scoring_vs_pace] Fetching 3PT scoring vs pace for game {game_id}')
-
-        from api.utils.three_pt_scoring_vs_pace import get_team_three_pt_scoring_vs_pace
-        from api.utils.pace_projection import calculate_projected_pace
-
-        # Find the game to get team IDs
-        games = get_todays_games(season)
-        game = next((g for g in games if g['game_id'] == game_id), None)
-
-        if not game:
-            return jsonify({
-                'success': False,
-                'error': f'Game {game_id} not found'
-            }), 404
-
-        print(f'[game_three_pt_scoring_vs_pace] Found game: {game.get("away_team_name")} @ {game.get("home_team_name")}')
-
-        # Get 3PT pace splits for both teams
-        home_splits = get_team_three_pt_scoring_vs_pace(game['home_team_id'], season)
-        away_splits = get_team_three_pt_scoring_vs_pace(game['away_team_id'], season)
-
-        if not home_splits or not away_splits:
-            return jsonify({
-                'success': False,
-                'error': 'Team data not found for one or both teams'
-            }), 404
-
-        # Calculate projected pace for the game
-        try:
-            projected_pace = calculate_projected_pace(game['home_team_id'], game['away_team_id'], season)
-            print(f'[game_three_pt_scoring_vs_pace] Projected pace: {projected_pace:.1f}')
-        except Exception as e:
-            print(f'[game_three_pt_scoring_vs_pace] Error calculating projected pace: {e}')
-            projected_pace = None
-
-        # Add projected pace to each team's data
-        home_splits['projected_pace'] = projected_pace
-        away_splits['projected_pace'] = projected_pace
-
-        return jsonify({
-            'success': True,
-            'data': {
-                'game_id': game_id,
-                'game_date': game.get('game_date'),
-                'projected_pace': projected_pace,
-                'home_team': home_splits,
-                'away_team': away_splits
-            }
-        })
+    game_id = request.args.get('game_id')
+    season = request.args.get('season', '2025-26')
 
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
+    if not game_id:
         return jsonify({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': 'game_id parameter is required'
+        }), 400
+
+    print(f'[game_three_pt_scoring_vs_pace] Fetching three_pt_pace payload for game {game_id}')
+    return _serve_game_payload('three_pt_pace', game_id, season)
+
 
 @app.route('/api/game-turnover-vs-defense-pressure', methods=['GET'])
+@conditional_get()
 def game_turnover_vs_defense_pressure():
     """
     Get turnover splits by opponent defensive pressure tier for both teams in a game.
@@ -3011,86 +2143,21 @@ def game_turnover_vs_defense_pressure():
             }
         }
     """
-    try:
-        game_id = request.args.get('game_id')
-        season = request.args.get('season', '2025-26')
-
-        if not game_id:
-            return jsonify({
-                'success': False,
-                'error': 'game_id parameter is required'
-            }), 400
-
-        print(f'[game_turnover_vs_defense_pressure] Fetching turnover vs defense pressure for game {game_id}')
-
-        from api.utils.turnover_vs_defense_pressure import get_team_turnover_vs_defense_pressure
-        from api.utils.turnover_pressure_tiers import get_turnover_pressure_tier
-
-        # Find the game to get team IDs
-        games = get_todays_games(season)
-        game = next((g for g in games if g['game_id'] == game_id), None)
-
-        if not game:
-            return jsonify({
-                'success': False,
-                'error': f'Game {game_id} not found'
-            }), 404
-
-        print(f'[game_turnover_vs_defense_pressure] Found game: {game.get("away_team_name")} @ {game.get("home_team_name")}')
-
-        # Get turnover pressure splits for both teams
-        home_splits = get_team_turnover_vs_defense_pressure(game['home_team_id'], season)
-        away_splits = get_team_turnover_vs_defense_pressure(game['away_team_id'], season)
-
-        if not home_splits or not away_splits:
-            return jsonify({
-                'success': False,
-                'error': 'Team data not found for one or both teams'
-            }), 404
-
-        # Get opponent turnover pressure tier for each team
-        # Home team faces away team's defensive pressure
-        away_team_stats = get_team_stats_with_ranks(game['away_team_id'], season)
-        away_opp_tov_rank = away_team_stats['stats']['opp_tov']['rank'] if away_team_stats and 'opp_tov' in away_team_stats['stats'] else None
-        away_def_rtg_rank = away_team_stats['stats']['def_rtg']['rank'] if away_team_stats and 'def_rtg' in away_team_stats['stats'] else None
-        home_opponent_tier = get_turnover_pressure_tier(away_opp_tov_rank)
-
-        # Away team faces home team's defensive pressure
-        home_team_stats = get_team_stats_with_ranks(game['home_team_id'], season)
-        home_opp_tov_rank = home_team_stats['stats']['opp_tov']['rank'] if home_team_stats and 'opp_tov' in home_team_stats['stats'] else None
-        home_def_rtg_rank = home_team_stats['stats']['def_rtg']['rank'] if home_team_stats and 'def_rtg' in home_team_stats['stats'] else None
-        away_opponent_tier = get_turnover_pressure_tier(home_opp_tov_rank)
-
-        # Add opponent tier and stats to each team's data
-        home_splits['opponent_turnover_pressure_tier'] = home_opponent_tier
-        home_splits['opponent_opp_tov_rank'] = away_opp_tov_rank
-        home_splits['opponent_def_rtg_rank'] = away_def_rtg_rank
-
-        away_splits['opponent_turnover_pressure_tier'] = away_opponent_tier
-        away_splits['opponent_opp_tov_rank'] = home_opp_tov_rank
-        away_splits['opponent_def_rtg_rank'] = home_def_rtg_rank
-
-        print(f'[game_turnover_vs_defense_pressure] Home faces {home_opponent_tier} pressure, Away faces {away_opponent_tier} pressure')
-
-        return jsonify({
-            'success': True,
-            'data': {
-                'game_id': game_id,
-                'game_date': game.get('game_date'),
-                'home_team': home_splits,
-                'away_team': away_splits
-            }
-        })
+    game_id = request.args.get('game_id')
+    season = request.args.get('season', '2025-26')
 
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
+    if not game_id:
         return jsonify({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': 'game_id parameter is required'
+        }), 400
+
+    print(f'[game_turnover_vs_defense_pressure] Fetching turnover_pressure payload for game {game_id}')
+    return _serve_game_payload('turnover_pressure', game_id, season)
+
 
 @app.route('/api/game-turnover-vs-pace', methods=['GET'])
+@conditional_get()
 def game_turnover_vs_pace():
     """
     Get turnover splits by game pace tier for both teams in a game.
@@ -3127,76 +2194,21 @@ def game_turnover_vs_pace():
             }
         }
     """
-    try:
-        game_id = request.args.get('game_id')
-        season = request.args.get('season', '2025-26')
-
-        if not game_id:
-            return jsonify({
-                'success': False,
-                'error': 'game_id parameter is required'
-            }), 400
-
-        print(f'[game_turnover_vs_pace] Fetching turnover vs pace for game {game_id}')
-
-        from api.utils.turnover_vs_pace import get_team_turnover_vs_pace
-        from api.utils.pace_projection import calculate_projected_pace
-
-        # Find the game to get team IDs
-        games = get_todays_games(season)
-        game = next((g for g in games if g['game_id'] == game_id), None)
-
-        if not game:
-            return jsonify({
-                'success': False,
-                'error': f'Game {game_id} not found'
-            }), 404
-
-        print(f'[game_turnover_vs_pace] Found game: {game.get("away_team_name")} @ {game.get("home_team_name")}')
-
-        # Get turnover pace splits for both teams
-        home_splits = get_team_turnover_vs_pace(game['home_team_id'], season)
-        away_splits = get_team_turnover_vs_pace(game['away_team_id'], season)
-
-        if not home_splits or not away_splits:
-            return jsonify({
-                'success': False,
-                'error': 'Team data not found for one or both teams'
-            }), 404
-
-        # Calculate projected pace for the game
-        try:
-            projected_pace = calculate_projected_pace(game['home_team_id'], game['away_team_id'], season)
-            print(f'[game_turnover_vs_pace] Projected pace: {projected_pace:.1f}')
-        except Exception as e:
-            print(f'[game_turnover_vs_pace] Error calculating projected pace: {e}')
-            projected_pace = None
-
-        # Add projected pace to each team's data
-        home_splits['projected_pace'] = projected_pace
-        away_splits['projected_pace'] = projected_pace
-
-        return jsonify({
-            'success': True,
-            'data': {
-                'game_id': game_id,
-                'game_date': game.get('game_date'),
-                'projected_pace': projected_pace,
-                'home_team': home_splits,
-                'away_team': away_splits
-            }
-        })
+    game_id = request.args.get('game_id')
+    season = request.args.get('season', '2025-26')
 
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
+    if not game_id:
         return jsonify({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': 'game_id parameter is required'
+        }), 400
+
+    print(f'[game_turnover_vs_pace] Fetching turnover_pace payload for game {game_id}')
+    return _serve_game_payload('turnover_pace', game_id, season)
 
 
 @app.route('/api/game-assists-vs-defense', methods=['GET'])
+@conditional_get()
 def game_assists_vs_defense():
     """
     Get assist splits by opponent ball-movement defense tier for both teams in a game.
@@ -3213,127 +2225,40 @@ def game_assists_vs_defense():
                 'game_date': '2025-11-30',
                 'home_team': {
                     'team_id': 1610612738,
-                    'team_abbreviation': 'BOS',
-                    'full_name': 'Boston Celtics',
-                    'season_avg_ast': 27.5,
-                    'opponent_ball_movement_tier': 'elite',
-                    'splits': {
-                        'elite': {
-                            'home_ast': 26.2,
-                            'home_games': 8,
-                            'away_ast': 25.3,
-                            'away_games': 7
-                        },
-                        'average': { ... },
-                        'bad': { ... }
-                    }
-                },
-                'away_team': { ... }
-            }
-        }
-    """
-    try:
-        game_id = request.args.get('game_id')
-        season = request.args.get('season', '2025-26')
-
-        if not game_id:
-            return jsonify({
-                'success': False,
-                'error': 'game_id parameter is required'
-            }), 400
-
-        print(f'[game_assists_vs_defense] Fetching assists vs ball-movement defense for game {game_id}')
-
-        from api.utils.assists_splits import get_team_assists_splits, get_ball_movement_defense_tier
-
-        # Find the game to get team IDs
-        games = get_todays_games(season)
-        game = next((g for g in games if g['game_id'] == game_id), None)
-
-        # If not found in today's games, check historical games table
-        if not game:
-            print(f'[game_assists_vs_defense] Game {game_id} not in today\'s games, checking historical games')
-            import os
-            db_path = os.path.join(os.path.dirname(__file__), 'api/data/nba_data.db')
-            conn = sqlite3.connect(db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT
-                    g.id as game_id,
-                    g.game_date,
-                    g.home_team_id,
-                    g.away_team_id,
-                    ht.full_name as home_team_name,
-                    at.full_name as away_team_name
-                FROM games g
-                JOIN nba_teams ht ON g.home_team_id = ht.team_id
-                JOIN nba_teams at ON g.away_team_id = at.team_id
-                WHERE g.id = ? AND g.season = ?
-            ''', (game_id, season))
-            game_row = cursor.fetchone()
-            conn.close()
-
-            if game_row:
-                game = dict(game_row)
-            else:
-                return jsonify({
-                    'success': False,
-                    'error': f'Game {game_id} not found'
-                }), 404
-
-        print(f'[game_assists_vs_defense] Found game: {game.get("away_team_name")} @ {game.get("home_team_name")}')
-
-        # Get assist splits for both teams
-        home_splits = get_team_assists_splits(game['home_team_id'], season)
-        away_splits = get_team_assists_splits(game['away_team_id'], season)
-
-        if not home_splits or not away_splits:
-            return jsonify({
-                'success': False,
-                'error': 'Team data not found for one or both teams'
-            }), 404
-
-        # Get opponent ball-movement defense tier for each team
-        # Home team faces away team's ball-movement defense
-        away_team_stats = get_team_stats_with_ranks(game['away_team_id'], season)
-        away_opp_ast_rank = away_team_stats['stats']['opp_assists']['rank'] if away_team_stats and 'opp_assists' in away_team_stats['stats'] else None
-        home_opponent_tier = get_ball_movement_defense_tier(away_opp_ast_rank)
-
-        # Away team faces home team's ball-movement defense
-        home_team_stats = get_team_stats_with_ranks(game['home_team_id'], season)
-        home_opp_ast_rank = home_team_stats['stats']['opp_assists']['rank'] if home_team_stats and 'opp_assists' in home_team_stats['stats'] else None
-        away_opponent_tier = get_ball_movement_defense_tier(home_opp_ast_rank)
-
-        # Add opponent tier and rank to each team's data
-        home_splits['opponent_ball_movement_tier'] = home_opponent_tier
-        home_splits['opponent_opp_ast_rank'] = away_opp_ast_rank
-
-        away_splits['opponent_ball_movement_tier'] = away_opponent_tier
-        away_splits['opponent_opp_ast_rank'] = home_opp_ast_rank
-
-        print(f'[game_assists_vs_defense] Home faces {home_opponent_tier} ball-movement defense, Away faces {away_opponent_tier} ball-movement defense')
-
-        return jsonify({
-            'success': True,
-            'data': {
-                'game_id': game_id,
-                'game_date': game.get('game_date'),
-                'home_team': home_splits,
-                'away_team': away_splits
+                    'team_abbreviation': 'BOS',
+                    'full_name': 'Boston Celtics',
+                    'season_avg_ast': 27.5,
+                    'opponent_ball_movement_tier': 'elite',
+                    'splits': {
+                        'elite': {
+                            'home_ast': 26.2,
+                            'home_games': 8,
+                            'away_ast': 25.3,
+                            'away_games': 7
+                        },
+                        'average': { ... },
+                        'bad': { ... }
+                    }
+                },
+                'away_team': { ... }
             }
-        })
+        }
+    """
+    game_id = request.args.get('game_id')
+    season = request.args.get('season', '2025-26')
 
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
+    if not game_id:
         return jsonify({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': 'game_id parameter is required'
+        }), 400
+
+    print(f'[game_assists_vs_defense] Fetching assists_defense payload for game {game_id}')
+    return _serve_game_payload('assists_defense', game_id, season)
 
 
 @app.route('/api/game-assists-vs-pace', methods=['GET'])
+@conditional_get()
 def game_assists_vs_pace():
     """
     Get assist splits by game pace tier for both teams in a game.
@@ -3370,99 +2295,17 @@ def game_assists_vs_pace():
             }
         }
     """
-    try:
-        game_id = request.args.get('game_id')
-        season = request.args.get('season', '2025-26')
-
-        if not game_id:
-            return jsonify({
-                'success': False,
-                'error': 'game_id parameter is required'
-            }), 400
-
-        print(f'[game_assists_vs_pace] Fetching assists vs pace for game {game_id}')
-
-        from api.utils.assists_vs_pace import get_team_assists_vs_pace
-        from api.utils.pace_projection import calculate_projected_pace
-
-        # Find the game to get team IDs
-        games = get_todays_games(season)
-        game = next((g for g in games if g['game_id'] == game_id), None)
-
-        # If not found in today's games, check historical games table
-        if not game:
-            print(f'[game_assists_vs_pace] Game {game_id} not in today\'s games, checking historical games')
-            import os
-            db_path = os.path.join(os.path.dirname(__file__), 'api/data/nba_data.db')
-            conn = sqlite3.connect(db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT
-                    g.id as game_id,
-                    g.game_date,
-                    g.home_team_id,
-                    g.away_team_id,
-                    ht.full_name as home_team_name,
-                    at.full_name as away_team_name
-                FROM games g
-                JOIN nba_teams ht ON g.home_team_id = ht.team_id
-                JOIN nba_teams at ON g.away_team_id = at.team_id
-                WHERE g.id = ? AND g.season = ?
-            ''', (game_id, season))
-            game_row = cursor.fetchone()
-            conn.close()
-
-            if game_row:
-                game = dict(game_row)
-            else:
-                return jsonify({
-                    'success': False,
-                    'error': f'Game {game_id} not found'
-                }), 404
-
-        print(f'[game_assists_vs_pace] Found game: {game.get("away_team_name")} @ {game.get("home_team_name")}')
-
-        # Get assist pace splits for both teams
-        home_splits = get_team_assists_vs_pace(game['home_team_id'], season)
-        away_splits = get_team_assists_vs_pace(game['away_team_id'], season)
-
-        if not home_splits or not away_splits:
-            return jsonify({
-                'success': False,
-                'error': 'Team data not found for one or both teams'
-            }), 404
-
-        # Calculate projected pace for the game
-        try:
-            projected_pace = calculate_projected_pace(game['home_team_id'], game['away_team_id'], season)
-            print(f'[game_assists_vs_pace] Projected pace: {projected_pace:.1f}')
-        except Exception as e:
-            print(f'[game_assists_vs_pace] Error calculating projected pace: {e}')
-            projected_pace = None
-
-        # Add projected pace to each team's data
-        home_splits['projected_pace'] = projected_pace
-        away_splits['projected_pace'] = projected_pace
-
-        return jsonify({
-            'success': True,
-            'data': {
-                'game_id': game_id,
-                'game_date': game.get('game_date'),
-                'projected_pace': projected_pace,
-                'home_team': home_splits,
-                'away_team': away_splits
-            }
-        })
+    game_id = request.args.get('game_id')
+    season = request.args.get('season', '2025-26')
 
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
+    if not game_id:
         return jsonify({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': 'game_id parameter is required'
+        }), 400
+
+    print(f'[game_assists_vs_pace] Fetching assists_pace payload for game {game_id}')
+    return _serve_game_payload('assists_pace', game_id, season)
 
 
 @app.route('/api/scoring-mix', methods=['GET'])
@@ -3534,8 +2377,7 @@ def scoring_mix():
             print(f'[scoring_mix] Game {game_id} not in today\'s games, checking historical games')
             import os
             db_path = os.path.join(os.path.dirname(__file__), 'api/data/nba_data.db')
-            conn = sqlite3.connect(db_path)
-            conn.row_factory = sqlite3.Row
+            conn = get_shared_connection(db_path, readonly=True)
             cursor = conn.cursor()
 
             cursor.execute('''
@@ -3708,6 +2550,7 @@ def team_drilldown(team_id):
 
 
 @app.route('/api/predict', methods=['POST'])
+@with_prediction_scope
 def predict():
     """Make a prediction for a game"""
     try:
@@ -3743,6 +2586,66 @@ def predict():
             'error': str(e)
         }), 500
 
+@app.route('/api/predict/slate', methods=['GET', 'POST'])
+def predict_slate_route():
+    """
+    Predict a whole slate of games in one pass
+
+    Input (either):
+    - POST JSON: {"game_ids": [...], "betting_lines": {"<game_id>": 228.5}}
+    - GET query: ?game_ids=0022500501,0022500502
+    If no game_ids are given, today's games from get_todays_games() are used.
+    """
+    from api.utils.prediction_engine import predict_slate
+
+    try:
+        if request.method == 'POST':
+            data = request.get_json() or {}
+            game_ids = data.get('game_ids') or []
+            betting_lines = data.get('betting_lines') or {}
+        else:
+            game_ids_param = request.args.get('game_ids', '')
+            game_ids = [gid.strip() for gid in game_ids_param.split(',') if gid.strip()]
+            betting_lines = {}
+
+        if not game_ids:
+            game_ids = [g['game_id'] for g in get_todays_games()]
+
+        betting_lines = {str(k): float(v) for k, v in betting_lines.items() if v is not None}
+
+        result = predict_slate(game_ids, betting_lines=betting_lines, season='2025-26')
+
+        predictions = []
+        for entry in result['games']:
+            # Seed the single-game cache so /api/predict hits are warm
+            cache_key = (entry['home_team_id'], entry['away_team_id'], entry['betting_line'])
+            _store_cached_prediction(cache_key, entry['prediction'], entry['matchup_data'])
+
+            predictions.append({
+                'game_id': entry['game_id'],
+                'home_team_id': entry['home_team_id'],
+                'away_team_id': entry['away_team_id'],
+                'betting_line': entry['betting_line'],
+                'prediction': entry['prediction']
+            })
+
+        return jsonify({
+            'success': True,
+            'count': len(predictions),
+            'predictions': predictions,
+            'missing_game_ids': result['missing_game_ids'],
+            'context': result['context']
+        })
+
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @app.route('/api/feedback', methods=['POST'])
 def submit_feedback():
     """Submit user feedback"""
@@ -3922,6 +2825,7 @@ def get_team_cluster(team_id):
 
 
 @app.route('/api/clusters', methods=['GET'])
+@conditional_get(lambda: file_stamp(SIMILARITY_DB_PATH))
 def get_all_clusters():
     """
     Get all cluster definitions
@@ -4377,6 +3281,333 @@ def prediction_history():
 # GAME REVIEW ENDPOINTS (OpenAI Vision-powered post-game analysis)
 # ============================================================================
 
+def _run_screenshot_review(game_id, temp_path, filename, home_team, away_team, game_date,
+                           sportsbook_line, predicted_home_fallback, predicted_away_fallback,
+                           predicted_total_fallback):
+    """
+    Background job for upload_result_screenshot: read the final score from the
+    screenshot, generate the AI Model Coach review and store it in game_reviews.
+
+    Returns:
+        {'review': {...}} - what the endpoint used to return inline
+    """
+    from api.utils.openai_client import extract_scores_from_screenshot, generate_game_review
+    from api.utils.db_schema_game_reviews import get_connection as get_reviews_db
+    from api.utils.style_stats_builder import build_expected_style_stats, build_actual_style_stats
+
+    # These will be set from get_cached_prediction if available, otherwise use fallback
+    predicted_home = predicted_home_fallback
+    predicted_away = predicted_away_fallback
+    predicted_total = predicted_total_fallback
+
+    try:
+        # Debug: Check if API key is available
+        api_key_available = bool(os.environ.get('OPENAI_API_KEY'))
+        print(f"[Review] OpenAI API Key available: {api_key_available}")
+
+        # Extract scores using OpenAI Vision
+        print(f"[Review] Extracting scores from screenshot for game {game_id}")
+        vision_result = extract_scores_from_screenshot(
+            temp_path,
+            home_team,
+            away_team,
+            model="gpt-4.1-mini"  # Use mini for cost efficiency
+        )
+
+        actual_home = vision_result['home_score']
+        actual_away = vision_result['away_score']
+        actual_total = vision_result['total']
+        vision_confidence = vision_result.get('confidence', 'medium')
+
+        print(f"[Review] Scores extracted: {home_team} {actual_home}, {away_team} {actual_away} (confidence: {vision_confidence})")
+
+        # We'll calculate errors AFTER we get the prediction (below)
+
+        # Fetch comprehensive data for AI Model Coach v2
+        from api.utils.db_queries import get_team_by_abbreviation, get_game_box_score
+
+        home_box_score = None
+        away_box_score = None
+        predicted_pace = None
+        prediction_breakdown = None
+        matchup_data = None
+        team_season_stats = None
+        last_5_trends = None
+        similarity_data = None
+        # Note: sportsbook_line is already set from form_data above (line 1879)
+
+        # Try to get team IDs and comprehensive data
+        try:
+            home_team_data = get_team_by_abbreviation(home_team)
+            away_team_data = get_team_by_abbreviation(away_team)
+
+            if home_team_data and away_team_data:
+                home_team_id = home_team_data['id']
+                away_team_id = away_team_data['id']
+
+                # Get box scores
+                home_box_score = get_game_box_score(game_id, home_team_id)
+                away_box_score = get_game_box_score(game_id, away_team_id)
+
+                if home_box_score:
+                    print(f"[Review] Fetched home box score: pace={home_box_score.get('pace')}, 3PA={home_box_score.get('fg3a')}")
+                if away_box_score:
+                    print(f"[Review] Fetched away box score: pace={away_box_score.get('pace')}, 3PA={away_box_score.get('fg3a')}")
+
+                # === CRITICAL: Get prediction using SAME source as UI ===
+                # Try to fetch fresh prediction, but use fallback if it fails
+                if not sportsbook_line:
+                    print(f"[Review] WARNING: No sportsbook line provided, using fallback from form")
+                    print(f"[Review] Using FALLBACK values from form: {predicted_total_fallback:.1f if predicted_total_fallback else 'N/A'}")
+                else:
+                    print(f"[Review] Fetching prediction with line={sportsbook_line}")
+                    # DATA ONLY MODE: Predictions disabled
+                    prediction = None
+                    matchup_data = None
+
+                    if prediction:
+                        # OVERRIDE fallback values with fresh prediction from backend
+                        prediction_breakdown = prediction
+                        predicted_total = prediction.get('predicted_total')
+                        predicted_home = prediction.get('breakdown', {}).get('home_projected')
+                        predicted_away = prediction.get('breakdown', {}).get('away_projected')
+                        predicted_pace = prediction.get('factors', {}).get('game_pace')
+
+                        print(f"[Review] ✓ Got prediction from BACKEND (overriding fallback):")
+                        print(f"  - Betting Line: {sportsbook_line}")
+                        print(f"  - Predicted Total: {predicted_total:.1f if predicted_total else 'N/A'} ({predicted_home:.1f if predicted_home else 'N/A'} + {predicted_away:.1f if predicted_away else 'N/A'})")
+                        print(f"  - Model Pick: {prediction.get('recommendation', 'N/A')}")
+                        print(f"  - Predicted Pace: {predicted_pace}")
+                        print(f"  - Has Matchup DNA: {bool(matchup_data)}")
+                    else:
+                        print(f"[Review] WARNING: get_cached_prediction returned None, using FALLBACK from form")
+                        print(f"[Review] FALLBACK values: {predicted_total:.1f if predicted_total else 'N/A'} ({predicted_home:.1f if predicted_home else 'N/A'} + {predicted_away:.1f if predicted_away else 'N/A'})")
+
+                # Get team season stats
+                try:
+                    home_stats = get_team_stats_with_ranks(home_team_id, '2025-26')
+                    away_stats = get_team_stats_with_ranks(away_team_id, '2025-26')
+
+                    team_season_stats = {
+                        'home': home_stats,
+                        'away': away_stats
+                    }
+                    print(f"[Review] Fetched team season stats")
+                except Exception as e:
+                    print(f"[Review] Could not fetch team season stats: {e}")
+
+                # Get last-5 trends from prediction object
+                if prediction:
+                    last_5_trends = {
+                        'home': prediction.get('home_last5_trends'),
+                        'away': prediction.get('away_last5_trends')
+                    }
+                    print(f"[Review] Got last-5 trends from prediction")
+
+                # Get similarity/cluster data from prediction object
+                if prediction and 'similarity' in prediction:
+                    similarity_data = prediction.get('similarity')
+                    if similarity_data and similarity_data.get('matchup_type'):
+                        print(f"[Review] Got similarity data from prediction:")
+                        print(f"  - Matchup Type: {similarity_data.get('matchup_type')}")
+                        print(f"  - Home Cluster: {similarity_data.get('home_cluster', {}).get('name', 'N/A')}")
+                        print(f"  - Away Cluster: {similarity_data.get('away_cluster', {}).get('name', 'N/A')}")
+                        # Wrap in 'has_data' format expected by openai_client
+                        similarity_data['has_data'] = True
+                    else:
+                        print(f"[Review] Similarity data present but incomplete")
+                        similarity_data = None
+                else:
+                    print(f"[Review] No similarity data in prediction")
+
+        except Exception as e:
+            print(f"[Review] Could not fetch comprehensive data: {e}")
+            import traceback
+            traceback.print_exc()
+            # Continue with whatever data we have
+
+        # Calculate errors (now that we have predicted values from get_cached_prediction)
+        # Also verify actual values are not None (vision extraction might fail)
+        if (predicted_home is not None and predicted_away is not None and predicted_total is not None and
+            actual_home is not None and actual_away is not None and actual_total is not None):
+            error_home = actual_home - predicted_home
+            error_away = actual_away - predicted_away
+            error_total = actual_total - predicted_total
+            abs_error_total = abs(error_total)
+            print(f"[Review] Calculated errors: home={error_home:+.1f}, away={error_away:+.1f}, total={error_total:+.1f}")
+        else:
+            print(f"[Review] WARNING: Could not calculate errors - predicted or actual values are None")
+            print(f"[Review]   predicted: home={predicted_home}, away={predicted_away}, total={predicted_total}")
+            print(f"[Review]   actual: home={actual_home}, away={actual_away}, total={actual_total}")
+            error_home = 0
+            error_away = 0
+            error_total = 0
+            abs_error_total = 0
+
+        # Compute expected vs actual stats for AI Coach
+        from api.utils.expected_vs_actual_stats import compute_all_expected_vs_actual
+
+        expected_vs_actual = compute_all_expected_vs_actual(
+            team_season_stats=team_season_stats,
+            home_box_score=home_box_score,
+            away_box_score=away_box_score,
+            predicted_pace=predicted_pace
+        )
+
+        # Build detailed style stats for AI Model Coach
+        expected_style_stats = None
+        actual_style_stats = None
+        expected_style_stats_json = None
+        actual_style_stats_json = None
+
+        try:
+            # Build expected stats (what we predicted teams would do)
+            if home_team_data and away_team_data:
+                expected_style_stats = build_expected_style_stats(
+                    home_team_id,
+                    away_team_id,
+                    predicted_pace,
+                    season='2025-26'
+                )
+                print(f"[StyleStats] Built expected stats for both teams")
+
+            # Build actual stats (what teams actually did in the game)
+            if home_team_data and away_team_data and home_box_score and away_box_score:
+                actual_style_stats = build_actual_style_stats(
+                    game_id,
+                    home_team_id,
+                    away_team_id
+                )
+                print(f"[StyleStats] Built actual stats for both teams")
+
+            # Convert to JSON for database storage
+            if expected_style_stats:
+                expected_style_stats_json = json.dumps(expected_style_stats)
+            if actual_style_stats:
+                actual_style_stats_json = json.dumps(actual_style_stats)
+
+        except Exception as e:
+            print(f"[StyleStats] Error building style stats: {e}")
+            import traceback
+            traceback.print_exc()
+
+        # === COMPREHENSIVE LOGGING: Verify prediction/AI Coach sync ===
+        print(f"\n{'='*80}")
+        print(f"[AI COACH] Starting post-game analysis for game {game_id}")
+        print(f"[AI COACH] PREDICTION SOURCE VERIFICATION:")
+        print(f"  Sportsbook Line: {sportsbook_line}")
+        print(f"  Predicted Total: {f'{predicted_total:.1f}' if predicted_total is not None else 'N/A'} ({f'{predicted_home:.1f}' if predicted_home is not None else 'N/A'} + {f'{predicted_away:.1f}' if predicted_away is not None else 'N/A'})")
+        print(f"  Model Pick: {prediction_breakdown.get('recommendation', 'N/A') if prediction_breakdown else 'N/A'}")
+        print(f"  Predicted Pace: {f'{predicted_pace:.1f}' if predicted_pace is not None else 'N/A'}")
+        print(f"[AI COACH] ACTUAL RESULTS:")
+        print(f"  Actual Total: {actual_total} ({actual_home} + {actual_away})")
+        print(f"  Error: {f'{error_total:+.1f}' if error_total is not None else 'N/A'} points")
+        print(f"[AI COACH] DATA AVAILABILITY:")
+        print(f"  Has Prediction Breakdown: {bool(prediction_breakdown)}")
+        print(f"  Has Team Season Stats: {bool(team_season_stats)}")
+        print(f"  Has Last-5 Trends: {bool(last_5_trends)}")
+        print(f"  Has Box Score Stats: {bool(home_box_score and away_box_score)}")
+        print(f"  Has Expected vs Actual Stats: {bool(expected_vs_actual)}")
+        print(f"  Has Similarity Data: {bool(similarity_data)}")
+        print(f"{'='*80}\n")
+
+        # Final verification before calling AI Coach
+        print(f"[Review] Calling generate_game_review with:")
+        print(f"  game_id={game_id}")
+        print(f"  predicted_total={predicted_total}, predicted_home={predicted_home}, predicted_away={predicted_away}")
+        print(f"  actual_total={actual_total}, actual_home={actual_home}, actual_away={actual_away}")
+        print(f"  sportsbook_line={sportsbook_line}")
+
+        ai_review = generate_game_review(
+            game_id,
+            home_team,
+            away_team,
+            predicted_total,
+            actual_total,
+            predicted_home,
+            actual_home,
+            predicted_away,
+            actual_away,
+            predicted_pace=predicted_pace,
+            home_box_score=home_box_score,
+            away_box_score=away_box_score,
+            prediction_breakdown=prediction_breakdown,
+            matchup_data=matchup_data,  # Add Matchup DNA for team identities
+            team_season_stats=team_season_stats,  # Used for Advanced Splits context
+            last_5_trends=last_5_trends,
+            sportsbook_line=sportsbook_line,
+            expected_vs_actual=expected_vs_actual,
+            similarity_data=similarity_data,  # Add similarity/cluster analysis
+            expected_style_stats=expected_style_stats,  # Add detailed expected stats
+            actual_style_stats=actual_style_stats,  # Add detailed actual stats
+            model="gpt-4.1-mini"
+        )
+
+        # Store in database
+        with get_reviews_db() as conn:
+            cursor = conn.cursor()
+            now = datetime.now(timezone.utc).isoformat()
+
+            cursor.execute('''
+                INSERT OR REPLACE INTO game_reviews (
+                    game_id, home_team, away_team, game_date,
+                    actual_home_score, actual_away_score, actual_total,
+                    predicted_home_score, predicted_away_score, predicted_total,
+                    sportsbook_line,
+                    vision_confidence, vision_model, vision_raw_response,
+                    error_home, error_away, error_total, abs_error_total,
+                    ai_review_json, ai_review_model,
+                    expected_style_stats_json, actual_style_stats_json,
+                    screenshot_filename, created_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                game_id, home_team, away_team, game_date,
+                actual_home, actual_away, actual_total,
+                predicted_home, predicted_away, predicted_total,
+                sportsbook_line,  # Store the betting line
+                vision_confidence, vision_result.get('model', 'gpt-4.1-mini'),
+                vision_result.get('raw_response', ''),
+                error_home, error_away, error_total, abs_error_total,
+                json.dumps(ai_review), ai_review.get('model', 'gpt-4.1-mini'),
+                expected_style_stats_json, actual_style_stats_json,
+                filename, now, now
+            ))
+            conn.commit()
+
+        print(f"[Review] Review saved to database for game {game_id}")
+
+        # Regenerate the date's Model Coach summary in the background
+        try:
+            from api.utils.coach_summary_cache import queue_coach_summary
+            queue_coach_summary(game_date, retry_failed=True)
+        except Exception as e:
+            print(f"[Review] Warning: could not queue Model Coach summary for {game_date}: {e}")
+
+        return {
+            'review': {
+                'game_id': game_id,
+                'home_team': home_team,
+                'away_team': away_team,
+                'actual_home': actual_home,
+                'actual_away': actual_away,
+                'actual_total': actual_total,
+                'predicted_home': predicted_home,
+                'predicted_away': predicted_away,
+                'predicted_total': predicted_total,
+                'error_home': round(error_home, 1),
+                'error_away': round(error_away, 1),
+                'error_total': round(error_total, 1),
+                'vision_confidence': vision_confidence,
+                'ai_review': ai_review
+            }
+        }
+
+    finally:
+        # Clean up temp file
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+
+
 @app.route('/api/games/<game_id>/result-screenshot', methods=['POST'])
 def upload_result_screenshot(game_id):
     """
@@ -4384,14 +3615,22 @@ def upload_result_screenshot(game_id):
 
     Workflow:
     1. Receive screenshot file upload
-    2. Extract scores using OpenAI Vision API
-    3. Calculate prediction errors
-    4. Generate AI coaching review
-    5. Store in game_reviews database
+    2. Queue a background job (_run_screenshot_review) that:
+       - Extracts scores using OpenAI Vision API
+       - Calculates prediction errors
+       - Generates AI coaching review
+       - Stores it in game_reviews database
 
-    Returns:
+    Returns (202):
         {
             success: true,
+            job_id: str,
+            status: 'queued',
+            status_endpoint: '/api/jobs/<job_id>'
+        }
+
+    Poll status_endpoint; when the job succeeds its result is
+        {
             review: {
                 game_id, actual_scores, predicted_scores, errors,
                 ai_review (what_happened, why_we_missed, key_factors, model_advice)
@@ -4400,9 +3639,7 @@ def upload_result_screenshot(game_id):
     """
     try:
         from werkzeug.utils import secure_filename
-        from api.utils.openai_client import extract_scores_from_screenshot, generate_game_review
-        from api.utils.db_schema_game_reviews import get_connection as get_reviews_db
-        from api.utils.style_stats_builder import build_expected_style_stats, build_actual_style_stats
+        from api.utils.background_jobs import submit_job
         import tempfile
 
         # Validate file upload
@@ -4432,334 +3669,31 @@ def upload_result_screenshot(game_id):
         predicted_away_fallback = float(form_data.get('predicted_away')) if form_data.get('predicted_away') else None
         predicted_total_fallback = float(form_data.get('predicted_total')) if form_data.get('predicted_total') else None
 
-        # These will be set from get_cached_prediction if available, otherwise use fallback
-        predicted_home = predicted_home_fallback
-        predicted_away = predicted_away_fallback
-        predicted_total = predicted_total_fallback
-
-        # Save uploaded file temporarily
+        # Save uploaded file temporarily (the review job deletes it)
         filename = secure_filename(file.filename)
         temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1])
         temp_path = temp_file.name
         file.save(temp_path)
         temp_file.close()
 
-        try:
-            # Debug: Check if API key is available
-            api_key_available = bool(os.environ.get('OPENAI_API_KEY'))
-            print(f"[Review] OpenAI API Key available: {api_key_available}")
-
-            # Extract scores using OpenAI Vision
-            print(f"[Review] Extracting scores from screenshot for game {game_id}")
-            vision_result = extract_scores_from_screenshot(
-                temp_path,
-                home_team,
-                away_team,
-                model="gpt-4.1-mini"  # Use mini for cost efficiency
-            )
-
-            actual_home = vision_result['home_score']
-            actual_away = vision_result['away_score']
-            actual_total = vision_result['total']
-            vision_confidence = vision_result.get('confidence', 'medium')
-
-            print(f"[Review] Scores extracted: {home_team} {actual_home}, {away_team} {actual_away} (confidence: {vision_confidence})")
-
-            # We'll calculate errors AFTER we get the prediction (below)
-
-            # Fetch comprehensive data for AI Model Coach v2
-            from api.utils.db_queries import get_team_by_abbreviation, get_game_box_score
-
-            home_box_score = None
-            away_box_score = None
-            predicted_pace = None
-            prediction_breakdown = None
-            matchup_data = None
-            team_season_stats = None
-            last_5_trends = None
-            similarity_data = None
-            # Note: sportsbook_line is already set from form_data above (line 1879)
-
-            # Try to get team IDs and comprehensive data
-            try:
-                home_team_data = get_team_by_abbreviation(home_team)
-                away_team_data = get_team_by_abbreviation(away_team)
-
-                if home_team_data and away_team_data:
-                    home_team_id = home_team_data['id']
-                    away_team_id = away_team_data['id']
-
-                    # Get box scores
-                    home_box_score = get_game_box_score(game_id, home_team_id)
-                    away_box_score = get_game_box_score(game_id, away_team_id)
-
-                    if home_box_score:
-                        print(f"[Review] Fetched home box score: pace={home_box_score.get('pace')}, 3PA={home_box_score.get('fg3a')}")
-                    if away_box_score:
-                        print(f"[Review] Fetched away box score: pace={away_box_score.get('pace')}, 3PA={away_box_score.get('fg3a')}")
-
-                    # === CRITICAL: Get prediction using SAME source as UI ===
-                    # Try to fetch fresh prediction, but use fallback if it fails
-                    if not sportsbook_line:
-                        print(f"[Review] WARNING: No sportsbook line provided, using fallback from form")
-                        print(f"[Review] Using FALLBACK values from form: {predicted_total_fallback:.1f if predicted_total_fallback else 'N/A'}")
-                    else:
-                        print(f"[Review] Fetching prediction with line={sportsbook_line}")
-                        # DATA ONLY MODE: Predictions disabled
-                        prediction = None
-                        matchup_data = None
-
-                        if prediction:
-                            # OVERRIDE fallback values with fresh prediction from backend
-                            prediction_breakdown = prediction
-                            predicted_total = prediction.get('predicted_total')
-                            predicted_home = prediction.get('breakdown', {}).get('home_projected')
-                            predicted_away = prediction.get('breakdown', {}).get('away_projected')
-                            predicted_pace = prediction.get('factors', {}).get('game_pace')
-
-                            print(f"[Review] ✓ Got prediction from BACKEND (overriding fallback):")
-                            print(f"  - Betting Line: {sportsbook_line}")
-                            print(f"  - Predicted Total: {predicted_total:.1f if predicted_total else 'N/A'} ({predicted_home:.1f if predicted_home else 'N/A'} + {predicted_away:.1f if predicted_away else 'N/A'})")
-                            print(f"  - Model Pick: {prediction.get('recommendation', 'N/A')}")
-                            print(f"  - Predicted Pace: {predicted_pace}")
-                            print(f"  - Has Matchup DNA: {bool(matchup_data)}")
-                        else:
-                            print(f"[Review] WARNING: get_cached_prediction returned None, using FALLBACK from form")
-                            print(f"[Review] FALLBACK values: {predicted_total:.1f if predicted_total else 'N/A'} ({predicted_home:.1f if predicted_home else 'N/A'} + {predicted_away:.1f if predicted_away else 'N/A'})")
-
-                    # Get team season stats
-                    try:
-                        home_stats = get_team_stats_with_ranks(home_team_id, '2025-26')
-                        away_stats = get_team_stats_with_ranks(away_team_id, '2025-26')
-
-                        team_season_stats = {
-                            'home': home_stats,
-                            'away': away_stats
-                        }
-                        print(f"[Review] Fetched team season stats")
-                    except Exception as e:
-                        print(f"[Review] Could not fetch team season stats: {e}")
-
-                    # Get last-5 trends from prediction object
-                    if prediction:
-                        last_5_trends = {
-                            'home': prediction.get('home_last5_trends'),
-                            'away': prediction.get('away_last5_trends')
-                        }
-                        print(f"[Review] Got last-5 trends from prediction")
-
-                    # Get similarity/cluster data from prediction object
-                    if prediction and 'similarity' in prediction:
-                        similarity_data = prediction.get('similarity')
-                        if similarity_data and similarity_data.get('matchup_type'):
-                            print(f"[Review] Got similarity data from prediction:")
-                            print(f"  - Matchup Type: {similarity_data.get('matchup_type')}")
-                            print(f"  - Home Cluster: {similarity_data.get('home_cluster', {}).get('name', 'N/A')}")
-                            print(f"  - Away Cluster: {similarity_data.get('away_cluster', {}).get('name', 'N/A')}")
-                            # Wrap in 'has_data' format expected by openai_client
-                            similarity_data['has_data'] = True
-                        else:
-                            print(f"[Review] Similarity data present but incomplete")
-                            similarity_data = None
-                    else:
-                        print(f"[Review] No similarity data in prediction")
-
-            except Exception as e:
-                print(f"[Review] Could not fetch comprehensive data: {e}")
-                import traceback
-                traceback.print_exc()
-                # Continue with whatever data we have
-
-            # Calculate errors (now that we have predicted values from get_cached_prediction)
-            # Also verify actual values are not None (vision extraction might fail)
-            if (predicted_home is not None and predicted_away is not None and predicted_total is not None and
-                actual_home is not None and actual_away is not None and actual_total is not None):
-                error_home = actual_home - predicted_home
-                error_away = actual_away - predicted_away
-                error_total = actual_total - predicted_total
-                abs_error_total = abs(error_total)
-                print(f"[Review] Calculated errors: home={error_home:+.1f}, away={error_away:+.1f}, total={error_total:+.1f}")
-            else:
-                print(f"[Review] WARNING: Could not calculate errors - predicted or actual values are None")
-                print(f"[Review]   predicted: home={predicted_home}, away={predicted_away}, total={predicted_total}")
-                print(f"[Review]   actual: home={actual_home}, away={actual_away}, total={actual_total}")
-                error_home = 0
-                error_away = 0
-                error_total = 0
-                abs_error_total = 0
-
-            # Compute expected vs actual stats for AI Coach
-            from api.utils.expected_vs_actual_stats import compute_all_expected_vs_actual
-
-            expected_vs_actual = compute_all_expected_vs_actual(
-                team_season_stats=team_season_stats,
-                home_box_score=home_box_score,
-                away_box_score=away_box_score,
-                predicted_pace=predicted_pace
-            )
-
-            # Build detailed style stats for AI Model Coach
-            expected_style_stats = None
-            actual_style_stats = None
-            expected_style_stats_json = None
-            actual_style_stats_json = None
-
-            try:
-                # Build expected stats (what we predicted teams would do)
-                if home_team_data and away_team_data:
-                    expected_style_stats = build_expected_style_stats(
-                        home_team_id,
-                        away_team_id,
-                        predicted_pace,
-                        season='2025-26'
-                    )
-                    print(f"[StyleStats] Built expected stats for both teams")
-
-                # Build actual stats (what teams actually did in the game)
-                if home_team_data and away_team_data and home_box_score and away_box_score:
-                    actual_style_stats = build_actual_style_stats(
-                        game_id,
-                        home_team_id,
-                        away_team_id
-                    )
-                    print(f"[StyleStats] Built actual stats for both teams")
-
-                # Convert to JSON for database storage
-                if expected_style_stats:
-                    expected_style_stats_json = json.dumps(expected_style_stats)
-                if actual_style_stats:
-                    actual_style_stats_json = json.dumps(actual_style_stats)
-
-            except Exception as e:
-                print(f"[StyleStats] Error building style stats: {e}")
-                import traceback
-                traceback.print_exc()
-
-            # === COMPREHENSIVE LOGGING: Verify prediction/AI Coach sync ===
-            print(f"\n{'='*80}")
-            print(f"[AI COACH] Starting post-game analysis for game {game_id}")
-            print(f"[AI COACH] PREDICTION SOURCE VERIFICATION:")
-            print(f"  Sportsbook Line: {sportsbook_line}")
-            print(f"  Predicted Total: {f'{predicted_total:.1f}' if predicted_total is not None else 'N/A'} ({f'{predicted_home:.1f}' if predicted_home is not None else 'N/A'} + {f'{predicted_away:.1f}' if predicted_away is not None else 'N/A'})")
-            print(f"  Model Pick: {prediction_breakdown.get('recommendation', 'N/A') if prediction_breakdown else 'N/A'}")
-            print(f"  Predicted Pace: {f'{predicted_pace:.1f}' if predicted_pace is not None else 'N/A'}")
-            print(f"[AI COACH] ACTUAL RESULTS:")
-            print(f"  Actual Total: {actual_total} ({actual_home} + {actual_away})")
-            print(f"  Error: {f'{error_total:+.1f}' if error_total is not None else 'N/A'} points")
-            print(f"[AI COACH] DATA AVAILABILITY:")
-            print(f"  Has Prediction Breakdown: {bool(prediction_breakdown)}")
-            print(f"  Has Team Season Stats: {bool(team_season_stats)}")
-            print(f"  Has Last-5 Trends: {bool(last_5_trends)}")
-            print(f"  Has Box Score Stats: {bool(home_box_score and away_box_score)}")
-            print(f"  Has Expected vs Actual Stats: {bool(expected_vs_actual)}")
-            print(f"  Has Similarity Data: {bool(similarity_data)}")
-            print(f"{'='*80}\n")
-
-            # Final verification before calling AI Coach
-            print(f"[Review] Calling generate_game_review with:")
-            print(f"  game_id={game_id}")
-            print(f"  predicted_total={predicted_total}, predicted_home={predicted_home}, predicted_away={predicted_away}")
-            print(f"  actual_total={actual_total}, actual_home={actual_home}, actual_away={actual_away}")
-            print(f"  sportsbook_line={sportsbook_line}")
-
-            ai_review = generate_game_review(
-                game_id,
-                home_team,
-                away_team,
-                predicted_total,
-                actual_total,
-                predicted_home,
-                actual_home,
-                predicted_away,
-                actual_away,
-                predicted_pace=predicted_pace,
-                home_box_score=home_box_score,
-                away_box_score=away_box_score,
-                prediction_breakdown=prediction_breakdown,
-                matchup_data=matchup_data,  # Add Matchup DNA for team identities
-                team_season_stats=team_season_stats,  # Used for Advanced Splits context
-                last_5_trends=last_5_trends,
-                sportsbook_line=sportsbook_line,
-                expected_vs_actual=expected_vs_actual,
-                similarity_data=similarity_data,  # Add similarity/cluster analysis
-                expected_style_stats=expected_style_stats,  # Add detailed expected stats
-                actual_style_stats=actual_style_stats,  # Add detailed actual stats
-                model="gpt-4.1-mini"
-            )
-
-            # Store in database
-            with get_reviews_db() as conn:
-                cursor = conn.cursor()
-                now = datetime.now(timezone.utc).isoformat()
-
-                cursor.execute('''
-                    INSERT OR REPLACE INTO game_reviews (
-                        game_id, home_team, away_team, game_date,
-                        actual_home_score, actual_away_score, actual_total,
-                        predicted_home_score, predicted_away_score, predicted_total,
-                        sportsbook_line,
-                        vision_confidence, vision_model, vision_raw_response,
-                        error_home, error_away, error_total, abs_error_total,
-                        ai_review_json, ai_review_model,
-                        expected_style_stats_json, actual_style_stats_json,
-                        screenshot_filename, created_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    game_id, home_team, away_team, game_date,
-                    actual_home, actual_away, actual_total,
-                    predicted_home, predicted_away, predicted_total,
-                    sportsbook_line,  # Store the betting line
-                    vision_confidence, vision_result.get('model', 'gpt-4.1-mini'),
-                    vision_result.get('raw_response', ''),
-                    error_home, error_away, error_total, abs_error_total,
-                    json.dumps(ai_review), ai_review.get('model', 'gpt-4.1-mini'),
-                    expected_style_stats_json, actual_style_stats_json,
-                    filename, now, now
-                ))
-                conn.commit()
-
-            print(f"[Review] Review saved to database for game {game_id}")
-
-            return jsonify({
-                'success': True,
-                'review': {
-                    'game_id': game_id,
-                    'home_team': home_team,
-                    'away_team': away_team,
-                    'actual_home': actual_home,
-                    'actual_away': actual_away,
-                    'actual_total': actual_total,
-                    'predicted_home': predicted_home,
-                    'predicted_away': predicted_away,
-                    'predicted_total': predicted_total,
-                    'error_home': round(error_home, 1),
-                    'error_away': round(error_away, 1),
-                    'error_total': round(error_total, 1),
-                    'vision_confidence': vision_confidence,
-                    'ai_review': ai_review
-                }
-            })
-
-        finally:
-            # Clean up temp file
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
+        job_id = submit_job(
+            'screenshot_review', _run_screenshot_review,
+            game_id, temp_path, filename, home_team, away_team, game_date, sportsbook_line,
+            predicted_home_fallback, predicted_away_fallback, predicted_total_fallback,
+            params={'game_id': game_id, 'home_team': home_team, 'away_team': away_team}
+        )
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'status': 'queued',
+            'status_endpoint': f'/api/jobs/{job_id}'
+        }), 202
 
     except ValueError as e:
         return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
-        from api.utils.openai_client import OpenAIKeyMissingError
         import traceback
         traceback.print_exc()
-
-        # Special handling for missing OpenAI API key
-        if isinstance(e, OpenAIKeyMissingError):
-            return jsonify({
-                'success': False,
-                'code': 'OPENAI_KEY_MISSING',
-                'error': 'The AI key is not set on the server.'
-            }), 500
-
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
@@ -4787,8 +3721,7 @@ def get_similar_opponent_boxscores(game_id):
 
         # Get game info
         db_path = os.path.join(os.path.dirname(__file__), 'api/data/nba_data.db')
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
+        conn = get_shared_connection(db_path, readonly=True)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -4937,8 +3870,7 @@ def get_full_matchup_analysis(game_id):
 
         # Fetch game data directly with proper game_id
         db_path = os.path.join(os.path.dirname(__file__), 'api/data/nba_data.db')
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
+        conn = get_shared_connection(db_path, readonly=True)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -5012,8 +3944,7 @@ def get_full_matchup_analysis(game_id):
 
         # Also get PPG from team_season_stats table
         db_path_nba = os.path.join(os.path.dirname(__file__), 'api/data/nba_data.db')
-        conn_nba = sqlite3.connect(db_path_nba)
-        conn_nba.row_factory = sqlite3.Row
+        conn_nba = get_shared_connection(db_path_nba, readonly=True)
         cursor_nba = conn_nba.cursor()
 
         cursor_nba.execute("""
@@ -5122,6 +4053,10 @@ def model_coach_summary():
     """
     Get "Today's Model Coach" summary for a specific date.
 
+    Served from coach_summaries; never calls OpenAI in the request. When the
+    date's reviews changed since the stored summary, regeneration is queued
+    and the previous summary is returned with summary_status 'stale'.
+
     Query params:
         - date: YYYY-MM-DD (default: today)
 
@@ -5133,54 +4068,30 @@ def model_coach_summary():
                 games_within_3, games_within_7,
                 overall_performance, patterns, action_items,
                 biggest_miss, biggest_win
-            }
+            } or null (while the first summary is generated),
+            summary_status: 'current' | 'stale' | 'pending',
+            job_id: str (while regenerating)
         }
     """
     try:
-        from api.utils.db_schema_game_reviews import get_connection as get_reviews_db
-        from api.utils.openai_client import generate_daily_coach_summary
+        from api.utils.coach_summary_cache import get_coach_summary
 
         # Get date from query params (default: today)
         date_str = request.args.get('date')
         if not date_str:
             date_str = datetime.now(timezone.utc).strftime('%Y-%m-%d')
 
-        # Fetch all reviews for this date
-        with get_reviews_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM game_reviews
-                WHERE game_date = ?
-                ORDER BY abs_error_total DESC
-            ''', (date_str,))
-            rows = cursor.fetchall()
+        result = get_coach_summary(date_str)
 
-        if not rows:
+        if result['summary'] is None and result['summary_status'] == 'unavailable':
             return jsonify({
-                'success': True,
-                'summary': {
-                    'date': date_str,
-                    'total_games': 0,
-                    'message': 'No reviews available for this date yet.'
-                }
-            })
-
-        # Convert rows to dicts
-        reviews = []
-        for row in rows:
-            review_dict = dict(row)
-            # Parse JSON if present
-            if review_dict.get('ai_review_json'):
-                review_dict['ai_review'] = json.loads(review_dict['ai_review_json'])
-            reviews.append(review_dict)
-
-        # Generate AI coaching summary
-        print(f"[Model Coach] Generating daily summary for {date_str} ({len(reviews)} games)")
-        summary = generate_daily_coach_summary(reviews, model="gpt-4.1-mini")
-
-        summary['date'] = date_str
+                'success': False,
+                'error': result.get('error') or 'Could not generate the Model Coach summary',
+                'error_code': result.get('error_code'),
+                'summary_status': result['summary_status']
+            }), 503
 
-        return jsonify({'success': True, 'summary': summary})
+        return jsonify({'success': True, **result})
 
     except Exception as e:
         import traceback
@@ -5194,13 +4105,14 @@ def debug_openai_key():
     Debug endpoint to check if OPENAI_API_KEY is configured.
 
     Returns only a boolean - does NOT expose the actual key value.
+    hasKey is always true on the replay backend (OPENAI_BACKEND=replay).
 
     Returns:
-        { "hasKey": true/false }
+        { "hasKey": true/false, "backend": "openai" | "replay" | "record" }
     """
-    from api.utils.openai_client import has_openai_key
+    from api.utils.openai_client import get_backend, has_openai_key
 
-    return jsonify({'hasKey': has_openai_key()})
+    return jsonify({'hasKey': has_openai_key(), 'backend': get_backend()})
 
 
 # ============================================================================
@@ -5242,8 +4154,7 @@ def get_full_matchup_summary_writeup(game_id):
 
         # Get game data
         db_path = os.path.join(os.path.dirname(__file__), 'api/data/nba_data.db')
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
+        conn = get_shared_connection(db_path, readonly=True)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -5763,7 +4674,7 @@ if __name__ == '__main__':
         print(f"[Server] Database exists: {os.path.exists(db_path)}")
 
         # Check if database has any games
-        conn = sqlite3.connect(db_path)
+        conn = get_shared_connection(db_path, row_factory=None)
         cursor = conn.cursor()
 
         # Check if table exists
@@ -18,6 +18,7 @@ export default function ModelCoachDrawer({ isOpen, onClose }) {
   const [summary, setSummary] = useState(null);
   const [isLoading, setIsLoading] = useState(false);
   const [error, setError] = useState(null);
+  const [summaryStatus, setSummaryStatus] = useState(null);
   const [selectedDate, setSelectedDate] = useState(new Date().toISOString().split('T')[0]);
 
   useEffect(() => {
@@ -26,24 +27,40 @@ export default function ModelCoachDrawer({ isOpen, onClose }) {
     }
   }, [isOpen, selectedDate]);
 
-  const fetchSummary = async (date) => {
-    setIsLoading(true);
-    setError(null);
+  // While the server regenerates the summary, check back quietly
+  useEffect(() => {
+    if (!isOpen || (summaryStatus !== 'pending' && summaryStatus !== 'stale')) return;
+    const timer = setTimeout(() => fetchSummary(selectedDate, { quiet: true }), 5000);
+    return () => clearTimeout(timer);
+  }, [isOpen, selectedDate, summary, summaryStatus]);
+
+  const fetchSummary = async (date, { quiet = false } = {}) => {
+    if (!quiet) {
+      setIsLoading(true);
+      setError(null);
+    }
 
     try {
       const response = await fetch(`/api/model-review/summary?date=${date}`);
       const data = await response.json();
 
       if (!response.ok || !data.success) {
+        if (data.error_code === 'OPENAI_KEY_MISSING') {
+          throw new Error('The AI key is not set on the server. Add your OpenAI key in Railway, then reload and try again.');
+        }
         throw new Error(data.error || 'Failed to load summary');
       }
 
       setSummary(data.summary);
+      setSummaryStatus(data.summary_status);
     } catch (err) {
       console.error('[Model Coach] Error fetching summary:', err);
+      setSummaryStatus(null);
       setError(err.message);
     } finally {
-      setIsLoading(false);
+      if (!quiet) {
+        setIsLoading(false);
+      }
     }
   };
 
@@ -108,6 +125,19 @@ export default function ModelCoachDrawer({ isOpen, onClose }) {
             </div>
           )}
 
+          {!isLoading && !error && !summary && summaryStatus === 'pending' && (
+            <div className="text-center py-12">
+              <div className="inline-block animate-spin rounded-full h-12 w-12 border-b-2 border-purple-600"></div>
+              <p className="mt-4 text-gray-600 dark:text-gray-400">Generating today's coaching summary...</p>
+            </div>
+          )}
+
+          {!isLoading && !error && summary && summaryStatus === 'stale' && (
+            <p className="text-xs text-gray-500 dark:text-gray-400 mb-3">
+              New reviews came in - updating this summary...
+            </p>
+          )}
+
           {!isLoading && !error && summary && (
             <>
               {summary.total_games === 0 ? (
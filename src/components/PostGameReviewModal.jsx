@@ -102,6 +102,22 @@ export default function PostGameReviewModal({ isOpen, onClose, gameData }) {
     setPreviewUrl(url);
   };
 
+  const waitForJob = async (statusEndpoint) => {
+    // Screenshot reviews take 10-60 seconds (Vision + Model Coach)
+    for (let attempt = 0; attempt < 150; attempt++) {
+      await new Promise((resolve) => setTimeout(resolve, 2000));
+      const response = await fetch(statusEndpoint);
+      const data = await response.json();
+      if (!response.ok || !data.success) {
+        throw new Error(data.error || 'Lost track of the review job. Please try again.');
+      }
+      if (data.job.status === 'succeeded' || data.job.status === 'failed') {
+        return data.job;
+      }
+    }
+    throw new Error('The review is taking longer than expected. Please try again later.');
+  };
+
   const handleUpload = async () => {
     if (!selectedFile || !gameData) return;
 
@@ -129,15 +145,22 @@ export default function PostGameReviewModal({ isOpen, onClose, gameData }) {
       const data = await response.json();
 
       if (!response.ok || !data.success) {
+        throw new Error(data.error || 'I could not analyze this screenshot. Please try again.');
+      }
+
+      // The review runs as a background job - poll until it finishes
+      const job = await waitForJob(data.status_endpoint);
+
+      if (job.status !== 'succeeded') {
         // Check for specific error codes from backend
-        if (data.code === 'OPENAI_KEY_MISSING') {
+        if (job.error_code === 'OPENAI_KEY_MISSING') {
           throw new Error('The AI key is not set on the server. Add your OpenAI key in Railway, then reload and try again.');
         }
-        throw new Error(data.error || 'I could not analyze this screenshot. Please try again.');
+        throw new Error(job.error || 'I could not analyze this screenshot. Please try again.');
       }
 
-      console.log('[PostGameReview] AI review response:', data.review);
-      setReviewResult(data.review);
+      console.log('[PostGameReview] AI review response:', job.result.review);
+      setReviewResult(job.result.review);
       setHasExistingReview(true); // Mark as saved after successful upload
 
     } catch (error) {
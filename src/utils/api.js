@@ -240,6 +240,8 @@ export const useGameDetail = (gameId, bettingLine = null) => {
     refetchOnWindowFocus: false,
     // Keep previous data while fetching new data (smoother UX)
     keepPreviousData: true,
+    // AI summary/writeup are generated in the background - poll until ready
+    refetchInterval: (query) => query.state.data?.ai_status?.status === 'pending' ? 5000 : false,
   })
 }
 
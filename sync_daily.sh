@@ -1,9 +1,13 @@
 #!/bin/bash
 # Daily NBA Data Sync Script
 # Runs at 3 AM MT to fetch today's games and update Last 5 trends
+# Incremental: only games newer than each team's last synced game are fetched
 
 cd "/Users/malcolmlittle/NBA OVER UNDER SW"
 
+# Warmed predictions go to the shared cache the server workers read
+export PREDICTION_CACHE_BACKEND="${PREDICTION_CACHE_BACKEND:-sqlite}"
+
 # Log file with date
 LOG_FILE="/Users/malcolmlittle/NBA OVER UNDER SW/logs/sync_$(date +%Y%m%d_%H%M%S).log"
 mkdir -p "$(dirname "$LOG_FILE")"
@@ -17,11 +21,12 @@ sys.path.insert(0, '/Users/malcolmlittle/NBA OVER UNDER SW')
 
 from api.utils.sync_nba_data import sync_all
 
-print("Starting daily sync...")
-result = sync_all(season='2025-26', triggered_by='cron')
+print("Starting daily sync (incremental)...")
+result = sync_all(season='2025-26', triggered_by='cron', incremental=True)
 print(f"\nSync completed!")
 print(f"  Success: {result['success']}")
 print(f"  Game Logs: {result['game_logs']}")
+print(f"  Teams Changed: {result.get('changed_teams', 0)}")
 print(f"  Today's Games: {result['todays_games']}")
 print(f"  Total Records: {result['total_records']}")
 if result.get('errors'):
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Test script for queued AI section generation
+
+Tests:
+1. Cached sections are attached as 'ready' without queueing anything
+2. Concurrent requests for the same uncached game share one job; once it
+   finishes the sections are served from cache
+3. A failed generation is not retried until RETRY_AFTER_SECONDS pass
+4. Without an OpenAI key nothing is queued
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from api.utils import ai_generation_queue, background_jobs, game_payloads
+from api.utils.ai_generation_queue import attach_ai_sections, queue_slate_ai_sections
+from api.utils.background_jobs import wait_for_job
+from api.utils.connection_pool import close_shared_connections
+
+PAYLOAD = {
+    'success': True,
+    'home_team': {'id': 1610612747, 'abbreviation': 'LAL'},
+    'away_team': {'id': 1610612738, 'abbreviation': 'BOS'},
+    'prediction': {'home_last5_trends': {'ppg': 118.2}},
+}
+
+
+class _FakeSummaryCache:
+    def __init__(self):
+        self.saved = {}
+        self.generated = []
+
+    def get_cached_summary(self, game_id):
+        return self.saved.get(game_id)
+
+    def get_or_generate_summary(self, game_id, **kwargs):
+        self.generated.append(game_id)
+        self.saved[game_id] = {'matchup_dna_summary': {'content': f'summary {game_id}'}}
+        return self.saved[game_id]
+
+
+class _FakeWriteupCache:
+    def __init__(self):
+        self.saved = {}
+        self.generated = []
+        self.release = threading.Event()
+        self.release.set()
+        self.fail = False
+
+    def get_writeup_data_hash(self, game_data):
+        return f"hash-{game_data['home_last5_trends'].get('ppg')}"
+
+    def get_current_writeup(self, game_data):
+        return self.saved.get((game_data['game_id'], self.get_writeup_data_hash(game_data)))
+
+    def get_or_generate_writeup(self, game_data):
+        self.release.wait(5)
+        self.generated.append(game_data['game_id'])
+        if self.fail:
+            return None
+        text = f"writeup {game_data['game_id']}"
+        self.saved[(game_data['game_id'], self.get_writeup_data_hash(game_data))] = text
+        return text
+
+
+class _Setup:
+    """Fake caches, payloads and OpenAI key; scratch jobs.db"""
+
+    def __init__(self, has_key=True):
+        self.has_key = has_key
+
+    def __enter__(self):
+        self.saved = (background_jobs.JOBS_DB_PATH, ai_generation_queue._cache_modules,
+                      ai_generation_queue.has_openai_key, ai_generation_queue.get_all_teams,
+                      ai_generation_queue.get_matchup_data, game_payloads.get_game_payload,
+                      ai_generation_queue.RETRY_AFTER_SECONDS)
+        background_jobs.JOBS_DB_PATH = os.path.join(tempfile.mkdtemp(), 'jobs.db')
+        self.summaries, self.writeups = _FakeSummaryCache(), _FakeWriteupCache()
+        ai_generation_queue._cache_modules = lambda: (self.writeups, self.summaries)
+        ai_generation_queue.has_openai_key = lambda: self.has_key
+        ai_generation_queue.get_all_teams = lambda: []
+        ai_generation_queue.get_matchup_data = lambda *args: {}
+        game_payloads.get_game_payload = lambda game_id, section, season='2025-26': dict(PAYLOAD)
+        return self
+
+    def __exit__(self, *exc):
+        (background_jobs.JOBS_DB_PATH, ai_generation_queue._cache_modules,
+         ai_generation_queue.has_openai_key, ai_generation_queue.get_all_teams,
+         ai_generation_queue.get_matchup_data, game_payloads.get_game_payload,
+         ai_generation_queue.RETRY_AFTER_SECONDS) = self.saved
+        close_shared_connections()
+
+
+def test_ready_from_cache():
+    """Both sections cached: nothing is queued"""
+    with _Setup() as setup:
+        setup.summaries.saved['g1'] = {'matchup_dna_summary': {'content': 'cached'}}
+        setup.writeups.saved[('g1', 'hash-118.2')] = 'cached writeup'
+
+        response = attach_ai_sections(dict(PAYLOAD), 'g1')
+        assert response['ai_status'] == {'status': 'ready'}
+        assert response['ai_writeup'] == 'cached writeup'
+        assert background_jobs.list_jobs() == []
+
+
+def test_concurrent_requests_share_one_job():
+    """Eight simultaneous page loads queue one generation"""
+    with _Setup() as setup:
+        setup.writeups.release.clear()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            responses = list(pool.map(lambda _: attach_ai_sections(dict(PAYLOAD), 'g2'), range(8)))
+
+        statuses = {r['ai_status']['status'] for r in responses}
+        job_ids = {r['ai_status']['job_id'] for r in responses}
+        assert statuses == {'pending'} and len(job_ids) == 1, (statuses, job_ids)
+        assert all(r['matchup_summary'] is None and r['ai_writeup'] is None for r in responses)
+
+        setup.writeups.release.set()
+        job = wait_for_job(job_ids.pop(), timeout=10)
+        assert job['status'] == 'succeeded', job
+        assert setup.writeups.generated == ['g2'] and setup.summaries.generated == ['g2']
+
+        response = attach_ai_sections(dict(PAYLOAD), 'g2')
+        assert response['ai_status'] == {'status': 'ready'}
+        assert response['ai_writeup'] == 'writeup g2'
+
+
+def test_failed_generation_backs_off():
+    """A failure is reported as unavailable instead of retried on every request"""
+    with _Setup() as setup:
+        setup.writeups.fail = True
+        job_id = attach_ai_sections(dict(PAYLOAD), 'g3')['ai_status']['job_id']
+        assert wait_for_job(job_id, timeout=10)['status'] == 'failed'
+
+        assert attach_ai_sections(dict(PAYLOAD), 'g3')['ai_status'] == {'status': 'unavailable'}
+        assert len(setup.writeups.generated) == 1
+
+        ai_generation_queue.RETRY_AFTER_SECONDS = 0
+        setup.writeups.fail = False
+        retry = attach_ai_sections(dict(PAYLOAD), 'g3')['ai_status']
+        assert retry['status'] == 'pending' and retry['job_id'] != job_id
+        assert wait_for_job(retry['job_id'], timeout=10)['status'] == 'succeeded'
+
+
+def test_no_openai_key():
+    """Without a key the page gets no AI sections and nothing is queued"""
+    with _Setup(has_key=False):
+        response = attach_ai_sections(dict(PAYLOAD), 'g4')
+        assert response['ai_status'] == {'status': 'unavailable'}
+        assert response['matchup_summary'] is None and response['ai_writeup'] is None
+        assert queue_slate_ai_sections(game_ids=['g4'])['skipped']
+        assert background_jobs.list_jobs() == []
+
+
+def main():
+    tests = [test_ready_from_cache, test_concurrent_requests_share_one_job,
+             test_failed_generation_backs_off, test_no_openai_key]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test script for bulk archetype feature extraction
+
+Tests:
+1. Bulk season/last-10 averages match a per-team aggregate query
+2. Small-sample standardization rules (1 team, 2 teams, no variance)
+3. Frame rule matching picks the same archetype as the per-team functions
+4. Live archetype assignment for all teams runs well under a second
+"""
+
+import sys
+import time
+
+import pandas as pd
+
+from api.utils.archetype_features import (
+    GAME_FILTER, _get_db_connection, calculate_team_feature_frames
+)
+from api.utils.archetype_classifier import (
+    ARCHETYPE_RULESETS, assign_all_team_archetypes, assign_archetypes_frame,
+    standardize_feature_frame, standardize_features,
+    assign_offensive_archetype, assign_defensive_archetype,
+    assign_assists_offensive_archetype, assign_assists_defensive_archetype,
+    assign_rebounds_offensive_archetype, assign_rebounds_defensive_archetype,
+    assign_threes_offensive_archetype, assign_threes_defensive_archetype,
+    assign_turnovers_offensive_archetype, assign_turnovers_defensive_archetype
+)
+
+SEASON = '2025-26'
+
+PER_TEAM_ASSIGN = {
+    'offensive': assign_offensive_archetype,
+    'defensive': assign_defensive_archetype,
+    'assists_offensive': assign_assists_offensive_archetype,
+    'assists_defensive': assign_assists_defensive_archetype,
+    'rebounds_offensive': assign_rebounds_offensive_archetype,
+    'rebounds_defensive': assign_rebounds_defensive_archetype,
+    'threes_offensive': assign_threes_offensive_archetype,
+    'threes_defensive': assign_threes_defensive_archetype,
+    'turnovers_offensive': assign_turnovers_offensive_archetype,
+    'turnovers_defensive': assign_turnovers_defensive_archetype
+}
+
+
+def test_bulk_matches_per_team_query():
+    """Threes features for one team equal a direct last-10 aggregate"""
+    frames = calculate_team_feature_frames(SEASON)
+    threes = frames['threes_offensive']
+    team_id = threes.xs('season', level='window').index[0]
+
+    conn = _get_db_connection()
+    row = conn.execute(f'''
+        SELECT COUNT(*), AVG(fg3a), AVG(fg3m), AVG(fga)
+        FROM (
+            SELECT * FROM team_game_logs
+            WHERE team_id = ? AND season = ? {GAME_FILTER}
+            ORDER BY game_date DESC LIMIT 10
+        )
+    ''', (int(team_id), SEASON)).fetchone()
+    conn.close()
+
+    bulk = threes.loc[('last_10', team_id)]
+    assert bulk['games_count'] == row[0]
+    assert abs(bulk['fg3a'] - row[1]) < 1e-9
+    assert abs(bulk['fg3_pct'] - row[2] / row[1]) < 1e-9
+    assert abs(bulk['three_pa_rate'] - row[1] / row[3]) < 1e-9
+    assert (threes.xs('last_10', level='window')['games_count'] <= 10).all()
+
+
+def test_standardization_small_samples():
+    """Same rules as the per-team dict version"""
+    one_team = pd.DataFrame({'fg3a': [30.0], 'fg3_pct': [0.36], 'three_pa_rate': [0.4]}, index=[1])
+    assert (standardize_feature_frame(one_team, 'threes_offensive').loc[1] == [30.0, 0.36, 0.4]).all()
+
+    two_teams = pd.DataFrame({'fg3a': [30.0, 40.0], 'fg3_pct': [0.36, 0.36], 'three_pa_rate': [0.4, 0.5]},
+                             index=[1, 2])
+    z = standardize_feature_frame(two_teams, 'threes_offensive')
+    assert list(z['fg3a']) == [-5.0, 5.0]  # stdev fixed at 1.0 with two teams
+    assert list(z['fg3_pct']) == [0.0, 0.0]
+
+    features = {1: {'fg3a': 30.0, 'fg3_pct': 0.3, 'three_pa_rate': 0.4, 'games_count': 10, 'window': 'season'},
+                2: {'fg3a': 36.0, 'fg3_pct': 0.4, 'three_pa_rate': 0.5, 'games_count': 11, 'window': 'season'},
+                3: {'fg3a': 42.0, 'fg3_pct': 0.35, 'three_pa_rate': 0.3, 'games_count': 12, 'window': 'season'}}
+    standardized = standardize_features(features, 'threes_offensive')
+    assert standardized[2]['fg3a'] == 0.0
+    assert abs(standardized[3]['fg3a'] - 1.0) < 1e-12
+    assert standardized[3]['games_count'] == 12 and standardized[3]['window'] == 'season'
+
+
+def test_frame_rules_match_per_team():
+    """Every family and window: frame assignment == assign_*_archetype per team"""
+    frames = calculate_team_feature_frames(SEASON)
+    for family, frame in frames.items():
+        for window in ('season', 'last_10'):
+            window_frame = frame.xs(window, level='window')
+            z_scores = standardize_feature_frame(window_frame, family)
+            assigned = assign_archetypes_frame(z_scores, family)
+            for team_id, z_row in zip(z_scores.index, z_scores.to_dict('records')):
+                assert assigned[int(team_id)] == PER_TEAM_ASSIGN[family](z_row), (family, window, team_id)
+    assert set(ARCHETYPE_RULESETS) == set(frames)
+
+
+def test_live_assignment_is_fast():
+    """/api/team-archetypes can recompute live"""
+    start = time.perf_counter()
+    assignments = assign_all_team_archetypes(SEASON)
+    elapsed = time.perf_counter() - start
+    print(f"  {len(assignments)} teams in {elapsed * 1000:.0f}ms")
+    assert len(assignments) >= 2
+    assert elapsed < 1.0
+
+
+def main():
+    tests = [test_bulk_matches_per_team_query, test_standardization_small_samples,
+             test_frame_rules_match_per_team, test_live_assignment_is_fast]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
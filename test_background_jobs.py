@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test script for background jobs
+
+Tests:
+1. A job's result is stored and readable from a fresh connection
+2. Exceptions become failed jobs; a `code` attribute becomes error_code
+3. Jobs left queued/running by a dead process (or by an earlier process
+   with the same PID) are reported as failed
+4. Jobs still active after JOB_MAX_RUNTIME_SECONDS are failed as expired
+5. Jobs run concurrently up to JOB_WORKERS and outside the caller's thread
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+
+from api.utils import background_jobs
+from api.utils.background_jobs import get_job, list_jobs, submit_job, wait_for_job
+from api.utils.connection_pool import close_shared_connections
+
+
+class _KeyMissing(Exception):
+    code = 'OPENAI_KEY_MISSING'
+
+
+class _Setup:
+    """Point background_jobs at a scratch jobs.db"""
+
+    def __enter__(self):
+        self.saved = background_jobs.JOBS_DB_PATH
+        background_jobs.JOBS_DB_PATH = os.path.join(tempfile.mkdtemp(), 'jobs.db')
+        return background_jobs.JOBS_DB_PATH
+
+    def __exit__(self, *exc):
+        background_jobs.JOBS_DB_PATH = self.saved
+        close_shared_connections()
+
+
+def test_result_stored():
+    """The return value is stored as JSON with params and timings"""
+    with _Setup() as path:
+        job_id = submit_job('add', lambda a, b=0: {'sum': a + b}, 2, b=3, params={'a': 2})
+        job = wait_for_job(job_id, timeout=5)
+        assert job['status'] == 'succeeded', job
+        assert job['result'] == {'sum': 5} and job['params'] == {'a': 2}
+        assert job['kind'] == 'add' and job['duration_ms'] is not None
+
+        conn = sqlite3.connect(path)
+        assert conn.execute('SELECT status FROM background_jobs').fetchone()[0] == 'succeeded'
+        conn.close()
+        assert [j['job_id'] for j in list_jobs(kind='add')] == [job_id]
+        assert get_job('no-such-job') is None
+
+
+def test_failure_recorded():
+    """The error message and code are kept for the status endpoint"""
+    def boom():
+        raise _KeyMissing('OPENAI_API_KEY environment variable not set')
+
+    with _Setup():
+        job = wait_for_job(submit_job('review', boom), timeout=5)
+        assert job['status'] == 'failed' and job['result'] is None
+        assert job['error_code'] == 'OPENAI_KEY_MISSING' and 'OPENAI_API_KEY' in job['error']
+
+        job = wait_for_job(submit_job('review', lambda: 1 / 0), timeout=5)
+        assert job['status'] == 'failed' and job['error_code'] is None
+
+
+def test_orphaned_job_failed():
+    """A running job whose worker process is gone is reported as failed"""
+    with _Setup() as path:
+        job_id = wait_for_job(submit_job('sync', lambda: None), timeout=5)['job_id']
+        conn = sqlite3.connect(path)
+        # PIDs wrap well below 2**22 on Linux, so this process cannot exist
+        conn.execute("UPDATE background_jobs SET status = 'running', worker_pid = 4194304")
+        conn.commit()
+        conn.close()
+
+        job = get_job(job_id)
+        assert job['status'] == 'failed' and job['error_code'] == 'WORKER_EXITED'
+        assert list_jobs()[0]['status'] == 'failed'
+
+        # Our own PID, recorded by a process that started at another time
+        # (a container restart hands out the same PIDs)
+        conn = sqlite3.connect(path)
+        conn.execute("UPDATE background_jobs SET status = 'running', worker_pid = ?, worker_identity = ?",
+                     (os.getpid(), f'{os.getpid()}:1'))
+        conn.commit()
+        conn.close()
+        assert get_job(job_id)['error_code'] == 'WORKER_EXITED'
+
+        # Still active in this process: left alone
+        conn = sqlite3.connect(path)
+        conn.execute("UPDATE background_jobs SET status = 'running', worker_identity = ?",
+                     (background_jobs._current_identity(),))
+        conn.commit()
+        conn.close()
+        assert get_job(job_id)['status'] == 'running'
+
+
+def test_expired_job_failed():
+    """An active job past the max runtime is failed and releases its dedupe key"""
+    with _Setup() as path:
+        job_id = wait_for_job(submit_job('summary', lambda: None, dedupe_key='2026-01-02'), timeout=5)['job_id']
+        conn = sqlite3.connect(path)
+        conn.execute("UPDATE background_jobs SET status = 'running', created_at = '2026-01-01T00:00:00+00:00'")
+        conn.commit()
+        conn.close()
+
+        job = background_jobs.latest_job('summary', '2026-01-02')
+        assert job['status'] == 'failed' and job['error_code'] == 'JOB_EXPIRED', job
+        assert submit_job('summary', lambda: None, dedupe_key='2026-01-02') != job_id
+
+
+def test_runs_concurrently_off_thread():
+    """JOB_WORKERS jobs run at once, none on the submitting thread"""
+    started = threading.Barrier(background_jobs.JOB_WORKERS, timeout=5)
+    caller = threading.get_ident()
+
+    def job():
+        started.wait()
+        return threading.get_ident() != caller
+
+    with _Setup():
+        job_ids = [submit_job('wait', job) for _ in range(background_jobs.JOB_WORKERS)]
+        for job_id in job_ids:
+            job = wait_for_job(job_id, timeout=10)
+            assert job['status'] == 'succeeded' and job['result'] is True, job
+
+
+def main():
+    tests = [test_result_stored, test_failure_recorded, test_orphaned_job_failed,
+             test_expired_job_failed, test_runs_concurrently_off_thread]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
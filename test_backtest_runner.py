@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script for the multi-engine backtest runner
+
+Tests:
+1. Metrics: MAE, bias, and over/under hits with pushes and missing lines
+2. Code hashes cover every api.utils module an engine imports
+3. A second run reuses stored predictions; a code change recomputes them
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+
+import pandas as pd
+
+from api.utils import backtest_runner
+from api.utils.backtest_runner import (
+    ENGINES, BacktestEngine, _module_closure, calculate_engine_metrics, engine_code_hash, run_backtest
+)
+
+SEASON = '2025-26'
+
+
+def _predict_constant(game, season):
+    """Test engine: always 220"""
+    return 220.0
+
+
+def test_engine_metrics():
+    """Pushes and games without a line are not graded"""
+    results = pd.DataFrame({
+        'predicted_total': [230.0, 210.0, 220.0, 225.0, None],
+        'actual_total': [226.0, 214.0, 221.0, 230.0, 200.0],
+        'line': [225.0, 212.0, 221.0, None, 210.0],
+        'elapsed_ms': [10.0, 20.0, 30.0, 40.0, 50.0],
+        'error': [None, None, None, None, 'ValueError: no data']
+    })
+    metrics = calculate_engine_metrics(results)
+
+    assert metrics['games'] == 4 and metrics['errors'] == 1
+    assert metrics['mae'] == round((4 + 4 + 1 + 5) / 4, 2)
+    assert metrics['bias'] == round((4 - 4 - 1 - 5) / 4, 2)
+    # Over 225 hit, under 212 missed (214 went over), 221 is a push
+    assert metrics['ou_games'] == 2 and metrics['ou_hit_rate'] == 50.0
+    assert metrics['ms_per_game'] == 30.0
+
+
+def test_code_hash_covers_imports():
+    """v5 hashes the profile builder and feature store it reads"""
+    files = {os.path.basename(path) for path in _module_closure('prediction_engine_v5')}
+    assert {'prediction_engine_v5.py', 'team_profiles_v5.py', 'team_feature_store.py'} <= files
+    assert 'prediction_engine.py' not in files
+
+    extra = os.path.join(tempfile.mkdtemp(), 'model.json')
+    with open(extra, 'w') as f:
+        f.write('{"version": "1"}')
+    engine = BacktestEngine('t', '1', 'team_ratings_model', _predict_constant, False, (extra,))
+    before = engine_code_hash(engine)
+    with open(extra, 'w') as f:
+        f.write('{"version": "2"}')
+    assert engine_code_hash(engine) != before
+
+
+def test_results_are_cached():
+    """Unchanged engines are read back instead of recomputed"""
+    tmp = tempfile.mkdtemp()
+    nba_db = os.path.join(tmp, 'nba_data.db')
+    shutil.copy(backtest_runner.NBA_DATA_DB_PATH, nba_db)
+    conn = sqlite3.connect(nba_db)
+    conn.execute('DROP TABLE IF EXISTS backtest_results')
+    game_id, game_date, actual = conn.execute('''
+        SELECT game_id, substr(game_date, 1, 10), SUM(team_pts) FROM team_game_logs
+        WHERE season = ? GROUP BY game_id HAVING COUNT(*) = 2 ORDER BY game_date DESC LIMIT 1
+    ''', (SEASON,)).fetchone()
+    conn.commit()
+    conn.close()
+
+    lines_db = os.path.join(tmp, 'predictions.db')
+    conn = sqlite3.connect(lines_db)
+    conn.execute('CREATE TABLE game_predictions (game_id TEXT, sportsbook_total_line REAL)')
+    conn.execute('INSERT INTO game_predictions VALUES (?, ?)', (game_id, actual - 0.5))
+    conn.commit()
+    conn.close()
+
+    originals = backtest_runner.NBA_DATA_DB_PATH, backtest_runner.PREDICTIONS_DB_PATH
+    backtest_runner.NBA_DATA_DB_PATH, backtest_runner.PREDICTIONS_DB_PATH = nba_db, lines_db
+    ENGINES['constant'] = BacktestEngine('constant', '1', 'team_ratings_model', _predict_constant, False)
+    try:
+        first = run_backtest(['constant'], SEASON, game_date, game_date, workers=2)['constant']
+        second = run_backtest(['constant'], SEASON, game_date, game_date, workers=2)['constant']
+        assert first['computed'] == first['games'] > 0 and first['cached'] == 0
+        assert second['computed'] == 0 and second['cached'] == first['games']
+        assert second['mae'] == first['mae'] and second['ou_games'] == 1
+        assert second['ou_hit_rate'] == (100.0 if 220.0 > actual - 0.5 else 0.0)
+
+        ENGINES['constant'] = BacktestEngine('constant', '2', 'team_ratings_model', _predict_constant, False)
+        assert run_backtest(['constant'], SEASON, game_date, game_date, workers=2)['constant']['computed'] > 0
+    finally:
+        del ENGINES['constant']
+        backtest_runner.NBA_DATA_DB_PATH, backtest_runner.PREDICTIONS_DB_PATH = originals
+
+
+def main():
+    tests = [test_engine_metrics, test_code_hash_covers_imports, test_results_are_cached]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test script for the cached daily Model Coach summary
+
+Tests:
+1. The first request queues one generation; later requests are served from
+   coach_summaries without calling OpenAI again
+2. A new review for the date serves the old summary as 'stale' and
+   regenerates it once in the background
+3. Dates without reviews return the total_games=0 message
+4. Without an OpenAI key nothing is queued and the status is 'unavailable'
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime, timezone
+
+from api.utils import background_jobs, coach_summary_cache, db_schema_game_reviews, openai_client
+from api.utils.background_jobs import wait_for_job
+from api.utils.coach_summary_cache import get_coach_summary
+from api.utils.connection_pool import close_shared_connections
+
+DATE = '2026-01-15'
+
+
+class _Setup:
+    """Scratch game_reviews.db and jobs.db, fake OpenAI summary"""
+
+    def __init__(self, has_key=True):
+        self.has_key = has_key
+
+    def __enter__(self):
+        self.saved = (background_jobs.JOBS_DB_PATH, db_schema_game_reviews.GAME_REVIEWS_DB_PATH,
+                      openai_client.generate_daily_coach_summary, coach_summary_cache.has_openai_key)
+        scratch = tempfile.mkdtemp()
+        background_jobs.JOBS_DB_PATH = os.path.join(scratch, 'jobs.db')
+        db_schema_game_reviews.GAME_REVIEWS_DB_PATH = os.path.join(scratch, 'game_reviews.db')
+        db_schema_game_reviews.init_game_reviews_db()
+
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+        def fake_summary(reviews, model):
+            self.release.wait(5)
+            self.calls.append(sorted(r['game_id'] for r in reviews))
+            return {'total_games': len(reviews), 'overall_performance': f'{len(reviews)} games'}
+
+        openai_client.generate_daily_coach_summary = fake_summary
+        coach_summary_cache.has_openai_key = lambda: self.has_key
+        return self
+
+    def __exit__(self, *exc):
+        (background_jobs.JOBS_DB_PATH, db_schema_game_reviews.GAME_REVIEWS_DB_PATH,
+         openai_client.generate_daily_coach_summary, coach_summary_cache.has_openai_key) = self.saved
+        close_shared_connections()
+
+    def add_review(self, game_id, abs_error=5.0):
+        now = datetime.now(timezone.utc).isoformat()
+        with db_schema_game_reviews.get_connection() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO game_reviews
+                    (game_id, home_team, away_team, game_date, abs_error_total,
+                     ai_review_json, created_at, updated_at)
+                VALUES (?, 'LAL', 'BOS', ?, ?, '{"what_happened": "x"}', ?, ?)
+            ''', (game_id, DATE, abs_error, now, now))
+            conn.commit()
+
+
+def test_generated_once_then_cached():
+    """Only the first request for a review set reaches OpenAI"""
+    with _Setup() as setup:
+        setup.add_review('g1')
+        first = get_coach_summary(DATE)
+        assert first['summary'] is None and first['summary_status'] == 'pending', first
+        assert get_coach_summary(DATE)['job_id'] == first['job_id']
+
+        assert wait_for_job(first['job_id'], timeout=10)['status'] == 'succeeded'
+        for _ in range(3):
+            result = get_coach_summary(DATE)
+            assert result['summary_status'] == 'current', result
+            assert result['summary'] == {'total_games': 1, 'overall_performance': '1 games', 'date': DATE}
+        assert setup.calls == [['g1']]
+
+
+def test_new_review_serves_stale_and_regenerates():
+    """A new review keeps the old summary on screen until the new one is ready"""
+    with _Setup() as setup:
+        setup.add_review('g1')
+        assert wait_for_job(get_coach_summary(DATE)['job_id'], timeout=10)['status'] == 'succeeded'
+
+        setup.release.clear()
+        setup.add_review('g2', abs_error=12.0)
+        stale = get_coach_summary(DATE)
+        assert stale['summary_status'] == 'stale' and stale['summary']['total_games'] == 1, stale
+        assert get_coach_summary(DATE)['job_id'] == stale['job_id']
+
+        setup.release.set()
+        assert wait_for_job(stale['job_id'], timeout=10)['status'] == 'succeeded'
+        result = get_coach_summary(DATE)
+        assert result['summary_status'] == 'current' and result['summary']['total_games'] == 2
+        assert setup.calls == [['g1'], ['g1', 'g2']]
+
+
+def test_no_reviews():
+    """An empty date needs no summary"""
+    with _Setup() as setup:
+        result = get_coach_summary('2026-01-01')
+        assert result['summary']['total_games'] == 0 and result['summary_status'] == 'current'
+        assert background_jobs.list_jobs() == [] and setup.calls == []
+
+
+def test_no_openai_key():
+    """Without a key nothing is queued"""
+    with _Setup(has_key=False) as setup:
+        setup.add_review('g1')
+        result = get_coach_summary(DATE)
+        assert result['summary'] is None and result['summary_status'] == 'unavailable'
+        assert result['error_code'] == 'OPENAI_KEY_MISSING'
+        assert background_jobs.list_jobs() == []
+
+
+def main():
+    tests = [test_generated_once_then_cached, test_new_review_serves_stale_and_regenerates,
+             test_no_reviews, test_no_openai_key]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script for read-only nba_data.db serving snapshots
+
+Tests:
+1. Read-only connections read the published snapshot, not later live writes;
+   a new publish swaps readers on their next checkout
+2. Without DB_SNAPSHOT_SERVING, read-only connections read the live database
+3. ensure_snapshot() only republishes when the live database changed
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from api.utils.connection_pool import close_shared_connections, get_shared_connection
+from api.utils.db_snapshot import ensure_snapshot, get_snapshot_status, publish_snapshot, snapshot_path
+
+
+def _make_live_db():
+    path = os.path.join(tempfile.mkdtemp(), 'nba_data.db')
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('CREATE TABLE team_game_logs (game_id TEXT, team_pts INTEGER)')
+    conn.execute("INSERT INTO team_game_logs VALUES ('g1', 110)")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _count(conn):
+    return conn.execute('SELECT COUNT(*) FROM team_game_logs').fetchone()[0]
+
+
+def _write_live(path, game_id):
+    conn = get_shared_connection(path)
+    conn.execute('INSERT INTO team_game_logs VALUES (?, 100)', (game_id,))
+    conn.commit()
+    conn.close()
+
+
+def test_reads_come_from_snapshot():
+    """Live writes after publish are invisible to readers until the next publish"""
+    path = _make_live_db()
+    os.environ['DB_SNAPSHOT_SERVING'] = '1'
+    try:
+        result = publish_snapshot(path)
+        assert result['path'] == snapshot_path(path) and result['bytes'] > 0
+        snapshot = sqlite3.connect(result['path'])
+        assert snapshot.execute('PRAGMA journal_mode').fetchone()[0] == 'delete'
+        snapshot.close()
+
+        _write_live(path, 'g2')
+        reader = get_shared_connection(path, readonly=True)
+        assert _count(reader) == 1
+        try:
+            reader.execute("INSERT INTO team_game_logs VALUES ('g3', 1)")
+            assert False, 'snapshot connection accepted a write'
+        except sqlite3.OperationalError:
+            pass
+
+        # A reader mid-request keeps its snapshot; the next checkout swaps
+        publish_snapshot(path)
+        assert _count(reader) == 1
+        reader.close()
+        swapped = get_shared_connection(path, readonly=True)
+        assert swapped is not reader and _count(swapped) == 2
+        swapped.close()
+        assert get_snapshot_status(path)['loaded_version_current']
+    finally:
+        del os.environ['DB_SNAPSHOT_SERVING']
+        close_shared_connections()
+
+
+def test_disabled_reads_live():
+    """Snapshot files are ignored unless serving mode is on"""
+    path = _make_live_db()
+    publish_snapshot(path)
+    _write_live(path, 'g2')
+    reader = get_shared_connection(path, readonly=True)
+    assert _count(reader) == 2
+    reader.close()
+    close_shared_connections()
+
+
+def test_ensure_snapshot():
+    """Missing or stale snapshots are published; current ones are left alone"""
+    path = _make_live_db()
+    assert ensure_snapshot(path) is not None
+    assert ensure_snapshot(path) is None
+
+    time.sleep(0.01)
+    _write_live(path, 'g2')
+    os.utime(snapshot_path(path), (time.time() - 60, time.time() - 60))
+    assert ensure_snapshot(path) is not None
+    close_shared_connections()
+
+
+def main():
+    tests = [test_reads_come_from_snapshot, test_disabled_reads_live, test_ensure_snapshot]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
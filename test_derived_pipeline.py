@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script for the derived table pipeline
+
+Tests:
+1. Stages are declared after the stages they read from
+2. Changed game logs rebuild team stages for those teams only
+3. Changed season stats skip the game-log-only stages
+4. Stages writing one database never overlap; other databases run alongside
+5. A failed stage skips everything downstream of it
+"""
+
+import sys
+import time
+
+from api.utils.derived_pipeline import STAGES, BASE_INPUTS, DerivedStage, plan_rebuild, rebuild_derived_tables
+
+
+def _planned(changed):
+    return {stage.name: team_ids for stage, team_ids, _ in plan_rebuild(changed)}
+
+
+def test_stages_in_dependency_order():
+    """Every input is a base input or produced by an earlier stage"""
+    available = set(BASE_INPUTS)
+    for stage in STAGES:
+        missing = set(stage.inputs) - available
+        assert not missing, f"{stage.name} reads {missing} before it is produced"
+        available |= set(stage.outputs)
+
+
+def test_game_log_change_is_team_scoped():
+    """Two teams played: team stages run for them, league stages for everyone"""
+    planned = _planned({'team_game_logs': {1610612747, 1610612738}})
+
+    assert planned['season_opponent_stats'] == [1610612738, 1610612747]
+    assert planned['scoring_vs_pace'] == [1610612738, 1610612747]
+    assert planned['rankings'] is None
+    assert planned['team_archetypes'] is None
+    assert 'league_averages' not in planned  # Reads only team_season_stats
+
+
+def test_season_stats_change_skips_game_log_stages():
+    """Refetched season stats don't touch per-game aggregates"""
+    planned = _planned({'team_season_stats': None})
+
+    assert 'season_opponent_stats' not in planned
+    assert 'scoring_vs_pace' not in planned
+    assert 'team_archetypes' not in planned
+    assert {'rankings', 'league_averages', 'team_profiles', 'similarity'} <= set(planned)
+
+
+def _fake_stages(events, fail=None):
+    """Stages that record when they run instead of touching SQLite"""
+    def builder(name):
+        def build(season, team_ids, prepared):
+            events.append(('start', name, time.perf_counter()))
+            time.sleep(0.05)
+            events.append(('end', name, time.perf_counter()))
+            if name == fail:
+                raise RuntimeError('boom')
+            return 1
+        return build
+
+    return [
+        DerivedStage('a', ('logs',), ('a',), builder('a'), scope='team'),
+        DerivedStage('b', ('logs',), ('b',), builder('b'), scope='team'),
+        DerivedStage('c', ('logs',), ('c',), builder('c'), database='other.db'),
+        DerivedStage('d', ('a', 'b'), ('d',), builder('d')),
+    ]
+
+
+def _interval(events, name):
+    start = next(t for kind, n, t in events if kind == 'start' and n == name)
+    end = next(t for kind, n, t in events if kind == 'end' and n == name)
+    return start, end
+
+
+def test_concurrency_respects_write_lock():
+    """a and b share nba_data.db and take turns; c (other.db) overlaps them"""
+    events = []
+    results = rebuild_derived_tables('2025-26', {'logs': [1]}, max_workers=3,
+                                     stages=_fake_stages(events), log_stages=False)
+    assert all(r['error'] is None for r in results.values())
+
+    a, b, c, d = (_interval(events, name) for name in 'abcd')
+    assert a[1] <= b[0] or b[1] <= a[0], "nba_data.db writers overlapped"
+    assert c[0] < max(a[1], b[1]) and min(a[0], b[0]) < c[1], "other.db stage did not run alongside"
+    assert d[0] >= max(a[1], b[1]), "d started before its inputs were rebuilt"
+
+
+def test_failure_skips_downstream():
+    """d depends on a; when a fails, d is skipped and c still runs"""
+    events = []
+    results = rebuild_derived_tables('2025-26', {'logs': [1]}, max_workers=3,
+                                     stages=_fake_stages(events, fail='a'), log_stages=False)
+
+    assert 'a failed' in results['a']['error']
+    assert 'skipped' in results['d']['error']
+    assert results['c']['error'] is None
+    assert not any(n == 'd' for _, n, _ in events)
+
+
+def main():
+    tests = [test_stages_in_dependency_order, test_game_log_change_is_team_scoped,
+             test_season_stats_change_skips_game_log_stages, test_concurrency_respects_write_lock,
+             test_failure_skips_downstream]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Test script for the columnar game log store
+
+Tests:
+1. A team's games come back most recent first, filtered by game type,
+   NULL and non-positive columns; last_n() keeps the most recent
+2. Defense tier and pace bucket selections match get_defense_tier() and
+   get_pace_bucket(), including the boundaries and missing ranks
+3. The store is reused until the data version changes, then reloaded
+4. pace_splits answers from the store
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+
+from api.utils import game_log_store, pace_splits
+from api.utils.connection_pool import close_shared_connections
+from api.utils.db_queries import get_pace_bucket
+from api.utils.defense_tiers import get_defense_tier
+from api.utils.game_log_store import average, get_game_log_store, total
+
+SEASON = '2025-26'
+data_version = ['1:2026-01-02']
+
+# team_id, opponent def_rtg_rank (None = no season row)
+TEAMS = [(1, 5), (2, 15), (3, 28), (4, None)]
+
+# Team 1's games: game_date, opponent, game_type, is_home, team_pts, pace, turnovers
+GAMES = [
+    ('2025-07-12', 2, 'Summer League', 1, 90, 104.0, 20),
+    ('2025-11-01', 2, 'Regular Season', 1, 110, 95.9, 12),
+    ('2025-11-03', 3, 'Regular Season', 0, 104, 96.0, 14),
+    ('2025-11-05', 4, 'NBA Cup', 1, 121, 101.0, None),
+    ('2025-11-07', 2, 'Regular Season', 0, 99, 101.5, 11),
+    ('2025-11-09', 3, 'NBA Cup', 1, 117, None, 15),
+    ('2025-11-11', 2, 'Regular Season', 0, 108, 0.0, 13),
+]
+
+
+class _Setup:
+    """Scratch nba_data.db with one team's game logs and opponent ranks"""
+
+    def __enter__(self):
+        self.saved = (game_log_store.NBA_DATA_DB_PATH, pace_splits.NBA_DATA_DB_PATH,
+                      game_log_store.get_cached_data_version)
+        path = os.path.join(tempfile.mkdtemp(), 'nba_data.db')
+
+        source = sqlite3.connect(game_log_store.NBA_DATA_DB_PATH)
+        schema = [sql for (sql,) in source.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' "
+            "AND name IN ('nba_teams', 'team_season_stats', 'team_game_logs')")]
+        source.close()
+
+        conn = sqlite3.connect(path)
+        for sql in schema:
+            conn.execute(sql)
+        for team_id, def_rank in TEAMS:
+            conn.execute('''
+                INSERT INTO nba_teams (team_id, team_abbreviation, full_name, season, last_updated)
+                VALUES (?, ?, ?, ?, '2026-01-01')
+            ''', (team_id, f'T{team_id}', f'Team {team_id}', SEASON))
+            if def_rank is not None:
+                conn.execute('''
+                    INSERT INTO team_season_stats (team_id, season, split_type, ppg, def_rtg_rank, synced_at)
+                    VALUES (?, ?, 'overall', 110.0, ?, '2026-01-01')
+                ''', (team_id, SEASON, def_rank))
+        for i, (game_date, opponent, game_type, is_home, pts, pace, tov) in enumerate(GAMES):
+            conn.execute('''
+                INSERT INTO team_game_logs
+                    (game_id, team_id, game_date, season, opponent_team_id, game_type,
+                     is_home, team_pts, opp_pts, pace, turnovers, synced_at)
+                VALUES (?, 1, ?, ?, ?, ?, ?, ?, 100, ?, ?, '2026-01-01')
+            ''', (f'g{i}', game_date, SEASON, opponent, game_type, is_home, pts, pace, tov))
+        # Another team's game, so team 1's slice has neighbours
+        conn.execute('''
+            INSERT INTO team_game_logs (game_id, team_id, game_date, season, is_home, team_pts, synced_at)
+            VALUES ('g1', 2, '2025-11-01', ?, 0, 100, '2026-01-01')
+        ''', (SEASON,))
+        conn.commit()
+        conn.close()
+
+        game_log_store.NBA_DATA_DB_PATH = pace_splits.NBA_DATA_DB_PATH = path
+        game_log_store.get_cached_data_version = lambda: data_version[0]
+        game_log_store.reset_game_log_store()
+        return path
+
+    def __exit__(self, *exc):
+        (game_log_store.NBA_DATA_DB_PATH, pace_splits.NBA_DATA_DB_PATH,
+         game_log_store.get_cached_data_version) = self.saved
+        data_version[0] = '1:2026-01-02'
+        game_log_store.reset_game_log_store()
+        close_shared_connections()
+
+
+def _game_ids(store, rows):
+    return list(store.values('game_id', rows))
+
+
+def test_team_rows():
+    """Most recent first; eligible, require and positive filters"""
+    with _Setup():
+        store = get_game_log_store(SEASON)
+        assert len(store) == 8
+
+        assert _game_ids(store, store.team_rows(1)) == ['g6', 'g5', 'g4', 'g3', 'g2', 'g1', 'g0']
+        assert _game_ids(store, store.team_rows(1, eligible_only=True)) == ['g6', 'g5', 'g4', 'g3', 'g2', 'g1']
+        assert _game_ids(store, store.team_rows(1, require=('pace', 'turnovers'))) == ['g6', 'g4', 'g2', 'g1', 'g0']
+        assert _game_ids(store, store.team_rows(1, eligible_only=True, positive=('pace',))) == ['g4', 'g3', 'g2', 'g1']
+        assert _game_ids(store, store.team_rows(2)) == ['g1']
+        assert len(store.team_rows(99)) == 0
+
+        rows = store.team_rows(1, eligible_only=True, require=('turnovers',))
+        assert _game_ids(store, store.last_n(rows, 2)) == ['g6', 'g5']
+        assert average(store.values('turnovers', store.last_n(rows, 3))) == round((13 + 15 + 11) / 3, 1)
+        assert _game_ids(store, store.at_home(rows)) == ['g5', 'g1']
+        assert average(store.values('turnovers', store.at_home(store.team_rows(99)))) == 0
+        assert total(store.values('turnovers', store.team_rows(1))) == 20 + 12 + 14 + 11 + 15 + 13
+
+
+def test_tiers_and_buckets():
+    """Vectorized selections agree with the scalar classifiers"""
+    with _Setup():
+        store = get_game_log_store(SEASON)
+        rows = store.team_rows(1)
+        ranks = dict(zip(_game_ids(store, rows), store.values('opp_def_rtg_rank', rows).tolist()))
+        for tier in ('elite', 'average', 'bad'):
+            expected = [g for g, rank in ranks.items() if rank == rank and get_defense_tier(int(rank)) == tier]
+            assert _game_ids(store, store.vs_defense_tier(rows, tier)) == expected, tier
+        # g3 is against a team without a season row
+        assert 'g3' not in _game_ids(store, store.vs_defense_tier(rows, 'elite'))
+
+        paced = store.team_rows(1, require=('pace',))
+        paces = dict(zip(_game_ids(store, paced), store.values('pace', paced).tolist()))
+        for bucket in ('slow', 'normal', 'fast'):
+            expected = [g for g, pace in paces.items() if get_pace_bucket(pace) == bucket]
+            assert _game_ids(store, store.in_pace_bucket(paced, bucket)) == expected, bucket
+        assert _game_ids(store, store.in_pace_bucket(paced, 'normal')) == ['g3', 'g2']
+        assert _game_ids(store, store.in_pace_range(rows, 96, 101.5)) == ['g3', 'g2']
+        assert _game_ids(store, store.in_pace_range(rows, low=101.5)) == ['g4', 'g0']
+
+
+def test_reload_on_new_version():
+    """Same snapshot until a sync changes the data version"""
+    with _Setup() as path:
+        first = get_game_log_store(SEASON)
+        assert get_game_log_store(SEASON) is first
+
+        conn = sqlite3.connect(path)
+        conn.execute('''
+            INSERT INTO team_game_logs (game_id, team_id, game_date, season, is_home, team_pts, synced_at)
+            VALUES ('g7', 1, '2025-11-13', ?, 1, 115, '2026-01-01')
+        ''', (SEASON,))
+        conn.commit()
+        conn.close()
+        assert get_game_log_store(SEASON) is first
+
+        data_version[0] = '2:2026-01-03'
+        second = get_game_log_store(SEASON)
+        assert second is not first and second.data_version == '2:2026-01-03'
+        assert _game_ids(second, second.last_n(second.team_rows(1), 1)) == ['g7']
+        assert len(get_game_log_store('2024-25')) == 0
+
+
+def test_pace_splits_from_store():
+    """Per-bucket home/away PPG from the store (all game types, unrounded)"""
+    with _Setup():
+        splits = pace_splits.get_team_pace_splits(1, SEASON)['pace_splits']
+        assert splits['slow'] == {'home_ppg': 110.0, 'away_ppg': 108.0, 'home_games': 1, 'away_games': 1}
+        assert splits['normal'] == {'home_ppg': 121.0, 'away_ppg': 104.0, 'home_games': 1, 'away_games': 1}
+        assert splits['fast'] == {'home_ppg': 90.0, 'away_ppg': 99.0, 'home_games': 1, 'away_games': 1}
+        assert pace_splits.get_team_pace_splits(4, SEASON) is None
+
+
+def main():
+    tests = [test_team_rows, test_tiers_and_buckets, test_reload_on_new_version, test_pace_splits_from_store]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
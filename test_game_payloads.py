@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test script for materialized per-game payloads
+
+Tests:
+1. A miss builds and stores the payload; later reads are served from the table
+2. Rows from another data version, payload version or day are rebuilt
+3. Unavailable games are reported, never stored
+4. materialize_game_payloads() builds every section and purges stale rows
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import zlib
+
+from api.utils import game_payloads, prediction_cache
+from api.utils.connection_pool import close_shared_connections
+from api.utils.game_payloads import (
+    PayloadUnavailable, get_game_payload, load_payload, materialize_game_payloads
+)
+
+calls = []
+data_version = ['1:2026-01-02']
+
+
+def _scoring(game_id, season):
+    calls.append(('scoring', game_id))
+    if game_id == 'missing':
+        raise PayloadUnavailable(f'Game {game_id} not found')
+    return {'success': True, 'data': {'game_id': game_id, 'ranks': {1: 3}}}
+
+
+def _pace(game_id, season):
+    calls.append(('pace', game_id))
+    return {'success': True, 'data': {'game_id': game_id, 'projected_pace': 99.5}}
+
+
+class _Setup:
+    """Point game_payloads at a scratch database with fake builders"""
+
+    def __enter__(self):
+        self.saved = (game_payloads.NBA_DATA_DB_PATH, game_payloads._builders, prediction_cache.get_data_version)
+        game_payloads.NBA_DATA_DB_PATH = os.path.join(tempfile.mkdtemp(), 'nba_data.db')
+        game_payloads._builders = lambda: {'scoring': _scoring, 'pace': _pace}
+        game_payloads.get_data_version = prediction_cache.get_data_version = lambda: data_version[0]
+        prediction_cache.reset_cached_data_version()
+        calls.clear()
+        return game_payloads.NBA_DATA_DB_PATH
+
+    def __exit__(self, *exc):
+        game_payloads.NBA_DATA_DB_PATH, game_payloads._builders, prediction_cache.get_data_version = self.saved
+        game_payloads.get_data_version = prediction_cache.get_data_version
+        prediction_cache.reset_cached_data_version()
+        data_version[0] = '1:2026-01-02'
+        close_shared_connections()
+
+
+def test_miss_then_hit():
+    """The builder runs once; the stored copy is compressed and identical"""
+    with _Setup() as path:
+        first = get_game_payload('0022500485', 'scoring')
+        second = get_game_payload('0022500485', 'scoring')
+        assert calls == [('scoring', '0022500485')]
+        # JSON object keys are strings, on a miss as well as a hit
+        assert first == second and first['data']['ranks'] == {'1': 3}
+
+        conn = sqlite3.connect(path)
+        blob, version = conn.execute(
+            "SELECT payload, payload_version FROM game_payloads WHERE section = 'scoring'"
+        ).fetchone()
+        conn.close()
+        assert version == game_payloads.PAYLOAD_VERSION
+        assert zlib.decompress(blob).startswith(b'{"success":true')
+
+
+def test_stale_rows_rebuilt():
+    """A sync, a builder change or a new day makes the stored row stale"""
+    with _Setup() as path:
+        get_game_payload('g1', 'pace')
+        data_version[0] = '2:2026-01-03'
+        prediction_cache.reset_cached_data_version()
+        assert load_payload('g1', 'pace') is None
+        get_game_payload('g1', 'pace')
+        assert len(calls) == 2
+
+        conn = sqlite3.connect(path)
+        conn.execute("UPDATE game_payloads SET built_on = '2000-01-01'")
+        conn.commit()
+        assert load_payload('g1', 'pace') is None
+        conn.execute("UPDATE game_payloads SET built_on = date('now', 'localtime'), payload_version = 'v0'")
+        conn.commit()
+        conn.close()
+        assert load_payload('g1', 'pace') is None
+        assert game_payloads.get_payload_stats()['stored'] == 1
+
+
+def test_unavailable_not_stored():
+    """PayloadUnavailable propagates with its status and leaves no row"""
+    with _Setup() as path:
+        for _ in range(2):
+            try:
+                get_game_payload('missing', 'scoring')
+                assert False, 'expected PayloadUnavailable'
+            except PayloadUnavailable as e:
+                assert e.status == 404 and 'missing' in str(e)
+        assert len(calls) == 2
+        assert game_payloads.get_payload_stats()['stored'] == 0
+
+
+def test_materialize():
+    """Every section of every game is stored; old-version rows are purged"""
+    with _Setup() as path:
+        get_game_payload('old', 'pace')
+        data_version[0] = '2:2026-01-03'
+
+        result = materialize_game_payloads(game_ids=['g1', 'g2', 'missing'])
+        assert result['games'] == 3
+        assert result['payloads'] == 5 and result['unavailable'] == 1
+        assert result['errors'] == []
+
+        calls.clear()
+        assert get_game_payload('g2', 'scoring')['data']['game_id'] == 'g2'
+        assert calls == []
+
+        conn = sqlite3.connect(path)
+        game_ids = {row[0] for row in conn.execute('SELECT game_id FROM game_payloads')}
+        conn.close()
+        assert game_ids == {'g1', 'g2', 'missing'}
+
+
+def main():
+    tests = [test_miss_then_hit, test_stale_rows_rebuilt, test_unavailable_not_stored, test_materialize]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
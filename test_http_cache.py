@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test script for ETag revalidation and response compression
+
+Tests:
+1. A matching If-None-Match gets a 304 without running the view
+2. The ETag changes with the data version, the query string and extra stamps
+3. Large JSON bodies are gzipped and their ETag suffixed; the suffixed ETag
+   still revalidates
+4. Small bodies, errors and skip_etag() responses are left alone
+"""
+
+import gzip
+import sys
+
+from flask import Flask, jsonify, request
+
+from api.utils import http_cache, prediction_cache
+from api.utils.http_cache import conditional_get, create_compression_middleware, skip_etag
+
+calls = []
+data_version = ['1:2026-01-02']
+stamp = [0]
+
+
+def _make_app():
+    app = Flask(__name__)
+    create_compression_middleware(app)
+
+    @app.route('/api/big')
+    @conditional_get(lambda: stamp[0])
+    def big():
+        calls.append(request.full_path)
+        return jsonify({'success': True, 'rows': [{'team': i, 'pts': 110 + i} for i in range(100)]})
+
+    @app.route('/api/small')
+    @conditional_get()
+    def small():
+        calls.append(request.full_path)
+        if request.args.get('partial'):
+            skip_etag()
+        if request.args.get('fail'):
+            return jsonify({'success': False, 'error': 'boom'}), 500
+        return jsonify({'success': True})
+
+    return app
+
+
+class _Setup:
+    """Pin the data version and reset call tracking"""
+
+    def __enter__(self):
+        self.saved = prediction_cache.get_data_version
+        prediction_cache.get_data_version = lambda: data_version[0]
+        prediction_cache.reset_cached_data_version()
+        calls.clear()
+        return _make_app().test_client()
+
+    def __exit__(self, *exc):
+        prediction_cache.get_data_version = self.saved
+        prediction_cache.reset_cached_data_version()
+        data_version[0] = '1:2026-01-02'
+        stamp[0] = 0
+
+
+def test_not_modified_skips_view():
+    """The second request revalidates without building the payload"""
+    with _Setup() as client:
+        first = client.get('/api/small')
+        etag = first.headers['ETag']
+        assert first.status_code == 200 and etag.startswith('"')
+
+        second = client.get('/api/small', headers={'If-None-Match': etag})
+        assert second.status_code == 304 and second.data == b''
+        assert second.headers['ETag'] == etag
+        assert calls == ['/api/small?']
+
+        assert client.get('/api/small', headers={'If-None-Match': '*'}).status_code == 304
+        assert client.get('/api/small', headers={'If-None-Match': '"other"'}).status_code == 200
+
+
+def test_etag_inputs():
+    """A sync, a different query or a changed stamp means a new ETag"""
+    with _Setup() as client:
+        etag = client.get('/api/small').headers['ETag']
+        assert client.get('/api/small?team_id=1').headers['ETag'] != etag
+
+        data_version[0] = '2:2026-01-03'
+        prediction_cache.reset_cached_data_version()
+        response = client.get('/api/small', headers={'If-None-Match': etag})
+        assert response.status_code == 200 and response.headers['ETag'] != etag
+
+        big_etag = client.get('/api/big').headers['ETag']
+        stamp[0] = 1
+        assert client.get('/api/big', headers={'If-None-Match': big_etag}).status_code == 200
+
+
+def test_gzip_large_bodies():
+    """Compressed bodies decode to the plain body; either ETag revalidates"""
+    with _Setup() as client:
+        plain = client.get('/api/big')
+        assert 'Content-Encoding' not in plain.headers
+        assert plain.headers['Vary'] == 'Accept-Encoding'
+
+        zipped = client.get('/api/big', headers={'Accept-Encoding': 'gzip'})
+        assert zipped.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(zipped.data) == plain.data
+        assert int(zipped.headers['Content-Length']) == len(zipped.data) < len(plain.data)
+        assert zipped.headers['ETag'] == plain.headers['ETag'][:-1] + '-gzip"'
+
+        for etag in (zipped.headers['ETag'], plain.headers['ETag']):
+            response = client.get('/api/big', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+            assert response.status_code == 304
+        assert len(calls) == 2
+
+
+def test_untouched_responses():
+    """Small bodies stay plain; errors and skip_etag() responses get no ETag"""
+    with _Setup() as client:
+        small = client.get('/api/small', headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in small.headers and small.json == {'success': True}
+
+        assert 'ETag' not in client.get('/api/small?partial=1').headers
+        failed = client.get('/api/small?fail=1')
+        assert failed.status_code == 500 and 'ETag' not in failed.headers
+
+        if http_cache.brotli is None:
+            response = client.get('/api/big', headers={'Accept-Encoding': 'br'})
+            assert 'Content-Encoding' not in response.headers
+
+
+def main():
+    tests = [test_not_modified_skips_view, test_etag_inputs, test_gzip_large_bodies, test_untouched_responses]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script for the replay OpenAI backend
+
+Tests:
+1. Calls are routed to the right recording by the AI path that made them
+2. OPENAI_BACKEND=replay runs the real AI helpers without a key or network
+3. Injected latency and errors surface like the OpenAI library's own
+4. RecordingClient output replays, including recorded latency
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+import openai
+
+from api.utils import openai_client
+from api.utils.ai_game_writeup_generator import generate_with_retry
+from api.utils.openai_replay import RecordingClient, ReplayClient, classify_request
+
+
+class _Setup:
+    """OPENAI_BACKEND and recordings path for the test, cached client dropped"""
+
+    def __init__(self, **env):
+        self.env = {'OPENAI_BACKEND': 'replay', 'OPENAI_API_KEY': '',
+                    'OPENAI_RECORDINGS_PATH': os.path.join(tempfile.mkdtemp(), 'recordings.jsonl'), **env}
+
+    def __enter__(self):
+        self.saved = {name: os.environ.get(name) for name in self.env}
+        os.environ.update(self.env)
+        openai_client.reset_client()
+        return self.env['OPENAI_RECORDINGS_PATH']
+
+    def __exit__(self, *exc):
+        for name, value in self.saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        openai_client.reset_client()
+
+
+def test_routes():
+    """Each AI path's prompt is recognized"""
+    image = {'role': 'user', 'content': [{'type': 'text', 'text': 'Read the score'},
+                                         {'type': 'image_url', 'image_url': {'url': 'data:'}}]}
+    assert classify_request([image]) == 'extract_scores'
+    assert classify_request([
+        {'role': 'system', 'content': 'You are an expert NBA analytics coach providing daily model reviews.'},
+        {'role': 'user', 'content': '...'}]) == 'daily_coach_summary'
+    assert classify_request([{'role': 'user', 'content': '{"matchup_payload": {}}'}]) == 'matchup_summary'
+    assert classify_request([{'role': 'system', 'content': 'Generate a 3-section analytical write-up'}]) == 'game_writeup'
+    assert classify_request([{'role': 'user', 'content': 'Return verdict and headline'}]) == 'game_review'
+
+
+def test_replay_backend_end_to_end():
+    """The AI helpers run offline; recordings are replayed round-robin"""
+    with _Setup() as path:
+        with open(path, 'w') as f:
+            for text in ('first', 'second'):
+                f.write(json.dumps({'route': 'daily_coach_summary', 'content': json.dumps(
+                    {'overall_performance': text, 'patterns': [], 'action_items': []})}) + '\n')
+
+        assert openai_client.has_openai_key()
+        reviews = [{'home_team': 'LAL', 'away_team': 'BOS', 'predicted_total': 221.0, 'actual_total': 225,
+                    'error_total': 4.0, 'abs_error_total': 4.0, 'ai_review': {}}]
+        texts = [openai_client.generate_daily_coach_summary(reviews)['overall_performance'] for _ in range(3)]
+        assert texts == ['first', 'second', 'first'], texts
+
+        screenshot = os.path.join(tempfile.mkdtemp(), 'final.png')
+        with open(screenshot, 'wb') as f:
+            f.write(b'\x89PNG')
+        scores = openai_client.extract_scores_from_screenshot(screenshot, 'LAL', 'BOS')
+        assert scores['total'] == scores['home_score'] + scores['away_score']
+        assert openai_client.get_client().calls == {'daily_coach_summary': 3, 'extract_scores': 1}
+
+
+def test_latency_and_errors():
+    """Configured delay is applied and failures raise openai exceptions"""
+    with _Setup(OPENAI_REPLAY_LATENCY_MS='50-60', OPENAI_REPLAY_ERROR_RATE='1', OPENAI_REPLAY_ERROR='rate_limit'):
+        client = openai_client.get_client()
+        start = time.perf_counter()
+        try:
+            client.chat.completions.create(model='gpt-4o', messages=[{'role': 'user', 'content': 'x'}])
+            assert False, 'expected RateLimitError'
+        except openai.RateLimitError:
+            pass
+        assert time.perf_counter() - start >= 0.05
+        assert generate_with_retry(client, [{'role': 'user', 'content': 'x'}], max_retries=1) is None
+
+    client = ReplayClient(error_rate=1.0, error_kind='timeout')
+    try:
+        client.chat.completions.create(model='gpt-4o', messages=[])
+        assert False, 'expected APITimeoutError'
+    except openai.APITimeoutError:
+        pass
+
+
+def test_record_then_replay():
+    """Recorded responses and their latency are replayed"""
+    path = os.path.join(tempfile.mkdtemp(), 'recordings.jsonl')
+    source = ReplayClient(recordings_path=path, latency_ms=(30, 30))
+    recorder = RecordingClient(source, recordings_path=path)
+    messages = [{'role': 'system', 'content': 'Generate a 3-section analytical write-up'}]
+    recorded = recorder.chat.completions.create(model='gpt-4o', messages=messages).choices[0].message.content
+
+    with open(path) as f:
+        entry = json.loads(f.readline())
+    assert entry['route'] == 'game_writeup' and entry['content'] == recorded
+    assert entry['latency_ms'] >= 30
+
+    replay = ReplayClient(recordings_path=path)
+    start = time.perf_counter()
+    assert replay.chat.completions.create(model='gpt-4o', messages=messages).choices[0].message.content == recorded
+    assert time.perf_counter() - start >= 0.03
+
+
+def main():
+    tests = [test_routes, test_replay_backend_end_to_end, test_latency_and_errors, test_record_then_replay]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test script for opponent rank snapshots
+
+Tests:
+1. A snapshot only counts games before its date
+2. Ties go to the lower team_id; 3PT% allowed uses summed makes / attempts
+3. Incremental refresh starts at the first date whose games changed
+4. Every drilldown tier dimension has a snapshot metric and a pipeline stage
+"""
+
+import sqlite3
+import sys
+
+import numpy as np
+
+from api.utils.opponent_rank_snapshots import (
+    SNAPSHOT_METRICS, _first_stale_date, _metric_columns, compute_rank_snapshots, create_snapshot_table
+)
+from api.utils.bar_drilldown import TIER_DIMENSIONS
+from api.utils.derived_pipeline import STAGES
+
+DATES = ['2025-10-21', '2025-10-22', '2025-10-23']
+TEAMS = [1, 2, 3]
+
+
+def _daily_totals(games):
+    """games: {(date_idx, team_idx): {column: value}} -> sums, counts arrays"""
+    columns = _metric_columns()
+    sums = np.zeros((len(DATES), len(TEAMS), len(columns) + 1))
+    counts = np.zeros_like(sums)
+    for (i, j), stats in games.items():
+        sums[i, j, 0] = counts[i, j, 0] = 1
+        for col, value in stats.items():
+            sums[i, j, 1 + columns.index(col)] = value
+            counts[i, j, 1 + columns.index(col)] = 1
+    return sums, counts
+
+
+GAMES = {
+    # Opening night: team 1 allows 120, team 2 allows 100
+    (0, 0): {'off_rating': 110.0, 'def_rating': 120.0, 'opp_fg3m': 10, 'opp_fg3a': 40},
+    (0, 1): {'off_rating': 105.0, 'def_rating': 100.0, 'opp_fg3m': 15, 'opp_fg3a': 30},
+    # Next night team 1 locks down, team 3 debuts
+    (1, 0): {'off_rating': 99.0, 'def_rating': 80.0, 'opp_fg3m': 2, 'opp_fg3a': 20},
+    (1, 2): {'off_rating': 112.0, 'def_rating': 95.0, 'opp_fg3m': 12, 'opp_fg3a': 36},
+}
+
+
+def test_snapshots_use_prior_games_only():
+    """Nobody is ranked on opening night; day 2 ranks only day-1 games"""
+    sums, counts = _daily_totals(GAMES)
+    def_rtg = compute_rank_snapshots(DATES, TEAMS, sums, counts)['def_rtg']
+
+    assert list(def_rtg['rank'][0]) == [0, 0, 0]
+    assert list(def_rtg['rank'][1]) == [2, 1, 0]  # Team 2 (100) beats team 1 (120); team 3 unplayed
+    assert list(def_rtg['games'][1]) == [1, 1, 0]
+    # Day 3: team 1 averages 100, tied with team 2; team 3 at 95 is best
+    assert list(def_rtg['rank'][2]) == [2, 3, 1]
+    assert def_rtg['value'][2, 0] == 100.0
+
+
+def test_ties_and_ratio_metrics():
+    """Lower team_id wins ties; fg3 pct from totals, not per-game average"""
+    sums, counts = _daily_totals(GAMES)
+    fg3 = compute_rank_snapshots(DATES, TEAMS, sums, counts)['opp_fg3_pct']
+
+    # Team 1: 12/60 = 20%; team 2: 15/30 = 50%; team 3: 12/36 = 33.3%
+    assert abs(fg3['value'][2, 0] - 20.0) < 1e-9
+    assert list(fg3['rank'][2]) == [1, 3, 2]
+    assert SNAPSHOT_METRICS['opp_fg3_pct'][3] is False  # Lower allowed is better
+
+
+def test_incremental_refresh_start():
+    """Stored counts decide which dates are rewritten"""
+    sums, counts = _daily_totals(GAMES)
+    snapshot = compute_rank_snapshots(DATES, TEAMS, sums, counts)['off_rtg']
+
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    create_snapshot_table(cursor)
+    assert _first_stale_date(cursor, '2025-26', DATES, snapshot) == DATES[1]
+
+    # Day 2 stored with both day-1 games: day 3 is the first missing date
+    for team_id in (1, 2):
+        cursor.execute('''
+            INSERT INTO opponent_rank_snapshots VALUES (?, '2025-26', ?, 'off_rtg', 0, 1, 1, '')
+        ''', (team_id, DATES[1]))
+    assert _first_stale_date(cursor, '2025-26', DATES, snapshot) == DATES[2]
+
+    # A late day-1 game (team 3) changes every later snapshot
+    late = dict(GAMES)
+    late[(0, 2)] = {'off_rating': 110.0}
+    sums, counts = _daily_totals(late)
+    snapshot = compute_rank_snapshots(DATES, TEAMS, sums, counts)['off_rtg']
+    assert _first_stale_date(cursor, '2025-26', DATES, snapshot) == DATES[1]
+
+    # Stored dates with no games left are stale too
+    first_day = {'rank': snapshot['rank'][:1], 'games': snapshot['games'][:1]}
+    assert _first_stale_date(cursor, '2025-26', DATES[:1], first_day) == DATES[1]
+    conn.close()
+
+
+def test_tier_dimensions_have_snapshots():
+    """Drilldown metrics are materialized by a pipeline stage"""
+    for dimension, (metric, _) in TIER_DIMENSIONS.items():
+        assert metric in SNAPSHOT_METRICS, dimension
+    assert {'off_rtg', 'def_rtg'} <= set(SNAPSHOT_METRICS)  # archetype_games
+    stage = next(stage for stage in STAGES if stage.name == 'opponent_rank_snapshots')
+    assert stage.inputs == ('team_game_logs',)
+
+
+def main():
+    tests = [test_snapshots_use_prior_games_only, test_ties_and_ratio_metrics,
+             test_incremental_refresh_start, test_tier_dimensions_have_snapshots]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
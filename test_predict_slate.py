@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test script for batched slate predictions
+
+Tests:
+1. predict_slate returns one prediction per known game
+2. Slate predictions match the single-game path exactly
+3. Unknown game IDs are reported, not raised
+"""
+
+import sys
+import json
+import os
+import sqlite3
+import tempfile
+
+from api.utils import last_5_trends
+from api.utils.connection_pool import close_shared_connections
+from api.utils.db_config import get_db_path
+from api.utils.db_queries import get_matchup_data, get_all_teams, get_games_by_ids
+from api.utils.prediction_engine import predict_game_total, predict_slate
+
+
+class _ScratchTrendsDB:
+    """Store trends filled on a miss in a scratch copy of nba_data.db, not the committed one"""
+
+    def __enter__(self):
+        self.saved = last_5_trends.NBA_DATA_DB_PATH
+        path = os.path.join(tempfile.mkdtemp(), 'nba_data.db')
+        source = sqlite3.connect(self.saved)
+        target = sqlite3.connect(path)
+        source.backup(target)
+        source.close()
+        target.close()
+        last_5_trends.NBA_DATA_DB_PATH = path
+        with last_5_trends._memory_lock:
+            last_5_trends._memory.clear()
+        return path
+
+    def __exit__(self, *exc):
+        last_5_trends.NBA_DATA_DB_PATH = self.saved
+        with last_5_trends._memory_lock:
+            last_5_trends._memory.clear()
+        close_shared_connections()
+
+
+def _latest_slate_game_ids():
+    """Get game IDs for the most recent date in todays_games"""
+    conn = sqlite3.connect(get_db_path('nba_data.db'))
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT game_id FROM todays_games
+        WHERE game_date = (SELECT MAX(game_date) FROM todays_games)
+        ORDER BY game_id
+    ''')
+    game_ids = [row[0] for row in cursor.fetchall()]
+    conn.close()
+    return game_ids
+
+
+def _predict_single(game):
+    """Run the same steps as server.get_cached_prediction for one game"""
+    teams = {t['id']: t for t in get_all_teams()}
+    home_team_id = int(game['home_team_id'])
+    away_team_id = int(game['away_team_id'])
+    matchup_data = get_matchup_data(home_team_id, away_team_id)
+
+    return predict_game_total(
+        matchup_data['home'],
+        matchup_data['away'],
+        None,
+        home_team_id=home_team_id,
+        away_team_id=away_team_id,
+        home_team_abbr=teams[home_team_id]['abbreviation'],
+        away_team_abbr=teams[away_team_id]['abbreviation'],
+        season='2025-26',
+        game_id=game['game_id']
+    )
+
+
+def test_slate_matches_single_game_path():
+    """Slate predictions must be identical to one-at-a-time predictions"""
+    print("=" * 70)
+    print("TEST: Slate vs single-game predictions")
+    print("=" * 70)
+
+    game_ids = _latest_slate_game_ids()
+    assert game_ids, "No games in todays_games"
+
+    with _ScratchTrendsDB():
+        single = {g['game_id']: _predict_single(g) for g in get_games_by_ids(game_ids)}
+        slate = predict_slate(game_ids)
+
+    assert len(slate['games']) == len(single)
+    for entry in slate['games']:
+        expected = json.dumps(single[entry['game_id']], sort_keys=True, default=str)
+        actual = json.dumps(entry['prediction'], sort_keys=True, default=str)
+        assert expected == actual, f"Mismatch for game {entry['game_id']}"
+        print(f"  ✓ {entry['game_id']}: {entry['prediction']['predicted_total']}")
+
+    print(f"\nContext: {slate['context']}")
+    assert slate['context']['hits'] > 0, "Slate context was never reused"
+
+
+def test_slate_reports_unknown_games():
+    """Unknown IDs show up in missing_game_ids"""
+    with _ScratchTrendsDB():
+        result = predict_slate(['0000000000'])
+    assert result['games'] == []
+    assert result['missing_game_ids'] == ['0000000000']
+
+
+def main():
+    tests = [test_slate_matches_single_game_path, test_slate_reports_unknown_games]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for the versioned LRU prediction cache
+
+Tests:
+1. Least recently used entry is evicted, not the oldest inserted
+2. Entries expire after their TTL
+3. A new data version invalidates every entry
+4. get_data_version reads the sync log
+5. The shared SQLite backend serves hits across cache instances
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from api.utils.prediction_cache import PredictionCache, SQLiteCacheBackend, get_data_version
+
+
+def _cache(max_size=3, ttl_seconds=60.0, version=None):
+    """Build a cache whose data version is controlled by the test"""
+    version = version if version is not None else {'value': 'v1'}
+    return PredictionCache(max_size=max_size, ttl_seconds=ttl_seconds,
+                           version_fn=lambda: version['value'],
+                           version_check_interval=0)
+
+
+def test_lru_eviction():
+    """A recently read entry survives eviction"""
+    cache = _cache(max_size=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == (True, 1)
+
+    cache.put('c', 3)  # evicts 'b', the least recently used
+    assert cache.get('b') == (False, None)
+    assert cache.get('a') == (True, 1)
+    assert cache.get('c') == (True, 3)
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_ttl_expiry():
+    """Entries past their TTL are reported as misses"""
+    cache = _cache(ttl_seconds=0.05)
+    cache.put('a', 1)
+    assert cache.get('a') == (True, 1)
+    time.sleep(0.1)
+    assert cache.get('a') == (False, None)
+    assert cache.get_stats()['expirations'] == 1
+
+
+def test_data_version_invalidates():
+    """Entries written before a sync are not served after it"""
+    version = {'value': 'v1'}
+    cache = _cache(version=version)
+    cache.put('a', 1)
+    assert cache.get('a') == (True, 1)
+
+    version['value'] = 'v2'
+    assert cache.get('a') == (False, None)
+    stats = cache.get_stats()
+    assert stats['invalidations'] == 1
+    assert stats['data_version'] == 'v2'
+    assert stats['size'] == 0
+
+
+def test_data_version_from_sync_log():
+    """The real version stamp comes from data_sync_log"""
+    version = get_data_version()
+    print(f"  data version: {version}")
+    assert version != 'unknown'
+
+
+def test_shared_backend_across_workers():
+    """An entry written by one worker's cache is a hit in another's"""
+    db_path = os.path.join(tempfile.mkdtemp(), 'prediction_cache.db')
+    version = {'value': 'v1'}
+    worker_a = PredictionCache(version_fn=lambda: version['value'], version_check_interval=0,
+                               shared=SQLiteCacheBackend(db_path))
+    worker_b = PredictionCache(version_fn=lambda: version['value'], version_check_interval=0,
+                               shared=SQLiteCacheBackend(db_path))
+
+    worker_a.put((1, 2, 220.5), {'predicted_total': 221.3})
+    assert worker_b.get((1, 2, 220.5)) == (True, {'predicted_total': 221.3})
+    assert worker_b.get_stats()['shared_hits'] == 1
+
+    # A sync in between invalidates the shared entry too
+    version['value'] = 'v2'
+    assert worker_b.get((1, 2, 220.5)) == (False, None)
+    assert worker_a.shared.count() == 0
+
+
+def main():
+    tests = [test_lru_eviction, test_ttl_expiry, test_data_version_invalidates,
+             test_data_version_from_sync_log, test_shared_backend_across_workers]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
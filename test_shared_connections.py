@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test script for per-thread shared SQLite connections
+
+Tests:
+1. One connection per thread and database; close() releases instead of closing
+2. Nested checkouts keep their own row_factory; only the last release rolls back
+3. Read-only connections reject writes
+4. A replaced database file or a forked process gets a fresh connection
+5. reset_shared_connections() clears checkouts a caller never released
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+
+from api.utils import connection_pool
+from api.utils.connection_pool import (
+    close_shared_connections, get_shared_connection, reset_shared_connections, resolve_db_path
+)
+
+
+def _make_db():
+    path = os.path.join(tempfile.mkdtemp(), 'shared.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE t (x INTEGER)')
+    conn.execute('INSERT INTO t VALUES (1)')
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_reused_per_thread():
+    """Same thread reuses the connection; another thread gets its own"""
+    path = _make_db()
+    first = get_shared_connection(path)
+    first.close()
+    second = get_shared_connection(path)
+    assert second is first
+    assert second.execute('SELECT x FROM t').fetchone()['x'] == 1
+    second.close()
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(get_shared_connection(path)))
+    thread.start()
+    thread.join()
+    assert other[0] is not first
+
+    assert resolve_db_path('nba_data').endswith('nba_data.db')
+    assert resolve_db_path('team_similarity').endswith(os.path.join('api', 'data', 'team_similarity.db'))
+    close_shared_connections()
+
+
+def test_nested_checkouts():
+    """Inner callers do not roll back or change the outer caller's rows"""
+    path = _make_db()
+    outer = get_shared_connection(path, row_factory=None)
+    outer.execute('INSERT INTO t VALUES (2)')
+
+    inner = get_shared_connection(path)
+    assert inner is outer
+    assert isinstance(inner.execute('SELECT x FROM t').fetchone(), sqlite3.Row)
+    inner.close()
+
+    assert outer.in_transaction
+    assert outer.execute('SELECT COUNT(*) FROM t').fetchone() == (2,)
+    outer.close()
+    # Releasing without commit discards the insert, as closing would have
+    conn = get_shared_connection(path)
+    assert conn.execute('SELECT COUNT(*) FROM t').fetchone()[0] == 1
+    conn.close()
+    close_shared_connections()
+
+
+def test_readonly():
+    """query_only connections refuse writes and are separate from writable ones"""
+    path = _make_db()
+    reader = get_shared_connection(path, readonly=True)
+    writer = get_shared_connection(path)
+    assert reader is not writer
+    try:
+        reader.execute('INSERT INTO t VALUES (3)')
+        assert False, 'read-only connection accepted a write'
+    except sqlite3.OperationalError as e:
+        assert 'readonly' in str(e)
+    reader.close()
+    writer.close()
+    close_shared_connections()
+
+
+def test_stale_connections_replaced():
+    """Replacing the file or forking opens a new connection"""
+    path = _make_db()
+    conn = get_shared_connection(path)
+    conn.close()
+
+    os.remove(path)
+    replacement = sqlite3.connect(path)
+    replacement.execute('CREATE TABLE t (x INTEGER)')
+    replacement.close()
+    fresh = get_shared_connection(path)
+    assert fresh is not conn
+    assert fresh.execute('SELECT COUNT(*) FROM t').fetchone()[0] == 0
+    fresh.close()
+
+    connection_pool._local.pid = -1  # As if inherited across fork()
+    assert get_shared_connection(path) is not fresh
+    close_shared_connections()
+
+
+def test_reset_releases_leaks():
+    """A checkout never closed is released (and rolled back) by the reset"""
+    path = _make_db()
+    leaked = get_shared_connection(path, row_factory=None)
+    leaked.execute('INSERT INTO t VALUES (4)')
+
+    assert reset_shared_connections() == 1
+    assert not leaked.in_transaction and leaked.row_factory is None
+    conn = get_shared_connection(path)
+    assert conn is leaked and conn.execute('SELECT COUNT(*) FROM t').fetchone()[0] == 1
+    conn.close()
+    assert reset_shared_connections() == 0
+    close_shared_connections()
+
+
+def main():
+    tests = [test_reused_per_thread, test_nested_checkouts, test_readonly,
+             test_stale_connections_replaced, test_reset_releases_leaks]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
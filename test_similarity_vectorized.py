@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script for the vectorized team similarity engine
+
+Tests:
+1. Pairwise distance matrix matches compute_weighted_distance for every pair
+2. argpartition top-k matches a full sort
+3. Vectorized cluster fit matches evaluate_cluster_fit row by row
+4. Conditional window modes keep each team's most recent games only
+5. Bulk feature matrix matches the single-team view
+"""
+
+import sys
+
+import numpy as np
+
+from api.utils.team_similarity import (
+    FEATURE_NAMES, MAX_DISTANCE, _CONDITIONAL_LOG_COLUMNS,
+    build_conditional_feature_matrix, build_feature_matrix, compute_team_feature_vector,
+    compute_weighted_distance, distance_to_similarity, evaluate_cluster_fit,
+    evaluate_cluster_fit_matrix, normalize_feature_matrix, pairwise_weighted_distances,
+    top_k_similar
+)
+
+
+def test_pairwise_distances_match_scalar():
+    """Matrix distances equal the per-pair loop"""
+    features = np.random.default_rng(1).random((12, len(FEATURE_NAMES)))
+    distances = pairwise_weighted_distances(features)
+
+    for i in range(len(features)):
+        for j in range(len(features)):
+            expected = compute_weighted_distance(features[i].tolist(), features[j].tolist())
+            assert abs(distances[i, j] - expected) < 1e-12, f"({i}, {j}): {distances[i, j]} != {expected}"
+
+
+def test_top_k_matches_full_sort():
+    """top_k_similar returns the same ranking as sorting every pair"""
+    features = np.random.default_rng(2).random((15, len(FEATURE_NAMES)))
+    team_ids = list(range(100, 115))
+    top = top_k_similar(team_ids, features, k=5)
+
+    for i, team_id in enumerate(team_ids):
+        scores = [(team_ids[j], distance_to_similarity(
+                      compute_weighted_distance(features[i].tolist(), features[j].tolist()), MAX_DISTANCE))
+                  for j in range(len(team_ids)) if j != i]
+        scores.sort(key=lambda x: x[1], reverse=True)
+        assert [t for t, _ in top[team_id]] == [t for t, _ in scores[:5]]
+        assert all(abs(a[1] - b[1]) < 1e-9 for a, b in zip(top[team_id], scores[:5]))
+
+    # Fewer teams than k
+    assert len(top_k_similar([1, 2], features[:2], k=5)[1]) == 1
+
+
+def test_cluster_fit_matches_scalar():
+    """Threshold edges and typical values score the same both ways"""
+    rng = np.random.default_rng(3)
+    typical = {'pace': 98.0, 'three_pt_rate': 0.38, 'paint_scoring_rate': 0.48, 'rim_attempt_rate': 0.30,
+               'ast_ratio': 0.62, 'ast_to_ratio': 1.8, 'fastbreak_pts_rate': 0.13, 'oreb_pct': 0.24,
+               'def_paint_pts_allowed': 5.0, 'pace_variance': 0.6}
+    raw = np.array([[typical.get(name, 0.5) for name in FEATURE_NAMES] for _ in range(40)])
+    raw[1:] *= rng.uniform(0.9, 1.1, size=(39, len(FEATURE_NAMES)))
+
+    matrix = evaluate_cluster_fit_matrix(raw)
+    for row, scores in zip(raw, matrix):
+        expected = evaluate_cluster_fit(dict(zip(FEATURE_NAMES, row.tolist())), FEATURE_NAMES)
+        assert list(scores) == [expected[cid] for cid in sorted(expected)]
+
+
+def _synthetic_logs():
+    """Team 1 plays 12 games vs team 9 (newest first), team 2 only 4"""
+    columns = {name: i for i, name in enumerate(_CONDITIONAL_LOG_COLUMNS)}
+    rows, teams, dates = [], [], []
+    for team_id, games in ((1, 12), (2, 4)):
+        for g in range(games):
+            stats = np.full(len(_CONDITIONAL_LOG_COLUMNS), 10.0)
+            stats[columns['team_pts']] = 100.0 + g  # Game g days ago scored 100 + g
+            stats[columns['pace']] = 98.0
+            rows.append(stats)
+            teams.append(team_id)
+            dates.append(f"2025-12-{30 - g:02d}")
+    return {
+        'team_id': np.array(teams, dtype=np.int64),
+        'opponent_team_id': np.full(len(teams), 9, dtype=np.int64),
+        'game_date': np.array(dates, dtype=object),
+        'stats': np.array(rows)
+    }
+
+
+def test_conditional_window_modes():
+    """last10 keeps the 10 newest games; teams under 5 games are dropped"""
+    logs = _synthetic_logs()
+
+    team_ids, _, games, date_ranges = build_conditional_feature_matrix(logs, [1, 2], [9], 'season')
+    assert team_ids == [1] and list(games) == [12]
+    assert date_ranges[0] == ('2025-12-19', '2025-12-30')
+
+    team_ids, _, games, date_ranges = build_conditional_feature_matrix(logs, [1, 2], [9], 'last10')
+    assert list(games) == [10]
+    assert date_ranges[0] == ('2025-12-21', '2025-12-30')
+
+    # Opponent filter
+    assert build_conditional_feature_matrix(logs, [1, 2], [8], 'season')[0] == []
+
+
+def test_feature_matrix_matches_single_team():
+    """One bulk query gives the same raw features as the single-team call"""
+    team_ids, raw = build_feature_matrix('2025-26')
+    print(f"  {len(team_ids)} teams")
+    assert raw.shape == (len(team_ids), len(FEATURE_NAMES))
+    assert len(team_ids) >= 2
+
+    single = compute_team_feature_vector(team_ids[0], '2025-26')
+    assert np.allclose(raw[0], [single['raw_features'][name] for name in FEATURE_NAMES])
+
+    normalized = normalize_feature_matrix(raw)
+    assert normalized.min() >= 0.0 and normalized.max() <= 1.0
+
+
+def main():
+    tests = [test_pairwise_distances_match_scalar, test_top_k_matches_full_sort,
+             test_cluster_fit_matches_scalar, test_conditional_window_modes,
+             test_feature_matrix_matches_single_team]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Test script for the post-sync slate warm-up
+
+Tests:
+1. Every game is warmed (prediction cache, insights, payloads) and gets a
+   data_sync_log timing row; the data version does not change
+2. A failing step is recorded on its game without stopping the others
+3. No more than max_workers games are warmed at once
+4. Warmed predictions are stored under the /api/predict cache key
+5. sync_all() publishes the serving snapshot before warming from it
+6. Every other successful sync publishes it too; a failed one does not
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+from api.utils import game_payloads, prediction_cache, prediction_engine, slate_warmup, sync_nba_data
+from api.utils.connection_pool import close_shared_connections
+from api.utils.game_payloads import load_payload
+from api.utils.prediction_cache import get_data_version, get_prediction_cache
+from api.utils.slate_warmup import warm_slate
+
+GAMES = ['0022500501', '0022500502', '0022500503']
+SECTIONS = ['game_detail']
+
+
+def _detail(game_id, season):
+    return {'success': True, 'game_id': game_id}
+
+
+class _Setup:
+    """Scratch nba_data.db with a sync log; prediction and insights steps recorded"""
+
+    def __init__(self, delay=0.0, fail=None):
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def _step(self, name, game_id):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+            self.calls.append((name, game_id))
+        if (name, game_id) == self.fail:
+            raise RuntimeError('boom')
+        return True
+
+    def __enter__(self):
+        self.saved = (slate_warmup.NBA_DATA_DB_PATH, prediction_cache.NBA_DATA_DB_PATH,
+                      game_payloads.NBA_DATA_DB_PATH, game_payloads._builders,
+                      slate_warmup._warm_prediction, slate_warmup._warm_insights)
+        path = os.path.join(tempfile.mkdtemp(), 'nba_data.db')
+
+        source = sqlite3.connect(prediction_cache.NBA_DATA_DB_PATH)
+        schema = source.execute("SELECT sql FROM sqlite_master WHERE name = 'data_sync_log'").fetchone()[0]
+        source.close()
+        conn = sqlite3.connect(path)
+        conn.execute(schema)
+        conn.execute('''
+            INSERT INTO data_sync_log (sync_type, season, status, started_at, completed_at)
+            VALUES ('full', '2025-26', 'success', '2026-01-02T10:00:00', '2026-01-02T10:05:00')
+        ''')
+        conn.commit()
+        conn.close()
+
+        slate_warmup.NBA_DATA_DB_PATH = prediction_cache.NBA_DATA_DB_PATH = path
+        game_payloads.NBA_DATA_DB_PATH = path
+        game_payloads._builders = lambda: {'game_detail': _detail}
+        slate_warmup._warm_prediction = lambda game_id, season: self._step('prediction', game_id)
+        slate_warmup._warm_insights = lambda game_id, season: self._step('insights', game_id)
+        prediction_cache.reset_cached_data_version()
+        return path
+
+    def __exit__(self, *exc):
+        (slate_warmup.NBA_DATA_DB_PATH, prediction_cache.NBA_DATA_DB_PATH,
+         game_payloads.NBA_DATA_DB_PATH, game_payloads._builders,
+         slate_warmup._warm_prediction, slate_warmup._warm_insights) = self.saved
+        prediction_cache.reset_cached_data_version()
+        get_prediction_cache().invalidate()
+        close_shared_connections()
+
+
+def _log_rows(path):
+    conn = sqlite3.connect(path)
+    rows = conn.execute('''
+        SELECT game_ids_sample, status, records_synced, error_message, duration_seconds, run_id
+        FROM data_sync_log WHERE sync_type = 'slate_warmup' ORDER BY game_ids_sample
+    ''').fetchall()
+    conn.close()
+    return rows
+
+
+def test_warms_every_game():
+    """Each step runs once per game; timings logged; version unchanged"""
+    setup = _Setup()
+    with setup as path:
+        version = get_data_version()
+        result = warm_slate(game_ids=GAMES, sections=SECTIONS, run_id='run-1')
+
+        assert result['games'] == 3 and result['predictions'] == 3 and result['insights'] == 3
+        assert result['payloads'] == 3 and result['errors'] == []
+        assert sorted(setup.calls) == sorted([(step, g) for g in GAMES for step in ('prediction', 'insights')])
+        assert [t['game_id'] for t in result['timings']] == GAMES
+        assert all(t['total_ms'] >= t['prediction_ms'] for t in result['timings'])
+
+        rows = _log_rows(path)
+        assert [r[0] for r in rows] == GAMES
+        assert all(r[1] == 'success' and r[2] == 3 and r[4] is not None and r[5] == 'run-1' for r in rows), rows
+
+        assert get_data_version() == version
+        assert load_payload(GAMES[0], 'game_detail') == {'success': True, 'game_id': GAMES[0]}
+
+
+def test_failed_step_recorded():
+    """A failing step fails its game's row only"""
+    with _Setup(fail=('insights', GAMES[1])) as path:
+        result = warm_slate(game_ids=GAMES, sections=SECTIONS)
+        assert result['errors'] == [f'{GAMES[1]}/insights: boom']
+        assert result['payloads'] == 3
+
+        statuses = {r[0]: (r[1], r[3]) for r in _log_rows(path)}
+        assert statuses[GAMES[1]] == ('failed', 'insights: boom')
+        assert statuses[GAMES[0]] == ('success', None)
+
+
+def test_bounded_pool():
+    """Concurrency is capped at max_workers"""
+    setup = _Setup(delay=0.05)
+    with setup:
+        warm_slate(game_ids=GAMES * 2, sections=SECTIONS, max_workers=2)
+    assert setup.max_active == 2, setup.max_active
+    assert len(setup.calls) == 12
+
+
+def test_prediction_cache_key():
+    """The cache entry matches get_cached_prediction()'s key with no line"""
+    saved = prediction_engine.predict_slate
+    prediction_engine.predict_slate = lambda game_ids, season='2025-26': {'games': [{
+        'game_id': game_ids[0], 'home_team_id': 1610612747, 'away_team_id': 1610612738,
+        'betting_line': None, 'prediction': {'predicted_total': 221.5}, 'matchup_data': {'home': {}}
+    }], 'missing_game_ids': [], 'context': {}}
+    try:
+        setup = _Setup()
+        with setup:
+            slate_warmup._warm_prediction = setup.saved[4]
+            warm_slate(game_ids=GAMES[:1], sections=SECTIONS)
+            found, value = get_prediction_cache().get((1610612747, 1610612738, None))
+            assert found and value[0] == {'predicted_total': 221.5}
+    finally:
+        prediction_engine.predict_slate = saved
+
+
+def test_sync_publishes_before_warmup():
+    """Trends and the warm-up run after the snapshot they read is published"""
+    names = ('_sync_all_impl', '_publish_serving_snapshot', '_materialize_team_trends',
+             '_warm_slate', '_queue_ai_sections')
+    saved = {name: getattr(sync_nba_data, name) for name in names}
+    calls = []
+    sync_nba_data._sync_all_impl = lambda *args: calls.append('sync') or {'success': True}
+    sync_nba_data._publish_serving_snapshot = lambda results: calls.append('publish')
+    sync_nba_data._materialize_team_trends = lambda season: calls.append('trends')
+    sync_nba_data._warm_slate = lambda season, *args: calls.append('warm')
+    sync_nba_data._queue_ai_sections = lambda season: calls.append('ai')
+    try:
+        sync_nba_data.sync_all(run_id='run-1')
+    finally:
+        for name, value in saved.items():
+            setattr(sync_nba_data, name, value)
+    assert calls == ['sync', 'publish', 'trends', 'warm', 'ai'], calls
+
+
+def test_every_sync_publishes():
+    """Standalone and today's-games syncs publish on success, before warming"""
+    names = ('_sync_todays_games_impl', '_sync_game_logs_impl', '_sync_season_stats_impl',
+             '_publish_serving_snapshot', '_materialize_team_trends', '_warm_slate', '_queue_ai_sections')
+    saved = {name: getattr(sync_nba_data, name) for name in names}
+    calls = []
+    error = [None]
+    sync_nba_data._sync_todays_games_impl = lambda *args: calls.append('sync') or (1, error[0])
+    sync_nba_data._sync_game_logs_impl = lambda *args: calls.append('sync') or (1, error[0])
+    sync_nba_data._sync_season_stats_impl = lambda *args: calls.append('sync') or (1, error[0])
+    sync_nba_data._publish_serving_snapshot = lambda results: calls.append('publish')
+    sync_nba_data._materialize_team_trends = lambda season: calls.append('trends')
+    sync_nba_data._warm_slate = lambda season, *args: calls.append('warm')
+    sync_nba_data._queue_ai_sections = lambda season: calls.append('ai')
+    try:
+        sync_nba_data.sync_todays_games()
+        assert calls == ['sync', 'publish', 'trends', 'warm', 'ai'], calls
+
+        del calls[:]
+        sync_nba_data.sync_game_logs()
+        sync_nba_data.sync_season_stats()
+        assert calls == ['sync', 'publish', 'sync', 'publish'], calls
+
+        del calls[:]
+        error[0] = 'API timeout'
+        sync_nba_data.sync_todays_games()
+        sync_nba_data.sync_game_logs()
+        assert calls == ['sync', 'sync'], calls
+    finally:
+        for name, value in saved.items():
+            setattr(sync_nba_data, name, value)
+
+
+def main():
+    tests = [test_warms_every_game, test_failed_step_recorded, test_bounded_pool, test_prediction_cache_key,
+             test_sync_publishes_before_warmup, test_every_sync_publishes]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script for per-request SQL tracing
+
+Tests:
+1. A statement repeated in a loop is reported as N+1; untraced code is not counted
+2. Pooled connections are traced too
+3. Flask requests get X-SQL-* headers and per-endpoint statistics
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+
+from flask import Flask, jsonify
+
+from api.utils import sql_trace
+from api.utils.sql_trace import (
+    N_PLUS_ONE_THRESHOLD, create_sql_trace_middleware, get_endpoint_stats,
+    install_sql_tracing, trace_queries, uninstall_sql_tracing
+)
+
+
+def _make_db():
+    path = os.path.join(tempfile.mkdtemp(), 'trace.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE teams (id INTEGER PRIMARY KEY, name TEXT)')
+    conn.executemany('INSERT INTO teams VALUES (?, ?)', [(i, f'T{i}') for i in range(30)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_n_plus_one_detection():
+    """One query per team is flagged; queries outside the block are not counted"""
+    install_sql_tracing()
+    try:
+        conn = sqlite3.connect(_make_db())
+        conn.row_factory = sqlite3.Row
+        conn.execute('SELECT COUNT(*) FROM teams').fetchone()
+
+        with trace_queries() as trace:
+            ids = [row['id'] for row in conn.execute('SELECT id FROM teams').fetchall()]
+            for team_id in ids:
+                cursor = conn.cursor()
+                cursor.execute('SELECT name FROM teams\n   WHERE id = ?', (team_id,))
+                assert cursor.fetchone()['name'] == f'T{team_id}'
+        conn.close()
+    finally:
+        uninstall_sql_tracing()
+
+    summary = trace.summary()
+    assert summary['query_count'] == 31
+    assert summary['distinct_statements'] == 2
+    assert len(summary['slowest']) == 5
+    worst = summary['n_plus_one'][0]
+    assert worst['sql'] == 'SELECT name FROM teams WHERE id = ?'
+    assert worst['count'] == 30 >= N_PLUS_ONE_THRESHOLD and worst['distinct_params'] == 30
+
+
+def test_pooled_connections_traced():
+    """ConnectionPool connections opened after install are TracedConnections"""
+    from api.utils.connection_pool import ConnectionPool
+
+    install_sql_tracing()
+    try:
+        pool = ConnectionPool(_make_db(), pool_size=1)
+        with trace_queries() as trace:
+            with pool.get_connection() as conn:
+                conn.execute('SELECT * FROM teams').fetchall()
+        pool.close_all()
+    finally:
+        uninstall_sql_tracing()
+
+    # The pool's health check runs on the same connection
+    assert 'SELECT * FROM teams' in trace.statements
+    assert sqlite3.connect is sql_trace._original_connect
+
+
+def test_flask_headers_and_stats():
+    """Each request is traced separately and aggregated per endpoint"""
+    db_path = _make_db()
+    app = Flask(__name__)
+    create_sql_trace_middleware(app, headers=True)
+
+    @app.route('/teams')
+    def teams():
+        conn = sqlite3.connect(db_path)
+        names = [conn.execute('SELECT name FROM teams WHERE id = ?', (i,)).fetchone()[0] for i in range(12)]
+        conn.close()
+        return jsonify(names)
+
+    get_endpoint_stats().clear()
+    install_sql_tracing()
+    try:
+        client = app.test_client()
+        for _ in range(2):
+            response = client.get('/teams')
+            assert response.status_code == 200
+            assert response.headers['X-SQL-Query-Count'] == '12'
+            assert response.headers['X-SQL-Max-Repeats'] == '12'
+            assert float(response.headers['X-SQL-Time-Ms']) >= 0
+    finally:
+        uninstall_sql_tracing()
+
+    snapshot = get_endpoint_stats().snapshot()
+    endpoint = snapshot['endpoints'][0]
+    assert endpoint['endpoint'] == 'GET teams'
+    assert endpoint['requests'] == 2 and endpoint['avg_queries'] == 12
+    assert endpoint['n_plus_one'][0]['max_count'] == 12
+    assert len(snapshot['recent']) == 2
+    assert sql_trace._active_trace.get() is None
+
+
+def main():
+    tests = [test_n_plus_one_detection, test_pooled_connections_traced, test_flask_headers_and_stats]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script for per-stage profiling (StageProfiler / mark_stage)
+
+Tests:
+1. Time and SQL statements are charged to the stage that ran them
+2. mark_stage() is a no-op outside a profile and sqlite3.connect is restored
+3. The benchmark flags slower stages and extra SQL statements
+"""
+
+import sqlite3
+import sys
+import time
+
+from api.utils.performance import PerformanceTracker, StageProfiler, mark_stage
+from benchmark_prediction_engine import compare_to_baseline
+
+
+def _pipeline():
+    """Two stages: a sleep, then three queries"""
+    time.sleep(0.02)
+    mark_stage('query')
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE t (x INTEGER)')
+    conn.execute('INSERT INTO t VALUES (1)')
+    conn.execute('SELECT * FROM t').fetchall()
+    conn.close()
+
+
+def test_stages_get_their_own_cost():
+    """The sleep lands in 'setup', the queries in 'query'"""
+    tracker = PerformanceTracker()
+    profiler = StageProfiler(tracker=tracker, trace_memory=True)
+    for _ in range(2):
+        with profiler.profile('setup'):
+            _pipeline()
+
+    stats = profiler.get_stage_stats()
+    assert list(stats) == ['setup', 'query']
+    assert stats['setup']['calls'] == 2 and stats['query']['calls'] == 2
+    assert stats['setup']['median_ms'] >= 20 and stats['query']['median_ms'] < 20
+    assert stats['setup']['queries_per_call'] == 0
+    assert stats['query']['queries_per_call'] >= 3
+    assert stats['query']['peak_kb'] is not None
+    assert tracker.get_stats()['total_operations'] == 4
+
+
+def test_no_profiler_no_effect():
+    """Marks outside a profile do nothing; connect is unpatched afterwards"""
+    connect = sqlite3.connect
+    mark_stage('ignored')
+    profiler = StageProfiler()
+    with profiler.profile():
+        assert sqlite3.connect is not connect
+    assert sqlite3.connect is connect
+    mark_stage('ignored')
+    assert list(profiler.get_stage_stats()) == ['start']
+
+
+def test_baseline_comparison():
+    """Within tolerance passes; slower or chattier stages fail"""
+    baseline = {'stages': {'a': {'median_ms': 10.0, 'queries_per_call': 2.0},
+                           'b': {'median_ms': 1.0, 'queries_per_call': 0.0}}}
+    ok = {'a': {'median_ms': 16.0, 'queries_per_call': 2.0}, 'b': {'median_ms': 3.0, 'queries_per_call': 0.0}}
+    assert compare_to_baseline(ok, baseline, tolerance=0.5, slack_ms=2.0) == []
+
+    slow = {'a': {'median_ms': 17.5, 'queries_per_call': 2.0}, 'b': {'median_ms': 1.0, 'queries_per_call': 1.0}}
+    regressions = compare_to_baseline(slow, baseline, tolerance=0.5, slack_ms=2.0)
+    assert len(regressions) == 2
+    assert regressions[0].startswith('a:') and 'SQL' in regressions[1]
+
+
+def main():
+    tests = [test_stages_get_their_own_cost, test_no_profiler_no_effect, test_baseline_comparison]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for sync run status (data_sync_log)
+
+Tests:
+1. A run_id returns the 'full' row with every other row of the run
+   (today's games, derived stages, slate warm-up) nested in 'steps'
+2. Recent and per-date runs leave out derived stage and warm-up rows,
+   but keep standalone syncs whose type matches a stage name
+3. Derived stages are logged as 'derived:<stage>'
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+from api.utils import derived_pipeline, sync_nba_data
+from api.utils.connection_pool import close_shared_connections
+from api.utils.sync_nba_data import get_last_sync_status, get_sync_runs
+
+RUN_ID = 'run-1'
+
+# sync_type, started_at, run_id, target_date_mt, game_ids_sample
+ROWS = [
+    ('full', '2026-01-02T10:00:00', RUN_ID, '2026-01-02', None),
+    ('todays_games', '2026-01-02T10:01:00', RUN_ID, '2026-01-02', None),
+    ('derived:rankings', '2026-01-02T10:02:00', RUN_ID, None, None),
+    ('derived:team_profiles', '2026-01-02T10:03:00', RUN_ID, None, None),
+    ('slate_warmup', '2026-01-02T10:04:00', RUN_ID, None, '0022500501'),
+    ('slate_warmup', '2026-01-02T10:04:01', RUN_ID, None, '0022500502'),
+    ('team_profiles', '2026-01-02T11:00:00', None, None, None),
+]
+
+
+class _Setup:
+    """Scratch nba_data.db with one sync_all run and a standalone sync"""
+
+    def __enter__(self):
+        self.saved = (sync_nba_data.NBA_DATA_DB_PATH, derived_pipeline.NBA_DATA_DB_PATH)
+        path = os.path.join(tempfile.mkdtemp(), 'nba_data.db')
+
+        source = sqlite3.connect(sync_nba_data.NBA_DATA_DB_PATH)
+        schema = source.execute("SELECT sql FROM sqlite_master WHERE name = 'data_sync_log'").fetchone()[0]
+        source.close()
+        conn = sqlite3.connect(path)
+        conn.execute(schema)
+        conn.executemany('''
+            INSERT INTO data_sync_log
+                (sync_type, season, status, started_at, completed_at, run_id, target_date_mt, game_ids_sample)
+            VALUES (?, '2025-26', 'success', ?, ?, ?, ?, ?)
+        ''', [(sync_type, started, started, run_id, date, game) for sync_type, started, run_id, date, game in ROWS])
+        conn.commit()
+        conn.close()
+
+        sync_nba_data.NBA_DATA_DB_PATH = derived_pipeline.NBA_DATA_DB_PATH = path
+        return path
+
+    def __exit__(self, *exc):
+        sync_nba_data.NBA_DATA_DB_PATH, derived_pipeline.NBA_DATA_DB_PATH = self.saved
+        close_shared_connections()
+
+
+def test_run_with_steps():
+    """The run row, not its last stage or warm-up row"""
+    with _Setup():
+        runs = get_sync_runs(run_id=RUN_ID)
+        assert len(runs) == 1 and runs[0]['sync_type'] == 'full', runs
+        assert [step['sync_type'] for step in runs[0]['steps']] == [
+            'todays_games', 'derived:rankings', 'derived:team_profiles', 'slate_warmup', 'slate_warmup'
+        ]
+        assert get_sync_runs(run_id='no-such-run') == []
+
+
+def test_recent_runs_skip_steps():
+    """Stage and warm-up rows never show up as runs"""
+    with _Setup():
+        assert [run['sync_type'] for run in get_sync_runs()] == ['team_profiles', 'todays_games', 'full']
+        assert [run['sync_type'] for run in get_sync_runs(target_date_mt='2026-01-02')] == ['todays_games', 'full']
+        assert [run['sync_type'] for run in get_sync_runs(limit=1)] == ['team_profiles']
+        assert get_last_sync_status()['sync_type'] == 'team_profiles'
+        assert get_last_sync_status('slate_warmup')['game_ids_sample'] == '0022500502'
+
+
+def test_stage_rows_prefixed():
+    """_log_stage records the stage under the derived: prefix"""
+    with _Setup() as path:
+        started = datetime(2026, 1, 2, 12, 0, tzinfo=timezone.utc)
+        derived_pipeline._log_stage('rankings', '2025-26', started, 0.5, 30, None, 'sync', 'run-2')
+        conn = sqlite3.connect(path)
+        row = conn.execute("SELECT sync_type, records_synced FROM data_sync_log WHERE run_id = 'run-2'").fetchone()
+        conn.close()
+        assert row == ('derived:rankings', 30), row
+
+
+def main():
+    tests = [test_run_with_steps, test_recent_runs_skip_steps, test_stage_rows_prefixed]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
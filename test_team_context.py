@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for TeamContext-backed helpers
+
+Tests:
+1. Helpers return identical results with and without a TeamContext
+2. One TeamContext is built per team per prediction scope
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+
+from api.utils import db_queries, last_5_trends
+from api.utils.connection_pool import close_shared_connections
+from api.utils.prediction_context import prediction_scope
+from api.utils.team_context import get_team_context
+from api.utils.shootout_stats import get_team_season_3pt_pct, get_last5_3pt_pct, get_rest_days
+from api.utils.pace_projection import get_team_recent_pace
+from api.utils.last_5_trends import get_last_5_trends
+from api.utils.turnover_vs_defense_pressure import get_team_turnover_vs_defense_pressure
+from api.utils.three_pt_scoring_splits import get_team_three_pt_scoring_splits
+
+
+class _ScratchTrendsDB:
+    """Store trends filled on a miss in a scratch copy of nba_data.db, not the committed one"""
+
+    def __enter__(self):
+        self.saved = last_5_trends.NBA_DATA_DB_PATH
+        path = os.path.join(tempfile.mkdtemp(), 'nba_data.db')
+        source = sqlite3.connect(self.saved)
+        target = sqlite3.connect(path)
+        source.backup(target)
+        source.close()
+        target.close()
+        last_5_trends.NBA_DATA_DB_PATH = path
+        with last_5_trends._memory_lock:
+            last_5_trends._memory.clear()
+        return path
+
+    def __exit__(self, *exc):
+        last_5_trends.NBA_DATA_DB_PATH = self.saved
+        with last_5_trends._memory_lock:
+            last_5_trends._memory.clear()
+        close_shared_connections()
+
+
+def _team_outputs(team_id, abbr, team_context=None):
+    """Call every context-aware helper for one team"""
+    return {
+        'stats': db_queries.get_team_stats(team_id, team_context=team_context),
+        'advanced': db_queries.get_team_advanced_stats(team_id, team_context=team_context),
+        'opponent': db_queries.get_team_opponent_stats(team_id, team_context=team_context),
+        'ranks': db_queries.get_team_stats_with_ranks(team_id, team_context=team_context),
+        'last_10': db_queries.get_team_last_n_games(team_id, n=10, team_context=team_context),
+        'season_3pt': get_team_season_3pt_pct(team_id, team_context=team_context),
+        'last5_3pt': get_last5_3pt_pct(team_id, team_context=team_context),
+        'rest': get_rest_days(team_id, team_context=team_context),
+        'recent_pace': get_team_recent_pace(team_id, team_context=team_context),
+        'trends': get_last_5_trends(team_id, abbr, team_context=team_context),
+        'turnovers': get_team_turnover_vs_defense_pressure(team_id, team_context=team_context),
+        'three_pt_splits': get_team_three_pt_scoring_splits(team_id, team_context=team_context),
+    }
+
+
+def test_context_matches_sql():
+    """Every helper must return the same data from a TeamContext as from SQLite"""
+    print("=" * 70)
+    print("TEST: TeamContext vs SQLite")
+    print("=" * 70)
+
+    teams = db_queries.get_all_teams()
+    assert teams, "No teams in database"
+
+    with _ScratchTrendsDB():
+        for team in teams:
+            expected = _team_outputs(team['id'], team['abbreviation'])
+            actual = _team_outputs(team['id'], team['abbreviation'], get_team_context(team['id']))
+            for key in expected:
+                assert expected[key] == actual[key], f"{team['abbreviation']}: {key} differs"
+            print(f"  ✓ {team['abbreviation']}")
+
+
+def test_context_shared_within_scope():
+    """get_team_context returns the same object for a team inside one scope"""
+    team_id = db_queries.get_all_teams()[0]['id']
+
+    with prediction_scope():
+        first = get_team_context(team_id)
+        second = get_team_context(team_id)
+        assert first is second
+        assert first.league_overall is get_team_context(team_id + 1).league_overall
+
+    assert get_team_context(team_id) is not first
+
+
+def main():
+    tests = [test_context_matches_sql, test_context_shared_within_scope]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Test script for the point-in-time team feature store
+
+Tests:
+1. Features as of a date only include games before it
+2. Last-5 and rolling PPP windows match the live builders' definitions
+3. Incremental refresh rewrites only the teams and dates that changed
+4. Profiles built from the store equal the live as-of profiles
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from dataclasses import asdict
+
+import pandas as pd
+
+from api.utils import team_feature_store, team_profiles_v5
+from api.utils.team_feature_store import (
+    compute_team_feature_history, get_def_rtg_rank_as_of, get_team_features_as_of,
+    preloaded_feature_history, refresh_team_feature_store
+)
+from api.utils.derived_pipeline import STAGES
+
+SEASON = '2025-26'
+
+
+def _logs(games):
+    """games: [(team_id, game_date, is_home, team_pts, possessions)] -> _load_game_logs() frame"""
+    rows = []
+    for team_id, game_date, is_home, pts, poss in games:
+        rows.append({
+            'team_id': team_id, 'game_date': game_date, 'is_home': is_home,
+            'team_pts': pts, 'opp_pts': 100.0, 'pace': poss, 'possessions': poss,
+            'off_rating': None if poss is None else 100.0 * pts / poss, 'def_rating': 110.0,
+            'fg3_pct': 0.36, 'ft_pct': 0.8, 'assists': 25.0, 'turnovers': 13.0,
+            'fg3m': 12, 'fg3a': 33, 'fg2m': 30, 'fg2a': 55
+        })
+    return pd.DataFrame(rows).sort_values(['team_id', 'game_date'], kind='stable')
+
+
+def _temp_db(games):
+    """Scratch nba_data.db with nba_teams and the given team_game_logs rows"""
+    path = os.path.join(tempfile.mkdtemp(), 'nba_data.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE nba_teams (team_id INTEGER, season TEXT, full_name TEXT)')
+    conn.executemany('INSERT INTO nba_teams VALUES (?, ?, ?)',
+                     [(1, SEASON, 'Team One'), (2, SEASON, 'Team Two')])
+    logs = _logs(games)
+    logs['season'] = SEASON
+    logs.to_sql('team_game_logs', conn, index=False)
+    conn.close()
+    return path
+
+
+def test_as_of_excludes_same_day_and_future():
+    """A date's own games and later games never leak into its features"""
+    path = _temp_db([(1, '2025-10-21', 1, 110.0, 100.0), (1, '2025-10-23', 0, 120.0, 100.0),
+                     (2, '2025-10-22', 1, 90.0, 100.0)])
+    original = team_feature_store.NBA_DATA_DB_PATH
+    team_feature_store.NBA_DATA_DB_PATH = path
+    try:
+        refresh_team_feature_store(SEASON)
+
+        assert get_team_features_as_of(1, '2025-10-21', SEASON) is None
+        before = get_team_features_as_of(1, '2025-10-23', SEASON)
+        assert before['games'] == 1 and before['season_ppg'] == 110.0
+        assert before['through_date'] == '2025-10-21' and before['team_name'] == 'Team One'
+        assert get_team_features_as_of(1, '2025-11-01', SEASON)['season_ppg'] == 115.0
+
+        # Preloaded reads agree with the SQL reads
+        with preloaded_feature_history(SEASON):
+            assert get_team_features_as_of(1, '2025-10-23', SEASON) == before
+            assert get_team_features_as_of(1, '2025-10-21', SEASON) is None
+
+        # Both teams allow 110 going into 10-23: ties share the better rank
+        assert get_def_rtg_rank_as_of(1, '2025-10-23', SEASON) == 1
+        assert get_def_rtg_rank_as_of(2, '2025-10-22', SEASON) is None
+    finally:
+        team_feature_store.NBA_DATA_DB_PATH = original
+
+
+def test_window_semantics():
+    """Last 5 divides by games in the window; PPP skips games without possessions"""
+    games = [(1, f'2025-11-{day:02d}', day % 2, float(100 + day), 100.0) for day in range(1, 8)]
+    games.append((1, '2025-11-08', 1, 150.0, None))  # No possessions recorded
+    history = compute_team_feature_history(_logs(games)).set_index('game_date')
+
+    after_7 = history.loc['2025-11-07']
+    assert after_7['last_5_ppg'] == sum(100 + d for d in range(3, 8)) / 5
+    assert after_7['ppp_last5'] == round(sum(100 + d for d in range(3, 8)) / 500, 3)
+    assert after_7['ppp_last10_games'] == 7
+    assert after_7['home_games'] == 4 and after_7['away_games'] == 3
+
+    # The possession-less game counts for PPG but not PPP
+    after_8 = history.loc['2025-11-08']
+    assert after_8['games'] == 8
+    assert after_8['ppp_last5'] == after_7['ppp_last5']
+    assert after_8['ppp_season'] == after_7['ppp_season']
+
+
+def test_incremental_refresh():
+    """Only the team with a new game gets rows written"""
+    path = _temp_db([(1, '2025-10-21', 1, 110.0, 100.0), (2, '2025-10-21', 0, 100.0, 100.0)])
+    original = team_feature_store.NBA_DATA_DB_PATH
+    team_feature_store.NBA_DATA_DB_PATH = path
+    try:
+        assert refresh_team_feature_store(SEASON) == 2
+        assert refresh_team_feature_store(SEASON) == 0
+
+        conn = sqlite3.connect(path)
+        conn.execute('''
+            INSERT INTO team_game_logs (team_id, season, game_date, is_home, team_pts, possessions)
+            VALUES (2, ?, '2025-10-20', 1, 95.0, 98.0)
+        ''', (SEASON,))
+        conn.commit()
+        conn.close()
+
+        # A late earlier game rewrites team 2 from that date onward
+        assert refresh_team_feature_store(SEASON, team_ids=[2]) == 2
+        assert get_team_features_as_of(2, '2025-10-22', SEASON)['games'] == 2
+        assert refresh_team_feature_store(SEASON) == 0
+    finally:
+        team_feature_store.NBA_DATA_DB_PATH = original
+
+    stage = next(stage for stage in STAGES if stage.name == 'team_feature_snapshots')
+    assert stage.inputs == ('team_game_logs',) and stage.scope == 'team'
+
+
+def test_profiles_match_live_builder():
+    """build_team_profile(as_of) is identical with and without the store"""
+    path = os.path.join(tempfile.mkdtemp(), 'nba_data.db')
+    shutil.copy(team_profiles_v5.NBA_DATA_DB_PATH, path)
+    conn = sqlite3.connect(path)
+    conn.execute('DROP TABLE IF EXISTS team_feature_snapshots')
+    team_dates = conn.execute('''
+        SELECT team_id, game_date FROM team_game_logs
+        WHERE season = ? ORDER BY game_date, team_id
+    ''', (SEASON,)).fetchall()[::97]
+    conn.close()
+
+    originals = team_feature_store.NBA_DATA_DB_PATH, team_profiles_v5.NBA_DATA_DB_PATH
+    team_feature_store.NBA_DATA_DB_PATH = team_profiles_v5.NBA_DATA_DB_PATH = path
+    try:
+        live = [team_profiles_v5.build_team_profile(team_id, SEASON, date) for team_id, date in team_dates]
+        refresh_team_feature_store(SEASON)
+        with preloaded_feature_history(SEASON):
+            stored = [team_profiles_v5.build_team_profile(team_id, SEASON, date) for team_id, date in team_dates]
+    finally:
+        team_feature_store.NBA_DATA_DB_PATH, team_profiles_v5.NBA_DATA_DB_PATH = originals
+
+    print(f"  {len(team_dates)} team/date pairs, {sum(p is not None for p in live)} with profiles")
+    for (team_id, date), a, b in zip(team_dates, live, stored):
+        if a is None:
+            assert b is None, (team_id, date)
+            continue
+        for field, value in asdict(a).items():
+            other = asdict(b)[field]
+            if isinstance(value, float):
+                assert abs(value - other) < 1e-9, (team_id, date, field)
+            else:
+                assert value == other, (team_id, date, field)
+
+
+def main():
+    tests = [test_as_of_excludes_same_day_and_future, test_window_semantics,
+             test_incremental_refresh, test_profiles_match_live_builder]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
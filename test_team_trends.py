@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Test script for materialized last-5 team trends
+
+Tests:
+1. One query builds the last 5 games with opponent profiles: unknown
+   opponents are dropped, opponents without season stats are 'unknown'
+2. materialize_team_trends() stores every team; reads are served from it
+3. A new sync (data version) makes stored trends stale and they are rebuilt
+4. Teams without games or season stats get the empty trends
+5. A failed read returns empty trends for that call only (never stored)
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+
+from api.utils import last_5_trends, prediction_cache
+from api.utils.connection_pool import close_shared_connections
+from api.utils.last_5_trends import build_team_trends, get_last_5_trends, materialize_team_trends
+
+SEASON = '2025-26'
+data_version = ['1:2026-01-02']
+
+# team_id, abbreviation, season row (off_rtg, off_rank, def_rtg, def_rank, pace, pace_rank) or None
+TEAMS = [
+    (1, 'AAA', (115.0, 5, 110.0, 8, 100.0, 12)),
+    (2, 'BBB', (112.0, 15, 113.0, 18, 98.0, 25)),
+    (3, 'CCC', None),
+    (4, 'DDD', (108.0, 25, 116.0, 28, 101.0, 4)),
+]
+
+
+class _Setup:
+    """Scratch nba_data.db with a few teams, season rows and game logs"""
+
+    def __enter__(self):
+        self.saved = (last_5_trends.NBA_DATA_DB_PATH, last_5_trends.get_data_version,
+                      prediction_cache.get_data_version, os.environ.get('GAME_FILTER_MODE'))
+        schema_path = last_5_trends.NBA_DATA_DB_PATH
+        path = os.path.join(tempfile.mkdtemp(), 'nba_data.db')
+
+        source = sqlite3.connect(schema_path)
+        schema = [sql for (sql,) in source.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' "
+            "AND name IN ('nba_teams', 'team_season_stats', 'team_game_logs')")]
+        source.close()
+
+        conn = sqlite3.connect(path)
+        for sql in schema:
+            conn.execute(sql)
+        for team_id, abbr, stats in TEAMS:
+            conn.execute('''
+                INSERT INTO nba_teams (team_id, team_abbreviation, full_name, season, last_updated)
+                VALUES (?, ?, ?, ?, '2026-01-01')
+            ''', (team_id, abbr, abbr, SEASON))
+            if stats is not None:
+                off_rtg, off_rank, def_rtg, def_rank, pace, pace_rank = stats
+                conn.execute('''
+                    INSERT INTO team_season_stats
+                        (team_id, season, split_type, ppg, assists, off_rtg, off_rtg_rank,
+                         def_rtg, def_rtg_rank, pace, pace_rank, synced_at)
+                    VALUES (?, ?, 'overall', 110.0, 25.0, ?, ?, ?, ?, ?, ?, '2026-01-01')
+                ''', (team_id, SEASON, off_rtg, off_rank, def_rtg, def_rank, pace, pace_rank))
+
+        # AAA: six games, oldest first; the oldest falls outside the last 5
+        # and the game against ZZZ (not a known team) is dropped
+        games = [('2026-01-01', 'BBB'), ('2026-01-03', 'BBB'), ('2026-01-05', 'CCC'),
+                 ('2026-01-07', 'ZZZ'), ('2026-01-09', 'DDD'), ('2026-01-11', 'BBB')]
+        for i, (game_date, opponent) in enumerate(games):
+            conn.execute('''
+                INSERT INTO team_game_logs
+                    (game_id, team_id, game_date, season, matchup, team_pts, opp_pts,
+                     off_rating, def_rating, pace, fgm, fga, fg3m, fg3a, ftm, turnovers,
+                     assists, rebounds, points_in_paint, game_type, is_home, synced_at)
+                VALUES (?, 1, ?, ?, ?, ?, 100, 112.0, 108.0, ?, 40, 85, 12, 34, 18, 13, 26, 44, ?,
+                        'Regular Season', ?, '2026-01-01')
+            ''', (f'g{i}', game_date, SEASON, f'AAA vs. {opponent}' if i % 2 else f'AAA @ {opponent}',
+                  110 + i, 99.0 + i, 40 + i * 2, i % 2))
+        # DDD's side of g4; BBB and CCC have no games
+        conn.execute('''
+            INSERT INTO team_game_logs
+                (game_id, team_id, game_date, season, matchup, team_pts, opp_pts, pace,
+                 fgm, fga, fg3m, fg3a, ftm, is_home, synced_at)
+            VALUES ('g4', 4, '2026-01-09', ?, 'DDD vs. AAA', 100, 114, 103.0, 38, 88, 10, 30, 14, 1, '2026-01-01')
+        ''', (SEASON,))
+        conn.commit()
+        conn.close()
+
+        last_5_trends.NBA_DATA_DB_PATH = path
+        last_5_trends.get_data_version = prediction_cache.get_data_version = lambda: data_version[0]
+        prediction_cache.reset_cached_data_version()
+        os.environ['GAME_FILTER_MODE'] = 'DISABLED'
+        with last_5_trends._memory_lock:
+            last_5_trends._memory.clear()
+        return path
+
+    def __exit__(self, *exc):
+        (last_5_trends.NBA_DATA_DB_PATH, last_5_trends.get_data_version,
+         prediction_cache.get_data_version, filter_mode) = self.saved
+        if filter_mode is None:
+            os.environ.pop('GAME_FILTER_MODE', None)
+        else:
+            os.environ['GAME_FILTER_MODE'] = filter_mode
+        prediction_cache.reset_cached_data_version()
+        data_version[0] = '1:2026-01-02'
+        with last_5_trends._memory_lock:
+            last_5_trends._memory.clear()
+        close_shared_connections()
+
+
+def _counting_builds():
+    """Wrap build_team_trends to record which teams are built"""
+    builds = []
+    real = last_5_trends.build_team_trends
+
+    def counted(season=SEASON, team_ids=None):
+        result = real(season, team_ids)
+        builds.append(sorted(result))
+        return result
+
+    last_5_trends.build_team_trends = counted
+    return builds, real
+
+
+def test_last_games_with_opponents():
+    """Last 5 games, opponent ranks from the joined season rows"""
+    with _Setup():
+        trends = build_team_trends(SEASON)[1]
+        games = trends['games']
+        # g0 is the sixth most recent, g3 (vs ZZZ) is dropped
+        assert [g['game_id'] for g in games] == ['g5', 'g4', 'g2', 'g1'], games
+        assert games[0]['opponent'] == {
+            'tricode': 'BBB', 'off_rtg': 112.0, 'off_rtg_rank': 15, 'def_rtg': 113.0,
+            'def_rtg_rank': 18, 'pace': 98.0, 'pace_rank': 25, 'strength': 'mid'
+        }
+        assert games[1]['opponent']['strength'] == 'bottom'
+        assert games[2]['opponent']['strength'] == 'unknown' and games[2]['opponent']['off_rtg'] is None
+        assert trends['opponent_breakdown']['vs_mid_off'] == 2
+        assert trends['averages']['pace'] == round((104.0 + 103.0 + 101.0 + 100.0) / 4, 1)
+        assert trends['season_avg']['paint_points'] == 45.0
+        assert trends['data_quality'] == 'good'
+
+
+def test_materialized_then_served():
+    """Stored trends are read back without building"""
+    with _Setup() as path:
+        result = materialize_team_trends(SEASON)
+        assert result['teams'] == 4
+        expected = build_team_trends(SEASON)[1]
+
+        builds, real = _counting_builds()
+        try:
+            first = get_last_5_trends(1, 'AAA', SEASON)
+            second = get_last_5_trends(1, 'AAA', SEASON)
+        finally:
+            last_5_trends.build_team_trends = real
+        assert builds == []
+        assert first == second == expected
+
+        conn = sqlite3.connect(path)
+        rows = conn.execute('SELECT COUNT(*), MIN(data_version) FROM team_trends').fetchone()
+        conn.close()
+        assert rows == (4, data_version[0])
+
+
+def test_new_sync_rebuilds():
+    """A new data version misses the stored row; materialize purges the old ones"""
+    with _Setup() as path:
+        materialize_team_trends(SEASON)
+        data_version[0] = '2:2026-01-03'
+        prediction_cache.reset_cached_data_version()
+
+        builds, real = _counting_builds()
+        try:
+            get_last_5_trends(1, 'AAA', SEASON)
+            get_last_5_trends(1, 'AAA', SEASON)
+        finally:
+            last_5_trends.build_team_trends = real
+        assert builds == [[1]]
+
+        materialize_team_trends(SEASON)
+        conn = sqlite3.connect(path)
+        versions = conn.execute('SELECT DISTINCT data_version FROM team_trends').fetchall()
+        conn.close()
+        assert versions == [('2:2026-01-03',)]
+
+
+def test_empty_trends():
+    """No games, or no season stats for the team"""
+    with _Setup():
+        for team_id, tricode in ((2, 'BBB'), (3, 'CCC'), (99, 'XXX')):
+            trends = get_last_5_trends(team_id, tricode, SEASON)
+            assert trends['games'] == [] and trends['data_quality'] == 'none', trends
+            assert trends['team_tricode'] == tricode
+        assert get_last_5_trends(4, 'DDD', SEASON)['games'][0]['opponent']['strength'] == 'top'
+
+
+def test_failed_read_not_stored():
+    """A transient query error is not cached under the data version"""
+    with _Setup() as path:
+        real = last_5_trends._load_last_games
+
+        def locked(conn, season, team_ids):
+            raise sqlite3.OperationalError('database is locked')
+
+        last_5_trends._load_last_games = locked
+        try:
+            failed = get_last_5_trends(1, 'AAA', SEASON)
+        finally:
+            last_5_trends._load_last_games = real
+        assert failed['data_quality'] == 'none' and failed['games'] == []
+
+        conn = sqlite3.connect(path)
+        stored = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'team_trends'").fetchone()[0]
+        if stored:
+            stored = conn.execute('SELECT COUNT(*) FROM team_trends').fetchone()[0]
+        conn.close()
+        assert stored == 0
+
+        recovered = get_last_5_trends(1, 'AAA', SEASON)
+        assert [g['game_id'] for g in recovered['games']] == ['g5', 'g4', 'g2', 'g1']
+
+
+def main():
+    tests = [test_last_games_with_opponents, test_materialized_then_served,
+             test_new_sync_rebuilds, test_empty_trends, test_failed_read_not_stored]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())